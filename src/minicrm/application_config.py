@@ -12,6 +12,31 @@ import logging
 from minicrm.core.dependency_injection import container
 
 
+_DAO = "minicrm.data.dao"
+_SERVICES = "minicrm.services"
+
+# 按具体类注册的延迟加载实现("模块路径:类名")
+_LAZY_DAOS = (
+    f"{_DAO}.customer_dao:CustomerDAO",
+    f"{_DAO}.supplier_dao:SupplierDAO",
+    f"{_DAO}.customer_score_dao:CustomerScoreDAO",
+    f"{_DAO}.metric_rollup_dao:MetricRollupDAO",
+    f"{_DAO}.analytics_snapshot_dao:AnalyticsSnapshotDAO",
+    f"{_DAO}.financial_risk_dao:FinancialRiskDAO",
+    f"{_DAO}.table_stats_dao:TableStatsDAO",
+    f"{_DAO}.interaction_dao:InteractionDAO",
+    f"{_DAO}.business_dao:QuoteDAO",
+)
+_LAZY_SERVICES = (
+    f"{_SERVICES}.finance_service:FinanceService",
+    f"{_SERVICES}.backup_service:BackupService",
+    f"{_SERVICES}.contract_service:ContractService",
+    f"{_SERVICES}.quote_service:QuoteServiceRefactored",
+    f"{_SERVICES}.settings_service:SettingsService",
+    f"{_SERVICES}.task_service:TaskService",
+)
+
+
 def configure_application_dependencies():
     """
     配置应用程序依赖关系
@@ -21,12 +46,11 @@ def configure_application_dependencies():
     logger = logging.getLogger(__name__)
 
     try:
-        # 导入接口
-
-        # 注册数据库管理器(最底层)
-        # 使用工厂方法创建 DatabaseManager,提供数据库路径
+        # 只导入接口和数据库管理器, DAO和Service的实现模块在首次解析时才导入,
+        # 启动时用不到的服务(及其依赖的pandas、reportlab等)不会被加载
         from pathlib import Path
 
+        from minicrm.core.cache_tier import get_cache_tier
         from minicrm.core.interfaces.dao_interfaces import (
             ICustomerDAO,
             ISupplierDAO,
@@ -42,61 +66,48 @@ def configure_application_dependencies():
             ISupplierService,
             ITaskService,
         )
-        from minicrm.data.dao.business_dao import QuoteDAO
-        from minicrm.data.dao.customer_dao import CustomerDAO
-        from minicrm.data.dao.interaction_dao import InteractionDAO
-        from minicrm.data.dao.supplier_dao import SupplierDAO
         from minicrm.data.database import DatabaseManager
-        from minicrm.services.analytics_service import AnalyticsService
-
-        # 导入实现类
-        from minicrm.services.backup_service import BackupService
-        from minicrm.services.contract_service import ContractService
-        from minicrm.services.customer_service import CustomerService
-        from minicrm.services.finance_service import FinanceService
-        from minicrm.services.quote_service import QuoteServiceRefactored
-        from minicrm.services.settings_service import SettingsService
-        from minicrm.services.supplier_service import SupplierService
-        from minicrm.services.task_service import TaskService
 
+        # 注册数据库管理器(最底层)
+        # 使用工厂方法创建 DatabaseManager,提供数据库路径
         def create_database_manager():
             # 获取用户数据目录
             data_dir = Path.home() / "Library" / "Application Support" / "MiniCRM"
             data_dir.mkdir(parents=True, exist_ok=True)
             db_path = data_dir / "minicrm.db"
-            return DatabaseManager(db_path)
+            database_manager = DatabaseManager(db_path)
+            # 写入后按表失效统一缓存层中的相关缓存
+            get_cache_tier().attach_database(database_manager)
+            return database_manager
 
         container.register_factory(DatabaseManager, create_database_manager)
 
         # 注册DAO层(依赖DatabaseManager)
-        container.register_singleton(ICustomerDAO, CustomerDAO)
-        container.register_singleton(ISupplierDAO, SupplierDAO)
+        container.register_lazy(ICustomerDAO, f"{_DAO}.customer_dao:CustomerDAO")
+        container.register_lazy(ISupplierDAO, f"{_DAO}.supplier_dao:SupplierDAO")
         # 同时注册具体类,以支持直接依赖
-        container.register_singleton(CustomerDAO, CustomerDAO)
-        container.register_singleton(SupplierDAO, SupplierDAO)
-        container.register_singleton(InteractionDAO, InteractionDAO)
-        container.register_singleton(QuoteDAO, QuoteDAO)
+        for target in _LAZY_DAOS:
+            container.register_lazy(target)
 
         # 注册Service层(依赖DAO层)
-        container.register_singleton(ICustomerService, CustomerService)
-        container.register_singleton(ISupplierService, SupplierService)
-        container.register_singleton(IAnalyticsService, AnalyticsService)
-        container.register_singleton(IFinanceService, FinanceService)
-        container.register_singleton(IBackupService, BackupService)
-        container.register_singleton(IContractService, ContractService)
-        container.register_singleton(IQuoteService, QuoteServiceRefactored)
-        container.register_singleton(ISettingsService, SettingsService)
-        container.register_singleton(ITaskService, TaskService)
+        for interface, target in (
+            (ICustomerService, f"{_SERVICES}.customer_service:CustomerService"),
+            (ISupplierService, f"{_SERVICES}.supplier_service:SupplierService"),
+            (IAnalyticsService, f"{_SERVICES}.analytics_service:AnalyticsService"),
+            (IFinanceService, f"{_SERVICES}.finance_service:FinanceService"),
+            (IBackupService, f"{_SERVICES}.backup_service:BackupService"),
+            (IContractService, f"{_SERVICES}.contract_service:ContractService"),
+            (IQuoteService, f"{_SERVICES}.quote_service:QuoteServiceRefactored"),
+            (ISettingsService, f"{_SERVICES}.settings_service:SettingsService"),
+            (ITaskService, f"{_SERVICES}.task_service:TaskService"),
+        ):
+            container.register_lazy(interface, target)
         # 注意:ImportExportService有依赖问题,暂时跳过注册
         # container.register_singleton(IImportExportService, ImportExportService)
 
         # 同时注册具体类,以支持直接依赖
-        container.register_singleton(FinanceService, FinanceService)
-        container.register_singleton(BackupService, BackupService)
-        container.register_singleton(ContractService, ContractService)
-        container.register_singleton(QuoteServiceRefactored, QuoteServiceRefactored)
-        container.register_singleton(SettingsService, SettingsService)
-        container.register_singleton(TaskService, TaskService)
+        for target in _LAZY_SERVICES:
+            container.register_lazy(target)
         # 注意:ImportExportService有依赖问题,暂时跳过注册
         # container.register_singleton(ImportExportService, ImportExportService)
 
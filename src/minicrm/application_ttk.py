@@ -29,7 +29,9 @@ from minicrm.core.interfaces.service_interfaces import (
     ISupplierService,
     ITaskService,
 )
+from minicrm.core.startup_timeline import get_startup_timeline
 from minicrm.core.ttk_error_handler import TTKErrorHandler
+from minicrm.ui.event_bus import get_event_bus
 from minicrm.ui.ttk_base.event_manager import EventManager, get_global_event_manager
 from minicrm.ui.ttk_base.main_window_ttk import MainWindowTTK
 from minicrm.ui.ttk_base.service_integration_manager import (
@@ -52,13 +54,16 @@ class MiniCRMApplicationTTK:
     - 导航和页面管理
     """
 
-    def __init__(self, config: ConfigManager):
+    def __init__(self, config: ConfigManager, headless: bool = False):
         """初始化MiniCRM TTK应用程序.
 
         Args:
             config: 应用程序配置管理器
+            headless: 无界面模式, 只初始化服务层, 不创建主题和主窗口,
+                用于无显示环境下的启动基准测试
         """
         self._config = config
+        self._headless = headless
         self._logger = logging.getLogger(__name__)
 
         # 服务层组件(通过依赖注入获取)
@@ -105,23 +110,32 @@ class MiniCRMApplicationTTK:
         try:
             self._logger.info("开始初始化MiniCRM TTK应用程序...")
 
+            timeline = get_startup_timeline()
+
             # 配置依赖注入
-            configure_application_dependencies()
+            with timeline.phase("di_wiring"):
+                configure_application_dependencies()
 
             # 获取服务实例
-            self._initialize_services()
+            with timeline.phase("services"):
+                self._initialize_services()
 
             # 初始化TTK组件
-            self._initialize_ttk_components()
+            with timeline.phase("ttk_components"):
+                self._initialize_ttk_components()
 
             # 初始化服务集成
-            self._initialize_service_integrations()
+            with timeline.phase("service_integrations"):
+                self._initialize_service_integrations()
 
-            # 设置主窗口
-            self._setup_main_window()
+            if not self._headless:
+                # 设置主窗口
+                with timeline.phase("main_window"):
+                    self._setup_main_window()
 
-            # 配置导航系统(包含业务面板注册)
-            self._setup_navigation()
+                # 配置导航系统(包含业务面板注册)
+                with timeline.phase("navigation"):
+                    self._setup_navigation()
 
             # 标记初始化完成
             self._is_initialized = True
@@ -139,28 +153,32 @@ class MiniCRMApplicationTTK:
         try:
             self._logger.info("正在初始化服务层组件...")
 
+            timeline = get_startup_timeline()
+
             # 首先获取数据库管理器并初始化数据库
             from minicrm.data.database import DatabaseManager
 
-            self._database_manager = get_service(DatabaseManager)
-            self._database_manager.initialize_database()
+            with timeline.phase("database_init"):
+                self._database_manager = get_service(DatabaseManager)
+                self._database_manager.initialize_database()
             self._logger.debug("数据库管理器初始化完成")
 
             # 通过依赖注入获取服务实例
-            self._customer_service = get_service(ICustomerService)
-            self._logger.debug("客户服务初始化完成")
+            with timeline.phase("service_construction"):
+                self._customer_service = get_service(ICustomerService)
+                self._logger.debug("客户服务初始化完成")
 
-            self._supplier_service = get_service(ISupplierService)
-            self._logger.debug("供应商服务初始化完成")
+                self._supplier_service = get_service(ISupplierService)
+                self._logger.debug("供应商服务初始化完成")
 
-            self._analytics_service = get_service(IAnalyticsService)
-            self._logger.debug("分析服务初始化完成")
+                self._analytics_service = get_service(IAnalyticsService)
+                self._logger.debug("分析服务初始化完成")
 
-            self._settings_service = get_service(ISettingsService)
-            self._logger.debug("设置服务初始化完成")
+                self._settings_service = get_service(ISettingsService)
+                self._logger.debug("设置服务初始化完成")
 
-            self._task_service = get_service(ITaskService)
-            self._logger.debug("任务服务初始化完成")
+                self._task_service = get_service(ITaskService)
+                self._logger.debug("任务服务初始化完成")
 
             self._logger.info("服务层组件初始化完成")
 
@@ -177,9 +195,10 @@ class MiniCRMApplicationTTK:
             self._event_manager = get_global_event_manager()
             self._logger.debug("事件管理器初始化完成")
 
-            # 初始化主题管理器
-            self._theme_manager = TTKThemeManager()
-            self._logger.debug("主题管理器初始化完成")
+            # 初始化主题管理器(需要Tk显示环境, 无界面模式下跳过)
+            if not self._headless:
+                self._theme_manager = TTKThemeManager()
+                self._logger.debug("主题管理器初始化完成")
 
             # 初始化错误处理器
             self._error_handler = TTKErrorHandler()
@@ -337,6 +356,10 @@ class MiniCRMApplicationTTK:
                 self._main_window.deiconify()  # 确保窗口可见
                 self._main_window.lift()  # 提升到前台
                 self._main_window.focus_force()  # 获得焦点
+                self.render_first_frame()
+
+                # 事件总线在主线程分发, 订阅者可以直接更新界面
+                get_event_bus().attach_to_tk(self._main_window)
 
                 # 进入主事件循环
                 self._main_window.mainloop()
@@ -347,6 +370,17 @@ class MiniCRMApplicationTTK:
         finally:
             self._is_running = False
 
+    def render_first_frame(self) -> None:
+        """完成主窗口的首次布局和绘制, 并记录首帧渲染耗时"""
+        if not self._main_window:
+            return
+
+        timeline = get_startup_timeline()
+        with timeline.phase("first_render"):
+            self._main_window.update_idletasks()
+        timeline.mark("interactive")
+        timeline.finish()
+
     def shutdown(self) -> None:
         """关闭应用程序
 
@@ -378,6 +412,9 @@ class MiniCRMApplicationTTK:
     def _cleanup_ttk_components(self) -> None:
         """清理TTK组件资源"""
         try:
+            # 事件总线恢复后台线程分发
+            get_event_bus().detach_from_tk()
+
             # 清理主窗口
             if self._main_window:
                 self._main_window.cleanup()
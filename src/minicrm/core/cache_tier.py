@@ -0,0 +1,883 @@
+"""
+MiniCRM 统一缓存层
+
+为各服务提供共享的缓存子系统, 取代分散在各处的独立缓存:
+- 命名区域(region), 每个区域有独立的字节预算、TTL和淘汰策略
+- 全局内存上限, 超出时从占用比例最高的区域跨区域淘汰
+- 标签和表依赖失效, 可直接订阅DatabaseManager的写通知
+- 每个区域的命中、未命中和访问耗时统计
+- 可插拔的磁盘二级缓存(L2), 用于计算代价高的结果
+
+区域内部使用DataCacheManager存储, 容量记账和淘汰均为O(1).
+同一区域由多个使用方共享时, 通过命名空间(CacheNamespace)隔离各自的键.
+"""
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable, Iterable
+from dataclasses import asdict, dataclass
+from datetime import timedelta
+import itertools
+import logging
+from pathlib import Path
+import pickle
+import sqlite3
+import threading
+import time
+from typing import Any
+
+from .data_cache_manager import (
+    CacheEntry,
+    CachePolicy,
+    DataCacheManager,
+    SizeEstimator,
+)
+from .sql_table_parser import ALL_TABLES
+
+
+# 表依赖标签前缀, 表名统一小写
+TABLE_TAG_PREFIX = "table:"
+
+# 命名空间标签前缀
+NAMESPACE_TAG_PREFIX = "ns:"
+
+# 默认全局内存上限(MB)
+DEFAULT_MAX_MEMORY_MB = 256.0
+
+# 保留的耗时样本数
+_LATENCY_SAMPLES = 1000
+
+# 区分"未命中"和"缓存了None"
+_MISSING = object()
+
+
+def table_tag(table: str) -> str:
+    """生成表依赖标签"""
+    return f"{TABLE_TAG_PREFIX}{table.lower()}"
+
+
+@dataclass
+class RegionStatistics:
+    """缓存区域统计信息"""
+
+    name: str
+    entries: int = 0
+    size_bytes: int = 0
+    max_size_bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    l2_hits: int = 0
+    evictions: int = 0
+    loads: int = 0
+    hit_rate: float = 0.0
+    avg_get_time_ms: float = 0.0
+    avg_load_time_ms: float = 0.0
+
+
+class CacheBackend(ABC):
+    """
+    二级缓存后端接口
+
+    后端只保存可pickle的值; 写入失败时区域照常使用内存缓存.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> tuple[Any, float | None, set[str]] | None:
+        """
+        读取缓存值
+
+        Returns:
+            tuple | None: (值, 过期时间戳, 标签集合), 不存在或已过期时返回None
+        """
+        pass
+
+    @abstractmethod
+    def put(
+        self, key: str, value: Any, expires_at: float | None, tags: set[str]
+    ) -> None:
+        """写入缓存值"""
+        pass
+
+    @abstractmethod
+    def remove(self, key: str) -> None:
+        """删除缓存值"""
+        pass
+
+    @abstractmethod
+    def invalidate_tag(self, tag: str) -> int:
+        """删除带有指定标签的缓存值, 返回删除数量"""
+        pass
+
+    @abstractmethod
+    def invalidate_tag_prefix(self, prefix: str) -> int:
+        """删除标签以指定前缀开头的缓存值, 返回删除数量"""
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        """清空缓存"""
+        pass
+
+    def close(self) -> None:
+        """释放资源"""
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    基于SQLite文件的二级缓存后端
+
+    值以pickle格式保存, 标签单独建表以支持按标签失效.
+    """
+
+    def __init__(self, path: str | Path):
+        """
+        初始化SQLite缓存后端
+
+        Args:
+            path: 缓存数据库文件路径
+        """
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self._path), check_same_thread=False, isolation_level=None
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                key TEXT PRIMARY KEY,
+                value BLOB NOT NULL,
+                expires_at REAL
+            );
+            CREATE TABLE IF NOT EXISTS cache_tags (
+                tag TEXT NOT NULL,
+                key TEXT NOT NULL,
+                PRIMARY KEY (tag, key)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags(key);
+            """
+        )
+
+    def get(self, key: str) -> tuple[Any, float | None, set[str]] | None:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] is not None and row[1] <= time.time():
+                self._delete_keys([key])
+                return None
+            tags = {
+                tag
+                for (tag,) in self._connection.execute(
+                    "SELECT tag FROM cache_tags WHERE key = ?", (key,)
+                )
+            }
+        return pickle.loads(row[0]), row[1], tags
+
+    def put(
+        self, key: str, value: Any, expires_at: float | None, tags: set[str]
+    ) -> None:
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._connection.execute("BEGIN")
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO cache_entries (key, value, expires_at) "
+                    "VALUES (?, ?, ?)",
+                    (key, payload, expires_at),
+                )
+                self._connection.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+                self._connection.executemany(
+                    "INSERT INTO cache_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in tags],
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._delete_keys([key])
+
+    def invalidate_tag(self, tag: str) -> int:
+        return self._invalidate("SELECT key FROM cache_tags WHERE tag = ?", (tag,))
+
+    def invalidate_tag_prefix(self, prefix: str) -> int:
+        return self._invalidate(
+            "SELECT DISTINCT key FROM cache_tags WHERE substr(tag, 1, ?) = ?",
+            (len(prefix), prefix),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection.execute("DELETE FROM cache_entries")
+            self._connection.execute("DELETE FROM cache_tags")
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def _invalidate(self, sql: str, params: tuple) -> int:
+        """删除查询返回的键"""
+        with self._lock:
+            keys = [key for (key,) in self._connection.execute(sql, params)]
+            self._delete_keys(keys)
+        return len(keys)
+
+    def _delete_keys(self, keys: list[str]) -> None:
+        """删除键及其标签, 调用方持有锁"""
+        if not keys:
+            return
+        params = [(key,) for key in keys]
+        self._connection.execute("BEGIN")
+        self._connection.executemany("DELETE FROM cache_entries WHERE key = ?", params)
+        self._connection.executemany("DELETE FROM cache_tags WHERE key = ?", params)
+        self._connection.execute("COMMIT")
+
+
+class CacheRegion:
+    """
+    缓存区域
+
+    拥有独立字节预算的一块缓存, 可选配二级缓存后端.
+    读取时先查内存, 未命中再查后端并提升到内存; 写入时同时写入后端.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size_mb: float,
+        ttl: timedelta | None = None,
+        policy: str = CachePolicy.LRU,
+        backend: CacheBackend | None = None,
+        size_estimator: SizeEstimator | None = None,
+        tier: "CacheTier | None" = None,
+    ):
+        """
+        初始化缓存区域
+
+        Args:
+            name: 区域名称
+            max_size_mb: 区域字节预算(MB)
+            ttl: 默认生存时间, 为None时不过期
+            policy: 淘汰策略
+            backend: 二级缓存后端
+            size_estimator: 大小估算器, 为None时使用estimate_size
+            tier: 所属缓存层, 写入后由其检查全局内存上限
+        """
+        self.name = name
+        self._logger = logging.getLogger(__name__)
+        self._ttl = ttl or timedelta.max
+        self._policy = policy
+        self._cache = DataCacheManager(
+            max_size_mb=max_size_mb,
+            cache_policy=policy,
+            size_estimator=size_estimator,
+        )
+        self._backend = backend
+        self._tier = tier
+
+        self._stats_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._l2_hits = 0
+        self._loads = 0
+        self._get_times: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+        self._load_times: deque[float] = deque(maxlen=_LATENCY_SAMPLES)
+
+        self._namespace_ids = itertools.count(1)
+
+    @property
+    def size_bytes(self) -> int:
+        """区域当前占用的字节数"""
+        return self._cache.size_bytes
+
+    @property
+    def max_size_bytes(self) -> int:
+        """区域字节预算"""
+        return self._cache.max_size_bytes
+
+    @property
+    def ttl(self) -> timedelta | None:
+        """默认生存时间, 为None时不过期"""
+        return None if self._ttl == timedelta.max else self._ttl
+
+    @property
+    def policy(self) -> str:
+        """淘汰策略"""
+        return self._policy
+
+    @property
+    def backend(self) -> CacheBackend | None:
+        """二级缓存后端"""
+        return self._backend
+
+    def set_backend(self, backend: CacheBackend | None) -> None:
+        """
+        设置二级缓存后端
+
+        Args:
+            backend: 缓存后端, 为None时关闭二级缓存
+        """
+        if self._backend is not None and self._backend is not backend:
+            self._backend.close()
+        self._backend = backend
+
+    def register_size_estimator(
+        self, value_type: type, estimator: SizeEstimator
+    ) -> None:
+        """注册指定类型的大小估算器"""
+        self._cache.register_size_estimator(value_type, estimator)
+
+    def namespace(self, name: str | None = None) -> "CacheNamespace":
+        """
+        创建本区域内的命名空间
+
+        Args:
+            name: 命名空间名称, 为None时生成进程内唯一的名称
+
+        Returns:
+            CacheNamespace: 命名空间
+        """
+        if name is None:
+            name = f"{self.name}#{next(self._namespace_ids)}"
+        return CacheNamespace(self, name)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """
+        获取缓存值
+
+        Args:
+            key: 缓存键
+            default: 未命中时返回的默认值
+
+        Returns:
+            Any: 缓存值或默认值
+        """
+        start = time.perf_counter()
+        value = self._cache.get(key, _MISSING)
+        hit = value is not _MISSING
+        l2_hit = False
+
+        if not hit and self._backend is not None:
+            value = self._get_from_backend(key)
+            hit = l2_hit = value is not _MISSING
+
+        with self._stats_lock:
+            if hit:
+                self._hits += 1
+                self._l2_hits += l2_hit
+            else:
+                self._misses += 1
+            self._get_times.append((time.perf_counter() - start) * 1000)
+
+        return value if hit else default
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl: timedelta | None = None,
+        tags: Iterable[str] | None = None,
+        tables: Iterable[str] | None = None,
+        size_bytes: int | None = None,
+    ) -> bool:
+        """
+        存储缓存值
+
+        Args:
+            key: 缓存键
+            value: 缓存值
+            ttl: 生存时间, 为None时使用区域默认值
+            tags: 标签
+            tables: 结果依赖的表, 这些表被写入时自动失效
+            size_bytes: 调用方已知的数据大小
+
+        Returns:
+            bool: 是否存入内存缓存
+        """
+        ttl = ttl or self._ttl
+        all_tags = set(tags or ())
+        all_tags.update(table_tag(table) for table in tables or ())
+
+        stored = self._cache.put(key, value, ttl, all_tags, size_bytes=size_bytes)
+
+        if self._backend is not None:
+            expires_at = (
+                None if ttl == timedelta.max else time.time() + (ttl.total_seconds())
+            )
+            try:
+                self._backend.put(key, value, expires_at, all_tags)
+            except Exception as e:
+                self._logger.debug(f"二级缓存写入失败: {self.name}/{key}, {e}")
+
+        if stored and self._tier is not None:
+            self._tier.enforce_memory_limit()
+        return stored
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: timedelta | None = None,
+        tags: Iterable[str] | None = None,
+        tables: Iterable[str] | None = None,
+    ) -> Any:
+        """
+        获取缓存值, 未命中时调用loader加载并缓存
+
+        Args:
+            key: 缓存键
+            loader: 加载函数
+            ttl: 生存时间
+            tags: 标签
+            tables: 结果依赖的表
+
+        Returns:
+            Any: 缓存或新加载的值
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        start = time.perf_counter()
+        value = loader()
+        with self._stats_lock:
+            self._loads += 1
+            self._load_times.append((time.perf_counter() - start) * 1000)
+
+        self.put(key, value, ttl, tags, tables)
+        return value
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """查看内存中的缓存条目, 不影响统计和淘汰顺序"""
+        return self._cache.peek(key)
+
+    def keys(self, tag: str | None = None) -> list[str]:
+        """获取内存中的缓存键, 可按标签过滤"""
+        return self._cache.keys(tag)
+
+    def remove(self, key: str) -> bool:
+        """
+        删除缓存值
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            bool: 内存中是否存在该键
+        """
+        if self._backend is not None:
+            self._backend.remove(key)
+        return self._cache.remove(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        失效带有指定标签的缓存
+
+        Returns:
+            int: 失效的内存条目数量
+        """
+        if self._backend is not None:
+            self._backend.invalidate_tag(tag)
+        return self._cache.invalidate_by_tag(tag)
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        失效依赖指定表的缓存
+
+        Args:
+            tables: 被修改的表名, 包含ALL_TABLES时失效所有依赖表的缓存
+
+        Returns:
+            int: 失效的内存条目数量
+        """
+        tables = set(tables)
+        if ALL_TABLES in tables:
+            if self._backend is not None:
+                self._backend.invalidate_tag_prefix(TABLE_TAG_PREFIX)
+            return self._cache.invalidate_by_tag_prefix(TABLE_TAG_PREFIX)
+        return sum(self.invalidate_tag(table_tag(table)) for table in tables)
+
+    def evict_one(self) -> bool:
+        """按区域策略淘汰一个内存条目"""
+        return self._cache.evict_one()
+
+    def purge_expired(self) -> int:
+        """移除内存中的过期条目"""
+        return self._cache.purge_expired()
+
+    def clear(self) -> None:
+        """清空区域, 包括二级缓存"""
+        if self._backend is not None:
+            self._backend.clear()
+        self._cache.clear()
+        with self._stats_lock:
+            self._hits = self._misses = self._l2_hits = self._loads = 0
+            self._get_times.clear()
+            self._load_times.clear()
+
+    def get_statistics(self) -> RegionStatistics:
+        """
+        获取区域统计信息
+
+        Returns:
+            RegionStatistics: 统计信息
+        """
+        cache_stats = self._cache.get_statistics()
+        with self._stats_lock:
+            total = self._hits + self._misses
+            return RegionStatistics(
+                name=self.name,
+                entries=cache_stats.total_entries,
+                size_bytes=cache_stats.total_size_bytes,
+                max_size_bytes=self.max_size_bytes,
+                hits=self._hits,
+                misses=self._misses,
+                l2_hits=self._l2_hits,
+                evictions=cache_stats.eviction_count,
+                loads=self._loads,
+                hit_rate=self._hits / total * 100 if total else 0.0,
+                avg_get_time_ms=_average(self._get_times),
+                avg_load_time_ms=_average(self._load_times),
+            )
+
+    def _get_from_backend(self, key: str) -> Any:
+        """从二级缓存读取并提升到内存"""
+        try:
+            cached = self._backend.get(key)
+        except Exception as e:
+            self._logger.debug(f"二级缓存读取失败: {self.name}/{key}, {e}")
+            return _MISSING
+        if cached is None:
+            return _MISSING
+
+        value, expires_at, tags = cached
+        ttl = (
+            self._ttl
+            if expires_at is None
+            else timedelta(seconds=max(expires_at - time.time(), 0.001))
+        )
+        if self._cache.put(key, value, ttl, tags) and self._tier is not None:
+            self._tier.enforce_memory_limit()
+        return value
+
+
+class CacheNamespace:
+    """
+    缓存命名空间
+
+    共享区域中属于单个使用方的一组键. 键自动加上命名空间前缀,
+    并带有命名空间标签, 清空时只影响自己的条目.
+    """
+
+    def __init__(self, region: CacheRegion, name: str):
+        """
+        初始化命名空间
+
+        Args:
+            region: 所属区域
+            name: 命名空间名称
+        """
+        self.region = region
+        self.name = name
+        self._prefix = f"{name}:"
+        self._tag = f"{NAMESPACE_TAG_PREFIX}{name}"
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """获取缓存值"""
+        return self.region.get(self._prefix + key, default)
+
+    def put(
+        self,
+        key: str,
+        value: Any,
+        ttl: timedelta | None = None,
+        tags: Iterable[str] | None = None,
+        tables: Iterable[str] | None = None,
+        size_bytes: int | None = None,
+    ) -> bool:
+        """存储缓存值, 参数同CacheRegion.put"""
+        return self.region.put(
+            self._prefix + key,
+            value,
+            ttl,
+            {self._tag, *(tags or ())},
+            tables,
+            size_bytes,
+        )
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        ttl: timedelta | None = None,
+        tags: Iterable[str] | None = None,
+        tables: Iterable[str] | None = None,
+    ) -> Any:
+        """获取缓存值, 未命中时加载, 参数同CacheRegion.get_or_load"""
+        return self.region.get_or_load(
+            self._prefix + key, loader, ttl, {self._tag, *(tags or ())}, tables
+        )
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """查看缓存条目, 不影响统计"""
+        return self.region.peek(self._prefix + key)
+
+    def remove(self, key: str) -> bool:
+        """删除缓存值"""
+        return self.region.remove(self._prefix + key)
+
+    def keys(self) -> list[str]:
+        """获取命名空间内的缓存键(不含前缀)"""
+        start = len(self._prefix)
+        return [key[start:] for key in self.region.keys(self._tag)]
+
+    def clear(self) -> int:
+        """
+        清空命名空间内的缓存
+
+        Returns:
+            int: 清除的内存条目数量
+        """
+        return self.region.invalidate_tag(self._tag)
+
+    def __len__(self) -> int:
+        return len(self.region.keys(self._tag))
+
+
+class CacheTier:
+    """
+    统一缓存层
+
+    管理所有缓存区域, 负责全局内存上限和按表失效的分发.
+    """
+
+    def __init__(self, max_memory_mb: float = DEFAULT_MAX_MEMORY_MB):
+        """
+        初始化缓存层
+
+        Args:
+            max_memory_mb: 所有区域合计的内存上限(MB)
+        """
+        self._logger = logging.getLogger(__name__)
+        self._max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self._regions: dict[str, CacheRegion] = {}
+        self._lock = threading.RLock()
+        self._databases: list[Any] = []
+        self._global_evictions = 0
+
+    def create_region(
+        self,
+        name: str,
+        max_size_mb: float,
+        ttl: timedelta | None = None,
+        policy: str = CachePolicy.LRU,
+        backend: CacheBackend | None = None,
+        size_estimator: SizeEstimator | None = None,
+    ) -> CacheRegion:
+        """
+        创建缓存区域, 同名区域已存在时直接返回已有区域
+
+        区域配置以首次创建时为准, 之后传入的配置与已有区域不一致时记录警告.
+        需要不同生存时间的使用者应在写入时指定ttl.
+
+        Args:
+            name: 区域名称
+            max_size_mb: 区域字节预算(MB)
+            ttl: 默认生存时间
+            policy: 淘汰策略
+            backend: 二级缓存后端
+            size_estimator: 大小估算器
+
+        Returns:
+            CacheRegion: 缓存区域
+        """
+        with self._lock:
+            region = self._regions.get(name)
+            if region is None:
+                region = CacheRegion(
+                    name, max_size_mb, ttl, policy, backend, size_estimator, self
+                )
+                self._regions[name] = region
+                self._logger.debug(f"创建缓存区域: {name} ({max_size_mb}MB)")
+            else:
+                self._check_region_config(region, max_size_mb, ttl, policy, backend)
+            return region
+
+    def _check_region_config(
+        self,
+        region: CacheRegion,
+        max_size_mb: float,
+        ttl: timedelta | None,
+        policy: str,
+        backend: CacheBackend | None,
+    ) -> None:
+        """检查已有区域的配置是否与再次传入的一致, 不一致时记录警告"""
+        mismatched = []
+        if region.max_size_bytes != int(max_size_mb * 1024 * 1024):
+            mismatched.append(f"max_size_mb={max_size_mb}")
+        if region.ttl != (ttl or None):
+            mismatched.append(f"ttl={ttl}")
+        if region.policy != policy:
+            mismatched.append(f"policy={policy}")
+        if backend is not None and backend is not region.backend:
+            mismatched.append("backend")
+        if mismatched:
+            self._logger.warning(
+                f"缓存区域{region.name}已存在, 忽略不一致的配置: "
+                f"{', '.join(mismatched)}"
+            )
+
+    def region(self, name: str) -> CacheRegion:
+        """
+        获取缓存区域
+
+        Raises:
+            KeyError: 区域不存在
+        """
+        return self._regions[name]
+
+    def regions(self) -> list[CacheRegion]:
+        """获取所有缓存区域"""
+        with self._lock:
+            return list(self._regions.values())
+
+    @property
+    def size_bytes(self) -> int:
+        """所有区域合计占用的字节数"""
+        return sum(region.size_bytes for region in self.regions())
+
+    @property
+    def max_memory_bytes(self) -> int:
+        """全局内存上限"""
+        return self._max_memory_bytes
+
+    def set_max_memory(self, max_memory_mb: float) -> None:
+        """
+        设置全局内存上限, 立即淘汰超出部分
+
+        Args:
+            max_memory_mb: 内存上限(MB)
+        """
+        self._max_memory_bytes = int(max_memory_mb * 1024 * 1024)
+        self.enforce_memory_limit()
+
+    def enforce_memory_limit(self) -> int:
+        """
+        超出全局内存上限时跨区域淘汰
+
+        每次从占用/预算比例最高的区域淘汰一个条目, 直到总量回到上限以内.
+
+        Returns:
+            int: 淘汰的条目数量
+        """
+        evicted = 0
+        with self._lock:
+            regions = list(self._regions.values())
+            total = sum(region.size_bytes for region in regions)
+            while total > self._max_memory_bytes:
+                victim = max(
+                    regions,
+                    key=lambda region: (
+                        region.size_bytes / max(region.max_size_bytes, 1)
+                    ),
+                )
+                before = victim.size_bytes
+                if not victim.evict_one():
+                    break
+                total -= before - victim.size_bytes
+                evicted += 1
+            self._global_evictions += evicted
+        if evicted:
+            self._logger.debug(f"超出全局内存上限, 跨区域淘汰了 {evicted} 个条目")
+        return evicted
+
+    def invalidate_tables(self, tables: Iterable[str]) -> int:
+        """
+        失效所有区域中依赖指定表的缓存
+
+        签名与DatabaseManager写监听器一致, 可直接注册.
+
+        Args:
+            tables: 被修改的表名集合, 包含ALL_TABLES时失效所有依赖表的缓存
+
+        Returns:
+            int: 失效的内存条目数量
+        """
+        tables = frozenset(tables)
+        return sum(region.invalidate_tables(tables) for region in self.regions())
+
+    def invalidate_tag(self, tag: str) -> int:
+        """失效所有区域中带有指定标签的缓存"""
+        return sum(region.invalidate_tag(tag) for region in self.regions())
+
+    def attach_database(self, database_manager: Any) -> None:
+        """
+        订阅数据库管理器的写通知, 写入后自动按表失效
+
+        Args:
+            database_manager: 支持add_write_listener的数据库管理器
+        """
+        if not hasattr(database_manager, "add_write_listener"):
+            self._logger.warning("数据库管理器不支持写通知, 缓存仅按TTL过期")
+            return
+        with self._lock:
+            if database_manager in self._databases:
+                return
+            database_manager.add_write_listener(self.invalidate_tables)
+            self._databases.append(database_manager)
+
+    def detach_database(self, database_manager: Any) -> None:
+        """取消订阅数据库管理器的写通知"""
+        with self._lock:
+            if database_manager not in self._databases:
+                return
+            database_manager.remove_write_listener(self.invalidate_tables)
+            self._databases.remove(database_manager)
+
+    def get_statistics(self) -> dict[str, Any]:
+        """
+        获取缓存层统计信息
+
+        Returns:
+            Dict[str, Any]: 全局统计以及各区域统计
+        """
+        regions = {
+            region.name: asdict(region.get_statistics()) for region in self.regions()
+        }
+        return {
+            "max_memory_bytes": self._max_memory_bytes,
+            "total_size_bytes": sum(stats["size_bytes"] for stats in regions.values()),
+            "global_evictions": self._global_evictions,
+            "regions": regions,
+        }
+
+    def clear(self) -> None:
+        """清空所有区域"""
+        for region in self.regions():
+            region.clear()
+
+
+def _average(samples: deque[float]) -> float:
+    """计算样本平均值"""
+    return sum(samples) / len(samples) if samples else 0.0
+
+
+# 全局缓存层实例
+_cache_tier: CacheTier | None = None
+_cache_tier_lock = threading.Lock()
+
+
+def get_cache_tier() -> CacheTier:
+    """获取全局缓存层实例"""
+    global _cache_tier
+    if _cache_tier is None:
+        with _cache_tier_lock:
+            if _cache_tier is None:
+                _cache_tier = CacheTier()
+    return _cache_tier
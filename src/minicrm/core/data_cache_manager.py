@@ -7,19 +7,100 @@ MiniCRM 数据缓存管理器
 - 缓存失效和更新
 - 分布式缓存支持
 - 缓存性能监控
+
+淘汰和容量记账均为O(1):
+- 运行中的字节计数器, 存取时不再遍历全部条目
+- 可插拔的廉价大小估算器, 大列表按样本推算, 不做pickle序列化
+- LRU基于OrderedDict的move_to_end/popitem
+- LFU为近似实现, 按(封顶的)访问频率分桶, 桶内按LRU淘汰
 """
 
 import logging
-import pickle
+import sys
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from itertools import islice
 from threading import RLock
 from typing import Any
 
 
+# 大小估算器: 接收缓存值, 返回估算的字节数
+SizeEstimator = Callable[[Any], int]
+
+# 估算容器大小时抽样的元素个数
+_SIZE_SAMPLE_COUNT = 16
+
+# 估算嵌套容器时的最大递归深度
+_SIZE_MAX_DEPTH = 3
+
+# LFU访问频率上限, 频率封顶后保证淘汰时扫描的桶数为常数
+_LFU_MAX_FREQUENCY = 32
+
+# 保留的访问耗时样本数
+_ACCESS_TIME_SAMPLES = 1000
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    廉价估算值占用的内存字节数
+
+    标量直接使用sys.getsizeof; 列表、元组、集合和字典只抽样前若干个元素,
+    按平均大小推算整体, 因此对上万行的查询结果也是常数开销.
+
+    Args:
+        value: 要估算的值
+
+    Returns:
+        int: 估算的字节数
+    """
+    size = sys.getsizeof(value, 64)
+
+    if value is None or isinstance(value, bool | int | float | str | bytes):
+        return size
+    if _depth >= _SIZE_MAX_DEPTH:
+        return size
+
+    if isinstance(value, dict):
+        count = len(value)
+        if count == 0:
+            return size
+        sampled = 0
+        sample_count = 0
+        for item_key, item_value in islice(value.items(), _SIZE_SAMPLE_COUNT):
+            sampled += estimate_size(item_key, _depth + 1)
+            sampled += estimate_size(item_value, _depth + 1)
+            sample_count += 1
+        return size + sampled * count // sample_count
+
+    if isinstance(value, list | tuple | set | frozenset | deque):
+        count = len(value)
+        if count == 0:
+            return size
+        sampled = 0
+        sample_count = 0
+        for item in islice(value, _SIZE_SAMPLE_COUNT):
+            sampled += estimate_size(item, _depth + 1)
+            sample_count += 1
+        return size + sampled * count // sample_count
+
+    # 普通对象按实例属性估算
+    attributes = getattr(value, "__dict__", None)
+    if isinstance(attributes, dict):
+        return size + estimate_size(attributes, _depth + 1)
+
+    # 使用__slots__的对象(如数据模型)按槽中的属性估算
+    for klass in type(value).__mro__:
+        slots = getattr(klass, "__slots__", ())
+        for name in (slots,) if isinstance(slots, str) else slots:
+            slot_value = getattr(value, name, None)
+            size += estimate_size(slot_value, _depth + 1)
+
+    return size
+
+
 @dataclass
 class CacheEntry:
     """缓存条目"""
@@ -71,6 +152,7 @@ class DataCacheManager:
         max_size_mb: float = 100.0,
         default_ttl_minutes: int = 30,
         cache_policy: str = CachePolicy.LRU,
+        size_estimator: SizeEstimator | None = None,
     ):
         """
         初始化数据缓存管理器
@@ -79,6 +161,7 @@ class DataCacheManager:
             max_size_mb: 最大缓存大小(MB)
             default_ttl_minutes: 默认TTL(分钟)
             cache_policy: 缓存策略
+            size_estimator: 默认大小估算器, 为None时使用estimate_size
         """
         self._logger = logging.getLogger(__name__)
 
@@ -90,6 +173,15 @@ class DataCacheManager:
         # 缓存存储
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
         self._cache_lock = RLock()
+        self._current_size_bytes = 0
+
+        # 大小估算器
+        self._size_estimator: SizeEstimator = size_estimator or estimate_size
+        self._size_estimators: dict[type, SizeEstimator] = {}
+
+        # LFU频率桶: 频率 -> 按最近访问排序的键集合
+        self._frequency_buckets: dict[int, OrderedDict[str, None]] = {}
+        self._min_frequency = 0
 
         # 索引和标签
         self._tag_index: dict[str, set[str]] = {}  # 标签到键的映射
@@ -97,7 +189,7 @@ class DataCacheManager:
 
         # 统计信息
         self._stats = CacheStatistics()
-        self._access_times: list[float] = []
+        self._access_times: deque[float] = deque(maxlen=_ACCESS_TIME_SAMPLES)
 
         # 回调函数
         self._eviction_callbacks: list[Callable[[str, Any], None]] = []
@@ -128,6 +220,7 @@ class DataCacheManager:
         ttl: timedelta | None = None,
         tags: set[str] | None = None,
         dependencies: set[str] | None = None,
+        size_bytes: int | None = None,
     ) -> bool:
         """
         存储数据到缓存
@@ -138,6 +231,7 @@ class DataCacheManager:
             ttl: 生存时间
             tags: 标签集合
             dependencies: 依赖键集合
+            size_bytes: 调用方已知的数据大小, 提供时跳过估算
 
         Returns:
             bool: 是否成功存储
@@ -148,7 +242,12 @@ class DataCacheManager:
         try:
             with self._cache_lock:
                 # 计算数据大小
-                size_bytes = self._calculate_size(value)
+                if size_bytes is None:
+                    size_bytes = self._calculate_size(value)
+
+                # 如果键已存在,先释放旧条目占用的空间和索引
+                if key in self._cache:
+                    self._detach_entry(key)
 
                 # 检查是否需要腾出空间
                 if not self._ensure_space(size_bytes):
@@ -168,19 +267,19 @@ class DataCacheManager:
                     dependencies=dependencies or set(),
                 )
 
-                # 如果键已存在,先清理旧的索引
-                if key in self._cache:
-                    self._remove_from_indexes(key)
-
                 # 存储到缓存
                 self._cache[key] = entry
+                self._current_size_bytes += size_bytes
+                if self._cache_policy == CachePolicy.LFU:
+                    self._add_to_frequency_bucket(key, 0)
+                    self._min_frequency = 0
 
                 # 更新索引
                 self._update_indexes(key, entry)
 
                 # 更新统计
                 self._stats.total_entries = len(self._cache)
-                self._stats.total_size_bytes += size_bytes
+                self._stats.total_size_bytes = self._current_size_bytes
 
                 self._logger.debug(f"缓存存储成功: {key} ({size_bytes} bytes)")
                 return True
@@ -252,6 +351,8 @@ class DataCacheManager:
                 if self._cache_policy == CachePolicy.LRU:
                     # 移动到末尾(最近使用)
                     self._cache.move_to_end(key)
+                elif self._cache_policy == CachePolicy.LFU:
+                    self._promote_frequency(key, entry.access_count)
 
                 # 更新统计
                 self._stats.hit_count += 1
@@ -267,8 +368,6 @@ class DataCacheManager:
             # 记录访问时间
             access_time = (time.perf_counter() - start_time) * 1000
             self._access_times.append(access_time)
-            if len(self._access_times) > 1000:
-                self._access_times = self._access_times[-1000:]
 
     def remove(self, key: str) -> bool:
         """
@@ -352,6 +451,94 @@ class DataCacheManager:
             self._logger.error(f"根据依赖失效缓存失败: {dependency}, 错误: {e}")
             return 0
 
+    def invalidate_by_tag_prefix(self, prefix: str) -> int:
+        """
+        失效所有标签以指定前缀开头的缓存
+
+        Args:
+            prefix: 标签前缀
+
+        Returns:
+            int: 失效的条目数量
+        """
+        with self._cache_lock:
+            keys_to_remove: set[str] = set()
+            for tag, keys in self._tag_index.items():
+                if tag.startswith(prefix):
+                    keys_to_remove.update(keys)
+
+            for key in keys_to_remove:
+                self._remove_entry(key)
+
+            return len(keys_to_remove)
+
+    def evict_one(self) -> bool:
+        """
+        按缓存策略淘汰一个条目, 供外部的全局内存上限使用
+
+        Returns:
+            bool: 是否淘汰了条目
+        """
+        with self._cache_lock:
+            if not self._cache:
+                return False
+            self._remove_entry(self._select_victim())
+            self._stats.eviction_count += 1
+            return True
+
+    def purge_expired(self) -> int:
+        """
+        移除所有过期条目
+
+        Returns:
+            int: 移除的条目数量
+        """
+        with self._cache_lock:
+            expired_keys = [
+                key for key, entry in self._cache.items() if self._is_expired(entry)
+            ]
+            for key in expired_keys:
+                self._remove_entry(key)
+            return len(expired_keys)
+
+    def keys(self, tag: str | None = None) -> list[str]:
+        """
+        获取缓存键
+
+        Args:
+            tag: 只返回带有该标签的键, 为None时返回全部
+
+        Returns:
+            List[str]: 缓存键列表
+        """
+        with self._cache_lock:
+            if tag is None:
+                return list(self._cache)
+            return list(self._tag_index.get(tag, ()))
+
+    def peek(self, key: str) -> CacheEntry | None:
+        """
+        查看缓存条目, 不更新访问信息和统计
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            CacheEntry | None: 缓存条目, 不存在时返回None
+        """
+        with self._cache_lock:
+            return self._cache.get(key)
+
+    @property
+    def size_bytes(self) -> int:
+        """当前缓存占用的字节数"""
+        return self._current_size_bytes
+
+    @property
+    def max_size_bytes(self) -> int:
+        """缓存的字节上限"""
+        return self._max_size_bytes
+
     def clear(self) -> None:
         """清空所有缓存"""
         try:
@@ -368,6 +555,9 @@ class DataCacheManager:
                 self._cache.clear()
                 self._tag_index.clear()
                 self._dependency_index.clear()
+                self._frequency_buckets.clear()
+                self._min_frequency = 0
+                self._current_size_bytes = 0
 
                 # 重置统计
                 self._stats = CacheStatistics()
@@ -400,14 +590,12 @@ class DataCacheManager:
                         self._access_times
                     )
 
-                # 计算内存使用
-                self._stats.memory_usage_mb = self._stats.total_size_bytes / 1024 / 1024
-
                 # 更新当前状态
                 self._stats.total_entries = len(self._cache)
-                self._stats.total_size_bytes = sum(
-                    entry.size_bytes for entry in self._cache.values()
-                )
+                self._stats.total_size_bytes = self._current_size_bytes
+
+                # 计算内存使用
+                self._stats.memory_usage_mb = self._stats.total_size_bytes / 1024 / 1024
 
                 return self._stats
 
@@ -415,6 +603,21 @@ class DataCacheManager:
             self._logger.error(f"获取缓存统计失败: {e}")
             return CacheStatistics()
 
+    def register_size_estimator(
+        self, value_type: type, estimator: SizeEstimator
+    ) -> None:
+        """
+        注册指定类型的大小估算器
+
+        按值的精确类型查找, 未注册的类型使用默认估算器.
+
+        Args:
+            value_type: 值类型
+            estimator: 估算函数, 返回字节数
+        """
+        self._size_estimators[value_type] = estimator
+        self._logger.debug(f"注册大小估算器: {value_type.__name__}")
+
     def register_preload_pattern(
         self, pattern: str, loader: Callable[[str], Any]
     ) -> None:
@@ -523,17 +726,16 @@ class DataCacheManager:
                     self._remove_entry(key)
                     optimization_results["unused_entries_removed"] += 1
 
-                # 3. 重新组织缓存(对于OrderedDict,重新排序)
+                # 3. 清理LFU中的空频率桶
                 if self._cache_policy == CachePolicy.LFU:
-                    # 按访问频率重新排序
-                    sorted_items = sorted(
-                        self._cache.items(),
-                        key=lambda x: x[1].access_count,
-                        reverse=True,
-                    )
-                    self._cache.clear()
-                    self._cache.update(sorted_items)
-                    optimization_results["fragmentation_reduced"] = True
+                    empty_buckets = [
+                        frequency
+                        for frequency, bucket in self._frequency_buckets.items()
+                        if not bucket
+                    ]
+                    for frequency in empty_buckets:
+                        del self._frequency_buckets[frequency]
+                    optimization_results["fragmentation_reduced"] = bool(empty_buckets)
 
                 self._logger.info(f"缓存优化完成: {optimization_results}")
                 return optimization_results
@@ -544,73 +746,63 @@ class DataCacheManager:
 
     def _calculate_size(self, value: Any) -> int:
         """计算值的大小"""
+        estimator = self._size_estimators.get(type(value), self._size_estimator)
         try:
-            # 使用pickle序列化来估算大小
-            return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
-        except Exception:
-            # 如果无法序列化,使用简单估算
-            if isinstance(value, str):
-                return len(value.encode("utf-8"))
-            elif isinstance(value, list | tuple):
-                return sum(self._calculate_size(item) for item in value)
-            elif isinstance(value, dict):
-                return sum(
-                    self._calculate_size(k) + self._calculate_size(v)
-                    for k, v in value.items()
-                )
-            else:
-                return 100  # 默认估算值
+            return max(0, int(estimator(value)))
+        except Exception as e:
+            self._logger.debug(f"大小估算失败, 使用默认值: {e}")
+            return 100  # 默认估算值
 
     def _ensure_space(self, required_bytes: int) -> bool:
         """确保有足够的空间"""
-        current_size = sum(entry.size_bytes for entry in self._cache.values())
-
-        if current_size + required_bytes <= self._max_size_bytes:
-            return True
-
-        # 需要腾出空间
-        bytes_to_free = current_size + required_bytes - self._max_size_bytes
-        freed_bytes = 0
-
-        # 根据策略选择要移除的条目
-        if self._cache_policy == CachePolicy.LRU:
-            # 移除最近最少使用的条目
-            keys_to_remove = []
-            for key in self._cache:
-                if freed_bytes >= bytes_to_free:
-                    break
-                entry = self._cache[key]
-                keys_to_remove.append(key)
-                freed_bytes += entry.size_bytes
-
-        elif self._cache_policy == CachePolicy.LFU:
-            # 移除使用频率最低的条目
-            sorted_entries = sorted(
-                self._cache.items(), key=lambda x: x[1].access_count
-            )
-            keys_to_remove = []
-            for key, entry in sorted_entries:
-                if freed_bytes >= bytes_to_free:
-                    break
-                keys_to_remove.append(key)
-                freed_bytes += entry.size_bytes
-
-        else:
-            # 默认FIFO策略
-            keys_to_remove = []
-            for key in self._cache:
-                if freed_bytes >= bytes_to_free:
-                    break
-                entry = self._cache[key]
-                keys_to_remove.append(key)
-                freed_bytes += entry.size_bytes
+        if required_bytes > self._max_size_bytes:
+            return False
 
-        # 移除选中的条目
-        for key in keys_to_remove:
-            self._remove_entry(key)
+        # 逐个淘汰, 每次选择淘汰对象均为O(1)
+        while (
+            self._cache
+            and self._current_size_bytes + required_bytes > self._max_size_bytes
+        ):
+            self._remove_entry(self._select_victim())
             self._stats.eviction_count += 1
 
-        return freed_bytes >= bytes_to_free
+        return self._current_size_bytes + required_bytes <= self._max_size_bytes
+
+    def _select_victim(self) -> str:
+        """根据策略选择要淘汰的键"""
+        if self._cache_policy == CachePolicy.LFU:
+            # 频率有上限, 向上查找非空桶的次数为常数
+            for frequency in range(self._min_frequency, _LFU_MAX_FREQUENCY + 1):
+                bucket = self._frequency_buckets.get(frequency)
+                if bucket:
+                    self._min_frequency = frequency
+                    return next(iter(bucket))
+
+        # LRU: 头部为最近最少使用; FIFO/TTL/SIZE: 头部为最早写入
+        return next(iter(self._cache))
+
+    def _add_to_frequency_bucket(self, key: str, frequency: int) -> None:
+        """将键加入指定频率桶"""
+        bucket = self._frequency_buckets.get(frequency)
+        if bucket is None:
+            bucket = OrderedDict()
+            self._frequency_buckets[frequency] = bucket
+        bucket[key] = None
+
+    def _promote_frequency(self, key: str, access_count: int) -> None:
+        """访问后将键移动到更高的频率桶"""
+        new_frequency = min(access_count, _LFU_MAX_FREQUENCY)
+        old_frequency = min(access_count - 1, _LFU_MAX_FREQUENCY)
+
+        bucket = self._frequency_buckets.get(old_frequency)
+        if bucket is not None:
+            bucket.pop(key, None)
+            if not bucket:
+                del self._frequency_buckets[old_frequency]
+                if self._min_frequency == old_frequency:
+                    self._min_frequency = new_frequency
+
+        self._add_to_frequency_bucket(key, new_frequency)
 
     def _remove_entry(self, key: str) -> None:
         """移除缓存条目"""
@@ -626,11 +818,26 @@ class DataCacheManager:
             except Exception as e:
                 self._logger.error(f"驱逐回调失败: {e}")
 
+        self._detach_entry(key)
+
+    def _detach_entry(self, key: str) -> None:
+        """从缓存、索引和频率桶中移除条目并释放计数, 不触发回调"""
         # 从索引中移除
         self._remove_from_indexes(key)
 
         # 从缓存中移除
-        del self._cache[key]
+        entry = self._cache.pop(key)
+        self._current_size_bytes -= entry.size_bytes
+        self._stats.total_entries = len(self._cache)
+        self._stats.total_size_bytes = self._current_size_bytes
+
+        if self._cache_policy == CachePolicy.LFU:
+            frequency = min(entry.access_count, _LFU_MAX_FREQUENCY)
+            bucket = self._frequency_buckets.get(frequency)
+            if bucket is not None:
+                bucket.pop(key, None)
+                if not bucket:
+                    del self._frequency_buckets[frequency]
 
     def _update_indexes(self, key: str, entry: CacheEntry) -> None:
         """更新索引"""
@@ -7,6 +7,7 @@ MiniCRM 依赖注入容器
 - 统一的依赖管理
 """
 
+import importlib
 import logging
 from collections.abc import Callable
 from typing import Any, TypeVar
@@ -25,6 +26,7 @@ class DIContainer:
     - 单例模式
     - 工厂模式
     - 接口绑定
+    - 延迟加载(首次解析时才导入实现模块)
     - 生命周期管理
     """
 
@@ -34,6 +36,7 @@ class DIContainer:
         self._factories: dict[str, Callable] = {}
         self._singletons: dict[str, Any] = {}
         self._bindings: dict[type, type] = {}
+        self._lazy: dict[str, str] = {}
         self._logger = logging.getLogger(__name__)
 
     def register_singleton(self, interface: type[T], implementation: type[T]) -> None:
@@ -72,6 +75,35 @@ class DIContainer:
         self._factories[key] = factory
         self._logger.debug(f"注册工厂方法: {key}")
 
+    def register_lazy(
+        self, interface: type[T] | str, target: str | None = None
+    ) -> None:
+        """
+        注册延迟加载的单例服务
+
+        实现类以"模块路径:类名"给出, 首次解析时才导入其模块并创建实例,
+        启动时用不到的服务及其依赖的重量级库不会被加载.
+
+        Args:
+            interface: 接口类型; 为字符串时表示具体类路径, 按具体类本身注册
+            target: 实现类路径, 格式为"模块路径:类名"
+
+        Raises:
+            DependencyError: 实现类路径格式无效
+        """
+        if isinstance(interface, str):
+            target = interface
+            key = interface.replace(":", ".")
+        else:
+            key = self._get_key(interface)
+
+        module_name, _, class_name = (target or "").partition(":")
+        if not module_name or not class_name:
+            raise DependencyError(f"无效的延迟加载路径: {target}")
+
+        self._lazy[key] = target
+        self._logger.debug(f"注册延迟加载服务: {key} -> {target}")
+
     def register_instance(self, interface: type[T], instance: T) -> None:
         """
         注册实例
@@ -110,6 +142,13 @@ class DIContainer:
                 self._singletons[key] = instance
                 return instance
 
+            # 检查是否有延迟加载的实现
+            if key in self._lazy:
+                implementation = self._load_lazy_target(self._lazy[key])
+                instance = self._create_instance(implementation)
+                self._singletons[key] = instance
+                return instance
+
             # 检查是否有绑定的实现
             if interface in self._bindings:
                 implementation = self._bindings[interface]
@@ -123,6 +162,12 @@ class DIContainer:
             self._logger.error(f"依赖解析失败: {interface}, 错误: {e}")
             raise DependencyError(f"依赖解析失败: {interface}") from e
 
+    @staticmethod
+    def _load_lazy_target(target: str) -> type:
+        """导入"模块路径:类名"指向的实现类"""
+        module_name, _, class_name = target.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)
+
     def _create_instance(self, implementation: type[T]) -> T:
         """
         创建实例
@@ -165,6 +210,15 @@ class DIContainer:
                         self._logger.warning(f"跳过字符串类型注解: {param_name}: {param_type}")
                         continue
 
+                    # 可选依赖(X | None 且有默认值): 已注册时注入,否则使用默认值
+                    if param.default is not inspect.Parameter.empty:
+                        optional_type = self._unwrap_optional(param_type)
+                        if optional_type is None or not self.is_registered(
+                            optional_type
+                        ):
+                            continue
+                        param_type = optional_type
+
                     # 递归解析依赖
                     dependency = self.resolve(param_type)
                     kwargs[param_name] = dependency
@@ -175,6 +229,35 @@ class DIContainer:
             self._logger.error(f"创建实例失败: {implementation}, 错误: {e}")
             raise DependencyError(f"创建实例失败: {implementation}") from e
 
+    def is_registered(self, interface: type) -> bool:
+        """
+        检查接口是否已注册
+
+        Args:
+            interface: 接口类型
+
+        Returns:
+            bool: 是否已注册实例、工厂方法、延迟加载实现或实现
+        """
+        key = self._get_key(interface)
+        return (
+            key in self._singletons
+            or key in self._factories
+            or key in self._lazy
+            or interface in self._bindings
+        )
+
+    @staticmethod
+    def _unwrap_optional(param_type: Any) -> type | None:
+        """从X | None注解中取出X, 其他注解原样返回, 无法确定时返回None"""
+        import types
+        from typing import Union, get_args, get_origin
+
+        if get_origin(param_type) in (Union, types.UnionType):
+            candidates = [arg for arg in get_args(param_type) if arg is not type(None)]
+            return candidates[0] if len(candidates) == 1 else None
+        return param_type if isinstance(param_type, type) else None
+
     def _get_key(self, interface: type) -> str:
         """
         获取接口的键名
@@ -193,6 +276,7 @@ class DIContainer:
         self._factories.clear()
         self._singletons.clear()
         self._bindings.clear()
+        self._lazy.clear()
         self._logger.debug("依赖注入容器已清理")
 
 
@@ -228,24 +312,33 @@ def configure_dependencies():
         ICustomerService,
         ISupplierService,
     )
-    from minicrm.data.dao.customer_dao import CustomerDAO
-    from minicrm.data.dao.supplier_dao import SupplierDAO
     from minicrm.data.database import DatabaseManager
-    from minicrm.services.analytics_service import AnalyticsService
-    from minicrm.services.customer_service import CustomerService
-    from minicrm.services.supplier_service import SupplierService
 
     # 注册数据库管理器(最底层)
     container.register_singleton(DatabaseManager, DatabaseManager)
 
-    # 注册DAO层(依赖DatabaseManager)
-    container.register_singleton(ICustomerDAO, CustomerDAO)
-    container.register_singleton(ISupplierDAO, SupplierDAO)
+    # 注册DAO层(依赖DatabaseManager), 实现模块在首次解析时导入
+    container.register_lazy(ICustomerDAO, "minicrm.data.dao.customer_dao:CustomerDAO")
+    container.register_lazy(ISupplierDAO, "minicrm.data.dao.supplier_dao:SupplierDAO")
+    for target in (
+        "minicrm.data.dao.customer_score_dao:CustomerScoreDAO",
+        "minicrm.data.dao.metric_rollup_dao:MetricRollupDAO",
+        "minicrm.data.dao.analytics_snapshot_dao:AnalyticsSnapshotDAO",
+        "minicrm.data.dao.financial_risk_dao:FinancialRiskDAO",
+        "minicrm.data.dao.table_stats_dao:TableStatsDAO",
+    ):
+        container.register_lazy(target)
 
     # 注册Service层(依赖DAO层)
-    container.register_singleton(ICustomerService, CustomerService)
-    container.register_singleton(ISupplierService, SupplierService)
-    container.register_singleton(IAnalyticsService, AnalyticsService)
+    container.register_lazy(
+        ICustomerService, "minicrm.services.customer_service:CustomerService"
+    )
+    container.register_lazy(
+        ISupplierService, "minicrm.services.supplier_service:SupplierService"
+    )
+    container.register_lazy(
+        IAnalyticsService, "minicrm.services.analytics_service:AnalyticsService"
+    )
 
     # UI层将通过构造函数注入Service层依赖
 
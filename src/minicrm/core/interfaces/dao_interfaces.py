@@ -8,8 +8,11 @@
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterator
 from typing import Any
 
+from transfunctions.data_operations import DEFAULT_CHUNK_SIZE
+
 
 class IBaseDAO(ABC):
     """基础数据访问对象接口"""
@@ -105,6 +108,108 @@ class IBaseDAO(ABC):
         """
         pass
 
+    def insert_many(
+        self, records: list[dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        批量插入数据
+
+        默认实现逐条调用insert, 基于executemany的DAO应覆盖此方法.
+
+        Args:
+            records: 要插入的数据列表
+            chunk_size: 每块记录数
+
+        Returns:
+            List[int]: 新插入记录的ID, 与records顺序一致
+        """
+        return [self.insert(data) for data in records]
+
+    def update_many(
+        self,
+        updates: list[tuple[int, dict[str, Any]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        批量更新记录
+
+        默认实现逐条调用update, 基于executemany的DAO应覆盖此方法.
+
+        Args:
+            updates: (记录ID, 更新数据)列表
+            chunk_size: 每块记录数
+
+        Returns:
+            int: 更新的记录数
+        """
+        return sum(1 for record_id, data in updates if self.update(record_id, data))
+
+    def delete_many(
+        self, record_ids: list[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """
+        批量删除记录
+
+        默认实现逐条调用delete, 按块删除的DAO应覆盖此方法.
+
+        Args:
+            record_ids: 记录ID列表
+            chunk_size: 每块记录数
+
+        Returns:
+            int: 删除的记录数
+        """
+        return sum(1 for record_id in record_ids if self.delete(record_id))
+
+    def stream_batches(
+        self,
+        conditions: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        按批次流式读取记录
+
+        默认实现基于search分页, 基于游标的DAO应覆盖此方法.
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+            batch_size: 每批记录数
+
+        Yields:
+            List[Dict[str, Any]]: 每批记录
+        """
+        offset = 0
+        while True:
+            batch = self.search(conditions, order_by, batch_size, offset)
+            if not batch:
+                return
+            yield batch
+            if len(batch) < batch_size:
+                return
+            offset += batch_size
+
+    def stream(
+        self,
+        conditions: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        逐条流式读取记录
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+            batch_size: 底层读取的批次大小
+
+        Yields:
+            Dict[str, Any]: 记录数据
+        """
+        for batch in self.stream_batches(conditions, order_by, batch_size):
+            yield from batch
+
 
 class ICustomerDAO(IBaseDAO):
     """客户数据访问对象接口"""
@@ -19,9 +19,17 @@ from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+from .cache_tier import get_cache_tier
 from .data_cache_manager import data_cache_manager
 
 
+# 分页结果缓存区域
+PAGES_REGION = "pages"
+
+# 分页结果缓存区域的字节预算(MB)
+PAGES_REGION_SIZE_MB = 32.0
+
+
 @dataclass
 class LoadingTask:
     """加载任务"""
@@ -52,6 +60,7 @@ class LazyLoadConfig:
     preload_enabled: bool = True
     preload_threshold: int = 10  # 距离边界多少项时开始预加载
     timeout_seconds: int = 30
+    page_cache_ttl_minutes: int = 30
 
 
 @dataclass
@@ -103,8 +112,16 @@ class LazyLoadingManager:
         self._loaders: dict[str, Callable] = {}
         self._loader_configs: dict[str, dict[str, Any]] = {}
 
-        # 分页管理
-        self._page_cache: dict[str, dict[int, Any]] = {}
+        # 分页管理, 页面缓存存放在统一缓存层的分页区域中, 按加载器打标签
+        self._page_cache = (
+            get_cache_tier()
+            .create_region(
+                PAGES_REGION,
+                PAGES_REGION_SIZE_MB,
+                timedelta(minutes=self._config.page_cache_ttl_minutes),
+            )
+            .namespace()
+        )
         self._page_sizes: dict[str, int] = {}
         self._total_counts: dict[str, int] = {}
 
@@ -264,12 +281,10 @@ class LazyLoadingManager:
             )
 
             # 检查页面缓存
-            if (
-                loader_name in self._page_cache
-                and page in self._page_cache[loader_name]
-            ):
+            cached_page = self._page_cache.get(self._page_key(loader_name, page))
+            if cached_page is not None:
                 future = Future()
-                future.set_result(self._page_cache[loader_name][page])
+                future.set_result(cached_page)
                 return future
 
             # 计算偏移量
@@ -295,9 +310,12 @@ class LazyLoadingManager:
             def cache_page_result(fut):
                 try:
                     result = fut.result()
-                    if loader_name not in self._page_cache:
-                        self._page_cache[loader_name] = {}
-                    self._page_cache[loader_name][page] = result
+                    self._page_cache.put(
+                        self._page_key(loader_name, page),
+                        result,
+                        timedelta(minutes=self._config.page_cache_ttl_minutes),
+                        tags=(self._loader_tag(loader_name),),
+                    )
 
                     # 触发预加载
                     if self._config.preload_enabled:
@@ -414,8 +432,7 @@ class LazyLoadingManager:
         try:
             if loader_name:
                 # 清空特定加载器的页面缓存
-                if loader_name in self._page_cache:
-                    del self._page_cache[loader_name]
+                self._page_cache.region.invalidate_tag(self._loader_tag(loader_name))
 
                 # 清空相关的数据缓存
                 # 这里需要根据实际情况实现缓存键的匹配
@@ -627,6 +644,14 @@ class LazyLoadingManager:
         content = f"{loader_name}_{args}_{kwargs}_{time.time()}"
         return hashlib.md5(content.encode()).hexdigest()[:12]
 
+    def _page_key(self, loader_name: str, page: int) -> str:
+        """生成页面缓存键"""
+        return f"{loader_name}:{page}"
+
+    def _loader_tag(self, loader_name: str) -> str:
+        """生成加载器的页面缓存标签"""
+        return f"{self._page_cache.name}/loader:{loader_name}"
+
     def _record_access_pattern(self, loader_name: str, page: int) -> None:
         """记录访问模式"""
         self._access_patterns[loader_name].append(page)
@@ -659,10 +684,7 @@ class LazyLoadingManager:
 
             # 创建预加载任务
             for page in next_pages:
-                if (
-                    loader_name in self._page_cache
-                    and page in self._page_cache[loader_name]
-                ):
+                if self._page_cache.peek(self._page_key(loader_name, page)):
                     continue  # 已缓存,跳过
 
                 # 创建预加载任务
@@ -10,8 +10,6 @@ from contextlib import contextmanager
 from functools import wraps
 from typing import Any
 
-import psutil
-
 
 class MemoryManager:
     """内存管理器 - 监控和优化内存使用"""
@@ -21,11 +19,29 @@ class MemoryManager:
     ):
         self.warning_threshold = warning_threshold_mb * 1024 * 1024  # 转换为字节
         self.critical_threshold = critical_threshold_mb * 1024 * 1024
-        self.process = psutil.Process()
-        self.baseline_memory = self.get_memory_usage()
+        self._process = None
+        self._baseline_memory: dict[str, float] | None = None
+
+    @property
+    def process(self):
+        """当前进程句柄, 首次使用时才导入psutil"""
+        if self._process is None:
+            import psutil
+
+            self._process = psutil.Process()
+        return self._process
+
+    @property
+    def baseline_memory(self) -> dict[str, float]:
+        """首次读取时记录的基线内存使用情况"""
+        if self._baseline_memory is None:
+            self._baseline_memory = self.get_memory_usage()
+        return self._baseline_memory
 
     def get_memory_usage(self) -> dict[str, float]:
         """获取当前内存使用情况"""
+        import psutil
+
         memory_info = self.process.memory_info()
         return {
             "rss_mb": memory_info.rss / 1024 / 1024,
@@ -167,6 +183,8 @@ def performance_monitor(func_name: str | None = None):
 
         @wraps(func)
         def wrapper(*args, **kwargs):
+            import psutil
+
             start_time = time.time()
             start_memory = psutil.Process().memory_info().rss
 
@@ -9,15 +9,25 @@ MiniCRM 性能监控系统
 """
 
 import functools
+import itertools
 import logging
+import threading
 import time
+from collections import deque
 from collections.abc import Callable
-from contextlib import contextmanager
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
-import psutil
+
+# 默认保存的最近指标数量
+DEFAULT_MAX_METRICS = 1000
+# 默认每隔多少次监控操作读取一次进程内存
+DEFAULT_MEMORY_SAMPLE_INTERVAL = 100
+
+# 禁用监控时复用的空上下文管理器
+_DISABLED_CONTEXT = nullcontext()
 
 
 @dataclass
@@ -27,7 +37,7 @@ class PerformanceMetric:
     operation: str
     start_time: datetime
     end_time: datetime
-    duration: float  # 毫秒
+    duration: float  # 秒
     memory_before: float  # MB
     memory_after: float  # MB
     memory_delta: float  # MB
@@ -39,11 +49,129 @@ class PerformanceMetric:
         return self.duration * 1000
 
 
+class LatencyHistogram:
+    """
+    对数线性分桶的耗时直方图
+
+    与HDR Histogram相同的分桶方式: 以微秒为单位, 小于2^SUB_BUCKET_BITS的值
+    每个值一个桶, 更大的值按二进制位数分段, 每段再等分为2^(SUB_BUCKET_BITS-1)个桶,
+    相对误差不超过1/64. 记录只需整数位运算, 内存占用与调用次数无关.
+    """
+
+    SUB_BUCKET_BITS = 7
+
+    __slots__ = ("_counts", "count", "total", "min", "max")
+
+    def __init__(self):
+        """初始化空直方图"""
+        self._counts: dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float) -> None:
+        """
+        记录一次耗时
+
+        Args:
+            seconds: 耗时(秒)
+        """
+        micros = int(seconds * 1_000_000)
+        shift = max(micros.bit_length() - self.SUB_BUCKET_BITS, 0)
+        key = (shift << self.SUB_BUCKET_BITS) | (micros >> shift)
+        self._counts[key] = self._counts.get(key, 0) + 1
+
+        if self.count == 0 or seconds < self.min:
+            self.min = seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.count += 1
+        self.total += seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        计算百分位耗时
+
+        Args:
+            percent: 百分位(0-100)
+
+        Returns:
+            float: 耗时(秒), 为所在桶的中点并限制在最小值和最大值之间
+        """
+        if self.count == 0:
+            return 0.0
+        rank = max(1, -(-self.count * percent // 100))
+        seen = 0
+        mask = (1 << self.SUB_BUCKET_BITS) - 1
+        for key in sorted(self._counts):
+            seen += self._counts[key]
+            if seen >= rank:
+                shift = key >> self.SUB_BUCKET_BITS
+                lower = (key & mask) << shift
+                middle = (lower + ((1 << shift) - 1) / 2) / 1_000_000
+                return min(max(middle, self.min), self.max)
+        return self.max
+
+
+class _OperationStats:
+    """单个操作的累计统计"""
+
+    __slots__ = ("histogram", "memory_delta_total", "memory_samples", "last_start")
+
+    def __init__(self):
+        self.histogram = LatencyHistogram()
+        self.memory_delta_total = 0.0
+        self.memory_samples = 0
+        self.last_start = 0.0
+
+
+class _MonitoredOperation:
+    """monitor_operation返回的上下文管理器, 只在进入和退出时读取计时器"""
+
+    __slots__ = ("_monitor", "_operation", "_metadata", "_wall", "_start", "_memory")
+
+    def __init__(
+        self, monitor: "PerformanceMonitor", operation: str, metadata: dict[str, Any]
+    ):
+        self._monitor = monitor
+        self._operation = operation
+        self._metadata = metadata
+        self._memory: float | None = None
+
+    def __enter__(self) -> None:
+        monitor = self._monitor
+        if monitor._should_sample_memory():
+            self._memory = monitor._get_memory_usage()
+        self._wall = time.time()
+        self._start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        duration = time.perf_counter() - self._start
+        monitor = self._monitor
+        memory_after = None
+        if self._memory is not None:
+            memory_after = monitor._get_memory_usage()
+        monitor._record(
+            self._operation,
+            self._wall,
+            duration,
+            self._memory,
+            memory_after,
+            self._metadata,
+        )
+        return False
+
+
 class PerformanceMonitor:
     """
     性能监控器
 
     提供性能监控的核心功能,包括时间测量、内存监控和数据收集.
+
+    每个操作的耗时记录在对数线性直方图中, 记录和百分位查询的开销与调用次数无关;
+    最近的指标明细保存在定长环形缓冲区中. 进程内存按固定间隔抽样读取,
+    不在每次调用时读取.
     """
 
     _instance: Optional["PerformanceMonitor"] = None
@@ -60,9 +188,16 @@ class PerformanceMonitor:
             return
 
         self._logger = logging.getLogger(__name__)
-        self._metrics: list[PerformanceMetric] = []
+        self._lock = threading.Lock()
+        # 最近的指标明细: (操作, 开始时间戳, 耗时, 内存前, 内存后, 元数据)
+        self._recent: deque[tuple] = deque(maxlen=DEFAULT_MAX_METRICS)
+        self._operations: dict[str, _OperationStats] = {}
         self._enabled = True
-        self._max_metrics = 1000  # 最大保存的指标数量
+        self._memory_sample_interval = DEFAULT_MEMORY_SAMPLE_INTERVAL
+        self._operation_counter = itertools.count()
+        self._process = None
+        self._process_unavailable = False
+        self._stats_providers: dict[str, Callable[[], dict[str, Any]]] = {}
         self._initialized = True
 
         self._logger.debug("性能监控器初始化完成")
@@ -81,7 +216,25 @@ class PerformanceMonitor:
         """检查是否启用了性能监控"""
         return self._enabled
 
-    @contextmanager
+    def set_max_metrics(self, max_metrics: int) -> None:
+        """
+        设置保存的最近指标明细数量
+
+        Args:
+            max_metrics: 最大数量, 超出时丢弃最旧的明细(不影响累计统计)
+        """
+        with self._lock:
+            self._recent = deque(self._recent, maxlen=max(max_metrics, 1))
+
+    def set_memory_sample_interval(self, interval: int) -> None:
+        """
+        设置内存抽样间隔
+
+        Args:
+            interval: 每隔多少次监控操作读取一次进程内存, 1表示每次读取, 0表示不读取
+        """
+        self._memory_sample_interval = max(interval, 0)
+
     def monitor_operation(self, operation_name: str, **metadata):
         """
         监控操作的上下文管理器
@@ -96,47 +249,8 @@ class PerformanceMonitor:
                 pass
         """
         if not self._enabled:
-            yield
-            return
-
-        # 记录开始状态
-        start_time = datetime.now()
-        start_timestamp = time.perf_counter()
-        memory_before = self._get_memory_usage()
-
-        try:
-            yield
-        finally:
-            # 记录结束状态
-            end_time = datetime.now()
-            end_timestamp = time.perf_counter()
-            memory_after = self._get_memory_usage()
-
-            # 计算性能指标
-            duration = end_timestamp - start_timestamp
-            memory_delta = memory_after - memory_before
-
-            # 创建性能指标
-            metric = PerformanceMetric(
-                operation=operation_name,
-                start_time=start_time,
-                end_time=end_time,
-                duration=duration,
-                memory_before=memory_before,
-                memory_after=memory_after,
-                memory_delta=memory_delta,
-                metadata=metadata,
-            )
-
-            # 保存指标
-            self._add_metric(metric)
-
-            # 记录日志
-            self._logger.debug(
-                f"性能监控 [{operation_name}]: "
-                f"耗时 {duration * 1000:.2f}ms, "
-                f"内存变化 {memory_delta:+.2f}MB"
-            )
+            return _DISABLED_CONTEXT
+        return _MonitoredOperation(self, operation_name, metadata)
 
     def monitor_function(self, operation_name: str = None, **metadata):
         """
@@ -161,7 +275,9 @@ class PerformanceMonitor:
 
             @functools.wraps(func)
             def wrapper(*args, **kwargs):
-                with self.monitor_operation(op_name, **metadata):
+                if not self._enabled:
+                    return func(*args, **kwargs)
+                with _MonitoredOperation(self, op_name, metadata):
                     return func(*args, **kwargs)
 
             return wrapper
@@ -183,46 +299,31 @@ class PerformanceMonitor:
         if not self._enabled:
             return
 
-        now = datetime.now()
-        metric = PerformanceMetric(
-            operation=operation,
-            start_time=now,
-            end_time=now,
-            duration=duration,
-            memory_before=0.0,
-            memory_after=memory_delta,
-            memory_delta=memory_delta,
-            metadata=metadata,
-        )
-
-        self._add_metric(metric)
+        self._record(operation, time.time(), duration, 0.0, memory_delta, metadata)
 
     def get_metrics(
         self, operation: str = None, limit: int = None
     ) -> list[PerformanceMetric]:
         """
-        获取性能指标
+        获取最近的性能指标明细
 
         Args:
             operation: 操作名称过滤器
             limit: 返回数量限制
 
         Returns:
-            List[PerformanceMetric]: 性能指标列表
+            List[PerformanceMetric]: 性能指标列表, 最新的在前
         """
-        metrics = self._metrics
-
-        # 按操作名称过滤
-        if operation:
-            metrics = [m for m in metrics if m.operation == operation]
-
-        # 按时间倒序排列
-        metrics = sorted(metrics, key=lambda m: m.start_time, reverse=True)
-
-        # 限制数量
-        if limit:
-            metrics = metrics[:limit]
-
+        with self._lock:
+            recent = list(self._recent)
+
+        metrics = []
+        for entry in reversed(recent):
+            if operation and entry[0] != operation:
+                continue
+            metrics.append(self._to_metric(entry))
+            if limit and len(metrics) >= limit:
+                break
         return metrics
 
     def get_operation_stats(self, operation: str) -> dict[str, Any]:
@@ -233,39 +334,85 @@ class PerformanceMonitor:
             operation: 操作名称
 
         Returns:
-            Dict[str, Any]: 统计信息
+            Dict[str, Any]: 统计信息, 包括p50/p95/p99耗时
         """
-        metrics = self.get_metrics(operation)
-
-        if not metrics:
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None or stats.histogram.count == 0:
+                return {
+                    "operation": operation,
+                    "count": 0,
+                    "avg_duration_ms": 0.0,
+                    "min_duration_ms": 0.0,
+                    "max_duration_ms": 0.0,
+                    "total_duration_ms": 0.0,
+                    "p50_duration_ms": 0.0,
+                    "p95_duration_ms": 0.0,
+                    "p99_duration_ms": 0.0,
+                    "avg_memory_delta_mb": 0.0,
+                }
+
+            histogram = stats.histogram
             return {
                 "operation": operation,
-                "count": 0,
-                "avg_duration_ms": 0.0,
-                "min_duration_ms": 0.0,
-                "max_duration_ms": 0.0,
-                "total_duration_ms": 0.0,
-                "avg_memory_delta_mb": 0.0,
+                "count": histogram.count,
+                "avg_duration_ms": histogram.total / histogram.count * 1000,
+                "min_duration_ms": histogram.min * 1000,
+                "max_duration_ms": histogram.max * 1000,
+                "total_duration_ms": histogram.total * 1000,
+                "p50_duration_ms": histogram.percentile(50) * 1000,
+                "p95_duration_ms": histogram.percentile(95) * 1000,
+                "p99_duration_ms": histogram.percentile(99) * 1000,
+                "avg_memory_delta_mb": (
+                    stats.memory_delta_total / stats.memory_samples
+                    if stats.memory_samples
+                    else 0.0
+                ),
+                "last_execution": datetime.fromtimestamp(stats.last_start).isoformat(),
             }
 
-        durations = [m.duration_ms for m in metrics]
-        memory_deltas = [m.memory_delta for m in metrics]
-
-        return {
-            "operation": operation,
-            "count": len(metrics),
-            "avg_duration_ms": sum(durations) / len(durations),
-            "min_duration_ms": min(durations),
-            "max_duration_ms": max(durations),
-            "total_duration_ms": sum(durations),
-            "avg_memory_delta_mb": sum(memory_deltas) / len(memory_deltas),
-            "last_execution": metrics[0].start_time.isoformat(),
-        }
-
     def get_all_operations(self) -> list[str]:
         """获取所有监控的操作名称"""
-        operations = set(m.operation for m in self._metrics)
-        return sorted(operations)
+        with self._lock:
+            return sorted(self._operations)
+
+    def register_stats_provider(
+        self, name: str, provider: Callable[[], dict[str, Any]]
+    ) -> None:
+        """
+        注册外部统计信息提供者
+
+        用于将连接池等组件的运行统计纳入性能摘要.
+
+        Args:
+            name: 提供者名称
+            provider: 返回统计字典的可调用对象
+        """
+        self._stats_providers[name] = provider
+
+    def unregister_stats_provider(self, name: str) -> None:
+        """
+        注销外部统计信息提供者
+
+        Args:
+            name: 提供者名称
+        """
+        self._stats_providers.pop(name, None)
+
+    def get_provider_stats(self) -> dict[str, Any]:
+        """
+        获取所有外部提供者的统计信息
+
+        Returns:
+            Dict[str, Any]: 以提供者名称为键的统计信息
+        """
+        stats = {}
+        for name, provider in list(self._stats_providers.items()):
+            try:
+                stats[name] = provider()
+            except Exception as e:
+                self._logger.warning(f"获取统计信息失败 [{name}]: {e}")
+        return stats
 
     def get_summary(self) -> dict[str, Any]:
         """
@@ -274,36 +421,38 @@ class PerformanceMonitor:
         Returns:
             Dict[str, Any]: 摘要信息
         """
-        if not self._metrics:
-            return {
-                "total_operations": 0,
-                "unique_operations": 0,
-                "total_duration_ms": 0.0,
-                "avg_duration_ms": 0.0,
-                "current_memory_mb": self._get_memory_usage(),
-                "monitoring_enabled": self._enabled,
-            }
-
-        durations = [m.duration_ms for m in self._metrics]
-
-        return {
-            "total_operations": len(self._metrics),
-            "unique_operations": len(self.get_all_operations()),
-            "total_duration_ms": sum(durations),
-            "avg_duration_ms": sum(durations) / len(durations),
+        with self._lock:
+            total_operations = sum(
+                stats.histogram.count for stats in self._operations.values()
+            )
+            total_duration = sum(
+                stats.histogram.total for stats in self._operations.values()
+            )
+            unique_operations = len(self._operations)
+            oldest = self._recent[0][1] if self._recent else None
+            newest = self._recent[-1][1] if self._recent else None
+
+        summary = {
+            "total_operations": total_operations,
+            "unique_operations": unique_operations,
+            "total_duration_ms": total_duration * 1000,
+            "avg_duration_ms": (
+                total_duration / total_operations * 1000 if total_operations else 0.0
+            ),
             "current_memory_mb": self._get_memory_usage(),
             "monitoring_enabled": self._enabled,
-            "oldest_metric": min(
-                self._metrics, key=lambda m: m.start_time
-            ).start_time.isoformat(),
-            "newest_metric": max(
-                self._metrics, key=lambda m: m.start_time
-            ).start_time.isoformat(),
+            "resource_stats": self.get_provider_stats(),
         }
+        if oldest is not None:
+            summary["oldest_metric"] = datetime.fromtimestamp(oldest).isoformat()
+            summary["newest_metric"] = datetime.fromtimestamp(newest).isoformat()
+        return summary
 
     def clear_metrics(self) -> None:
         """清空所有性能指标"""
-        self._metrics.clear()
+        with self._lock:
+            self._recent.clear()
+            self._operations.clear()
         self._logger.info("性能指标已清空")
 
     def export_metrics(self, file_path: str) -> None:
@@ -321,6 +470,9 @@ class PerformanceMonitor:
             export_data = {
                 "export_time": datetime.now().isoformat(),
                 "summary": self.get_summary(),
+                "operations": [
+                    self.get_operation_stats(op) for op in self.get_all_operations()
+                ],
                 "metrics": [
                     {
                         "operation": m.operation,
@@ -332,7 +484,7 @@ class PerformanceMonitor:
                         "memory_delta_mb": m.memory_delta,
                         "metadata": self._serialize_metadata(m.metadata),
                     }
-                    for m in self._metrics
+                    for m in reversed(self.get_metrics())
                 ],
             }
 
@@ -347,23 +499,69 @@ class PerformanceMonitor:
             self._logger.error(f"导出性能指标失败: {e}")
             raise
 
-    def _add_metric(self, metric: PerformanceMetric) -> None:
-        """添加性能指标"""
-        self._metrics.append(metric)
+    def _record(
+        self,
+        operation: str,
+        wall_start: float,
+        duration: float,
+        memory_before: float | None,
+        memory_after: float | None,
+        metadata: dict[str, Any],
+    ) -> None:
+        """记录一次操作, 直方图和环形缓冲区的更新都是O(1)"""
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = _OperationStats()
+            stats.histogram.record(duration)
+            stats.last_start = wall_start
+            if memory_before is not None and memory_after is not None:
+                stats.memory_delta_total += memory_after - memory_before
+                stats.memory_samples += 1
+            self._recent.append(
+                (operation, wall_start, duration, memory_before, memory_after, metadata)
+            )
+
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(f"性能监控 [{operation}]: 耗时 {duration * 1000:.2f}ms")
+
+    def _to_metric(self, entry: tuple) -> PerformanceMetric:
+        """将环形缓冲区中的记录转换为性能指标对象, 未抽样内存的记录内存为0"""
+        operation, wall_start, duration, memory_before, memory_after, metadata = entry
+        memory_before = memory_before or 0.0
+        memory_after = memory_after or 0.0
+        return PerformanceMetric(
+            operation=operation,
+            start_time=datetime.fromtimestamp(wall_start),
+            end_time=datetime.fromtimestamp(wall_start + duration),
+            duration=duration,
+            memory_before=memory_before,
+            memory_after=memory_after,
+            memory_delta=memory_after - memory_before,
+            metadata=metadata,
+        )
 
-        # 限制指标数量
-        if len(self._metrics) > self._max_metrics:
-            # 删除最旧的指标
-            self._metrics = sorted(
-                self._metrics, key=lambda m: m.start_time, reverse=True
-            )[: self._max_metrics]
+    def _should_sample_memory(self) -> bool:
+        """按抽样间隔判断本次操作是否读取内存"""
+        interval = self._memory_sample_interval
+        return interval > 0 and next(self._operation_counter) % interval == 0
 
     def _get_memory_usage(self) -> float:
-        """获取当前内存使用量(MB)"""
+        """获取当前内存使用量(MB), 复用同一个进程句柄"""
+        if self._process is None:
+            if self._process_unavailable:
+                return 0.0
+            try:
+                import psutil
+
+                self._process = psutil.Process()
+            except Exception as e:
+                self._process_unavailable = True
+                self._logger.warning(f"无法读取进程内存, 内存监控已关闭: {e}")
+                return 0.0
+
         try:
-            process = psutil.Process()
-            memory_info = process.memory_info()
-            return memory_info.rss / 1024 / 1024  # 转换为MB
+            return self._process.memory_info().rss / 1024 / 1024  # 转换为MB
         except Exception as e:
             self._logger.warning(f"获取内存使用量失败: {e}")
             return 0.0
@@ -6,12 +6,37 @@ MiniCRM 查询缓存管理器
 - 缓存策略管理
 - 缓存统计和监控
 - 缓存清理和过期处理
+- 按表的写通知失效
+
+每个缓存项记录查询读取的表以及缓存时这些表的代数(generation).
+写操作只需递增被修改表的代数, 失效为O(1); 读取时比较代数即可发现过期项.
+
+缓存项存放在统一缓存层的"query"区域中, 受区域字节预算和全局内存上限约束;
+条目数上限仍由本管理器按写入顺序维护.
 """
 
+import hashlib
 import logging
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from threading import RLock
 from typing import Any
 
+from .cache_tier import get_cache_tier
+from .sql_table_parser import (
+    ALL_TABLES,
+    extract_read_tables,
+    extract_write_tables,
+    is_read_query,
+)
+
+
+# 查询结果缓存区域
+QUERY_REGION = "query"
+
+# 查询结果缓存区域的字节预算(MB)
+QUERY_REGION_SIZE_MB = 64.0
+
 
 class QueryCacheManager:
     """
@@ -30,13 +55,27 @@ class QueryCacheManager:
         self._db = database_manager
         self._logger = logging.getLogger(__name__)
 
-        # 查询缓存
-        self._query_cache: dict[str, Any] = {}
-        self._cache_stats = {"hits": 0, "misses": 0}
+        # 写操作会主动失效相关缓存, TTL只用于兜底进程外的修改
+        self._cache_ttl = timedelta(hours=6)
+
+        # 查询缓存存放在共享区域中, 本地只按写入顺序记录键(头部为最旧的项)
+        self._query_cache = (
+            get_cache_tier()
+            .create_region(QUERY_REGION, QUERY_REGION_SIZE_MB, self._cache_ttl)
+            .namespace()
+        )
+        self._cache_order: OrderedDict[str, None] = OrderedDict()
+        self._cache_lock = RLock()
+        self._cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
         self._cache_max_size = 1000
-        self._cache_ttl = timedelta(minutes=30)
+
+        # 表代数: 表被写入时递增, 全局代数递增表示所有表失效
+        self._table_generations: dict[str, int] = {}
+        self._global_generation = 0
 
         self._enabled = True
+        self._subscribed = False
+        self._subscribe_to_writes()
 
     def enable(self) -> None:
         """启用查询缓存"""
@@ -63,7 +102,7 @@ class QueryCacheManager:
         Returns:
             List[Any]: 查询结果
         """
-        if not self._enabled:
+        if not self._enabled or not is_read_query(sql):
             return self._db.execute_query(sql, params)
 
         # 生成缓存键
@@ -75,15 +114,95 @@ class QueryCacheManager:
             self._cache_stats["hits"] += 1
             return cached_result
 
+        # 在执行查询前记录代数, 查询期间发生的写入会使本次结果立即过期
+        tables = extract_read_tables(sql)
+        generations = self._snapshot_generations(tables)
+
         # 执行查询
         self._cache_stats["misses"] += 1
         result = self._db.execute_query(sql, params)
 
         # 存入缓存
-        self._put_to_cache(cache_key, result)
+        self._put_to_cache(cache_key, result, sql, generations)
 
         return result
 
+    def invalidate_tables(self, tables: set[str] | frozenset[str]) -> None:
+        """
+        失效读取了指定表的缓存项
+
+        只递增表代数, 过期项在下次读取或清理时移除.
+
+        Args:
+            tables: 被修改的表名集合, 包含ALL_TABLES时失效全部缓存
+        """
+        with self._cache_lock:
+            if ALL_TABLES in tables:
+                self._global_generation += 1
+            else:
+                for table in tables:
+                    table = table.lower()
+                    self._table_generations[table] = (
+                        self._table_generations.get(table, 0) + 1
+                    )
+            self._cache_stats["invalidations"] += 1
+
+    def close(self) -> None:
+        """取消对数据库写通知的订阅并释放缓存"""
+        if self._subscribed and hasattr(self._db, "remove_write_listener"):
+            self._db.remove_write_listener(self.invalidate_tables)
+        self._subscribed = False
+        with self._cache_lock:
+            self._query_cache.clear()
+            self._cache_order.clear()
+
+    def _subscribe_to_writes(self) -> None:
+        """订阅数据库管理器的写通知"""
+        if hasattr(self._db, "add_write_listener"):
+            # DatabaseManager: 提交后以表名集合回调
+            self._db.add_write_listener(self.invalidate_tables)
+            self._subscribed = True
+        elif hasattr(self._db, "register_hook"):
+            # EnhancedDatabaseManager: 通过after hooks获取表名
+            for operation in ("insert", "update", "delete"):
+                self._db.register_hook(operation, "after", self._on_write_hook)
+            self._subscribed = True
+        else:
+            self._logger.warning("数据库管理器不支持写通知, 查询缓存仅按TTL过期")
+
+    def _on_write_hook(self, **kwargs: Any) -> None:
+        """EnhancedDatabaseManager的after hook, 根据表名或SQL失效缓存"""
+        table_name = kwargs.get("table_name")
+        sql = kwargs.get("sql")
+        if table_name:
+            self.invalidate_tables({str(table_name)})
+        elif sql:
+            self.invalidate_tables(extract_write_tables(str(sql)))
+        else:
+            self.invalidate_tables({ALL_TABLES})
+
+    def _snapshot_generations(self, tables: frozenset[str]) -> tuple:
+        """记录表的当前代数"""
+        with self._cache_lock:
+            return (
+                self._global_generation,
+                tuple(
+                    (table, self._table_generations.get(table, 0))
+                    for table in sorted(tables)
+                ),
+            )
+
+    def _is_stale(self, cached_item: dict[str, Any]) -> bool:
+        """检查缓存项读取的表是否在缓存后被写入"""
+        global_generation, table_generations = cached_item["generations"]
+        if global_generation != self._global_generation:
+            return True
+        get_generation = self._table_generations.get
+        return any(
+            get_generation(table, 0) != generation
+            for table, generation in table_generations
+        )
+
     def get_cache_statistics(self) -> dict[str, Any]:
         """
         获取查询缓存统计信息
@@ -100,17 +219,26 @@ class QueryCacheManager:
 
         return {
             "cache_size": len(self._query_cache),
+            "cache_size_bytes": sum(
+                entry.size_bytes
+                for entry in map(self._query_cache.peek, self._query_cache.keys())
+                if entry is not None
+            ),
             "max_cache_size": self._cache_max_size,
             "cache_hits": self._cache_stats["hits"],
             "cache_misses": self._cache_stats["misses"],
             "hit_rate_percent": hit_rate,
+            "invalidations": self._cache_stats["invalidations"],
+            "tracked_tables": len(self._table_generations),
             "cache_ttl_minutes": self._cache_ttl.total_seconds() / 60,
         }
 
     def clear_cache(self) -> None:
         """清空查询缓存"""
-        self._query_cache.clear()
-        self._cache_stats = {"hits": 0, "misses": 0}
+        with self._cache_lock:
+            self._query_cache.clear()
+            self._cache_order.clear()
+            self._cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
         self._logger.info("查询缓存已清空")
 
     def set_cache_config(
@@ -132,7 +260,7 @@ class QueryCacheManager:
             self._logger.info(f"缓存TTL设置为: {ttl_minutes}分钟")
 
         # 如果缓存大小超过新的限制,清理多余的项
-        if len(self._query_cache) > self._cache_max_size:
+        if len(self._cache_order) > self._cache_max_size:
             self._cleanup_excess_cache()
 
     def cleanup_expired_cache(self) -> int:
@@ -145,16 +273,19 @@ class QueryCacheManager:
         if not self._enabled:
             return 0
 
-        expired_keys = []
         current_time = datetime.now()
 
-        for cache_key, cached_item in self._query_cache.items():
-            if current_time - cached_item["timestamp"] >= self._cache_ttl:
-                expired_keys.append(cache_key)
+        with self._cache_lock:
+            expired_keys = [
+                cache_key
+                for cache_key, cached_item in self._cached_items()
+                if current_time - cached_item["timestamp"] >= self._cache_ttl
+                or self._is_stale(cached_item)
+            ]
 
-        # 删除过期项
-        for key in expired_keys:
-            del self._query_cache[key]
+            # 删除过期项
+            for key in expired_keys:
+                self._remove_from_cache(key)
 
         if expired_keys:
             self._logger.info(f"清理了 {len(expired_keys)} 个过期缓存项")
@@ -166,20 +297,21 @@ class QueryCacheManager:
         根据模式失效缓存
 
         Args:
-            pattern: 匹配模式(简单的字符串包含匹配)
+            pattern: 匹配模式(对缓存键和SQL做简单的字符串包含匹配)
 
         Returns:
             int: 失效的缓存项数量
         """
-        invalidated_keys = []
-
-        for cache_key in self._query_cache.keys():
-            if pattern in cache_key:
-                invalidated_keys.append(cache_key)
+        with self._cache_lock:
+            invalidated_keys = [
+                cache_key
+                for cache_key, cached_item in self._cached_items()
+                if pattern in cache_key or pattern in cached_item["sql"]
+            ]
 
-        # 删除匹配的项
-        for key in invalidated_keys:
-            del self._query_cache[key]
+            # 删除匹配的项
+            for key in invalidated_keys:
+                self._remove_from_cache(key)
 
         if invalidated_keys:
             self._logger.info(
@@ -190,58 +322,85 @@ class QueryCacheManager:
 
     def _generate_cache_key(self, sql: str, params: tuple) -> str:
         """生成缓存键"""
-        import hashlib
-
         content = f"{sql}_{params}"
         return hashlib.md5(content.encode()).hexdigest()
 
     def _get_from_cache(self, cache_key: str) -> Any | None:
         """从缓存获取数据"""
-        if cache_key in self._query_cache:
-            cached_item = self._query_cache[cache_key]
-            # 检查是否过期
-            if datetime.now() - cached_item["timestamp"] < self._cache_ttl:
+        with self._cache_lock:
+            cached_item = self._query_cache.get(cache_key)
+            if cached_item is None:
+                self._cache_order.pop(cache_key, None)
+                return None
+
+            # 检查是否过期或依赖的表已被写入
+            if datetime.now() - cached_item[
+                "timestamp"
+            ] < self._cache_ttl and not self._is_stale(cached_item):
                 return cached_item["data"]
-            else:
-                # 删除过期项
-                del self._query_cache[cache_key]
-        return None
 
-    def _put_to_cache(self, cache_key: str, data: Any) -> None:
-        """将数据存入缓存"""
-        # 检查缓存大小限制
-        if len(self._query_cache) >= self._cache_max_size:
-            # 删除最旧的项
-            self._cleanup_excess_cache()
+            # 删除过期项
+            self._remove_from_cache(cache_key)
+            return None
 
-        self._query_cache[cache_key] = {
-            "data": data,
-            "timestamp": datetime.now(),
-        }
+    def _put_to_cache(
+        self,
+        cache_key: str,
+        data: Any,
+        sql: str = "",
+        generations: tuple | None = None,
+    ) -> None:
+        """将数据存入缓存"""
+        if generations is None:
+            generations = self._snapshot_generations(extract_read_tables(sql))
+
+        with self._cache_lock:
+            # 检查缓存大小限制
+            if len(self._cache_order) >= self._cache_max_size:
+                # 删除最旧的项
+                self._cleanup_excess_cache()
+
+            cached_item = {
+                "data": data,
+                "timestamp": datetime.now(),
+                "sql": sql,
+                "generations": generations,
+            }
+            self._cache_order.pop(cache_key, None)
+            if self._query_cache.put(cache_key, cached_item, self._cache_ttl):
+                self._cache_order[cache_key] = None
 
     def _cleanup_excess_cache(self) -> None:
         """清理多余的缓存项"""
-        if len(self._query_cache) <= self._cache_max_size:
-            return
+        with self._cache_lock:
+            if len(self._cache_order) < self._cache_max_size:
+                return
 
-        # 按时间戳排序,删除最旧的项
-        sorted_items = sorted(
-            self._query_cache.items(), key=lambda x: x[1]["timestamp"]
-        )
+            # 头部即为最旧的项, 为新项预留一个位置
+            items_to_remove = len(self._cache_order) - self._cache_max_size + 1
+            for _ in range(items_to_remove):
+                cache_key, _ = self._cache_order.popitem(last=False)
+                self._query_cache.remove(cache_key)
 
-        # 计算需要删除的项数
-        items_to_remove = len(self._query_cache) - self._cache_max_size + 1
+        self._logger.debug(f"清理了 {items_to_remove} 个缓存项以释放空间")
 
-        # 删除最旧的项
-        for i in range(items_to_remove):
-            key_to_remove = sorted_items[i][0]
-            del self._query_cache[key_to_remove]
+    def _remove_from_cache(self, cache_key: str) -> None:
+        """删除缓存项"""
+        self._cache_order.pop(cache_key, None)
+        self._query_cache.remove(cache_key)
 
-        self._logger.debug(f"清理了 {items_to_remove} 个缓存项以释放空间")
+    def _cached_items(self) -> list[tuple[str, dict[str, Any]]]:
+        """获取仍在共享区域中的缓存项, 不影响命中统计和淘汰顺序"""
+        items = []
+        for cache_key in self._query_cache.keys():
+            entry = self._query_cache.peek(cache_key)
+            if entry is not None:
+                items.append((cache_key, entry.value))
+        return items
 
     def get_cache_keys(self) -> list[str]:
         """获取所有缓存键"""
-        return list(self._query_cache.keys())
+        return self._query_cache.keys()
 
     def get_cache_info(self, cache_key: str) -> dict[str, Any] | None:
         """
@@ -253,8 +412,9 @@ class QueryCacheManager:
         Returns:
             Dict[str, Any]: 缓存项信息,如果不存在则返回None
         """
-        if cache_key in self._query_cache:
-            cached_item = self._query_cache[cache_key]
+        entry = self._query_cache.peek(cache_key)
+        if entry is not None:
+            cached_item = entry.value
             return {
                 "key": cache_key,
                 "timestamp": cached_item["timestamp"],
@@ -262,6 +422,8 @@ class QueryCacheManager:
                     datetime.now() - cached_item["timestamp"]
                 ).total_seconds(),
                 "data_size": len(str(cached_item["data"])),
-                "expired": datetime.now() - cached_item["timestamp"] >= self._cache_ttl,
+                "tables": sorted(table for table, _ in cached_item["generations"][1]),
+                "expired": datetime.now() - cached_item["timestamp"] >= self._cache_ttl
+                or self._is_stale(cached_item),
             }
         return None
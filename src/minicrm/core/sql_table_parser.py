@@ -0,0 +1,250 @@
+"""SQL表名解析器.
+
+从SQL语句中提取读取和写入的表名, 供查询缓存做按表失效使用.
+
+解析基于轻量的词法扫描而不是完整的SQL语法分析:
+- 跳过字符串字面量和注释, 避免把文本内容误认为表名
+- 读取表: FROM/JOIN之后的表名, 包括逗号分隔的多表
+- 写入表: INSERT/REPLACE INTO, UPDATE, DELETE FROM的目标表
+- DDL语句(CREATE/DROP/ALTER等)无法精确判断影响范围, 视为影响所有表
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import re
+
+
+# 表示"影响所有表"的特殊标记
+ALL_TABLES = "*"
+
+_TOKEN_PATTERN = re.compile(
+    r"""
+    (?P<skip>'(?:[^']|'')*'|--[^\n]*|/\*.*?\*/)   # 字符串和注释
+    | "(?P<dquoted>(?:[^"]|"")+)"                 # "标识符"
+    | `(?P<bquoted>[^`]+)`                         # `标识符`
+    | \[(?P<squoted>[^\]]+)\]                      # [标识符]
+    | (?P<word>[A-Za-z_][\w$]*)
+    | (?P<punct>[(),.;])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+# 不会作为表名出现在FROM之后的关键字
+_NON_TABLE_KEYWORDS = frozenset(
+    {
+        "SELECT",
+        "WHERE",
+        "GROUP",
+        "ORDER",
+        "LIMIT",
+        "HAVING",
+        "UNION",
+        "VALUES",
+        "LATERAL",
+    }
+)
+
+# 表名和别名之后标志当前表引用结束的关键字
+_TABLE_REFERENCE_END = frozenset(
+    {
+        "ON",
+        "USING",
+        "WHERE",
+        "GROUP",
+        "ORDER",
+        "LIMIT",
+        "HAVING",
+        "WINDOW",
+        "UNION",
+        "JOIN",
+        "LEFT",
+        "RIGHT",
+        "INNER",
+        "OUTER",
+        "CROSS",
+        "NATURAL",
+        "FULL",
+    }
+)
+
+_DDL_KEYWORDS = frozenset(
+    {"CREATE", "DROP", "ALTER", "VACUUM", "REINDEX", "ATTACH", "DETACH"}
+)
+
+
+def _tokenize(sql: str) -> list[tuple[str, str]]:
+    """将SQL拆分为(类型, 值)序列, 跳过字符串字面量和注释."""
+    tokens: list[tuple[str, str]] = []
+    for match in _TOKEN_PATTERN.finditer(sql):
+        kind = match.lastgroup
+        if kind == "skip":
+            continue
+        if kind == "punct":
+            tokens.append(("punct", match.group(kind)))
+        elif kind == "word":
+            tokens.append(("word", match.group(kind)))
+        else:
+            tokens.append(("name", match.group(kind)))
+    return tokens
+
+
+def _table_at(tokens: list[tuple[str, str]], index: int) -> tuple[str | None, int]:
+    """读取index位置的表名(支持schema.table), 返回(表名, 下一个位置)."""
+    if index >= len(tokens) or tokens[index][0] == "punct":
+        return None, index
+
+    kind, value = tokens[index]
+    if kind == "word" and value.upper() in _NON_TABLE_KEYWORDS:
+        return None, index
+
+    index += 1
+    # schema.table形式只保留表名
+    if (
+        index + 1 < len(tokens)
+        and tokens[index] == ("punct", ".")
+        and tokens[index + 1][0] != "punct"
+    ):
+        value = tokens[index + 1][1]
+        index += 2
+    return value.lower(), index
+
+
+@lru_cache(maxsize=1024)
+def extract_read_tables(sql: str) -> frozenset[str]:
+    """提取查询语句读取的表名.
+
+    Args:
+        sql: SQL查询语句
+
+    Returns:
+        frozenset[str]: 小写的表名集合, 包括CTE名称
+    """
+    tokens = _tokenize(sql)
+    tables: set[str] = set()
+
+    index = 0
+    while index < len(tokens):
+        kind, value = tokens[index]
+        index += 1
+        if kind != "word" or value.upper() not in ("FROM", "JOIN"):
+            continue
+
+        # FROM a, b JOIN c: 逗号分隔的表依次收集
+        while True:
+            table, index = _table_at(tokens, index)
+            if table is None:
+                break
+            tables.add(table)
+
+            # 跳过别名, 直到逗号或子句结束
+            while index < len(tokens):
+                kind, value = tokens[index]
+                if kind == "punct" or (
+                    kind == "word" and value.upper() in _TABLE_REFERENCE_END
+                ):
+                    break
+                index += 1
+
+            if index < len(tokens) and tokens[index] == ("punct", ","):
+                index += 1
+                continue
+            break
+
+    return frozenset(tables)
+
+
+@lru_cache(maxsize=1024)
+def extract_write_tables(sql: str) -> frozenset[str]:
+    """提取写语句修改的表名.
+
+    Args:
+        sql: SQL写语句
+
+    Returns:
+        frozenset[str]: 小写的表名集合; DDL或无法识别时返回{ALL_TABLES}
+    """
+    return _write_target(_tokenize(sql))
+
+
+def extract_trigger_write_tables(sql: str) -> frozenset[str]:
+    """提取触发器主体中各语句修改的表名.
+
+    Args:
+        sql: CREATE TRIGGER语句
+
+    Returns:
+        frozenset[str]: 小写的表名集合; 无法识别时包含ALL_TABLES
+    """
+    tokens = _tokenize(sql)
+    words = [value.upper() if kind == "word" else "" for kind, value in tokens]
+    try:
+        body_start = words.index("BEGIN") + 1
+    except ValueError:
+        return frozenset({ALL_TABLES})
+
+    tables: set[str] = set()
+    statement: list[tuple[str, str]] = []
+    for token in tokens[body_start:]:
+        if token == ("punct", ";"):
+            if statement:
+                tables |= _write_target(statement)
+            statement = []
+        elif token[0] == "word" and token[1].upper() == "END" and not statement:
+            break
+        else:
+            statement.append(token)
+    return frozenset(tables)
+
+
+def _write_target(tokens: list[tuple[str, str]]) -> frozenset[str]:
+    """从词法序列中定位写操作的目标表."""
+    words = [value.upper() if kind == "word" else "" for kind, value in tokens]
+
+    # 跳过WITH子句, 定位真正的写操作关键字
+    for index, word in enumerate(words):
+        if word in _DDL_KEYWORDS:
+            return frozenset({ALL_TABLES})
+
+        if word in ("INSERT", "REPLACE"):
+            try:
+                into = words.index("INTO", index)
+            except ValueError:
+                break
+            table, _ = _table_at(tokens, into + 1)
+            return frozenset({table}) if table else frozenset({ALL_TABLES})
+
+        if word == "UPDATE":
+            position = index + 1
+            # UPDATE OR REPLACE table
+            if position < len(words) and words[position] == "OR":
+                position += 2
+            table, _ = _table_at(tokens, position)
+            return frozenset({table}) if table else frozenset({ALL_TABLES})
+
+        if word == "DELETE":
+            position = index + 1
+            if position < len(words) and words[position] == "FROM":
+                position += 1
+            table, _ = _table_at(tokens, position)
+            return frozenset({table}) if table else frozenset({ALL_TABLES})
+
+    return frozenset({ALL_TABLES})
+
+
+def is_read_query(sql: str) -> bool:
+    """判断语句是否为只读查询(SELECT或WITH ... SELECT).
+
+    Args:
+        sql: SQL语句
+
+    Returns:
+        bool: 是否为只读查询
+    """
+    keyword = sql.lstrip()[:6].upper()
+    if keyword.startswith("SELECT"):
+        return True
+    if keyword.startswith("WITH"):
+        words = {value.upper() for kind, value in _tokenize(sql) if kind == "word"}
+        return not words & {"INSERT", "UPDATE", "DELETE", "REPLACE"}
+    return False
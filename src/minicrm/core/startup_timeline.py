@@ -0,0 +1,248 @@
+"""
+MiniCRM 启动阶段时间线
+
+记录应用程序启动各阶段(配置加载、日志初始化、数据库初始化、依赖配置、
+服务创建、主窗口构建、首帧渲染等)的耗时, 支持:
+- 嵌套阶段
+- 导出为JSON时间线
+- 导出为Chrome trace格式(chrome://tracing 或 Perfetto 中查看)
+
+每个阶段只记录两次时钟读数, 对启动耗时没有可见影响. 启动完成(finish)后
+或记录数达到上限后不再记录, 之后重复执行的初始化代码不会累积记录.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import threading
+import time
+from typing import Any
+
+
+# 时间线最多保存的阶段记录数
+DEFAULT_MAX_PHASES = 1000
+
+
+@dataclass
+class StartupPhase:
+    """启动阶段记录"""
+
+    name: str
+    start: float
+    end: float
+    depth: int
+    thread_id: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_ms(self) -> float:
+        """阶段耗时(毫秒)"""
+        return (self.end - self.start) * 1000
+
+
+class StartupTimeline:
+    """
+    启动阶段时间线
+
+    以创建时刻为零点记录各阶段的开始和结束时间.
+    """
+
+    def __init__(self, max_phases: int = DEFAULT_MAX_PHASES):
+        """
+        初始化时间线
+
+        Args:
+            max_phases: 最多保存的阶段记录数(时间点单独计数)
+        """
+        self._origin = time.perf_counter()
+        self._max_phases = max_phases
+        self._finished = False
+        self._phases: list[StartupPhase] = []
+        self._marks: list[tuple[str, float, dict[str, Any]]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str, **args: Any) -> Iterator[None]:
+        """
+        记录一个启动阶段
+
+        阶段内抛出的异常照常向外传播, 阶段仍会记录并标记error.
+
+        Args:
+            name: 阶段名称
+            **args: 附加信息, 原样写入导出结果
+        """
+        if self._finished:
+            yield
+            return
+
+        depth = getattr(self._local, "depth", 0)
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as e:
+            args["error"] = type(e).__name__
+            raise
+        finally:
+            end = time.perf_counter()
+            self._local.depth = depth
+            with self._lock:
+                if len(self._phases) < self._max_phases:
+                    self._phases.append(
+                        StartupPhase(
+                            name, start, end, depth, threading.get_ident(), args
+                        )
+                    )
+
+    def mark(self, name: str, **args: Any) -> None:
+        """
+        记录一个时间点(如"窗口可交互")
+
+        Args:
+            name: 时间点名称
+            **args: 附加信息
+        """
+        if self._finished:
+            return
+
+        with self._lock:
+            if len(self._marks) < self._max_phases:
+                self._marks.append((name, time.perf_counter(), args))
+
+    def finish(self) -> None:
+        """标记启动完成, 之后的阶段不再记录"""
+        self._finished = True
+
+    @property
+    def is_finished(self) -> bool:
+        """启动是否已完成"""
+        return self._finished
+
+    def reset(self) -> None:
+        """清空记录并以当前时刻为新的零点, 重新开始记录"""
+        with self._lock:
+            self._origin = time.perf_counter()
+            self._finished = False
+            self._phases.clear()
+            self._marks.clear()
+
+    @property
+    def phases(self) -> list[StartupPhase]:
+        """按开始时间排列的阶段记录"""
+        with self._lock:
+            return sorted(self._phases, key=lambda p: (p.start, p.depth))
+
+    def get_phase(self, name: str) -> StartupPhase | None:
+        """获取指定名称的第一个阶段记录"""
+        return next((p for p in self.phases if p.name == name), None)
+
+    def total_ms(self) -> float:
+        """从零点到最后一个阶段结束的耗时(毫秒)"""
+        ends = [p.end for p in self.phases] + [t for _, t, _ in self._marks]
+        return (max(ends) - self._origin) * 1000 if ends else 0.0
+
+    def _offset_ms(self, timestamp: float) -> float:
+        return (timestamp - self._origin) * 1000
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        导出为JSON时间线
+
+        Returns:
+            Dict[str, Any]: 包含总耗时、各阶段和时间点的字典
+        """
+        return {
+            "total_ms": round(self.total_ms(), 3),
+            "phases": [
+                {
+                    "name": p.name,
+                    "start_ms": round(self._offset_ms(p.start), 3),
+                    "duration_ms": round(p.duration_ms, 3),
+                    "depth": p.depth,
+                    "args": p.args,
+                }
+                for p in self.phases
+            ],
+            "marks": [
+                {"name": name, "time_ms": round(self._offset_ms(t), 3), "args": args}
+                for name, t, args in sorted(self._marks, key=lambda m: m[1])
+            ],
+        }
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """
+        导出为Chrome trace格式(Trace Event Format)
+
+        Returns:
+            Dict[str, Any]: 可直接序列化为JSON的trace对象
+        """
+        pid = os.getpid()
+        events: list[dict[str, Any]] = [
+            {
+                "name": p.name,
+                "cat": "startup",
+                "ph": "X",
+                "ts": round(self._offset_ms(p.start) * 1000, 1),
+                "dur": round(p.duration_ms * 1000, 1),
+                "pid": pid,
+                "tid": p.thread_id,
+                "args": p.args,
+            }
+            for p in self.phases
+        ]
+        events.extend(
+            {
+                "name": name,
+                "cat": "startup",
+                "ph": "i",
+                "s": "p",
+                "ts": round(self._offset_ms(t) * 1000, 1),
+                "pid": pid,
+                "tid": threading.get_ident(),
+                "args": args,
+            }
+            for name, t, args in self._marks
+        )
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(
+        self, json_path: str | Path | None = None, trace_path: str | Path | None = None
+    ) -> None:
+        """
+        将时间线写入文件
+
+        Args:
+            json_path: JSON时间线文件路径
+            trace_path: Chrome trace文件路径
+        """
+        for path, data in (
+            (json_path, self.to_dict),
+            (trace_path, self.to_chrome_trace),
+        ):
+            if path is None:
+                continue
+            path = Path(path)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                json.dumps(data(), ensure_ascii=False, indent=2), encoding="utf-8"
+            )
+
+
+# 全局启动时间线实例
+_startup_timeline: StartupTimeline | None = None
+_startup_timeline_lock = threading.Lock()
+
+
+def get_startup_timeline() -> StartupTimeline:
+    """获取全局启动时间线实例"""
+    global _startup_timeline
+    if _startup_timeline is None:
+        with _startup_timeline_lock:
+            if _startup_timeline is None:
+                _startup_timeline = StartupTimeline()
+    return _startup_timeline
@@ -20,6 +20,15 @@ import threading
 from typing import Any, Callable, Optional
 from weakref import WeakKeyDictionary, WeakSet
 
+from .cache_tier import get_cache_tier
+
+
+# UI组件缓存区域
+UI_COMPONENTS_REGION = "ui_components"
+
+# UI组件缓存区域的字节预算(MB)
+UI_COMPONENTS_REGION_SIZE_MB = 16.0
+
 
 class BaseObject:
     """基础对象类 - 替代QObject"""
@@ -131,12 +140,20 @@ class UIMemoryManager:
         self._component_info: dict[str, ComponentInfo] = {}
         self._component_refs: WeakSet = WeakSet()
 
-        # 缓存管理
-        self._component_cache: dict[str, Any] = {}
+        # 缓存管理, 组件缓存存放在统一缓存层的UI组件区域中
         self._pixmap_cache: dict[str, Pixmap] = {}
-        self._cache_access_times: dict[str, datetime] = {}
         self._cache_max_size = 100
         self._cache_ttl = timedelta(minutes=30)
+        self._component_cache = (
+            get_cache_tier()
+            .create_region(
+                UI_COMPONENTS_REGION,
+                UI_COMPONENTS_REGION_SIZE_MB,
+                self._cache_ttl,
+                size_estimator=UIMemoryManager._estimate_component_size,
+            )
+            .namespace()
+        )
 
         # 内存泄漏检测
         self._leak_detection_enabled = True
@@ -316,9 +333,9 @@ class UIMemoryManager:
             if len(self._component_cache) >= self._cache_max_size:
                 self._evict_oldest_cache_item()
 
-            # 缓存组件
-            self._component_cache[key] = component
-            self._cache_access_times[key] = datetime.now()
+            # 缓存组件, 字节预算和全局内存上限由缓存层负责
+            if not self._component_cache.put(key, component, ttl or self._cache_ttl):
+                return False
 
             # 标记组件为已缓存
             component_id = self._tracked_components.get(component)
@@ -345,21 +362,8 @@ class UIMemoryManager:
             return None
 
         try:
-            if key not in self._component_cache:
-                return None
-
-            # 检查是否过期
-            access_time = self._cache_access_times.get(key)
-            if access_time and datetime.now() - access_time > self._cache_ttl:
-                # 过期,删除缓存
-                del self._component_cache[key]
-                del self._cache_access_times[key]
-                return None
-
-            # 更新访问时间
-            self._cache_access_times[key] = datetime.now()
-
-            return self._component_cache[key]
+            # 过期的组件由缓存层删除
+            return self._component_cache.get(key)
 
         except Exception as e:
             self._logger.error(f"获取缓存组件失败: {e}")
@@ -417,16 +421,11 @@ class UIMemoryManager:
                 del self._component_info[component_id]
 
             # 清理过期缓存
-            cache_keys_to_remove = []
-            for key, access_time in self._cache_access_times.items():
-                if current_time - access_time > self._cache_ttl:
-                    cache_keys_to_remove.append(key)
-
-            for key in cache_keys_to_remove:
-                if key in self._component_cache:
-                    del self._component_cache[key]
-                del self._cache_access_times[key]
-                cleanup_results["cleaned_cache_items"] += 1
+            cache_size_before = len(self._component_cache)
+            self._component_cache.region.purge_expired()
+            cleanup_results["cleaned_cache_items"] = cache_size_before - len(
+                self._component_cache
+            )
 
             self._logger.info(f"空闲组件清理完成: {cleanup_results}")
             return cleanup_results
@@ -601,7 +600,8 @@ class UIMemoryManager:
         content = f"{component.__class__.__name__}_{id(component)}_{datetime.now().timestamp()}"
         return hashlib.md5(content.encode()).hexdigest()[:12]
 
-    def _estimate_component_memory(self, component: Any) -> float:
+    @staticmethod
+    def _estimate_component_memory(component: Any) -> float:
         """估算组件内存使用(KB)"""
         try:
             # 简化的内存估算
@@ -625,18 +625,26 @@ class UIMemoryManager:
         except Exception:
             return 10.0  # 默认估算值
 
+    @staticmethod
+    def _estimate_component_size(component: Any) -> int:
+        """估算组件占用的字节数, 供缓存层记账
+
+        全局缓存层比管理器存活更久, 估算器不能持有管理器实例.
+        """
+        return int(UIMemoryManager._estimate_component_memory(component) * 1024)
+
     def _evict_oldest_cache_item(self) -> None:
-        """驱逐最旧的缓存项"""
-        if not self._cache_access_times:
+        """驱逐最久未访问的缓存项"""
+        entries = [
+            entry
+            for entry in map(self._component_cache.peek, self._component_cache.keys())
+            if entry is not None
+        ]
+        if not entries:
             return
 
-        oldest_key = min(
-            self._cache_access_times.keys(), key=lambda k: self._cache_access_times[k]
-        )
-
-        if oldest_key in self._component_cache:
-            del self._component_cache[oldest_key]
-        del self._cache_access_times[oldest_key]
+        oldest = min(entries, key=lambda entry: entry.last_accessed)
+        self._component_cache.region.remove(oldest.key)
 
     def _cleanup_destroyed_components(self) -> None:
         """清理已销毁的组件"""
@@ -695,28 +703,31 @@ class UIMemoryManager:
             self._logger.error(f"内存泄漏检测失败: {e}")
 
     def _calculate_cache_hit_rate(self) -> float:
-        """计算缓存命中率"""
-        # 简化实现,实际应该跟踪命中和未命中次数
-        return 0.0
+        """计算缓存命中率(UI组件区域)"""
+        return self._component_cache.region.get_statistics().hit_rate
 
     def _calculate_avg_cache_age(self) -> float:
         """计算平均缓存年龄(分钟)"""
-        if not self._cache_access_times:
+        entries = [
+            entry
+            for entry in map(self._component_cache.peek, self._component_cache.keys())
+            if entry is not None
+        ]
+        if not entries:
             return 0.0
 
         current_time = datetime.now()
         total_age = sum(
-            (current_time - access_time).total_seconds() / 60
-            for access_time in self._cache_access_times.values()
+            (current_time - entry.last_accessed).total_seconds() / 60
+            for entry in entries
         )
 
-        return total_age / len(self._cache_access_times)
+        return total_age / len(entries)
 
     def clear_all_caches(self) -> None:
         """清空所有缓存"""
         self._component_cache.clear()
         self._pixmap_cache.clear()
-        self._cache_access_times.clear()
         self._logger.info("所有缓存已清空")
 
     def set_cache_size(self, max_size: int) -> None:
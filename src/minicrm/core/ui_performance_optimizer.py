@@ -18,8 +18,6 @@ import threading
 from typing import Any, Callable, Optional
 from weakref import WeakSet
 
-import psutil
-
 
 class BaseObject:
     """基础对象类 - 替代QObject"""
@@ -685,6 +683,8 @@ class UIPerformanceOptimizer(BaseObject):
     def _get_current_memory_usage(self) -> float:
         """获取当前内存使用量(MB)"""
         try:
+            import psutil
+
             process = psutil.Process()
             memory_info = process.memory_info()
             return memory_info.rss / 1024 / 1024  # 转换为MB
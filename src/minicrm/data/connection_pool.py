@@ -1,67 +1,110 @@
 """MiniCRM 数据库连接池模块.
 
 轻量级SQLite连接池实现, 为桌面应用优化.
+
+支持:
+- 按线程签出: 同一线程重复获取时复用已签出的连接
+- 只读连接: 配合WAL模式为读操作提供独立连接
+- 惰性健康检查: 仅对空闲超过阈值的连接执行探测
+- 连接池统计: 等待时间、签出次数、饱和度等
 """
 
 from __future__ import annotations
 
 import logging
 from queue import Empty, Queue
+import re
 import sqlite3
 import threading
-from typing import TYPE_CHECKING
+import time
+from typing import TYPE_CHECKING, Any
 
 
 if TYPE_CHECKING:
     from pathlib import Path
 
 
+def _regexp(pattern: str | None, value: str | None) -> bool:
+    """SQLite REGEXP运算符实现, 无效的正则表达式视为不匹配"""
+    if pattern is None or value is None:
+        return False
+    try:
+        return re.search(pattern, value) is not None
+    except re.error:
+        return False
+
+
+def register_sql_functions(connection: sqlite3.Connection) -> None:
+    """为连接注册应用使用的自定义SQL函数.
+
+    Args:
+        connection: 数据库连接
+    """
+    connection.create_function("REGEXP", 2, _regexp, deterministic=True)
+
+
 class ConnectionPool:
     """轻量级SQLite连接池.
 
     为桌面应用优化的简单连接池实现, 支持并发访问控制.
     """
 
-    def __init__(self, db_path: Path, max_connections: int = 5):
+    def __init__(
+        self,
+        db_path: Path,
+        max_connections: int = 5,
+        read_only: bool = False,
+        health_check_interval: float = 30.0,
+        timeout: float = 30.0,
+    ):
         """初始化连接池.
 
         Args:
             db_path: 数据库文件路径
             max_connections: 最大连接数
+            read_only: 是否创建只读连接(要求数据库文件已存在)
+            health_check_interval: 连接空闲超过该秒数后, 签出时才执行健康检查
+            timeout: 等待可用连接的超时时间(秒)
         """
         self._db_path = db_path
         self._max_connections = max_connections
+        self._read_only = read_only
+        self._health_check_interval = health_check_interval
+        self._timeout = timeout
         self._pool: Queue = Queue(maxsize=max_connections)
         self._active_connections = 0
         self._lock = threading.Lock()
+        self._local = threading.local()
+        self._last_used: dict[int, float] = {}
         self._logger = logging.getLogger(__name__)
 
+        # 统计信息
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._in_use = 0
+        self._peak_in_use = 0
+        self._health_check_failures = 0
+
     def get_connection(self) -> sqlite3.Connection:
         """获取数据库连接.
 
+        同一线程在归还之前重复调用时返回同一个连接.
+
         Returns:
             sqlite3.Connection: 数据库连接对象
         """
-        try:
-            # 尝试从池中获取现有连接
-            connection = self._pool.get_nowait()
-        except Empty:
-            # 池中无可用连接, 尝试创建新连接
-            with self._lock:
-                if self._active_connections < self._max_connections:
-                    connection = self._create_connection()
-                    self._active_connections += 1
-                    self._logger.debug(
-                        "创建新连接, 当前活跃连接数: %d", self._active_connections
-                    )
-                    return connection
-
-            # 达到最大连接数, 等待可用连接
-            self._logger.debug("等待可用连接")
-            return self._pool.get(timeout=30)  # type: ignore[no-any-return]
-        else:
-            self._logger.debug("从连接池获取连接")
-            return connection  # type: ignore[no-any-return]
+        held = getattr(self._local, "connection", None)
+        if held is not None:
+            self._local.depth += 1
+            return held  # type: ignore[no-any-return]
+
+        connection = self._checkout()
+        self._local.connection = connection
+        self._local.depth = 1
+        return connection
 
     def return_connection(self, connection: sqlite3.Connection) -> None:
         """归还连接到池中.
@@ -69,17 +112,131 @@ class ConnectionPool:
         Args:
             connection: 要归还的连接
         """
+        if getattr(self._local, "connection", None) is connection:
+            self._local.depth -= 1
+            if self._local.depth > 0:
+                return
+            self._local.connection = None
+
+        with self._lock:
+            self._in_use = max(0, self._in_use - 1)
+
         try:
-            # 检查连接是否仍然有效
-            connection.execute("SELECT 1")
+            # 未提交的事务不能带回池中, 回滚即可, 无需额外探测查询
+            if connection.in_transaction:
+                connection.rollback()
+            self._last_used[id(connection)] = time.monotonic()
             self._pool.put_nowait(connection)
             self._logger.debug("连接已归还到池中")
         except (sqlite3.Error, OSError, ValueError):
             # 连接已损坏, 关闭并减少计数
+            self._discard(connection)
+            self._logger.warning("损坏的连接已关闭")
+
+    def _checkout(self) -> sqlite3.Connection:
+        """从池中签出一个连接, 必要时创建或等待.
+
+        Returns:
+            sqlite3.Connection: 数据库连接对象
+        """
+        waited = 0.0
+        while True:
+            try:
+                # 尝试从池中获取现有连接
+                connection = self._pool.get_nowait()
+            except Empty:
+                connection = self._create_if_allowed()
+                if connection is None:
+                    # 达到最大连接数, 等待可用连接
+                    self._logger.debug("等待可用连接")
+                    start = time.perf_counter()
+                    try:
+                        connection = self._pool.get(timeout=self._timeout)
+                    except Empty:
+                        with self._lock:
+                            self._timeouts += 1
+                        raise
+                    finally:
+                        waited += time.perf_counter() - start
+            else:
+                self._logger.debug("从连接池获取连接")
+
+            if self._is_healthy(connection):
+                break
+            self._discard(connection)
+
+        with self._lock:
+            self._checkouts += 1
+            self._in_use += 1
+            self._peak_in_use = max(self._peak_in_use, self._in_use)
+            if waited > 0:
+                self._waits += 1
+                self._total_wait += waited
+                self._max_wait = max(self._max_wait, waited)
+
+        return connection
+
+    def _create_if_allowed(self) -> sqlite3.Connection | None:
+        """在未达到上限时创建新连接.
+
+        Returns:
+            sqlite3.Connection | None: 新连接, 已达上限时返回None
+        """
+        with self._lock:
+            if self._active_connections >= self._max_connections:
+                return None
+            self._active_connections += 1
+
+        try:
+            connection = self._create_connection()
+        except (sqlite3.Error, OSError):
             with self._lock:
-                connection.close()
                 self._active_connections -= 1
-                self._logger.warning("损坏的连接已关闭")
+            raise
+
+        self._logger.debug("创建新连接, 当前活跃连接数: %d", self._active_connections)
+        return connection
+
+    def _is_healthy(self, connection: sqlite3.Connection) -> bool:
+        """检查连接是否可用.
+
+        只有空闲时间超过健康检查间隔的连接才会执行探测查询.
+
+        Args:
+            connection: 要检查的连接
+
+        Returns:
+            bool: 连接是否可用
+        """
+        last_used = self._last_used.get(id(connection))
+        if (
+            last_used is None
+            or time.monotonic() - last_used < self._health_check_interval
+        ):
+            return True
+
+        try:
+            connection.execute("SELECT 1")
+        except (sqlite3.Error, OSError, ValueError):
+            with self._lock:
+                self._health_check_failures += 1
+            self._logger.warning("连接健康检查失败, 将重新创建")
+            return False
+        return True
+
+    def _discard(self, connection: sqlite3.Connection) -> None:
+        """关闭并丢弃损坏的连接.
+
+        Args:
+            connection: 要丢弃的连接
+        """
+        self._last_used.pop(id(connection), None)
+        try:
+            connection.close()
+        except (sqlite3.Error, OSError):
+            pass
+        with self._lock:
+            self._active_connections = max(0, self._active_connections - 1)
 
     def _create_connection(self) -> sqlite3.Connection:
         """创建新的数据库连接.
@@ -87,18 +244,60 @@ class ConnectionPool:
         Returns:
             sqlite3.Connection: 新的数据库连接
         """
+        if self._read_only:
+            connection = sqlite3.connect(
+                f"{self._db_path.resolve().as_uri()}?mode=ro",
+                uri=True,
+                check_same_thread=False,
+                timeout=30.0,
+            )
+            connection.row_factory = sqlite3.Row
+            register_sql_functions(connection)
+            # 只读连接不能修改journal_mode, 依赖写连接预先设置的WAL模式
+            connection.execute("PRAGMA query_only = ON")
+            return connection
+
         connection = sqlite3.connect(
             self._db_path, check_same_thread=False, timeout=30.0
         )
 
         # 配置连接
         connection.row_factory = sqlite3.Row
+        register_sql_functions(connection)
         connection.execute("PRAGMA foreign_keys = ON")
         connection.execute("PRAGMA journal_mode = WAL")
         connection.execute("PRAGMA synchronous = NORMAL")
 
         return connection
 
+    def get_stats(self) -> dict[str, Any]:
+        """获取连接池统计信息.
+
+        Returns:
+            dict[str, Any]: 包含签出次数、等待时间、饱和度等统计信息
+        """
+        with self._lock:
+            return {
+                "max_connections": self._max_connections,
+                "active_connections": self._active_connections,
+                "in_use": self._in_use,
+                "idle": self._pool.qsize(),
+                "peak_in_use": self._peak_in_use,
+                "saturation": self._in_use / self._max_connections
+                if self._max_connections
+                else 0.0,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "total_wait_ms": self._total_wait * 1000,
+                "avg_wait_ms": (self._total_wait * 1000 / self._waits)
+                if self._waits
+                else 0.0,
+                "max_wait_ms": self._max_wait * 1000,
+                "health_check_failures": self._health_check_failures,
+                "read_only": self._read_only,
+            }
+
     def close_all(self) -> None:
         """关闭所有连接."""
         while not self._pool.empty():
@@ -107,5 +306,7 @@ class ConnectionPool:
 
         with self._lock:
             self._active_connections = 0
+            self._in_use = 0
+        self._last_used.clear()
 
         self._logger.info("所有数据库连接已关闭")
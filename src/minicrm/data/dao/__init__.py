@@ -7,13 +7,23 @@
 - 依赖倒置原则
 """
 
+from .analytics_snapshot_dao import AnalyticsSnapshotDAO
 from .base_dao import BaseDAO
 from .customer_dao import CustomerDAO
+from .customer_score_dao import CustomerScoreDAO
+from .financial_risk_dao import FinancialRiskDAO
+from .metric_rollup_dao import MetricRollupDAO
 from .supplier_dao import SupplierDAO
+from .table_stats_dao import TableStatsDAO
 
 
 __all__ = [
+    "AnalyticsSnapshotDAO",
     "BaseDAO",
     "CustomerDAO",
+    "CustomerScoreDAO",
+    "FinancialRiskDAO",
+    "MetricRollupDAO",
     "SupplierDAO",
+    "TableStatsDAO",
 ]
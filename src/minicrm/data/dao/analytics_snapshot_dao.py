@@ -0,0 +1,175 @@
+"""
+分析结果快照数据访问对象
+
+负责分析结果的持久化:
+- 读取由触发器维护的表变更计数, 组合成数据版本
+- 按名称读写分析结果快照及其计算时的数据版本
+
+快照保存在analytics_snapshots表中, 应用重启后仍可直接使用.
+是否需要重新计算由分析服务比较数据版本决定, 本DAO只负责数据访问.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+import json
+import logging
+import pickle
+from typing import Any
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.database import DatabaseManager
+
+
+@dataclass
+class AnalyticsSnapshot:
+    """分析结果快照"""
+
+    name: str
+    data_version: str
+    payload: Any
+    computed_at: str
+    compute_seconds: float
+
+
+class AnalyticsSnapshotDAO:
+    """
+    分析结果快照数据访问对象
+
+    快照内容以pickle格式保存; 无法还原的快照(例如结果类型已变更)
+    视为不存在, 由服务重新计算后覆盖.
+    """
+
+    def __init__(self, database_manager: DatabaseManager):
+        """
+        初始化分析结果快照DAO
+
+        Args:
+            database_manager: 数据库管理器
+        """
+        self._db = database_manager
+        self._logger = logging.getLogger(__name__)
+
+    def get_data_version(self, tables: Iterable[str]) -> str:
+        """
+        获取指定表当前的数据版本
+
+        Args:
+            tables: 表名
+
+        Returns:
+            str: 由各表变更计数组成的版本字符串, 任意一张表被修改后都会变化
+        """
+        tables = sorted(set(tables))
+        try:
+            placeholders = ", ".join("?" for _ in tables)
+            sql = f"""
+            SELECT table_name, change_count
+            FROM table_change_counters
+            WHERE table_name IN ({placeholders})
+            """
+            results = self._db.execute_query(sql, tuple(tables))
+            counts = {row[0]: row[1] for row in results}
+            return json.dumps([[table, counts.get(table, 0)] for table in tables])
+
+        except Exception as e:
+            self._logger.error(f"获取数据版本失败: {e}")
+            raise DatabaseError(f"获取数据版本失败: {e}") from e
+
+    def get_snapshot(self, name: str) -> AnalyticsSnapshot | None:
+        """
+        获取分析结果快照
+
+        Args:
+            name: 快照名称
+
+        Returns:
+            AnalyticsSnapshot | None: 快照, 不存在或无法还原时返回None
+        """
+        try:
+            sql = """
+            SELECT name, data_version, payload, computed_at, compute_seconds
+            FROM analytics_snapshots
+            WHERE name = ?
+            """
+            results = self._db.execute_query(sql, (name,))
+
+        except Exception as e:
+            self._logger.error(f"获取分析快照失败: {e}")
+            raise DatabaseError(f"获取分析快照失败: {e}") from e
+
+        if not results:
+            return None
+
+        row = results[0]
+        try:
+            payload = pickle.loads(row[2])
+        except Exception as e:
+            self._logger.warning(f"分析快照无法还原, 将重新计算: {name}, {e}")
+            return None
+
+        return AnalyticsSnapshot(
+            name=row[0],
+            data_version=row[1],
+            payload=payload,
+            computed_at=row[3],
+            compute_seconds=row[4],
+        )
+
+    def save_snapshot(
+        self,
+        name: str,
+        data_version: str,
+        payload: Any,
+        compute_seconds: float = 0.0,
+    ) -> None:
+        """
+        保存分析结果快照, 覆盖同名的旧快照
+
+        Args:
+            name: 快照名称
+            data_version: 计算开始前读取的数据版本
+            payload: 分析结果
+            compute_seconds: 计算耗时(秒)
+        """
+        try:
+            sql = """
+            INSERT INTO analytics_snapshots
+                (name, data_version, payload, computed_at, compute_seconds)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                data_version = excluded.data_version,
+                payload = excluded.payload,
+                computed_at = excluded.computed_at,
+                compute_seconds = excluded.compute_seconds
+            """
+            blob = pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+            computed_at = datetime.now().isoformat(timespec="seconds")
+            self._db.execute_update(
+                sql, (name, data_version, blob, computed_at, compute_seconds)
+            )
+
+        except Exception as e:
+            self._logger.error(f"保存分析快照失败: {e}")
+            raise DatabaseError(f"保存分析快照失败: {e}") from e
+
+    def delete_snapshots(self, name: str | None = None) -> int:
+        """
+        删除分析结果快照
+
+        Args:
+            name: 快照名称, 为None时删除全部
+
+        Returns:
+            int: 删除的快照数量
+        """
+        try:
+            if name is None:
+                return self._db.execute_update("DELETE FROM analytics_snapshots")
+            return self._db.execute_update(
+                "DELETE FROM analytics_snapshots WHERE name = ?", (name,)
+            )
+
+        except Exception as e:
+            self._logger.error(f"删除分析快照失败: {e}")
+            raise DatabaseError(f"删除分析快照失败: {e}") from e
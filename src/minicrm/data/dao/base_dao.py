@@ -5,6 +5,7 @@
 集成transfunctions中的CRUD模板,确保代码复用和一致性.
 """
 
+from collections.abc import Iterator
 import logging
 from typing import Any
 
@@ -12,8 +13,11 @@ from minicrm.core.interfaces.dao_interfaces import IBaseDAO
 from minicrm.data.database import DatabaseManager
 from transfunctions.data_operations import create_crud_template
 
+from .batch_mixin import BatchOperationsMixin
+from .paging_mixin import PagingMixin
 
-class BaseDAO(IBaseDAO):
+
+class BaseDAO(BatchOperationsMixin, PagingMixin, IBaseDAO):
     """
     基础数据访问对象
 
@@ -107,6 +111,25 @@ class BaseDAO(IBaseDAO):
         """
         return self._crud_template.search(conditions, order_by, limit, offset)
 
+    def stream_batches(
+        self,
+        conditions: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        按批次流式读取记录
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+            batch_size: 每批记录数
+
+        Yields:
+            List[Dict[str, Any]]: 每批记录
+        """
+        return self._crud_template.stream_batches(conditions, order_by, batch_size)
+
     def count(self, conditions: dict[str, Any] | None = None) -> int:
         """
         统计记录数量
@@ -0,0 +1,148 @@
+"""
+DAO批量写操作混入类
+
+将批量插入、更新、插入或更新和删除委托给transfunctions的CRUD模板,
+供BaseDAO以及直接实现接口的客户、供应商DAO共用.
+"""
+
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from minicrm.core.exceptions import DatabaseError, ValidationError
+from transfunctions.data_operations import DEFAULT_CHUNK_SIZE
+
+
+T = TypeVar("T")
+
+
+class BatchOperationsMixin:
+    """
+    批量写操作混入类
+
+    使用者需要提供_crud_template、_logger和_table_name属性,
+    并放在DAO接口之前继承以覆盖接口的逐条默认实现.
+    """
+
+    # 日志和错误信息中的记录名称, 为空时使用表名
+    _record_label = ""
+
+    def insert_many(
+        self, records: list[dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        在一个事务中批量插入数据
+
+        Args:
+            records: 要插入的数据列表, 每条记录的字段必须相同
+            chunk_size: 每次executemany的记录数
+
+        Returns:
+            List[int]: 新插入记录的ID, 与records顺序一致
+
+        Raises:
+            DatabaseError: 数据库操作失败, 整批回滚
+        """
+        return self._run_batch(
+            "插入",
+            lambda: self._crud_template.create_many(
+                [self._insert_record(data) for data in records], chunk_size
+            ),
+        )
+
+    def update_many(
+        self,
+        updates: list[tuple[int, dict[str, Any]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        在一个事务中批量更新记录
+
+        Args:
+            updates: (记录ID, 更新数据)列表
+            chunk_size: 每次executemany的记录数
+
+        Returns:
+            int: 更新的记录数
+        """
+        return self._run_batch(
+            "更新", lambda: self._crud_template.update_many(updates, chunk_size)
+        )
+
+    def update_by_ids(
+        self,
+        record_ids: list[int],
+        data: dict[str, Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        将多条记录更新为相同的值, 每块执行一条UPDATE语句
+
+        Args:
+            record_ids: 记录ID列表
+            data: 更新数据
+            chunk_size: 每条语句的记录数
+
+        Returns:
+            int: 更新的记录数
+        """
+        return self._run_batch(
+            "更新",
+            lambda: self._crud_template.update_by_ids(record_ids, data, chunk_size),
+        )
+
+    def upsert_many(
+        self,
+        records: list[dict[str, Any]],
+        conflict_columns: tuple[str, ...] = ("id",),
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        在一个事务中批量插入或更新记录(INSERT ... ON CONFLICT)
+
+        Args:
+            records: 数据列表, 每条记录的字段必须相同且包含冲突列
+            conflict_columns: 主键或唯一索引列
+            chunk_size: 每次executemany的记录数
+
+        Returns:
+            int: 插入和更新的记录数
+        """
+        return self._run_batch(
+            "插入或更新",
+            lambda: self._crud_template.upsert_many(
+                records, conflict_columns, chunk_size
+            ),
+        )
+
+    def delete_many(
+        self, record_ids: list[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """
+        在一个事务中批量删除记录, 每块执行一条DELETE语句
+
+        Args:
+            record_ids: 记录ID列表
+            chunk_size: 每条语句的记录数
+
+        Returns:
+            int: 删除的记录数
+        """
+        return self._run_batch(
+            "删除", lambda: self._crud_template.delete_many(record_ids, chunk_size)
+        )
+
+    def _insert_record(self, data: dict[str, Any]) -> dict[str, Any]:
+        """构造批量插入的字段和值, 子类可覆盖以固定字段"""
+        return data
+
+    def _run_batch(self, action: str, operation: Callable[[], T]) -> T:
+        """执行批量操作, 数据库错误记录日志后包装为DatabaseError"""
+        try:
+            return operation()
+
+        except ValidationError:
+            raise
+        except Exception as e:
+            label = self._record_label or f"{self._table_name}记录"
+            self._logger.error(f"批量{action}{label}失败: {e}")
+            raise DatabaseError(f"批量{action}{label}失败: {e}") from e
@@ -7,15 +7,23 @@
 - 实现ICustomerDAO接口
 """
 
+from collections.abc import Iterator
 import logging
 from typing import Any
 
 from minicrm.core.exceptions import DatabaseError
 from minicrm.core.interfaces.dao_interfaces import ICustomerDAO
+from minicrm.data.dao.batch_mixin import BatchOperationsMixin
+from minicrm.data.dao.paging_mixin import PagingMixin
 from minicrm.data.database import DatabaseManager
+from transfunctions.data_operations import create_crud_template
+from transfunctions.data_operations.query_builder import (
+    ComparisonOperator,
+    QueryBuilder,
+)
 
 
-class CustomerDAO(ICustomerDAO):
+class CustomerDAO(BatchOperationsMixin, PagingMixin, ICustomerDAO):
     """
     客户数据访问对象实现
 
@@ -25,6 +33,17 @@ class CustomerDAO(ICustomerDAO):
     - 实现标准的CRUD接口
     """
 
+    # 插入语句, 单条插入和批量插入共用
+    _INSERT_SQL = """
+    INSERT INTO customers (
+        name, phone, email, address, customer_type_id,
+        contact_person, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # 批量写操作日志和错误信息中的记录名称
+    _record_label = "客户数据"
+
     def __init__(self, database_manager: DatabaseManager):
         """
         初始化客户DAO
@@ -35,6 +54,10 @@ class CustomerDAO(ICustomerDAO):
         self._db = database_manager
         self._logger = logging.getLogger(__name__)
         self._table_name = "customers"
+        # 批量写操作使用CRUD模板
+        self._crud_template = create_crud_template(
+            self._table_name, database_manager, self._logger
+        )
 
     def insert(self, data: dict[str, Any]) -> int:
         """
@@ -50,31 +73,30 @@ class CustomerDAO(ICustomerDAO):
             DatabaseError: 数据库操作失败
         """
         try:
-            sql = """
-            INSERT INTO customers (
-                name, phone, email, address, customer_type_id,
-                contact_person, notes, created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-
-            params = (
-                data.get("name"),
-                data.get("phone"),
-                data.get("email"),
-                data.get("address"),
-                data.get("customer_type_id"),
-                data.get("contact_person"),
-                data.get("notes"),
-                data.get("created_at"),
-                data.get("updated_at"),
-            )
-
-            return self._db.execute_insert(sql, params)
+            return self._db.execute_insert(self._INSERT_SQL, self._insert_params(data))
 
         except Exception as e:
             self._logger.error(f"插入客户数据失败: {e}")
             raise DatabaseError(f"插入客户数据失败: {e}") from e
 
+    def _insert_params(self, data: dict[str, Any]) -> tuple:
+        """构造插入语句参数"""
+        return tuple(self._insert_record(data).values())
+
+    def _insert_record(self, data: dict[str, Any]) -> dict[str, Any]:
+        """构造插入的字段和值, 顺序与_INSERT_SQL一致"""
+        return {
+            "name": data.get("name"),
+            "phone": data.get("phone"),
+            "email": data.get("email"),
+            "address": data.get("address"),
+            "customer_type_id": data.get("customer_type_id"),
+            "contact_person": data.get("contact_person"),
+            "notes": data.get("notes"),
+            "created_at": data.get("created_at"),
+            "updated_at": data.get("updated_at"),
+        }
+
     def get_by_id(self, record_id: int) -> dict[str, Any] | None:
         """
         根据ID获取客户记录
@@ -170,24 +192,7 @@ class CustomerDAO(ICustomerDAO):
             List[Dict[str, Any]]: 搜索结果列表
         """
         try:
-            sql = "SELECT * FROM customers"
-            params = []
-
-            # 构建WHERE子句
-            if conditions:
-                where_clauses = []
-                for key, value in conditions.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-
-                if where_clauses:
-                    sql += " WHERE " + " AND ".join(where_clauses)
-
-            # 添加排序
-            if order_by:
-                sql += f" ORDER BY {order_by}"
-            else:
-                sql += " ORDER BY created_at DESC"
+            sql, params = self._build_search_sql(conditions, order_by)
 
             # 添加分页
             if limit:
@@ -195,13 +200,76 @@ class CustomerDAO(ICustomerDAO):
                 if offset:
                     sql += f" OFFSET {offset}"
 
-            results = self._db.execute_query(sql, tuple(params))
+            results = self._db.execute_query(sql, params)
             return [self._row_to_dict(row) for row in results]
 
         except Exception as e:
             self._logger.error(f"搜索客户记录失败: {e}")
             raise DatabaseError(f"搜索客户记录失败: {e}") from e
 
+    def stream_batches(
+        self,
+        conditions: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        按批次流式读取客户记录
+
+        基于数据库游标的fetchmany实现, 内存占用与结果集大小无关.
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+            batch_size: 每批记录数
+
+        Yields:
+            List[Dict[str, Any]]: 每批客户记录
+        """
+        sql, params = self._build_search_sql(conditions, order_by)
+        try:
+            for batch in self._db.iter_query_batches(sql, params, batch_size):
+                yield [self._row_to_dict(row) for row in batch]
+        except DatabaseError:
+            raise
+        except Exception as e:
+            self._logger.error(f"流式读取客户记录失败: {e}")
+            raise DatabaseError(f"流式读取客户记录失败: {e}") from e
+
+    def _build_search_sql(
+        self, conditions: dict[str, Any] | None, order_by: str | None
+    ) -> tuple[str, tuple[Any, ...]]:
+        """
+        构建客户搜索SQL(不含分页)
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+
+        Returns:
+            Tuple[str, Tuple]: SQL语句和参数
+        """
+        sql = "SELECT * FROM customers"
+        params = []
+
+        # 构建WHERE子句
+        if conditions:
+            where_clauses = []
+            for key, value in conditions.items():
+                where_clauses.append(f"{key} = ?")
+                params.append(value)
+
+            if where_clauses:
+                sql += " WHERE " + " AND ".join(where_clauses)
+
+        # 添加排序
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        else:
+            sql += " ORDER BY created_at DESC"
+
+        return sql, tuple(params)
+
     def count(self, conditions: dict[str, Any] | None = None) -> int:
         """
         统计客户记录数量
@@ -232,6 +300,88 @@ class CustomerDAO(ICustomerDAO):
             self._logger.error(f"统计客户记录失败: {e}")
             raise DatabaseError(f"统计客户记录失败: {e}") from e
 
+    def search_keyset(
+        self,
+        query: str = "",
+        search_fields: tuple[str, ...] = (),
+        filters: dict[str, Any] | None = None,
+        order: tuple[str, str] = ("created_at", "DESC"),
+        after: tuple[Any, Any] | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """
+        按关键词和筛选条件做键集分页查询
+
+        结果按(排序字段, id)排序, after为上一页最后一条记录的(排序值, id).
+
+        Args:
+            query: 搜索关键词, 在search_fields中模糊匹配
+            search_fields: 关键词匹配的字段
+            filters: 等值筛选条件
+            order: (排序字段, "ASC"或"DESC")
+            after: 上一页最后一条记录的(排序值, id), 为None时从头开始
+            limit: 返回的最大记录数
+            offset: 偏移量, 仅在after为None时使用
+
+        Returns:
+            List[Dict[str, Any]]: 客户记录
+        """
+        try:
+            builder = self._build_keyword_query(query, search_fields, filters)
+            builder.seek(order[0], order[1], after).limit(limit)
+            if after is None and offset:
+                builder.offset(offset)
+            sql, params = builder.build()
+            results = self._db.execute_query(sql, tuple(params))
+            return [self._row_to_dict(row) for row in results]
+
+        except Exception as e:
+            self._logger.error(f"键集分页查询客户失败: {e}")
+            raise DatabaseError(f"键集分页查询客户失败: {e}") from e
+
+    def count_keyword_matches(
+        self,
+        query: str = "",
+        search_fields: tuple[str, ...] = (),
+        filters: dict[str, Any] | None = None,
+    ) -> int:
+        """
+        统计满足关键词和筛选条件的客户数量
+
+        Args:
+            query: 搜索关键词
+            search_fields: 关键词匹配的字段
+            filters: 等值筛选条件
+
+        Returns:
+            int: 记录数量
+        """
+        try:
+            builder = self._build_keyword_query(query, search_fields, filters)
+            sql, params = builder.build_count()
+            result = self._db.execute_query(sql, tuple(params))
+            return result[0][0] if result else 0
+
+        except Exception as e:
+            self._logger.error(f"统计客户记录失败: {e}")
+            raise DatabaseError(f"统计客户记录失败: {e}") from e
+
+    def _build_keyword_query(
+        self,
+        query: str,
+        search_fields: tuple[str, ...],
+        filters: dict[str, Any] | None,
+    ) -> QueryBuilder:
+        """构建关键词搜索查询(不含排序和分页)"""
+        builder = QueryBuilder(self._table_name)
+        for field, value in (filters or {}).items():
+            builder.where(field, ComparisonOperator.EQUAL, value)
+        if query and search_fields:
+            pattern = f"%{query}%"
+            builder.where_any(list(search_fields), ComparisonOperator.LIKE, pattern)
+        return builder
+
     def search_by_name_or_phone(self, query: str) -> list[dict[str, Any]]:
         """
         根据姓名或电话搜索客户
@@ -257,6 +407,21 @@ class CustomerDAO(ICustomerDAO):
             self._logger.error(f"按姓名或电话搜索失败: {e}")
             raise DatabaseError(f"按姓名或电话搜索失败: {e}") from e
 
+    def get_name_phone_pairs(self) -> list[tuple[str, str]]:
+        """
+        获取全部客户的名称和电话, 用于批量导入时的重复检测
+
+        Returns:
+            List[Tuple[str, str]]: (名称, 电话)列表
+        """
+        try:
+            sql = "SELECT name, COALESCE(phone, '') FROM customers"
+            return [(row[0], row[1]) for row in self._db.execute_query(sql)]
+
+        except Exception as e:
+            self._logger.error(f"获取客户名称和电话失败: {e}")
+            raise DatabaseError(f"获取客户名称和电话失败: {e}") from e
+
     def get_by_type(self, customer_type_id: int) -> list[dict[str, Any]]:
         """
         根据客户类型获取客户列表
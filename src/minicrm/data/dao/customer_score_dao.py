@@ -0,0 +1,217 @@
+"""
+客户价值评分数据访问对象
+
+负责预计算客户价值评分的持久化和查询:
+- 读取被触发器标记为需要重算的客户
+- 将计算时间过久的评分重新标记为需要重算
+- 批量保存重算后的评分
+- 通过索引提供价值分布计数和前N名客户
+
+评分算法本身属于业务逻辑, 由分析服务负责, 本DAO只负责数据访问.
+"""
+
+import logging
+from typing import Any
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.database import DatabaseManager
+
+
+class CustomerScoreDAO:
+    """
+    客户价值评分数据访问对象
+
+    customer_value_scores表中每个客户一行, 客户及其互动、报价、
+    财务记录变化时由触发器置is_dirty并递增dirty_version.
+    """
+
+    def __init__(self, database_manager: DatabaseManager):
+        """
+        初始化客户价值评分DAO
+
+        Args:
+            database_manager: 数据库管理器
+        """
+        self._db = database_manager
+        self._logger = logging.getLogger(__name__)
+
+    def get_dirty_customers(
+        self, after_customer_id: int = 0, limit: int = 500
+    ) -> list[dict[str, Any]]:
+        """
+        获取需要重算评分的客户
+
+        按客户ID递增分批读取, 每条记录附带_score_dirty_version字段,
+        保存评分时用于检测读取之后客户是否再次被修改.
+
+        Args:
+            after_customer_id: 只返回ID大于该值的客户
+            limit: 最大返回数量
+
+        Returns:
+            List[Dict[str, Any]]: 客户数据列表
+        """
+        try:
+            sql = """
+            SELECT c.*, s.dirty_version AS _score_dirty_version
+            FROM customer_value_scores s
+            JOIN customers c ON c.id = s.customer_id
+            WHERE s.is_dirty = 1 AND s.customer_id > ?
+            ORDER BY s.customer_id
+            LIMIT ?
+            """
+            results = self._db.execute_query(sql, (after_customer_id, limit))
+            return [dict(row) for row in results]
+
+        except Exception as e:
+            self._logger.error(f"获取待重算客户失败: {e}")
+            raise DatabaseError(f"获取待重算客户失败: {e}") from e
+
+    def count_dirty(self) -> int:
+        """
+        统计需要重算评分的客户数量
+
+        Returns:
+            int: 客户数量
+        """
+        try:
+            sql = "SELECT COUNT(*) FROM customer_value_scores WHERE is_dirty = 1"
+            result = self._db.execute_query(sql)
+            return result[0][0] if result else 0
+
+        except Exception as e:
+            self._logger.error(f"统计待重算客户失败: {e}")
+            raise DatabaseError(f"统计待重算客户失败: {e}") from e
+
+    def save_scores(self, scores: list[tuple[int, int, float, float, str]]) -> int:
+        """
+        批量保存评分并清除重算标记
+
+        只有dirty_version与读取时一致的行才会被更新, 读取之后再次被修改的
+        客户保持待重算状态.
+
+        Args:
+            scores: (客户ID, 读取时的dirty_version, 价值评分, 排名评分, 价值等级)列表
+
+        Returns:
+            int: 实际保存的行数
+        """
+        if not scores:
+            return 0
+
+        try:
+            sql = """
+            UPDATE customer_value_scores
+            SET value_score = ?, ranking_score = ?, value_level = ?,
+                is_dirty = 0, computed_at = CURRENT_TIMESTAMP
+            WHERE customer_id = ? AND dirty_version = ?
+            """
+            params = [
+                (value_score, ranking_score, value_level, customer_id, version)
+                for customer_id, version, value_score, ranking_score, value_level in (
+                    scores
+                )
+            ]
+            return self._db.execute_many(sql, params)
+
+        except Exception as e:
+            self._logger.error(f"保存客户评分失败: {e}")
+            raise DatabaseError(f"保存客户评分失败: {e}") from e
+
+    def mark_stale(self, max_age_days: int) -> int:
+        """
+        将计算时间早于指定天数的评分标记为需要重算
+
+        评分中合作时长等项依赖计算当天的日期, 数据不变时也会逐渐过时.
+
+        Args:
+            max_age_days: 评分的最长有效天数
+
+        Returns:
+            int: 标记的行数
+        """
+        try:
+            return self._db.execute_update(
+                """
+                UPDATE customer_value_scores
+                SET is_dirty = 1, dirty_version = dirty_version + 1
+                WHERE is_dirty = 0 AND computed_at < datetime('now', ?)
+                """,
+                (f"-{max_age_days} days",),
+            )
+
+        except Exception as e:
+            self._logger.error(f"标记过期客户评分失败: {e}")
+            raise DatabaseError(f"标记过期客户评分失败: {e}") from e
+
+    def mark_all_dirty(self) -> int:
+        """
+        将所有客户标记为需要重算, 用于评分算法变更后全量刷新
+
+        Returns:
+            int: 标记的行数
+        """
+        try:
+            self._db.execute_update(
+                """
+                INSERT OR IGNORE INTO customer_value_scores (customer_id, is_dirty)
+                SELECT id, 1 FROM customers
+                """
+            )
+            return self._db.execute_update(
+                """
+                UPDATE customer_value_scores
+                SET is_dirty = 1, dirty_version = dirty_version + 1
+                """
+            )
+
+        except Exception as e:
+            self._logger.error(f"标记客户评分重算失败: {e}")
+            raise DatabaseError(f"标记客户评分重算失败: {e}") from e
+
+    def get_value_level_counts(self) -> dict[str, int]:
+        """
+        按价值等级统计客户数量
+
+        Returns:
+            Dict[str, int]: 价值等级到客户数量的映射
+        """
+        try:
+            sql = """
+            SELECT value_level, COUNT(*)
+            FROM customer_value_scores
+            WHERE value_level IS NOT NULL
+            GROUP BY value_level
+            """
+            results = self._db.execute_query(sql)
+            return {row[0]: row[1] for row in results}
+
+        except Exception as e:
+            self._logger.error(f"统计客户价值等级失败: {e}")
+            raise DatabaseError(f"统计客户价值等级失败: {e}") from e
+
+    def get_top_customers(self, limit: int = 10) -> list[dict[str, Any]]:
+        """
+        按排名评分获取前N名客户
+
+        Args:
+            limit: 返回数量
+
+        Returns:
+            List[Dict[str, Any]]: 客户数据列表, 包含value_score字段
+        """
+        try:
+            sql = """
+            SELECT c.*, s.ranking_score AS value_score
+            FROM customer_value_scores s
+            JOIN customers c ON c.id = s.customer_id
+            WHERE s.ranking_score IS NOT NULL
+            ORDER BY s.ranking_score DESC, s.customer_id
+            LIMIT ?
+            """
+            results = self._db.execute_query(sql, (limit,))
+            return [dict(row) for row in results]
+
+        except Exception as e:
+            self._logger.error(f"获取顶级客户失败: {e}")
+            raise DatabaseError(f"获取顶级客户失败: {e}") from e
@@ -0,0 +1,143 @@
+"""
+财务风险数据访问对象
+
+负责按客户聚合财务风险指标:
+- 未结应收账款及按逾期天数划分的账龄
+- 历史逾期次数、按时付款率和最长逾期天数
+- 客户回款收入及其在总收入中的占比和排名
+
+所有指标由一次分组查询在数据库中计算, 风险等级的判断和预警属于业务逻辑,
+由财务风险服务负责, 本DAO只负责数据访问.
+"""
+
+from datetime import date
+import logging
+from typing import Any
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.database import DatabaseManager
+
+
+# 账龄区间 -> 风险档案中对应的金额字段
+AGING_BUCKET_FIELDS = {
+    "0-30天": "aging_0_30",
+    "31-60天": "aging_31_60",
+    "61-90天": "aging_61_90",
+    "90天以上": "aging_over_90",
+}
+
+
+class FinancialRiskDAO:
+    """
+    财务风险数据访问对象
+
+    逾期天数用julianday在SQL中计算: 未结应收账款按统计日期计算,
+    已结应收账款按实际付款日期计算, 因此无需在Python中逐行解析日期.
+    """
+
+    def __init__(self, database_manager: DatabaseManager):
+        """
+        初始化财务风险DAO
+
+        Args:
+            database_manager: 数据库管理器
+        """
+        self._db = database_manager
+        self._logger = logging.getLogger(__name__)
+
+    def get_customer_risk_profiles(self, as_of: date) -> list[dict[str, Any]]:
+        """
+        获取所有客户的财务风险档案
+
+        Args:
+            as_of: 统计日期, 用于计算未结应收账款的逾期天数
+
+        Returns:
+            List[Dict[str, Any]]: 每个客户一条档案, 按未结应收金额从高到低排序.
+                包含outstanding_amount、overdue_amount、overdue_days、
+                AGING_BUCKET_FIELDS中的账龄金额、max_overdue_days、overdue_count、
+                on_time_payment_rate、transaction_count、cooperation_years、
+                revenue、revenue_share和revenue_rank; 没有数据的字段不出现在结果中
+        """
+        try:
+            sql = """
+            WITH today AS (SELECT julianday(?) AS jd),
+            records AS (
+                SELECT customer_id, record_type, amount, is_open,
+                       CAST(end_jd - julianday(due_date) AS INTEGER) AS late_days
+                FROM (
+                    SELECT fr.customer_id, fr.record_type, fr.amount, fr.due_date,
+                           fr.record_type = 'receivable' AND fr.paid_date IS NULL
+                               AND COALESCE(fr.status, '') != 'paid' AS is_open,
+                           CASE
+                               WHEN fr.record_type != 'receivable' THEN NULL
+                               WHEN fr.paid_date IS NOT NULL
+                                   THEN julianday(fr.paid_date)
+                               WHEN COALESCE(fr.status, '') != 'paid' THEN today.jd
+                           END AS end_jd
+                    FROM financial_records AS fr, today
+                    WHERE fr.customer_id IS NOT NULL
+                )
+            ),
+            customer_stats AS (
+                SELECT customer_id,
+                       SUM(CASE WHEN is_open THEN amount ELSE 0 END)
+                           AS outstanding_amount,
+                       SUM(CASE WHEN is_open AND late_days > 0 THEN amount ELSE 0 END)
+                           AS overdue_amount,
+                       SUM(CASE WHEN is_open AND late_days BETWEEN 1 AND 30
+                           THEN amount ELSE 0 END) AS aging_0_30,
+                       SUM(CASE WHEN is_open AND late_days BETWEEN 31 AND 60
+                           THEN amount ELSE 0 END) AS aging_31_60,
+                       SUM(CASE WHEN is_open AND late_days BETWEEN 61 AND 90
+                           THEN amount ELSE 0 END) AS aging_61_90,
+                       SUM(CASE WHEN is_open AND late_days > 90
+                           THEN amount ELSE 0 END) AS aging_over_90,
+                       MAX(CASE WHEN is_open AND late_days > 0
+                           THEN late_days ELSE 0 END) AS overdue_days,
+                       MAX(CASE WHEN late_days > 0 THEN late_days ELSE 0 END)
+                           AS max_overdue_days,
+                       SUM(late_days > 0) AS overdue_count,
+                       SUM(NOT is_open AND late_days IS NOT NULL) AS settled_count,
+                       SUM(NOT is_open AND late_days <= 0) AS on_time_count,
+                       SUM(CASE WHEN record_type = 'payment' THEN amount ELSE 0 END)
+                           AS revenue,
+                       COUNT(*) AS transaction_count
+                FROM records
+                GROUP BY customer_id
+            )
+            SELECT c.id, c.name,
+                   MAX((today.jd - julianday(c.created_at)) / 365.0, 0)
+                       AS cooperation_years,
+                   COALESCE(s.outstanding_amount, 0) AS outstanding_amount,
+                   COALESCE(s.overdue_amount, 0) AS overdue_amount,
+                   COALESCE(s.overdue_days, 0) AS overdue_days,
+                   COALESCE(s.aging_0_30, 0) AS aging_0_30,
+                   COALESCE(s.aging_31_60, 0) AS aging_31_60,
+                   COALESCE(s.aging_61_90, 0) AS aging_61_90,
+                   COALESCE(s.aging_over_90, 0) AS aging_over_90,
+                   s.max_overdue_days,
+                   s.overdue_count,
+                   CAST(s.on_time_count AS REAL) / NULLIF(s.settled_count, 0)
+                       AS on_time_payment_rate,
+                   COALESCE(s.transaction_count, 0) AS transaction_count,
+                   COALESCE(s.revenue, 0) AS revenue,
+                   CAST(COALESCE(s.revenue, 0) AS REAL)
+                       / NULLIF(SUM(COALESCE(s.revenue, 0)) OVER (), 0)
+                       AS revenue_share,
+                   ROW_NUMBER() OVER (ORDER BY COALESCE(s.revenue, 0) DESC, c.id)
+                       AS revenue_rank
+            FROM customers AS c
+            CROSS JOIN today
+            LEFT JOIN customer_stats AS s ON s.customer_id = c.id
+            ORDER BY outstanding_amount DESC, c.id
+            """
+            results = self._db.execute_query(sql, (as_of.isoformat(),))
+            return [
+                {key: row[key] for key in row.keys() if row[key] is not None}
+                for row in results
+            ]
+
+        except Exception as e:
+            self._logger.error(f"获取客户风险档案失败: {e}")
+            raise DatabaseError(f"获取客户风险档案失败: {e}") from e
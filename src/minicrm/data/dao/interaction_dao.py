@@ -19,6 +19,8 @@ from datetime import datetime
 from typing import Any
 
 from minicrm.data.database import DatabaseManager
+from minicrm.data.database.database_schema import INTERACTION_SEARCH_SOURCES
+from transfunctions.data_operations import DEFAULT_CHUNK_SIZE
 
 from .base_dao import BaseDAO
 
@@ -40,6 +42,7 @@ class InteractionDAO(BaseDAO):
         """
         super().__init__(database_manager, "interactions")
         self._logger = logging.getLogger(__name__)
+        self._search_index_available: bool | None = None
 
     def get_by_party(
         self,
@@ -227,46 +230,156 @@ class InteractionDAO(BaseDAO):
         )
 
     def search_by_content(
-        self, query: str, party_id: int = None
+        self,
+        query: str,
+        party_id: int = None,
+        party_type: str | None = None,
+        limit: int = 50,
+        offset: int = 0,
+        highlight: tuple[str, str] = ("<mark>", "</mark>"),
     ) -> list[dict[str, Any]]:
         """
         根据内容搜索互动记录
 
+        在互动全文索引中检索主题、内容和关联方名称, 结果按bm25相关度排序.
+        关键词按空白拆分, 各关键词须同时出现; trigram分词只能索引3个字符
+        及以上的关键词, 更短的关键词在索引表上按子串匹配.
+
         Args:
             query: 搜索关键词
             party_id: 关联方ID（可选）
+            party_type: 关联方类型（可选, "customer"或"supplier"）
+            limit: 限制数量
+            offset: 偏移量
+            highlight: 摘要中标记命中词的前后缀
 
         Returns:
-            List[Dict[str, Any]]: 搜索结果列表
+            List[Dict[str, Any]]: 搜索结果列表, 包含snippet摘要和rank相关度
         """
-        # 这里需要根据实际数据库实现全文搜索
-        # 暂时使用简单的LIKE查询
-        conditions = {}
+        terms = query.split()
+        if not terms:
+            return []
+
+        if not self._has_search_index():
+            return self._search_by_content_like(
+                terms, party_id, party_type, limit, offset
+            )
+
+        indexed = [term for term in terms if len(term) >= 3]
+        short = [term for term in terms if len(term) < 3]
+
+        where: list[str] = []
+        params: list[Any] = []
+        if indexed:
+            where.append("interaction_search MATCH ?")
+            # 每个关键词作为短语引用, 避免用户输入被解析为FTS5语法
+            params.append(
+                " AND ".join('"' + term.replace('"', '""') + '"' for term in indexed)
+            )
+        for term in short:
+            where.append(
+                "(subject LIKE ? ESCAPE '\\' OR content LIKE ? ESCAPE '\\' "
+                "OR party_name LIKE ? ESCAPE '\\')"
+            )
+            params.extend([f"%{self._escape_like(term)}%"] * 3)
         if party_id:
-            conditions["party_id"] = party_id
+            where.append("party_id = ?")
+            params.append(party_id)
+        if party_type:
+            where.append("party_type = ?")
+            params.append(party_type)
+
+        if indexed:
+            # snippet和bm25只能在MATCH查询中使用
+            columns = (
+                "snippet(interaction_search, -1, ?, ?, '…', 16) AS snippet, "
+                "bm25(interaction_search) AS rank"
+            )
+            order_by = "rank"
+            params = [*highlight, *params]
+        else:
+            columns = (
+                "substr(COALESCE(content, subject, ''), 1, 64) AS snippet, 0 AS rank"
+            )
+            order_by = "rowid DESC"
+
+        sql = f"""
+        SELECT interaction_id AS id, party_type, party_id, party_name,
+               subject, content, {columns}
+        FROM interaction_search
+        WHERE {" AND ".join(where)}
+        ORDER BY {order_by}
+        LIMIT ? OFFSET ?
+        """
+        params.extend([limit, offset])
 
-        # 注意：这里需要根据实际数据库实现来调整搜索逻辑
-        # SQLite的全文搜索需要特殊处理
-        all_interactions = self.search(conditions)
+        results = self._db.execute_query(sql, tuple(params))
+        return [dict(row) for row in results]
 
-        # 在内存中进行简单的文本匹配
-        results = []
-        query_lower = query.lower()
+    def _has_search_index(self) -> bool:
+        """检查互动全文索引是否存在, 结果缓存在实例上"""
+        if self._search_index_available is None:
+            result = self._db.execute_query(
+                "SELECT 1 FROM sqlite_master WHERE name = 'interaction_search'"
+            )
+            self._search_index_available = bool(result)
+        return self._search_index_available
 
-        for interaction in all_interactions:
-            searchable_text = " ".join(
-                [
-                    interaction.get("subject", ""),
-                    interaction.get("content", ""),
-                    interaction.get("outcome", ""),
-                    interaction.get("party_name", ""),
-                ]
-            ).lower()
+    def _search_by_content_like(
+        self,
+        terms: list[str],
+        party_id: int | None,
+        party_type: str | None,
+        limit: int,
+        offset: int,
+    ) -> list[dict[str, Any]]:
+        """SQLite不支持FTS5时在互动表上按子串匹配"""
+        selects: list[str] = []
+        params: list[Any] = []
+        for source_type, source in INTERACTION_SEARCH_SOURCES.items():
+            if party_type and party_type != source_type:
+                continue
+            table, party_column, party_table, _ = source
+
+            where = []
+            for term in terms:
+                where.append(
+                    "(i.subject LIKE ? ESCAPE '\\' OR i.content LIKE ? ESCAPE '\\' "
+                    "OR p.name LIKE ? ESCAPE '\\')"
+                )
+                params.extend([f"%{self._escape_like(term)}%"] * 3)
+            if party_id:
+                where.append(f"i.{party_column} = ?")
+                params.append(party_id)
+
+            selects.append(f"""
+                SELECT i.id, '{source_type}' AS party_type, i.{party_column} AS party_id,
+                       p.name AS party_name, i.subject, i.content,
+                       substr(COALESCE(i.content, i.subject, ''), 1, 64) AS snippet,
+                       0 AS rank, i.interaction_date
+                FROM {table} AS i
+                LEFT JOIN {party_table} AS p ON p.id = i.{party_column}
+                WHERE {" AND ".join(where)}
+            """)
+
+        if not selects:
+            return []
+
+        sql = f"""
+        SELECT id, party_type, party_id, party_name, subject, content, snippet, rank
+        FROM ({" UNION ALL ".join(selects)})
+        ORDER BY interaction_date DESC
+        LIMIT ? OFFSET ?
+        """
+        params.extend([limit, offset])
 
-            if query_lower in searchable_text:
-                results.append(interaction)
+        results = self._db.execute_query(sql, tuple(params))
+        return [dict(row) for row in results]
 
-        return results
+    @staticmethod
+    def _escape_like(term: str) -> str:
+        """转义LIKE模式中的通配符"""
+        return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
 
     def get_interaction_statistics(
         self, party_id: int = None, days: int = 30
@@ -319,13 +432,19 @@ class InteractionDAO(BaseDAO):
             "start_date": start_date.isoformat(),
         }
 
-    def bulk_update_status(self, interaction_ids: list[int], new_status: str) -> int:
+    def bulk_update_status(
+        self,
+        interaction_ids: list[int],
+        new_status: str,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
         """
-        批量更新互动记录状态
+        批量更新互动记录状态, 每块执行一条UPDATE语句
 
         Args:
             interaction_ids: 互动记录ID列表
             new_status: 新状态
+            chunk_size: 每条语句的记录数
 
         Returns:
             int: 更新的记录数量
@@ -333,15 +452,11 @@ class InteractionDAO(BaseDAO):
         if not interaction_ids:
             return 0
 
-        updated_count = 0
         update_data = {
             "interaction_status": new_status,
             "updated_at": datetime.now().isoformat(),
         }
-
-        for interaction_id in interaction_ids:
-            if self.update(interaction_id, update_data):
-                updated_count += 1
+        updated_count = self.update_by_ids(interaction_ids, update_data, chunk_size)
 
         self._logger.info(f"批量更新状态完成: {updated_count}/{len(interaction_ids)}")
         return updated_count
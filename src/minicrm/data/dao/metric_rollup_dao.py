@@ -0,0 +1,139 @@
+"""
+业务指标汇总数据访问对象
+
+负责按时间段聚合业务指标:
+- 读取由触发器增量维护的指标日汇总表
+- 按日、周、月、季度、年分组统计计数和金额
+- 从来源表全量重建日汇总
+
+时间段的划分和展示属于业务逻辑, 由分析服务负责, 本DAO只负责数据访问.
+"""
+
+from datetime import date
+import logging
+from typing import Any
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.database import DatabaseManager
+from minicrm.data.database.database_schema import (
+    METRIC_ROLLUP_SOURCES,
+    metric_rollup_rebuild_sql,
+)
+
+
+class MetricRollupDAO:
+    """
+    业务指标汇总数据访问对象
+
+    metric_daily_rollups表中每个指标每天一行, 来源记录变化时由触发器
+    增量调整, 因此趋势查询的开销只与时间跨度有关, 与历史数据量无关.
+    """
+
+    # 时间粒度 -> 分组表达式, 结果与calculate_period_buckets的key一致
+    BUCKET_EXPRESSIONS = {
+        "daily": "bucket_date",
+        "weekly": "date(bucket_date, 'weekday 0', '-6 days')",
+        "monthly": "strftime('%Y-%m', bucket_date)",
+        "quarterly": (
+            "strftime('%Y', bucket_date) || '-Q' || "
+            "((CAST(strftime('%m', bucket_date) AS INTEGER) + 2) / 3)"
+        ),
+        "yearly": "strftime('%Y', bucket_date)",
+    }
+
+    def __init__(self, database_manager: DatabaseManager):
+        """
+        初始化业务指标汇总DAO
+
+        Args:
+            database_manager: 数据库管理器
+        """
+        self._db = database_manager
+        self._logger = logging.getLogger(__name__)
+
+    def get_series(
+        self, metric: str, granularity: str, start_date: date, end_date: date
+    ) -> dict[str, dict[str, Any]]:
+        """
+        按时间粒度统计指标
+
+        Args:
+            metric: 指标名 ("new_customers", "revenue", "quotes")
+            granularity: 时间粒度 ("daily", "weekly", "monthly", "quarterly", "yearly")
+            start_date: 开始日期(含)
+            end_date: 结束日期(不含)
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 时间段key到count和amount的映射,
+                没有数据的时间段不出现在结果中
+        """
+        self._validate_metric(metric)
+        bucket = self.BUCKET_EXPRESSIONS.get(granularity)
+        if bucket is None:
+            raise DatabaseError(f"不支持的时间粒度: {granularity}")
+
+        try:
+            sql = f"""
+            SELECT {bucket} AS bucket,
+                   SUM(event_count) AS count,
+                   SUM(total_amount) AS amount
+            FROM metric_daily_rollups
+            WHERE metric = ? AND bucket_date >= ? AND bucket_date < ?
+            GROUP BY bucket
+            ORDER BY bucket
+            """
+            results = self._db.execute_query(
+                sql, (metric, start_date.isoformat(), end_date.isoformat())
+            )
+            return {
+                row["bucket"]: {"count": row["count"], "amount": row["amount"]}
+                for row in results
+            }
+
+        except Exception as e:
+            self._logger.error(f"获取指标趋势失败: {metric}, 错误: {e}")
+            raise DatabaseError(f"获取指标趋势失败: {e}") from e
+
+    def get_count_before(self, metric: str, before_date: date) -> int:
+        """
+        统计指定日期之前的指标累计计数
+
+        Args:
+            metric: 指标名
+            before_date: 截止日期(不含)
+
+        Returns:
+            int: 累计计数
+        """
+        self._validate_metric(metric)
+
+        try:
+            sql = """
+            SELECT COALESCE(SUM(event_count), 0)
+            FROM metric_daily_rollups
+            WHERE metric = ? AND bucket_date < ?
+            """
+            result = self._db.execute_query(sql, (metric, before_date.isoformat()))
+            return result[0][0] if result else 0
+
+        except Exception as e:
+            self._logger.error(f"获取指标累计值失败: {metric}, 错误: {e}")
+            raise DatabaseError(f"获取指标累计值失败: {e}") from e
+
+    def rebuild(self) -> None:
+        """从来源表全量重建所有指标的日汇总, 用于修复或汇总规则变更后"""
+        try:
+            with self._db.transaction():
+                self._db.execute_delete("DELETE FROM metric_daily_rollups")
+                for metric in METRIC_ROLLUP_SOURCES:
+                    self._db.execute_insert(metric_rollup_rebuild_sql(metric))
+            self._logger.info("指标日汇总已重建")
+
+        except Exception as e:
+            self._logger.error(f"重建指标日汇总失败: {e}")
+            raise DatabaseError(f"重建指标日汇总失败: {e}") from e
+
+    def _validate_metric(self, metric: str) -> None:
+        """检查指标是否有汇总来源"""
+        if metric not in METRIC_ROLLUP_SOURCES:
+            raise DatabaseError(f"不支持的指标: {metric}")
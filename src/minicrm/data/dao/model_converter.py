@@ -1,7 +1,8 @@
 """
 MiniCRM 模型转换器
 
-负责模型与数据库记录之间的转换
+负责模型与数据库记录之间的转换.
+从数据库批量读取的行视为可信数据, 不在加载时验证; 模型写回数据库前验证.
 """
 
 import logging
@@ -88,6 +89,8 @@ class ModelConverter:
         """
         将数据库行列表转换为模型列表
 
+        使用模型的from_rows批量构建, 不清理字符串也不验证.
+
         Args:
             rows_data: 数据库行数据列表
             model_class: 模型类
@@ -99,13 +102,7 @@ class ModelConverter:
             if not rows_data:
                 return []
 
-            models = []
-            for row_data in rows_data:
-                model = self.row_to_model(row_data, model_class)
-                if model:
-                    models.append(model)
-
-            return models
+            return model_class.from_rows(row for row in rows_data if row)
 
         except Exception as e:
             self._logger.error(f"行数据列表转换为模型列表失败: {e}")
@@ -140,8 +137,12 @@ class ModelConverter:
 
         Returns:
             dict: 准备好的数据字典
+
+        Raises:
+            ValidationError: 模型数据无效时
         """
         try:
+            model.validate()
             data = self.model_to_dict(model)
 
             # 移除ID字段（由数据库自动生成）
@@ -166,8 +167,12 @@ class ModelConverter:
 
         Returns:
             dict: 准备好的数据字典
+
+        Raises:
+            ValidationError: 模型数据无效时
         """
         try:
+            model.validate()
             data = self.model_to_dict(model)
 
             # 移除ID字段（不应该更新ID）
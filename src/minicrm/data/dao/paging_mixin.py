@@ -0,0 +1,119 @@
+"""
+DAO分页查询混入类
+
+按表格筛选和排序条件在SQL中完成分页、统计和流式读取,
+供BaseDAO以及直接实现接口的客户、供应商DAO共用.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from minicrm.core.exceptions import DatabaseError
+
+from .sql_builder import SQLBuilder
+
+
+class PagingMixin:
+    """
+    分页查询混入类
+
+    使用者需要提供_db、_logger和_table_name属性以及_row_to_dict方法.
+    """
+
+    def fetch_page(
+        self,
+        offset: int,
+        limit: int,
+        sort: tuple[str, str] | None = None,
+        filters: dict[str, list[dict[str, Any]]] | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        按筛选和排序条件获取一页记录
+
+        筛选、排序和分页均在SQL中完成, 供表格等分页展示组件使用.
+
+        Args:
+            offset: 偏移量
+            limit: 每页数量
+            sort: (列名, "asc"或"desc")
+            filters: 筛选条件, 格式见SQLBuilder.build_filter_clause
+
+        Returns:
+            List[Dict[str, Any]]: 当前页记录
+        """
+        try:
+            sql, params = self._build_filtered_sql(sort, filters)
+            results = self._db.execute_query(
+                f"{sql} LIMIT ? OFFSET ?", (*params, limit, offset)
+            )
+            return [self._row_to_dict(row) for row in results]
+
+        except Exception as e:
+            self._logger.error(f"分页获取{self._table_name}记录失败: {e}")
+            raise DatabaseError(f"分页获取{self._table_name}记录失败: {e}") from e
+
+    def count_filtered(
+        self, filters: dict[str, list[dict[str, Any]]] | None = None
+    ) -> int:
+        """
+        统计满足筛选条件的记录数量
+
+        Args:
+            filters: 筛选条件, 格式见SQLBuilder.build_filter_clause
+
+        Returns:
+            int: 记录数量
+        """
+        try:
+            builder = SQLBuilder()
+            where_clause, params = builder.build_filter_clause(filters)
+            sql = builder.build_count_sql(self._table_name, where_clause or None)
+            result = self._db.execute_query(sql, tuple(params))
+            return result[0][0] if result else 0
+
+        except Exception as e:
+            self._logger.error(f"统计{self._table_name}记录失败: {e}")
+            raise DatabaseError(f"统计{self._table_name}记录失败: {e}") from e
+
+    def stream_filtered(
+        self,
+        sort: tuple[str, str] | None = None,
+        filters: dict[str, list[dict[str, Any]]] | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        按筛选和排序条件分批流式读取全部记录
+
+        与fetch_page使用相同的条件和顺序, 但通过数据库游标的fetchmany
+        逐批读取, 内存占用与结果集大小无关, 用于表格导出等全量场景.
+
+        Args:
+            sort: (列名, "asc"或"desc")
+            filters: 筛选条件, 格式见SQLBuilder.build_filter_clause
+            batch_size: 每批记录数
+
+        Yields:
+            List[Dict[str, Any]]: 每批记录
+        """
+        try:
+            sql, params = self._build_filtered_sql(sort, filters)
+            for batch in self._db.iter_query_batches(sql, params, batch_size):
+                yield [self._row_to_dict(row) for row in batch]
+
+        except Exception as e:
+            self._logger.error(f"流式读取{self._table_name}记录失败: {e}")
+            raise DatabaseError(f"流式读取{self._table_name}记录失败: {e}") from e
+
+    def _build_filtered_sql(
+        self,
+        sort: tuple[str, str] | None,
+        filters: dict[str, list[dict[str, Any]]] | None,
+    ) -> tuple[str, tuple[Any, ...]]:
+        """构建按筛选条件过滤并排序的查询, 不含分页"""
+        builder = SQLBuilder()
+        where_clause, params = builder.build_filter_clause(filters)
+        sql = f"SELECT * FROM {self._table_name}"
+        if where_clause:
+            sql += f" WHERE {where_clause}"
+        sql += f" ORDER BY {builder.build_order_clause(sort)}"
+        return sql, tuple(params)
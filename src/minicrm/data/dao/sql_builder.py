@@ -5,9 +5,13 @@ MiniCRM SQL构建器
 """
 
 import logging
+import re
 from typing import Any
 
 
+_IDENTIFIER_PATTERN = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
 class SQLBuilder:
     """SQL语句构建器"""
 
@@ -228,3 +232,147 @@ class SQLBuilder:
         except Exception as e:
             self._logger.error(f"构建WHERE子句失败: {e}")
             raise
+
+    def build_filter_clause(
+        self, filters: dict[str, list[dict[str, Any]]] | None
+    ) -> tuple[str, list]:
+        """
+        将表格筛选条件构建为WHERE子句
+
+        筛选条件格式为{"all": [...], "any": [...]}, all中的条件全部满足,
+        any中的条件至少满足一个. 每个条件包含column、operator、value和
+        可选的value2, operator取值见_build_filter_condition. 文本比较不区分
+        大小写, 与表格组件在内存中筛选的语义一致. all中不含column的条件
+        视为嵌套的筛选条件, 用于组合多组各自带any的筛选.
+
+        Args:
+            filters: 筛选条件
+
+        Returns:
+            tuple: (WHERE子句, 参数列表)
+        """
+        if not filters:
+            return "", []
+
+        clauses = []
+        params: list = []
+
+        for condition in filters.get("all", []):
+            if "column" in condition:
+                sql, condition_params = self._build_filter_condition(condition)
+            else:
+                sql, condition_params = self.build_filter_clause(condition)
+                if not sql:
+                    continue
+                sql = f"({sql})"
+            clauses.append(sql)
+            params.extend(condition_params)
+
+        any_clauses = []
+        for condition in filters.get("any", []):
+            sql, condition_params = self._build_filter_condition(condition)
+            any_clauses.append(sql)
+            params.extend(condition_params)
+        if any_clauses:
+            clauses.append("(" + " OR ".join(any_clauses) + ")")
+
+        return " AND ".join(clauses), params
+
+    def build_order_clause(self, sort: tuple[str, str] | None) -> str:
+        """
+        构建ORDER BY子句
+
+        以rowid作为次要排序键, 保证排序值相同时分页结果稳定.
+
+        Args:
+            sort: (列名, "asc"或"desc"), None表示按rowid排序
+
+        Returns:
+            str: ORDER BY子句(不含ORDER BY关键字)
+        """
+        if not sort:
+            return "rowid"
+
+        column, direction = sort
+        direction = direction.upper()
+        if direction not in ("ASC", "DESC"):
+            raise ValueError(f"无效的排序方向: {direction}")
+        return f"{self._validate_identifier(column)} {direction}, rowid {direction}"
+
+    def _build_filter_condition(self, condition: dict[str, Any]) -> tuple[str, list]:
+        """构建单个筛选条件"""
+        column = self._validate_identifier(condition["column"])
+        operator = condition["operator"]
+        value = condition.get("value")
+        value2 = condition.get("value2")
+
+        text = f"lower(COALESCE(CAST({column} AS TEXT), ''))"
+        number = f"CAST({column} AS REAL)"
+        value_text = "" if value is None else str(value).lower()
+
+        if operator == "equals":
+            return f"{text} = ?", [value_text]
+        if operator == "not_equals":
+            return f"{text} != ?", [value_text]
+        if operator in ("contains", "not_contains", "starts_with", "ends_with"):
+            escaped = self._escape_like(value_text)
+            pattern = {
+                "contains": f"%{escaped}%",
+                "not_contains": f"%{escaped}%",
+                "starts_with": f"{escaped}%",
+                "ends_with": f"%{escaped}",
+            }[operator]
+            negate = "NOT " if operator == "not_contains" else ""
+            return f"{text} {negate}LIKE ? ESCAPE '\\'", [pattern]
+        if operator in ("greater_than", "greater_equal", "less_than", "less_equal"):
+            symbol = {
+                "greater_than": ">",
+                "greater_equal": ">=",
+                "less_than": "<",
+                "less_equal": "<=",
+            }[operator]
+            return f"{number} {symbol} ?", [self._to_number(value)]
+        if operator == "between":
+            bounds = [
+                (f"{number} >= ?", value),
+                (f"{number} <= ?", value2),
+            ]
+            bounds = [(sql, bound) for sql, bound in bounds if bound not in (None, "")]
+            if not bounds:
+                return "1", []
+            return (
+                "(" + " AND ".join(sql for sql, _ in bounds) + ")",
+                [float(bound) for _, bound in bounds],
+            )
+        if operator in ("in_list", "not_in_list"):
+            items = [item.strip() for item in value_text.split(",")]
+            placeholders = ", ".join("?" for _ in items)
+            negate = "NOT " if operator == "not_in_list" else ""
+            return f"{text} {negate}IN ({placeholders})", items
+        if operator == "is_empty":
+            return f"{text} = ''", []
+        if operator == "is_not_empty":
+            return f"{text} != ''", []
+        if operator == "regex":
+            return f"{text} REGEXP ?", [value_text]
+
+        raise ValueError(f"不支持的筛选操作符: {operator}")
+
+    @staticmethod
+    def _validate_identifier(name: str) -> str:
+        """校验列名, 防止通过列名注入SQL"""
+        if not _IDENTIFIER_PATTERN.match(name):
+            raise ValueError(f"无效的列名: {name}")
+        return name
+
+    @staticmethod
+    def _escape_like(value: str) -> str:
+        """转义LIKE模式中的通配符"""
+        return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    @staticmethod
+    def _to_number(value: Any) -> float:
+        """将筛选值转换为数值, 空值按0处理"""
+        if value is None or value == "":
+            return 0.0
+        return float(value)
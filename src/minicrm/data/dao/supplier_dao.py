@@ -8,15 +8,19 @@
 """
 
 import logging
+from collections.abc import Iterator
 from datetime import datetime
 from typing import Any
 
 from minicrm.core.exceptions import DatabaseError
 from minicrm.core.interfaces.dao_interfaces import ISupplierDAO
+from minicrm.data.dao.batch_mixin import BatchOperationsMixin
+from minicrm.data.dao.paging_mixin import PagingMixin
 from minicrm.data.database import DatabaseManager
+from transfunctions.data_operations import create_crud_template
 
 
-class SupplierDAO(ISupplierDAO):
+class SupplierDAO(BatchOperationsMixin, PagingMixin, ISupplierDAO):
     """
     供应商数据访问对象实现
 
@@ -26,6 +30,18 @@ class SupplierDAO(ISupplierDAO):
     - 实现标准的CRUD接口
     """
 
+    # 插入语句, 单条插入和批量插入共用
+    _INSERT_SQL = """
+    INSERT INTO suppliers (
+        name, contact_person, phone, email, address,
+        quality_rating, cooperation_years, notes,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    # 批量写操作日志和错误信息中的记录名称
+    _record_label = "供应商数据"
+
     def __init__(self, database_manager: DatabaseManager):
         """
         初始化供应商DAO
@@ -36,37 +52,36 @@ class SupplierDAO(ISupplierDAO):
         self._db = database_manager
         self._logger = logging.getLogger(__name__)
         self._table_name = "suppliers"
+        # 批量写操作使用CRUD模板
+        self._crud_template = create_crud_template(
+            self._table_name, database_manager, self._logger
+        )
 
     def insert(self, data: dict[str, Any]) -> int:
         """插入供应商数据"""
         try:
-            sql = """
-            INSERT INTO suppliers (
-                name, contact_person, phone, email, address,
-                quality_rating, cooperation_years, notes,
-                created_at, updated_at
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """
-
-            params = (
-                data.get("name"),
-                data.get("contact_person"),
-                data.get("phone"),
-                data.get("email"),
-                data.get("address"),
-                data.get("quality_rating", 0.0),
-                data.get("cooperation_years", 0),
-                data.get("notes"),
-                data.get("created_at"),
-                data.get("updated_at"),
-            )
-
-            return self._db.execute_insert(sql, params)
+            params = tuple(self._insert_record(data).values())
+            return self._db.execute_insert(self._INSERT_SQL, params)
 
         except Exception as e:
             self._logger.error(f"插入供应商数据失败: {e}")
             raise DatabaseError(f"插入供应商数据失败: {e}") from e
 
+    def _insert_record(self, data: dict[str, Any]) -> dict[str, Any]:
+        """构造插入的字段和值, 顺序与_INSERT_SQL一致"""
+        return {
+            "name": data.get("name"),
+            "contact_person": data.get("contact_person"),
+            "phone": data.get("phone"),
+            "email": data.get("email"),
+            "address": data.get("address"),
+            "quality_rating": data.get("quality_rating", 0.0),
+            "cooperation_years": data.get("cooperation_years", 0),
+            "notes": data.get("notes"),
+            "created_at": data.get("created_at"),
+            "updated_at": data.get("updated_at"),
+        }
+
     def get_by_id(self, record_id: int) -> dict[str, Any] | None:
         """根据ID获取供应商记录"""
         try:
@@ -125,35 +140,60 @@ class SupplierDAO(ISupplierDAO):
     ) -> list[dict[str, Any]]:
         """搜索供应商记录"""
         try:
-            sql = "SELECT * FROM suppliers"
-            params = []
-
-            if conditions:
-                where_clauses = []
-                for key, value in conditions.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-
-                if where_clauses:
-                    sql += " WHERE " + " AND ".join(where_clauses)
-
-            if order_by:
-                sql += f" ORDER BY {order_by}"
-            else:
-                sql += " ORDER BY created_at DESC"
+            sql, params = self._build_search_sql(conditions, order_by)
 
             if limit:
                 sql += f" LIMIT {limit}"
                 if offset:
                     sql += f" OFFSET {offset}"
 
-            results = self._db.execute_query(sql, tuple(params))
+            results = self._db.execute_query(sql, params)
             return [self._row_to_dict(row) for row in results]
 
         except Exception as e:
             self._logger.error(f"搜索供应商记录失败: {e}")
             raise DatabaseError(f"搜索供应商记录失败: {e}") from e
 
+    def stream_batches(
+        self,
+        conditions: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """按批次流式读取供应商记录(基于游标fetchmany, 常量内存)"""
+        sql, params = self._build_search_sql(conditions, order_by)
+        try:
+            for batch in self._db.iter_query_batches(sql, params, batch_size):
+                yield [self._row_to_dict(row) for row in batch]
+        except DatabaseError:
+            raise
+        except Exception as e:
+            self._logger.error(f"流式读取供应商记录失败: {e}")
+            raise DatabaseError(f"流式读取供应商记录失败: {e}") from e
+
+    def _build_search_sql(
+        self, conditions: dict[str, Any] | None, order_by: str | None
+    ) -> tuple[str, tuple[Any, ...]]:
+        """构建供应商搜索SQL(不含分页)"""
+        sql = "SELECT * FROM suppliers"
+        params = []
+
+        if conditions:
+            where_clauses = []
+            for key, value in conditions.items():
+                where_clauses.append(f"{key} = ?")
+                params.append(value)
+
+            if where_clauses:
+                sql += " WHERE " + " AND ".join(where_clauses)
+
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+        else:
+            sql += " ORDER BY created_at DESC"
+
+        return sql, tuple(params)
+
     def count(self, conditions: dict[str, Any] | None = None) -> int:
         """统计供应商记录数量"""
         try:
@@ -0,0 +1,129 @@
+"""
+表结构统计数据访问对象
+
+为分页和搜索提供表的结构与统计信息:
+- 每个索引的首列, 用于判断排序字段是否有可用于键集分页的索引
+- ANALYZE写入sqlite_stat1的行数统计, 用于在不执行COUNT(*)的情况下估算结果数量
+
+索引信息按表缓存, 数据库结构版本(schema_version)变化时重新读取.
+"""
+
+import logging
+import threading
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.database import DatabaseManager
+
+
+class TableStatsDAO:
+    """
+    表结构统计数据访问对象
+
+    SQLite的二级索引隐含以rowid结尾, 所以以某列开头的索引同时支持
+    按(该列, id)排序和键集比较; 整数主键id本身总是可用于排序.
+    """
+
+    def __init__(self, database_manager: DatabaseManager):
+        """
+        初始化表结构统计DAO
+
+        Args:
+            database_manager: 数据库管理器
+        """
+        self._db = database_manager
+        self._logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+        self._schema_version: int | None = None
+        self._leading_columns: dict[str, dict[str, str]] = {}
+
+    def get_indexed_columns(self, table_name: str) -> dict[str, str]:
+        """
+        获取表中可用于排序的列
+
+        Args:
+            table_name: 表名
+
+        Returns:
+            Dict[str, str]: 列名 -> 以该列开头的索引名, 整数主键映射为"PRIMARY KEY"
+        """
+        try:
+            schema_version = self._db.execute_query("PRAGMA schema_version")[0][0]
+            with self._lock:
+                if schema_version != self._schema_version:
+                    self._leading_columns.clear()
+                    self._schema_version = schema_version
+                cached = self._leading_columns.get(table_name)
+            if cached is not None:
+                return cached
+
+            columns: dict[str, str] = {}
+            for column in self._db.execute_query(f"PRAGMA table_info({table_name})"):
+                if column["pk"] == 1 and column["type"].upper() == "INTEGER":
+                    columns[column["name"]] = "PRIMARY KEY"
+
+            for index in self._db.execute_query(f"PRAGMA index_list({table_name})"):
+                if index["partial"]:
+                    continue
+                index_columns = self._db.execute_query(
+                    f"PRAGMA index_info({index['name']})"
+                )
+                first = min(index_columns, key=lambda col: col["seqno"], default=None)
+                if first is not None and first["name"]:
+                    columns.setdefault(first["name"], index["name"])
+
+            with self._lock:
+                self._leading_columns[table_name] = columns
+            return columns
+
+        except Exception as e:
+            self._logger.error(f"读取{table_name}索引信息失败: {e}")
+            raise DatabaseError(f"读取{table_name}索引信息失败: {e}") from e
+
+    def estimate_row_count(
+        self, table_name: str, equal_columns: tuple[str, ...] = ()
+    ) -> int | None:
+        """
+        根据sqlite_stat1估算行数
+
+        Args:
+            table_name: 表名
+            equal_columns: 以等值条件筛选的列, 用以该列开头的索引
+                每个取值的平均行数缩小估算结果
+
+        Returns:
+            Optional[int]: 估算行数; 数据库尚未执行ANALYZE,
+                或某列没有可用的索引统计时返回None
+        """
+        try:
+            has_stats = self._db.execute_query(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' "
+                "AND name = 'sqlite_stat1'"
+            )
+            if not has_stats:
+                return None
+
+            # stat的第一个数是行数, 第二个数是索引首列每个取值的平均行数
+            stats = {
+                row["idx"]: [int(p) for p in row["stat"].split() if p.isdigit()]
+                for row in self._db.execute_query(
+                    "SELECT idx, stat FROM sqlite_stat1 WHERE tbl = ?", (table_name,)
+                )
+            }
+            row_counts = [stat[0] for stat in stats.values() if stat]
+            if not row_counts:
+                return None
+
+            estimate = max(row_counts)
+            if equal_columns:
+                indexed = self.get_indexed_columns(table_name)
+                for column in equal_columns:
+                    stat = stats.get(indexed.get(column), [])
+                    if len(stat) < 2:
+                        # 条件无法用索引统计缩小, 表行数会严重高估结果数量
+                        return None
+                    estimate = min(estimate, stat[1])
+            return estimate
+
+        except Exception as e:
+            self._logger.error(f"估算{table_name}行数失败: {e}")
+            raise DatabaseError(f"估算{table_name}行数失败: {e}") from e
@@ -6,6 +6,9 @@ MiniCRM 数据库管理器核心
 
 import logging
 import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
@@ -14,6 +17,14 @@ from typing import Any
 from ...core.database_index_manager import get_index_manager
 from ...core.database_query_optimizer import get_query_optimizer
 from ...core.exceptions import DatabaseError
+from ...core.sql_table_parser import (
+    ALL_TABLES,
+    extract_trigger_write_tables,
+    extract_write_tables,
+    is_read_query,
+)
+from ...core.startup_timeline import get_startup_timeline
+from ..connection_pool import ConnectionPool, register_sql_functions
 
 
 class DatabaseManager:
@@ -21,19 +32,45 @@ class DatabaseManager:
     数据库管理器核心类
 
     负责数据库连接、事务管理和基本CRUD操作.
+
+    连接模型:
+    - 一个写连接(self._connection), 所有写操作和事务通过锁串行执行
+    - WAL模式下的只读连接池, SELECT查询在各线程间并发执行
+    - 事务内的查询始终走写连接, 以便读取到未提交的修改
+
+    写通知:
+    - 每次写操作提交后, 以被修改的表名集合通知写监听器(如查询缓存)
+    - 事务内的写操作延迟到最外层事务结束时统一通知
+    - 触发器和外键级联修改的表根据数据库模式推导
+    - 直接使用事务连接的写入无法确定具体的表, 此时通知ALL_TABLES
     """
 
-    def __init__(self, db_path: Path):
+    def __init__(self, db_path: Path, max_readers: int = 4):
         """
         初始化数据库管理器
 
         Args:
             db_path: 数据库文件路径
+            max_readers: 只读连接池的最大连接数, 0表示所有查询都使用写连接
         """
         self._db_path = Path(db_path)
         self._connection: sqlite3.Connection | None = None
         self._logger = logging.getLogger(__name__)
 
+        # 读写分离: 只读连接池 + 串行化的写连接
+        self._max_readers = max_readers
+        self._read_pool: ConnectionPool | None = None
+        self._write_lock = threading.RLock()
+        self._thread_state = threading.local()
+        self._write_count = 0
+        self._write_waits = 0
+        self._total_write_wait = 0.0
+
+        # 写监听器, 参数为被修改的表名集合
+        self._write_listeners: list[Callable[[frozenset[str]], None]] = []
+        # 表 -> 因触发器或外键级联而可能被连带修改的表, 模式变更后重新加载
+        self._write_side_effects: dict[str, set[str]] | None = None
+
         # 确保数据库目录存在
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
 
@@ -45,36 +82,49 @@ class DatabaseManager:
 
     def initialize_database(self) -> None:
         """初始化数据库"""
-        try:
-            self._connect()
+        timeline = get_startup_timeline()
+        with self._write_lock:
+            try:
+                with timeline.phase("database_connect"):
+                    if not self._connection:
+                        self._connect()
 
-            # 导入其他模块来完成初始化
-            from .database_initializer import DatabaseInitializer
-            from .database_schema import DatabaseSchema
+                # 导入其他模块来完成初始化
+                from .database_initializer import DatabaseInitializer
+                from .database_schema import DatabaseSchema
 
-            schema = DatabaseSchema()
-            initializer = DatabaseInitializer(self._connection)
+                schema = DatabaseSchema()
+                initializer = DatabaseInitializer(self._connection)
 
-            # 创建表结构
-            schema.create_tables(self._connection)
+                with timeline.phase("database_schema"):
+                    # 创建表结构
+                    schema.create_tables(self._connection)
 
-            # 创建索引
-            schema.create_indexes(self._connection)
+                    # 创建索引
+                    schema.create_indexes(self._connection)
 
-            # 插入初始数据
-            initializer.insert_initial_data()
+                    # 创建触发器
+                    schema.create_triggers(self._connection)
 
-            self._connection.commit()
+                    # 创建全文索引
+                    schema.create_search_index(self._connection)
 
-            # 初始化优化器和索引管理器
-            self._initialize_optimizers()
+                # 插入初始数据
+                with timeline.phase("database_initial_data"):
+                    initializer.insert_initial_data()
 
-            self._logger.info("数据库初始化完成")
+                self._connection.commit()
 
-        except Exception as e:
-            if self._connection:
-                self._connection.rollback()
-            raise DatabaseError(f"数据库初始化失败: {e}") from e
+                # 初始化优化器和索引管理器
+                with timeline.phase("database_optimizers"):
+                    self._initialize_optimizers()
+
+                self._logger.info("数据库初始化完成")
+
+            except Exception as e:
+                if self._connection:
+                    self._connection.rollback()
+                raise DatabaseError(f"数据库初始化失败: {e}") from e
 
     def _connect(self) -> None:
         """创建数据库连接"""
@@ -85,18 +135,75 @@ class DatabaseManager:
 
             # 设置行工厂,使查询结果可以通过列名访问
             self._connection.row_factory = sqlite3.Row
+            register_sql_functions(self._connection)
 
             # 启用外键约束
             self._connection.execute("PRAGMA foreign_keys = ON")
 
             # 设置WAL模式以提高并发性能
-            self._connection.execute("PRAGMA journal_mode = WAL")
+            journal_mode = self._connection.execute(
+                "PRAGMA journal_mode = WAL"
+            ).fetchone()[0]
 
             self._logger.debug("数据库连接已建立")
 
         except Exception as e:
             raise DatabaseError(f"数据库连接失败: {e}") from e
 
+        # 只有WAL模式下读连接才能与写连接并发, 内存数据库等情况退回单连接
+        if str(journal_mode).lower() == "wal":
+            self._init_read_pool()
+
+    def _init_read_pool(self) -> None:
+        """创建只读连接池并注册到性能监控器"""
+        if self._max_readers <= 0 or self._read_pool is not None:
+            return
+
+        self._read_pool = ConnectionPool(
+            self._db_path, self._max_readers, read_only=True
+        )
+
+        try:
+            from ...core.performance_monitor import performance_monitor
+
+            performance_monitor.register_stats_provider(
+                "database_pool", self.get_pool_stats
+            )
+        except ImportError:
+            # 性能监控依赖psutil, 未安装时仅跳过统计注册
+            self._logger.debug("性能监控不可用, 跳过连接池统计注册")
+
+        self._logger.debug(f"只读连接池已创建, 最大连接数: {self._max_readers}")
+
+    @contextmanager
+    def _writer(self):
+        """
+        获取写连接的上下文管理器
+
+        写连接在多个线程之间通过锁串行使用, 并记录等待时间.
+        """
+        start = time.perf_counter()
+        with self._write_lock:
+            waited = time.perf_counter() - start
+            self._write_count += 1
+            if waited > 0.001:
+                self._write_waits += 1
+                self._total_write_wait += waited
+
+            if not self._connection:
+                self._connect()
+            yield self._connection
+
+    def _in_transaction(self) -> bool:
+        """当前线程是否处于transaction()上下文中"""
+        return getattr(self._thread_state, "transaction_depth", 0) > 0
+
+    def _use_read_pool(self, sql: str) -> bool:
+        """判断查询是否可以交给只读连接池执行"""
+        if self._read_pool is None or self._in_transaction():
+            return False
+        return is_read_query(sql)
+
     @contextmanager
     def transaction(self):
         """
@@ -107,15 +214,157 @@ class DatabaseManager:
                 # 执行数据库操作
                 pass
         """
-        if not self._connection:
-            self._connect()
+        with self._writer() as connection:
+            state = self._thread_state
+            state.transaction_depth = getattr(state, "transaction_depth", 0) + 1
+            if state.transaction_depth == 1:
+                state.pending_writes = set()
+                state.recorded_changes = 0
+                changes_before = connection.total_changes
+            try:
+                yield connection
+                connection.commit()
+            except Exception as e:
+                connection.rollback()
+                raise DatabaseError(f"事务执行失败: {e}") from e
+            finally:
+                state.transaction_depth -= 1
+                if state.transaction_depth == 0:
+                    self._finish_transaction_writes(
+                        connection.total_changes - changes_before
+                    )
+
+    def _finish_transaction_writes(self, total_changes: int) -> None:
+        """
+        最外层事务结束时通知事务内的写操作
+
+        回滚时同样通知, 以便失效事务期间读取到的未提交数据.
+
+        Args:
+            total_changes: 事务期间连接上的总修改行数
+        """
+        state = self._thread_state
+        tables = state.pending_writes
+        if total_changes > state.recorded_changes:
+            # 直接通过事务连接执行的写入, 无法确定修改了哪些表
+            tables.add(ALL_TABLES)
+        state.pending_writes = set()
+        state.recorded_changes = 0
+        if tables:
+            self._notify_write(frozenset(tables))
+
+    def add_write_listener(self, listener: Callable[[frozenset[str]], None]) -> None:
+        """
+        注册写监听器
+
+        Args:
+            listener: 回调函数, 参数为被修改的表名集合(小写);
+                包含ALL_TABLES时表示可能修改了任意表
+        """
+        if listener not in self._write_listeners:
+            self._write_listeners.append(listener)
+
+    def remove_write_listener(self, listener: Callable[[frozenset[str]], None]) -> None:
+        """
+        注销写监听器
+
+        Args:
+            listener: 已注册的回调函数
+        """
+        if listener in self._write_listeners:
+            self._write_listeners.remove(listener)
+
+    def _record_write(self, sql: str, changes: int, rowcount: int) -> None:
+        """
+        记录一次写操作, 事务外立即通知, 事务内延迟到事务结束
+
+        Args:
+            sql: 执行的写语句
+            changes: 执行前后连接total_changes的差值
+            rowcount: 语句本身报告的影响行数
+        """
+        tables = extract_write_tables(sql)
+        if ALL_TABLES in tables:
+            # 模式可能已变更, 下次需要时重新加载触发器和外键信息
+            self._write_side_effects = None
+        elif changes > max(rowcount, 0):
+            # 外键级联或触发器修改了其他表
+            tables = self._expand_side_effects(tables)
+
+        if self._in_transaction():
+            state = self._thread_state
+            state.pending_writes.update(tables)
+            state.recorded_changes += changes
+        else:
+            self._notify_write(tables)
+
+    def _expand_side_effects(self, tables: frozenset[str]) -> frozenset[str]:
+        """
+        将写入的表扩展为包含触发器和外键级联连带修改的表
+
+        Args:
+            tables: 语句直接修改的表
+
+        Returns:
+            frozenset[str]: 扩展后的表集合, 无法解释连带修改时为{ALL_TABLES}
+        """
+        if self._write_side_effects is None:
+            self._write_side_effects = self._load_write_side_effects()
+
+        expanded = set(tables)
+        pending = list(tables)
+        while pending:
+            for dependent in self._write_side_effects.get(pending.pop(), ()):
+                if dependent not in expanded:
+                    expanded.add(dependent)
+                    pending.append(dependent)
+
+        if expanded == tables or ALL_TABLES in expanded:
+            return frozenset({ALL_TABLES})
+        return frozenset(expanded)
+
+    def _load_write_side_effects(self) -> dict[str, set[str]]:
+        """从数据库模式读取触发器目标表和级联外键"""
+        side_effects: dict[str, set[str]] = {}
+        connection = self._connection
+        if connection is None:
+            return side_effects
 
         try:
-            yield self._connection
-            self._connection.commit()
-        except Exception as e:
-            self._connection.rollback()
-            raise DatabaseError(f"事务执行失败: {e}") from e
+            for row in connection.execute(
+                "SELECT tbl_name, sql FROM sqlite_master WHERE type = 'trigger'"
+            ):
+                side_effects.setdefault(row[0].lower(), set()).update(
+                    extract_trigger_write_tables(row[1] or "")
+                )
+
+            tables = [
+                row[0]
+                for row in connection.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table'"
+                )
+            ]
+            for child in tables:
+                for foreign_key in connection.execute(
+                    f'PRAGMA foreign_key_list("{child}")'
+                ):
+                    actions = {foreign_key["on_update"], foreign_key["on_delete"]}
+                    if actions & {"CASCADE", "SET NULL", "SET DEFAULT"}:
+                        side_effects.setdefault(
+                            foreign_key["table"].lower(), set()
+                        ).add(child.lower())
+        except sqlite3.Error as e:
+            self._logger.warning(f"读取触发器和外键信息失败: {e}")
+
+        return side_effects
+
+    def _notify_write(self, tables: frozenset[str]) -> None:
+        """通知所有写监听器, 监听器异常不影响写操作本身"""
+        for listener in tuple(self._write_listeners):
+            try:
+                listener(tables)
+            except Exception as e:
+                self._logger.error(f"写监听器执行失败: {e}")
 
     def execute_query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
         """
@@ -129,17 +378,102 @@ class DatabaseManager:
             查询结果列表
         """
         if not self._connection:
-            self._connect()
+            with self._write_lock:
+                if not self._connection:
+                    self._connect()
 
         try:
-            cursor = self._connection.execute(sql, params)
-            results = cursor.fetchall()
+            if self._use_read_pool(sql):
+                connection = self._read_pool.get_connection()
+                try:
+                    results = connection.execute(sql, params).fetchall()
+                finally:
+                    self._read_pool.return_connection(connection)
+            else:
+                with self._writer() as connection:
+                    results = connection.execute(sql, params).fetchall()
             self._logger.debug(f"查询执行成功,返回 {len(results)} 条记录")
             return results
         except Exception as e:
             self._logger.error(f"查询执行失败: {sql}, 参数: {params}, 错误: {e}")
             raise DatabaseError(f"查询执行失败: {e}", sql) from e
 
+    def iter_query_batches(
+        self, sql: str, params: tuple = (), batch_size: int = 500
+    ) -> Iterator[list[sqlite3.Row]]:
+        """
+        以固定大小的批次流式读取查询结果
+
+        在整个迭代期间持有同一个游标, 使用fetchmany逐批读取,
+        内存占用只与batch_size有关, 与结果集大小无关.
+        没有只读连接池时迭代期间会占用写连接, 应尽快消费完毕.
+
+        Args:
+            sql: SQL查询语句
+            params: 查询参数
+            batch_size: 每批返回的行数
+
+        Yields:
+            每批查询结果
+        """
+        if not self._connection:
+            with self._write_lock:
+                if not self._connection:
+                    self._connect()
+
+        if self._use_read_pool(sql):
+            connection = self._read_pool.get_connection()
+            try:
+                yield from self._fetch_batches(connection, sql, params, batch_size)
+            finally:
+                self._read_pool.return_connection(connection)
+        else:
+            with self._writer() as connection:
+                yield from self._fetch_batches(connection, sql, params, batch_size)
+
+    def iter_query(
+        self, sql: str, params: tuple = (), batch_size: int = 500
+    ) -> Iterator[sqlite3.Row]:
+        """
+        逐行流式读取查询结果
+
+        Args:
+            sql: SQL查询语句
+            params: 查询参数
+            batch_size: 底层fetchmany的批次大小
+
+        Yields:
+            查询结果行
+        """
+        for batch in self.iter_query_batches(sql, params, batch_size):
+            yield from batch
+
+    def _fetch_batches(
+        self,
+        connection: sqlite3.Connection,
+        sql: str,
+        params: tuple,
+        batch_size: int,
+    ) -> Iterator[list[sqlite3.Row]]:
+        """在给定连接上执行查询并按批次读取"""
+        try:
+            cursor = connection.execute(sql, params)
+        except Exception as e:
+            self._logger.error(f"查询执行失败: {sql}, 参数: {params}, 错误: {e}")
+            raise DatabaseError(f"查询执行失败: {e}", sql) from e
+
+        total = 0
+        try:
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                total += len(batch)
+                yield batch
+        finally:
+            cursor.close()
+            self._logger.debug(f"流式查询结束,共读取 {total} 条记录")
+
     def execute_insert(self, sql: str, params: tuple = ()) -> int:
         """
         执行插入语句
@@ -151,19 +485,22 @@ class DatabaseManager:
         Returns:
             新插入记录的ID
         """
-        if not self._connection:
-            self._connect()
-
-        try:
-            cursor = self._connection.execute(sql, params)
-            self._connection.commit()
-            record_id = cursor.lastrowid
-            self._logger.debug(f"插入执行成功,新记录ID: {record_id}")
-            return record_id
-        except Exception as e:
-            self._connection.rollback()
-            self._logger.error(f"插入执行失败: {sql}, 参数: {params}, 错误: {e}")
-            raise DatabaseError(f"插入执行失败: {e}", sql) from e
+        with self._writer() as connection:
+            try:
+                changes_before = connection.total_changes
+                cursor = connection.execute(sql, params)
+                if not self._in_transaction():
+                    connection.commit()
+                self._record_write(
+                    sql, connection.total_changes - changes_before, cursor.rowcount
+                )
+                record_id = cursor.lastrowid
+                self._logger.debug(f"插入执行成功,新记录ID: {record_id}")
+                return record_id
+            except Exception as e:
+                connection.rollback()
+                self._logger.error(f"插入执行失败: {sql}, 参数: {params}, 错误: {e}")
+                raise DatabaseError(f"插入执行失败: {e}", sql) from e
 
     def execute_update(self, sql: str, params: tuple = ()) -> int:
         """
@@ -176,19 +513,22 @@ class DatabaseManager:
         Returns:
             受影响的行数
         """
-        if not self._connection:
-            self._connect()
-
-        try:
-            cursor = self._connection.execute(sql, params)
-            self._connection.commit()
-            affected_rows = cursor.rowcount
-            self._logger.debug(f"更新执行成功,影响 {affected_rows} 行")
-            return affected_rows
-        except Exception as e:
-            self._connection.rollback()
-            self._logger.error(f"更新执行失败: {sql}, 参数: {params}, 错误: {e}")
-            raise DatabaseError(f"更新执行失败: {e}", sql) from e
+        with self._writer() as connection:
+            try:
+                changes_before = connection.total_changes
+                cursor = connection.execute(sql, params)
+                if not self._in_transaction():
+                    connection.commit()
+                self._record_write(
+                    sql, connection.total_changes - changes_before, cursor.rowcount
+                )
+                affected_rows = cursor.rowcount
+                self._logger.debug(f"更新执行成功,影响 {affected_rows} 行")
+                return affected_rows
+            except Exception as e:
+                connection.rollback()
+                self._logger.error(f"更新执行失败: {sql}, 参数: {params}, 错误: {e}")
+                raise DatabaseError(f"更新执行失败: {e}", sql) from e
 
     def execute_delete(self, sql: str, params: tuple = ()) -> int:
         """
@@ -201,19 +541,52 @@ class DatabaseManager:
         Returns:
             删除的行数
         """
-        if not self._connection:
-            self._connect()
+        with self._writer() as connection:
+            try:
+                changes_before = connection.total_changes
+                cursor = connection.execute(sql, params)
+                if not self._in_transaction():
+                    connection.commit()
+                self._record_write(
+                    sql, connection.total_changes - changes_before, cursor.rowcount
+                )
+                deleted_rows = cursor.rowcount
+                self._logger.debug(f"删除执行成功,删除 {deleted_rows} 行")
+                return deleted_rows
+            except Exception as e:
+                connection.rollback()
+                self._logger.error(f"删除执行失败: {sql}, 参数: {params}, 错误: {e}")
+                raise DatabaseError(f"删除执行失败: {e}", sql) from e
 
-        try:
-            cursor = self._connection.execute(sql, params)
-            self._connection.commit()
-            deleted_rows = cursor.rowcount
-            self._logger.debug(f"删除执行成功,删除 {deleted_rows} 行")
-            return deleted_rows
-        except Exception as e:
-            self._connection.rollback()
-            self._logger.error(f"删除执行失败: {sql}, 参数: {params}, 错误: {e}")
-            raise DatabaseError(f"删除执行失败: {e}", sql) from e
+    def execute_many(self, sql: str, params_seq: Iterable[tuple]) -> int:
+        """
+        使用executemany批量执行同一条写语句
+
+        事务外整批作为一个事务提交; 事务内随外层事务提交.
+
+        Args:
+            sql: SQL写语句
+            params_seq: 参数序列
+
+        Returns:
+            受影响的总行数
+        """
+        with self._writer() as connection:
+            try:
+                changes_before = connection.total_changes
+                cursor = connection.executemany(sql, params_seq)
+                if not self._in_transaction():
+                    connection.commit()
+                affected_rows = cursor.rowcount
+                self._record_write(
+                    sql, connection.total_changes - changes_before, affected_rows
+                )
+                self._logger.debug(f"批量执行成功,影响 {affected_rows} 行")
+                return affected_rows
+            except Exception as e:
+                connection.rollback()
+                self._logger.error(f"批量执行失败: {sql}, 错误: {e}")
+                raise DatabaseError(f"批量执行失败: {e}", sql) from e
 
     def get_table_info(self, table_name: str) -> list[dict[str, Any]]:
         """
@@ -254,18 +627,16 @@ class DatabaseManager:
             备份是否成功
         """
         try:
-            if not self._connection:
-                self._connect()
-
             backup_path = Path(backup_path)
             backup_path.parent.mkdir(parents=True, exist_ok=True)
 
-            # 创建备份连接
-            backup_conn = sqlite3.connect(backup_path)
+            with self._writer() as connection:
+                # 创建备份连接
+                backup_conn = sqlite3.connect(backup_path)
 
-            # 执行备份
-            self._connection.backup(backup_conn)
-            backup_conn.close()
+                # 执行备份
+                connection.backup(backup_conn)
+                backup_conn.close()
 
             self._logger.info(f"数据库备份成功: {backup_path}")
             return True
@@ -277,13 +648,48 @@ class DatabaseManager:
     def close(self) -> None:
         """关闭数据库连接"""
         try:
-            if self._connection:
-                self._connection.close()
-                self._connection = None
-                self._logger.debug("数据库连接已关闭")
+            if self._read_pool:
+                self._read_pool.close_all()
+                self._read_pool = None
+                self._unregister_pool_stats()
+
+            with self._write_lock:
+                if self._connection:
+                    self._connection.close()
+                    self._connection = None
+                    self._logger.debug("数据库连接已关闭")
         except Exception as e:
             self._logger.error(f"关闭数据库连接时出错: {e}")
 
+    def _unregister_pool_stats(self) -> None:
+        """从性能监控器注销连接池统计"""
+        try:
+            from ...core.performance_monitor import performance_monitor
+
+            performance_monitor.unregister_stats_provider("database_pool")
+        except ImportError:
+            pass
+
+    def get_pool_stats(self) -> dict[str, Any]:
+        """
+        获取连接池统计信息
+
+        Returns:
+            Dict[str, Any]: 读连接池和写连接的统计信息
+        """
+        write_waits = self._write_waits
+        return {
+            "readers": self._read_pool.get_stats() if self._read_pool else None,
+            "writer": {
+                "checkouts": self._write_count,
+                "waits": write_waits,
+                "total_wait_ms": self._total_write_wait * 1000,
+                "avg_wait_ms": (self._total_write_wait * 1000 / write_waits)
+                if write_waits
+                else 0.0,
+            },
+        }
+
     @property
     def is_connected(self) -> bool:
         """检查是否已连接到数据库"""
@@ -4,11 +4,96 @@ MiniCRM 数据库模式定义
 定义数据库表结构和索引。
 """
 
+import logging
 import sqlite3
 
 from ...core.exceptions import DatabaseError
 
 
+# 按日汇总的业务指标: 指标 -> (来源表, 归属日期, 金额, 计入条件)
+# 表达式中的{row}在触发器中替换为NEW/OLD, 在全量重建时替换为来源表别名
+METRIC_ROLLUP_SOURCES: dict[str, tuple[str, str, str, str]] = {
+    "new_customers": ("customers", "{row}.created_at", "0", "1"),
+    "revenue": (
+        "financial_records",
+        "COALESCE({row}.paid_date, {row}.created_at)",
+        "{row}.amount",
+        "{row}.customer_id IS NOT NULL AND {row}.record_type = 'payment'",
+    ),
+    "quotes": (
+        "quotes",
+        "COALESCE({row}.quote_date, {row}.created_at)",
+        "{row}.total_amount",
+        "1",
+    ),
+}
+
+
+# 维护变更计数的表, 每次增删改都会使对应计数加一, 用于判断缓存的分析结果是否过期
+CHANGE_COUNTED_TABLES = (
+    "customers",
+    "suppliers",
+    "quotes",
+    "contracts",
+    "customer_interactions",
+    "supplier_interactions",
+    "financial_records",
+    "tasks",
+)
+
+
+def metric_rollup_rebuild_sql(metric: str) -> str:
+    """
+    生成从来源表全量重建单个指标日汇总的SQL
+
+    Args:
+        metric: METRIC_ROLLUP_SOURCES中的指标名
+
+    Returns:
+        str: INSERT ... SELECT语句
+    """
+    table, bucket, amount, condition = (
+        part.format(row="src") for part in METRIC_ROLLUP_SOURCES[metric]
+    )
+    return f"""
+        INSERT INTO metric_daily_rollups
+            (metric, bucket_date, event_count, total_amount)
+        SELECT '{metric}', date({bucket}), COUNT(*), COALESCE(SUM({amount}), 0)
+        FROM {table} AS src
+        WHERE ({condition}) AND date({bucket}) IS NOT NULL
+        GROUP BY date({bucket})
+    """
+
+
+# 互动全文索引来源: 关联方类型 -> (互动表, 关联方外键, 关联方表, rowid偏移)
+# 索引rowid为"互动ID * 2 + 偏移", 使两张互动表的记录在同一索引中互不冲突
+INTERACTION_SEARCH_SOURCES: dict[str, tuple[str, str, str, int]] = {
+    "customer": ("customer_interactions", "customer_id", "customers", 0),
+    "supplier": ("supplier_interactions", "supplier_id", "suppliers", 1),
+}
+
+
+def interaction_search_rebuild_sql(party_type: str) -> str:
+    """
+    生成从互动表全量重建单类关联方全文索引的SQL
+
+    Args:
+        party_type: INTERACTION_SEARCH_SOURCES中的关联方类型
+
+    Returns:
+        str: INSERT ... SELECT语句
+    """
+    table, party_column, party_table, offset = INTERACTION_SEARCH_SOURCES[party_type]
+    return f"""
+        INSERT INTO interaction_search
+            (rowid, subject, content, party_name, party_type, party_id, interaction_id)
+        SELECT i.id * 2 + {offset}, i.subject, i.content, p.name,
+               '{party_type}', i.{party_column}, i.id
+        FROM {table} AS i
+        LEFT JOIN {party_table} AS p ON p.id = i.{party_column}
+    """
+
+
 class DatabaseSchema:
     """
     数据库模式管理器
@@ -16,6 +101,9 @@ class DatabaseSchema:
     负责创建和管理数据库表结构和索引。
     """
 
+    def __init__(self):
+        self._logger = logging.getLogger(__name__)
+
     def create_tables(self, connection: sqlite3.Connection) -> None:
         """创建数据库表结构"""
         try:
@@ -216,6 +304,50 @@ class DatabaseSchema:
                 )
             """)
 
+            # 客户价值评分表(预计算, 由触发器标记需要重算的客户)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS customer_value_scores (
+                    customer_id INTEGER PRIMARY KEY,
+                    value_score REAL,
+                    ranking_score REAL,
+                    value_level TEXT,
+                    is_dirty INTEGER NOT NULL DEFAULT 1,
+                    dirty_version INTEGER NOT NULL DEFAULT 0,
+                    computed_at TIMESTAMP,
+                    FOREIGN KEY (customer_id) REFERENCES customers (id) ON DELETE CASCADE
+                )
+            """)
+
+            # 业务指标日汇总表(由触发器增量维护, 供趋势查询按周期聚合)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS metric_daily_rollups (
+                    metric TEXT NOT NULL,
+                    bucket_date DATE NOT NULL,
+                    event_count INTEGER NOT NULL DEFAULT 0,
+                    total_amount REAL NOT NULL DEFAULT 0,
+                    PRIMARY KEY (metric, bucket_date)
+                ) WITHOUT ROWID
+            """)
+
+            # 表变更计数(由触发器维护, 分析快照据此判断数据版本)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS table_change_counters (
+                    table_name TEXT PRIMARY KEY,
+                    change_count INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID
+            """)
+
+            # 分析结果快照表(保存最近一次计算结果及其数据版本, 跨重启复用)
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS analytics_snapshots (
+                    name TEXT PRIMARY KEY,
+                    data_version TEXT NOT NULL,
+                    payload BLOB NOT NULL,
+                    computed_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                    compute_seconds REAL NOT NULL DEFAULT 0
+                )
+            """)
+
         except Exception as e:
             raise DatabaseError(f"创建表结构失败: {e}") from e
 
@@ -227,10 +359,13 @@ class DatabaseSchema:
             "CREATE INDEX IF NOT EXISTS idx_customers_phone ON customers(phone)",
             "CREATE INDEX IF NOT EXISTS idx_customers_type ON customers(customer_type_id)",
             "CREATE INDEX IF NOT EXISTS idx_customers_created ON customers(created_at)",
+            # 高级搜索默认按更新时间排序并做键集分页
+            "CREATE INDEX IF NOT EXISTS idx_customers_updated ON customers(updated_at)",
             # 供应商表索引
             "CREATE INDEX IF NOT EXISTS idx_suppliers_name ON suppliers(name)",
             "CREATE INDEX IF NOT EXISTS idx_suppliers_phone ON suppliers(phone)",
             "CREATE INDEX IF NOT EXISTS idx_suppliers_rating ON suppliers(quality_rating)",
+            "CREATE INDEX IF NOT EXISTS idx_suppliers_updated ON suppliers(updated_at)",
             # 报价表索引
             "CREATE INDEX IF NOT EXISTS idx_quotes_number ON quotes(quote_number)",
             "CREATE INDEX IF NOT EXISTS idx_quotes_customer ON quotes(customer_id)",
@@ -264,7 +399,236 @@ class DatabaseSchema:
             "CREATE INDEX IF NOT EXISTS idx_tasks_priority ON tasks(priority)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks(due_date)",
             "CREATE INDEX IF NOT EXISTS idx_tasks_assigned ON tasks(assigned_to)",
+            # 客户价值评分表索引
+            "CREATE INDEX IF NOT EXISTS idx_customer_value_scores_level ON customer_value_scores(value_level)",
+            "CREATE INDEX IF NOT EXISTS idx_customer_value_scores_ranking ON customer_value_scores(ranking_score DESC, customer_id)",
+            "CREATE INDEX IF NOT EXISTS idx_customer_value_scores_dirty ON customer_value_scores(customer_id) WHERE is_dirty = 1",
+            "CREATE INDEX IF NOT EXISTS idx_customer_value_scores_computed ON customer_value_scores(computed_at)",
         ]
 
         for index_sql in indexes:
             connection.execute(index_sql)
+
+    def create_triggers(self, connection: sqlite3.Connection) -> None:
+        """创建触发器"""
+        try:
+            self._create_customer_score_triggers(connection)
+            self._create_metric_rollup_triggers(connection)
+            self._create_change_counter_triggers(connection)
+
+        except Exception as e:
+            raise DatabaseError(f"创建触发器失败: {e}") from e
+
+    def _create_customer_score_triggers(self, connection: sqlite3.Connection) -> None:
+        """创建客户评分触发器
+
+        客户本身或其互动、报价、财务记录发生变化时,
+        将该客户的价值评分标记为需要重算. 关联记录被删除或改挂到
+        其他客户时, 原客户同样需要重算. 定义变化的旧触发器会被替换.
+        """
+        # 只标记仍然存在的客户, 客户ID为NULL或客户已删除时不写入评分行
+        mark_dirty = """
+                        INSERT INTO customer_value_scores (customer_id, is_dirty)
+                        SELECT id, 1 FROM customers WHERE id = {customer_id}{extra}
+                        ON CONFLICT(customer_id) DO UPDATE SET
+                            is_dirty = 1,
+                            dirty_version = dirty_version + 1;"""
+        reassigned = " AND OLD.customer_id IS NOT NEW.customer_id"
+
+        triggers = {
+            ("customers", "INSERT"): [("NEW.id", "")],
+            ("customers", "UPDATE"): [("NEW.id", "")],
+        }
+        for table in ("customer_interactions", "quotes", "financial_records"):
+            triggers[(table, "INSERT")] = [("NEW.customer_id", "")]
+            triggers[(table, "UPDATE")] = [
+                ("NEW.customer_id", ""),
+                ("OLD.customer_id", reassigned),
+            ]
+            triggers[(table, "DELETE")] = [("OLD.customer_id", "")]
+
+        existing = dict(
+            connection.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'trigger' "
+                "AND name LIKE 'trg_%_customer_score'"
+            ).fetchall()
+        )
+        for (table, event), targets in triggers.items():
+            name = f"trg_{table}_{event.lower()}_customer_score"
+            body = "".join(
+                mark_dirty.format(customer_id=customer_id, extra=extra)
+                for customer_id, extra in targets
+            )
+            sql = (
+                f"CREATE TRIGGER {name} AFTER {event} ON {table}\n"
+                f"                    BEGIN{body}\n"
+                f"                    END"
+            )
+            if existing.get(name) == sql:
+                continue
+            if name in existing:
+                connection.execute(f"DROP TRIGGER {name}")
+            connection.execute(sql)
+
+        # 为触发器创建之前已存在的客户补齐评分行
+        connection.execute("""
+            INSERT OR IGNORE INTO customer_value_scores (customer_id, is_dirty)
+            SELECT id, 1 FROM customers
+        """)
+
+    def _create_metric_rollup_triggers(self, connection: sqlite3.Connection) -> None:
+        """创建指标日汇总触发器
+
+        来源记录新增、删除或影响汇总的字段变化时增量调整对应日期的计数和金额.
+        """
+        # 汇总表为空说明触发器尚未维护过数据, 先从来源表全量回填
+        backfill = (
+            connection.execute("SELECT 1 FROM metric_daily_rollups LIMIT 1").fetchone()
+            is None
+        )
+
+        for metric, (table, bucket, amount, condition) in METRIC_ROLLUP_SOURCES.items():
+            if backfill:
+                connection.execute(metric_rollup_rebuild_sql(metric))
+
+            add = f"""
+                INSERT INTO metric_daily_rollups
+                    (metric, bucket_date, event_count, total_amount)
+                SELECT '{metric}', date({bucket}), 1, COALESCE({amount}, 0)
+                WHERE ({condition}) AND date({bucket}) IS NOT NULL
+                ON CONFLICT(metric, bucket_date) DO UPDATE SET
+                    event_count = event_count + 1,
+                    total_amount = total_amount + excluded.total_amount
+            """.format(row="NEW")
+            remove = f"""
+                UPDATE metric_daily_rollups
+                SET event_count = event_count - 1,
+                    total_amount = total_amount - COALESCE({amount}, 0)
+                WHERE metric = '{metric}' AND bucket_date = date({bucket})
+                    AND ({condition})
+            """.format(row="OLD")
+            changed = " OR ".join(
+                f"({part.format(row='OLD')}) IS NOT ({part.format(row='NEW')})"
+                for part in (bucket, amount, condition)
+            )
+
+            for event, when, body in (
+                ("INSERT", "", (add,)),
+                ("DELETE", "", (remove,)),
+                ("UPDATE", f"WHEN {changed}", (remove, add)),
+            ):
+                statements = "".join(f"{statement};" for statement in body)
+                connection.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS
+                        trg_{table}_{event.lower()}_{metric}_rollup
+                    AFTER {event} ON {table}
+                    {when}
+                    BEGIN
+                        {statements}
+                    END
+                """)
+
+    def _create_change_counter_triggers(self, connection: sqlite3.Connection) -> None:
+        """创建表变更计数触发器
+
+        表中的记录新增、修改或删除时将该表的变更计数加一.
+        """
+        connection.executemany(
+            "INSERT OR IGNORE INTO table_change_counters (table_name) VALUES (?)",
+            [(table,) for table in CHANGE_COUNTED_TABLES],
+        )
+
+        for table in CHANGE_COUNTED_TABLES:
+            for event in ("INSERT", "UPDATE", "DELETE"):
+                connection.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS
+                        trg_{table}_{event.lower()}_change_counter
+                    AFTER {event} ON {table}
+                    BEGIN
+                        UPDATE table_change_counters
+                        SET change_count = change_count + 1
+                        WHERE table_name = '{table}';
+                    END
+                """)
+
+    def create_search_index(self, connection: sqlite3.Connection) -> bool:
+        """创建互动记录全文索引
+
+        使用FTS5 trigram分词, 支持中文等无空格文本的子串检索.
+        互动记录或关联方名称变化时由触发器同步索引.
+
+        Returns:
+            bool: 是否创建成功, SQLite未编译FTS5时返回False
+        """
+        try:
+            exists = connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'interaction_search'"
+            ).fetchone()
+            connection.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS interaction_search USING fts5(
+                    subject,
+                    content,
+                    party_name,
+                    party_type UNINDEXED,
+                    party_id UNINDEXED,
+                    interaction_id UNINDEXED,
+                    tokenize = 'trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            self._logger.warning(f"SQLite不支持FTS5 trigram, 互动搜索将使用LIKE: {e}")
+            return False
+
+        try:
+            for party_type, source in INTERACTION_SEARCH_SOURCES.items():
+                table, party_column, party_table, offset = source
+                if not exists:
+                    connection.execute(interaction_search_rebuild_sql(party_type))
+
+                insert = f"""
+                    INSERT INTO interaction_search (
+                        rowid, subject, content, party_name,
+                        party_type, party_id, interaction_id
+                    )
+                    VALUES (
+                        NEW.id * 2 + {offset}, NEW.subject, NEW.content,
+                        (SELECT name FROM {party_table} WHERE id = NEW.{party_column}),
+                        '{party_type}', NEW.{party_column}, NEW.id
+                    );
+                """
+                delete = f"""
+                    DELETE FROM interaction_search WHERE rowid = OLD.id * 2 + {offset};
+                """
+
+                for event, body in (
+                    ("INSERT", insert),
+                    ("DELETE", delete),
+                    ("UPDATE", delete + insert),
+                ):
+                    connection.execute(f"""
+                        CREATE TRIGGER IF NOT EXISTS
+                            trg_{table}_{event.lower()}_search
+                        AFTER {event} ON {table}
+                        BEGIN
+                            {body}
+                        END
+                    """)
+
+                # 关联方改名时同步索引中的名称
+                connection.execute(f"""
+                    CREATE TRIGGER IF NOT EXISTS trg_{party_table}_rename_search
+                    AFTER UPDATE OF name ON {party_table}
+                    WHEN OLD.name IS NOT NEW.name
+                    BEGIN
+                        UPDATE interaction_search SET party_name = NEW.name
+                        WHERE rowid IN (
+                            SELECT id * 2 + {offset} FROM {table}
+                            WHERE {party_column} = NEW.id
+                        );
+                    END
+                """)
+
+            return True
+
+        except Exception as e:
+            raise DatabaseError(f"创建全文索引失败: {e}") from e
@@ -165,7 +165,11 @@ class EnhancedDatabaseManager:
 
                 # 执行after hooks
                 self._hooks.execute_after_hooks(
-                    "insert", record_id=record_id, table_name=table_name, params=params
+                    "insert",
+                    record_id=record_id,
+                    table_name=table_name,
+                    params=params,
+                    sql=hook_params.get("sql", sql),
                 )
 
                 return record_id
@@ -212,6 +216,7 @@ class EnhancedDatabaseManager:
                     affected_rows=affected_rows,
                     table_name=table_name,
                     params=params,
+                    sql=hook_params.get("sql", sql),
                 )
 
                 return affected_rows
@@ -258,6 +263,7 @@ class EnhancedDatabaseManager:
                     deleted_rows=deleted_rows,
                     table_name=table_name,
                     params=params,
+                    sql=hook_params.get("sql", sql),
                 )
 
                 return deleted_rows
@@ -0,0 +1,167 @@
+"""数据库连接池与读写分离测试.
+
+测试只读连接池、按线程签出、连接池统计以及DatabaseManager的读写路由.
+"""
+
+from pathlib import Path
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+from minicrm.data.connection_pool import ConnectionPool
+from minicrm.data.database import DatabaseManager
+
+
+class TestConnectionPool(unittest.TestCase):
+    """连接池测试类."""
+
+    def setUp(self):
+        """测试准备."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_path = self.temp_dir / "pool.db"
+
+        # 只读连接要求数据库文件和WAL模式已存在
+        writer = sqlite3.connect(self.db_path)
+        writer.execute("PRAGMA journal_mode = WAL")
+        writer.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)")
+        writer.execute("INSERT INTO items (name) VALUES ('a')")
+        writer.commit()
+        writer.close()
+
+    def tearDown(self):
+        """测试清理."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_same_thread_reuses_connection(self):
+        """测试同一线程重复签出得到同一连接."""
+        pool = ConnectionPool(self.db_path, max_connections=2)
+
+        outer = pool.get_connection()
+        inner = pool.get_connection()
+        assert outer is inner
+
+        pool.return_connection(inner)
+        assert pool.get_stats()["in_use"] == 1
+        pool.return_connection(outer)
+        assert pool.get_stats()["in_use"] == 0
+        assert pool.get_stats()["checkouts"] == 1
+
+        pool.close_all()
+
+    def test_read_only_connection_rejects_writes(self):
+        """测试只读连接不允许写入."""
+        pool = ConnectionPool(self.db_path, max_connections=1, read_only=True)
+
+        connection = pool.get_connection()
+        try:
+            assert connection.execute("SELECT COUNT(*) FROM items").fetchone()[0] == 1
+            with self.assertRaises(sqlite3.OperationalError):
+                connection.execute("INSERT INTO items (name) VALUES ('b')")
+        finally:
+            pool.return_connection(connection)
+            pool.close_all()
+
+    def test_stats_record_waits_when_saturated(self):
+        """测试连接池饱和时记录等待统计."""
+        pool = ConnectionPool(self.db_path, max_connections=1, read_only=True)
+        held = pool.get_connection()
+        assert pool.get_stats()["saturation"] == 1.0
+
+        def worker():
+            connection = pool.get_connection()
+            pool.return_connection(connection)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        threading.Event().wait(0.05)
+        pool.return_connection(held)
+        thread.join(timeout=5)
+
+        stats = pool.get_stats()
+        assert stats["checkouts"] == 2
+        assert stats["waits"] == 1
+        assert stats["max_wait_ms"] > 0
+        pool.close_all()
+
+
+class TestDatabaseManagerReadPool(unittest.TestCase):
+    """DatabaseManager读写分离测试类."""
+
+    def setUp(self):
+        """测试准备."""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(self.temp_dir / "crm.db", max_readers=2)
+        with self.db_manager.transaction() as connection:
+            connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+
+    def tearDown(self):
+        """测试清理."""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_select_uses_read_pool(self):
+        """测试SELECT查询走只读连接池."""
+        self.db_manager.execute_insert("INSERT INTO notes (body) VALUES (?)", ("x",))
+
+        rows = self.db_manager.execute_query("SELECT body FROM notes")
+
+        assert [row["body"] for row in rows] == ["x"]
+        assert self.db_manager.get_pool_stats()["readers"]["checkouts"] == 1
+
+    def test_writable_cte_uses_writer(self):
+        """测试带写操作的WITH语句不走只读连接池."""
+        self.db_manager.execute_query(
+            "WITH src(body) AS (SELECT 'cte') "
+            "INSERT INTO notes (body) SELECT body FROM src"
+        )
+
+        rows = self.db_manager.execute_query("SELECT body FROM notes")
+
+        assert [row["body"] for row in rows] == ["cte"]
+        assert self.db_manager.get_pool_stats()["readers"]["checkouts"] == 1
+
+    def test_transaction_reads_own_writes(self):
+        """测试事务内的查询能读取未提交的修改."""
+        with self.db_manager.transaction():
+            self.db_manager.execute_insert(
+                "INSERT INTO notes (body) VALUES (?)", ("pending",)
+            )
+            rows = self.db_manager.execute_query("SELECT COUNT(*) FROM notes")
+            assert rows[0][0] == 1
+
+        assert self.db_manager.get_pool_stats()["readers"]["checkouts"] == 0
+
+    def test_iter_query_batches(self):
+        """测试按批次流式读取查询结果."""
+        with self.db_manager.transaction() as connection:
+            connection.executemany(
+                "INSERT INTO notes (body) VALUES (?)", [(str(i),) for i in range(5)]
+            )
+
+        batches = list(
+            self.db_manager.iter_query_batches(
+                "SELECT body FROM notes ORDER BY id", batch_size=2
+            )
+        )
+
+        assert [len(batch) for batch in batches] == [2, 2, 1]
+        assert self.db_manager.get_pool_stats()["readers"]["in_use"] == 0
+        rows = self.db_manager.iter_query("SELECT body FROM notes ORDER BY id")
+        assert [row["body"] for row in rows] == ["0", "1", "2", "3", "4"]
+
+    def test_memory_database_falls_back_to_single_connection(self):
+        """测试内存数据库不创建只读连接池."""
+        manager = DatabaseManager(Path(":memory:"))
+        try:
+            manager.execute_update("CREATE TABLE t (id INTEGER)")
+            manager.execute_insert("INSERT INTO t VALUES (1)")
+            assert manager.execute_query("SELECT COUNT(*) FROM t")[0][0] == 1
+            assert manager.get_pool_stats()["readers"] is None
+        finally:
+            manager.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
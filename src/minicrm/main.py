@@ -22,6 +22,7 @@ from minicrm.core.logging import (  # noqa: E402
     initialize_logging,
     shutdown_logging,
 )
+from minicrm.core.startup_timeline import get_startup_timeline  # noqa: E402
 
 
 def setup_application() -> None:
@@ -29,13 +30,16 @@ def setup_application() -> None:
 
     包括日志系统、配置管理等基础设施的初始化.
     """
+    timeline = get_startup_timeline()
     try:
         # 加载配置
-        config_manager = load_config()
+        with timeline.phase("config_load"):
+            config_manager = load_config()
 
         # 初始化日志系统
-        log_config = config_manager.logging.__dict__
-        initialize_logging(log_config)
+        with timeline.phase("logging_init"):
+            log_config = config_manager.logging.__dict__
+            initialize_logging(log_config)
 
         logger = get_logger("main")
         logger.info("启动 %s v%s", APP_NAME, APP_VERSION)
@@ -102,10 +106,13 @@ def main() -> int:
         logger.info("UI主题: %s", config.ui.theme)
 
         # 创建并运行TTK应用程序
-        from minicrm.application_ttk import MiniCRMApplicationTTK
+        timeline = get_startup_timeline()
+        with timeline.phase("application_import"):
+            from minicrm.application_ttk import MiniCRMApplicationTTK
 
         logger.info("正在创建TTK应用程序实例...")
-        app = MiniCRMApplicationTTK(config)
+        with timeline.phase("application_init"):
+            app = MiniCRMApplicationTTK(config)
 
         logger.info("TTK应用程序创建成功,开始运行...")
         print(f"\n🎉 {APP_NAME} v{APP_VERSION} TTK版本启动成功!")
@@ -6,13 +6,18 @@
 - 序列化和反序列化
 - 通用字段类型
 - 模型元数据管理
+- 从可信数据库行批量构建模型
 """
 
 from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Mapping
+import dataclasses
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
 from enum import Enum
-from typing import Any, TypeVar
+import types
+from typing import Any, TypeVar, Union, get_args, get_origin, get_type_hints
 
 from typing_extensions import Self
 
@@ -37,6 +42,222 @@ def clean_string(value: str) -> str:
 T = TypeVar("T", bound="BaseModel")
 
 
+def slotted_dataclass(cls: type[T]) -> type[T]:
+    """以__slots__方式定义模型dataclass
+
+    等同于dataclass(slots=True). dataclass(slots=True)会重新创建类,
+    原方法中零参数super()引用的仍是旧类, 这里把这些引用指向新类.
+
+    Args:
+        cls: 模型类
+
+    Returns:
+        Type[T]: 使用__slots__的新模型类
+    """
+    slotted = dataclass(slots=True)(cls)
+    for member in slotted.__dict__.values():
+        if isinstance(member, (classmethod, staticmethod)):
+            functions = [member.__func__]
+        elif isinstance(member, property):
+            functions = [member.fget, member.fset, member.fdel]
+        else:
+            functions = [member]
+
+        for function in functions:
+            code = getattr(function, "__code__", None)
+            if code is None or "__class__" not in code.co_freevars:
+                continue
+            cell = function.__closure__[code.co_freevars.index("__class__")]
+            if cell.cell_contents is cls:
+                cell.cell_contents = slotted
+    return slotted
+
+
+def _optional_inner(annotation: Any) -> tuple[Any, bool]:
+    """拆分Optional类型注解, 返回(内部类型, 是否可为None)"""
+    if get_origin(annotation) in (Union, types.UnionType):
+        args = [arg for arg in get_args(annotation) if arg is not type(None)]
+        nullable = len(args) < len(get_args(annotation))
+        return (args[0] if len(args) == 1 else Any), nullable
+    return annotation, annotation is Any
+
+
+def _enum_converter(enum_class: type[Enum], default: Any) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if isinstance(value, enum_class):
+            return value
+        try:
+            return enum_class(value)
+        except ValueError:
+            return default
+
+    return convert
+
+
+def _decimal_converter(default: Any) -> Callable[[Any], Any]:
+    def convert(value: Any) -> Any:
+        if isinstance(value, Decimal):
+            return value
+        try:
+            return Decimal(str(value))
+        except (InvalidOperation, ValueError, TypeError):
+            return default
+
+    return convert
+
+
+def _datetime_converter(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return value
+
+
+def _date_converter(value: Any) -> Any:
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value[:10])
+        except ValueError:
+            return None
+    return value
+
+
+def _list_converter(value: Any) -> Any:
+    return value if isinstance(value, list) else []
+
+
+def _format_datetime(value: Any) -> Any:
+    return value.strftime("%Y-%m-%d %H:%M:%S") if isinstance(value, datetime) else value
+
+
+def _enum_value(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _build_assigner(names: tuple[str, ...]) -> Callable[[Any, dict[str, Any]], None]:
+    """生成按字段名逐个赋值的函数
+
+    与dataclass生成__init__的方式相同, 逐条属性赋值比循环调用setattr快数倍.
+    """
+    body = "".join(f"    model.{name} = values[{name!r}]\n" for name in names)
+    namespace: dict[str, Any] = {}
+    exec(f"def assign(model, values):\n{body or '    pass'}\n", namespace)
+    return namespace["assign"]
+
+
+def _serialize(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return _format_datetime(value)
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    return value
+
+
+class ModelFields:
+    """模型类的字段元数据
+
+    每个模型类只解析一次字段和类型注解, 供from_dict、from_rows和to_dict
+    复用.
+    """
+
+    __slots__ = (
+        "names",
+        "name_set",
+        "defaults",
+        "factories",
+        "loaders",
+        "serializers",
+        "assign",
+    )
+
+    def __init__(self, model_class: type):
+        """解析模型类的字段
+
+        Args:
+            model_class: dataclass模型类
+        """
+        fields = dataclasses.fields(model_class)
+        hints = get_type_hints(model_class)
+
+        self.names: tuple[str, ...] = tuple(f.name for f in fields)
+        self.name_set: frozenset[str] = frozenset(self.names)
+        # 字段默认值, 使用default_factory的字段单独保存
+        self.defaults: dict[str, Any] = {}
+        self.factories: dict[str, Callable[[], Any]] = {}
+        # 字段名 -> (转换函数或None, 是否可为None)
+        self.loaders: dict[str, tuple[Callable[[Any], Any] | None, bool]] = {}
+        # 字段名 -> 序列化函数, None表示原样输出
+        self.serializers: dict[str, Callable[[Any], Any] | None] = {}
+
+        for f in fields:
+            default = None
+            if f.default_factory is not dataclasses.MISSING:
+                self.factories[f.name] = f.default_factory
+            else:
+                if f.default is not dataclasses.MISSING:
+                    default = f.default
+                self.defaults[f.name] = default
+
+            annotation, nullable = _optional_inner(hints.get(f.name, Any))
+            self.loaders[f.name] = (self._loader(annotation, default), nullable)
+            self.serializers[f.name] = self._serializer(annotation)
+
+        # 把字段值字典赋给实例的函数
+        self.assign = _build_assigner(self.names)
+
+    @staticmethod
+    def _loader(annotation: Any, default: Any) -> Callable[[Any], Any] | None:
+        """按类型注解选择数据库值的转换函数"""
+        if isinstance(annotation, type):
+            if issubclass(annotation, Enum):
+                return _enum_converter(annotation, default)
+            if issubclass(annotation, Decimal):
+                return _decimal_converter(default)
+            if issubclass(annotation, datetime):
+                return _datetime_converter
+            if issubclass(annotation, date):
+                return _date_converter
+            if issubclass(annotation, bool):
+                return bool
+        if annotation is list or get_origin(annotation) is list:
+            return _list_converter
+        return None
+
+    @staticmethod
+    def _serializer(annotation: Any) -> Callable[[Any], Any] | None:
+        """按类型注解选择to_dict的序列化函数"""
+        if annotation in (str, int, float, bool, Decimal):
+            return None
+        if isinstance(annotation, type):
+            if issubclass(annotation, datetime):
+                return _format_datetime
+            if issubclass(annotation, Enum):
+                return _enum_value
+        return _serialize
+
+
+_model_fields_cache: dict[type, ModelFields] = {}
+
+
+def model_fields(model_class: type) -> ModelFields:
+    """获取模型类的字段元数据(按类缓存)
+
+    Args:
+        model_class: dataclass模型类
+
+    Returns:
+        ModelFields: 字段元数据
+    """
+    meta = _model_fields_cache.get(model_class)
+    if meta is None:
+        meta = _model_fields_cache[model_class] = ModelFields(model_class)
+    return meta
+
+
 class ModelStatus(Enum):
     """模型状态枚举"""
 
@@ -46,12 +267,16 @@ class ModelStatus(Enum):
     DRAFT = "draft"  # 草稿
 
 
-@dataclass
+@slotted_dataclass
 class BaseModel(ABC):
     """基础数据模型类
 
     所有业务模型都应该继承自这个基础类.
     提供通用的字段、验证和序列化功能.
+
+    通过构造函数或from_dict创建的实例在初始化时清理并验证数据;
+    from_rows用于从数据库加载可信数据, 不清理也不验证,
+    验证推迟到写回数据库时进行.
     """
 
     # 基础字段
@@ -80,6 +305,12 @@ class BaseModel(ABC):
         # 执行自定义验证
         self.validate()
 
+    def _after_load(self) -> None:
+        """从可信数据加载后的处理
+
+        只补全派生字段(如空列表), 不清理字符串也不验证.
+        """
+
     @abstractmethod
     def validate(self) -> None:
         """验证模型数据
@@ -131,21 +362,15 @@ class BaseModel(ABC):
             Dict[str, Any]: 模型数据字典
         """
         result = {}
+        serializers = model_fields(type(self)).serializers
 
-        for key, value in self.__dict__.items():
+        for key, serialize in serializers.items():
             # 跳过私有字段(除非明确要求包含)
             if not include_private and key.startswith("_"):
                 continue
 
-            # 处理特殊类型
-            if isinstance(value, datetime):
-                result[key] = format_date(value, "%Y-%m-%d %H:%M:%S")
-            elif isinstance(value, Enum):
-                result[key] = value.value
-            elif hasattr(value, "to_dict"):
-                result[key] = value.to_dict()
-            else:
-                result[key] = value
+            value = getattr(self, key)
+            result[key] = value if serialize is None else serialize(value)
 
         return result
 
@@ -162,19 +387,9 @@ class BaseModel(ABC):
         Raises:
             ValidationError: 当数据无效时
         """
-        # 获取dataclass字段名
-        import dataclasses
-
-        if dataclasses.is_dataclass(cls):
-            field_names = {field.name for field in dataclasses.fields(cls)}
-            valid_fields = {
-                key: value for key, value in data.items() if key in field_names
-            }
-        else:
-            # 过滤掉不存在的字段
-            valid_fields = {
-                key: value for key, value in data.items() if hasattr(cls, key)
-            }
+        # 过滤掉不存在的字段
+        field_names = model_fields(cls).name_set
+        valid_fields = {key: value for key, value in data.items() if key in field_names}
 
         # 处理特殊字段类型
         if "created_at" in valid_fields and isinstance(valid_fields["created_at"], str):
@@ -201,6 +416,53 @@ class BaseModel(ABC):
 
         return cls(**valid_fields)
 
+    @classmethod
+    def from_rows(cls, rows: Iterable[Mapping[str, Any]]) -> list[Self]:
+        """从可信的数据库行批量创建模型实例
+
+        按字段类型转换数据库值(枚举、Decimal、日期时间等), 不清理字符串,
+        不执行validate(). 行中不属于模型的列被忽略, 缺少的字段使用默认值,
+        非Optional字段的NULL值也使用默认值.
+
+        Args:
+            rows: 数据库行数据
+
+        Returns:
+            List[T]: 模型实例列表
+        """
+        meta = model_fields(cls)
+        loaders = meta.loaders
+        defaults = meta.defaults
+        factories = meta.factories
+        assign = meta.assign
+        new = cls.__new__
+        models = []
+
+        for row in rows:
+            values = defaults.copy()
+            for key, value in row.items():
+                loader = loaders.get(key)
+                if loader is None:
+                    continue
+                convert, nullable = loader
+                if value is None:
+                    if not nullable:
+                        continue
+                elif convert is not None:
+                    value = convert(value)
+                values[key] = value
+
+            for key, factory in factories.items():
+                if key not in values:
+                    values[key] = factory()
+
+            model = new(cls)
+            assign(model, values)
+            model._after_load()
+            models.append(model)
+
+        return models
+
     def copy(self, **changes: Any) -> Self:
         """创建模型的副本
 
@@ -233,7 +495,8 @@ class BaseModel(ABC):
         class_name = self.__class__.__name__
         fields = []
 
-        for key, value in self.__dict__.items():
+        for key in model_fields(type(self)).names:
+            value = getattr(self, key)
             if not key.startswith("_"):
                 if isinstance(value, str):
                     fields.append(f"{key}='{value}'")
@@ -243,7 +506,7 @@ class BaseModel(ABC):
         return f"{class_name}({', '.join(fields)})"
 
 
-@dataclass
+@slotted_dataclass
 class NamedModel(BaseModel):
     """带名称的基础模型
 
@@ -270,7 +533,7 @@ class NamedModel(BaseModel):
             raise ValidationError("名称长度不能超过100个字符")
 
 
-@dataclass
+@slotted_dataclass
 class ContactModel(NamedModel):
     """联系信息基础模型
 
@@ -15,7 +15,6 @@ MiniCRM 合同数据模型
 - 集成transfunctions进行数据验证和格式化
 """
 
-from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from enum import Enum
@@ -24,7 +23,7 @@ from typing import Any
 from transfunctions import format_currency, format_date
 
 from ..core.exceptions import ValidationError
-from .base import NamedModel, register_model
+from .base import NamedModel, register_model, slotted_dataclass
 
 
 class ContractType(Enum):
@@ -62,7 +61,7 @@ class PaymentMethod(Enum):
 
 
 @register_model
-@dataclass
+@slotted_dataclass
 class Contract(NamedModel):
     """
     合同数据模型
@@ -128,6 +127,11 @@ class Contract(NamedModel):
 
         super().__post_init__()
 
+    def _after_load(self) -> None:
+        """从可信数据加载后的处理"""
+        if self.attachments is None:
+            self.attachments = []
+
     def validate(self) -> None:
         """验证合同数据"""
         super().validate()
@@ -15,7 +15,6 @@ MiniCRM 客户数据模型
 - 提供完整的序列化功能
 """
 
-from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
@@ -30,7 +29,7 @@ from transfunctions import (
     validate_customer_data,
 )
 
-from .base import ContactModel, register_model
+from .base import ContactModel, register_model, slotted_dataclass
 
 
 class CustomerLevel(Enum):
@@ -63,7 +62,7 @@ class IndustryType(Enum):
 
 
 @register_model
-@dataclass
+@slotted_dataclass
 class Customer(ContactModel):
     """
     客户数据模型
@@ -114,6 +113,13 @@ class Customer(ContactModel):
 
         super().__post_init__()
 
+    def _after_load(self) -> None:
+        """从可信数据加载后的处理"""
+        if self.tags is None:
+            self.tags = []
+        if not self.company_name and self.name:
+            self.company_name = self.name
+
     def validate(self) -> None:
         """验证客户数据"""
         super().validate()
@@ -27,7 +27,7 @@ from transfunctions import (
     format_date,
 )
 
-from .base import NamedModel, register_model
+from .base import NamedModel, model_fields, register_model, slotted_dataclass
 
 
 class QuoteStatus(Enum):
@@ -156,7 +156,7 @@ class QuoteItem:
 
 
 @register_model
-@dataclass
+@slotted_dataclass
 class Quote(NamedModel):
     """报价数据模型
 
@@ -230,6 +230,11 @@ class Quote(NamedModel):
 
         super().__post_init__()
 
+    def _after_load(self) -> None:
+        """从可信数据加载后的处理"""
+        if self.items is None:
+            self.items = []
+
     def validate(self) -> None:
         """验证报价数据"""
         super().validate()
@@ -512,9 +517,7 @@ class Quote(NamedModel):
         data = data.copy()
 
         # 移除不存在的字段(如is_expired等计算字段)
-        valid_fields = {field.name for field in cls.__dataclass_fields__.values()}
-        # 添加继承的字段
-        valid_fields.update(["id", "name", "notes", "created_at", "updated_at"])
+        valid_fields = model_fields(cls).name_set
 
         # 过滤掉无效字段
         filtered_data = {k: v for k, v in data.items() if k in valid_fields}
@@ -15,7 +15,6 @@ MiniCRM 供应商数据模型
 - 提供完整的序列化功能
 """
 
-from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
@@ -28,7 +27,7 @@ from transfunctions import (
     validate_supplier_data,
 )
 
-from .base import ContactModel, register_model
+from .base import ContactModel, register_model, slotted_dataclass
 
 
 class SupplierLevel(Enum):
@@ -70,7 +69,7 @@ class SupplierType(Enum):
 
 
 @register_model
-@dataclass
+@slotted_dataclass
 class Supplier(ContactModel):
     """
     供应商数据模型
@@ -135,6 +134,15 @@ class Supplier(ContactModel):
 
         super().__post_init__()
 
+    def _after_load(self) -> None:
+        """从可信数据加载后的处理"""
+        if self.product_categories is None:
+            self.product_categories = []
+        if self.tags is None:
+            self.tags = []
+        if not self.company_name and self.name:
+            self.company_name = self.name
+
     def validate(self) -> None:
         """验证供应商数据"""
         super().validate()
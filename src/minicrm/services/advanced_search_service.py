@@ -6,6 +6,8 @@ MiniCRM 高级搜索服务
 - 范围查询和模糊匹配
 - 关联查询和跨表搜索
 - 查询结果缓存和优化
+- 基于索引的键集分页和总数估算
+- 按规范化查询指纹缓存, 细化查询时复用已缓存的结果集
 
 设计原则:
 - 遵循业务逻辑层职责
@@ -19,17 +21,51 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+from minicrm.core.cache_tier import get_cache_tier
 from minicrm.core.exceptions import BusinessLogicError, ValidationError
 from minicrm.data.dao.customer_dao import CustomerDAO
 from minicrm.data.dao.supplier_dao import SupplierDAO
-from minicrm.ui.components.advanced_search_dialog import QueryCondition
+from minicrm.data.dao.table_stats_dao import TableStatsDAO
+from minicrm.services.search_fingerprint import (
+    QueryFingerprint,
+    RowNotEvaluableError,
+    filter_rows,
+    fingerprint_conditions,
+    rows_after,
+    sort_rows,
+)
 from transfunctions.data_operations.query_builder import (
     ComparisonOperator,
     LogicalOperator,
     QueryBuilder,
+    decode_cursor,
+    encode_cursor,
 )
 
 
+# 搜索结果缓存区域
+SEARCH_REGION = "search"
+
+# 搜索结果缓存区域的字节预算(MB)
+SEARCH_REGION_SIZE_MB = 16.0
+
+# 总数统计方式: 精确COUNT(*)(按条件缓存)、优先使用缓存或表统计估算、不统计
+COUNT_MODES = ("exact", "estimated", "none")
+
+# 结果总数不超过该值时缓存完整结果集, 用于在内存中回答更细化的查询
+FULL_RESULT_ROW_LIMIT = 1000
+
+
+class QueryCondition:
+    """查询条件"""
+
+    def __init__(self, field: str, operator: str, value: Any, logic: str = "AND"):
+        self.field = field
+        self.operator = operator  # =, !=, >, LIKE, IN, BETWEEN, IS NULL等
+        self.value = value
+        self.logic = logic  # 与前一条件的连接方式: AND, OR
+
+
 class SearchField:
     """搜索字段定义"""
 
@@ -60,17 +96,25 @@ class SearchResult:
     def __init__(
         self,
         data: list[dict[str, Any]],
-        total_count: int,
+        total_count: int | None,
         page: int = 1,
         page_size: int = 50,
         query_time: float = 0.0,
+        next_cursor: str | None = None,
+        count_estimated: bool = False,
     ):
         self.data = data
         self.total_count = total_count
         self.page = page
         self.page_size = page_size
         self.query_time = query_time
-        self.total_pages = (total_count + page_size - 1) // page_size
+        # 下一页的键集分页游标, 没有下一页时为None
+        self.next_cursor = next_cursor
+        # total_count是否为根据表统计信息得到的估算值
+        self.count_estimated = count_estimated
+        self.total_pages = (
+            None if total_count is None else (total_count + page_size - 1) // page_size
+        )
 
 
 class AdvancedSearchService:
@@ -84,25 +128,40 @@ class AdvancedSearchService:
     - 查询性能优化
     """
 
-    def __init__(self, customer_dao: CustomerDAO, supplier_dao: SupplierDAO):
+    def __init__(
+        self,
+        customer_dao: CustomerDAO,
+        supplier_dao: SupplierDAO,
+        table_stats_dao: TableStatsDAO | None = None,
+    ):
         """
         初始化高级搜索服务
 
         Args:
             customer_dao: 客户数据访问对象
             supplier_dao: 供应商数据访问对象
+            table_stats_dao: 表结构统计DAO, 用于验证排序索引和估算总数
         """
         self._customer_dao = customer_dao
         self._supplier_dao = supplier_dao
+        self._table_stats_dao = table_stats_dao
         self._logger = logging.getLogger(__name__)
 
         # 搜索字段定义
         self._customer_fields = self._init_customer_fields()
         self._supplier_fields = self._init_supplier_fields()
 
-        # 查询缓存(简单的内存缓存)
-        self._query_cache: dict[str, tuple[SearchResult, datetime]] = {}
+        # 查询缓存, 存放在统一缓存层的搜索区域中, 相关表被写入时自动失效
         self._cache_ttl = timedelta(minutes=5)  # 缓存5分钟
+        search_region = get_cache_tier().create_region(
+            SEARCH_REGION, SEARCH_REGION_SIZE_MB, self._cache_ttl
+        )
+        self._query_cache = search_region.namespace()
+        # 按查询条件缓存的结果总数, 翻页和改变排序时复用
+        self._count_cache = search_region.namespace()
+        # 按查询指纹缓存的完整结果集, 用于在内存中回答更细化的查询
+        self._full_results = search_region.namespace()
+        self._superset_hits = 0
 
     def _init_customer_fields(self) -> list[SearchField]:
         """初始化客户搜索字段"""
@@ -200,81 +259,38 @@ class AdvancedSearchService:
         page_size: int = 50,
         order_by: str | None = None,
         use_cache: bool = True,
+        cursor: str | None = None,
+        count_mode: str = "exact",
     ) -> SearchResult:
         """
         执行客户高级搜索
 
         Args:
             conditions: 查询条件列表
-            page: 页码
+            page: 页码, 提供cursor时忽略
             page_size: 每页大小
-            order_by: 排序字段
+            order_by: 排序字段, 可带方向, 如"name DESC"; 必须有可用索引
             use_cache: 是否使用缓存
+            cursor: 上一页结果的next_cursor, 提供时按键集翻到下一页
+            count_mode: 总数统计方式, 见COUNT_MODES
 
         Returns:
             SearchResult: 搜索结果
 
         Raises:
-            ValidationError: 查询条件验证失败
+            ValidationError: 查询条件、排序字段或游标验证失败
             BusinessLogicError: 业务逻辑错误
         """
-        try:
-            start_time = datetime.now()
-
-            # 验证查询条件
-            self._validate_conditions(conditions, "customer")
-
-            # 检查缓存
-            cache_key = self._generate_cache_key(
-                "customer", conditions, page, page_size, order_by
-            )
-            if use_cache and cache_key in self._query_cache:
-                cached_result, cached_time = self._query_cache[cache_key]
-                if datetime.now() - cached_time < self._cache_ttl:
-                    self._logger.debug(f"使用缓存结果: {cache_key}")
-                    return cached_result
-
-            # 构建查询
-            query_builder = self._build_customer_query(conditions, order_by)
-
-            # 执行查询
-            data_sql, data_params = query_builder.paginate(page, page_size).build()
-            count_sql, count_params = query_builder.build_count()
-
-            # 获取数据
-            data_rows = self._customer_dao.execute_complex_query(
-                data_sql, tuple(data_params)
-            )
-            count_result = self._customer_dao.execute_complex_query(
-                count_sql, tuple(count_params)
-            )
-            total_count = count_result[0]["count"] if count_result else 0
-
-            # 转换数据格式
-            data = [self._format_customer_row(row) for row in data_rows]
-
-            # 计算查询时间
-            query_time = (datetime.now() - start_time).total_seconds()
-
-            # 创建结果
-            result = SearchResult(data, total_count, page, page_size, query_time)
-
-            # 缓存结果
-            if use_cache:
-                self._query_cache[cache_key] = (result, datetime.now())
-
-            self._logger.info(
-                f"客户搜索完成: {len(data)}条记录, 总计{total_count}条, "
-                f"耗时{query_time:.3f}秒"
-            )
-
-            return result
-
-        except Exception as e:
-            self._logger.error(f"客户搜索失败: {e}")
-            if isinstance(e, ValidationError | BusinessLogicError):
-                raise
-            raise BusinessLogicError(f"搜索执行失败: {e}") from e
+        return self._search(
+            "customer",
+            conditions,
+            page,
+            page_size,
+            order_by,
+            use_cache,
+            cursor,
+            count_mode,
+        )
 
     def search_suppliers(
         self,
@@ -283,82 +299,423 @@ class AdvancedSearchService:
         page_size: int = 50,
         order_by: str | None = None,
         use_cache: bool = True,
+        cursor: str | None = None,
+        count_mode: str = "exact",
     ) -> SearchResult:
         """
         执行供应商高级搜索
 
         Args:
             conditions: 查询条件列表
-            page: 页码
+            page: 页码, 提供cursor时忽略
             page_size: 每页大小
-            order_by: 排序字段
+            order_by: 排序字段, 可带方向, 如"name DESC"; 必须有可用索引
             use_cache: 是否使用缓存
+            cursor: 上一页结果的next_cursor, 提供时按键集翻到下一页
+            count_mode: 总数统计方式, 见COUNT_MODES
 
         Returns:
             SearchResult: 搜索结果
 
         Raises:
-            ValidationError: 查询条件验证失败
+            ValidationError: 查询条件、排序字段或游标验证失败
             BusinessLogicError: 业务逻辑错误
         """
+        return self._search(
+            "supplier",
+            conditions,
+            page,
+            page_size,
+            order_by,
+            use_cache,
+            cursor,
+            count_mode,
+        )
+
+    def _search(
+        self,
+        entity_type: str,
+        conditions: list[QueryCondition],
+        page: int,
+        page_size: int,
+        order_by: str | None,
+        use_cache: bool,
+        cursor: str | None,
+        count_mode: str,
+    ) -> SearchResult:
+        """
+        执行搜索
+
+        数据查询按(排序字段, id)做键集分页, 多取一条用于判断是否还有下一页.
+        总数按count_mode统计, 同一组条件的精确总数缓存后供后续翻页复用.
+
+        Args:
+            entity_type: 实体类型 (customer/supplier)
+            其余参数见search_customers
+
+        Returns:
+            SearchResult: 搜索结果
+        """
+        entity_label = "客户" if entity_type == "customer" else "供应商"
+        table = "customers" if entity_type == "customer" else "suppliers"
+        dao = self._customer_dao if entity_type == "customer" else self._supplier_dao
         try:
             start_time = datetime.now()
 
-            # 验证查询条件
-            self._validate_conditions(conditions, "supplier")
+            # 验证查询条件、排序字段和统计方式
+            self._validate_conditions(conditions, entity_type)
+            if count_mode not in COUNT_MODES:
+                raise ValidationError(f"无效的总数统计方式: {count_mode}")
+            sort_column, direction = self._resolve_order_by(entity_type, order_by)
 
             # 检查缓存
             cache_key = self._generate_cache_key(
-                "supplier", conditions, page, page_size, order_by
+                entity_type, conditions, page, page_size, order_by, cursor, count_mode
             )
-            if use_cache and cache_key in self._query_cache:
-                cached_result, cached_time = self._query_cache[cache_key]
-                if datetime.now() - cached_time < self._cache_ttl:
+            if use_cache:
+                cached_result = self._query_cache.get(cache_key)
+                if cached_result is not None:
                     self._logger.debug(f"使用缓存结果: {cache_key}")
                     return cached_result
 
-            # 构建查询
-            query_builder = self._build_supplier_query(conditions, order_by)
-
-            # 执行查询
-            data_sql, data_params = query_builder.paginate(page, page_size).build()
-            count_sql, count_params = query_builder.build_count()
-
-            # 获取数据
-            data_rows = self._supplier_dao.execute_complex_query(
-                data_sql, tuple(data_params)
+            signature = self._generate_cache_key(
+                entity_type, conditions, 0, 0, f"{sort_column} {direction}"
             )
-            count_result = self._supplier_dao.execute_complex_query(
-                count_sql, tuple(count_params)
-            )
-            total_count = count_result[0]["count"] if count_result else 0
+            after = None
+            if cursor:
+                try:
+                    after = decode_cursor(cursor, signature)
+                except ValueError as e:
+                    raise ValidationError(str(e)) from e
+
+            # 只是在已缓存查询上增加了AND条件时, 在内存中筛选缓存的结果集
+            fingerprint = self._fingerprint(entity_type, conditions)
+            answered = None
+            if use_cache:
+                answered = self._search_cached_superset(
+                    fingerprint, sort_column, direction, after, page, page_size
+                )
+
+            if answered is not None:
+                data_rows, has_more, matched_count = answered
+                total_count = None if count_mode == "none" else matched_count
+                count_estimated = False
+            else:
+                # 构建查询
+                query_builder = self._build_query(entity_type, conditions)
+                query_builder.seek(
+                    f"{table}.{sort_column}", direction, after, f"{table}.id"
+                ).limit(page_size + 1)
+                if after is None and page > 1:
+                    query_builder.offset((page - 1) * page_size)
+
+                # 获取数据
+                data_sql, data_params = query_builder.build()
+                data_rows = dao.execute_complex_query(data_sql, tuple(data_params))
+                has_more = len(data_rows) > page_size
+                data_rows = data_rows[:page_size]
+
+                # 统计总数
+                total_count, count_estimated = self._count_results(
+                    entity_type, conditions, query_builder, count_mode, use_cache
+                )
+
+                if use_cache:
+                    is_complete = after is None and page == 1 and not has_more
+                    self._cache_full_result(
+                        fingerprint,
+                        conditions,
+                        (sort_column, direction),
+                        data_rows if is_complete else None,
+                        None if count_estimated else total_count,
+                    )
+
+            next_cursor = None
+            if has_more:
+                last_row = data_rows[-1]
+                next_cursor = encode_cursor(
+                    signature, last_row.get(sort_column), last_row.get("id")
+                )
 
             # 转换数据格式
-            data = [self._format_supplier_row(row) for row in data_rows]
+            formatter = (
+                self._format_customer_row
+                if entity_type == "customer"
+                else self._format_supplier_row
+            )
+            data = [formatter(row) for row in data_rows]
 
             # 计算查询时间
             query_time = (datetime.now() - start_time).total_seconds()
 
             # 创建结果
-            result = SearchResult(data, total_count, page, page_size, query_time)
+            result = SearchResult(
+                data,
+                total_count,
+                page,
+                page_size,
+                query_time,
+                next_cursor=next_cursor,
+                count_estimated=count_estimated,
+            )
 
             # 缓存结果
             if use_cache:
-                self._query_cache[cache_key] = (result, datetime.now())
+                self._query_cache.put(
+                    cache_key, result, self._cache_ttl, tables=(table,)
+                )
 
             self._logger.info(
-                f"供应商搜索完成: {len(data)}条记录, 总计{total_count}条, "
+                f"{entity_label}搜索完成: {len(data)}条记录, 总计{total_count}条, "
                 f"耗时{query_time:.3f}秒"
             )
 
             return result
 
         except Exception as e:
-            self._logger.error(f"供应商搜索失败: {e}")
+            self._logger.error(f"{entity_label}搜索失败: {e}")
             if isinstance(e, ValidationError | BusinessLogicError):
                 raise
             raise BusinessLogicError(f"搜索执行失败: {e}") from e
 
+    def _resolve_order_by(
+        self, entity_type: str, order_by: str | None
+    ) -> tuple[str, str]:
+        """
+        解析并验证排序字段
+
+        键集分页只在排序字段有以它开头的索引时才能避免全表排序,
+        配置了表结构统计DAO时, 没有可用索引的排序字段会被拒绝.
+
+        Args:
+            entity_type: 实体类型
+            order_by: 排序字段, 可带表名前缀和方向
+
+        Returns:
+            Tuple[str, str]: (列名, 排序方向)
+
+        Raises:
+            ValidationError: 排序字段无效或没有可用索引
+        """
+        table = "customers" if entity_type == "customer" else "suppliers"
+        if not order_by:
+            return "updated_at", "DESC"
+
+        column, _, direction = order_by.strip().partition(" ")
+        column = column.removeprefix(f"{table}.")
+        direction = direction.strip().upper() or "ASC"
+        if direction not in ("ASC", "DESC"):
+            raise ValidationError(f"无效的排序方向: {direction}")
+
+        fields = (
+            self._customer_fields
+            if entity_type == "customer"
+            else self._supplier_fields
+        )
+        sortable = {f.column_name for f in fields if f.table_name == table} | {"id"}
+        if column not in sortable:
+            raise ValidationError(f"无效的排序字段: {column}")
+
+        if self._table_stats_dao is not None:
+            indexed = self._table_stats_dao.get_indexed_columns(table)
+            if column not in indexed:
+                raise ValidationError(f"排序字段 {column} 没有可用的索引")
+
+        return column, direction
+
+    def _count_results(
+        self,
+        entity_type: str,
+        conditions: list[QueryCondition],
+        query_builder: QueryBuilder,
+        count_mode: str,
+        use_cache: bool,
+    ) -> tuple[int | None, bool]:
+        """
+        统计搜索结果总数
+
+        同一组条件的精确总数按表缓存, 翻页和改变排序都不需要重新COUNT(*);
+        estimated模式在没有缓存且条件都是等值条件时使用sqlite_stat1的
+        行数统计估算, 其他情况执行COUNT(*).
+
+        Returns:
+            Tuple[Optional[int], bool]: (总数, 是否为估算值)
+        """
+        if count_mode == "none":
+            return None, False
+
+        table = "customers" if entity_type == "customer" else "suppliers"
+        count_key = self._generate_cache_key(entity_type, conditions, 0, 0, None)
+        if use_cache:
+            cached_count = self._count_cache.get(count_key)
+            if cached_count is not None:
+                return cached_count, False
+
+        # 只有全部为AND连接的等值条件时才能用索引统计估算
+        estimable = all(
+            condition.logic == "AND" and condition.operator == "="
+            for condition in conditions
+        )
+        if (
+            count_mode == "estimated"
+            and estimable
+            and self._table_stats_dao is not None
+        ):
+            equal_columns = tuple(condition.field for condition in conditions)
+            estimate = self._table_stats_dao.estimate_row_count(table, equal_columns)
+            if estimate is not None:
+                return estimate, True
+
+        dao = self._customer_dao if entity_type == "customer" else self._supplier_dao
+        count_sql, count_params = query_builder.build_count()
+        count_result = dao.execute_complex_query(count_sql, tuple(count_params))
+        total_count = count_result[0]["count"] if count_result else 0
+        if use_cache:
+            self._count_cache.put(
+                count_key, total_count, self._cache_ttl, tables=(table,)
+            )
+        return total_count, False
+
+    def _build_query(
+        self, entity_type: str, conditions: list[QueryCondition]
+    ) -> QueryBuilder:
+        """按实体类型构建查询(不含排序和分页)"""
+        if entity_type == "customer":
+            return self._build_customer_query(conditions)
+        return self._build_supplier_query(conditions)
+
+    def _fingerprint(
+        self, entity_type: str, conditions: list[QueryCondition]
+    ) -> QueryFingerprint:
+        """生成规范化的查询指纹"""
+        fields = (
+            self._customer_fields
+            if entity_type == "customer"
+            else self._supplier_fields
+        )
+        field_types = {field.key: field.field_type for field in fields}
+        return fingerprint_conditions(entity_type, conditions, field_types)
+
+    def _is_row_evaluable(self, fingerprint: QueryFingerprint) -> bool:
+        """判断查询条件能否直接在主表记录上计算(只含AND且不涉及关联统计字段)"""
+        if not fingerprint.conjunctive:
+            return False
+        fields = (
+            self._customer_fields
+            if fingerprint.entity_type == "customer"
+            else self._supplier_fields
+        )
+        base_fields = {
+            field.key
+            for field in fields
+            if field.table_name in ("customers", "suppliers")
+        }
+        return all(c.field in base_fields for c in fingerprint.conditions)
+
+    def _search_cached_superset(
+        self,
+        fingerprint: QueryFingerprint,
+        sort_column: str,
+        direction: str,
+        after: tuple[Any, Any] | None,
+        page: int,
+        page_size: int,
+    ) -> tuple[list[dict[str, Any]], bool, int] | None:
+        """
+        用已缓存的完整结果集回答查询
+
+        在所有条件是本查询条件子集的缓存结果中选择行数最少的一个,
+        在内存中补充筛选、排序和分页. 筛选结果也作为完整结果缓存,
+        供进一步细化的查询使用.
+
+        Returns:
+            Optional[Tuple[List[Dict[str, Any]], bool, int]]:
+                (当前页记录, 是否有下一页, 匹配总数); 没有可用的缓存时返回None
+        """
+        if not self._is_row_evaluable(fingerprint):
+            return None
+
+        candidates = []
+        for key in self._full_results.keys():
+            entry = self._full_results.peek(key)
+            if entry is not None and fingerprint.narrows(entry.value[0]):
+                candidates.append((len(entry.value[1]), key))
+        for _, key in sorted(candidates):
+            cached = self._full_results.get(key)
+            if cached is None:
+                continue  # 已过期或因写入失效
+            cached_fingerprint, rows = cached
+            extra_conditions = fingerprint.conditions - cached_fingerprint.conditions
+            try:
+                matched = filter_rows(rows, extra_conditions)
+                ordered = sort_rows(matched, sort_column, direction)
+                if after is not None:
+                    remaining = rows_after(ordered, sort_column, direction, after)
+                else:
+                    remaining = ordered[(page - 1) * page_size :]
+            except RowNotEvaluableError as e:
+                self._logger.debug(f"缓存结果无法在内存中筛选: {e}")
+                return None
+
+            if extra_conditions:
+                self._put_full_result(fingerprint, matched)
+            self._superset_hits += 1
+            return remaining[:page_size], len(remaining) > page_size, len(matched)
+        return None
+
+    def _cache_full_result(
+        self,
+        fingerprint: QueryFingerprint,
+        conditions: list[QueryCondition],
+        order: tuple[str, str],
+        complete_rows: list[dict[str, Any]] | None,
+        total_count: int | None,
+    ) -> None:
+        """
+        缓存查询的完整结果集
+
+        第一页已包含全部结果时直接缓存; 否则在结果总数不超过
+        FULL_RESULT_ROW_LIMIT时额外查询一次完整结果. 预取失败不影响搜索.
+
+        Args:
+            fingerprint: 查询指纹
+            conditions: 查询条件
+            order: (排序字段, 排序方向)
+            complete_rows: 已获得的完整结果, 没有时为None
+            total_count: 精确的结果总数, 未知时为None
+        """
+        if not self._is_row_evaluable(fingerprint):
+            return
+        if complete_rows is None:
+            if total_count is None or total_count > FULL_RESULT_ROW_LIMIT:
+                return
+            entity_type = fingerprint.entity_type
+            table = "customers" if entity_type == "customer" else "suppliers"
+            dao = (
+                self._customer_dao if entity_type == "customer" else self._supplier_dao
+            )
+            try:
+                builder = self._build_query(entity_type, conditions)
+                builder.seek(f"{table}.{order[0]}", order[1], None, f"{table}.id")
+                sql, params = builder.build()
+                complete_rows = dao.execute_complex_query(sql, tuple(params))
+            except Exception as e:
+                self._logger.debug(f"预取完整搜索结果失败: {e}")
+                return
+        self._put_full_result(fingerprint, complete_rows)
+
+    def _put_full_result(
+        self, fingerprint: QueryFingerprint, rows: list[dict[str, Any]]
+    ) -> None:
+        """缓存完整结果集, 所在表被写入时自动失效"""
+        table = "customers" if fingerprint.entity_type == "customer" else "suppliers"
+        self._full_results.put(
+            fingerprint.key,
+            (fingerprint, list(rows)),
+            self._cache_ttl,
+            tables=(table,),
+        )
+
     def _validate_conditions(
         self, conditions: list[QueryCondition], entity_type: str
     ) -> None:
@@ -403,15 +760,14 @@ class AdvancedSearchService:
             ):
                 raise ValidationError(f"字段 {condition.field} 的值不能为空")
 
-    def _build_customer_query(
-        self, conditions: list[QueryCondition], order_by: str | None = None
-    ) -> QueryBuilder:
+    def _build_customer_query(self, conditions: list[QueryCondition]) -> QueryBuilder:
         """
         构建客户查询
 
+        排序和分页由调用方通过QueryBuilder.seek设置.
+
         Args:
             conditions: 查询条件列表
-            order_by: 排序字段
 
         Returns:
             QueryBuilder: 查询构建器
@@ -453,27 +809,16 @@ class AdvancedSearchService:
             )
             self._add_condition_to_builder(builder, condition, logical_op, "customer")
 
-        # 添加排序
-        if order_by:
-            if " " in order_by:
-                field, direction = order_by.split(" ", 1)
-                builder.order_by(field, direction)
-            else:
-                builder.order_by(order_by)
-        else:
-            builder.order_by("customers.updated_at", "DESC")
-
         return builder
 
-    def _build_supplier_query(
-        self, conditions: list[QueryCondition], order_by: str | None = None
-    ) -> QueryBuilder:
+    def _build_supplier_query(self, conditions: list[QueryCondition]) -> QueryBuilder:
         """
         构建供应商查询
 
+        排序和分页由调用方通过QueryBuilder.seek设置.
+
         Args:
             conditions: 查询条件列表
-            order_by: 排序字段
 
         Returns:
             QueryBuilder: 查询构建器
@@ -501,16 +846,6 @@ class AdvancedSearchService:
             )
             self._add_condition_to_builder(builder, condition, logical_op, "supplier")
 
-        # 添加排序
-        if order_by:
-            if " " in order_by:
-                field, direction = order_by.split(" ", 1)
-                builder.order_by(field, direction)
-            else:
-                builder.order_by(order_by)
-        else:
-            builder.order_by("suppliers.updated_at", "DESC")
-
         return builder
 
     def _add_condition_to_builder(
@@ -624,6 +959,8 @@ class AdvancedSearchService:
         page: int,
         page_size: int,
         order_by: str | None,
+        cursor: str | None = None,
+        count_mode: str = "exact",
     ) -> str:
         """
         生成缓存键
@@ -634,37 +971,32 @@ class AdvancedSearchService:
             page: 页码
             page_size: 每页大小
             order_by: 排序字段
+            cursor: 分页游标
+            count_mode: 总数统计方式
 
         Returns:
             str: 缓存键
         """
         import hashlib
 
-        # 构建缓存键字符串
+        # 条件按规范化指纹参与缓存键, 写法或顺序不同但语义相同的查询共用缓存
         key_parts = [
-            entity_type,
+            self._fingerprint(entity_type, conditions).key,
             str(page),
             str(page_size),
             order_by or "",
+            cursor or "",
+            count_mode,
         ]
 
-        # 添加条件信息
-        for condition in conditions:
-            key_parts.extend(
-                [
-                    condition.field,
-                    condition.operator,
-                    str(condition.value),
-                    condition.logic,
-                ]
-            )
-
         key_string = "|".join(key_parts)
         return hashlib.md5(key_string.encode()).hexdigest()
 
     def clear_cache(self) -> None:
         """清除查询缓存"""
         self._query_cache.clear()
+        self._count_cache.clear()
+        self._full_results.clear()
         self._logger.debug("查询缓存已清除")
 
     def get_cache_stats(self) -> dict[str, Any]:
@@ -678,15 +1010,18 @@ class AdvancedSearchService:
         valid_entries = 0
         expired_entries = 0
 
-        for _, cached_time in self._query_cache.values():
-            if now - cached_time < self._cache_ttl:
+        for key in self._query_cache.keys():
+            entry = self._query_cache.peek(key)
+            if entry is not None and now - entry.created_at < self._cache_ttl:
                 valid_entries += 1
             else:
                 expired_entries += 1
 
         return {
-            "total_entries": len(self._query_cache),
+            "total_entries": valid_entries + expired_entries,
             "valid_entries": valid_entries,
             "expired_entries": expired_entries,
             "cache_ttl_minutes": self._cache_ttl.total_seconds() / 60,
+            "full_results": len(self._full_results),
+            "superset_hits": self._superset_hits,
         }
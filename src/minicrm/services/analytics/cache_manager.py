@@ -6,12 +6,25 @@ MiniCRM 缓存管理器
 - TTL过期管理
 - 缓存统计
 - 缓存清理
+
+数据存放在统一缓存层的"analytics"区域中, 受区域字节预算和全局内存上限约束.
+区域可配置磁盘二级缓存, 用于保存计算代价高的分析结果.
 """
 
+from collections.abc import Iterable
+from datetime import timedelta
 import logging
-import time
 from typing import Any
 
+from minicrm.core.cache_tier import get_cache_tier
+
+
+# 分析结果缓存区域
+ANALYTICS_REGION = "analytics"
+
+# 分析结果缓存区域的字节预算(MB)
+ANALYTICS_REGION_SIZE_MB = 32.0
+
 
 class CacheManager:
     """
@@ -20,15 +33,20 @@ class CacheManager:
     提供简单的内存缓存功能,支持TTL过期机制.
     """
 
-    def __init__(self, cache_ttl: int = 300):
+    def __init__(self, cache_ttl: int = 300, namespace: str | None = None):
         """
         初始化缓存管理器
 
         Args:
             cache_ttl: 缓存生存时间(秒),默认5分钟
+            namespace: 缓存命名空间, 为None时每个实例使用独立的命名空间
         """
-        self._cache: dict[str, dict[str, Any]] = {}
         self._cache_ttl = cache_ttl
+        self._ttl = timedelta(seconds=cache_ttl)
+        self._region = get_cache_tier().create_region(
+            ANALYTICS_REGION, ANALYTICS_REGION_SIZE_MB, self._ttl
+        )
+        self._cache = self._region.namespace(namespace)
         self._logger = logging.getLogger(__name__)
 
         self._logger.debug(f"缓存管理器初始化完成,TTL: {cache_ttl}秒")
@@ -43,30 +61,21 @@ class CacheManager:
         Returns:
             缓存值,如果不存在或已过期则返回None
         """
-        if key not in self._cache:
-            return None
+        value = self._cache.get(key)
+        if value is not None:
+            self._logger.debug(f"缓存命中: {key}")
+        return value
 
-        cache_entry = self._cache[key]
-        current_time = time.time()
-
-        # 检查是否过期
-        if current_time - cache_entry["timestamp"] > self._cache_ttl:
-            del self._cache[key]
-            self._logger.debug(f"缓存过期并删除: {key}")
-            return None
-
-        self._logger.debug(f"缓存命中: {key}")
-        return cache_entry["value"]
-
-    def set(self, key: str, value: Any) -> None:
+    def set(self, key: str, value: Any, tables: Iterable[str] | None = None) -> None:
         """
         设置缓存值
 
         Args:
             key: 缓存键
             value: 缓存值
+            tables: 结果依赖的表, 这些表被写入时缓存自动失效
         """
-        self._cache[key] = {"value": value, "timestamp": time.time()}
+        self._cache.put(key, value, self._ttl, tables=tables)
         self._logger.debug(f"缓存设置: {key}")
 
     def clear(self, pattern: str | None = None) -> None:
@@ -80,9 +89,9 @@ class CacheManager:
             self._cache.clear()
             self._logger.info("清除所有缓存")
         else:
-            keys_to_remove = [key for key in self._cache if pattern in key]
+            keys_to_remove = [key for key in self._cache.keys() if pattern in key]
             for key in keys_to_remove:
-                del self._cache[key]
+                self._cache.remove(key)
             self._logger.info(
                 f"清除匹配模式 '{pattern}' 的缓存,共{len(keys_to_remove)}项"
             )
@@ -94,19 +103,15 @@ class CacheManager:
         Returns:
             Dict[str, Any]: 缓存统计数据
         """
-        current_time = time.time()
-        valid_entries = 0
-        expired_entries = 0
-
-        for cache_entry in self._cache.values():
-            if current_time - cache_entry["timestamp"] > self._cache_ttl:
-                expired_entries += 1
-            else:
-                valid_entries += 1
+        self._region.purge_expired()
+        region_stats = self._region.get_statistics()
 
         return {
             "total_entries": len(self._cache),
-            "valid_entries": valid_entries,
-            "expired_entries": expired_entries,
+            "valid_entries": len(self._cache),
+            "expired_entries": 0,
             "cache_ttl": self._cache_ttl,
+            "region_size_bytes": region_stats.size_bytes,
+            "region_hit_rate": region_stats.hit_rate,
+            "region_l2_hits": region_stats.l2_hits,
         }
@@ -13,14 +13,24 @@ MiniCRM 客户分析服务
 - 不包含UI逻辑
 """
 
+import heapq
 import logging
-from datetime import datetime, timedelta
+from collections.abc import Iterable
 from typing import Any
 
 from minicrm.core.exceptions import ServiceError
 from minicrm.core.interfaces.dao_interfaces import ICustomerDAO
+from minicrm.data.dao.customer_score_dao import CustomerScoreDAO
+from minicrm.data.dao.metric_rollup_dao import MetricRollupDAO
 from minicrm.models.analytics_models import CustomerAnalysis
-from transfunctions.calculations import calculate_customer_value_score
+from transfunctions.calculations import (
+    calculate_customer_value_score,
+    calculate_period_buckets,
+)
+
+
+# 预计算评分的最长有效天数, 合作时长等随日期变化的评分项按此周期更新
+SCORE_MAX_AGE_DAYS = 7
 
 
 class CustomerAnalyticsService:
@@ -34,14 +44,24 @@ class CustomerAnalyticsService:
     - 客户行为分析
     """
 
-    def __init__(self, customer_dao: ICustomerDAO):
+    def __init__(
+        self,
+        customer_dao: ICustomerDAO,
+        score_dao: CustomerScoreDAO | None = None,
+        rollup_dao: MetricRollupDAO | None = None,
+    ):
         """
         初始化客户分析服务
 
         Args:
             customer_dao: 客户数据访问对象
+            score_dao: 客户价值评分DAO, 提供时价值分布和顶级客户
+                使用预计算评分, 否则每次分析都遍历全部客户实时计算
+            rollup_dao: 业务指标汇总DAO, 未提供时增长趋势的各月数据均为0
         """
         self._customer_dao = customer_dao
+        self._score_dao = score_dao
+        self._rollup_dao = rollup_dao
         self._logger = logging.getLogger(__name__)
 
         self._logger.debug("客户分析服务初始化完成")
@@ -65,16 +85,23 @@ class CustomerAnalyticsService:
             # 获取客户统计数据
             customer_stats = self._customer_dao.get_statistics()
 
-            # 获取所有客户数据
-            all_customers = self._customer_dao.search()
-
-            # 计算客户价值分布
-            value_distribution = self.calculate_customer_value_distribution(
-                all_customers
-            )
-
-            # 获取顶级客户
-            top_customers = self.get_top_customers(all_customers, limit=10)
+            if self._score_dao is not None:
+                # 只重算有变化的客户, 分布和前N名由索引查询得到
+                self.refresh_customer_scores()
+                value_distribution = self._empty_value_distribution()
+                value_distribution.update(self._score_dao.get_value_level_counts())
+                top_customers = self._score_dao.get_top_customers(limit=10)
+            else:
+                # 单次流式遍历客户, 同时计算价值分布和顶级客户,
+                # 内存中只保留分布计数和前N名
+                distribution = self._empty_value_distribution()
+                top_heap: list[tuple[float, int, dict[str, Any]]] = []
+                for index, customer in enumerate(self._customer_dao.stream()):
+                    self._add_to_value_distribution(distribution, customer)
+                    self._push_top_customer(top_heap, customer, index, limit=10)
+
+                value_distribution = distribution
+                top_customers = self._sorted_top_customers(top_heap)
 
             # 计算增长趋势
             growth_trend = self.calculate_customer_growth_trend(time_period_months)
@@ -95,8 +122,58 @@ class CustomerAnalyticsService:
             self._logger.error(f"客户分析失败: {e}")
             raise ServiceError(f"客户分析失败: {e}", "CustomerAnalyticsService") from e
 
+    def refresh_customer_scores(
+        self, batch_size: int = 500, max_age_days: int = SCORE_MAX_AGE_DAYS
+    ) -> int:
+        """
+        重算被标记为需要更新的客户评分并持久化
+
+        客户本身或其互动、报价、财务记录变化时由数据库触发器标记,
+        因此每次只处理自上次刷新以来有变化的客户. 评分依赖当前日期,
+        计算时间超过max_age_days的评分也会重算.
+
+        Args:
+            batch_size: 每批处理的客户数
+            max_age_days: 评分的最长有效天数
+
+        Returns:
+            int: 保存的评分数量
+        """
+        if self._score_dao is None:
+            return 0
+
+        self._score_dao.mark_stale(max_age_days)
+        saved = 0
+        last_customer_id = 0
+        while True:
+            customers = self._score_dao.get_dirty_customers(
+                last_customer_id, batch_size
+            )
+            if not customers:
+                break
+
+            scores = []
+            for customer in customers:
+                version = customer.pop("_score_dirty_version")
+                value_score = self._safe_value_score(customer)
+                scores.append(
+                    (
+                        customer["id"],
+                        version,
+                        value_score,
+                        self._ranking_score(customer),
+                        self._value_level(value_score),
+                    )
+                )
+            saved += self._score_dao.save_scores(scores)
+            last_customer_id = customers[-1]["id"]
+
+        if saved:
+            self._logger.info(f"客户价值评分已更新: {saved} 个客户")
+        return saved
+
     def calculate_customer_value_distribution(
-        self, customers: list[dict[str, Any]]
+        self, customers: Iterable[dict[str, Any]]
     ) -> dict[str, int]:
         """
         计算客户价值分布
@@ -117,28 +194,51 @@ class CustomerAnalyticsService:
         Returns:
             Dict[str, int]: 客户价值分布统计
         """
-        distribution = {"高价值": 0, "中价值": 0, "低价值": 0, "潜在": 0}
+        distribution = self._empty_value_distribution()
 
         for customer in customers:
-            # 使用优化的客户价值评分算法
-            try:
-                score = self._calculate_enhanced_customer_value_score(customer)
-
-                # 优化的价值分级阈值
-                if score >= 85:
-                    distribution["高价值"] += 1
-                elif score >= 70:
-                    distribution["中价值"] += 1
-                elif score >= 50:
-                    distribution["低价值"] += 1
-                else:
-                    distribution["潜在"] += 1
-            except Exception as e:
-                self._logger.warning(f"计算客户价值失败: {e}")
-                distribution["潜在"] += 1
+            self._add_to_value_distribution(distribution, customer)
 
         return distribution
 
+    def _empty_value_distribution(self) -> dict[str, int]:
+        """创建空的价值分布计数"""
+        return {"高价值": 0, "中价值": 0, "低价值": 0, "潜在": 0}
+
+    def _add_to_value_distribution(
+        self, distribution: dict[str, int], customer: dict[str, Any]
+    ) -> None:
+        """将单个客户计入价值分布"""
+        distribution[self._value_level(self._safe_value_score(customer))] += 1
+
+    def _safe_value_score(self, customer: dict[str, Any]) -> float:
+        """计算用于价值分布的评分, 失败时按潜在客户处理"""
+        # 使用优化的客户价值评分算法
+        try:
+            return self._calculate_enhanced_customer_value_score(customer)
+        except Exception as e:
+            self._logger.warning(f"计算客户价值失败: {e}")
+            return 0.0
+
+    def _value_level(self, score: float) -> str:
+        """根据评分确定价值等级"""
+        # 优化的价值分级阈值
+        if score >= 85:
+            return "高价值"
+        elif score >= 70:
+            return "中价值"
+        elif score >= 50:
+            return "低价值"
+        else:
+            return "潜在"
+
+    def _ranking_score(self, customer: dict[str, Any]) -> float:
+        """计算用于顶级客户排名的评分"""
+        try:
+            return calculate_customer_value_score(customer, [], []).total_score
+        except Exception:
+            return 0
+
     def _calculate_enhanced_customer_value_score(
         self, customer: dict[str, Any]
     ) -> float:
@@ -516,7 +616,7 @@ class CustomerAnalyticsService:
         return rating_factor * delay_factor * dispute_factor
 
     def get_top_customers(
-        self, customers: list[dict[str, Any]], limit: int = 10
+        self, customers: Iterable[dict[str, Any]], limit: int = 10
     ) -> list[dict[str, Any]]:
         """
         获取顶级客户
@@ -531,32 +631,52 @@ class CustomerAnalyticsService:
             List[Dict[str, Any]]: 顶级客户列表
         """
         try:
-            # 计算每个客户的价值评分
-            customers_with_scores = []
-            for customer in customers:
-                try:
-                    value_metrics = calculate_customer_value_score(customer, [], [])
-                    customer_data = customer.copy()
-                    customer_data["value_score"] = value_metrics.total_score
-                    customers_with_scores.append(customer_data)
-                except Exception:
-                    customer_data = customer.copy()
-                    customer_data["value_score"] = 0
-                    customers_with_scores.append(customer_data)
-
-            # 按价值评分排序
-            sorted_customers = sorted(
-                customers_with_scores,
-                key=lambda x: x.get("value_score", 0),
-                reverse=True,
-            )
+            # 使用大小为limit的最小堆, 无需为全部客户排序
+            top_heap: list[tuple[float, int, dict[str, Any]]] = []
+            for index, customer in enumerate(customers):
+                self._push_top_customer(top_heap, customer, index, limit)
 
-            return sorted_customers[:limit]
+            return self._sorted_top_customers(top_heap)
 
         except Exception as e:
             self._logger.error(f"获取顶级客户失败: {e}")
             # 返回前N个客户作为备选
-            return customers[:limit]
+            return list(customers[:limit]) if isinstance(customers, list) else []
+
+    def _push_top_customer(
+        self,
+        top_heap: list[tuple[float, int, dict[str, Any]]],
+        customer: dict[str, Any],
+        index: int,
+        limit: int,
+    ) -> None:
+        """
+        将客户计入前N名最小堆
+
+        Args:
+            top_heap: 以(评分, -序号, 客户)为元素的最小堆
+            customer: 客户数据
+            index: 客户在输入中的序号, 评分相同时先出现的客户优先
+            limit: 保留数量
+        """
+        entry = (self._ranking_score(customer), -index, customer)
+        if len(top_heap) < limit:
+            heapq.heappush(top_heap, entry)
+        elif entry[:2] > top_heap[0][:2]:
+            heapq.heapreplace(top_heap, entry)
+
+    def _sorted_top_customers(
+        self, top_heap: list[tuple[float, int, dict[str, Any]]]
+    ) -> list[dict[str, Any]]:
+        """将前N名堆转换为按评分降序排列的客户列表"""
+        result = []
+        for score, _, customer in sorted(
+            top_heap, key=lambda entry: entry[:2], reverse=True
+        ):
+            customer_data = customer.copy()
+            customer_data["value_score"] = score
+            result.append(customer_data)
+        return result
 
     def calculate_customer_growth_trend(self, months: int) -> list[dict[str, Any]]:
         """
@@ -571,22 +691,28 @@ class CustomerAnalyticsService:
             List[Dict[str, Any]]: 增长趋势数据
         """
         try:
-            # 模拟数据,实际应从数据库获取历史数据
-            trend_data = []
-            base_date = datetime.now() - timedelta(days=months * 30)
-
-            for i in range(months):
-                month_date = base_date + timedelta(days=i * 30)
+            buckets = calculate_period_buckets("monthly", months)
+            series, total = {}, 0
+            if self._rollup_dao is not None and buckets:
+                series = self._rollup_dao.get_series(
+                    "new_customers", "monthly", buckets[0]["start"], buckets[-1]["end"]
+                )
+                total = self._rollup_dao.get_count_before(
+                    "new_customers", buckets[0]["start"]
+                )
 
-                # 实际实现中应该查询数据库获取该月的真实数据
-                # 这里使用模拟数据展示数据结构
+            trend_data = []
+            for bucket in buckets:
+                new_customers = series.get(bucket["key"], {}).get("count", 0)
+                previous_total = total
+                total += new_customers
                 trend_data.append(
                     {
-                        "date": month_date.strftime("%Y-%m"),
-                        "new_customers": 10 + i * 2,  # 模拟增长
-                        "total_customers": 100 + i * 12,
-                        "growth_rate": ((10 + i * 2) / (100 + (i - 1) * 12) * 100)
-                        if i > 0
+                        "date": bucket["key"],
+                        "new_customers": new_customers,
+                        "total_customers": total,
+                        "growth_rate": (new_customers / previous_total * 100)
+                        if previous_total
                         else 0,
                     }
                 )
@@ -15,11 +15,25 @@ MiniCRM 财务风险预警服务
 """
 
 import logging
-from datetime import datetime
+from dataclasses import dataclass
+from datetime import date, datetime
 from typing import Any
 
 from minicrm.core.exceptions import ServiceError
 from minicrm.core.interfaces.dao_interfaces import ICustomerDAO, ISupplierDAO
+from minicrm.data.dao.financial_risk_dao import AGING_BUCKET_FIELDS, FinancialRiskDAO
+
+
+@dataclass
+class RiskDataSnapshot:
+    """
+    单次风险分析使用的客户风险数据
+
+    综合风险分析只加载一次, 由信用、应收账款和集中度分析共享.
+    """
+
+    as_of: date
+    profiles: list[dict[str, Any]]
 
 
 class FinancialRiskService:
@@ -34,16 +48,23 @@ class FinancialRiskService:
     - 动态风险阈值管理
     """
 
-    def __init__(self, customer_dao: ICustomerDAO, supplier_dao: ISupplierDAO):
+    def __init__(
+        self,
+        customer_dao: ICustomerDAO,
+        supplier_dao: ISupplierDAO,
+        risk_dao: FinancialRiskDAO | None = None,
+    ):
         """
         初始化财务风险服务
 
         Args:
             customer_dao: 客户数据访问对象
             supplier_dao: 供应商数据访问对象
+            risk_dao: 财务风险DAO(可选, 提供时风险指标由数据库按财务记录聚合)
         """
         self._customer_dao = customer_dao
         self._supplier_dao = supplier_dao
+        self._risk_dao = risk_dao
         self._logger = logging.getLogger(__name__)
 
         # 风险阈值配置
@@ -165,17 +186,20 @@ class FinancialRiskService:
         try:
             self._logger.info("开始综合财务风险分析")
 
+            # 客户风险数据只加载一次, 供以下各项分析共享
+            snapshot = self.load_risk_snapshot()
+
             # 1. 客户信用风险分析
-            credit_risk = self.analyze_customer_credit_risk()
+            credit_risk = self.analyze_customer_credit_risk(snapshot)
 
             # 2. 应收账款风险分析
-            receivable_risk = self.analyze_receivable_risk()
+            receivable_risk = self.analyze_receivable_risk(snapshot)
 
             # 3. 现金流风险分析
             cash_flow_risk = self.analyze_cash_flow_risk()
 
             # 4. 客户集中度风险分析
-            concentration_risk = self.analyze_customer_concentration_risk()
+            concentration_risk = self.analyze_customer_concentration_risk(snapshot)
 
             # 5. 供应商付款风险分析
             payment_risk = self.analyze_supplier_payment_risk()
@@ -210,58 +234,129 @@ class FinancialRiskService:
                 f"综合财务风险分析失败: {e}", "FinancialRiskService"
             ) from e
 
-    def analyze_customer_credit_risk(self) -> dict[str, Any]:
+    def load_risk_snapshot(self) -> RiskDataSnapshot:
+        """
+        加载客户风险数据
+
+        Returns:
+            RiskDataSnapshot: 按未结应收金额从高到低排序的客户风险档案
+        """
+        as_of = date.today()
+        if self._risk_dao is not None:
+            profiles = self._risk_dao.get_customer_risk_profiles(as_of)
+        else:
+            profiles = self._build_risk_profiles(self._customer_dao.search(), as_of)
+        return RiskDataSnapshot(as_of=as_of, profiles=profiles)
+
+    def _build_risk_profiles(
+        self, customers: list[dict[str, Any]], as_of: date
+    ) -> list[dict[str, Any]]:
+        """
+        由客户数据中的应收字段构建风险档案
+
+        未提供财务风险DAO时使用, 档案结构与FinancialRiskDAO的结果一致.
+        """
+        profiles = []
+        for customer in customers:
+            profile = dict(customer)
+            outstanding_amount = customer.get("outstanding_amount", 0)
+            overdue_days = 0
+            due_date_str = customer.get("payment_due_date")
+            if outstanding_amount > 0 and due_date_str:
+                try:
+                    due_date = date.fromisoformat(due_date_str)
+                    overdue_days = max(0, (as_of - due_date).days)
+                except ValueError:
+                    pass
+
+            profile["outstanding_amount"] = outstanding_amount
+            profile["overdue_days"] = overdue_days
+            profile["overdue_amount"] = outstanding_amount if overdue_days else 0
+            for field in AGING_BUCKET_FIELDS.values():
+                profile[field] = 0
+            if overdue_days:
+                profile[self._aging_bucket_field(overdue_days)] = outstanding_amount
+            profile["revenue"] = customer.get("annual_revenue", 0)
+            profiles.append(profile)
+
+        total_revenue = sum(p["revenue"] for p in profiles)
+        by_revenue = sorted(profiles, key=lambda p: p["revenue"], reverse=True)
+        for rank, profile in enumerate(by_revenue, start=1):
+            profile["revenue_rank"] = rank
+            if total_revenue:
+                profile["revenue_share"] = profile["revenue"] / total_revenue
+
+        profiles.sort(key=lambda p: p["outstanding_amount"], reverse=True)
+        return profiles
+
+    def _aging_bucket_field(self, overdue_days: int) -> str:
+        """获取逾期天数对应的账龄金额字段"""
+        if overdue_days <= 30:
+            return AGING_BUCKET_FIELDS["0-30天"]
+        if overdue_days <= 60:
+            return AGING_BUCKET_FIELDS["31-60天"]
+        if overdue_days <= 90:
+            return AGING_BUCKET_FIELDS["61-90天"]
+        return AGING_BUCKET_FIELDS["90天以上"]
+
+    def analyze_customer_credit_risk(
+        self, snapshot: RiskDataSnapshot | None = None
+    ) -> dict[str, Any]:
         """
         分析客户信用风险
 
+        Args:
+            snapshot: 客户风险数据, 为None时重新加载
+
         Returns:
             Dict[str, Any]: 客户信用风险分析结果
         """
         try:
-            customers = self._customer_dao.search()
+            snapshot = snapshot or self.load_risk_snapshot()
+            thresholds = self._risk_thresholds["credit_risk"]
 
             risk_distribution = {"低风险": 0, "中风险": 0, "高风险": 0}
             high_risk_customers = []
             total_credit_exposure = 0
+            total_score = 0.0
 
-            for customer in customers:
-                credit_score = self._calculate_customer_credit_score(customer)
-                credit_limit = customer.get("credit_limit", 0)
-                outstanding_amount = customer.get("outstanding_amount", 0)
+            for profile in snapshot.profiles:
+                credit_score = self._calculate_customer_credit_score(profile)
+                outstanding_amount = profile.get("outstanding_amount", 0)
 
+                total_score += credit_score
                 total_credit_exposure += outstanding_amount
 
                 # 风险分级
-                if (
-                    credit_score
-                    >= self._risk_thresholds["credit_risk"]["low_threshold"]
-                ):
+                if credit_score >= thresholds["good_threshold"]:
                     risk_distribution["低风险"] += 1
-                elif (
-                    credit_score
-                    >= self._risk_thresholds["credit_risk"]["medium_threshold"]
-                ):
+                elif credit_score >= thresholds["warning_threshold"]:
                     risk_distribution["中风险"] += 1
                 else:
                     risk_distribution["高风险"] += 1
-                    high_risk_customers.append(
-                        {
-                            "customer_id": customer.get("id"),
-                            "customer_name": customer.get("name"),
-                            "credit_score": credit_score,
-                            "outstanding_amount": outstanding_amount,
-                            "credit_limit": credit_limit,
-                            "risk_factors": self._identify_credit_risk_factors(
-                                customer
-                            ),
-                        }
-                    )
-
+                    # 档案按未结应收金额排序, 前10个即敞口最大的高风险客户
+                    if len(high_risk_customers) < 10:
+                        high_risk_customers.append(
+                            {
+                                "customer_id": profile.get("id"),
+                                "customer_name": profile.get("name"),
+                                "credit_score": credit_score,
+                                "outstanding_amount": outstanding_amount,
+                                "credit_limit": profile.get("credit_limit", 0),
+                                "risk_factors": self._identify_credit_risk_factors(
+                                    profile
+                                ),
+                            }
+                        )
+
+            customer_count = len(snapshot.profiles)
             return {
                 "risk_distribution": risk_distribution,
-                "high_risk_customers": high_risk_customers[:10],  # 前10个高风险客户
+                "high_risk_customers": high_risk_customers,
                 "total_credit_exposure": total_credit_exposure,
-                "average_credit_score": self._calculate_average_credit_score(customers),
+                "average_credit_score": (
+                    round(total_score / customer_count, 2) if customer_count else 0
+                ),
                 "risk_level": self._determine_credit_risk_level(risk_distribution),
             }
 
@@ -375,74 +470,58 @@ class FinancialRiskService:
 
         return industry_score + position_score
 
-    def analyze_receivable_risk(self) -> dict[str, Any]:
+    def analyze_receivable_risk(
+        self, snapshot: RiskDataSnapshot | None = None
+    ) -> dict[str, Any]:
         """
         分析应收账款风险
 
+        Args:
+            snapshot: 客户风险数据, 为None时重新加载
+
         Returns:
             Dict[str, Any]: 应收账款风险分析结果
         """
         try:
-            customers = self._customer_dao.search()
+            snapshot = snapshot or self.load_risk_snapshot()
+            thresholds = self._risk_thresholds["overdue_risk"]
 
             total_receivables = 0
             overdue_receivables = 0
-            aging_analysis = {"0-30天": 0, "31-60天": 0, "61-90天": 0, "90天以上": 0}
+            aging_analysis = dict.fromkeys(AGING_BUCKET_FIELDS, 0)
             high_risk_receivables = []
 
-            current_date = datetime.now()
-
-            for customer in customers:
-                outstanding_amount = customer.get("outstanding_amount", 0)
-                due_date_str = customer.get("payment_due_date")
-
+            for profile in snapshot.profiles:
+                outstanding_amount = profile.get("outstanding_amount", 0)
                 if outstanding_amount <= 0:
                     continue
 
                 total_receivables += outstanding_amount
+                overdue_receivables += profile.get("overdue_amount", 0)
+                for bucket, field in AGING_BUCKET_FIELDS.items():
+                    aging_analysis[bucket] += profile.get(field, 0)
 
-                if due_date_str:
-                    try:
-                        due_date = datetime.strptime(due_date_str, "%Y-%m-%d")
-                        overdue_days = (current_date - due_date).days
-
-                        if overdue_days > 0:
-                            overdue_receivables += outstanding_amount
-
-                            # 账龄分析
-                            if overdue_days <= 30:
-                                aging_analysis["0-30天"] += outstanding_amount
-                            elif overdue_days <= 60:
-                                aging_analysis["31-60天"] += outstanding_amount
-                            elif overdue_days <= 90:
-                                aging_analysis["61-90天"] += outstanding_amount
-                            else:
-                                aging_analysis["90天以上"] += outstanding_amount
-
-                            # 高风险应收账款
-                            if (
-                                overdue_days
-                                >= self._risk_thresholds["overdue_risk"][
-                                    "critical_days"
-                                ]
-                                or outstanding_amount
-                                >= self._risk_thresholds["overdue_risk"][
-                                    "amount_threshold"
-                                ]
-                            ):
-                                high_risk_receivables.append(
-                                    {
-                                        "customer_id": customer.get("id"),
-                                        "customer_name": customer.get("name"),
-                                        "outstanding_amount": outstanding_amount,
-                                        "overdue_days": overdue_days,
-                                        "risk_level": "高"
-                                        if overdue_days >= 60
-                                        else "中",
-                                    }
-                                )
-                    except ValueError:
-                        continue
+                # 高风险应收账款, 档案已按未结应收金额从高到低排序
+                overdue_days = profile.get("overdue_days", 0)
+                if (
+                    overdue_days > 0
+                    and len(high_risk_receivables) < 10
+                    and (
+                        overdue_days >= thresholds["critical_days"]
+                        or outstanding_amount >= thresholds["large_amount_threshold"]
+                    )
+                ):
+                    high_risk_receivables.append(
+                        {
+                            "customer_id": profile.get("id"),
+                            "customer_name": profile.get("name"),
+                            "outstanding_amount": outstanding_amount,
+                            "overdue_days": overdue_days,
+                            "risk_level": "高"
+                            if overdue_days >= thresholds["serious_days"]
+                            else "中",
+                        }
+                    )
 
             overdue_rate = (
                 (overdue_receivables / total_receivables * 100)
@@ -455,11 +534,7 @@ class FinancialRiskService:
                 "overdue_receivables": overdue_receivables,
                 "overdue_rate": round(overdue_rate, 2),
                 "aging_analysis": aging_analysis,
-                "high_risk_receivables": sorted(
-                    high_risk_receivables,
-                    key=lambda x: x["outstanding_amount"],
-                    reverse=True,
-                )[:10],
+                "high_risk_receivables": high_risk_receivables,
                 "risk_level": self._determine_receivable_risk_level(overdue_rate),
             }
 
@@ -563,65 +638,61 @@ class FinancialRiskService:
 
         return forecast
 
-    def analyze_customer_concentration_risk(self) -> dict[str, Any]:
+    def analyze_customer_concentration_risk(
+        self, snapshot: RiskDataSnapshot | None = None
+    ) -> dict[str, Any]:
         """
         分析客户集中度风险
 
+        Args:
+            snapshot: 客户风险数据, 为None时重新加载
+
         Returns:
             Dict[str, Any]: 客户集中度风险分析结果
         """
         try:
-            customers = self._customer_dao.search()
+            snapshot = snapshot or self.load_risk_snapshot()
 
-            # 按收入排序
-            customers_by_revenue = sorted(
-                customers, key=lambda x: x.get("annual_revenue", 0), reverse=True
+            # 收入排名和占比已随风险档案一并计算
+            top_customers = sorted(
+                (p for p in snapshot.profiles if p.get("revenue_rank", 0) <= 5),
+                key=lambda p: p["revenue_rank"],
             )
-
-            total_revenue = sum(c.get("annual_revenue", 0) for c in customers)
+            total_revenue = sum(p.get("revenue", 0) for p in snapshot.profiles)
 
             if total_revenue == 0:
                 return {"risk_level": "低", "concentration_ratio": 0}
 
             # 计算集中度指标
-            top1_ratio = (
-                customers_by_revenue[0].get("annual_revenue", 0) / total_revenue
-                if customers_by_revenue
-                else 0
-            )
-            top5_revenue = sum(
-                c.get("annual_revenue", 0) for c in customers_by_revenue[:5]
-            )
-            top5_ratio = top5_revenue / total_revenue
+            top1_ratio = top_customers[0].get("revenue_share", 0)
+            top5_ratio = sum(p.get("revenue_share", 0) for p in top_customers)
 
             # 风险等级判断
-            single_limit = self._risk_thresholds["concentration_risk"][
-                "single_customer_limit"
-            ]
-            top5_limit = self._risk_thresholds["concentration_risk"][
-                "top5_customer_limit"
-            ]
-
-            if top1_ratio > single_limit or top5_ratio > top5_limit:
+            thresholds = self._risk_thresholds["concentration_risk"]
+            single_limit = thresholds["single_customer_warning"]
+            top5_limit = thresholds["top5_customer_warning"]
+
+            if (
+                top1_ratio > thresholds["single_customer_critical"]
+                or top5_ratio > thresholds["top5_customer_critical"]
+            ):
                 risk_level = "高"
-            elif top1_ratio > single_limit * 0.8 or top5_ratio > top5_limit * 0.9:
+            elif top1_ratio > single_limit or top5_ratio > top5_limit:
                 risk_level = "中"
             else:
                 risk_level = "低"
 
             return {
-                "total_customers": len(customers),
+                "total_customers": len(snapshot.profiles),
                 "top1_customer_ratio": round(top1_ratio * 100, 2),
                 "top5_customers_ratio": round(top5_ratio * 100, 2),
                 "top_customers": [
                     {
-                        "name": c.get("name"),
-                        "revenue": c.get("annual_revenue", 0),
-                        "ratio": round(
-                            c.get("annual_revenue", 0) / total_revenue * 100, 2
-                        ),
+                        "name": p.get("name"),
+                        "revenue": p.get("revenue", 0),
+                        "ratio": round(p.get("revenue_share", 0) * 100, 2),
                     }
-                    for c in customers_by_revenue[:5]
+                    for p in top_customers
                 ],
                 "risk_level": risk_level,
                 "concentration_alerts": self._generate_concentration_alerts(
@@ -868,14 +939,6 @@ class FinancialRiskService:
 
         return risk_factors
 
-    def _calculate_average_credit_score(self, customers: list[dict[str, Any]]) -> float:
-        """计算平均信用评分"""
-        if not customers:
-            return 0
-
-        total_score = sum(self._calculate_customer_credit_score(c) for c in customers)
-        return round(total_score / len(customers), 2)
-
     def _determine_credit_risk_level(self, risk_distribution: dict[str, int]) -> str:
         """确定信用风险等级"""
         total_customers = sum(risk_distribution.values())
@@ -0,0 +1,446 @@
+"""
+MiniCRM 预测引擎
+
+基于NumPy的批量时间序列预测:
+- 多条等长序列组成二维数组(序列 x 时间点), 一次完成拟合和预测
+- 线性回归(含IQR异常值处理、R²和季节因子)、指数平滑、趋势外推
+- Holt-Winters加法季节模型
+- 滚动起点回测, 评估各预测方法的误差
+- 按序列最新数据点缓存已拟合的模型
+
+时间循环只发生在拟合递推中, 循环内对所有序列向量化计算,
+因此数万条序列(例如逐客户收入)的预测开销与单条序列相近.
+
+NumPy属于analytics可选依赖, 在首次拟合时才导入;
+未安装时预测服务继续使用纯Python实现.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+import importlib.util
+import threading
+from typing import Any
+
+
+# 支持的预测方法
+FORECAST_METHODS = (
+    "linear_regression",
+    "exponential_smoothing",
+    "trend_analysis",
+    "holt_winters",
+)
+
+# 固定置信度的预测方法
+_FIXED_CONFIDENCE = {"exponential_smoothing": 0.80, "trend_analysis": 0.75}
+
+
+def numpy_available() -> bool:
+    """
+    检查NumPy是否可用, 不会导入NumPy
+
+    Returns:
+        bool: 是否已安装NumPy
+    """
+    return importlib.util.find_spec("numpy") is not None
+
+
+@dataclass
+class FittedModel:
+    """
+    一批序列的拟合结果
+
+    params中的数组第一维与序列一一对应.
+    """
+
+    method: str
+    data_key: tuple
+    points: int
+    params: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ForecastResult:
+    """
+    一批序列的预测结果
+
+    数组形状均为(序列数, 预测步数).
+    """
+
+    values: Any
+    confidence: Any
+    base_values: Any | None = None
+    seasonal_factors: Any | None = None
+
+
+class ForecastingEngine:
+    """
+    批量预测引擎
+
+    所有方法接受形状为(序列数, 时间点数)的数组, 一维数组视为单条序列.
+    """
+
+    def __init__(
+        self,
+        season_length: int = 12,
+        alpha: float = 0.3,
+        beta: float = 0.1,
+        gamma: float = 0.1,
+        max_cached_models: int = 64,
+    ):
+        """
+        初始化预测引擎
+
+        Args:
+            season_length: 季节周期长度(月度数据为12)
+            alpha: 水平平滑参数
+            beta: 趋势平滑参数(Holt-Winters)
+            gamma: 季节平滑参数(Holt-Winters)
+            max_cached_models: 缓存的拟合模型数量上限
+        """
+        self._season_length = season_length
+        self._alpha = alpha
+        self._beta = beta
+        self._gamma = gamma
+        self._max_cached_models = max_cached_models
+
+        self._models: OrderedDict[tuple[str, str], FittedModel] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def fit(
+        self, values: Any, method: str, cache_key: str | None = None
+    ) -> FittedModel:
+        """
+        拟合一批序列
+
+        Args:
+            values: 序列数据
+            method: 预测方法, FORECAST_METHODS之一
+            cache_key: 缓存键(例如指标名), 提供时最新数据点未变化则复用已拟合的模型
+
+        Returns:
+            FittedModel: 拟合结果
+        """
+        if method not in FORECAST_METHODS:
+            raise ValueError(f"不支持的预测方法: {method}")
+
+        data = self._as_matrix(values)
+        if data.shape[1] < 2:
+            raise ValueError("每条序列至少需要2个数据点")
+
+        data_key = (data.shape, data[:, -1].tobytes())
+        if cache_key is not None:
+            with self._lock:
+                model = self._models.get((cache_key, method))
+                if model is not None and model.data_key == data_key:
+                    self._models.move_to_end((cache_key, method))
+                    return model
+
+        fitter = getattr(self, f"_fit_{method}")
+        model = FittedModel(
+            method=method, data_key=data_key, points=data.shape[1], params=fitter(data)
+        )
+
+        if cache_key is not None:
+            with self._lock:
+                self._models[(cache_key, method)] = model
+                self._models.move_to_end((cache_key, method))
+                while len(self._models) > self._max_cached_models:
+                    self._models.popitem(last=False)
+        return model
+
+    def forecast(
+        self,
+        values: Any,
+        horizon: int,
+        method: str = "linear_regression",
+        cache_key: str | None = None,
+    ) -> ForecastResult:
+        """
+        拟合并预测一批序列
+
+        Args:
+            values: 序列数据
+            horizon: 预测步数
+            method: 预测方法
+            cache_key: 模型缓存键
+
+        Returns:
+            ForecastResult: 预测结果
+        """
+        return self.predict(self.fit(values, method, cache_key), horizon)
+
+    def predict(self, model: FittedModel, horizon: int) -> ForecastResult:
+        """
+        使用已拟合的模型预测
+
+        Args:
+            model: 拟合结果
+            horizon: 预测步数
+
+        Returns:
+            ForecastResult: 预测结果
+        """
+        np = self._numpy()
+        steps = np.arange(1, horizon + 1, dtype=float)
+        params = model.params
+        n = model.points
+
+        if model.method == "linear_regression":
+            slope = params["slope"][:, None]
+            base = slope * (n - 1 + steps) + params["intercept"][:, None]
+            factors = params["seasonal"][:, self._season_positions(n, horizon)]
+            r_squared = params["r_squared"][:, None]
+            confidence = 0.5 + r_squared * 0.4 + min(0.1, n / 100) - steps * 0.02
+            return ForecastResult(
+                values=np.maximum(base * factors, 0),
+                confidence=np.clip(confidence, 0.3, 0.95),
+                base_values=base,
+                seasonal_factors=factors,
+            )
+
+        if model.method == "exponential_smoothing":
+            forecast = np.repeat(params["level"][:, None], horizon, axis=1)
+        elif model.method == "trend_analysis":
+            forecast = np.maximum(
+                params["last"][:, None] + params["trend"][:, None] * steps, 0
+            )
+        else:
+            seasonal = params["seasonal"][:, self._season_positions(n, horizon)]
+            forecast = (
+                params["level"][:, None] + params["trend"][:, None] * steps + seasonal
+            )
+
+        if model.method in _FIXED_CONFIDENCE:
+            confidence = np.full(forecast.shape, _FIXED_CONFIDENCE[model.method])
+        else:
+            # Holt-Winters按样本内一步预测误差估计置信度
+            confidence = np.clip(
+                0.95 - params["in_sample_error"][:, None] - steps * 0.02, 0.3, 0.95
+            )
+        return ForecastResult(values=forecast, confidence=confidence)
+
+    def backtest(
+        self,
+        values: Any,
+        method: str,
+        horizon: int = 1,
+        min_train: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        滚动起点回测
+
+        依次以前t个数据点拟合, 预测第t+horizon个数据点并与实际值比较.
+
+        Args:
+            values: 序列数据
+            method: 预测方法
+            horizon: 预测步长
+            min_train: 最少训练点数, 默认为序列长度的一半(至少3个)
+
+        Returns:
+            Dict[str, Any]: mape和mae为每条序列的平均误差数组, folds为回测次数
+        """
+        np = self._numpy()
+        data = self._as_matrix(values)
+        n = data.shape[1]
+        min_train = min_train or max(3, n // 2)
+
+        abs_errors = []
+        pct_errors = []
+        for origin in range(min_train, n - horizon + 1):
+            model = self.fit(data[:, :origin], method)
+            predicted = self.predict(model, horizon).values[:, -1]
+            actual = data[:, origin + horizon - 1]
+            error = np.abs(predicted - actual)
+            abs_errors.append(error)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct_errors.append(np.where(actual != 0, error / np.abs(actual), np.nan))
+
+        if not abs_errors:
+            raise ValueError("数据点不足, 无法回测")
+
+        with np.errstate(invalid="ignore"):
+            pct = np.stack(pct_errors, axis=1)
+            valid = ~np.isnan(pct)
+            mape = np.where(
+                valid.any(axis=1),
+                np.nansum(pct, axis=1) / np.maximum(valid.sum(axis=1), 1),
+                np.nan,
+            )
+        return {
+            "mape": mape,
+            "mae": np.stack(abs_errors, axis=1).mean(axis=1),
+            "folds": len(abs_errors),
+        }
+
+    def clear_cache(self) -> None:
+        """清除缓存的拟合模型"""
+        with self._lock:
+            self._models.clear()
+
+    def _fit_linear_regression(self, data: Any) -> dict[str, Any]:
+        """拟合线性回归, 异常值用中位数替换, 序列足够长时计算季节因子"""
+        np = self._numpy()
+        n = data.shape[1]
+        cleaned = self._replace_outliers(data)
+
+        x = np.arange(n, dtype=float)
+        x_centered = x - x.mean()
+        denominator = float(x_centered @ x_centered)
+        y_mean = cleaned.mean(axis=1)
+        if denominator == 0:
+            slope = np.zeros(len(cleaned))
+        else:
+            slope = (cleaned - y_mean[:, None]) @ x_centered / denominator
+        intercept = y_mean - slope * x.mean()
+
+        fitted = slope[:, None] * x + intercept[:, None]
+        ss_res = ((cleaned - fitted) ** 2).sum(axis=1)
+        ss_tot = ((cleaned - y_mean[:, None]) ** 2).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r_squared = np.where(ss_tot == 0, 0.0, 1 - ss_res / ss_tot)
+
+        return {
+            "slope": slope,
+            "intercept": intercept,
+            "r_squared": r_squared,
+            "seasonal": self._seasonal_factors(cleaned),
+        }
+
+    def _fit_exponential_smoothing(self, data: Any) -> dict[str, Any]:
+        """拟合简单指数平滑"""
+        level = data[:, 0].astype(float)
+        for t in range(1, data.shape[1]):
+            level = self._alpha * data[:, t] + (1 - self._alpha) * level
+        return {"level": level}
+
+    def _fit_trend_analysis(self, data: Any) -> dict[str, Any]:
+        """以最近数据点的平均变化作为趋势"""
+        if data.shape[1] >= 3:
+            trend = (data[:, -1] - data[:, -3]) / 2
+        else:
+            trend = data[:, -1] - data[:, -2]
+        return {"last": data[:, -1].astype(float), "trend": trend}
+
+    def _fit_holt_winters(self, data: Any) -> dict[str, Any]:
+        """
+        拟合Holt-Winters加法模型
+
+        不足两个完整季节周期时退化为Holt线性趋势模型(季节项为0).
+        """
+        np = self._numpy()
+        count, n = data.shape
+        m = self._season_length
+        seasonal_fit = n >= 2 * m
+
+        if seasonal_fit:
+            # 用完整周期的均值估计初始趋势, 季节项取各周期去趋势后偏差的平均
+            cycles = n // m
+            cycle_means = data[:, : cycles * m].reshape(count, cycles, m).mean(axis=2)
+            trend = (cycle_means[:, -1] - cycle_means[:, 0]) / ((cycles - 1) * m)
+            ramp = (np.arange(m) - (m - 1) / 2)[None, None, :] * trend[:, None, None]
+            deviations = (
+                data[:, : cycles * m].reshape(count, cycles, m)
+                - cycle_means[:, :, None]
+                - ramp
+            )
+            seasonal = deviations.mean(axis=1)
+            level = cycle_means[:, 0] + trend * (m - 1) / 2
+            start = m
+        else:
+            level = data[:, 0].astype(float)
+            trend = (data[:, 1] - data[:, 0]).astype(float)
+            seasonal = np.zeros((count, m))
+            start = 1
+
+        pct_errors = []
+        for t in range(start, n):
+            y = data[:, t]
+            position = t % m
+            predicted = level + trend + seasonal[:, position]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct_errors.append(
+                    np.where(y != 0, np.abs(predicted - y) / np.abs(y), 0.0)
+                )
+
+            previous_level = level
+            level = self._alpha * (y - seasonal[:, position]) + (1 - self._alpha) * (
+                level + trend
+            )
+            trend = self._beta * (level - previous_level) + (1 - self._beta) * trend
+            if seasonal_fit:
+                seasonal[:, position] = (
+                    self._gamma * (y - level)
+                    + (1 - self._gamma) * seasonal[:, position]
+                )
+
+        in_sample_error = (
+            np.stack(pct_errors, axis=1).mean(axis=1) if pct_errors else np.zeros(count)
+        )
+        return {
+            "level": level,
+            "trend": trend,
+            "seasonal": seasonal,
+            "in_sample_error": in_sample_error,
+        }
+
+    def _replace_outliers(self, data: Any) -> Any:
+        """按IQR检测异常值并用中位数替换, 少于4个数据点时不处理"""
+        np = self._numpy()
+        n = data.shape[1]
+        if n < 4:
+            return data.astype(float)
+
+        ordered = np.sort(data, axis=1)
+        q1 = ordered[:, n // 4]
+        q3 = ordered[:, 3 * n // 4]
+        iqr = q3 - q1
+        lower = (q1 - 1.5 * iqr)[:, None]
+        upper = (q3 + 1.5 * iqr)[:, None]
+        median = ordered[:, n // 2][:, None]
+        return np.where((data < lower) | (data > upper), median, data).astype(float)
+
+    def _seasonal_factors(self, data: Any) -> Any:
+        """
+        计算季节因子(各周期位置的平均值 / 总平均值)
+
+        不足一个完整周期或平均值不为正时因子为1.
+        """
+        np = self._numpy()
+        count, n = data.shape
+        m = self._season_length
+        factors = np.ones((count, m))
+        if n < m:
+            return factors
+
+        # 季节位置与预测时一致: 第t个数据点位于t % m
+        positions = np.arange(n) % m
+        sums = np.zeros((count, m))
+        np.add.at(sums.T, positions, data.T)
+        counts = np.bincount(positions, minlength=m)
+        overall = data.mean(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ratio = sums / counts / overall[:, None]
+        return np.where(overall[:, None] > 0, ratio, factors)
+
+    def _season_positions(self, points: int, horizon: int) -> Any:
+        """预测步对应的季节位置"""
+        np = self._numpy()
+        return (points + np.arange(horizon)) % self._season_length
+
+    def _as_matrix(self, values: Any) -> Any:
+        """转换为(序列数, 时间点数)的浮点数组"""
+        np = self._numpy()
+        data = np.asarray(values, dtype=float)
+        if data.ndim == 1:
+            data = data[None, :]
+        if data.ndim != 2:
+            raise ValueError("序列数据必须是一维或二维数组")
+        return data
+
+    @staticmethod
+    def _numpy():
+        """导入NumPy"""
+        import numpy
+
+        return numpy
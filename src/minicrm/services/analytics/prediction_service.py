@@ -7,6 +7,9 @@ MiniCRM 预测分析服务
 - 历史数据处理
 - 预测结果评估
 
+安装NumPy(analytics可选依赖)时, 高级预测、批量预测和回测由向量化的
+ForecastingEngine完成; 未安装时使用纯Python实现.
+
 严格遵循业务逻辑层职责:
 - 只处理预测分析相关的业务逻辑
 - 通过DAO接口访问数据
@@ -20,9 +23,27 @@ from typing import Any
 from minicrm.core.exceptions import ServiceError, ValidationError
 from minicrm.core.interfaces.dao_interfaces import ICustomerDAO, ISupplierDAO
 from minicrm.models.analytics_models import PredictionResult
+from minicrm.services.analytics.forecasting_engine import (
+    FORECAST_METHODS,
+    ForecastingEngine,
+    ForecastResult,
+    numpy_available,
+)
 from transfunctions.calculations import calculate_average
 
 
+# 支持预测的业务指标
+PREDICTION_METRICS = ("customer_growth", "revenue", "supplier_performance")
+
+# 各预测方法在结果中报告的置信度
+METHOD_CONFIDENCE = {
+    "linear_regression": 0.85,
+    "exponential_smoothing": 0.80,
+    "trend_analysis": 0.75,
+    "holt_winters": 0.80,
+}
+
+
 class PredictionService:
     """
     预测分析服务
@@ -34,18 +55,28 @@ class PredictionService:
     - 置信度计算
     """
 
-    def __init__(self, customer_dao: ICustomerDAO, supplier_dao: ISupplierDAO):
+    def __init__(
+        self,
+        customer_dao: ICustomerDAO,
+        supplier_dao: ISupplierDAO,
+        forecasting_engine: ForecastingEngine | None = None,
+    ):
         """
         初始化预测服务
 
         Args:
             customer_dao: 客户数据访问对象
             supplier_dao: 供应商数据访问对象
+            forecasting_engine: 预测引擎, 为None时在NumPy可用时自动创建
         """
         self._customer_dao = customer_dao
         self._supplier_dao = supplier_dao
         self._logger = logging.getLogger(__name__)
 
+        if forecasting_engine is None and numpy_available():
+            forecasting_engine = ForecastingEngine()
+        self._engine = forecasting_engine
+
         self._logger.debug("预测分析服务初始化完成")
 
     def get_prediction(
@@ -108,7 +139,8 @@ class PredictionService:
             metric: 预测指标
             prediction_months: 预测月数
             method: 预测方法
-                ("linear_regression", "exponential_smoothing", "trend_analysis")
+                ("linear_regression", "exponential_smoothing", "trend_analysis",
+                "holt_winters", 其中holt_winters需要NumPy)
 
         Returns:
             PredictionResult: 预测结果
@@ -121,23 +153,24 @@ class PredictionService:
             if len(historical_data) < 6:
                 raise ValidationError("历史数据不足,建议至少6个数据点")
 
-            if method == "linear_regression":
-                predicted_values = self._linear_regression_prediction(
-                    historical_data, prediction_months
-                )
-                confidence_level = 0.85
-            elif method == "exponential_smoothing":
-                predicted_values = self._exponential_smoothing_prediction(
-                    historical_data, prediction_months
+            if method not in FORECAST_METHODS:
+                raise ValidationError(f"不支持的预测方法: {method}")
+
+            if self._engine is not None:
+                forecast = self._engine.forecast(
+                    [point["value"] for point in historical_data],
+                    prediction_months,
+                    method,
+                    cache_key=metric,
                 )
-                confidence_level = 0.80
-            elif method == "trend_analysis":
-                predicted_values = self._trend_analysis_prediction(
-                    historical_data, prediction_months
+                predicted_values = self._format_forecast(
+                    historical_data[-1]["date"], forecast, 0
                 )
-                confidence_level = 0.75
             else:
-                raise ValidationError(f"不支持的预测方法: {method}")
+                predicted_values = self._python_prediction(
+                    historical_data, prediction_months, method
+                )
+            confidence_level = METHOD_CONFIDENCE[method]
 
             result = PredictionResult(
                 metric_name=metric,
@@ -153,6 +186,164 @@ class PredictionService:
             self._logger.error(f"高级预测分析失败: {e}")
             raise ServiceError(f"高级预测分析失败: {e}", "PredictionService") from e
 
+    def predict_all_metrics(
+        self, prediction_months: int = 6, method: str = "linear_regression"
+    ) -> dict[str, PredictionResult]:
+        """
+        一次预测所有业务指标
+
+        有预测引擎时, 等长的指标序列合并为一个数组批量拟合.
+
+        Args:
+            prediction_months: 预测月数
+            method: 预测方法
+
+        Returns:
+            Dict[str, PredictionResult]: 指标名到预测结果的映射
+        """
+        if self._engine is None:
+            return {
+                metric: self.get_advanced_prediction(metric, prediction_months, method)
+                for metric in PREDICTION_METRICS
+            }
+
+        try:
+            if method not in FORECAST_METHODS:
+                raise ValidationError(f"不支持的预测方法: {method}")
+
+            # 按序列长度分组, 每组一次拟合
+            groups: dict[int, list[tuple[str, list[dict[str, Any]]]]] = {}
+            for metric in PREDICTION_METRICS:
+                historical_data = self._get_historical_data_for_prediction(metric)
+                if len(historical_data) >= 6:
+                    groups.setdefault(len(historical_data), []).append(
+                        (metric, historical_data)
+                    )
+
+            results = {}
+            for length, members in groups.items():
+                forecast = self._engine.forecast(
+                    [[point["value"] for point in data] for _, data in members],
+                    prediction_months,
+                    method,
+                    cache_key=f"metrics:{length}",
+                )
+                for row, (metric, data) in enumerate(members):
+                    results[metric] = PredictionResult(
+                        metric_name=metric,
+                        prediction_period=f"{prediction_months}个月",
+                        predicted_values=self._format_forecast(
+                            data[-1]["date"], forecast, row
+                        ),
+                        confidence_level=METHOD_CONFIDENCE[method],
+                        method_used=method,
+                    )
+
+            return results
+
+        except Exception as e:
+            self._logger.error(f"批量预测分析失败: {e}")
+            raise ServiceError(f"批量预测分析失败: {e}", "PredictionService") from e
+
+    def forecast_series_batch(
+        self,
+        series: dict[Any, list[float]],
+        prediction_months: int = 6,
+        method: str = "linear_regression",
+        cache_key: str | None = None,
+    ) -> dict[Any, list[float]]:
+        """
+        批量预测多条等长序列, 例如逐客户的月度收入
+
+        Args:
+            series: 序列键(如客户ID)到按月排列的历史值的映射
+            prediction_months: 预测月数
+            method: 预测方法
+            cache_key: 模型缓存键, 提供时最新数据点未变化则复用已拟合的模型
+
+        Returns:
+            Dict[Any, List[float]]: 序列键到预测值的映射
+        """
+        if self._engine is None:
+            raise ServiceError("批量预测需要安装NumPy", "PredictionService")
+
+        try:
+            if not series:
+                return {}
+            if method not in FORECAST_METHODS:
+                raise ValidationError(f"不支持的预测方法: {method}")
+
+            keys = list(series)
+            forecast = self._engine.forecast(
+                [series[key] for key in keys], prediction_months, method, cache_key
+            )
+            values = forecast.values.round(2).tolist()
+            return dict(zip(keys, values))
+
+        except Exception as e:
+            self._logger.error(f"批量序列预测失败: {e}")
+            raise ServiceError(f"批量序列预测失败: {e}", "PredictionService") from e
+
+    def _format_forecast(
+        self, last_date_str: str, forecast: ForecastResult, row: int
+    ) -> list[dict[str, Any]]:
+        """
+        将预测引擎的一行结果转换为预测数据点
+
+        Args:
+            last_date_str: 最后一个历史数据点的月份
+            forecast: 预测结果
+            row: 序列所在行
+
+        Returns:
+            List[Dict[str, Any]]: 预测结果
+        """
+        last_date = datetime.strptime(last_date_str, "%Y-%m")
+        predictions = []
+        for i, value in enumerate(forecast.values[row].tolist(), start=1):
+            pred_date = last_date + timedelta(days=i * 30)
+            point = {
+                "date": pred_date.strftime("%Y-%m"),
+                "value": round(value, 2),
+                "confidence": round(float(forecast.confidence[row, i - 1]), 4),
+            }
+            if forecast.seasonal_factors is not None:
+                point["seasonal_factor"] = float(forecast.seasonal_factors[row, i - 1])
+                point["base_prediction"] = round(
+                    float(forecast.base_values[row, i - 1]), 2
+                )
+            predictions.append(point)
+        return predictions
+
+    def _python_prediction(
+        self,
+        historical_data: list[dict[str, Any]],
+        prediction_months: int,
+        method: str,
+    ) -> list[dict[str, Any]]:
+        """
+        使用纯Python实现预测单条序列
+
+        Args:
+            historical_data: 历史数据
+            prediction_months: 预测月数
+            method: 预测方法
+
+        Returns:
+            List[Dict[str, Any]]: 预测结果
+        """
+        if method == "linear_regression":
+            return self._linear_regression_prediction(
+                historical_data, prediction_months
+            )
+        if method == "exponential_smoothing":
+            return self._exponential_smoothing_prediction(
+                historical_data, prediction_months
+            )
+        if method == "trend_analysis":
+            return self._trend_analysis_prediction(historical_data, prediction_months)
+        raise ValidationError(f"预测方法{method}需要安装NumPy")
+
     def _get_historical_data_for_prediction(self, metric: str) -> list[dict[str, Any]]:
         """
         获取用于预测的历史数据
@@ -613,29 +804,92 @@ class PredictionService:
         """
         获取预测准确性分析
 
+        对历史数据和实际数据组成的序列做滚动起点回测: 依次以前t个月的数据
+        预测第t+1个月, 与实际值比较, 统计各预测方法的平均绝对百分比误差.
+
         Args:
             metric: 指标名称
-            actual_data: 实际数据
+            actual_data: 实际数据, 与历史数据月份相同时以实际数据为准
 
         Returns:
             Dict[str, Any]: 预测准确性分析结果
         """
         try:
-            # 简化实现,实际应该比较历史预测与实际结果
-            accuracy_analysis = {
-                "metric": metric,
-                "prediction_accuracy": 0.82,  # 模拟准确率
-                "average_error_rate": 0.18,
-                "best_prediction_method": "linear_regression",
-                "recommendations": [
-                    "增加历史数据样本量以提高预测准确性",
-                    "考虑季节性因素对预测的影响",
-                    "定期更新预测模型参数",
-                ],
+            points = {
+                point["date"]: point
+                for point in self._get_historical_data_for_prediction(metric)
             }
+            points.update((point["date"], point) for point in actual_data)
+            data = [points[key] for key in sorted(points)]
+
+            if len(data) < 4:
+                raise ValidationError("数据不足,无法进行回测")
+
+            method_errors = {}
+            folds = 0
+            for method in self._backtest_methods():
+                error, folds = self._backtest(data, method)
+                if error is not None:
+                    method_errors[method] = round(error, 4)
 
-            return accuracy_analysis
+            if not method_errors:
+                raise ValidationError("实际值均为0,无法计算误差率")
+
+            best_method = min(method_errors, key=method_errors.get)
+            best_error = method_errors[best_method]
+
+            recommendations = []
+            if len(data) < 24:
+                recommendations.append("增加历史数据样本量以提高预测准确性")
+            if best_method != "holt_winters":
+                recommendations.append("考虑季节性因素对预测的影响")
+            recommendations.append("定期更新预测模型参数")
+
+            return {
+                "metric": metric,
+                "prediction_accuracy": round(max(0.0, 1 - best_error), 4),
+                "average_error_rate": best_error,
+                "best_prediction_method": best_method,
+                "method_errors": method_errors,
+                "backtest_folds": folds,
+                "recommendations": recommendations,
+            }
 
         except Exception as e:
             self._logger.error(f"预测准确性分析失败: {e}")
             raise ServiceError(f"预测准确性分析失败: {e}", "PredictionService") from e
+
+    def _backtest_methods(self) -> tuple[str, ...]:
+        """可以回测的预测方法"""
+        if self._engine is not None:
+            return FORECAST_METHODS
+        return tuple(m for m in FORECAST_METHODS if m != "holt_winters")
+
+    def _backtest(
+        self, data: list[dict[str, Any]], method: str
+    ) -> tuple[float | None, int]:
+        """
+        滚动起点回测单个预测方法
+
+        Args:
+            data: 按月排列的数据
+            method: 预测方法
+
+        Returns:
+            Tuple[Optional[float], int]: (平均绝对百分比误差, 回测次数)
+        """
+        if self._engine is not None:
+            result = self._engine.backtest([point["value"] for point in data], method)
+            error = float(result["mape"][0])
+            return (None if error != error else error), result["folds"]
+
+        errors = []
+        min_train = max(3, len(data) // 2)
+        for origin in range(min_train, len(data)):
+            predicted = self._python_prediction(data[:origin], 1, method)
+            actual = data[origin]["value"]
+            if predicted and actual != 0:
+                errors.append(abs(predicted[0]["value"] - actual) / abs(actual))
+
+        folds = len(data) - min_train
+        return (sum(errors) / len(errors) if errors else None), folds
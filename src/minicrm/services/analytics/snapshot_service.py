@@ -0,0 +1,242 @@
+"""
+MiniCRM 分析快照服务
+
+负责分析结果快照的读取和刷新:
+- 快照的数据版本与当前一致时直接返回, 不再计算
+- 数据已变化时先返回旧快照, 同时在后台线程重新计算并覆盖
+- 没有快照时同步计算并保存
+- 依赖当前日期的结果把日期(或月份)计入数据版本, 日期变化后同样刷新
+
+应用启动后首次打开仪表盘等页面即可立即得到上次的结果,
+只有底层数据变化后才需要付出完整的计算开销, 而且不阻塞界面.
+"""
+
+from collections.abc import Callable, Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+import logging
+import threading
+import time
+from typing import Any
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.dao.analytics_snapshot_dao import AnalyticsSnapshotDAO
+
+
+# 快照格式版本, 分析结果的结构变化时递增, 使旧快照全部失效
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class AnalyticsSnapshotService:
+    """
+    分析快照服务
+
+    以"先返回已有结果, 后台刷新"的方式提供持久化的分析结果.
+    """
+
+    def __init__(self, snapshot_dao: AnalyticsSnapshotDAO):
+        """
+        初始化分析快照服务
+
+        Args:
+            snapshot_dao: 分析结果快照DAO
+        """
+        self._snapshot_dao = snapshot_dao
+        self._logger = logging.getLogger(__name__)
+
+        self._executor: ThreadPoolExecutor | None = None
+        self._refreshing: dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._listeners: list[Callable[[str, Any], None]] = []
+
+    def get(
+        self,
+        name: str,
+        tables: Iterable[str],
+        compute: Callable[[], Any],
+        as_of: str = "",
+    ) -> tuple[Any, bool]:
+        """
+        获取分析结果
+
+        Args:
+            name: 快照名称
+            tables: 结果依赖的表
+            compute: 计算分析结果的函数
+            as_of: 结果依赖的日期或月份, 不依赖当前日期时为空
+
+        Returns:
+            tuple[Any, bool]: (分析结果, 是否与当前数据一致)
+        """
+        tables = tuple(tables)
+        try:
+            data_version = self._get_data_version(tables, as_of)
+            snapshot = self._snapshot_dao.get_snapshot(name)
+        except DatabaseError as e:
+            self._logger.warning(f"分析快照不可用, 直接计算: {name}, {e}")
+            return compute(), True
+
+        if snapshot is None:
+            return self._compute_and_save(name, data_version, compute), True
+
+        if snapshot.data_version == data_version:
+            self._logger.debug(f"使用分析快照: {name} ({snapshot.computed_at})")
+            return snapshot.payload, True
+
+        self._logger.info(f"数据已变化, 返回旧快照并在后台刷新: {name}")
+        self.refresh_in_background(name, tables, compute, as_of)
+        return snapshot.payload, False
+
+    def refresh(
+        self,
+        name: str,
+        tables: Iterable[str],
+        compute: Callable[[], Any],
+        as_of: str = "",
+    ) -> Any:
+        """
+        立即重新计算并保存快照
+
+        Args:
+            name: 快照名称
+            tables: 结果依赖的表
+            compute: 计算分析结果的函数
+            as_of: 结果依赖的日期或月份, 不依赖当前日期时为空
+
+        Returns:
+            Any: 新的分析结果
+        """
+        return self._compute_and_save(
+            name, self._get_data_version(tuple(tables), as_of), compute
+        )
+
+    def refresh_in_background(
+        self,
+        name: str,
+        tables: Iterable[str],
+        compute: Callable[[], Any],
+        as_of: str = "",
+    ) -> Future:
+        """
+        在后台线程重新计算快照, 同名快照正在刷新时复用同一个任务
+
+        Args:
+            name: 快照名称
+            tables: 结果依赖的表
+            compute: 计算分析结果的函数
+            as_of: 结果依赖的日期或月份, 不依赖当前日期时为空
+
+        Returns:
+            Future: 刷新任务, 结果为新的分析结果
+        """
+        tables = tuple(tables)
+        with self._lock:
+            future = self._refreshing.get(name)
+            if future is not None:
+                return future
+
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="AnalyticsSnapshot"
+                )
+            future = self._executor.submit(
+                self._background_refresh, name, tables, compute, as_of
+            )
+            self._refreshing[name] = future
+            return future
+
+    def wait_for_refreshes(self, timeout: float | None = None) -> None:
+        """
+        等待正在进行的后台刷新完成
+
+        Args:
+            timeout: 最长等待时间(秒)
+        """
+        with self._lock:
+            futures = list(self._refreshing.values())
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in futures:
+            remaining = (
+                None if deadline is None else max(deadline - time.monotonic(), 0)
+            )
+            try:
+                future.result(remaining)
+            except Exception as e:
+                self._logger.debug(f"后台刷新未完成: {e}")
+
+    def add_refresh_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """
+        注册后台刷新完成的监听器
+
+        Args:
+            listener: 回调函数, 参数为快照名称和新的分析结果
+        """
+        self._listeners.append(listener)
+
+    def invalidate(self, name: str | None = None) -> int:
+        """
+        删除快照, 下次读取时重新计算
+
+        Args:
+            name: 快照名称, 为None时删除全部
+
+        Returns:
+            int: 删除的快照数量
+        """
+        return self._snapshot_dao.delete_snapshots(name)
+
+    def shutdown(self) -> None:
+        """停止后台刷新线程"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _get_data_version(self, tables: tuple[str, ...], as_of: str = "") -> str:
+        """获取带格式版本前缀的数据版本, 依赖日期的结果附加日期"""
+        data_version = self._snapshot_dao.get_data_version(tables)
+        if as_of:
+            return f"{SNAPSHOT_FORMAT_VERSION}:{as_of}:{data_version}"
+        return f"{SNAPSHOT_FORMAT_VERSION}:{data_version}"
+
+    def _compute_and_save(
+        self, name: str, data_version: str, compute: Callable[[], Any]
+    ) -> Any:
+        """计算分析结果并保存快照
+
+        数据版本在计算前读取, 计算期间发生的写入会使快照在下次读取时再次刷新.
+        """
+        start = time.perf_counter()
+        payload = compute()
+        elapsed = time.perf_counter() - start
+
+        try:
+            self._snapshot_dao.save_snapshot(name, data_version, payload, elapsed)
+        except DatabaseError as e:
+            self._logger.warning(f"保存分析快照失败: {name}, {e}")
+
+        self._logger.info(f"分析快照已更新: {name}, 计算耗时{elapsed:.3f}秒")
+        return payload
+
+    def _background_refresh(
+        self,
+        name: str,
+        tables: tuple[str, ...],
+        compute: Callable[[], Any],
+        as_of: str,
+    ) -> Any:
+        """后台刷新任务"""
+        try:
+            payload = self.refresh(name, tables, compute, as_of)
+        except Exception as e:
+            self._logger.error(f"后台刷新分析快照失败: {name}, {e}")
+            raise
+        finally:
+            with self._lock:
+                self._refreshing.pop(name, None)
+
+        for listener in self._listeners:
+            try:
+                listener(name, payload)
+            except Exception as e:
+                self._logger.error(f"分析快照监听器执行失败: {e}")
+        return payload
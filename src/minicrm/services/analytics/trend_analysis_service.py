@@ -18,8 +18,12 @@ from typing import Any
 
 from minicrm.core.exceptions import ServiceError, ValidationError
 from minicrm.core.interfaces.dao_interfaces import ICustomerDAO, ISupplierDAO
+from minicrm.data.dao.metric_rollup_dao import MetricRollupDAO
 from minicrm.models.analytics_models import TrendAnalysis
-from transfunctions.calculations import calculate_growth_rate
+from transfunctions.calculations import (
+    calculate_growth_rate,
+    calculate_period_buckets,
+)
 
 
 class TrendAnalysisService:
@@ -33,16 +37,32 @@ class TrendAnalysisService:
     - 历史数据处理
     """
 
-    def __init__(self, customer_dao: ICustomerDAO, supplier_dao: ISupplierDAO):
+    # 各时间周期展示的时间段数量
+    PERIOD_BUCKET_COUNTS = {
+        "daily": 30,
+        "weekly": 12,
+        "monthly": 6,
+        "quarterly": 4,
+        "yearly": 3,
+    }
+
+    def __init__(
+        self,
+        customer_dao: ICustomerDAO,
+        supplier_dao: ISupplierDAO,
+        rollup_dao: MetricRollupDAO | None = None,
+    ):
         """
         初始化趋势分析服务
 
         Args:
             customer_dao: 客户数据访问对象
             supplier_dao: 供应商数据访问对象
+            rollup_dao: 业务指标汇总DAO, 未提供时客户增长和收入数据点均为0
         """
         self._customer_dao = customer_dao
         self._supplier_dao = supplier_dao
+        self._rollup_dao = rollup_dao
         self._logger = logging.getLogger(__name__)
 
         self._logger.debug("趋势分析服务初始化完成")
@@ -52,8 +72,9 @@ class TrendAnalysisService:
         获取业务趋势分析
 
         Args:
-            metric: 指标名称 ("customer_growth", "revenue", "supplier_performance")
-            period: 时间周期 ("monthly", "quarterly", "yearly")
+            metric: 指标名称 ("customer_growth", "revenue", "quotes",
+                "supplier_performance")
+            period: 时间周期 ("daily", "weekly", "monthly", "quarterly", "yearly")
 
         Returns:
             TrendAnalysis: 趋势分析结果
@@ -68,6 +89,8 @@ class TrendAnalysisService:
                 data_points = self._get_customer_growth_data_points(period)
             elif metric == "revenue":
                 data_points = self._get_revenue_data_points(period)
+            elif metric == "quotes":
+                data_points = self._get_quote_data_points(period)
             elif metric == "supplier_performance":
                 data_points = self._get_supplier_performance_data_points(period)
             else:
@@ -95,6 +118,8 @@ class TrendAnalysisService:
         """
         获取客户增长数据点
 
+        每个数据点的值为该时间段结束时的客户总数.
+
         Args:
             period: 时间周期
 
@@ -102,30 +127,25 @@ class TrendAnalysisService:
             List[Dict[str, Any]]: 客户增长数据点
         """
         try:
-            # 使用字典替代连续if语句,提高代码可维护性
-            data_mapping = {
-                "monthly": [
-                    {"date": "2024-07", "value": 120, "label": "7月"},
-                    {"date": "2024-08", "value": 132, "label": "8月"},
-                    {"date": "2024-09", "value": 145, "label": "9月"},
-                    {"date": "2024-10", "value": 151, "label": "10月"},
-                    {"date": "2024-11", "value": 156, "label": "11月"},
-                    {"date": "2024-12", "value": 162, "label": "12月"},
-                ],
-                "quarterly": [
-                    {"date": "2024-Q1", "value": 350, "label": "第一季度"},
-                    {"date": "2024-Q2", "value": 397, "label": "第二季度"},
-                    {"date": "2024-Q3", "value": 428, "label": "第三季度"},
-                    {"date": "2024-Q4", "value": 469, "label": "第四季度"},
-                ],
-                "yearly": [
-                    {"date": "2022", "value": 1200, "label": "2022年"},
-                    {"date": "2023", "value": 1380, "label": "2023年"},
-                    {"date": "2024", "value": 1644, "label": "2024年"},
-                ],
-            }
+            buckets = calculate_period_buckets(
+                period, self.PERIOD_BUCKET_COUNTS.get(period, 0)
+            )
+            series, total = {}, 0
+            if self._rollup_dao is not None and buckets:
+                series = self._rollup_dao.get_series(
+                    "new_customers", period, buckets[0]["start"], buckets[-1]["end"]
+                )
+                total = self._rollup_dao.get_count_before(
+                    "new_customers", buckets[0]["start"]
+                )
 
-            return data_mapping.get(period, [])
+            data_points = []
+            for bucket in buckets:
+                total += series.get(bucket["key"], {}).get("count", 0)
+                data_points.append(
+                    {"date": bucket["key"], "value": total, "label": bucket["label"]}
+                )
+            return data_points
 
         except Exception as e:
             self._logger.error(f"获取客户增长数据失败: {e}")
@@ -141,34 +161,52 @@ class TrendAnalysisService:
         Returns:
             List[Dict[str, Any]]: 收入数据点
         """
+        return self._get_amount_data_points("revenue", period)
+
+    def _get_quote_data_points(self, period: str) -> list[dict[str, Any]]:
+        """
+        获取报价金额数据点
+
+        Args:
+            period: 时间周期
+
+        Returns:
+            List[Dict[str, Any]]: 报价金额数据点
+        """
+        return self._get_amount_data_points("quotes", period)
+
+    def _get_amount_data_points(self, metric: str, period: str) -> list[dict[str, Any]]:
+        """
+        获取按时间段汇总金额的数据点, 没有数据的时间段补0
+
+        Args:
+            metric: 汇总指标名
+            period: 时间周期
+
+        Returns:
+            List[Dict[str, Any]]: 金额数据点
+        """
         try:
-            # 使用字典替代连续if语句,提高代码可维护性
-            data_mapping = {
-                "monthly": [
-                    {"date": "2024-07", "value": 850000, "label": "7月"},
-                    {"date": "2024-08", "value": 920000, "label": "8月"},
-                    {"date": "2024-09", "value": 880000, "label": "9月"},
-                    {"date": "2024-10", "value": 950000, "label": "10月"},
-                    {"date": "2024-11", "value": 1020000, "label": "11月"},
-                    {"date": "2024-12", "value": 1100000, "label": "12月"},
-                ],
-                "quarterly": [
-                    {"date": "2024-Q1", "value": 2400000, "label": "第一季度"},
-                    {"date": "2024-Q2", "value": 2650000, "label": "第二季度"},
-                    {"date": "2024-Q3", "value": 2750000, "label": "第三季度"},
-                    {"date": "2024-Q4", "value": 3070000, "label": "第四季度"},
-                ],
-                "yearly": [
-                    {"date": "2022", "value": 8500000, "label": "2022年"},
-                    {"date": "2023", "value": 9800000, "label": "2023年"},
-                    {"date": "2024", "value": 10870000, "label": "2024年"},
-                ],
-            }
+            buckets = calculate_period_buckets(
+                period, self.PERIOD_BUCKET_COUNTS.get(period, 0)
+            )
+            series = {}
+            if self._rollup_dao is not None and buckets:
+                series = self._rollup_dao.get_series(
+                    metric, period, buckets[0]["start"], buckets[-1]["end"]
+                )
 
-            return data_mapping.get(period, [])
+            return [
+                {
+                    "date": bucket["key"],
+                    "value": series.get(bucket["key"], {}).get("amount", 0),
+                    "label": bucket["label"],
+                }
+                for bucket in buckets
+            ]
 
         except Exception as e:
-            self._logger.error(f"获取收入数据失败: {e}")
+            self._logger.error(f"获取{metric}数据失败: {e}")
             return []
 
     def _get_supplier_performance_data_points(
@@ -15,12 +15,17 @@ MiniCRM 数据分析服务主协调器
 """
 
 import logging
-from datetime import datetime
+from collections.abc import Callable
+from datetime import date, datetime
 from typing import Any
 
 from minicrm.core.exceptions import ServiceError
 from minicrm.core.interfaces.dao_interfaces import ICustomerDAO, ISupplierDAO
 from minicrm.core.interfaces.service_interfaces import IAnalyticsService
+from minicrm.data.dao.analytics_snapshot_dao import AnalyticsSnapshotDAO
+from minicrm.data.dao.customer_score_dao import CustomerScoreDAO
+from minicrm.data.dao.financial_risk_dao import FinancialRiskDAO
+from minicrm.data.dao.metric_rollup_dao import MetricRollupDAO
 from minicrm.models.analytics_models import (
     CustomerAnalysis,
     MetricCard,
@@ -35,12 +40,20 @@ from minicrm.services.analytics.customer_analytics_service import (
 from minicrm.services.analytics.dashboard_service import DashboardService
 from minicrm.services.analytics.financial_risk_service import FinancialRiskService
 from minicrm.services.analytics.prediction_service import PredictionService
+from minicrm.services.analytics.snapshot_service import AnalyticsSnapshotService
 from minicrm.services.analytics.supplier_analytics_service import (
     SupplierAnalyticsService,
 )
 from minicrm.services.analytics.trend_analysis_service import TrendAnalysisService
 
 
+# 仪表盘数据依赖的表
+DASHBOARD_TABLES = ("customers", "suppliers")
+
+# 财务风险分析依赖的表
+RISK_ANALYSIS_TABLES = ("customers", "suppliers", "financial_records")
+
+
 class AnalyticsService(IAnalyticsService):
     """
     数据分析服务主协调器
@@ -54,13 +67,25 @@ class AnalyticsService(IAnalyticsService):
     - 缓存管理:性能优化和数据缓存
     """
 
-    def __init__(self, customer_dao: ICustomerDAO, supplier_dao: ISupplierDAO):
+    def __init__(
+        self,
+        customer_dao: ICustomerDAO,
+        supplier_dao: ISupplierDAO,
+        customer_score_dao: CustomerScoreDAO | None = None,
+        metric_rollup_dao: MetricRollupDAO | None = None,
+        snapshot_dao: AnalyticsSnapshotDAO | None = None,
+        financial_risk_dao: FinancialRiskDAO | None = None,
+    ):
         """
         初始化分析服务协调器
 
         Args:
             customer_dao: 客户数据访问对象
             supplier_dao: 供应商数据访问对象
+            customer_score_dao: 客户价值评分DAO(可选, 提供时使用预计算评分)
+            metric_rollup_dao: 业务指标汇总DAO(可选, 提供时趋势使用真实历史数据)
+            snapshot_dao: 分析快照DAO(可选, 提供时仪表盘和风险分析跨重启复用)
+            financial_risk_dao: 财务风险DAO(可选, 提供时风险指标由数据库聚合)
         """
         self._customer_dao = customer_dao
         self._supplier_dao = supplier_dao
@@ -69,13 +94,24 @@ class AnalyticsService(IAnalyticsService):
         # 初始化缓存管理器
         self._cache_manager = CacheManager(cache_ttl=300)  # 5分钟缓存
 
+        # 持久化的分析快照
+        self._snapshot_service = (
+            AnalyticsSnapshotService(snapshot_dao) if snapshot_dao else None
+        )
+
         # 初始化各个分析服务
         self._dashboard_service = DashboardService(customer_dao, supplier_dao)
-        self._customer_analytics_service = CustomerAnalyticsService(customer_dao)
+        self._customer_analytics_service = CustomerAnalyticsService(
+            customer_dao, customer_score_dao, metric_rollup_dao
+        )
         self._supplier_analytics_service = SupplierAnalyticsService(supplier_dao)
-        self._trend_analysis_service = TrendAnalysisService(customer_dao, supplier_dao)
+        self._trend_analysis_service = TrendAnalysisService(
+            customer_dao, supplier_dao, metric_rollup_dao
+        )
         self._prediction_service = PredictionService(customer_dao, supplier_dao)
-        self._financial_risk_service = FinancialRiskService(customer_dao, supplier_dao)
+        self._financial_risk_service = FinancialRiskService(
+            customer_dao, supplier_dao, financial_risk_dao
+        )
 
         self._logger.debug("数据分析服务协调器初始化完成")
 
@@ -101,11 +137,20 @@ class AnalyticsService(IAnalyticsService):
 
             self._logger.info("开始获取仪表盘数据")
 
-            # 委托给仪表盘服务
-            dashboard_data = self._dashboard_service.get_dashboard_data()
+            # 委托给仪表盘服务, 有快照时优先使用快照
+            dashboard_data, is_current = self._get_with_snapshot(
+                "dashboard",
+                DASHBOARD_TABLES,
+                self._dashboard_service.get_dashboard_data,
+                as_of=date.today().strftime("%Y-%m"),  # 含本月新增等按月指标
+            )
 
-            # 缓存结果
-            self._cache_manager.set(cache_key, dashboard_data)
+            # 缓存结果, 客户或供应商数据被写入时自动失效;
+            # 过期的快照正在后台刷新, 不放入内存缓存
+            if is_current:
+                self._cache_manager.set(
+                    cache_key, dashboard_data, tables=DASHBOARD_TABLES
+                )
 
             self._logger.info("仪表盘数据获取完成")
             return dashboard_data
@@ -348,7 +393,13 @@ class AnalyticsService(IAnalyticsService):
             Dict[str, Any]: 财务风险分析结果
         """
         try:
-            return self._financial_risk_service.get_comprehensive_risk_analysis()
+            risk_analysis, _ = self._get_with_snapshot(
+                "financial_risk",
+                RISK_ANALYSIS_TABLES,
+                self._financial_risk_service.get_comprehensive_risk_analysis,
+                as_of=date.today().isoformat(),  # 账龄和逾期按当天计算
+            )
+            return risk_analysis
         except Exception as e:
             self._logger.error(f"获取财务风险分析失败: {e}")
             raise ServiceError(f"获取财务风险分析失败: {e}", "AnalyticsService") from e
@@ -386,9 +437,36 @@ class AnalyticsService(IAnalyticsService):
             self._logger.error(f"获取风险阈值失败: {e}")
             return {}
 
+    def add_snapshot_listener(self, listener: Callable[[str, Any], None]) -> None:
+        """
+        注册分析快照后台刷新完成的监听器
+
+        界面可据此在数据变化后用新结果替换先显示的旧快照.
+
+        Args:
+            listener: 回调函数, 参数为快照名称("dashboard"、"financial_risk")
+                和新的分析结果, 在后台线程中调用
+        """
+        if self._snapshot_service:
+            self._snapshot_service.add_refresh_listener(listener)
+
+    def _get_with_snapshot(
+        self,
+        name: str,
+        tables: tuple[str, ...],
+        compute: Callable[[], Any],
+        as_of: str = "",
+    ) -> tuple[Any, bool]:
+        """通过分析快照获取结果, 未配置快照时直接计算"""
+        if self._snapshot_service is None:
+            return compute(), True
+        return self._snapshot_service.get(name, tables, compute, as_of)
+
     def cleanup(self) -> None:
         """清理服务资源"""
         self._cache_manager.clear()
+        if self._snapshot_service:
+            self._snapshot_service.shutdown()
         self._logger.debug("数据分析服务资源清理完成")
 
     # 兼容性方法 - 保持向后兼容
@@ -0,0 +1,416 @@
+"""
+MiniCRM 批量导入管道
+
+为导入服务提供流式、分批、可续传的导入执行:
+- CSV/Excel按批读取, 不把整个文件读入内存
+- 数据校验在线程池中进行, 与上一批的数据库写入重叠执行
+- 每批在一个事务中写入, 批量失败时逐行重试以定位错误行
+- 基于内存键索引的重复检测
+- 每批写入后保存检查点并回调进度
+
+设计原则:
+- 管道本身不依赖具体数据类型, 校验和写入由调用方提供
+- 行号始终对应源文件中的数据行(不含标题行)
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+import csv
+from dataclasses import asdict, dataclass, field
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+from minicrm.core.exceptions import ServiceError
+
+
+# 默认每批行数
+DEFAULT_BATCH_SIZE = 1000
+
+# 检查点中保留的错误信息条数上限
+_MAX_CHECKPOINT_ERRORS = 1000
+
+
+@dataclass
+class ImportProgress:
+    """导入进度, 每写入一批回调一次"""
+
+    batch_index: int
+    rows_processed: int
+    success_count: int
+    error_count: int
+    duplicate_count: int
+
+
+@dataclass
+class ImportResult:
+    """导入结果"""
+
+    success_count: int = 0
+    error_count: int = 0
+    duplicate_count: int = 0
+    rows_processed: int = 0
+    error_messages: list[str] = field(default_factory=list)
+    record_ids: list[int] = field(default_factory=list)
+
+    def as_tuple(self) -> tuple[int, int, list[str]]:
+        """转换为导入服务的返回格式(成功数量, 失败数量, 错误信息列表)"""
+        return self.success_count, self.error_count, self.error_messages
+
+
+class ImportCheckpoint:
+    """导入检查点
+
+    记录已提交的源数据行数和统计, 中断后再次导入同一文件时从断点继续.
+    源文件的大小或修改时间变化后检查点失效.
+    """
+
+    def __init__(self, checkpoint_path: str | Path, source_path: str | Path):
+        """
+        初始化检查点
+
+        Args:
+            checkpoint_path: 检查点文件路径
+            source_path: 导入源文件路径
+        """
+        self._path = Path(checkpoint_path)
+        self._source = self._source_signature(Path(source_path))
+
+    @staticmethod
+    def _source_signature(source_path: Path) -> dict[str, Any]:
+        stat = source_path.stat()
+        return {
+            "path": str(source_path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def load(self) -> ImportResult | None:
+        """
+        读取检查点
+
+        Returns:
+            已提交部分的导入结果, 没有有效检查点时返回None
+        """
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if state.get("source") != self._source:
+            return None
+
+        result = state.get("result", {})
+        return ImportResult(
+            success_count=result.get("success_count", 0),
+            error_count=result.get("error_count", 0),
+            duplicate_count=result.get("duplicate_count", 0),
+            rows_processed=result.get("rows_processed", 0),
+            error_messages=list(result.get("error_messages", [])),
+        )
+
+    def save(self, result: ImportResult) -> None:
+        """保存检查点(先写临时文件再替换, 避免中断时留下损坏的检查点)"""
+        state = asdict(result)
+        state.pop("record_ids")
+        state["error_messages"] = state["error_messages"][-_MAX_CHECKPOINT_ERRORS:]
+
+        temp_path = self._path.with_name(self._path.name + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"source": self._source, "result": state}, file, ensure_ascii=False
+            )
+        os.replace(temp_path, self._path)
+
+    def clear(self) -> None:
+        """导入完成后删除检查点"""
+        self._path.unlink(missing_ok=True)
+
+
+def iter_csv_batches(
+    file_path: str, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    按批读取CSV文件
+
+    Args:
+        file_path: 文件路径
+        batch_size: 每批行数
+
+    Yields:
+        每批数据行
+    """
+    with open(file_path, encoding="utf-8-sig", newline="") as file:
+        sample = file.read(1024)
+        file.seek(0)
+        delimiter = csv.Sniffer().sniff(sample).delimiter
+
+        batch: list[dict[str, Any]] = []
+        for row in csv.DictReader(file, delimiter=delimiter):
+            batch.append(row)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def iter_excel_batches(
+    file_path: str, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[list[dict[str, Any]]]:
+    """
+    按批读取Excel文件第一个工作表
+
+    使用openpyxl只读模式逐行读取, 空单元格转换为空字符串.
+
+    Args:
+        file_path: 文件路径
+        batch_size: 每批行数
+
+    Yields:
+        每批数据行
+    """
+    try:
+        from openpyxl import load_workbook
+    except ImportError as e:
+        raise ServiceError("需要安装openpyxl库来处理Excel文件") from e
+
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header_row = next(rows, None)
+        if not header_row:
+            return
+        headers = ["" if value is None else str(value) for value in header_row]
+
+        batch: list[dict[str, Any]] = []
+        for values in rows:
+            batch.append(
+                {
+                    header: "" if value is None else value
+                    for header, value in zip(headers, values)
+                }
+            )
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        workbook.close()
+
+
+class BulkImportPipeline:
+    """
+    批量导入管道
+
+    调用方提供:
+    - prepare_row: 把源数据行转换为待写入记录; 返回None表示跳过该行(如空行),
+      抛出异常表示校验失败, 异常信息作为错误原因. 会在工作线程中调用.
+    - write_batch: 写入一批记录并返回新记录ID, 必须是原子的(全部成功或全部回滚);
+      没有批量接口时改为提供write_row逐条写入.
+    - key_func/existing_keys: 重复检测使用的记录键和已存在的键.
+    """
+
+    def __init__(
+        self,
+        prepare_row: Callable[[dict[str, Any]], dict[str, Any] | None],
+        write_batch: Callable[[list[dict[str, Any]]], list[int]] | None = None,
+        write_row: Callable[[dict[str, Any]], int | None] | None = None,
+        key_func: Callable[[dict[str, Any]], Hashable] | None = None,
+        existing_keys: Iterable[Hashable] = (),
+        max_workers: int | None = None,
+        progress_callback: Callable[[ImportProgress], None] | None = None,
+        checkpoint: ImportCheckpoint | None = None,
+    ):
+        """
+        初始化批量导入管道
+
+        Args:
+            prepare_row: 行转换和校验函数
+            write_batch: 批量写入函数
+            write_row: 单条写入函数, 返回新记录ID, 失败时返回None或抛出异常
+            key_func: 重复检测键函数, 为None时不检测重复
+            existing_keys: 数据库中已存在的键
+            max_workers: 校验线程数
+            progress_callback: 进度回调
+            checkpoint: 检查点, 为None时不支持续传
+        """
+        if (write_batch is None) == (write_row is None):
+            raise ServiceError("write_batch和write_row必须且只能提供一个")
+
+        self._prepare_row = prepare_row
+        self._write_batch = write_batch
+        self._write_row = write_row or self._write_single
+        self._key_func = key_func
+        self._keys = set(existing_keys) if key_func else set()
+        self._max_workers = max_workers or min(4, os.cpu_count() or 1)
+        self._progress_callback = progress_callback
+        self._checkpoint = checkpoint
+        self._logger = logging.getLogger(__name__)
+
+    def run(self, batches: Iterable[list[dict[str, Any]]]) -> ImportResult:
+        """
+        执行导入
+
+        Args:
+            batches: 按批提供的源数据行
+
+        Returns:
+            ImportResult: 导入结果(续传时包含此前已提交部分)
+        """
+        result = self._checkpoint.load() if self._checkpoint else None
+        result = result or ImportResult()
+        if result.rows_processed:
+            self._logger.info(f"从检查点继续导入, 已处理 {result.rows_processed} 行")
+
+        numbered = self._number_batches(batches, result.rows_processed)
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as executor:
+            # 后续批次的校验与当前批的写入重叠执行, 按源文件顺序提交
+            pending: deque[Future] = deque()
+            batch_index = 0
+            for first_row, rows in numbered:
+                pending.append(executor.submit(self._prepare_batch, first_row, rows))
+                if len(pending) > self._max_workers:
+                    batch_index += 1
+                    self._commit_batch(batch_index, pending.popleft().result(), result)
+            while pending:
+                batch_index += 1
+                self._commit_batch(batch_index, pending.popleft().result(), result)
+
+        if self._checkpoint:
+            self._checkpoint.clear()
+
+        self._logger.info(
+            f"批量导入完成: 成功{result.success_count}条, 失败{result.error_count}条"
+            f"(其中重复{result.duplicate_count}条)"
+        )
+        return result
+
+    def _number_batches(
+        self, batches: Iterable[list[dict[str, Any]]], skip_rows: int
+    ) -> Iterator[tuple[int, list[dict[str, Any]]]]:
+        """为每批标注首行行号, 并跳过检查点之前已处理的行"""
+        row_number = 1
+        for rows in batches:
+            first_row = row_number
+            row_number += len(rows)
+            if row_number - 1 <= skip_rows:
+                continue
+            if first_row <= skip_rows:
+                rows = rows[skip_rows - first_row + 1 :]
+                first_row = skip_rows + 1
+            yield first_row, rows
+
+    def _prepare_batch(
+        self, first_row: int, rows: list[dict[str, Any]]
+    ) -> tuple[int, list[tuple[int, dict[str, Any] | None, str | None]]]:
+        """在工作线程中转换和校验一批数据"""
+        prepared = []
+        for row_number, row in enumerate(rows, start=first_row):
+            try:
+                prepared.append((row_number, self._prepare_row(row), None))
+            except Exception as e:
+                reason = getattr(e, "message", None) or e
+                message = f"第{row_number}行数据验证失败: {reason}"
+                prepared.append((row_number, None, message))
+        return len(rows), prepared
+
+    def _commit_batch(
+        self,
+        batch_index: int,
+        prepared_batch: tuple[int, list[tuple[int, dict[str, Any] | None, str | None]]],
+        result: ImportResult,
+    ) -> None:
+        """去重并写入一批数据, 然后保存检查点和回调进度"""
+        row_count, prepared = prepared_batch
+        row_numbers: list[int] = []
+        records: list[dict[str, Any]] = []
+        batch_keys: list[Hashable] = []
+
+        for row_number, record, error in prepared:
+            if error:
+                result.error_count += 1
+                result.error_messages.append(error)
+                continue
+            if record is None:
+                continue
+            if self._key_func:
+                key = self._key_func(record)
+                if key in self._keys:
+                    result.error_count += 1
+                    result.duplicate_count += 1
+                    result.error_messages.append(f"第{row_number}行数据重复, 已跳过")
+                    continue
+                self._keys.add(key)
+                batch_keys.append(key)
+            row_numbers.append(row_number)
+            records.append(record)
+
+        if records:
+            self._write_records(row_numbers, records, batch_keys, result)
+
+        result.rows_processed += row_count
+        if self._checkpoint:
+            self._checkpoint.save(result)
+        if self._progress_callback:
+            self._progress_callback(
+                ImportProgress(
+                    batch_index=batch_index,
+                    rows_processed=result.rows_processed,
+                    success_count=result.success_count,
+                    error_count=result.error_count,
+                    duplicate_count=result.duplicate_count,
+                )
+            )
+
+    def _write_records(
+        self,
+        row_numbers: list[int],
+        records: list[dict[str, Any]],
+        batch_keys: list[Hashable],
+        result: ImportResult,
+    ) -> None:
+        """写入一批记录, 整批失败时逐行重试以定位出错的行"""
+        if self._write_batch is not None:
+            try:
+                record_ids = self._write_batch(records)
+            except Exception as e:
+                self._logger.warning(f"批量写入失败, 逐行重试: {e}")
+            else:
+                result.success_count += len(record_ids)
+                result.record_ids.extend(record_ids)
+                return
+
+        for index, (row_number, record) in enumerate(zip(row_numbers, records)):
+            try:
+                record_id = self._write_row(record)
+            except Exception as e:
+                record_id = None
+                reason = getattr(e, "message", None) or e
+                message = f"第{row_number}行处理失败: {reason}"
+            else:
+                message = f"第{row_number}行数据创建失败"
+
+            if record_id:
+                result.success_count += 1
+                result.record_ids.append(record_id)
+                continue
+
+            result.error_count += 1
+            result.error_messages.append(message)
+            if batch_keys:
+                # 未写入的记录不应阻止后续同键记录
+                self._keys.discard(batch_keys[index])
+
+    def _write_single(self, record: dict[str, Any]) -> int | None:
+        """通过批量写入函数写入单条记录"""
+        record_ids = self._write_batch([record])
+        return record_ids[0] if record_ids else None
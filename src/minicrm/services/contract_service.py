@@ -24,6 +24,7 @@ from transfunctions import (
     format_currency,
     format_date,
 )
+from transfunctions.data_operations import DEFAULT_CHUNK_SIZE
 
 from ..core.exceptions import BusinessLogicError, ServiceError, ValidationError
 from ..models.contract import Contract, ContractStatus, ContractType
@@ -340,10 +341,9 @@ class ContractService(CRUDService):
 
             # 记录状态变更原因
             if reason:
-                status_note = (
-                    f"状态变更: {old_status.value} → {new_status.value}, 原因: {reason}"
+                contract.notes = self._append_status_note(
+                    contract.notes, old_status, new_status, reason
                 )
-                contract.notes = f"{contract.notes}\n{status_note}".strip()
 
             # 保存更新
             updated_contract = self.update(contract_id, contract.to_dict())
@@ -568,6 +568,9 @@ class ContractService(CRUDService):
         """
         处理已过期的合同
 
+        状态更新按块批量写入, 每块在一个事务中执行. 某一块写入失败时
+        只回滚该块, 其中的合同计入errors, 其余块继续处理.
+
         Returns:
             Dict[str, int]: 处理结果统计
         """
@@ -575,17 +578,50 @@ class ContractService(CRUDService):
             expired_contracts = self.get_expired_contracts()
             processed_count = 0
             error_count = 0
+            updated_at = format_date(datetime.now(), "%Y-%m-%d %H:%M:%S")
+            updates = []
 
             for contract in expired_contracts:
-                try:
-                    # 更新合同状态为已过期
-                    self.update_contract_status(
-                        contract.id, ContractStatus.EXPIRED, "合同已过期"
+                if not self._is_valid_status_transition(
+                    contract.contract_status, ContractStatus.EXPIRED
+                ):
+                    self.logger.error(
+                        f"处理过期合同失败 {contract.id}: "
+                        f"不能从{contract.contract_status.value}转换到已过期"
                     )
-                    processed_count += 1
-                except Exception as e:
-                    self.logger.error(f"处理过期合同失败 {contract.id}: {e}")
                     error_count += 1
+                    continue
+                notes = self._append_status_note(
+                    contract.notes,
+                    contract.contract_status,
+                    ContractStatus.EXPIRED,
+                    "合同已过期",
+                )
+                # 模型的contract_status对应contracts表的status列
+                updates.append(
+                    (
+                        contract.id,
+                        {
+                            "status": ContractStatus.EXPIRED.value,
+                            "notes": notes,
+                            "updated_at": updated_at,
+                        },
+                    )
+                )
+
+            # 更新字段相同, 每块合同只执行一条语句
+            for start in range(0, len(updates), DEFAULT_CHUNK_SIZE):
+                chunk = updates[start : start + DEFAULT_CHUNK_SIZE]
+                try:
+                    processed_count += self._dao.update_many(chunk)
+                except Exception as e:
+                    contract_ids = [contract_id for contract_id, _ in chunk]
+                    self.logger.error(f"处理过期合同失败 {contract_ids}: {e}")
+                    error_count += len(chunk)
+
+            if processed_count:
+                self._cache_clear("get_")
+                self._cache_clear("list_")
 
             result = {"processed": processed_count, "errors": error_count}
 
@@ -813,6 +849,19 @@ class ContractService(CRUDService):
 
     # ==================== 辅助方法 ====================
 
+    def _append_status_note(
+        self,
+        notes: str | None,
+        old_status: ContractStatus,
+        new_status: ContractStatus,
+        reason: str,
+    ) -> str:
+        """在合同备注后追加状态变更记录"""
+        status_note = (
+            f"状态变更: {old_status.value} → {new_status.value}, 原因: {reason}"
+        )
+        return f"{notes or ''}\n{status_note}".strip()
+
     def _is_valid_status_transition(
         self, current_status: ContractStatus, new_status: ContractStatus
     ) -> bool:
@@ -122,6 +122,74 @@ class CustomerCoreService:
             service_error_msg = f"创建客户失败: {e}"
             raise ServiceError(service_error_msg) from e
 
+    def prepare_customer_record(self, customer_data: dict[str, Any]) -> dict[str, Any]:
+        """为批量创建准备客户记录.
+
+        执行与create_customer相同的验证、预处理、业务规则和默认值,
+        但不访问数据库; 重复检查由调用方基于customer_key完成.
+
+        Args:
+            customer_data: 客户数据字典
+
+        Returns:
+            dict[str, Any]: 可直接写入的客户记录
+
+        Raises:
+            ValidationError: 当客户数据验证失败时
+            BusinessLogicError: 当业务规则检查失败时
+        """
+        record = validate_customer_data(dict(customer_data))
+        self._preprocess_customer_data(record)
+        self._validate_business_rules(record)
+        self._apply_customer_defaults(record)
+        return record
+
+    @staticmethod
+    def customer_key(customer_data: dict[str, Any]) -> tuple[str, str]:
+        """获取用于重复检测的客户键(名称, 标准化电话)."""
+        name = str(customer_data.get("name") or "").strip()
+        phone = CustomerCoreService._normalize_phone(
+            str(customer_data.get("phone") or "")
+        )
+        return name, phone
+
+    def get_existing_customer_keys(self) -> set[tuple[str, str]]:
+        """获取数据库中已有客户的重复检测键.
+
+        Returns:
+            set[tuple[str, str]]: 客户键集合
+        """
+        try:
+            return {
+                self.customer_key({"name": name, "phone": phone})
+                for name, phone in self._customer_dao.get_name_phone_pairs()
+            }
+        except Exception as e:
+            error_msg = f"获取客户重复检测键失败: {e}"
+            self._logger.exception(error_msg)
+            raise ServiceError(error_msg) from e
+
+    def bulk_create_customers(self, records: list[dict[str, Any]]) -> list[int]:
+        """在一个事务中批量创建已准备好的客户记录.
+
+        Args:
+            records: prepare_customer_record返回的客户记录列表
+
+        Returns:
+            list[int]: 新创建的客户ID
+
+        Raises:
+            ServiceError: 当数据库操作失败时, 整批回滚
+        """
+        try:
+            customer_ids = self._customer_dao.insert_many(records)
+            self._logger.info(f"批量创建客户 {len(customer_ids)} 个")
+            return customer_ids
+        except Exception as e:
+            error_msg = f"批量创建客户失败: {e}"
+            self._logger.exception(error_msg)
+            raise ServiceError(error_msg) from e
+
     def update_customer(self, customer_id: int, data: dict[str, Any]) -> bool:
         """更新客户信息.
 
@@ -288,16 +356,19 @@ class CustomerCoreService:
             customer_data["name"] = customer_data["name"].strip()
 
         if "phone" in customer_data:
-            # 标准化电话号码格式
-            phone = customer_data["phone"].strip()
-            # 移除常见分隔符
-            phone = (
-                phone.replace("-", "")
-                .replace(" ", "")
-                .replace("(", "")
-                .replace(")", "")
-            )
-            customer_data["phone"] = phone
+            customer_data["phone"] = self._normalize_phone(customer_data["phone"])
+
+    @staticmethod
+    def _normalize_phone(phone: str) -> str:
+        """标准化电话号码格式."""
+        # 移除常见分隔符
+        return (
+            phone.strip()
+            .replace("-", "")
+            .replace(" ", "")
+            .replace("(", "")
+            .replace(")", "")
+        )
 
     def _validate_business_rules(self, customer_data: dict[str, Any]) -> None:
         """验证业务规则."""
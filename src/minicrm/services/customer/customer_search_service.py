@@ -2,7 +2,8 @@
 
 提供客户搜索和筛选功能的业务逻辑处理:
 - 客户搜索和筛选功能
-- 分页查询
+- 键集分页查询和不透明分页游标
+- 按条件缓存或估算的结果总数
 - 高级搜索筛选器配置
 
 严格遵循分层架构和模块化原则.
@@ -10,20 +11,26 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
+from datetime import timedelta
+import hashlib
+import json
 import logging
 from typing import TYPE_CHECKING, Any
 
-from minicrm.core.exceptions import ServiceError
+from minicrm.core.cache_tier import get_cache_tier
+from minicrm.core.exceptions import ServiceError, ValidationError
+from transfunctions.data_operations.query_builder import decode_cursor, encode_cursor
 
 
 if TYPE_CHECKING:
     from minicrm.data.dao.customer_dao import CustomerDAO
+    from minicrm.data.dao.table_stats_dao import TableStatsDAO
 
 
 # 导入transfunctions模块
 try:
     from minicrm.transfunctions.data_formatting import format_currency, format_phone
-    from minicrm.transfunctions.search_templates import paginated_search_template
 except ImportError:
     # 如果transfunctions模块不存在, 提供临时实现
     def format_phone(phone: str) -> str:
@@ -34,18 +41,48 @@ except ImportError:
         """临时货币格式化函数."""
         return f"¥{amount:,.2f}"
 
-    def paginated_search_template(
-        dao: Any,
-        query: str,
-        filters: dict[str, Any],
-        page: int,
-        page_size: int,
-        config: dict[str, Any],
-    ) -> Any:
-        """临时分页搜索模板函数."""
-        # 使用未使用的参数避免警告
-        _ = dao, query, filters, page, page_size, config
-        return type("SearchResult", (), {"items": [], "total": 0})()
+
+# 关键词模糊匹配的字段
+SEARCH_FIELDS = ("name", "phone", "email", "contact_person")
+
+# 可以等值筛选的字段, 其他筛选条件被忽略
+FILTER_FIELDS = (
+    "id",
+    "name",
+    "phone",
+    "email",
+    "address",
+    "customer_type_id",
+    "contact_person",
+)
+
+# 可以排序的字段, 配置了表结构统计DAO时还要求有以该字段开头的索引
+SORT_FIELDS = ("id", "name", "phone", "customer_type_id", "created_at", "updated_at")
+
+# 默认排序
+DEFAULT_ORDER_BY = "created_at DESC"
+
+# 总数统计方式: 精确COUNT(*)(按条件缓存)、优先使用缓存或表统计估算、不统计
+COUNT_MODES = ("exact", "estimated", "none")
+
+# 结果总数缓存所在的缓存区域, 与高级搜索共用
+SEARCH_REGION = "search"
+
+# 搜索结果缓存区域的字节预算(MB)
+SEARCH_REGION_SIZE_MB = 16.0
+
+# 结果总数缓存的生存时间
+COUNT_CACHE_TTL = timedelta(minutes=5)
+
+
+@dataclass
+class CustomerSearchPage:
+    """客户搜索的一页结果."""
+
+    items: list[dict[str, Any]]
+    total: int | None
+    next_cursor: str | None = None
+    total_estimated: bool = False
 
 
 class CustomerSearchService:
@@ -59,14 +96,26 @@ class CustomerSearchService:
     严格遵循单一职责原则和模块化标准.
     """
 
-    def __init__(self, customer_dao: CustomerDAO):
+    def __init__(
+        self,
+        customer_dao: CustomerDAO,
+        table_stats_dao: TableStatsDAO | None = None,
+    ):
         """初始化客户搜索服务.
 
         Args:
             customer_dao: 客户数据访问对象
+            table_stats_dao: 表结构统计DAO, 用于验证排序索引和估算总数
         """
         self._customer_dao = customer_dao
+        self._table_stats_dao = table_stats_dao
         self._logger = logging.getLogger(__name__)
+        # 按搜索条件缓存的结果总数, 客户表写入时自动失效
+        self._count_cache = (
+            get_cache_tier()
+            .create_region(SEARCH_REGION, SEARCH_REGION_SIZE_MB, COUNT_CACHE_TTL)
+            .namespace()
+        )
         self._logger.info("客户搜索服务初始化完成")
 
     def search_customers(
@@ -76,7 +125,7 @@ class CustomerSearchService:
         page: int = 1,
         page_size: int = 20,
     ) -> tuple[list[dict[str, Any]], int]:
-        """搜索客户 - 使用transfunctions分页搜索模板.
+        """搜索客户.
 
         Args:
             query: 搜索关键词
@@ -87,45 +136,157 @@ class CustomerSearchService:
         Returns:
             Tuple[List[Dict[str, Any]], int]: (客户列表, 总数)
         """
-        try:
-            # 使用transfunctions分页搜索模板
-            search_config = {
-                "search_fields": ["name", "phone", "company_name", "email"],
-                "filter_fields": ["customer_level", "customer_type", "status"],
-                "order_by": "created_at DESC",
-            }
-
-            result = paginated_search_template(
-                dao=self._customer_dao,
-                query=query,
-                filters=filters or {},
-                page=page,
-                page_size=page_size,
-                config=search_config,
-            )
+        result = self.search_customers_page(
+            query, filters, page_size=page_size, page=page
+        )
+        return result.items, result.total
+
+    def search_customers_page(
+        self,
+        query: str = "",
+        filters: dict[str, Any] | None = None,
+        cursor: str | None = None,
+        page_size: int = 20,
+        order_by: str | None = None,
+        count_mode: str = "exact",
+        page: int = 1,
+    ) -> CustomerSearchPage:
+        """按键集分页搜索客户.
 
-            # 格式化客户数据
-            formatted_customers = []
-            for customer in result.items:
-                formatted_customer = customer.copy()
-                # 使用transfunctions格式化显示字段
-                if customer.get("phone"):
-                    formatted_customer["formatted_phone"] = format_phone(
-                        customer["phone"]
-                    )
-                if customer.get("credit_limit"):
-                    formatted_customer["formatted_credit_limit"] = format_currency(
-                        float(customer["credit_limit"])
-                    )
-                formatted_customers.append(formatted_customer)
+        第一页不传cursor, 之后传入上一页的next_cursor; 翻页代价与页码无关.
+
+        Args:
+            query: 搜索关键词
+            filters: 等值筛选条件, 只支持customers表中存在的字段
+            cursor: 上一页结果的next_cursor
+            page_size: 每页大小
+            order_by: 排序字段, 可带方向, 如"name DESC"
+            count_mode: 总数统计方式, 见COUNT_MODES
+            page: 页码, 仅在不传cursor时使用
+
+        Returns:
+            CustomerSearchPage: 当前页客户、总数和下一页游标
 
+        Raises:
+            ValidationError: 排序字段、统计方式或游标无效
+            ServiceError: 搜索失败
+        """
+        try:
+            if count_mode not in COUNT_MODES:
+                raise ValidationError(f"无效的总数统计方式: {count_mode}")
+            column, direction = self._resolve_order_by(order_by)
+            filters = self._supported_filters(filters)
+            signature = self._query_signature(query, filters, column, direction)
+            after = None
+            if cursor:
+                try:
+                    after = decode_cursor(cursor, signature)
+                except ValueError as e:
+                    raise ValidationError(str(e)) from e
+
+            # 多取一条用于判断是否还有下一页
+            rows = self._customer_dao.search_keyset(
+                query,
+                SEARCH_FIELDS,
+                filters,
+                (column, direction),
+                after,
+                page_size + 1,
+                (page - 1) * page_size,
+            )
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor(
+                    signature, rows[-1].get(column), rows[-1].get("id")
+                )
+
+            total, estimated = self._count_customers(query, filters, count_mode)
+            items = [self._format_customer(customer) for customer in rows]
+
+        except ValidationError:
+            raise
         except Exception as e:
             error_msg = f"搜索客户失败: {e}"
             self._logger.exception(error_msg)
-            service_error_msg = f"搜索客户失败: {e}"
-            raise ServiceError(service_error_msg) from e
+            raise ServiceError(error_msg) from e
         else:
-            return formatted_customers, result.total
+            return CustomerSearchPage(items, total, next_cursor, estimated)
+
+    def _resolve_order_by(self, order_by: str | None) -> tuple[str, str]:
+        """解析并验证排序字段, 返回(列名, 排序方向)."""
+        column, _, direction = (order_by or DEFAULT_ORDER_BY).strip().partition(" ")
+        direction = direction.strip().upper() or "ASC"
+        if direction not in ("ASC", "DESC"):
+            raise ValidationError(f"无效的排序方向: {direction}")
+        if column not in SORT_FIELDS:
+            raise ValidationError(f"无效的排序字段: {column}")
+        if self._table_stats_dao is not None:
+            indexed = self._table_stats_dao.get_indexed_columns("customers")
+            if column not in indexed:
+                raise ValidationError(f"排序字段 {column} 没有可用的索引")
+        return column, direction
+
+    def _supported_filters(self, filters: dict[str, Any] | None) -> dict[str, Any]:
+        """过滤掉customers表中不存在的筛选字段."""
+        supported = {
+            key: value for key, value in (filters or {}).items() if key in FILTER_FIELDS
+        }
+        ignored = set(filters or {}) - set(supported)
+        if ignored:
+            self._logger.debug(f"忽略不支持的筛选字段: {sorted(ignored)}")
+        return supported
+
+    def _count_customers(
+        self, query: str, filters: dict[str, Any], count_mode: str
+    ) -> tuple[int | None, bool]:
+        """统计搜索结果总数, 返回(总数, 是否为估算值)."""
+        if count_mode == "none":
+            return None, False
+
+        count_key = self._query_signature(query, filters, "", "")
+        cached_total = self._count_cache.get(count_key)
+        if cached_total is not None:
+            return cached_total, False
+
+        # 关键词是LIKE条件, 无法用索引统计估算
+        if (
+            count_mode == "estimated"
+            and not query
+            and self._table_stats_dao is not None
+        ):
+            estimate = self._table_stats_dao.estimate_row_count(
+                "customers", tuple(filters)
+            )
+            if estimate is not None:
+                return estimate, True
+
+        total = self._customer_dao.count_keyword_matches(query, SEARCH_FIELDS, filters)
+        self._count_cache.put(count_key, total, tables=("customers",))
+        return total, False
+
+    def _query_signature(
+        self, query: str, filters: dict[str, Any], column: str, direction: str
+    ) -> str:
+        """生成查询签名, 用于缓存键和校验游标."""
+        payload = json.dumps(
+            [query, sorted(filters.items()), column, direction],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.md5(payload.encode()).hexdigest()
+
+    def _format_customer(self, customer: dict[str, Any]) -> dict[str, Any]:
+        """添加格式化后的显示字段."""
+        formatted_customer = customer.copy()
+        # 使用transfunctions格式化显示字段
+        if customer.get("phone"):
+            formatted_customer["formatted_phone"] = format_phone(customer["phone"])
+        if customer.get("credit_limit"):
+            formatted_customer["formatted_credit_limit"] = format_currency(
+                float(customer["credit_limit"])
+            )
+        return formatted_customer
 
     def get_all_customers(
         self, page: int = 1, page_size: int = 100
@@ -11,6 +11,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from datetime import datetime, timezone
 import logging
 from typing import Any
@@ -50,6 +51,11 @@ class CustomerServiceFacade:
 
         self._logger.info("客户服务门面初始化完成")
 
+    @property
+    def customer_dao(self) -> CustomerDAO:
+        """客户数据访问对象, 供表格分页数据源在数据库中筛选、排序和分页."""
+        return self._customer_dao
+
     # ========== 核心CRUD操作 ==========
 
     def create_customer(self, customer_data: dict[str, Any]) -> int:
@@ -135,6 +141,43 @@ class CustomerServiceFacade:
         """
         return self._core_service.get_customer_by_id(customer_id)
 
+    # ========== 批量创建操作 ==========
+
+    def prepare_customer_record(self, customer_data: dict[str, Any]) -> dict[str, Any]:
+        """为批量创建准备客户记录(验证并应用业务规则, 不访问数据库)."""
+        return self._core_service.prepare_customer_record(customer_data)
+
+    def customer_key(self, customer_data: dict[str, Any]) -> tuple[str, str]:
+        """获取用于重复检测的客户键."""
+        return self._core_service.customer_key(customer_data)
+
+    def get_existing_customer_keys(self) -> set[tuple[str, str]]:
+        """获取数据库中已有客户的重复检测键."""
+        return self._core_service.get_existing_customer_keys()
+
+    def bulk_create_customers(self, records: list[dict[str, Any]]) -> list[int]:
+        """批量创建已准备好的客户记录.
+
+        整批在一个事务中写入, 审计日志和统计缓存更新按批执行一次.
+
+        Args:
+            records: prepare_customer_record返回的客户记录列表
+
+        Returns:
+            list[int]: 新创建的客户ID
+        """
+        customer_ids = self._core_service.bulk_create_customers(records)
+        self._update_statistics_cache()
+        self._log_audit_operation(
+            "批量创建客户成功",
+            {
+                "count": len(customer_ids),
+                "first_customer_id": customer_ids[0] if customer_ids else None,
+                "operation_type": "bulk_create",
+            },
+        )
+        return customer_ids
+
     # ========== 搜索和查询操作 ==========
 
     def search_customers(
@@ -171,6 +214,20 @@ class CustomerServiceFacade:
         """
         return self._search_service.get_all_customers(page, page_size)
 
+    def iter_customers(
+        self, filters: dict[str, Any] | None = None, batch_size: int = 500
+    ) -> Iterator[dict[str, Any]]:
+        """流式遍历客户, 用于导出和分析等全量处理场景.
+
+        Args:
+            filters: 等值筛选条件
+            batch_size: 底层游标读取的批次大小
+
+        Returns:
+            Iterator[Dict[str, Any]]: 客户数据迭代器
+        """
+        return self._customer_dao.stream(filters, batch_size=batch_size)
+
     def get_total_count(self) -> int:
         """获取客户总数.
 
@@ -17,6 +17,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
 from typing import Any
 import warnings
 
@@ -54,12 +55,33 @@ class CustomerService:
         # 委托给新的实现
         self._service = NewCustomerService(customer_dao)
 
+    @property
+    def customer_dao(self) -> CustomerDAO:
+        """客户数据访问对象."""
+        return self._service.customer_dao
+
     # ========== 委托所有方法到新的实现 ==========
 
     def create_customer(self, customer_data: dict[str, Any]) -> int:
         """创建新客户."""
         return self._service.create_customer(customer_data)
 
+    def prepare_customer_record(self, customer_data: dict[str, Any]) -> dict[str, Any]:
+        """为批量创建准备客户记录."""
+        return self._service.prepare_customer_record(customer_data)
+
+    def customer_key(self, customer_data: dict[str, Any]) -> tuple[str, str]:
+        """获取用于重复检测的客户键."""
+        return self._service.customer_key(customer_data)
+
+    def get_existing_customer_keys(self) -> set[tuple[str, str]]:
+        """获取数据库中已有客户的重复检测键."""
+        return self._service.get_existing_customer_keys()
+
+    def bulk_create_customers(self, records: list[dict[str, Any]]) -> list[int]:
+        """批量创建已准备好的客户记录."""
+        return self._service.bulk_create_customers(records)
+
     def update_customer(self, customer_id: int, data: dict[str, Any]) -> bool:
         """更新客户信息."""
         return self._service.update_customer(customer_id, data)
@@ -88,6 +110,12 @@ class CustomerService:
         """获取所有客户列表."""
         return self._service.get_all_customers(page, page_size)
 
+    def iter_customers(
+        self, filters: dict[str, Any] | None = None, batch_size: int = 500
+    ) -> Iterator[dict[str, Any]]:
+        """流式遍历客户."""
+        return self._service.iter_customers(filters, batch_size)
+
     def get_customer_by_id(self, customer_id: int) -> dict[str, Any] | None:
         """根据ID获取客户信息."""
         return self._service.get_customer_by_id(customer_id)
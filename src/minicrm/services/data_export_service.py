@@ -15,6 +15,7 @@ MiniCRM 数据导出服务
 
 import csv
 import logging
+from collections.abc import Callable, Iterable, Iterator
 from typing import Any
 
 from minicrm.core.exceptions import ServiceError
@@ -31,6 +32,9 @@ class DataExportService:
     提供统一的数据导出功能,支持多种格式和数据类型.
     """
 
+    # 流式导出时每批读取的记录数
+    EXPORT_BATCH_SIZE = 1000
+
     def __init__(
         self,
         customer_service: CustomerService,
@@ -101,101 +105,142 @@ class DataExportService:
             if not is_valid:
                 raise ServiceError(error_msg)
 
-            # 获取数据
-            data = self._get_export_data(data_type, filters)
-
-            if not data:
-                raise ServiceError("没有数据可以导出")
+            # 获取数据(流式迭代器, 导出过程中逐行读取)
+            data = self._iter_export_data(data_type, filters)
 
             # 筛选字段
             if fields:
                 data = self._filter_fields(data, fields)
 
-            # 根据格式导出
+            # 根据格式导出, CSV/Excel逐行写入, 没有数据时返回False
             if export_format == ".csv":
-                return self._export_csv(data, output_path)
+                exported = self._export_csv(data, output_path)
             elif export_format == ".xlsx":
-                return self._export_excel(data, output_path)
+                exported = self._export_excel(data, output_path)
             elif export_format == ".pdf":
-                return self._export_pdf(data, output_path, data_type)
+                # PDF表格需要完整数据进行排版
+                rows = list(data)
+                if not rows:
+                    raise ServiceError("没有数据可以导出")
+                return self._export_pdf(rows, output_path, data_type)
             else:
                 raise ServiceError(f"不支持的导出格式: {export_format}")
 
+            if not exported:
+                raise ServiceError("没有数据可以导出")
+            return exported
+
         except Exception as e:
             self._logger.error(f"导出数据失败: {e}")
             raise ServiceError(f"导出数据失败: {e}") from e
 
-    def _get_export_data(
+    def _iter_export_data(
         self, data_type: str, filters: dict[str, Any] | None
-    ) -> list[dict[str, Any]]:
-        """获取导出数据"""
+    ) -> Iterator[dict[str, Any]]:
+        """获取导出数据迭代器
+
+        没有关键词搜索时直接使用服务的流式接口(数据库游标),
+        否则按页调用搜索接口, 两种方式内存占用都与导出总量无关.
+        """
         service = self._data_type_services.get(data_type)
         if not service:
             raise ServiceError(f"不支持的数据类型: {data_type}")
 
+        query = filters.get("query", "") if filters else ""
+        conditions = filters.get("filters") if filters else None
+
         # 根据数据类型获取数据
         if data_type == "customers":
-            customers, _ = self._customer_service.search_customers(
-                query=filters.get("query", "") if filters else "",
-                filters=filters.get("filters") if filters else None,
-                page=1,
-                page_size=10000,  # 大批量导出
+            if not query and hasattr(service, "iter_customers"):
+                return service.iter_customers(conditions, self.EXPORT_BATCH_SIZE)
+            return self._iter_search_pages(
+                self._customer_service.search_customers, query, conditions
             )
-            return customers
         elif data_type == "suppliers":
-            # 假设供应商服务有类似的搜索方法
+            if not query and hasattr(service, "iter_suppliers"):
+                return service.iter_suppliers(conditions, self.EXPORT_BATCH_SIZE)
             if hasattr(service, "search_suppliers"):
-                suppliers, _ = service.search_suppliers(
-                    query=filters.get("query", "") if filters else "",
-                    filters=filters.get("filters") if filters else None,
-                    page=1,
-                    page_size=10000,
-                )
-                return suppliers
-            else:
-                return (
-                    service.get_all_suppliers()
-                    if hasattr(service, "get_all_suppliers")
-                    else []
+                return self._iter_search_pages(
+                    service.search_suppliers, query, conditions
                 )
+            return iter(
+                service.get_all_suppliers()
+                if hasattr(service, "get_all_suppliers")
+                else []
+            )
         else:
             # 其他数据类型的获取逻辑
-            return []
+            return iter([])
+
+    def _iter_search_pages(
+        self,
+        search_func: Callable[..., tuple[list[dict[str, Any]], int]],
+        query: str,
+        conditions: dict[str, Any] | None,
+    ) -> Iterator[dict[str, Any]]:
+        """按页调用搜索接口并逐条产出结果"""
+        page = 1
+        while True:
+            items, _ = search_func(
+                query=query,
+                filters=conditions,
+                page=page,
+                page_size=self.EXPORT_BATCH_SIZE,
+            )
+            yield from items
+            if len(items) < self.EXPORT_BATCH_SIZE:
+                return
+            page += 1
 
     def _filter_fields(
-        self, data: list[dict[str, Any]], fields: list[str]
-    ) -> list[dict[str, Any]]:
+        self, data: Iterable[dict[str, Any]], fields: list[str]
+    ) -> Iterator[dict[str, Any]]:
         """筛选字段"""
-        filtered_data = []
         for row in data:
-            filtered_row = {field: row.get(field, "") for field in fields}
-            filtered_data.append(filtered_row)
-        return filtered_data
+            yield {field: row.get(field, "") for field in fields}
+
+    def _export_csv(self, data: Iterable[dict[str, Any]], output_path: str) -> bool:
+        """导出CSV格式
 
-    def _export_csv(self, data: list[dict[str, Any]], output_path: str) -> bool:
-        """导出CSV格式"""
-        if not data:
+        逐行写入, 第一行数据决定表头; 没有数据时不创建文件.
+        """
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
             return False
 
         with open(output_path, "w", newline="", encoding="utf-8-sig") as csvfile:
-            fieldnames = list(data[0].keys())
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=list(first_row.keys()))
             writer.writeheader()
-            writer.writerows(data)
+            writer.writerow(first_row)
+            writer.writerows(rows)
 
         return True
 
-    def _export_excel(self, data: list[dict[str, Any]], output_path: str) -> bool:
-        """导出Excel格式"""
+    def _export_excel(self, data: Iterable[dict[str, Any]], output_path: str) -> bool:
+        """导出Excel格式
+
+        使用openpyxl的只写模式逐行追加, 工作簿不会在内存中保留全部单元格.
+        """
         try:
-            import pandas as pd
+            from openpyxl import Workbook
+        except ImportError as e:
+            raise ServiceError("导出Excel需要安装openpyxl库") from e
 
-            df = pd.DataFrame(data)
-            df.to_excel(output_path, index=False, engine="openpyxl")
-            return True
+        rows = iter(data)
+        first_row = next(rows, None)
+        if first_row is None:
+            return False
 
-        except ImportError as e:
-            raise ServiceError("导出Excel需要安装pandas和openpyxl库") from e
+        headers = list(first_row.keys())
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet()
+        ws.append(headers)
+        ws.append([first_row.get(field) for field in headers])
+        for row in rows:
+            ws.append([row.get(field) for field in headers])
+        wb.save(output_path)
+        return True
 
     def _export_pdf(
         self, data: list[dict[str, Any]], output_path: str, data_type: str
@@ -15,6 +15,7 @@ from .excel_export_service import ExcelExportService
 from .excel_formatters import ExcelFormatters
 from .excel_statistics_calculator import ExcelStatisticsCalculator
 from .financial_excel_exporter import FinancialExcelExporter
+from .streaming_sheet_writer import StreamingSheetWriter
 from .supplier_excel_exporter import SupplierExcelExporter
 
 
@@ -25,4 +26,5 @@ __all__ = [
     "SupplierExcelExporter",
     "FinancialExcelExporter",
     "ExcelStatisticsCalculator",
+    "StreamingSheetWriter",
 ]
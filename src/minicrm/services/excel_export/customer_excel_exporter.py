@@ -7,6 +7,7 @@
 
 import csv
 import logging
+from collections.abc import Iterable
 from datetime import datetime
 from typing import Any
 
@@ -14,6 +15,24 @@ from minicrm.core.exceptions import ServiceError
 
 from .excel_formatters import ExcelFormatters
 from .excel_statistics_calculator import ExcelStatisticsCalculator
+from .streaming_sheet_writer import StreamingSheetWriter
+
+
+# 客户明细列: (标题, 字段名, 样式)
+CUSTOMER_COLUMNS = (
+    ("客户ID", "id", "data"),
+    ("客户名称", "name", "data"),
+    ("联系人", "contact_person", "data"),
+    ("电话", "phone", "data"),
+    ("邮箱", "email", "data"),
+    ("地址", "address", "data"),
+    ("行业", "industry", "data"),
+    ("公司规模", "company_size", "data"),
+    ("客户类型", "customer_type", "data"),
+    ("创建日期", "created_at", "date"),
+    ("最后互动", "last_interaction_date", "date"),
+    ("状态", "status", "data"),
+)
 
 
 class CustomerExcelExporter:
@@ -28,6 +47,19 @@ class CustomerExcelExporter:
         self._logger = logging.getLogger(__name__)
         self._formatters = ExcelFormatters()
         self._calculator = ExcelStatisticsCalculator()
+        self._sheet_writer = StreamingSheetWriter(self._formatters)
+
+        self._headers = [header for header, _, _ in CUSTOMER_COLUMNS]
+        self._fields = [field for _, field, _ in CUSTOMER_COLUMNS]
+        self._column_styles = [style for _, _, style in CUSTOMER_COLUMNS]
+
+    def _customer_row(self, customer: dict[str, Any]) -> list[Any]:
+        """将客户记录转换为明细行"""
+        return [customer.get(field, "") for field in self._fields]
+
+    def _customer_rows(self, customers: Iterable[dict[str, Any]]) -> Iterable[list]:
+        """逐条转换客户记录"""
+        return map(self._customer_row, customers)
 
     def export_customer_data(
         self,
@@ -64,6 +96,69 @@ class CustomerExcelExporter:
             self._logger.error(f"导出客户数据失败: {e}")
             raise ServiceError(f"导出客户数据失败: {e}", "CustomerExcelExporter") from e
 
+    def export_customer_rows(
+        self, customers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """
+        单遍导出客户明细
+
+        只生成客户基本信息工作表, 数据只遍历一次,
+        可以直接传入DAO的流式迭代器而无需先加载为列表.
+        使用openpyxl只写模式, 已写入的行直接落盘, 不在内存中保留单元格.
+
+        Args:
+            customers: 客户数据迭代器
+            output_path: 输出文件路径
+
+        Returns:
+            bool: 导出是否成功
+        """
+        try:
+            self._logger.info(f"开始流式导出客户明细到Excel: {output_path}")
+
+            try:
+                from openpyxl import Workbook
+            except ImportError:
+                return self._export_rows_with_xlsxwriter(customers, output_path)
+
+            wb = Workbook(write_only=True)
+            try:
+                ws = wb.create_sheet("客户基本信息")
+                count = self._create_basic_sheet_openpyxl(ws, customers)
+                wb.save(output_path)
+            finally:
+                wb.close()
+
+            self._logger.info(f"流式导出客户明细成功: {output_path}, 共{count}行")
+            return True
+
+        except (PermissionError, OSError) as e:
+            self._logger.error(f"无法写入文件 {output_path}: {e}")
+            return False
+        except Exception as e:
+            self._logger.error(f"流式导出客户明细失败: {e}")
+            raise ServiceError(f"导出客户数据失败: {e}", "CustomerExcelExporter") from e
+
+    def _export_rows_with_xlsxwriter(
+        self, customers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """使用xlsxwriter单遍导出客户明细(备用方案)"""
+        try:
+            import xlsxwriter
+        except ImportError:
+            # 如果xlsxwriter也没有,使用CSV格式
+            return self._export_as_csv(customers, output_path.replace(".xlsx", ".csv"))
+
+        workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+        try:
+            worksheet = workbook.add_worksheet("客户基本信息")
+            self._create_basic_sheet_xlsxwriter(workbook, worksheet, customers)
+        finally:
+            workbook.close()
+
+        self._logger.info(f"使用xlsxwriter流式导出客户明细成功: {output_path}")
+        return True
+
     def _export_with_openpyxl(
         self, customers: list[dict[str, Any]], output_path: str, include_analysis: bool
     ) -> bool:
@@ -117,56 +212,12 @@ class CustomerExcelExporter:
             return False
 
     def _create_basic_sheet_openpyxl(
-        self, ws: Any, customers: list[dict[str, Any]]
-    ) -> None:
-        """创建客户基本信息工作表"""
-        # 设置列标题
-        headers = [
-            "客户ID",
-            "客户名称",
-            "联系人",
-            "电话",
-            "邮箱",
-            "地址",
-            "行业",
-            "公司规模",
-            "客户类型",
-            "创建日期",
-            "最后互动",
-            "状态",
-        ]
-
-        # 写入标题行
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            self._formatters.apply_openpyxl_style(cell, "header")
-
-        # 写入数据行
-        for row, customer in enumerate(customers, 2):
-            data = [
-                customer.get("id", ""),
-                customer.get("name", ""),
-                customer.get("contact_person", ""),
-                customer.get("phone", ""),
-                customer.get("email", ""),
-                customer.get("address", ""),
-                customer.get("industry", ""),
-                customer.get("company_size", ""),
-                customer.get("customer_type", ""),
-                customer.get("created_at", ""),
-                customer.get("last_interaction_date", ""),
-                customer.get("status", ""),
-            ]
-
-            for col, value in enumerate(data, 1):
-                cell = ws.cell(row=row, column=col, value=value)
-                # 日期列使用特殊格式
-                style = "date" if col in [10, 11] else "data"
-                self._formatters.apply_openpyxl_style(cell, style)
-
-        # 自动调整列宽和冻结首行
-        self._formatters.auto_adjust_column_width(ws, len(headers))
-        self._formatters.freeze_header_row(ws)
+        self, ws: Any, customers: Iterable[dict[str, Any]]
+    ) -> int:
+        """创建客户基本信息工作表, 返回写入的客户数量"""
+        return self._sheet_writer.write_openpyxl(
+            ws, self._headers, self._customer_rows(customers), self._column_styles
+        )
 
     def _create_analysis_sheet_openpyxl(
         self, ws: Any, customers: list[dict[str, Any]]
@@ -327,17 +378,9 @@ class CustomerExcelExporter:
 
             workbook = xlsxwriter.Workbook(output_path)
 
-            # 创建格式
-            header_format = self._formatters.create_xlsxwriter_format(
-                workbook, "header"
-            )
-            data_format = self._formatters.create_xlsxwriter_format(workbook, "data")
-
             # 创建客户基本信息工作表
             worksheet = workbook.add_worksheet("客户基本信息")
-            self._create_basic_sheet_xlsxwriter(
-                worksheet, customers, header_format, data_format
-            )
+            self._create_basic_sheet_xlsxwriter(workbook, worksheet, customers)
 
             if include_analysis:
                 # 创建分析工作表
@@ -359,54 +402,16 @@ class CustomerExcelExporter:
             return False
 
     def _create_basic_sheet_xlsxwriter(
-        self,
-        worksheet: Any,
-        customers: list[dict[str, Any]],
-        header_format: Any,
-        data_format: Any,
-    ) -> None:
-        """使用xlsxwriter创建客户基本信息工作表"""
-        headers = [
-            "客户ID",
-            "客户名称",
-            "联系人",
-            "电话",
-            "邮箱",
-            "地址",
-            "行业",
-            "公司规模",
-            "客户类型",
-            "创建日期",
-            "最后互动",
-            "状态",
-        ]
-
-        # 写入标题
-        for col, header in enumerate(headers):
-            worksheet.write(0, col, header, header_format)
-
-        # 写入数据
-        for row, customer in enumerate(customers, 1):
-            data = [
-                customer.get("id", ""),
-                customer.get("name", ""),
-                customer.get("contact_person", ""),
-                customer.get("phone", ""),
-                customer.get("email", ""),
-                customer.get("address", ""),
-                customer.get("industry", ""),
-                customer.get("company_size", ""),
-                customer.get("customer_type", ""),
-                customer.get("created_at", ""),
-                customer.get("last_interaction_date", ""),
-                customer.get("status", ""),
-            ]
-
-            for col, value in enumerate(data):
-                worksheet.write(row, col, value, data_format)
-
-        # 设置列宽
-        self._formatters.auto_adjust_column_width(worksheet, len(headers), "xlsxwriter")
+        self, workbook: Any, worksheet: Any, customers: Iterable[dict[str, Any]]
+    ) -> int:
+        """使用xlsxwriter创建客户基本信息工作表, 返回写入的客户数量"""
+        return self._sheet_writer.write_xlsxwriter(
+            workbook,
+            worksheet,
+            self._headers,
+            self._customer_rows(customers),
+            self._column_styles,
+        )
 
     def _create_analysis_sheet_xlsxwriter(
         self, worksheet: Any, customers: list[dict[str, Any]], workbook: Any
@@ -438,47 +443,15 @@ class CustomerExcelExporter:
             worksheet.write(i, 0, label, data_format)
             worksheet.write(i, 1, value, data_format)
 
-    def _export_as_csv(self, customers: list[dict[str, Any]], output_path: str) -> bool:
+    def _export_as_csv(
+        self, customers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
         """导出为CSV格式(最后备用方案)"""
         try:
             with open(output_path, "w", newline="", encoding="utf-8-sig") as csvfile:
-                if not customers:
-                    return True
-
-                fieldnames = [
-                    "客户ID",
-                    "客户名称",
-                    "联系人",
-                    "电话",
-                    "邮箱",
-                    "地址",
-                    "行业",
-                    "公司规模",
-                    "客户类型",
-                    "创建日期",
-                    "最后互动",
-                    "状态",
-                ]
-
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for customer in customers:
-                    row = {
-                        "客户ID": customer.get("id", ""),
-                        "客户名称": customer.get("name", ""),
-                        "联系人": customer.get("contact_person", ""),
-                        "电话": customer.get("phone", ""),
-                        "邮箱": customer.get("email", ""),
-                        "地址": customer.get("address", ""),
-                        "行业": customer.get("industry", ""),
-                        "公司规模": customer.get("company_size", ""),
-                        "客户类型": customer.get("customer_type", ""),
-                        "创建日期": customer.get("created_at", ""),
-                        "最后互动": customer.get("last_interaction_date", ""),
-                        "状态": customer.get("status", ""),
-                    }
-                    writer.writerow(row)
+                writer = csv.writer(csvfile)
+                writer.writerow(self._headers)
+                writer.writerows(self._customer_rows(customers))
 
             self._logger.info(f"导出客户数据为CSV成功: {output_path}")
             return True
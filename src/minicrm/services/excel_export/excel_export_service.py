@@ -14,6 +14,7 @@ Excel导出服务协调器
 """
 
 import logging
+from collections.abc import Iterable
 from typing import Any
 
 from minicrm.core.exceptions import ServiceError
@@ -66,6 +67,30 @@ class ExcelExportService:
             self._logger.error(f"客户数据导出失败: {e}")
             raise ServiceError(f"客户数据导出失败: {e}", "ExcelExportService") from e
 
+    def export_customer_rows(
+        self, customers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """
+        流式导出客户明细到Excel
+
+        适用于大数据量导出, customers可以是DAO的流式迭代器,
+        只生成明细工作表, 不包含需要全量数据的分析工作表.
+
+        Args:
+            customers: 客户数据迭代器
+            output_path: 输出文件路径
+
+        Returns:
+            bool: 导出是否成功
+        """
+        try:
+            return self._customer_exporter.export_customer_rows(customers, output_path)
+        except ServiceError:
+            raise
+        except Exception as e:
+            self._logger.error(f"客户明细流式导出失败: {e}")
+            raise ServiceError(f"客户数据导出失败: {e}", "ExcelExportService") from e
+
     def export_supplier_data(
         self, suppliers: list[dict[str, Any]], output_path: str
     ) -> bool:
@@ -85,6 +110,29 @@ class ExcelExportService:
             self._logger.error(f"供应商数据导出失败: {e}")
             raise ServiceError(f"供应商数据导出失败: {e}", "ExcelExportService") from e
 
+    def export_supplier_rows(
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """
+        流式导出供应商明细到Excel
+
+        适用于大数据量导出, suppliers可以是DAO的流式迭代器.
+
+        Args:
+            suppliers: 供应商数据迭代器
+            output_path: 输出文件路径
+
+        Returns:
+            bool: 导出是否成功
+        """
+        try:
+            return self._supplier_exporter.export_supplier_rows(suppliers, output_path)
+        except ServiceError:
+            raise
+        except Exception as e:
+            self._logger.error(f"供应商明细流式导出失败: {e}")
+            raise ServiceError(f"供应商数据导出失败: {e}", "ExcelExportService") from e
+
     def export_financial_report(
         self, financial_data: dict[str, Any], output_path: str
     ) -> bool:
@@ -6,9 +6,19 @@ Excel格式化器
 """
 
 import logging
+import unicodedata
+from collections.abc import Iterable, Sequence
 from typing import Any
 
 
+# 注册到工作簿的命名样式前缀, 避免与Excel内置样式重名
+NAMED_STYLE_PREFIX = "minicrm_"
+
+# 列宽范围(字符数)
+MIN_COLUMN_WIDTH = 8
+MAX_COLUMN_WIDTH = 50
+
+
 class ExcelFormatters:
     """
     Excel格式化器
@@ -65,6 +75,14 @@ class ExcelFormatters:
                 "align": "center",
                 "number_format": "yyyy-mm-dd",
             },
+            "supplier_header": {
+                "font_bold": True,
+                "font_size": 12,
+                "font_color": "FFFFFF",
+                "bg_color": "70AD47",
+                "border": True,
+                "align": "center",
+            },
             "highlight": {
                 "font_bold": True,
                 "font_color": "D63384",
@@ -89,52 +107,104 @@ class ExcelFormatters:
         """
         应用openpyxl样式到单元格
 
+        每次调用都会创建新的样式对象, 适合零散的单元格;
+        批量写入时应使用register_openpyxl_named_styles注册的命名样式.
+
         Args:
             cell: openpyxl单元格对象
             style_name: 样式名称
         """
         try:
-            from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+            font, fill, alignment, border = self._build_openpyxl_style_parts(
+                self.get_style(style_name)
+            )
+            if font is not None:
+                cell.font = font
+            if fill is not None:
+                cell.fill = fill
+            if alignment is not None:
+                cell.alignment = alignment
+            if border is not None:
+                cell.border = border
 
-            style = self.get_style(style_name)
+        except ImportError:
+            self._logger.warning("openpyxl库未安装,跳过样式应用")
+        except Exception as e:
+            self._logger.error(f"应用openpyxl样式失败: {e}")
 
-            # 设置字体
-            if (
-                style.get("font_bold")
-                or style.get("font_size")
-                or style.get("font_color")
-            ):
-                cell.font = Font(
-                    bold=style.get("font_bold", False),
-                    size=style.get("font_size", 10),
-                    color=style.get("font_color", "000000"),
-                )
+    def _build_openpyxl_style_parts(self, style: dict[str, Any]) -> tuple:
+        """根据样式配置创建openpyxl的字体、填充、对齐和边框对象"""
+        from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 
-            # 设置背景色
-            if style.get("bg_color"):
-                cell.fill = PatternFill(
-                    start_color=style["bg_color"],
-                    end_color=style["bg_color"],
-                    fill_type="solid",
-                )
+        font = fill = alignment = border = None
 
-            # 设置对齐
-            if style.get("align"):
-                cell.alignment = Alignment(horizontal=style["align"], vertical="center")
+        if style.get("font_bold") or style.get("font_size") or style.get("font_color"):
+            font = Font(
+                bold=style.get("font_bold", False),
+                size=style.get("font_size", 10),
+                color=style.get("font_color", "000000"),
+            )
 
-            # 设置边框
-            if style.get("border"):
-                cell.border = Border(
-                    left=Side(style="thin"),
-                    right=Side(style="thin"),
-                    top=Side(style="thin"),
-                    bottom=Side(style="thin"),
-                )
+        if style.get("bg_color"):
+            fill = PatternFill(
+                start_color=style["bg_color"],
+                end_color=style["bg_color"],
+                fill_type="solid",
+            )
 
-        except ImportError:
-            self._logger.warning("openpyxl库未安装,跳过样式应用")
-        except Exception as e:
-            self._logger.error(f"应用openpyxl样式失败: {e}")
+        if style.get("align"):
+            alignment = Alignment(horizontal=style["align"], vertical="center")
+
+        if style.get("border"):
+            side = Side(style="thin")
+            border = Border(left=side, right=side, top=side, bottom=side)
+
+        return font, fill, alignment, border
+
+    def register_openpyxl_named_styles(
+        self, workbook, style_names: Iterable[str]
+    ) -> dict[str, str]:
+        """
+        将样式注册为工作簿的命名样式
+
+        每个工作簿中每种样式只创建一次, 单元格通过样式名引用,
+        避免逐个单元格创建字体、边框等对象. 同样适用于只写模式的工作簿.
+
+        Args:
+            workbook: openpyxl工作簿对象
+            style_names: 样式名称
+
+        Returns:
+            Dict[str, str]: 样式名称到已注册命名样式名称的映射
+        """
+        from openpyxl.styles import NamedStyle
+
+        registered = set(workbook.named_styles)
+        names = {}
+        for style_name in style_names:
+            named = f"{NAMED_STYLE_PREFIX}{style_name}"
+            names[style_name] = named
+            if named in registered:
+                continue
+
+            style = self.get_style(style_name)
+            named_style = NamedStyle(name=named)
+            font, fill, alignment, border = self._build_openpyxl_style_parts(style)
+            if font is not None:
+                named_style.font = font
+            if fill is not None:
+                named_style.fill = fill
+            if alignment is not None:
+                named_style.alignment = alignment
+            if border is not None:
+                named_style.border = border
+            if style.get("number_format"):
+                named_style.number_format = style["number_format"]
+
+            workbook.add_named_style(named_style)
+            registered.add(named)
+
+        return names
 
     def create_xlsxwriter_format(self, workbook, style_name: str):
         """
@@ -174,8 +244,88 @@ class ExcelFormatters:
             self._logger.error(f"创建xlsxwriter格式失败: {e}")
             return workbook.add_format({})
 
+    def create_xlsxwriter_formats(
+        self, workbook, style_names: Iterable[str]
+    ) -> dict[str, Any]:
+        """
+        批量创建xlsxwriter格式对象, 每种样式只创建一次
+
+        Args:
+            workbook: xlsxwriter工作簿对象
+            style_names: 样式名称
+
+        Returns:
+            Dict[str, Any]: 样式名称到格式对象的映射
+        """
+        formats = {}
+        for style_name in style_names:
+            if style_name not in formats:
+                formats[style_name] = self.create_xlsxwriter_format(
+                    workbook, style_name
+                )
+        return formats
+
+    @staticmethod
+    def text_display_width(value: Any) -> int:
+        """
+        计算值在单元格中的显示宽度
+
+        中日韩等全角字符按两个字符宽度计算.
+
+        Args:
+            value: 单元格值
+
+        Returns:
+            int: 显示宽度(字符数)
+        """
+        if value is None:
+            return 0
+        text = value if isinstance(value, str) else str(value)
+        if text.isascii():
+            return len(text)
+        return sum(
+            2 if unicodedata.east_asian_width(char) in ("W", "F") else 1
+            for char in text
+        )
+
+    def calculate_column_widths(
+        self,
+        headers: Sequence[Any],
+        sample_rows: Iterable[Sequence[Any]],
+        min_width: int = MIN_COLUMN_WIDTH,
+        max_width: int = MAX_COLUMN_WIDTH,
+    ) -> list[int]:
+        """
+        根据标题和样本行计算列宽
+
+        只检查调用方提供的样本(通常是数据的前若干行), 不扫描整张工作表,
+        因此可以在流式写入数据之前确定列宽.
+
+        Args:
+            headers: 列标题
+            sample_rows: 样本数据行
+            min_width: 最小列宽
+            max_width: 最大列宽
+
+        Returns:
+            List[int]: 每列的宽度
+        """
+        widths = [self.text_display_width(header) for header in headers]
+        for row in sample_rows:
+            for col, value in enumerate(row[: len(widths)]):
+                width = self.text_display_width(value)
+                if width > widths[col]:
+                    widths[col] = width
+
+        # 预留两个字符的边距
+        return [min(max(width + 2, min_width), max_width) for width in widths]
+
     def auto_adjust_column_width(
-        self, worksheet, max_col: int, library: str = "openpyxl"
+        self,
+        worksheet,
+        max_col: int,
+        library: str = "openpyxl",
+        widths: Sequence[float] | None = None,
     ):
         """
         自动调整列宽
@@ -184,16 +334,22 @@ class ExcelFormatters:
             worksheet: 工作表对象
             max_col: 最大列数
             library: 使用的库(openpyxl或xlsxwriter)
+            widths: 每列宽度, 通常由calculate_column_widths根据样本计算;
+                未提供时使用默认宽度
         """
         try:
+            column_widths = [
+                widths[col] if widths and col < len(widths) else 15
+                for col in range(max_col)
+            ]
             if library == "openpyxl":
                 from openpyxl.utils import get_column_letter
 
-                for col in range(1, max_col + 1):
-                    worksheet.column_dimensions[get_column_letter(col)].width = 15
+                for col, width in enumerate(column_widths, 1):
+                    worksheet.column_dimensions[get_column_letter(col)].width = width
             elif library == "xlsxwriter":
-                for col in range(max_col):
-                    worksheet.set_column(col, col, 15)
+                for col, width in enumerate(column_widths):
+                    worksheet.set_column(col, col, width)
 
         except Exception as e:
             self._logger.error(f"自动调整列宽失败: {e}")
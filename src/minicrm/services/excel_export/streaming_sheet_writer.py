@@ -0,0 +1,162 @@
+"""
+流式工作表写入器
+
+将"标题行 + 数据行迭代器"逐行写入工作表, 内存占用与行数无关.
+支持openpyxl只写模式和xlsxwriter常量内存模式.
+
+设计特点:
+- 样式在每个工作簿中只注册一次, 单元格按名称引用
+- 列宽根据数据前若干行的样本计算, 不扫描全部数据
+- 数据只遍历一次, 可以直接使用DAO的游标迭代器
+"""
+
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import chain, islice
+from typing import Any
+
+from .excel_formatters import ExcelFormatters
+
+
+# 计算列宽时采样的行数
+DEFAULT_WIDTH_SAMPLE_SIZE = 200
+
+
+class StreamingSheetWriter:
+    """
+    流式工作表写入器
+
+    由各导出器共享, 负责样式注册、列宽计算和逐行写入.
+    """
+
+    def __init__(
+        self,
+        formatters: ExcelFormatters,
+        sample_size: int = DEFAULT_WIDTH_SAMPLE_SIZE,
+    ):
+        """
+        初始化流式工作表写入器
+
+        Args:
+            formatters: Excel格式化器
+            sample_size: 计算列宽时采样的行数
+        """
+        self._formatters = formatters
+        self._sample_size = sample_size
+
+    def _sample(
+        self, rows: Iterable[Sequence[Any]]
+    ) -> tuple[list[Sequence[Any]], Iterator[Sequence[Any]]]:
+        """读取样本行, 返回样本和包含样本在内的完整行迭代器"""
+        iterator = iter(rows)
+        sample = list(islice(iterator, self._sample_size))
+        return sample, chain(sample, iterator)
+
+    def write_openpyxl(
+        self,
+        worksheet: Any,
+        headers: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        column_styles: Sequence[str],
+        header_style: str = "header",
+    ) -> int:
+        """
+        使用openpyxl写入工作表
+
+        适用于只写模式和普通模式的工作表. 只写模式要求列宽和冻结窗格
+        在写入第一行之前设置, 因此先读取样本行计算列宽.
+
+        Args:
+            worksheet: openpyxl工作表对象
+            headers: 列标题
+            rows: 数据行迭代器, 每行的值与headers一一对应
+            column_styles: 每列的样式名称
+            header_style: 标题行样式名称
+
+        Returns:
+            int: 写入的数据行数
+        """
+        from openpyxl.cell import WriteOnlyCell
+
+        names = self._formatters.register_openpyxl_named_styles(
+            worksheet.parent, [header_style, *column_styles]
+        )
+        header_name = names[header_style]
+        style_names = [names[style] for style in column_styles]
+
+        sample, all_rows = self._sample(rows)
+        widths = self._formatters.calculate_column_widths(headers, sample)
+        self._formatters.auto_adjust_column_width(
+            worksheet, len(headers), widths=widths
+        )
+        self._formatters.freeze_header_row(worksheet)
+
+        worksheet.append(
+            [
+                self._styled_cell(WriteOnlyCell, worksheet, header, header_name)
+                for header in headers
+            ]
+        )
+
+        count = 0
+        for row in all_rows:
+            worksheet.append(
+                [
+                    self._styled_cell(WriteOnlyCell, worksheet, value, style)
+                    for value, style in zip(row, style_names)
+                ]
+            )
+            count += 1
+        return count
+
+    @staticmethod
+    def _styled_cell(cell_class: Any, worksheet: Any, value: Any, style: str) -> Any:
+        """创建引用命名样式的单元格"""
+        cell = cell_class(worksheet, value=value)
+        cell.style = style
+        return cell
+
+    def write_xlsxwriter(
+        self,
+        workbook: Any,
+        worksheet: Any,
+        headers: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        column_styles: Sequence[str],
+        header_style: str = "header",
+    ) -> int:
+        """
+        使用xlsxwriter写入工作表
+
+        按行顺序写入, 可用于constant_memory模式的工作簿.
+
+        Args:
+            workbook: xlsxwriter工作簿对象
+            worksheet: xlsxwriter工作表对象
+            headers: 列标题
+            rows: 数据行迭代器
+            column_styles: 每列的样式名称
+            header_style: 标题行样式名称
+
+        Returns:
+            int: 写入的数据行数
+        """
+        formats = self._formatters.create_xlsxwriter_formats(
+            workbook, [header_style, *column_styles]
+        )
+        column_formats = [formats[style] for style in column_styles]
+
+        sample, all_rows = self._sample(rows)
+        widths = self._formatters.calculate_column_widths(headers, sample)
+        self._formatters.auto_adjust_column_width(
+            worksheet, len(headers), "xlsxwriter", widths
+        )
+        self._formatters.freeze_header_row(worksheet, "xlsxwriter")
+
+        worksheet.write_row(0, 0, headers, formats[header_style])
+
+        count = 0
+        for row_index, row in enumerate(all_rows, 1):
+            for col, (value, cell_format) in enumerate(zip(row, column_formats)):
+                worksheet.write(row_index, col, value, cell_format)
+            count += 1
+        return count
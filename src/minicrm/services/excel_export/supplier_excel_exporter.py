@@ -7,11 +7,46 @@
 
 import csv
 import logging
+from collections.abc import Iterable
 from typing import Any
 
 from minicrm.core.exceptions import ServiceError
 
 from .excel_formatters import ExcelFormatters
+from .streaming_sheet_writer import StreamingSheetWriter
+
+
+# 供应商明细列标题
+SUPPLIER_HEADERS = (
+    "供应商ID",
+    "供应商名称",
+    "联系人",
+    "电话",
+    "邮箱",
+    "地址",
+    "供应商类别",
+    "质量评分",
+    "交付评分",
+    "价格竞争力",
+    "合作年限",
+    "状态",
+)
+
+# 每列样式, 评分列使用数字格式
+SUPPLIER_COLUMN_STYLES = (
+    "data",
+    "data",
+    "data",
+    "data",
+    "data",
+    "data",
+    "data",
+    "number",
+    "number",
+    "data",
+    "data",
+    "data",
+)
 
 
 class SupplierExcelExporter:
@@ -25,9 +60,10 @@ class SupplierExcelExporter:
         """初始化供应商Excel导出器"""
         self._logger = logging.getLogger(__name__)
         self._formatters = ExcelFormatters()
+        self._sheet_writer = StreamingSheetWriter(self._formatters)
 
     def export_supplier_data(
-        self, suppliers: list[dict[str, Any]], output_path: str
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
     ) -> bool:
         """
         导出供应商数据到Excel
@@ -36,6 +72,24 @@ class SupplierExcelExporter:
             suppliers: 供应商数据列表
             output_path: 输出文件路径
 
+        Returns:
+            bool: 导出是否成功
+        """
+        return self.export_supplier_rows(suppliers, output_path)
+
+    def export_supplier_rows(
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """
+        单遍导出供应商明细
+
+        数据只遍历一次, 可以直接传入DAO的流式迭代器.
+        优先使用openpyxl只写模式, 其次是xlsxwriter常量内存模式, 最后为CSV.
+
+        Args:
+            suppliers: 供应商数据迭代器
+            output_path: 输出文件路径
+
         Returns:
             bool: 导出是否成功
         """
@@ -46,10 +100,8 @@ class SupplierExcelExporter:
             try:
                 return self._export_with_openpyxl(suppliers, output_path)
             except ImportError:
-                # 备用方案:CSV格式
-                return self._export_as_csv(
-                    suppliers, output_path.replace(".xlsx", ".csv")
-                )
+                # 备用方案:xlsxwriter或CSV格式
+                return self._export_with_xlsxwriter(suppliers, output_path)
 
         except Exception as e:
             self._logger.error(f"导出供应商数据失败: {e}")
@@ -57,121 +109,92 @@ class SupplierExcelExporter:
                 f"导出供应商数据失败: {e}", "SupplierExcelExporter"
             ) from e
 
+    @staticmethod
+    def _supplier_row(supplier: dict[str, Any]) -> list[Any]:
+        """将供应商记录转换为明细行"""
+        return [
+            supplier.get("id", ""),
+            supplier.get("name", ""),
+            supplier.get("contact_person", ""),
+            supplier.get("phone", ""),
+            supplier.get("email", ""),
+            supplier.get("address", ""),
+            supplier.get("category", ""),
+            f"{supplier.get('quality_score') or 0:.1f}",
+            f"{supplier.get('delivery_score') or 0:.1f}",
+            supplier.get("price_competitive", ""),
+            f"{supplier.get('cooperation_years') or 0}年",
+            supplier.get("status", ""),
+        ]
+
+    def _supplier_rows(self, suppliers: Iterable[dict[str, Any]]) -> Iterable[list]:
+        """逐条转换供应商记录"""
+        return map(self._supplier_row, suppliers)
+
     def _export_with_openpyxl(
-        self, suppliers: list[dict[str, Any]], output_path: str
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
     ) -> bool:
-        """使用openpyxl导出供应商数据"""
+        """使用openpyxl只写模式导出供应商数据"""
+        from openpyxl import Workbook
+
         try:
-            from openpyxl import Workbook
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = "供应商数据"
-
-            # 设置列标题
-            headers = [
-                "供应商ID",
-                "供应商名称",
-                "联系人",
-                "电话",
-                "邮箱",
-                "地址",
-                "供应商类别",
-                "质量评分",
-                "交付评分",
-                "价格竞争力",
-                "合作年限",
-                "状态",
-            ]
-
-            # 写入标题行
-            for col, header in enumerate(headers, 1):
-                cell = ws.cell(row=1, column=col, value=header)
-                # 使用绿色主题区分供应商数据
-                self._formatters.apply_openpyxl_style(cell, "header")
-                # 自定义供应商标题颜色
-                from openpyxl.styles import PatternFill
-
-                cell.fill = PatternFill(
-                    start_color="70AD47", end_color="70AD47", fill_type="solid"
+            wb = Workbook(write_only=True)
+            try:
+                ws = wb.create_sheet("供应商数据")
+                # 使用绿色标题区分供应商数据
+                count = self._sheet_writer.write_openpyxl(
+                    ws,
+                    SUPPLIER_HEADERS,
+                    self._supplier_rows(suppliers),
+                    SUPPLIER_COLUMN_STYLES,
+                    header_style="supplier_header",
                 )
+                wb.save(output_path)
+            finally:
+                wb.close()
 
-            # 写入数据行
-            for row, supplier in enumerate(suppliers, 2):
-                data = [
-                    supplier.get("id", ""),
-                    supplier.get("name", ""),
-                    supplier.get("contact_person", ""),
-                    supplier.get("phone", ""),
-                    supplier.get("email", ""),
-                    supplier.get("address", ""),
-                    supplier.get("category", ""),
-                    f"{supplier.get('quality_score', 0):.1f}",
-                    f"{supplier.get('delivery_score', 0):.1f}",
-                    supplier.get("price_competitive", ""),
-                    f"{supplier.get('cooperation_years', 0)}年",
-                    supplier.get("status", ""),
-                ]
-
-                for col, value in enumerate(data, 1):
-                    cell = ws.cell(row=row, column=col, value=value)
-                    # 数字列使用数字格式
-                    style = "number" if col in [8, 9] else "data"
-                    self._formatters.apply_openpyxl_style(cell, style)
-
-            # 自动调整列宽
-            self._formatters.auto_adjust_column_width(ws, len(headers))
-
-            wb.save(output_path)
-            wb.close()
-
-            self._logger.info(f"导出供应商数据成功: {output_path}")
+            self._logger.info(f"导出供应商数据成功: {output_path}, 共{count}行")
             return True
 
-        except ImportError:
-            raise  # 重新抛出ImportError以便使用备用方案
-        except Exception as e:
-            self._logger.error(f"使用openpyxl导出供应商数据失败: {e}")
+        except (PermissionError, OSError) as e:
+            self._logger.error(f"无法写入文件 {output_path}: {e}")
             return False
 
-    def _export_as_csv(self, suppliers: list[dict[str, Any]], output_path: str) -> bool:
+    def _export_with_xlsxwriter(
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """使用xlsxwriter常量内存模式导出供应商数据(备用方案)"""
+        try:
+            import xlsxwriter
+        except ImportError:
+            return self._export_as_csv(suppliers, output_path.replace(".xlsx", ".csv"))
+
+        workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True})
+        try:
+            worksheet = workbook.add_worksheet("供应商数据")
+            self._sheet_writer.write_xlsxwriter(
+                workbook,
+                worksheet,
+                SUPPLIER_HEADERS,
+                self._supplier_rows(suppliers),
+                SUPPLIER_COLUMN_STYLES,
+                header_style="supplier_header",
+            )
+        finally:
+            workbook.close()
+
+        self._logger.info(f"使用xlsxwriter导出供应商数据成功: {output_path}")
+        return True
+
+    def _export_as_csv(
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
         """导出供应商数据为CSV格式"""
         try:
             with open(output_path, "w", newline="", encoding="utf-8-sig") as csvfile:
-                fieldnames = [
-                    "供应商ID",
-                    "供应商名称",
-                    "联系人",
-                    "电话",
-                    "邮箱",
-                    "地址",
-                    "供应商类别",
-                    "质量评分",
-                    "交付评分",
-                    "价格竞争力",
-                    "合作年限",
-                    "状态",
-                ]
-
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for supplier in suppliers:
-                    row = {
-                        "供应商ID": supplier.get("id", ""),
-                        "供应商名称": supplier.get("name", ""),
-                        "联系人": supplier.get("contact_person", ""),
-                        "电话": supplier.get("phone", ""),
-                        "邮箱": supplier.get("email", ""),
-                        "地址": supplier.get("address", ""),
-                        "供应商类别": supplier.get("category", ""),
-                        "质量评分": f"{supplier.get('quality_score', 0):.1f}",
-                        "交付评分": f"{supplier.get('delivery_score', 0):.1f}",
-                        "价格竞争力": supplier.get("price_competitive", ""),
-                        "合作年限": f"{supplier.get('cooperation_years', 0)}年",
-                        "状态": supplier.get("status", ""),
-                    }
-                    writer.writerow(row)
+                writer = csv.writer(csvfile)
+                writer.writerow(SUPPLIER_HEADERS)
+                writer.writerows(self._supplier_rows(suppliers))
 
             self._logger.info(f"导出供应商数据为CSV成功: {output_path}")
             return True
@@ -15,6 +15,7 @@ MiniCRM Excel导出服务 (向后兼容接口)
 """
 
 import logging
+from collections.abc import Iterable
 from typing import Any
 
 from minicrm.services.excel_export.excel_export_service import (
@@ -59,6 +60,21 @@ class ExcelExportService:
             customers, output_path, include_analysis
         )
 
+    def export_customer_rows(
+        self, customers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """
+        流式导出客户明细到Excel
+
+        Args:
+            customers: 客户数据迭代器(例如CustomerDAO.stream())
+            output_path: 输出文件路径
+
+        Returns:
+            bool: 导出是否成功
+        """
+        return self._service.export_customer_rows(customers, output_path)
+
     def export_supplier_data(
         self, suppliers: list[dict[str, Any]], output_path: str
     ) -> bool:
@@ -74,6 +90,21 @@ class ExcelExportService:
         """
         return self._service.export_supplier_data(suppliers, output_path)
 
+    def export_supplier_rows(
+        self, suppliers: Iterable[dict[str, Any]], output_path: str
+    ) -> bool:
+        """
+        流式导出供应商明细到Excel
+
+        Args:
+            suppliers: 供应商数据迭代器(例如SupplierDAO.stream())
+            output_path: 输出文件路径
+
+        Returns:
+            bool: 导出是否成功
+        """
+        return self._service.export_supplier_rows(suppliers, output_path)
+
     def export_financial_report(
         self, financial_data: dict[str, Any], output_path: str
     ) -> bool:
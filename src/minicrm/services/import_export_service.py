@@ -20,7 +20,14 @@ import os
 from pathlib import Path
 from typing import Any
 
-from minicrm.core.exceptions import ServiceError
+from minicrm.core.exceptions import ServiceError, ValidationError
+from minicrm.services.bulk_import import (
+    DEFAULT_BATCH_SIZE,
+    BulkImportPipeline,
+    ImportCheckpoint,
+    iter_csv_batches,
+    iter_excel_batches,
+)
 from minicrm.services.contract_service import ContractService
 from minicrm.services.customer_service import CustomerService
 from minicrm.services.supplier_service import SupplierService
@@ -237,11 +244,18 @@ class ImportExportService:
         """
         导入数据
 
+        文件按批流式读取, 校验在线程池中进行, 每批在一个事务中写入.
+
         Args:
             file_path: 文件路径
             data_type: 数据类型 (customers, suppliers, contracts)
             field_mapping: 字段映射 {目标字段: 源字段}
             options: 导入选项
+                - batch_size: 每批行数, 默认1000
+                - skip_duplicates: 是否跳过重复客户(名称+电话), 默认True
+                - checkpoint_path: 检查点文件路径, 提供时中断后可续传
+                - progress_callback: 每批写入后调用, 参数为ImportProgress
+                - max_workers: 校验线程数
 
         Returns:
             Tuple[int, int, List[str]]: (成功数量, 失败数量, 错误信息列表)
@@ -256,121 +270,115 @@ class ImportExportService:
             if data_type not in self._data_type_services:
                 raise ServiceError(f"不支持的数据类型: {data_type}")
 
-            # 读取文件数据
+            options = options or {}
+            batch_size = options.get("batch_size", DEFAULT_BATCH_SIZE)
+
+            # 按批读取文件数据
             file_ext = Path(file_path).suffix.lower()
             if file_ext == ".csv":
-                raw_data = self._read_csv_data(file_path)
+                batches = iter_csv_batches(file_path, batch_size)
             elif file_ext == ".xlsx":
-                raw_data = self._read_excel_data(file_path)
+                batches = iter_excel_batches(file_path, batch_size)
             else:
                 raise ServiceError(f"不支持的文件格式: {file_ext}")
 
-            # 映射字段
-            mapped_data = self._map_fields(raw_data, field_mapping)
-
             # 导入数据
-            return self._import_mapped_data(data_type, mapped_data, options or {})
+            return self._import_mapped_data(
+                data_type, batches, field_mapping, file_path, options
+            )
 
         except Exception as e:
             self._logger.error(f"导入数据失败: {e}")
             raise ServiceError(f"导入数据失败: {e}") from e
 
-    def _read_csv_data(self, file_path: str) -> list[dict[str, Any]]:
-        """读取CSV数据"""
-        with open(file_path, encoding="utf-8-sig") as file:
-            sample = file.read(1024)
-            file.seek(0)
-            sniffer = csv.Sniffer()
-            delimiter = sniffer.sniff(sample).delimiter
-
-            reader = csv.DictReader(file, delimiter=delimiter)
-            return list(reader)
-
-    def _read_excel_data(self, file_path: str) -> list[dict[str, Any]]:
-        """读取Excel数据"""
-        import pandas as pd
-
-        df = pd.read_excel(file_path)
-        # 处理NaN值
-        df = df.fillna("")
-        return df.to_dict("records")
-
     def _map_fields(
-        self, raw_data: list[dict[str, Any]], field_mapping: dict[str, str]
-    ) -> list[dict[str, Any]]:
-        """映射字段"""
-        mapped_data = []
-
-        for row in raw_data:
-            mapped_row = {}
-            for target_field, source_field in field_mapping.items():
-                if source_field and source_field in row:
-                    mapped_row[target_field] = row[source_field]
-
-            # 只保留有效数据行
-            if any(mapped_row.values()):
-                mapped_data.append(mapped_row)
-
-        return mapped_data
+        self, row: dict[str, Any], field_mapping: dict[str, str]
+    ) -> dict[str, Any] | None:
+        """映射单行字段, 空行返回None"""
+        mapped_row = {}
+        for target_field, source_field in field_mapping.items():
+            if source_field and source_field in row:
+                value = row[source_field]
+                # Excel单元格可能是数值, 统一按文本校验
+                if value is not None and not isinstance(value, str):
+                    value = str(value)
+                mapped_row[target_field] = value
+
+        # 只保留有效数据行
+        return mapped_row if any(mapped_row.values()) else None
 
     def _import_mapped_data(
-        self, data_type: str, mapped_data: list[dict[str, Any]], options: dict[str, Any]
+        self,
+        data_type: str,
+        batches: Any,
+        field_mapping: dict[str, str],
+        file_path: str,
+        options: dict[str, Any],
     ) -> tuple[int, int, list[str]]:
-        """导入映射后的数据"""
-        service = self._data_type_services[data_type]
-        success_count = 0
-        error_count = 0
-        error_messages = []
-
-        # TODO: 实现重复数据处理和更新逻辑
-        # skip_duplicates = options.get("skip_duplicates", True)
+        """通过批量导入管道导入映射后的数据"""
+        # TODO: 实现更新已有记录的逻辑
         # update_existing = options.get("update_existing", False)
+        checkpoint_path = options.get("checkpoint_path")
+        checkpoint = (
+            ImportCheckpoint(checkpoint_path, file_path) if checkpoint_path else None
+        )
+        detect_duplicates = data_type == "customers" and options.get(
+            "skip_duplicates", True
+        )
+
+        writer: dict[str, Any] = {}
+        if data_type == "customers":
+            writer["write_batch"] = self._customer_service.bulk_create_customers
+        else:
+            writer["write_row"] = lambda record: self._create_record(data_type, record)
+
+        pipeline = BulkImportPipeline(
+            prepare_row=lambda row: self._prepare_row(data_type, row, field_mapping),
+            key_func=self._customer_service.customer_key if detect_duplicates else None,
+            existing_keys=(
+                self._customer_service.get_existing_customer_keys()
+                if detect_duplicates
+                else ()
+            ),
+            max_workers=options.get("max_workers"),
+            progress_callback=options.get("progress_callback"),
+            checkpoint=checkpoint,
+            **writer,
+        )
+        return pipeline.run(batches).as_tuple()
+
+    def _prepare_row(
+        self, data_type: str, row: dict[str, Any], field_mapping: dict[str, str]
+    ) -> dict[str, Any] | None:
+        """映射并验证单行数据, 返回待写入记录"""
+        row_data = self._map_fields(row, field_mapping)
+        if row_data is None:
+            return None
+
+        # 数据验证
+        if data_type == "customers":
+            validation_result = validate_customer_data(row_data)
+        elif data_type == "suppliers":
+            validation_result = validate_supplier_data(row_data)
+        else:
+            # 对于其他类型,进行基本验证
+            validation_result = self._basic_validation(row_data)
 
-        for i, row_data in enumerate(mapped_data):
-            try:
-                # 数据验证
-                if data_type == "customers":
-                    validation_result = validate_customer_data(row_data)
-                elif data_type == "suppliers":
-                    validation_result = validate_supplier_data(row_data)
-                else:
-                    # 对于其他类型,进行基本验证
-                    validation_result = self._basic_validation(row_data)
-
-                if not validation_result.is_valid:
-                    errors_str = ", ".join(validation_result.errors)
-                    error_msg = f"第{i + 1}行数据验证失败: {errors_str}"
-                    error_messages.append(error_msg)
-                    error_count += 1
-                    continue
-
-                # 创建记录
-                record_id: int | None = None
-                if data_type == "customers":
-                    record_id = self._customer_service.create_customer(row_data)
-                elif data_type == "suppliers":
-                    # 检查供应商服务是否有create_supplier方法
-                    if hasattr(self._supplier_service, "create_supplier"):
-                        record_id = self._supplier_service.create_supplier(row_data)
-                    else:
-                        # 使用通用创建方法
-                        record_id = self._create_other_record(service, row_data)
-                else:
-                    # 其他类型的创建逻辑
-                    record_id = self._create_other_record(service, row_data)
-
-                if record_id:
-                    success_count += 1
-                else:
-                    error_count += 1
-                    error_messages.append(f"第{i + 1}行数据创建失败")
-
-            except Exception as e:
-                error_count += 1
-                error_messages.append(f"第{i + 1}行处理失败: {e}")
-
-        self._logger.info(f"数据导入完成: 成功{success_count}条, 失败{error_count}条")
-        return success_count, error_count, error_messages
+        if not validation_result.is_valid:
+            raise ValidationError(", ".join(validation_result.errors))
+
+        if data_type == "customers":
+            return self._customer_service.prepare_customer_record(row_data)
+        return row_data
+
+    def _create_record(self, data_type: str, row_data: dict[str, Any]) -> int | None:
+        """逐条创建没有批量接口的数据类型记录"""
+        service = self._data_type_services[data_type]
+        if data_type == "suppliers" and hasattr(
+            self._supplier_service, "create_supplier"
+        ):
+            return self._supplier_service.create_supplier(row_data)
+        return self._create_other_record(service, row_data)
 
     def _basic_validation(self, data: dict[str, Any]) -> Any:
         """基本数据验证"""
@@ -0,0 +1,175 @@
+"""
+MiniCRM PDF批量渲染引擎
+
+在进程池中并行生成PDF报表:
+- reportlab排版是CPU密集型任务, 多进程才能利用多核
+- 每个工作进程启动时预先注册字体和样式, 之后的报表共享
+- 图表按数据内容缓存在工作进程内
+- 每份报表单独计时, 支持逐份回调进度
+
+进程池不可用时(例如受限环境无法创建子进程)自动退回到当前进程顺序生成.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+import logging
+import os
+import pickle
+import time
+from typing import TYPE_CHECKING, Any
+
+
+if TYPE_CHECKING:
+    from minicrm.services.pdf_document_service import PdfDocumentService
+
+
+_logger = logging.getLogger(__name__)
+
+# 工作进程内共享的PDF文档服务
+_worker_service: PdfDocumentService | None = None
+
+
+@dataclass
+class ReportRenderResult:
+    """单份报表的生成结果"""
+
+    index: int
+    output_path: str
+    report_type: str
+    success: bool
+    elapsed: float
+    error: str | None = None
+
+
+def _get_worker_service() -> PdfDocumentService:
+    """获取当前进程的PDF文档服务, 首次调用时创建并预加载资源"""
+    global _worker_service
+    if _worker_service is None:
+        from minicrm.services.pdf_document_service import PdfDocumentService
+
+        _worker_service = PdfDocumentService()
+        _worker_service.warm_up()
+    return _worker_service
+
+
+def _init_worker() -> None:
+    """进程池工作进程初始化"""
+    _get_worker_service()
+
+
+def _render_report(
+    task: tuple[int, dict[str, Any]], service: PdfDocumentService | None = None
+) -> ReportRenderResult:
+    """生成一份报表, 未指定服务时使用当前进程共享的服务"""
+    index, config = task
+    service = service or _get_worker_service()
+    report_type = config.get("report_type", "generic")
+    output_path = config["output_path"]
+
+    start = time.perf_counter()
+    error = None
+    try:
+        success = service.generate_enhanced_pdf_report(
+            report_type, config.get("data", {}), output_path
+        )
+    except Exception as e:
+        success = False
+        error = str(e)
+
+    return ReportRenderResult(
+        index=index,
+        output_path=output_path,
+        report_type=report_type,
+        success=success,
+        elapsed=time.perf_counter() - start,
+        error=error,
+    )
+
+
+class PdfBatchRenderer:
+    """
+    PDF批量渲染引擎
+
+    将报表配置分发到进程池并行生成, 结果按输入顺序返回.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        service: PdfDocumentService | None = None,
+    ):
+        """
+        初始化批量渲染引擎
+
+        Args:
+            max_workers: 工作进程数, 默认为CPU核数; 为1时在当前进程顺序生成
+            service: 在当前进程生成时使用的PDF文档服务
+        """
+        self._max_workers = max(1, max_workers or os.cpu_count() or 1)
+        self._service = service
+
+    def render(
+        self,
+        report_configs: Sequence[dict[str, Any]],
+        progress_callback: Callable[[ReportRenderResult], None] | None = None,
+    ) -> list[ReportRenderResult]:
+        """
+        批量生成报表
+
+        Args:
+            report_configs: 报表配置列表, 每个配置包含report_type, data, output_path
+            progress_callback: 每份报表完成后的回调
+
+        Returns:
+            List[ReportRenderResult]: 与输入顺序一致的生成结果
+        """
+        tasks = [
+            (i, {**config, "output_path": config.get("output_path", f"report_{i}.pdf")})
+            for i, config in enumerate(report_configs)
+        ]
+        results: dict[int, ReportRenderResult] = {}
+
+        workers = min(self._max_workers, len(tasks))
+        if workers > 1:
+            try:
+                self._render_in_pool(tasks, workers, results, progress_callback)
+            except (BrokenProcessPool, OSError, pickle.PicklingError) as e:
+                _logger.warning(f"进程池不可用, 改为在当前进程中生成剩余报表: {e}")
+
+        for task in tasks:
+            if task[0] not in results:
+                result = _render_report(task, self._service)
+                self._collect(result, results, progress_callback)
+
+        return [results[i] for i in range(len(tasks))]
+
+    def _render_in_pool(
+        self,
+        tasks: list[tuple[int, dict[str, Any]]],
+        workers: int,
+        results: dict[int, ReportRenderResult],
+        progress_callback: Callable[[ReportRenderResult], None] | None,
+    ) -> None:
+        """在进程池中生成报表, 结果写入results"""
+        # 任务分块发送, 减少进程间通信次数
+        chunksize = max(1, len(tasks) // (workers * 4))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker
+        ) as executor:
+            for result in executor.map(_render_report, tasks, chunksize=chunksize):
+                self._collect(result, results, progress_callback)
+
+    @staticmethod
+    def _collect(
+        result: ReportRenderResult,
+        results: dict[int, ReportRenderResult],
+        progress_callback: Callable[[ReportRenderResult], None] | None,
+    ) -> None:
+        """记录单份报表结果并回调"""
+        results[result.index] = result
+        if progress_callback:
+            progress_callback(result)
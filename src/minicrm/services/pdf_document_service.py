@@ -13,9 +13,18 @@ MiniCRM PDF文档生成服务
 - 完整的错误处理和日志记录
 """
 
+from collections.abc import Callable
 import logging
 from typing import Any
 
+from .pdf_batch_renderer import PdfBatchRenderer, ReportRenderResult
+from .pdf_report_resources import (
+    get_chart_cache,
+    get_report_styles,
+    get_sample_styles,
+    warm_up_report_resources,
+)
+
 
 class PdfDocumentService:
     """
@@ -29,6 +38,10 @@ class PdfDocumentService:
         self._logger = logging.getLogger(__name__)
         self._logger.info("PDF文档生成服务初始化完成")
 
+    def warm_up(self) -> None:
+        """预先注册字体和创建报表样式, 批量生成前调用"""
+        warm_up_report_resources()
+
     def convert_word_to_pdf(self, word_file_path: str, pdf_output_path: str) -> bool:
         """
         将Word文档转换为PDF
@@ -149,15 +162,10 @@ class PdfDocumentService:
     ) -> bool:
         """创建增强的客户分析PDF报表 - 优化版本"""
         try:
-            from reportlab.graphics.charts.barcharts import VerticalBarChart
-            from reportlab.graphics.charts.piecharts import Pie
-            from reportlab.graphics.shapes import Drawing
             from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
             from reportlab.lib.units import inch
             from reportlab.platypus import (
-                Image,
                 PageBreak,
                 Paragraph,
                 SimpleDocTemplate,
@@ -179,70 +187,13 @@ class PdfDocumentService:
                 subject="客户数据分析报告",
             )
 
-            # 增强的样式定义
-            styles = getSampleStyleSheet()
-
-            # 主标题样式
-            title_style = ParagraphStyle(
-                "EnhancedTitle",
-                parent=styles["Heading1"],
-                fontSize=24,
-                spaceAfter=30,
-                spaceBefore=20,
-                alignment=1,  # 居中
-                textColor=colors.HexColor("#1f4e79"),
-                fontName="Helvetica-Bold",
-            )
-
-            # 章节标题样式
-            section_style = ParagraphStyle(
-                "SectionHeading",
-                parent=styles["Heading2"],
-                fontSize=16,
-                spaceAfter=15,
-                spaceBefore=20,
-                textColor=colors.HexColor("#2e75b6"),
-                fontName="Helvetica-Bold",
-                borderWidth=1,
-                borderColor=colors.HexColor("#2e75b6"),
-                borderPadding=5,
-                backColor=colors.HexColor("#f2f8ff"),
-            )
-
-            # 子标题样式
-            subsection_style = ParagraphStyle(
-                "SubsectionHeading",
-                parent=styles["Heading3"],
-                fontSize=14,
-                spaceAfter=10,
-                spaceBefore=15,
-                textColor=colors.HexColor("#4472c4"),
-                fontName="Helvetica-Bold",
-            )
-
-            # 正文样式
-            body_style = ParagraphStyle(
-                "EnhancedBody",
-                parent=styles["Normal"],
-                fontSize=11,
-                spaceAfter=8,
-                leading=14,
-                textColor=colors.HexColor("#333333"),
-            )
-
-            # 重点信息样式
-            highlight_style = ParagraphStyle(
-                "Highlight",
-                parent=styles["Normal"],
-                fontSize=12,
-                spaceAfter=10,
-                textColor=colors.HexColor("#d63384"),
-                fontName="Helvetica-Bold",
-                backColor=colors.HexColor("#fff3f3"),
-                borderWidth=1,
-                borderColor=colors.HexColor("#d63384"),
-                borderPadding=8,
-            )
+            # 增强的样式定义(进程内共享)
+            report_styles = get_report_styles()
+            title_style = report_styles["title"]
+            section_style = report_styles["section"]
+            subsection_style = report_styles["subsection"]
+            body_style = report_styles["body"]
+            highlight_style = report_styles["highlight"]
 
             story = []
 
@@ -514,18 +465,7 @@ class PdfDocumentService:
 
             # 页脚信息
             footer_text = f"报表生成时间: {report_date} | MiniCRM客户管理系统 | 第 <seq id='page'/> 页"
-            story.append(
-                Paragraph(
-                    footer_text,
-                    ParagraphStyle(
-                        "Footer",
-                        parent=styles["Normal"],
-                        fontSize=8,
-                        textColor=colors.grey,
-                        alignment=1,
-                    ),
-                )
-            )
+            story.append(Paragraph(footer_text, report_styles["footer"]))
 
             # 构建PDF
             doc.build(story)
@@ -547,7 +487,6 @@ class PdfDocumentService:
         try:
             from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
             from reportlab.lib.units import inch
             from reportlab.platypus import (
                 Paragraph,
@@ -559,16 +498,7 @@ class PdfDocumentService:
 
             # 创建PDF文档
             doc = SimpleDocTemplate(output_path, pagesize=A4)
-            styles = getSampleStyleSheet()
-
-            title_style = ParagraphStyle(
-                "CustomTitle",
-                parent=styles["Heading1"],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=1,
-                textColor=colors.darkblue,
-            )
+            title_style = get_report_styles()["simple_title"]
 
             story = []
 
@@ -618,24 +548,14 @@ class PdfDocumentService:
     ) -> bool:
         """创建分析PDF报表"""
         try:
-            from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
             from reportlab.lib.units import inch
             from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 
             # 创建PDF文档
             doc = SimpleDocTemplate(output_path, pagesize=A4)
-            styles = getSampleStyleSheet()
-
-            title_style = ParagraphStyle(
-                "CustomTitle",
-                parent=styles["Heading1"],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=1,
-                textColor=colors.darkblue,
-            )
+            styles = get_sample_styles()
+            title_style = get_report_styles()["simple_title"]
 
             story = []
 
@@ -660,7 +580,13 @@ class PdfDocumentService:
             return False
 
     def _create_pie_chart(self, data: dict[str, int], title: str):
-        """创建饼图"""
+        """创建饼图, 相同数据的图表在进程内复用"""
+        return get_chart_cache().get_or_create(
+            "pie", title, data, lambda: self._build_pie_chart(data, title)
+        )
+
+    def _build_pie_chart(self, data: dict[str, int], title: str):
+        """构建饼图"""
         try:
             from reportlab.graphics.charts.piecharts import Pie
             from reportlab.graphics.shapes import Drawing
@@ -693,7 +619,14 @@ class PdfDocumentService:
             return None
 
     def _create_trend_chart(self, trend_data: list[dict], title: str):
-        """创建趋势图表"""
+        """创建趋势图表, 按最近6个月的数据在进程内复用"""
+        recent = trend_data[-6:]
+        return get_chart_cache().get_or_create(
+            "trend", title, recent, lambda: self._build_trend_chart(recent, title)
+        )
+
+    def _build_trend_chart(self, trend_data: list[dict], title: str):
+        """构建趋势图表"""
         try:
             from reportlab.graphics.charts.linecharts import HorizontalLineChart
             from reportlab.graphics.shapes import Drawing
@@ -793,45 +726,49 @@ class PdfDocumentService:
         return recommendations
 
     def generate_batch_reports(
-        self, report_configs: list[dict[str, Any]]
+        self,
+        report_configs: list[dict[str, Any]],
+        max_workers: int | None = None,
+        progress_callback: Callable[[ReportRenderResult], None] | None = None,
     ) -> dict[str, bool]:
         """
-        批量生成PDF报表 - 新增功能
+        批量生成PDF报表
+
+        报表在进程池中并行生成, 每个工作进程共享已注册的字体、样式和图表缓存.
 
         Args:
             report_configs: 报表配置列表,每个配置包含report_type, data, output_path
+            max_workers: 工作进程数, 默认为CPU核数, 为1时在当前进程顺序生成
+            progress_callback: 每份报表完成后的回调, 参数包含耗时等信息
 
         Returns:
             Dict[str, bool]: 各报表生成结果
         """
-        results = {}
-
         try:
             self._logger.info(f"开始批量生成{len(report_configs)}个PDF报表")
 
-            for i, config in enumerate(report_configs):
-                report_type = config.get("report_type", "generic")
-                data = config.get("data", {})
-                output_path = config.get("output_path", f"report_{i}.pdf")
+            renderer = PdfBatchRenderer(max_workers, service=self)
+            results = {}
+            total_elapsed = 0.0
+            for result in renderer.render(report_configs, progress_callback):
+                results[result.output_path] = result.success
+                total_elapsed += result.elapsed
 
-                try:
-                    success = self.generate_enhanced_pdf_report(
-                        report_type, data, output_path
+                if result.success:
+                    self._logger.info(
+                        f"报表生成成功: {result.output_path}, 耗时{result.elapsed:.2f}秒"
                     )
-                    results[output_path] = success
-
-                    if success:
-                        self._logger.info(f"报表生成成功: {output_path}")
-                    else:
-                        self._logger.warning(f"报表生成失败: {output_path}")
-
-                except Exception as e:
-                    self._logger.error(f"生成报表{output_path}时出错: {e}")
-                    results[output_path] = False
+                elif result.error:
+                    self._logger.error(
+                        f"生成报表{result.output_path}时出错: {result.error}"
+                    )
+                else:
+                    self._logger.warning(f"报表生成失败: {result.output_path}")
 
             success_count = sum(1 for success in results.values() if success)
             self._logger.info(
-                f"批量报表生成完成: {success_count}/{len(report_configs)} 成功"
+                f"批量报表生成完成: {success_count}/{len(report_configs)} 成功, "
+                f"累计渲染耗时{total_elapsed:.2f}秒"
             )
 
             return results
@@ -845,24 +782,14 @@ class PdfDocumentService:
     ) -> bool:
         """创建通用PDF报表"""
         try:
-            from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4
-            from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
             from reportlab.lib.units import inch
             from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 
             # 创建PDF文档
-            doc = SimpleDocumentTemplate(output_path, pagesize=A4)
-            styles = getSampleStyleSheet()
-
-            title_style = ParagraphStyle(
-                "CustomTitle",
-                parent=styles["Heading1"],
-                fontSize=18,
-                spaceAfter=30,
-                alignment=1,
-                textColor=colors.darkblue,
-            )
+            doc = SimpleDocTemplate(output_path, pagesize=A4)
+            styles = get_sample_styles()
+            title_style = get_report_styles()["simple_title"]
 
             story = []
 
@@ -17,18 +17,16 @@ MiniCRM PDF导出服务
 import logging
 import os
 from datetime import datetime
-from pathlib import Path
 from typing import Any
 
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
-
 from minicrm.core.exceptions import ServiceError
+from minicrm.services.pdf_report_resources import (
+    DEFAULT_FONT_NAME,
+    get_chinese_font_paths,
+    get_reportlab,
+    get_sample_styles,
+    register_chinese_font,
+)
 
 
 class QuotePDFExportService:
@@ -42,6 +40,7 @@ class QuotePDFExportService:
         """初始化PDF导出服务"""
         self._logger = logging.getLogger(__name__)
         self._fonts_registered = False
+        self._font_name: str | None = None
         self._setup_fonts()
 
         # 初始化模板服务
@@ -50,61 +49,19 @@ class QuotePDFExportService:
         self._template_service = QuoteTemplateService()
 
     def _setup_fonts(self) -> None:
-        """设置中文字体"""
-        try:
-            # 尝试注册中文字体
-            font_paths = self._get_chinese_font_paths()
-
-            for font_name, font_path in font_paths.items():
-                if os.path.exists(font_path):
-                    pdfmetrics.registerFont(TTFont(font_name, font_path))
-                    self._fonts_registered = True
-                    self._logger.info(f"成功注册字体: {font_name}")
-                    break
-
-            if not self._fonts_registered:
-                self._logger.warning("未找到中文字体文件,将使用默认字体")
+        """设置中文字体
 
+        字体在进程内只探测和注册一次, 多个服务实例共享.
+        """
+        try:
+            self._font_name = register_chinese_font()
+            self._fonts_registered = self._font_name is not None
         except Exception as e:
             self._logger.error(f"设置字体失败: {e}")
 
     def _get_chinese_font_paths(self) -> dict[str, str]:
         """获取中文字体路径"""
-        import platform
-
-        system = platform.system()
-        font_paths = {}
-
-        if system == "Windows":
-            # Windows系统字体路径
-            windows_fonts = Path("C:/Windows/Fonts")
-            font_paths.update(
-                {
-                    "SimHei": str(windows_fonts / "simhei.ttf"),
-                    "SimSun": str(windows_fonts / "simsun.ttc"),
-                    "Microsoft-YaHei": str(windows_fonts / "msyh.ttc"),
-                }
-            )
-        elif system == "Darwin":  # macOS
-            # macOS系统字体路径
-            macos_fonts = Path("/System/Library/Fonts")
-            font_paths.update(
-                {
-                    "PingFang": str(macos_fonts / "PingFang.ttc"),
-                    "STHeiti": str(macos_fonts / "STHeiti Medium.ttc"),
-                }
-            )
-        else:  # Linux
-            # Linux系统字体路径
-            linux_fonts = Path("/usr/share/fonts")
-            font_paths.update(
-                {
-                    "WenQuanYi": str(linux_fonts / "truetype/wqy/wqy-microhei.ttc"),
-                    "Noto": str(linux_fonts / "truetype/noto/NotoSansCJK-Regular.ttc"),
-                }
-            )
-
-        return font_paths
+        return get_chinese_font_paths()
 
     def export_quote_to_pdf(
         self,
@@ -127,6 +84,8 @@ class QuotePDFExportService:
             ServiceError: 导出失败时抛出
         """
         try:
+            rl = get_reportlab()
+
             self._logger.info(
                 f"开始导出报价单PDF: {quote_data.get('quote_number', 'N/A')}"
             )
@@ -138,13 +97,13 @@ class QuotePDFExportService:
             template_config = self._get_template_config(template_id)
 
             # 创建PDF文档
-            doc = SimpleDocTemplate(
+            doc = rl.SimpleDocTemplate(
                 output_path,
-                pagesize=A4,
-                rightMargin=2 * cm,
-                leftMargin=2 * cm,
-                topMargin=2 * cm,
-                bottomMargin=2 * cm,
+                pagesize=rl.A4,
+                rightMargin=2 * rl.cm,
+                leftMargin=2 * rl.cm,
+                topMargin=2 * rl.cm,
+                bottomMargin=2 * rl.cm,
             )
 
             # 构建PDF内容
@@ -152,27 +111,27 @@ class QuotePDFExportService:
 
             # 添加页眉
             story.extend(self._create_header(quote_data))
-            story.append(Spacer(1, 12))
+            story.append(rl.Spacer(1, 12))
 
             # 添加客户信息
             story.extend(self._create_customer_info(quote_data))
-            story.append(Spacer(1, 12))
+            story.append(rl.Spacer(1, 12))
 
             # 添加报价信息
             story.extend(self._create_quote_info(quote_data))
-            story.append(Spacer(1, 12))
+            story.append(rl.Spacer(1, 12))
 
             # 添加产品清单表格
             story.extend(self._create_items_table(quote_data))
-            story.append(Spacer(1, 12))
+            story.append(rl.Spacer(1, 12))
 
             # 添加汇总信息
             story.extend(self._create_totals_section(quote_data))
-            story.append(Spacer(1, 12))
+            story.append(rl.Spacer(1, 12))
 
             # 添加条款信息
             story.extend(self._create_terms_section(quote_data))
-            story.append(Spacer(1, 12))
+            story.append(rl.Spacer(1, 12))
 
             # 添加页脚信息
             story.extend(self._create_footer_section())
@@ -208,69 +167,55 @@ class QuotePDFExportService:
 
     def _get_font_name(self) -> str:
         """获取可用的中文字体名称"""
-        if self._fonts_registered:
-            # 返回第一个成功注册的字体
-            font_names = [
-                "SimHei",
-                "Microsoft-YaHei",
-                "PingFang",
-                "STHeiti",
-                "WenQuanYi",
-                "Noto",
-            ]
-            for font_name in font_names:
-                try:
-                    # 测试字体是否可用
-                    pdfmetrics.getFont(font_name)
-                    return font_name
-                except:
-                    continue
-
         # 如果没有中文字体,使用默认字体
-        return "Helvetica"
+        return self._font_name or DEFAULT_FONT_NAME
 
     def _create_header(self, quote_data: dict[str, Any]) -> list:
         """创建PDF页眉"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
 
         # 创建样式
-        title_style = ParagraphStyle(
+        title_style = rl.ParagraphStyle(
             "CustomTitle",
-            parent=getSampleStyleSheet()["Heading1"],
+            parent=get_sample_styles()["Heading1"],
             fontName=font_name,
             fontSize=18,
             spaceAfter=12,
             alignment=1,  # 居中对齐
-            textColor=colors.darkblue,
+            textColor=rl.colors.darkblue,
         )
 
-        subtitle_style = ParagraphStyle(
+        subtitle_style = rl.ParagraphStyle(
             "CustomSubtitle",
-            parent=getSampleStyleSheet()["Normal"],
+            parent=get_sample_styles()["Normal"],
             fontName=font_name,
             fontSize=12,
             spaceAfter=6,
             alignment=1,  # 居中对齐
-            textColor=colors.grey,
+            textColor=rl.colors.grey,
         )
 
         # 创建页眉内容
         header_content = []
 
         # 公司名称和标题
-        header_content.append(Paragraph("MiniCRM 板材销售管理系统", title_style))
-        header_content.append(Paragraph("产品报价单", subtitle_style))
+        header_content.append(rl.Paragraph("MiniCRM 板材销售管理系统", title_style))
+        header_content.append(rl.Paragraph("产品报价单", subtitle_style))
 
         return header_content
 
     def _create_customer_info(self, quote_data: dict[str, Any]) -> list:
         """创建客户信息部分"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
 
         # 创建样式
-        info_style = ParagraphStyle(
+        info_style = rl.ParagraphStyle(
             "InfoStyle",
-            parent=getSampleStyleSheet()["Normal"],
+            parent=get_sample_styles()["Normal"],
             fontName=font_name,
             fontSize=10,
             spaceAfter=3,
@@ -287,20 +232,20 @@ class QuotePDFExportService:
         ]
 
         # 创建表格
-        table = Table(customer_info, colWidths=[4 * cm, 8 * cm])
+        table = rl.Table(customer_info, colWidths=[4 * rl.cm, 8 * rl.cm])
         table.setStyle(
-            TableStyle(
+            rl.TableStyle(
                 [
                     ("FONTNAME", (0, 0), (-1, -1), font_name),
                     ("FONTSIZE", (0, 0), (-1, -1), 10),
                     ("SPAN", (0, 0), (1, 0)),  # 合并标题行
-                    ("BACKGROUND", (0, 0), (1, 0), colors.lightgrey),
+                    ("BACKGROUND", (0, 0), (1, 0), rl.colors.lightgrey),
                     ("ALIGN", (0, 0), (-1, -1), "LEFT"),
                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                    ("GRID", (0, 0), (-1, -1), 0.5, rl.colors.black),
                     ("FONTNAME", (0, 0), (1, 0), font_name),
                     ("FONTSIZE", (0, 0), (1, 0), 12),
-                    ("TEXTCOLOR", (0, 0), (1, 0), colors.darkblue),
+                    ("TEXTCOLOR", (0, 0), (1, 0), rl.colors.darkblue),
                 ]
             )
         )
@@ -309,6 +254,8 @@ class QuotePDFExportService:
 
     def _create_quote_info(self, quote_data: dict[str, Any]) -> list:
         """创建报价信息部分"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
 
         # 报价信息数据
@@ -321,20 +268,20 @@ class QuotePDFExportService:
         ]
 
         # 创建表格
-        table = Table(quote_info, colWidths=[4 * cm, 8 * cm])
+        table = rl.Table(quote_info, colWidths=[4 * rl.cm, 8 * rl.cm])
         table.setStyle(
-            TableStyle(
+            rl.TableStyle(
                 [
                     ("FONTNAME", (0, 0), (-1, -1), font_name),
                     ("FONTSIZE", (0, 0), (-1, -1), 10),
                     ("SPAN", (0, 0), (1, 0)),  # 合并标题行
-                    ("BACKGROUND", (0, 0), (1, 0), colors.lightgrey),
+                    ("BACKGROUND", (0, 0), (1, 0), rl.colors.lightgrey),
                     ("ALIGN", (0, 0), (-1, -1), "LEFT"),
                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                    ("GRID", (0, 0), (-1, -1), 0.5, rl.colors.black),
                     ("FONTNAME", (0, 0), (1, 0), font_name),
                     ("FONTSIZE", (0, 0), (1, 0), 12),
-                    ("TEXTCOLOR", (0, 0), (1, 0), colors.darkblue),
+                    ("TEXTCOLOR", (0, 0), (1, 0), rl.colors.darkblue),
                 ]
             )
         )
@@ -343,6 +290,8 @@ class QuotePDFExportService:
 
     def _create_items_table(self, quote_data: dict[str, Any]) -> list:
         """创建产品清单表格"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
         items = quote_data.get("items", [])
 
@@ -363,21 +312,21 @@ class QuotePDFExportService:
             table_data.append(row)
 
         # 创建表格
-        table = Table(
+        table = rl.Table(
             table_data,
-            colWidths=[1 * cm, 4 * cm, 3 * cm, 1.5 * cm, 1.5 * cm, 2 * cm, 2 * cm],
+            colWidths=[w * rl.cm for w in (1, 4, 3, 1.5, 1.5, 2, 2)],
         )
 
         # 设置表格样式
         table.setStyle(
-            TableStyle(
+            rl.TableStyle(
                 [
                     # 字体设置
                     ("FONTNAME", (0, 0), (-1, -1), font_name),
                     ("FONTSIZE", (0, 0), (-1, -1), 9),
                     # 标题行样式
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.darkblue),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.whitesmoke),
+                    ("BACKGROUND", (0, 0), (-1, 0), rl.colors.darkblue),
+                    ("TEXTCOLOR", (0, 0), (-1, 0), rl.colors.whitesmoke),
                     ("FONTSIZE", (0, 0), (-1, 0), 10),
                     ("ALIGN", (0, 0), (-1, 0), "CENTER"),
                     # 数据行样式
@@ -386,13 +335,13 @@ class QuotePDFExportService:
                     ("ALIGN", (3, 1), (-1, -1), "RIGHT"),  # 数量、单价、小计右对齐
                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
                     # 边框
-                    ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+                    ("GRID", (0, 0), (-1, -1), 0.5, rl.colors.black),
                     # 交替行颜色
                     (
                         "ROWBACKGROUNDS",
                         (0, 1),
                         (-1, -1),
-                        [colors.white, colors.lightgrey],
+                        [rl.colors.white, rl.colors.lightgrey],
                     ),
                 ]
             )
@@ -402,6 +351,8 @@ class QuotePDFExportService:
 
     def _create_totals_section(self, quote_data: dict[str, Any]) -> list:
         """创建汇总信息部分"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
 
         # 汇总数据
@@ -416,9 +367,9 @@ class QuotePDFExportService:
         ]
 
         # 创建表格
-        table = Table(totals_data, colWidths=[8 * cm, 3 * cm, 4 * cm])
+        table = rl.Table(totals_data, colWidths=[8 * rl.cm, 3 * rl.cm, 4 * rl.cm])
         table.setStyle(
-            TableStyle(
+            rl.TableStyle(
                 [
                     ("FONTNAME", (0, 0), (-1, -1), font_name),
                     ("FONTSIZE", (0, 0), (-1, -1), 11),
@@ -426,14 +377,14 @@ class QuotePDFExportService:
                     ("ALIGN", (2, 0), (2, -1), "RIGHT"),
                     ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
                     # 总金额行特殊样式
-                    ("BACKGROUND", (1, 2), (2, 2), colors.lightblue),
+                    ("BACKGROUND", (1, 2), (2, 2), rl.colors.lightblue),
                     ("FONTSIZE", (1, 2), (2, 2), 12),
-                    ("TEXTCOLOR", (1, 2), (2, 2), colors.darkblue),
+                    ("TEXTCOLOR", (1, 2), (2, 2), rl.colors.darkblue),
                     # 边框
-                    ("LINEBELOW", (1, 0), (2, 0), 0.5, colors.black),
-                    ("LINEBELOW", (1, 1), (2, 1), 0.5, colors.black),
-                    ("LINEABOVE", (1, 2), (2, 2), 1, colors.darkblue),
-                    ("LINEBELOW", (1, 2), (2, 2), 1, colors.darkblue),
+                    ("LINEBELOW", (1, 0), (2, 0), 0.5, rl.colors.black),
+                    ("LINEBELOW", (1, 1), (2, 1), 0.5, rl.colors.black),
+                    ("LINEABOVE", (1, 2), (2, 2), 1, rl.colors.darkblue),
+                    ("LINEBELOW", (1, 2), (2, 2), 1, rl.colors.darkblue),
                 ]
             )
         )
@@ -442,25 +393,27 @@ class QuotePDFExportService:
 
     def _create_terms_section(self, quote_data: dict[str, Any]) -> list:
         """创建条款信息部分"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
 
         # 创建样式
-        terms_style = ParagraphStyle(
+        terms_style = rl.ParagraphStyle(
             "TermsStyle",
-            parent=getSampleStyleSheet()["Normal"],
+            parent=get_sample_styles()["Normal"],
             fontName=font_name,
             fontSize=10,
             spaceAfter=6,
             leftIndent=12,
         )
 
-        title_style = ParagraphStyle(
+        title_style = rl.ParagraphStyle(
             "TermsTitleStyle",
-            parent=getSampleStyleSheet()["Heading3"],
+            parent=get_sample_styles()["Heading3"],
             fontName=font_name,
             fontSize=12,
             spaceAfter=6,
-            textColor=colors.darkblue,
+            textColor=rl.colors.darkblue,
         )
 
         terms_content = []
@@ -468,40 +421,42 @@ class QuotePDFExportService:
         # 付款条款
         payment_terms = quote_data.get("payment_terms", "")
         if payment_terms:
-            terms_content.append(Paragraph("付款条款:", title_style))
-            terms_content.append(Paragraph(payment_terms, terms_style))
+            terms_content.append(rl.Paragraph("付款条款:", title_style))
+            terms_content.append(rl.Paragraph(payment_terms, terms_style))
 
         # 交付条款
         delivery_terms = quote_data.get("delivery_terms", "")
         if delivery_terms:
-            terms_content.append(Paragraph("交付条款:", title_style))
-            terms_content.append(Paragraph(delivery_terms, terms_style))
+            terms_content.append(rl.Paragraph("交付条款:", title_style))
+            terms_content.append(rl.Paragraph(delivery_terms, terms_style))
 
         # 备注信息
         notes = quote_data.get("notes", "")
         if notes:
-            terms_content.append(Paragraph("备注:", title_style))
-            terms_content.append(Paragraph(notes, terms_style))
+            terms_content.append(rl.Paragraph("备注:", title_style))
+            terms_content.append(rl.Paragraph(notes, terms_style))
 
         return terms_content
 
     def _create_footer_section(self) -> list:
         """创建页脚信息部分"""
+        rl = get_reportlab()
+
         font_name = self._get_font_name()
 
         # 创建样式
-        footer_style = ParagraphStyle(
+        footer_style = rl.ParagraphStyle(
             "FooterStyle",
-            parent=getSampleStyleSheet()["Normal"],
+            parent=get_sample_styles()["Normal"],
             fontName=font_name,
             fontSize=9,
             alignment=1,  # 居中对齐
-            textColor=colors.grey,
+            textColor=rl.colors.grey,
         )
 
-        signature_style = ParagraphStyle(
+        signature_style = rl.ParagraphStyle(
             "SignatureStyle",
-            parent=getSampleStyleSheet()["Normal"],
+            parent=get_sample_styles()["Normal"],
             fontName=font_name,
             fontSize=10,
             spaceAfter=12,
@@ -515,11 +470,11 @@ class QuotePDFExportService:
             ["签名日期:", "_______________", "签名日期:", "_______________"],
         ]
 
-        signature_table = Table(
-            signature_data, colWidths=[2.5 * cm, 3 * cm, 2.5 * cm, 3 * cm]
+        signature_table = rl.Table(
+            signature_data, colWidths=[2.5 * rl.cm, 3 * rl.cm, 2.5 * rl.cm, 3 * rl.cm]
         )
         signature_table.setStyle(
-            TableStyle(
+            rl.TableStyle(
                 [
                     ("FONTNAME", (0, 0), (-1, -1), font_name),
                     ("FONTSIZE", (0, 0), (-1, -1), 10),
@@ -531,11 +486,11 @@ class QuotePDFExportService:
         )
 
         footer_content.append(signature_table)
-        footer_content.append(Spacer(1, 12))
+        footer_content.append(rl.Spacer(1, 12))
 
         # 公司信息
         company_info = f"MiniCRM 板材销售管理系统 | 生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-        footer_content.append(Paragraph(company_info, footer_style))
+        footer_content.append(rl.Paragraph(company_info, footer_style))
 
         return footer_content
 
@@ -0,0 +1,315 @@
+"""
+MiniCRM PDF报表共享资源
+
+在进程内缓存PDF生成所需的资源,包括:
+- 中文字体只探测和注册一次
+- 段落样式只创建一次
+- 图表按数据内容缓存,相同数据直接复用
+
+批量生成报表时每个工作进程各自持有一份,初始化后所有报表共享.
+"""
+
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import lru_cache
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import platform
+import threading
+from types import SimpleNamespace
+from typing import Any
+
+
+_logger = logging.getLogger(__name__)
+
+# 未找到中文字体时使用的字体
+DEFAULT_FONT_NAME = "Helvetica"
+
+
+def get_chinese_font_paths() -> dict[str, str]:
+    """获取当前系统的中文字体路径"""
+    system = platform.system()
+    font_paths = {}
+
+    if system == "Windows":
+        # Windows系统字体路径
+        windows_fonts = Path("C:/Windows/Fonts")
+        font_paths.update(
+            {
+                "SimHei": str(windows_fonts / "simhei.ttf"),
+                "SimSun": str(windows_fonts / "simsun.ttc"),
+                "Microsoft-YaHei": str(windows_fonts / "msyh.ttc"),
+            }
+        )
+    elif system == "Darwin":  # macOS
+        # macOS系统字体路径
+        macos_fonts = Path("/System/Library/Fonts")
+        font_paths.update(
+            {
+                "PingFang": str(macos_fonts / "PingFang.ttc"),
+                "STHeiti": str(macos_fonts / "STHeiti Medium.ttc"),
+            }
+        )
+    else:  # Linux
+        # Linux系统字体路径
+        linux_fonts = Path("/usr/share/fonts")
+        font_paths.update(
+            {
+                "WenQuanYi": str(linux_fonts / "truetype/wqy/wqy-microhei.ttc"),
+                "Noto": str(linux_fonts / "truetype/noto/NotoSansCJK-Regular.ttc"),
+            }
+        )
+
+    return font_paths
+
+
+@lru_cache(maxsize=1)
+def register_chinese_font() -> str | None:
+    """
+    探测并注册中文字体,每个进程只执行一次
+
+    Returns:
+        str | None: 注册成功的字体名称,没有可用字体时返回None
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    for font_name, font_path in get_chinese_font_paths().items():
+        if not os.path.exists(font_path):
+            continue
+        try:
+            pdfmetrics.registerFont(TTFont(font_name, font_path))
+            _logger.info(f"成功注册字体: {font_name}")
+            return font_name
+        except Exception as e:
+            _logger.warning(f"注册字体{font_name}失败: {e}")
+
+    _logger.warning("未找到中文字体文件,将使用默认字体")
+    return None
+
+
+@lru_cache(maxsize=1)
+def get_sample_styles() -> Any:
+    """获取reportlab示例样式表,每个进程只创建一次"""
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    return getSampleStyleSheet()
+
+
+@lru_cache(maxsize=1)
+def get_reportlab() -> SimpleNamespace:
+    """
+    获取报价单PDF使用的reportlab名称,首次调用时才导入reportlab
+
+    Returns:
+        SimpleNamespace: 包含colors、cm、A4和常用platypus组件
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import (
+        Paragraph,
+        SimpleDocTemplate,
+        Spacer,
+        Table,
+        TableStyle,
+    )
+
+    return SimpleNamespace(
+        colors=colors,
+        cm=cm,
+        A4=A4,
+        ParagraphStyle=ParagraphStyle,
+        Paragraph=Paragraph,
+        SimpleDocTemplate=SimpleDocTemplate,
+        Spacer=Spacer,
+        Table=Table,
+        TableStyle=TableStyle,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_report_styles() -> dict[str, Any]:
+    """
+    获取增强报表使用的段落样式,每个进程只创建一次
+
+    Returns:
+        Dict[str, Any]: 样式名称到ParagraphStyle的映射
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import ParagraphStyle
+
+    styles = get_sample_styles()
+
+    return {
+        # 主标题样式
+        "title": ParagraphStyle(
+            "EnhancedTitle",
+            parent=styles["Heading1"],
+            fontSize=24,
+            spaceAfter=30,
+            spaceBefore=20,
+            alignment=1,  # 居中
+            textColor=colors.HexColor("#1f4e79"),
+            fontName="Helvetica-Bold",
+        ),
+        # 章节标题样式
+        "section": ParagraphStyle(
+            "SectionHeading",
+            parent=styles["Heading2"],
+            fontSize=16,
+            spaceAfter=15,
+            spaceBefore=20,
+            textColor=colors.HexColor("#2e75b6"),
+            fontName="Helvetica-Bold",
+            borderWidth=1,
+            borderColor=colors.HexColor("#2e75b6"),
+            borderPadding=5,
+            backColor=colors.HexColor("#f2f8ff"),
+        ),
+        # 子标题样式
+        "subsection": ParagraphStyle(
+            "SubsectionHeading",
+            parent=styles["Heading3"],
+            fontSize=14,
+            spaceAfter=10,
+            spaceBefore=15,
+            textColor=colors.HexColor("#4472c4"),
+            fontName="Helvetica-Bold",
+        ),
+        # 正文样式
+        "body": ParagraphStyle(
+            "EnhancedBody",
+            parent=styles["Normal"],
+            fontSize=11,
+            spaceAfter=8,
+            leading=14,
+            textColor=colors.HexColor("#333333"),
+        ),
+        # 重点信息样式
+        "highlight": ParagraphStyle(
+            "Highlight",
+            parent=styles["Normal"],
+            fontSize=12,
+            spaceAfter=10,
+            textColor=colors.HexColor("#d63384"),
+            fontName="Helvetica-Bold",
+            backColor=colors.HexColor("#fff3f3"),
+            borderWidth=1,
+            borderColor=colors.HexColor("#d63384"),
+            borderPadding=8,
+        ),
+        # 页脚样式
+        "footer": ParagraphStyle(
+            "Footer",
+            parent=styles["Normal"],
+            fontSize=8,
+            textColor=colors.grey,
+            alignment=1,
+        ),
+        # 简单报表标题样式
+        "simple_title": ParagraphStyle(
+            "CustomTitle",
+            parent=styles["Heading1"],
+            fontSize=18,
+            spaceAfter=30,
+            alignment=1,
+            textColor=colors.darkblue,
+        ),
+    }
+
+
+class ChartCache:
+    """
+    图表缓存
+
+    按图表类型、标题和数据内容的哈希缓存图表对象,
+    批量生成报表时相同数据的图表只创建一次.
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        初始化图表缓存
+
+        Args:
+            max_size: 最多缓存的图表数量,超出时淘汰最久未使用的图表
+        """
+        self._max_size = max_size
+        self._charts: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(kind: str, title: str, data: Any) -> str:
+        """根据图表类型、标题和数据计算缓存键"""
+        payload = json.dumps(
+            [kind, title, data], sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+    def get_or_create(
+        self, kind: str, title: str, data: Any, factory: Callable[[], Any]
+    ) -> Any:
+        """
+        获取缓存的图表,不存在时调用factory创建
+
+        factory返回None(创建失败)时不缓存.
+
+        Args:
+            kind: 图表类型
+            title: 图表标题
+            data: 图表数据
+            factory: 创建图表的函数
+
+        Returns:
+            Any: 图表对象
+        """
+        key = self.make_key(kind, title, data)
+        with self._lock:
+            chart = self._charts.get(key)
+            if chart is not None:
+                self._charts.move_to_end(key)
+                self.hits += 1
+                return chart
+            self.misses += 1
+
+        chart = factory()
+        if chart is not None:
+            with self._lock:
+                self._charts[key] = chart
+                self._charts.move_to_end(key)
+                while len(self._charts) > self._max_size:
+                    self._charts.popitem(last=False)
+        return chart
+
+    def clear(self) -> None:
+        """清空缓存"""
+        with self._lock:
+            self._charts.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._charts)
+
+
+_chart_cache = ChartCache()
+
+
+def get_chart_cache() -> ChartCache:
+    """获取进程内共享的图表缓存"""
+    return _chart_cache
+
+
+def warm_up_report_resources() -> None:
+    """预先注册字体并创建样式,供批量生成的工作进程初始化时调用"""
+    try:
+        register_chinese_font()
+        get_report_styles()
+    except ImportError:
+        _logger.warning("reportlab库未安装,跳过PDF资源预加载")
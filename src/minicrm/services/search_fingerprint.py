@@ -0,0 +1,281 @@
+"""
+MiniCRM 搜索条件指纹
+
+为高级搜索的结果缓存提供规范化的查询指纹:
+- 条件值规范化(模糊匹配补全通配符、IN列表排序), 写法不同但语义相同的条件指纹相同
+- 全部以AND连接的条件与顺序无关, 按集合比较; 含OR的条件按顺序比较
+- 判断一个查询是否只是在另一个查询上增加了AND条件, 以便用已缓存的结果集在内存中筛选
+
+内存筛选和排序遵循SQLite的比较规则: NULL不满足任何比较, 升序时排在最前;
+LIKE只对ASCII字母忽略大小写. 遇到无法确定与SQLite一致的情况时抛出
+RowNotEvaluableError, 由调用方改为查询数据库.
+"""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import hashlib
+import json
+import re
+from typing import Any
+
+
+# 在内存中可以计算的比较操作符
+_COMPARISONS = {
+    "=": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+}
+
+# 只转换ASCII大写字母, 与SQLite的LIKE一致
+_ASCII_LOWER = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+
+class RowNotEvaluableError(Exception):
+    """条件无法在内存中按SQLite规则计算"""
+
+
+@dataclass(frozen=True)
+class NormalizedCondition:
+    """规范化后的查询条件"""
+
+    field: str
+    operator: str
+    value: Any
+    logic: str
+
+    def canonical(self) -> list[Any]:
+        """返回可JSON序列化的规范形式"""
+        value = list(self.value) if isinstance(self.value, tuple) else self.value
+        return [self.field, self.operator, value, self.logic]
+
+
+@dataclass(frozen=True)
+class QueryFingerprint:
+    """
+    查询指纹
+
+    conditions在全部条件以AND连接时为frozenset, 否则为保持顺序的tuple.
+    """
+
+    entity_type: str
+    conditions: frozenset[NormalizedCondition] | tuple[NormalizedCondition, ...]
+
+    @property
+    def conjunctive(self) -> bool:
+        """是否全部条件以AND连接"""
+        return isinstance(self.conditions, frozenset)
+
+    @property
+    def key(self) -> str:
+        """指纹的字符串形式"""
+        canonical = [condition.canonical() for condition in self.conditions]
+        if self.conjunctive:
+            canonical.sort(key=lambda item: json.dumps(item, default=str))
+        payload = json.dumps(
+            [self.entity_type, self.conjunctive, canonical],
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.md5(payload.encode()).hexdigest()
+
+    def narrows(self, other: "QueryFingerprint") -> bool:
+        """
+        判断本查询的结果是否一定包含在另一个查询的结果中
+
+        Args:
+            other: 可能作为超集的查询
+
+        Returns:
+            bool: 两者都只含AND条件且other的条件是本查询条件的子集(含相等)
+        """
+        return (
+            self.entity_type == other.entity_type
+            and self.conjunctive
+            and other.conjunctive
+            and other.conditions <= self.conditions
+        )
+
+
+def fingerprint_conditions(
+    entity_type: str, conditions: Iterable[Any], field_types: dict[str, str]
+) -> QueryFingerprint:
+    """
+    生成查询指纹
+
+    Args:
+        entity_type: 实体类型
+        conditions: 查询条件, 需有field、operator、value和logic属性
+        field_types: 字段 -> 字段类型(text, number, date, boolean, select)
+
+    Returns:
+        QueryFingerprint: 查询指纹
+    """
+    normalized = []
+    for index, condition in enumerate(conditions):
+        value = condition.value
+        field_type = field_types.get(condition.field)
+        if (
+            field_type == "text"
+            and condition.operator in ("LIKE", "NOT LIKE")
+            and isinstance(value, str)
+            and not value.startswith("%")
+            and not value.endswith("%")
+        ):
+            # 与查询构建时的模糊匹配补全保持一致
+            value = f"%{value}%"
+        elif condition.operator in ("IN", "NOT IN") and isinstance(value, list | tuple):
+            value = tuple(sorted(set(value), key=repr))
+        elif isinstance(value, list):
+            value = tuple(value)
+        # 第一个条件的逻辑操作符不影响查询
+        logic = "AND" if index == 0 else condition.logic
+        normalized.append(
+            NormalizedCondition(condition.field, condition.operator, value, logic)
+        )
+
+    if all(condition.logic == "AND" for condition in normalized):
+        return QueryFingerprint(entity_type, frozenset(normalized))
+    return QueryFingerprint(entity_type, tuple(normalized))
+
+
+def filter_rows(
+    rows: list[dict[str, Any]], conditions: Iterable[NormalizedCondition]
+) -> list[dict[str, Any]]:
+    """
+    在内存中按AND条件筛选记录
+
+    Args:
+        rows: 记录列表
+        conditions: 规范化后的条件, 字段名即记录中的键
+
+    Returns:
+        List[Dict[str, Any]]: 满足全部条件的记录
+
+    Raises:
+        RowNotEvaluableError: 某个条件无法按SQLite规则计算
+    """
+    conditions = list(conditions)
+    for condition in conditions:
+        if not rows:
+            break
+        rows = [row for row in rows if _matches(row, condition)]
+    return rows
+
+
+def sort_key(value: Any) -> tuple[int, Any]:
+    """按SQLite的类型顺序生成排序键: NULL < 数值 < 文本 < BLOB"""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool | int | float):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    if isinstance(value, bytes):
+        return (3, value)
+    raise RowNotEvaluableError(f"无法比较的值: {value!r}")
+
+
+def sort_rows(
+    rows: list[dict[str, Any]], column: str, direction: str
+) -> list[dict[str, Any]]:
+    """
+    按(排序字段, id)排序, 与键集分页的SQL排序一致
+
+    Args:
+        rows: 记录列表
+        column: 排序字段
+        direction: ASC或DESC
+
+    Returns:
+        List[Dict[str, Any]]: 排序后的记录
+    """
+    return sorted(
+        rows,
+        key=lambda row: (sort_key(row.get(column)), sort_key(row.get("id"))),
+        reverse=direction == "DESC",
+    )
+
+
+def rows_after(
+    rows: list[dict[str, Any]],
+    column: str,
+    direction: str,
+    after: tuple[Any, Any],
+) -> list[dict[str, Any]]:
+    """
+    返回已排序记录中排在after之后的部分
+
+    Args:
+        rows: 按sort_rows排序的记录
+        column: 排序字段
+        direction: ASC或DESC
+        after: 上一页最后一条记录的(排序值, id)
+
+    Returns:
+        List[Dict[str, Any]]: after之后的记录
+    """
+    boundary = (sort_key(after[0]), sort_key(after[1]))
+    for index, row in enumerate(rows):
+        key = (sort_key(row.get(column)), sort_key(row.get("id")))
+        if (key > boundary) if direction == "ASC" else (key < boundary):
+            return rows[index:]
+    return []
+
+
+def _matches(row: dict[str, Any], condition: NormalizedCondition) -> bool:
+    """计算单个条件"""
+    if condition.field not in row:
+        raise RowNotEvaluableError(f"记录中没有字段: {condition.field}")
+    actual = row[condition.field]
+    operator = condition.operator
+    expected = condition.value
+
+    if operator == "IS NULL":
+        return actual is None
+    if operator == "IS NOT NULL":
+        return actual is not None
+    if actual is None:
+        return False
+
+    if operator in ("LIKE", "NOT LIKE"):
+        if not isinstance(actual, str) or not isinstance(expected, str):
+            raise RowNotEvaluableError("LIKE只支持文本")
+        matched = _like_pattern(expected).fullmatch(actual.translate(_ASCII_LOWER))
+        return (matched is not None) == (operator == "LIKE")
+    if operator in ("IN", "NOT IN"):
+        found = any(_compare("=", actual, item) for item in expected)
+        return found == (operator == "IN")
+    if operator == "BETWEEN":
+        low, high = expected
+        return _compare(">=", actual, low) and _compare("<=", actual, high)
+    if operator in _COMPARISONS:
+        return _compare(operator, actual, expected)
+    raise RowNotEvaluableError(f"不支持的操作符: {operator}")
+
+
+def _compare(operator: str, actual: Any, expected: Any) -> bool:
+    """比较两个非NULL值, 类型不同时无法保证与SQLite的类型亲和规则一致"""
+    if expected is None:
+        return False
+    numeric = (bool, int, float)
+    if isinstance(actual, numeric) != isinstance(expected, numeric) or (
+        not isinstance(actual, numeric) and type(actual) is not type(expected)
+    ):
+        raise RowNotEvaluableError(f"类型不同: {actual!r} {operator} {expected!r}")
+    return _COMPARISONS[operator](actual, expected)
+
+
+def _like_pattern(pattern: str) -> re.Pattern:
+    """将LIKE模式转换为正则表达式"""
+    parts = []
+    for char in pattern.translate(_ASCII_LOWER):
+        if char == "%":
+            parts.append(".*")
+        elif char == "_":
+            parts.append(".")
+        else:
+            parts.append(re.escape(char))
+    return re.compile("".join(parts), re.DOTALL)
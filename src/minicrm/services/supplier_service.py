@@ -11,6 +11,7 @@ MiniCRM 供应商管理服务协调器
 保持向后兼容性，同时实现模块化架构。
 """
 
+from collections.abc import Iterator
 from typing import Any
 
 from minicrm.data.dao.supplier_dao import SupplierDAO
@@ -64,6 +65,11 @@ class SupplierService(BaseService):
         """获取服务名称"""
         return "SupplierService"
 
+    @property
+    def supplier_dao(self) -> SupplierDAO:
+        """供应商数据访问对象，供表格分页数据源在数据库中筛选、排序和分页"""
+        return self._supplier_dao
+
     # ==================== 核心CRUD操作 ====================
     # 委托给SupplierCoreService
 
@@ -89,6 +95,12 @@ class SupplierService(BaseService):
         """搜索供应商"""
         return self.core.search_suppliers(query, filters, page, page_size)
 
+    def iter_suppliers(
+        self, filters: dict[str, Any] | None = None, batch_size: int = 500
+    ) -> Iterator[dict[str, Any]]:
+        """流式遍历供应商，用于导出等全量处理场景"""
+        return self._supplier_dao.stream(filters, batch_size=batch_size)
+
     # ==================== 质量评估功能 ====================
     # 委托给SupplierQualityService
 
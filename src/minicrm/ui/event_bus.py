@@ -6,6 +6,7 @@
 - 异步事件处理
 - 事件历史记录
 - 事件优先级管理
+- 重复刷新事件合并
 
 设计原则:
 - 松耦合:组件间通过事件通信,不直接依赖
@@ -19,10 +20,14 @@ from collections.abc import Callable
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from enum import Enum
+import heapq
+import itertools
 import logging
 import threading
 import time
-from typing import Any, Callable, Optional
+from typing import Any
+
+from minicrm.core.exceptions import UIError
 
 
 class BaseObject:
@@ -49,48 +54,6 @@ class Signal:
                 print(f"Signal callback error: {e}")
 
 
-class Timer:
-    """定时器类 - 替代QTimer"""
-
-    def __init__(self):
-        self._timer: Optional[threading.Timer] = None
-        self._interval = 1000  # 毫秒
-        self._callback: Optional[Callable] = None
-        self._running = False
-
-    def timeout_connect(self, callback: Callable) -> None:
-        """连接超时回调"""
-        self._callback = callback
-
-    def start(self, interval: int) -> None:
-        """启动定时器"""
-        self._interval = interval / 1000.0  # 转换为秒
-        self._running = True
-        self._schedule_next()
-
-    def stop(self) -> None:
-        """停止定时器"""
-        self._running = False
-        if self._timer:
-            self._timer.cancel()
-
-    def _schedule_next(self) -> None:
-        """调度下一次执行"""
-        if self._running and self._callback:
-            self._timer = threading.Timer(self._interval, self._execute)
-            self._timer.start()
-
-    def _execute(self) -> None:
-        """执行回调"""
-        if self._callback:
-            self._callback()
-        if self._running:
-            self._schedule_next()
-
-
-from minicrm.core.exceptions import UIError
-
-
 class EventPriority(Enum):
     """事件优先级"""
 
@@ -184,6 +147,20 @@ class EventSubscription:
             self.subscription_id = f"sub_{id(self.callback)}"
 
 
+# 每次从队列中取出的事件数量范围(根据积压和耗时自适应调整)
+MIN_DRAIN_BATCH = 16
+MAX_DRAIN_BATCH = 1024
+
+# 绑定Tk后每次调度的处理时间预算(秒), 避免长时间阻塞界面
+TK_DRAIN_TIME_BUDGET = 0.008
+
+# 绑定Tk后队列为空时的轮询间隔(毫秒)
+TK_IDLE_INTERVAL = 50
+
+# 默认合并的事件类型后缀: 尚未处理的同类刷新事件只保留最新一个
+COALESCED_EVENT_SUFFIXES = (".refresh",)
+
+
 class EventBus(BaseObject):
     """全局事件总线
 
@@ -211,8 +188,9 @@ class EventBus(BaseObject):
         Args:
             parent: 父对象
         """
-        super().__init__(parent)
+        super().__init__()
 
+        self._parent = parent
         self._logger = logging.getLogger(__name__)
 
         # 事件订阅者
@@ -221,8 +199,22 @@ class EventBus(BaseObject):
         # 全局订阅者(监听所有事件)
         self._global_subscribers: list[EventSubscription] = []
 
-        # 事件队列(按优先级排序)
-        self._event_queue: deque = deque()
+        # 每个事件类型的订阅者元组(含全局订阅者), 订阅变化时失效
+        self._dispatch_cache: dict[str, tuple[EventSubscription, ...]] = {}
+
+        # 事件队列: 最小堆, 元素为(-优先级, 序号, 事件, 合并键)
+        self._event_queue: list[tuple[int, int, Event, tuple | None]] = []
+        self._sequence = itertools.count()
+
+        # 待处理的可合并事件, 合并键为(类型, 来源, 目标)
+        self._coalesced_events: dict[tuple, Event] = {}
+        self._coalesced_types: set[str] = set()
+
+        # 队列中待处理的事件数量(不含已被合并的重复事件)
+        self._pending_count = 0
+
+        # 每次取出的事件数量, 根据积压情况自适应调整
+        self._drain_batch = MIN_DRAIN_BATCH
 
         # 事件历史记录
         self._event_history: deque = deque(maxlen=10000)
@@ -237,13 +229,18 @@ class EventBus(BaseObject):
             lambda: {"count": 0, "total_time": 0.0, "avg_time": 0.0, "errors": 0}
         )
 
-        # 线程锁
+        # 线程锁, 队列有新事件时通过条件变量唤醒分发线程
         self._lock = threading.RLock()
+        self._queue_condition = threading.Condition(self._lock)
 
-        # 事件处理定时器
-        self._processing_timer = Timer()
-        self._processing_timer.timeout_connect(self._process_event_queue)
-        self._processing_timer.start(10)  # 每10ms处理一次事件队列
+        # 分发器: 默认使用一个常驻后台线程, 绑定Tk后改为在主线程的after循环中分发
+        self._running = True
+        self._tk_root: Any = None
+        self._tk_after_id: str | None = None
+        self._tk_idle_interval = TK_IDLE_INTERVAL
+        self._tk_time_budget = TK_DRAIN_TIME_BUDGET
+        self._dispatcher_thread: threading.Thread | None = None
+        self._start_dispatcher_thread()
 
         # 是否启用事件历史记录
         self._enable_history = True
@@ -262,6 +259,7 @@ class EventBus(BaseObject):
         priority: EventPriority = EventPriority.NORMAL,
         metadata: dict[str, Any] | None = None,
         sync: bool = False,
+        coalesce: bool | None = None,
     ) -> str:
         """发布事件
 
@@ -273,6 +271,8 @@ class EventBus(BaseObject):
             priority: 事件优先级
             metadata: 事件元数据
             sync: 是否同步处理
+            coalesce: 是否与队列中尚未处理的同类事件合并(只保留最新的事件),
+                None表示按事件类型决定, 见add_coalesced_event_type
 
         Returns:
             str: 事件ID
@@ -300,8 +300,11 @@ class EventBus(BaseObject):
                 self._process_event(event)
             else:
                 # 添加到队列异步处理
-                with self._lock:
-                    self._add_to_queue(event)
+                if coalesce is None:
+                    coalesce = self._is_coalesced_type(event_type)
+                with self._queue_condition:
+                    self._add_to_queue(event, coalesce)
+                    self._queue_condition.notify()
 
             self._logger.debug(f"事件发布: {event_type} (ID: {event.event_id})")
             return event.event_id
@@ -340,6 +343,7 @@ class EventBus(BaseObject):
 
             with self._lock:
                 self._subscribers[event_type].append(subscription)
+                self._dispatch_cache.pop(event_type, None)
 
             self._logger.debug(
                 f"订阅事件: {event_type} (ID: {subscription.subscription_id})"
@@ -378,6 +382,7 @@ class EventBus(BaseObject):
 
             with self._lock:
                 self._global_subscribers.append(subscription)
+                self._dispatch_cache.clear()
 
             self._logger.debug(f"订阅全局事件 (ID: {subscription.subscription_id})")
             return subscription.subscription_id
@@ -402,6 +407,7 @@ class EventBus(BaseObject):
                     for i, subscription in enumerate(subscriptions):
                         if subscription.subscription_id == subscription_id:
                             del subscriptions[i]
+                            self._dispatch_cache.pop(event_type, None)
                             self._logger.debug(
                                 f"取消事件订阅: {event_type} (ID: {subscription_id})"
                             )
@@ -411,6 +417,7 @@ class EventBus(BaseObject):
                 for i, subscription in enumerate(self._global_subscribers):
                     if subscription.subscription_id == subscription_id:
                         del self._global_subscribers[i]
+                        self._dispatch_cache.clear()
                         self._logger.debug(f"取消全局事件订阅 (ID: {subscription_id})")
                         return True
 
@@ -447,6 +454,8 @@ class EventBus(BaseObject):
                     count += len(self._global_subscribers)
                     self._global_subscribers.clear()
 
+                self._dispatch_cache.clear()
+
             self._logger.debug(f"取消订阅数量: {count}")
             return count
 
@@ -454,56 +463,231 @@ class EventBus(BaseObject):
             self._logger.error(f"取消所有订阅失败: {e}")
             return 0
 
-    def _add_to_queue(self, event: Event) -> None:
-        """添加事件到队列(按优先级排序)"""
-        # 简单的优先级队列实现
-        inserted = False
-        for i, queued_event in enumerate(self._event_queue):
-            if event.priority.value > queued_event.priority.value:
-                self._event_queue.insert(i, event)
-                inserted = True
+    def add_coalesced_event_type(self, event_type: str) -> None:
+        """将事件类型设置为默认合并
+
+        队列中已有尚未处理的同类事件(类型、来源和目标相同)时,
+        新事件替换旧事件的内容而不是再次入队, 适用于刷新类事件.
+
+        Args:
+            event_type: 事件类型
+        """
+        with self._lock:
+            self._coalesced_types.add(event_type)
+
+    def _is_coalesced_type(self, event_type: str) -> bool:
+        """判断事件类型是否默认合并"""
+        return event_type in self._coalesced_types or event_type.endswith(
+            COALESCED_EVENT_SUFFIXES
+        )
+
+    def _add_to_queue(self, event: Event, coalesce: bool = False) -> None:
+        """添加事件到队列(按优先级排序, 同优先级先进先出)
+
+        调用方需持有锁.
+        """
+        key = None
+        if coalesce:
+            key = (event.type, event.source, event.target)
+            pending = self._coalesced_events.get(key)
+            self._coalesced_events[key] = event
+            if pending is not None:
+                if event.priority.value <= pending.priority.value:
+                    # 沿用已排队的位置, 出队时取最新的事件
+                    return
+                # 优先级提高时重新入队, 旧位置出队时会被跳过
+                heapq.heappush(
+                    self._event_queue,
+                    (-event.priority.value, next(self._sequence), event, key),
+                )
+                return
+
+        heapq.heappush(
+            self._event_queue, (-event.priority.value, next(self._sequence), event, key)
+        )
+        self._pending_count += 1
+
+    def _pop_events(self, limit: int) -> list[Event]:
+        """从队列中取出最多limit个事件
+
+        调用方需持有锁.
+        """
+        events = []
+        while self._event_queue and len(events) < limit:
+            _, _, event, key = heapq.heappop(self._event_queue)
+            if key is not None:
+                event = self._coalesced_events.pop(key, None)
+                if event is None:
+                    # 已随更高优先级的重复事件一起处理
+                    continue
+            self._pending_count -= 1
+            events.append(event)
+        return events
+
+    def _drain(self, time_budget: float | None = None, background: bool = False) -> int:
+        """处理队列中的事件
+
+        每次在锁内取出一批事件, 在锁外分发. 批大小自适应:
+        一批处理完仍有积压时加倍, 超出时间预算时减半.
+
+        Args:
+            time_budget: 处理时间预算(秒), None表示处理到队列为空
+            background: 是否由后台分发线程调用, 绑定Tk后后台线程停止处理
+
+        Returns:
+            int: 处理的事件数量
+        """
+        start = time.perf_counter()
+        processed = 0
+
+        while self._running:
+            if background and self._tk_root is not None:
+                break
+            with self._lock:
+                events = self._pop_events(self._drain_batch)
+                backlog = bool(self._event_queue)
+            if not events:
                 break
 
-        if not inserted:
-            self._event_queue.append(event)
+            batch_start = time.perf_counter()
+            for event in events:
+                self._process_event(event)
+            processed += len(events)
+
+            now = time.perf_counter()
+            if time_budget is not None and now - batch_start > time_budget:
+                self._drain_batch = max(MIN_DRAIN_BATCH, self._drain_batch // 2)
+            elif backlog:
+                self._drain_batch = min(MAX_DRAIN_BATCH, self._drain_batch * 2)
+
+            if time_budget is not None and now - start >= time_budget:
+                break
+
+        return processed
 
     def _process_event_queue(self) -> None:
         """处理事件队列"""
         try:
-            with self._lock:
-                if not self._event_queue:
+            self._drain()
+        except Exception as e:
+            self._logger.error(f"事件队列处理失败: {e}")
+
+    def _start_dispatcher_thread(self) -> None:
+        """启动常驻的后台分发线程"""
+        self._dispatcher_thread = threading.Thread(
+            target=self._dispatch_loop, name="EventBusDispatcher", daemon=True
+        )
+        self._dispatcher_thread.start()
+
+    def _dispatch_loop(self) -> None:
+        """后台分发线程主循环: 队列为空时等待, 有事件时处理"""
+        while True:
+            with self._queue_condition:
+                while self._running and self._tk_root is None and not self._event_queue:
+                    self._queue_condition.wait()
+                if not self._running or self._tk_root is not None:
                     return
+            try:
+                self._drain(background=True)
+            except Exception as e:
+                self._logger.error(f"事件队列处理失败: {e}")
 
-                # 批量处理事件(最多10个)
-                batch_size = min(10, len(self._event_queue))
-                events_to_process = []
+    def attach_to_tk(
+        self,
+        root: Any,
+        idle_interval: int = TK_IDLE_INTERVAL,
+        time_budget: float = TK_DRAIN_TIME_BUDGET,
+    ) -> None:
+        """将事件分发绑定到Tk主循环
 
-                for _ in range(batch_size):
-                    if self._event_queue:
-                        events_to_process.append(self._event_queue.popleft())
+        绑定后订阅者回调都在Tk主线程中执行, 可以直接更新界面.
+        必须在Tk主线程中调用.
 
-            # 处理事件
-            for event in events_to_process:
-                self._process_event(event)
+        Args:
+            root: Tk根窗口
+            idle_interval: 队列为空时的轮询间隔(毫秒)
+            time_budget: 每次调度的处理时间预算(秒)
+        """
+        with self._queue_condition:
+            if self._tk_root is not None:
+                self._cancel_tk_dispatch()
+            self._tk_root = root
+            self._tk_idle_interval = idle_interval
+            self._tk_time_budget = time_budget
+            # 唤醒后台分发线程使其退出
+            self._queue_condition.notify_all()
+
+        if self._dispatcher_thread is not None:
+            self._dispatcher_thread.join(timeout=1.0)
+            self._dispatcher_thread = None
+
+        self._tk_after_id = root.after(0, self._tk_dispatch)
+        self._logger.debug("事件分发已绑定到Tk主循环")
+
+    def detach_from_tk(self) -> None:
+        """解除与Tk主循环的绑定, 恢复后台线程分发"""
+        with self._queue_condition:
+            if self._tk_root is None:
+                return
+            self._cancel_tk_dispatch()
+            self._tk_root = None
+
+        if self._running:
+            self._start_dispatcher_thread()
+
+    def _cancel_tk_dispatch(self) -> None:
+        """取消已调度的Tk分发回调"""
+        if self._tk_after_id is not None:
+            try:
+                self._tk_root.after_cancel(self._tk_after_id)
+            except Exception:
+                pass
+            self._tk_after_id = None
+
+    def _tk_dispatch(self) -> None:
+        """Tk主线程中的分发回调, 处理一批事件后重新调度自身"""
+        self._tk_after_id = None
+        root = self._tk_root
+        if not self._running or root is None:
+            return
 
+        try:
+            self._drain(self._tk_time_budget)
         except Exception as e:
             self._logger.error(f"事件队列处理失败: {e}")
 
+        # 仍有积压时尽快继续处理, 否则按空闲间隔轮询
+        delay = 1 if self._pending_count else self._tk_idle_interval
+        try:
+            self._tk_after_id = root.after(delay, self._tk_dispatch)
+        except Exception as e:
+            # 窗口已销毁, 恢复后台线程分发
+            self._logger.debug(f"Tk分发调度失败, 恢复后台线程分发: {e}")
+            with self._lock:
+                self._tk_root = None
+            if self._running:
+                self._start_dispatcher_thread()
+
+    def _get_dispatch_subscribers(
+        self, event_type: str
+    ) -> tuple[EventSubscription, ...]:
+        """获取事件类型的订阅者元组(特定类型订阅者在前, 全局订阅者在后)"""
+        subscribers = self._dispatch_cache.get(event_type)
+        if subscribers is None:
+            with self._lock:
+                subscribers = tuple(self._subscribers.get(event_type, ())) + tuple(
+                    self._global_subscribers
+                )
+                self._dispatch_cache[event_type] = subscribers
+        return subscribers
+
     def _process_event(self, event: Event) -> None:
         """处理单个事件"""
         try:
             start_time = time.time()
 
             # 获取订阅者
-            subscribers = []
-
-            with self._lock:
-                # 特定事件类型的订阅者
-                if event.type in self._subscribers:
-                    subscribers.extend(self._subscribers[event.type])
-
-                # 全局订阅者
-                subscribers.extend(self._global_subscribers)
+            subscribers = self._get_dispatch_subscribers(event.type)
 
             # 处理订阅者
             for subscription in subscribers:
@@ -517,9 +701,7 @@ class EventBus(BaseObject):
 
                     # 检查目标
                     if event.target and hasattr(subscription.callback, "__self__"):
-                        callback_source = getattr(
-                            subscription.callback.__self__, "__class__", {}
-                        ).get("__name__", "")
+                        callback_source = type(subscription.callback.__self__).__name__
                         if callback_source != event.target:
                             continue
 
@@ -634,7 +816,7 @@ class EventBus(BaseObject):
     def get_queue_size(self) -> int:
         """获取事件队列大小"""
         with self._lock:
-            return len(self._event_queue)
+            return self._pending_count
 
     def get_subscriber_count(self, event_type: str | None = None) -> int:
         """获取订阅者数量"""
@@ -648,8 +830,17 @@ class EventBus(BaseObject):
     def cleanup(self) -> None:
         """清理资源"""
         try:
-            # 停止定时器
-            self._processing_timer.stop()
+            # 停止分发器
+            with self._queue_condition:
+                self._running = False
+                if self._tk_root is not None:
+                    self._cancel_tk_dispatch()
+                    self._tk_root = None
+                self._queue_condition.notify_all()
+
+            if self._dispatcher_thread is not None:
+                self._dispatcher_thread.join(timeout=1.0)
+                self._dispatcher_thread = None
 
             # 关闭线程池
             self._thread_pool.shutdown(wait=True)
@@ -658,7 +849,10 @@ class EventBus(BaseObject):
             with self._lock:
                 self._subscribers.clear()
                 self._global_subscribers.clear()
+                self._dispatch_cache.clear()
                 self._event_queue.clear()
+                self._coalesced_events.clear()
+                self._pending_count = 0
                 self._event_history.clear()
                 self._processing_stats.clear()
 
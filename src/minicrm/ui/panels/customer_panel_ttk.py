@@ -21,18 +21,59 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 from typing import TYPE_CHECKING, Any
 
-from minicrm.core.exceptions import ServiceError
-from minicrm.models.customer import CustomerLevel, CustomerType, IndustryType
+from minicrm.core.exceptions import DatabaseError, ServiceError
+from minicrm.services.customer.customer_search_service import SEARCH_FIELDS
 from minicrm.ui.panels.customer_detail_ttk import CustomerDetailTTK
 from minicrm.ui.panels.customer_edit_dialog_ttk import CustomerEditDialogTTK
 from minicrm.ui.ttk_base.base_widget import BaseWidget
 from minicrm.ui.ttk_base.data_table_ttk import DataTableTTK
+from minicrm.ui.ttk_base.table_data_source import (
+    DAOTableDataSource,
+    keyword_filters,
+)
 
 
 if TYPE_CHECKING:
     from minicrm.services.customer.customer_service_facade import CustomerServiceFacade
 
 
+# 客户表格列; 等级、类型和行业不是customers表的列, 不能排序和搜索
+TABLE_COLUMNS = [
+    {"id": "id", "text": "ID", "width": 60, "anchor": "center"},
+    {"id": "name", "text": "客户名称", "width": 150, "anchor": "w"},
+    {"id": "phone", "text": "联系电话", "width": 120, "anchor": "center"},
+    {"id": "company_name", "text": "公司名称", "width": 150, "anchor": "w"},
+    {
+        "id": "customer_level",
+        "text": "客户等级",
+        "width": 80,
+        "anchor": "center",
+        "sortable": False,
+        "searchable": False,
+    },
+    {
+        "id": "customer_type",
+        "text": "客户类型",
+        "width": 80,
+        "anchor": "center",
+        "sortable": False,
+        "searchable": False,
+    },
+    {
+        "id": "industry_type",
+        "text": "行业类型",
+        "width": 100,
+        "anchor": "center",
+        "sortable": False,
+        "searchable": False,
+    },
+    {"id": "created_at", "text": "创建时间", "width": 120, "anchor": "center"},
+]
+
+# 显示列到customers表列的映射, 未单独填写公司名称时与客户名称相同
+COLUMN_MAP = {"company_name": "name"}
+
+
 class CustomerPanelTTK(BaseWidget):
     """客户管理面板TTK组件.
 
@@ -62,16 +103,13 @@ class CustomerPanelTTK(BaseWidget):
 
         # UI组件引用
         self._search_entry: ttk.Entry | None = None
-        self._filter_frame: ttk.Frame | None = None
         self._customer_table: DataTableTTK | None = None
         self._detail_panel: CustomerDetailTTK | None = None
         self._splitter: ttk.PanedWindow | None = None
 
         # 数据状态
-        self._current_customers: list[dict[str, Any]] = []
         self._selected_customer_id: int | None = None
         self._search_query: str = ""
-        self._current_filters: dict[str, Any] = {}
 
         # 搜索防抖定时器
         self._search_timer_id: str | None = None
@@ -101,12 +139,12 @@ class CustomerPanelTTK(BaseWidget):
 
     def _create_search_area(self, parent: tk.Widget) -> None:
         """创建搜索区域."""
-        search_frame = ttk.LabelFrame(parent, text="搜索和筛选", padding=10)
+        search_frame = ttk.LabelFrame(parent, text="搜索", padding=10)
         search_frame.pack(fill=tk.X, pady=(0, 10))
 
         # 搜索输入框
         search_row = ttk.Frame(search_frame)
-        search_row.pack(fill=tk.X, pady=(0, 10))
+        search_row.pack(fill=tk.X)
 
         ttk.Label(search_row, text="搜索:").pack(side=tk.LEFT, padx=(0, 5))
 
@@ -118,59 +156,6 @@ class CustomerPanelTTK(BaseWidget):
         clear_button = ttk.Button(search_row, text="清除", command=self._clear_search)
         clear_button.pack(side=tk.LEFT, padx=(0, 10))
 
-        # 筛选器区域
-        self._create_filters(search_frame)
-
-    def _create_filters(self, parent: tk.Widget) -> None:
-        """创建筛选器."""
-        self._filter_frame = ttk.Frame(parent)
-        self._filter_frame.pack(fill=tk.X)
-
-        # 客户等级筛选
-        level_frame = ttk.Frame(self._filter_frame)
-        level_frame.pack(side=tk.LEFT, padx=(0, 20))
-
-        ttk.Label(level_frame, text="客户等级:").pack(side=tk.TOP, anchor=tk.W)
-        self._level_filter = ttk.Combobox(
-            level_frame,
-            values=["全部"] + [level.value for level in CustomerLevel],
-            state="readonly",
-            width=12,
-        )
-        self._level_filter.set("全部")
-        self._level_filter.pack(side=tk.TOP)
-        self._level_filter.bind("<<ComboboxSelected>>", self._on_filter_changed)
-
-        # 客户类型筛选
-        type_frame = ttk.Frame(self._filter_frame)
-        type_frame.pack(side=tk.LEFT, padx=(0, 20))
-
-        ttk.Label(type_frame, text="客户类型:").pack(side=tk.TOP, anchor=tk.W)
-        self._type_filter = ttk.Combobox(
-            type_frame,
-            values=["全部"] + [ctype.value for ctype in CustomerType],
-            state="readonly",
-            width=12,
-        )
-        self._type_filter.set("全部")
-        self._type_filter.pack(side=tk.TOP)
-        self._type_filter.bind("<<ComboboxSelected>>", self._on_filter_changed)
-
-        # 行业类型筛选
-        industry_frame = ttk.Frame(self._filter_frame)
-        industry_frame.pack(side=tk.LEFT, padx=(0, 20))
-
-        ttk.Label(industry_frame, text="行业类型:").pack(side=tk.TOP, anchor=tk.W)
-        self._industry_filter = ttk.Combobox(
-            industry_frame,
-            values=["全部"] + [industry.value for industry in IndustryType],
-            state="readonly",
-            width=12,
-        )
-        self._industry_filter.set("全部")
-        self._industry_filter.pack(side=tk.TOP)
-        self._industry_filter.bind("<<ComboboxSelected>>", self._on_filter_changed)
-
     def _create_toolbar(self, parent: tk.Widget) -> None:
         """创建操作工具栏."""
         toolbar_frame = ttk.Frame(parent)
@@ -238,37 +223,10 @@ class CustomerPanelTTK(BaseWidget):
 
     def _create_customer_table(self) -> None:
         """创建客户数据表格."""
-        # 定义表格列
-        columns = [
-            {"id": "id", "text": "ID", "width": 60, "anchor": "center"},
-            {"id": "name", "text": "客户名称", "width": 150, "anchor": "w"},
-            {"id": "phone", "text": "联系电话", "width": 120, "anchor": "center"},
-            {"id": "company_name", "text": "公司名称", "width": 150, "anchor": "w"},
-            {
-                "id": "customer_level",
-                "text": "客户等级",
-                "width": 80,
-                "anchor": "center",
-            },
-            {
-                "id": "customer_type",
-                "text": "客户类型",
-                "width": 80,
-                "anchor": "center",
-            },
-            {
-                "id": "industry_type",
-                "text": "行业类型",
-                "width": 100,
-                "anchor": "center",
-            },
-            {"id": "created_at", "text": "创建时间", "width": 120, "anchor": "center"},
-        ]
-
         # 创建数据表格
         self._customer_table = DataTableTTK(
             self._splitter,
-            columns=columns,
+            columns=TABLE_COLUMNS,
             multi_select=True,
             show_pagination=True,
             page_size=50,
@@ -314,84 +272,38 @@ class CustomerPanelTTK(BaseWidget):
     # ==================== 数据加载方法 ====================
 
     def _load_customers(self) -> None:
-        """加载客户数据."""
-        try:
-            # 从服务层获取客户数据
-            customers, total = self._customer_service.search_customers(
-                query=self._search_query,
-                filters=self._current_filters,
-                page=1,
-                page_size=1000,  # 暂时加载所有数据
-            )
+        """加载客户数据.
 
-            self._current_customers = customers
+        表格绑定分页数据源, 只加载当前页, 搜索关键词在数据库中筛选.
+        """
+        try:
+            data_source = self._create_data_source()
 
             # 更新表格数据
             if self._customer_table:
-                self._customer_table.load_data(customers)
+                self._customer_table.set_data_source(data_source)
+                total = self._customer_table.get_total_count()
 
-            # 更新状态栏
-            self._update_status_bar(len(customers), total)
+                # 更新状态栏
+                self._update_status_bar(total, total)
 
-            self._logger.info(f"成功加载 {len(customers)} 个客户")
+                self._logger.info(f"找到 {total} 个客户")
 
-        except ServiceError as e:
+        except (ServiceError, DatabaseError) as e:
             self._logger.exception(f"加载客户数据失败: {e}")
             messagebox.showerror("错误", f"加载客户数据失败:{e}")
-        except Exception as e:
-            self._logger.exception(f"加载客户数据时发生未知错误: {e}")
-            messagebox.showerror("错误", f"加载客户数据时发生未知错误:{e}")
+
+    def _create_data_source(self) -> DAOTableDataSource:
+        """创建按搜索关键词筛选的客户分页数据源."""
+        return DAOTableDataSource(
+            self._customer_service.customer_dao,
+            keyword_filters(self._search_query, SEARCH_FIELDS),
+            COLUMN_MAP,
+        )
 
     def _perform_search(self) -> None:
         """执行搜索."""
-        try:
-            # 获取搜索条件
-            query = self._search_query
-            filters = self._build_filters()
-
-            # 调用服务层搜索
-            customers, total = self._customer_service.search_customers(
-                query=query,
-                filters=filters,
-                page=1,
-                page_size=1000,
-            )
-
-            self._current_customers = customers
-
-            # 更新表格数据
-            if self._customer_table:
-                self._customer_table.load_data(customers)
-
-            # 更新状态栏
-            self._update_status_bar(len(customers), total)
-
-            self._logger.info(f"搜索完成,找到 {len(customers)} 个客户")
-
-        except ServiceError as e:
-            self._logger.exception(f"搜索客户失败: {e}")
-            messagebox.showerror("错误", f"搜索客户失败:{e}")
-        except Exception as e:
-            self._logger.exception(f"搜索时发生未知错误: {e}")
-            messagebox.showerror("错误", f"搜索时发生未知错误:{e}")
-
-    def _build_filters(self) -> dict[str, Any]:
-        """构建筛选条件."""
-        filters = {}
-
-        # 客户等级筛选
-        if hasattr(self, "_level_filter") and self._level_filter.get() != "全部":
-            filters["customer_level"] = self._level_filter.get()
-
-        # 客户类型筛选
-        if hasattr(self, "_type_filter") and self._type_filter.get() != "全部":
-            filters["customer_type"] = self._type_filter.get()
-
-        # 行业类型筛选
-        if hasattr(self, "_industry_filter") and self._industry_filter.get() != "全部":
-            filters["industry_type"] = self._industry_filter.get()
-
-        return filters
+        self._load_customers()
 
     # ==================== 事件处理方法 ====================
 
@@ -407,10 +319,6 @@ class CustomerPanelTTK(BaseWidget):
         # 设置新的定时器(防抖)
         self._search_timer_id = self.after(300, self._perform_search)
 
-    def _on_filter_changed(self, event) -> None:
-        """处理筛选变化."""
-        self._perform_search()
-
     def _clear_search(self) -> None:
         """清除搜索."""
         if self._search_entry:
@@ -616,7 +524,7 @@ class CustomerPanelTTK(BaseWidget):
 
     def _on_export_customers(self) -> None:
         """处理导出客户."""
-        if not self._current_customers:
+        if not self._customer_table or not self._customer_table.get_total_count():
             messagebox.showwarning("提示", "没有可导出的客户数据")
             return
 
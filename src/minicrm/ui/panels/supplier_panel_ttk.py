@@ -19,15 +19,76 @@ from __future__ import annotations
 
 import logging
 import tkinter as tk
-from typing import TYPE_CHECKING
+from tkinter import messagebox, ttk
+from typing import TYPE_CHECKING, Any
 
+from minicrm.core.exceptions import DatabaseError, ServiceError
+from minicrm.ui.panels.supplier_comparison_ttk import SupplierComparisonTTK
 from minicrm.ui.ttk_base.base_widget import BaseWidget
+from minicrm.ui.ttk_base.data_table_ttk import DataTableTTK
+from minicrm.ui.ttk_base.table_data_source import (
+    DAOTableDataSource,
+    keyword_filters,
+)
 
 
 if TYPE_CHECKING:
     from minicrm.services.supplier_service import SupplierService
 
 
+# 关键词模糊匹配的列, 与供应商服务按名称或联系方式搜索一致
+SEARCH_COLUMNS = ("name", "contact_person", "phone")
+
+# 供应商表格列; 等级、类型和质量评分不是suppliers表的列, 不能排序和搜索
+TABLE_COLUMNS = [
+    {"id": "id", "text": "ID", "width": 60, "anchor": "center"},
+    {"id": "name", "text": "供应商名称", "width": 150, "anchor": "w"},
+    {"id": "company_name", "text": "公司名称", "width": 150, "anchor": "w"},
+    {"id": "contact_person", "text": "联系人", "width": 100, "anchor": "w"},
+    {"id": "phone", "text": "联系电话", "width": 120, "anchor": "center"},
+    {
+        "id": "supplier_level",
+        "text": "供应商等级",
+        "width": 100,
+        "anchor": "center",
+        "sortable": False,
+        "searchable": False,
+    },
+    {
+        "id": "supplier_type",
+        "text": "供应商类型",
+        "width": 100,
+        "anchor": "center",
+        "sortable": False,
+        "searchable": False,
+    },
+    {
+        "id": "quality_rating",
+        "text": "质量等级",
+        "width": 80,
+        "anchor": "center",
+    },
+    {
+        "id": "quality_score",
+        "text": "质量评分",
+        "width": 80,
+        "anchor": "center",
+        "sortable": False,
+        "searchable": False,
+    },
+    {
+        "id": "cooperation_years",
+        "text": "合作年限",
+        "width": 80,
+        "anchor": "center",
+    },
+    {"id": "created_at", "text": "创建时间", "width": 120, "anchor": "center"},
+]
+
+# 显示列到suppliers表列的映射, 未单独填写公司名称时与供应商名称相同
+COLUMN_MAP = {"company_name": "name"}
+
+
 class SupplierPanelTTK(BaseWidget):
     """供应商管理面板TTK组件.
 
@@ -56,10 +117,8 @@ class SupplierPanelTTK(BaseWidget):
         self._supplier_service = supplier_service
         self._logger = logging.getLogger(__name__)
 
-        super().__init__(parent, **kwargs)
         # UI组件引用
         self._search_entry: ttk.Entry | None = None
-        self._filter_frame: ttk.Frame | None = None
         self._supplier_table: DataTableTTK | None = None
         self._detail_panel: ttk.Frame | None = None
         self._comparison_panel: SupplierComparisonTTK | None = None
@@ -67,14 +126,14 @@ class SupplierPanelTTK(BaseWidget):
         self._notebook: ttk.Notebook | None = None
 
         # 数据状态
-        self._current_suppliers: list[dict[str, Any]] = []
         self._selected_supplier_id: int | None = None
         self._search_query: str = ""
-        self._current_filters: dict[str, Any] = {}
 
         # 搜索防抖定时器
         self._search_timer_id: str | None = None
 
+        super().__init__(parent, **kwargs)
+
         # 初始化数据
         self._load_suppliers()
 
@@ -98,12 +157,12 @@ class SupplierPanelTTK(BaseWidget):
 
     def _create_search_area(self, parent: tk.Widget) -> None:
         """创建搜索区域."""
-        search_frame = ttk.LabelFrame(parent, text="搜索和筛选", padding=10)
+        search_frame = ttk.LabelFrame(parent, text="搜索", padding=10)
         search_frame.pack(fill=tk.X, pady=(0, 10))
 
         # 搜索输入框
         search_row = ttk.Frame(search_frame)
-        search_row.pack(fill=tk.X, pady=(0, 10))
+        search_row.pack(fill=tk.X)
 
         ttk.Label(search_row, text="搜索:").pack(side=tk.LEFT, padx=(0, 5))
 
@@ -115,59 +174,6 @@ class SupplierPanelTTK(BaseWidget):
         clear_button = ttk.Button(search_row, text="清除", command=self._clear_search)
         clear_button.pack(side=tk.LEFT, padx=(0, 10))
 
-        # 筛选器区域
-        self._create_filters(search_frame)
-
-    def _create_filters(self, parent: tk.Widget) -> None:
-        """创建筛选器."""
-        self._filter_frame = ttk.Frame(parent)
-        self._filter_frame.pack(fill=tk.X)
-
-        # 供应商等级筛选
-        level_frame = ttk.Frame(self._filter_frame)
-        level_frame.pack(side=tk.LEFT, padx=(0, 20))
-
-        ttk.Label(level_frame, text="供应商等级:").pack(side=tk.TOP, anchor=tk.W)
-        self._level_filter = ttk.Combobox(
-            level_frame,
-            values=["全部"] + [level.value for level in SupplierLevel],
-            state="readonly",
-            width=12,
-        )
-        self._level_filter.set("全部")
-        self._level_filter.pack(side=tk.TOP)
-        self._level_filter.bind("<<ComboboxSelected>>", self._on_filter_changed)
-
-        # 供应商类型筛选
-        type_frame = ttk.Frame(self._filter_frame)
-        type_frame.pack(side=tk.LEFT, padx=(0, 20))
-
-        ttk.Label(type_frame, text="供应商类型:").pack(side=tk.TOP, anchor=tk.W)
-        self._type_filter = ttk.Combobox(
-            type_frame,
-            values=["全部"] + [stype.value for stype in SupplierType],
-            state="readonly",
-            width=12,
-        )
-        self._type_filter.set("全部")
-        self._type_filter.pack(side=tk.TOP)
-        self._type_filter.bind("<<ComboboxSelected>>", self._on_filter_changed)
-
-        # 质量等级筛选
-        quality_frame = ttk.Frame(self._filter_frame)
-        quality_frame.pack(side=tk.LEFT, padx=(0, 20))
-
-        ttk.Label(quality_frame, text="质量等级:").pack(side=tk.TOP, anchor=tk.W)
-        self._quality_filter = ttk.Combobox(
-            quality_frame,
-            values=["全部"] + [rating.value for rating in QualityRating],
-            state="readonly",
-            width=12,
-        )
-        self._quality_filter.set("全部")
-        self._quality_filter.pack(side=tk.TOP)
-        self._quality_filter.bind("<<ComboboxSelected>>", self._on_filter_changed)
-
     def _create_toolbar(self, parent: tk.Widget) -> None:
         """创建操作工具栏."""
         toolbar_frame = ttk.Frame(parent)
@@ -268,50 +274,10 @@ class SupplierPanelTTK(BaseWidget):
 
     def _create_supplier_table(self) -> None:
         """创建供应商数据表格."""
-        # 定义表格列
-        columns = [
-            {"id": "id", "text": "ID", "width": 60, "anchor": "center"},
-            {"id": "name", "text": "供应商名称", "width": 150, "anchor": "w"},
-            {"id": "company_name", "text": "公司名称", "width": 150, "anchor": "w"},
-            {"id": "contact_person", "text": "联系人", "width": 100, "anchor": "w"},
-            {"id": "phone", "text": "联系电话", "width": 120, "anchor": "center"},
-            {
-                "id": "supplier_level",
-                "text": "供应商等级",
-                "width": 100,
-                "anchor": "center",
-            },
-            {
-                "id": "supplier_type",
-                "text": "供应商类型",
-                "width": 100,
-                "anchor": "center",
-            },
-            {
-                "id": "quality_rating",
-                "text": "质量等级",
-                "width": 80,
-                "anchor": "center",
-            },
-            {
-                "id": "quality_score",
-                "text": "质量评分",
-                "width": 80,
-                "anchor": "center",
-            },
-            {
-                "id": "cooperation_years",
-                "text": "合作年限",
-                "width": 80,
-                "anchor": "center",
-            },
-            {"id": "created_at", "text": "创建时间", "width": 120, "anchor": "center"},
-        ]
-
         # 创建数据表格
         self._supplier_table = DataTableTTK(
             self._splitter,
-            columns=columns,
+            columns=TABLE_COLUMNS,
             multi_select=True,
             show_pagination=True,
             page_size=50,
@@ -371,84 +337,38 @@ class SupplierPanelTTK(BaseWidget):
     # ==================== 数据加载方法 ====================
 
     def _load_suppliers(self) -> None:
-        """加载供应商数据."""
-        try:
-            # 从服务层获取供应商数据
-            suppliers, total = self._supplier_service.search_suppliers(
-                query=self._search_query,
-                filters=self._current_filters,
-                page=1,
-                page_size=1000,  # 暂时加载所有数据
-            )
+        """加载供应商数据.
 
-            self._current_suppliers = suppliers
+        表格绑定分页数据源, 只加载当前页, 搜索关键词在数据库中筛选.
+        """
+        try:
+            data_source = self._create_data_source()
 
             # 更新表格数据
             if self._supplier_table:
-                self._supplier_table.load_data(suppliers)
+                self._supplier_table.set_data_source(data_source)
+                total = self._supplier_table.get_total_count()
 
-            # 更新状态栏
-            self._update_status_bar(len(suppliers), total)
+                # 更新状态栏
+                self._update_status_bar(total, total)
 
-            self._logger.info(f"成功加载 {len(suppliers)} 个供应商")
+                self._logger.info(f"找到 {total} 个供应商")
 
-        except ServiceError as e:
+        except (ServiceError, DatabaseError) as e:
             self._logger.exception(f"加载供应商数据失败: {e}")
             messagebox.showerror("错误", f"加载供应商数据失败:{e}")
-        except Exception as e:
-            self._logger.exception(f"加载供应商数据时发生未知错误: {e}")
-            messagebox.showerror("错误", f"加载供应商数据时发生未知错误:{e}")
+
+    def _create_data_source(self) -> DAOTableDataSource:
+        """创建按搜索关键词筛选的供应商分页数据源."""
+        return DAOTableDataSource(
+            self._supplier_service.supplier_dao,
+            keyword_filters(self._search_query, SEARCH_COLUMNS),
+            COLUMN_MAP,
+        )
 
     def _perform_search(self) -> None:
         """执行搜索."""
-        try:
-            # 获取搜索条件
-            query = self._search_query
-            filters = self._build_filters()
-
-            # 调用服务层搜索
-            suppliers, total = self._supplier_service.search_suppliers(
-                query=query,
-                filters=filters,
-                page=1,
-                page_size=1000,
-            )
-
-            self._current_suppliers = suppliers
-
-            # 更新表格数据
-            if self._supplier_table:
-                self._supplier_table.load_data(suppliers)
-
-            # 更新状态栏
-            self._update_status_bar(len(suppliers), total)
-
-            self._logger.info(f"搜索完成,找到 {len(suppliers)} 个供应商")
-
-        except ServiceError as e:
-            self._logger.exception(f"搜索供应商失败: {e}")
-            messagebox.showerror("错误", f"搜索供应商失败:{e}")
-        except Exception as e:
-            self._logger.exception(f"搜索时发生未知错误: {e}")
-            messagebox.showerror("错误", f"搜索时发生未知错误:{e}")
-
-    def _build_filters(self) -> dict[str, Any]:
-        """构建筛选条件."""
-        filters = {}
-
-        # 供应商等级筛选
-        if hasattr(self, "_level_filter") and self._level_filter.get() != "全部":
-            filters["supplier_level"] = self._level_filter.get()
-
-        # 供应商类型筛选
-        if hasattr(self, "_type_filter") and self._type_filter.get() != "全部":
-            filters["supplier_type"] = self._type_filter.get()
-
-        # 质量等级筛选
-        if hasattr(self, "_quality_filter") and self._quality_filter.get() != "全部":
-            filters["quality_rating"] = self._quality_filter.get()
-
-        return filters
+        self._load_suppliers()
 
     # ==================== 事件处理方法 ====================
 
@@ -464,10 +384,6 @@ class SupplierPanelTTK(BaseWidget):
         # 设置新的定时器(防抖)
         self._search_timer_id = self.after(300, self._perform_search)
 
-    def _on_filter_changed(self, event) -> None:
-        """处理筛选变化."""
-        self._perform_search()
-
     def _clear_search(self) -> None:
         """清除搜索."""
         if self._search_entry:
@@ -900,7 +816,7 @@ class SupplierPanelTTK(BaseWidget):
 
     def _on_export_suppliers(self) -> None:
         """处理导出供应商."""
-        if not self._current_suppliers:
+        if not self._supplier_table or not self._supplier_table.get_total_count():
             messagebox.showwarning("提示", "没有可导出的供应商数据")
             return
 
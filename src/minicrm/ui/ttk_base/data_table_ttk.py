@@ -7,11 +7,14 @@
 - 使用TTK Treeview作为基础组件
 - 模块化设计,支持分页、筛选、导出等功能
 - 虚拟滚动支持大数据集显示
+- 可绑定分页数据源,由数据访问层完成筛选、排序和分页
 - 完整的事件处理和数据绑定机制
 """
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from enum import Enum
 import logging
 import tkinter as tk
@@ -19,7 +22,12 @@ from tkinter import messagebox, ttk
 from typing import Any, Callable
 
 from minicrm.ui.ttk_base.base_widget import BaseWidget
-from minicrm.ui.ttk_base.table_export_ttk import TableExportTTK
+from minicrm.ui.ttk_base.table_data_source import (
+    FilterSpec,
+    SortSpec,
+    TableDataSource,
+)
+from minicrm.ui.ttk_base.table_export_ttk import StreamedExportData, TableExportTTK
 from minicrm.ui.ttk_base.table_filter_ttk import TableFilterTTK
 from minicrm.ui.ttk_base.table_pagination_ttk import TablePaginationTTK
 
@@ -70,6 +78,10 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
 
     基于tkinter.ttk.Treeview实现的数据表格,提供完整的数据展示和操作功能.
     支持排序、筛选、多选、虚拟滚动等高级功能.
+
+    数据可以通过load_data一次性加载到内存, 也可以通过set_data_source
+    绑定分页数据源: 此时表格只持有当前页, 筛选、排序和分页交给数据源执行,
+    并在后台预取相邻页.
     """
 
     def __init__(
@@ -81,18 +93,21 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
         show_pagination: bool = True,
         page_size: int = 50,
         enable_virtual_scroll: bool = True,
+        data_source: TableDataSource | None = None,
         **kwargs,
     ):
         """初始化数据表格.
 
         Args:
             parent: 父组件
-            columns: 列定义列表,每个元素包含 id, text, width, anchor 等属性
+            columns: 列定义列表,每个元素包含 id, text, width, anchor 等属性,
+                sortable和searchable为False时该列不可排序、不参与筛选
             editable: 是否可编辑
             multi_select: 是否支持多选
             show_pagination: 是否显示分页控件
             page_size: 每页显示的行数
             enable_virtual_scroll: 是否启用虚拟滚动
+            data_source: 分页数据源,提供时由数据源完成筛选、排序和分页
             **kwargs: 其他参数
         """
         # 初始化混入类
@@ -112,6 +127,13 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
         self.current_page = 1
         self.total_pages = 1
 
+        # 分页数据源状态
+        self.data_source = data_source
+        self._source_total = 0
+        self._source_filters: FilterSpec | None = None
+        self._page_cache: dict[tuple, Future] = {}
+        self._prefetch_executor: ThreadPoolExecutor | None = None
+
         # 排序状态
         self.sort_column = None
         self.sort_order = SortOrder.ASC
@@ -135,6 +157,9 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
 
         super().__init__(parent, **kwargs)
 
+        if self.data_source is not None:
+            self.reload()
+
     def _setup_ui(self) -> None:
         """设置UI布局."""
         # 创建主框架
@@ -250,12 +275,16 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
         for col in self.columns:
             col_id = col["id"]
 
-            # 设置列标题和排序
-            self.tree.heading(
-                col_id,
-                text=col.get("text", col_id),
-                command=lambda c=col_id: self._sort_by_column(c),
-            )
+            # 设置列标题和排序, sortable为False的列(如没有对应数据库列的
+            # 显示列)不响应点击排序
+            if col.get("sortable", True):
+                self.tree.heading(
+                    col_id,
+                    text=col.get("text", col_id),
+                    command=lambda c=col_id: self._sort_by_column(c),
+                )
+            else:
+                self.tree.heading(col_id, text=col.get("text", col_id))
 
             # 设置列属性
             self.tree.column(
@@ -305,6 +334,7 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
         Args:
             data: 数据列表,每个元素是包含列数据的字典
         """
+        self._reset_data_source()
         self.data = data.copy()
 
         # 应用筛选
@@ -322,31 +352,145 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
 
         self.logger.info("加载了 %d 条数据到表格", len(data))
 
+    def set_data_source(self, data_source: TableDataSource) -> None:
+        """绑定分页数据源并加载第一页.
+
+        Args:
+            data_source: 分页数据源
+        """
+        self._reset_data_source()
+        self.data_source = data_source
+        self.data = []
+        self.filtered_data = []
+        self._source_filters = (
+            self.filter_widget.get_query_filters() if self.filter_widget else None
+        )
+
+        if self.pagination_widget:
+            self.pagination_widget.current_page = 1
+        self.reload()
+
+    def reload(self) -> None:
+        """从数据源重新统计并加载当前页,丢弃已缓存的页."""
+        if self.data_source is None:
+            self._refresh_display()
+            return
+
+        self._page_cache.clear()
+        try:
+            self._source_total = self.data_source.count(self._source_filters)
+        except Exception as e:
+            self.logger.error("统计表格数据失败: %s", e)
+            self._source_total = 0
+
+        if self.show_pagination and self.pagination_widget:
+            self.pagination_widget.update_pagination(self._source_total)
+
+        self._refresh_display()
+        self._update_info_display()
+
+    def _reset_data_source(self) -> None:
+        """解除数据源绑定并丢弃缓存页."""
+        self.data_source = None
+        self._source_total = 0
+        self._page_cache.clear()
+
     def _refresh_display(self) -> None:
         """刷新表格显示."""
         if not self.tree:
             return
 
-        # 清空现有数据
-        for item in self.tree.get_children():
-            self.tree.delete(item)
+        self._render_rows(self._get_current_page_data())
 
-        # 获取当前页数据
-        display_data = self._get_current_page_data()
+    def _render_rows(self, rows: list[dict[str, Any]]) -> None:
+        """显示行数据,复用已有的Treeview行而不是全部删除重建."""
+        items = self.tree.get_children()
 
-        # 插入数据
-        for row_data in display_data:
+        for index, row_data in enumerate(rows):
             values = [row_data.get(col["id"], "") for col in self.columns]
-            self.tree.insert("", "end", values=values)
+            if index < len(items):
+                self.tree.item(items[index], values=values)
+            else:
+                self.tree.insert("", "end", values=values)
+
+        if len(items) > len(rows):
+            self.tree.delete(*items[len(rows) :])
 
     def _get_current_page_data(self) -> list[dict[str, Any]]:
         """获取当前页的数据."""
+        if self.data_source is not None:
+            return self._get_source_page()
+
         if not self.show_pagination or not self.pagination_widget:
             return self.filtered_data
 
         start_index, end_index = self.pagination_widget.get_current_page_range()
         return self.filtered_data[start_index:end_index]
 
+    def _get_source_page(self) -> list[dict[str, Any]]:
+        """从数据源获取当前页,并在后台预取相邻页."""
+        if self.show_pagination and self.pagination_widget:
+            offset, _ = self.pagination_widget.get_current_page_range()
+            limit = self.pagination_widget.page_size
+        else:
+            offset, limit = 0, self.page_size
+
+        key = self._page_key(offset, limit)
+        future = self._page_cache.get(key)
+        try:
+            if future is not None:
+                rows = future.result()
+            else:
+                rows = self.data_source.fetch_page(
+                    offset, limit, self._source_sort(), self._source_filters
+                )
+                completed: Future = Future()
+                completed.set_result(rows)
+                self._page_cache[key] = completed
+        except Exception as e:
+            self.logger.error("加载表格数据失败: %s", e)
+            self._page_cache.pop(key, None)
+            rows = []
+
+        # 只保留当前页及其相邻页的缓存
+        neighbours = {
+            self._page_key(page_offset, limit)
+            for page_offset in (offset - limit, offset + limit)
+            if 0 <= page_offset < self._source_total
+        }
+        for cached_key in list(self._page_cache):
+            if cached_key != key and cached_key not in neighbours:
+                self._page_cache.pop(cached_key).cancel()
+        for neighbour in neighbours - self._page_cache.keys():
+            self._prefetch(neighbour)
+
+        return rows
+
+    def _page_key(self, offset: int, limit: int) -> tuple:
+        """生成页缓存键,包含影响查询结果的全部条件."""
+        return (offset, limit, self._source_sort(), repr(self._source_filters))
+
+    def _source_sort(self) -> SortSpec | None:
+        """当前排序状态对应的数据源排序条件."""
+        if not self.sort_column:
+            return None
+        return (
+            self.sort_column,
+            "desc" if self.sort_order == SortOrder.DESC else "asc",
+        )
+
+    def _prefetch(self, key: tuple) -> None:
+        """在后台线程中预取指定页."""
+        if self._prefetch_executor is None:
+            self._prefetch_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="DataTablePrefetch"
+            )
+
+        offset, limit, sort, _ = key
+        self._page_cache[key] = self._prefetch_executor.submit(
+            self.data_source.fetch_page, offset, limit, sort, self._source_filters
+        )
+
     def _sort_by_column(self, column_id: str) -> None:
         """按列排序."""
         # 切换排序顺序
@@ -359,8 +503,12 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
             self.sort_order = SortOrder.ASC
 
         # 执行排序
-        reverse = self.sort_order == SortOrder.DESC
-        self.filtered_data.sort(key=lambda x: x.get(column_id, ""), reverse=reverse)
+        if self.data_source is not None:
+            # 排序变化后缓存页全部失效,由数据源按新顺序重新获取
+            self._page_cache.clear()
+        else:
+            reverse = self.sort_order == SortOrder.DESC
+            self.filtered_data.sort(key=lambda x: x.get(column_id, ""), reverse=reverse)
 
         # 刷新显示
         self._refresh_display()
@@ -429,42 +577,76 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
             messagebox.showwarning("导出警告", "请先选择要导出的数据")
             return
 
-        if self.export_widget:
-            self.export_widget.show_export_dialog(
-                data=self.filtered_data,
-                selected_data=selected_data,
-                current_page_data=self._get_current_page_data(),
-            )
+        self._open_export_dialog(selected_data)
 
     def _export_all(self) -> None:
         """导出全部数据."""
-        if not self.filtered_data:
+        if not self._has_data():
             messagebox.showwarning("导出警告", "没有数据可以导出")
             return
 
-        if self.export_widget:
-            self.export_widget.show_export_dialog(
-                data=self.filtered_data,
-                selected_data=None,
-                current_page_data=self._get_current_page_data(),
-            )
+        self._open_export_dialog(None)
 
     def _show_export_dialog(self) -> None:
         """显示导出对话框."""
-        if not self.filtered_data:
+        if not self._has_data():
             messagebox.showwarning("导出警告", "没有数据可以导出")
             return
 
-        if self.export_widget:
-            self.export_widget.show_export_dialog(
-                data=self.filtered_data,
-                selected_data=self.get_selected_data(),
-                current_page_data=self._get_current_page_data(),
+        self._open_export_dialog(self.get_selected_data())
+
+    def _has_data(self) -> bool:
+        """是否有满足筛选条件的数据."""
+        if self.data_source is not None:
+            return self._source_total > 0
+        return bool(self.filtered_data)
+
+    def _open_export_dialog(self, selected_data: list[dict[str, Any]] | None) -> None:
+        """打开导出对话框.
+
+        数据源模式下全部数据以流的形式交给导出组件, 导出时在后台线程中
+        按当前排序和筛选分批读取并逐行写入文件.
+        """
+        if not self.export_widget:
+            return
+
+        data: list[dict[str, Any]] | StreamedExportData = self.filtered_data
+        if self.data_source is not None:
+            data_source = self.data_source
+            sort, filters = self._source_sort(), self._source_filters
+            data = StreamedExportData(
+                lambda: self._stream_export_rows(data_source, sort, filters),
+                self._source_total,
             )
 
+        self.export_widget.show_export_dialog(
+            data=data,
+            selected_data=selected_data,
+            current_page_data=self._get_current_page_data(),
+        )
+
+    @staticmethod
+    def _stream_export_rows(
+        data_source: TableDataSource,
+        sort: SortSpec | None,
+        filters: FilterSpec | None,
+    ) -> Iterator[dict[str, Any]]:
+        """按排序和筛选条件从数据源分批读取导出记录."""
+        for batch in data_source.stream(sort, filters):
+            yield from batch
+
     def refresh(self) -> None:
         """刷新表格."""
-        self._refresh_display()
+        if self.data_source is not None:
+            self.reload()
+        else:
+            self._refresh_display()
+
+    def get_total_count(self) -> int:
+        """获取满足筛选条件的记录总数."""
+        if self.data_source is not None:
+            return self._source_total
+        return len(self.filtered_data)
 
     def get_selected_data(self) -> list[dict[str, Any]]:
         """获取选中行的数据."""
@@ -499,6 +681,14 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
 
     def _on_filter_changed(self) -> None:
         """处理筛选变化事件."""
+        if self.data_source is not None:
+            self._source_filters = self.filter_widget.get_query_filters()
+            if self.pagination_widget:
+                self.pagination_widget.current_page = 1
+            self.reload()
+            self.logger.info("筛选后数据: %d 条记录", self._source_total)
+            return
+
         # 应用筛选
         self._apply_filters()
 
@@ -531,6 +721,10 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
     def _update_info_display(self) -> None:
         """更新信息显示."""
         if hasattr(self, "info_label") and self.info_label:
+            if self.data_source is not None:
+                self.info_label.config(text=f"共 {self._source_total} 条记录")
+                return
+
             total_records = len(self.data)
             filtered_records = len(self.filtered_data)
 
@@ -545,6 +739,10 @@ class DataTableTTK(BaseWidget, VirtualScrollMixin):
         """清理资源."""
         self.data.clear()
         self.filtered_data.clear()
+        self._reset_data_source()
+        if self._prefetch_executor is not None:
+            self._prefetch_executor.shutdown(wait=False, cancel_futures=True)
+            self._prefetch_executor = None
         if self.tree:
             for item in self.tree.get_children():
                 self.tree.delete(item)
@@ -19,8 +19,6 @@ import tkinter as tk
 from typing import Any, Callable, Dict, List, Optional
 from weakref import WeakSet
 
-import psutil
-
 from ...core.data_cache_manager import data_cache_manager
 from .async_processor import async_processor
 from .virtual_scroll_mixin import VirtualScrollMixin
@@ -251,6 +249,8 @@ class TTKPerformanceOptimizer:
         """收集性能指标"""
         try:
             # 系统指标
+            import psutil
+
             process = psutil.Process()
             memory_info = process.memory_info()
             memory_usage_mb = memory_info.rss / 1024 / 1024
@@ -0,0 +1,218 @@
+"""MiniCRM TTK表格数据源
+
+定义DataTableTTK的分页数据源接口, 使表格只加载当前页数据,
+由数据源在数据访问层完成筛选、排序和分页.
+
+设计特点:
+- 表格只依赖抽象接口, 不直接访问数据库
+- 筛选条件使用与数据访问层一致的格式
+- 提供基于DAO的默认实现, 可附加固定的基础筛选条件(如面板的关键词搜索)
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+
+# 排序条件: (列ID, "asc"或"desc")
+SortSpec = tuple[str, str]
+
+# 筛选条件: {"all": [...], "any": [...]}, 每个条件包含column、operator、value、value2
+FilterSpec = dict[str, list[dict[str, Any]]]
+
+# 导出等全量读取时每批的记录数
+STREAM_BATCH_SIZE = 500
+
+
+def keyword_filters(query: str, columns: Sequence[str]) -> FilterSpec | None:
+    """构建在多个列中模糊匹配关键词的筛选条件.
+
+    Args:
+        query: 搜索关键词, 为空时不筛选
+        columns: 匹配的列, 满足其一即可
+
+    Returns:
+        筛选条件
+    """
+    if not query:
+        return None
+    return {
+        "any": [
+            {"column": column, "operator": "contains", "value": query}
+            for column in columns
+        ]
+    }
+
+
+def combine_filters(*filters: FilterSpec | None) -> FilterSpec | None:
+    """组合多组筛选条件, 各组全部满足.
+
+    每组作为all中的嵌套条件, 各组的any互不影响.
+
+    Args:
+        *filters: 筛选条件, None表示不筛选
+
+    Returns:
+        组合后的筛选条件
+    """
+    groups = [group for group in filters if group]
+    if len(groups) <= 1:
+        return groups[0] if groups else None
+    return {"all": groups}
+
+
+class TableDataSource(ABC):
+    """表格分页数据源接口.
+
+    实现需要是线程安全的, 表格会在后台线程中预取相邻页.
+    """
+
+    @abstractmethod
+    def count(self, filters: FilterSpec | None = None) -> int:
+        """统计满足筛选条件的记录数.
+
+        Args:
+            filters: 筛选条件
+
+        Returns:
+            记录数量
+        """
+
+    @abstractmethod
+    def fetch_page(
+        self,
+        offset: int,
+        limit: int,
+        sort: SortSpec | None = None,
+        filters: FilterSpec | None = None,
+    ) -> list[dict[str, Any]]:
+        """获取一页记录.
+
+        Args:
+            offset: 偏移量
+            limit: 每页数量
+            sort: 排序条件
+            filters: 筛选条件
+
+        Returns:
+            当前页记录
+        """
+
+    def stream(
+        self,
+        sort: SortSpec | None = None,
+        filters: FilterSpec | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """按排序和筛选条件分批读取全部记录, 用于导出.
+
+        默认逐页调用fetch_page, 实现可以改用数据库游标.
+
+        Args:
+            sort: 排序条件
+            filters: 筛选条件
+            batch_size: 每批记录数
+
+        Yields:
+            每批记录
+        """
+        offset = 0
+        while True:
+            rows = self.fetch_page(offset, batch_size, sort, filters)
+            if rows:
+                yield rows
+            if len(rows) < batch_size:
+                return
+            offset += batch_size
+
+
+class DAOTableDataSource(TableDataSource):
+    """基于DAO的表格数据源.
+
+    将分页请求转发给提供fetch_page、count_filtered和stream_filtered的DAO
+    (如BaseDAO、CustomerDAO和SupplierDAO), 表格的筛选条件与基础筛选条件
+    同时生效. 与数据库列同值但名称不同的显示列通过列映射转换.
+    """
+
+    def __init__(
+        self,
+        dao: Any,
+        base_filters: FilterSpec | None = None,
+        column_map: dict[str, str] | None = None,
+    ):
+        """初始化DAO数据源.
+
+        Args:
+            dao: 数据访问对象
+            base_filters: 始终生效的基础筛选条件, 使用数据库列名
+            column_map: 表格列ID到数据库列名的映射, 排序和筛选时转换,
+                返回的记录中补充对应的显示列
+        """
+        self._dao = dao
+        self._base_filters = base_filters
+        self._column_map = column_map or {}
+
+    def count(self, filters: FilterSpec | None = None) -> int:
+        """统计满足筛选条件的记录数."""
+        return self._dao.count_filtered(self._query_filters(filters))
+
+    def fetch_page(
+        self,
+        offset: int,
+        limit: int,
+        sort: SortSpec | None = None,
+        filters: FilterSpec | None = None,
+    ) -> list[dict[str, Any]]:
+        """获取一页记录."""
+        rows = self._dao.fetch_page(
+            offset, limit, self._query_sort(sort), self._query_filters(filters)
+        )
+        return self._with_display_columns(rows)
+
+    def stream(
+        self,
+        sort: SortSpec | None = None,
+        filters: FilterSpec | None = None,
+        batch_size: int = STREAM_BATCH_SIZE,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """通过DAO的数据库游标分批读取全部记录."""
+        batches = self._dao.stream_filtered(
+            self._query_sort(sort), self._query_filters(filters), batch_size
+        )
+        return map(self._with_display_columns, batches)
+
+    def _query_sort(self, sort: SortSpec | None) -> SortSpec | None:
+        """将排序列转换为数据库列."""
+        if not sort:
+            return sort
+        column, direction = sort
+        return self._column_map.get(column, column), direction
+
+    def _query_filters(self, filters: FilterSpec | None) -> FilterSpec | None:
+        """将表格筛选条件转换为数据库列并与基础筛选条件组合."""
+        return combine_filters(self._base_filters, self._map_filters(filters))
+
+    def _map_filters(self, filters: FilterSpec | None) -> FilterSpec | None:
+        """转换筛选条件中的列."""
+        if not filters or not self._column_map:
+            return filters
+        return {
+            group: [self._map_condition(condition) for condition in conditions]
+            for group, conditions in filters.items()
+        }
+
+    def _map_condition(self, condition: dict[str, Any]) -> dict[str, Any]:
+        """转换单个条件的列, 不含column的条件为嵌套条件组."""
+        if "column" not in condition:
+            return self._map_filters(condition)
+        column = condition["column"]
+        return {**condition, "column": self._column_map.get(column, column)}
+
+    def _with_display_columns(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """为记录补充映射的显示列."""
+        for row in rows:
+            for column_id, column in self._column_map.items():
+                row.setdefault(column_id, row.get(column))
+        return rows
@@ -7,6 +7,7 @@
 - 支持Excel和CSV格式导出
 - 选择性导出(当前页/全部/选中)
 - 异步导出避免UI阻塞
+- 全部数据可以分批流式读取, Excel使用只写模式逐行写入
 - 进度显示和取消功能
 - 完整的错误处理机制
 """
@@ -18,17 +19,18 @@ import logging
 import threading
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
 
 
 try:
     import openpyxl
-    from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
 
     EXCEL_AVAILABLE = True
 except ImportError:
     EXCEL_AVAILABLE = False
 
+from minicrm.services.excel_export.excel_formatters import ExcelFormatters
+from minicrm.services.excel_export.streaming_sheet_writer import StreamingSheetWriter
 from minicrm.ui.ttk_base.base_widget import BaseWidget
 
 
@@ -73,6 +75,34 @@ class ExportProgress:
         return min(100.0, (self.current / self.total) * 100.0)
 
 
+class StreamedExportData:
+    """分批读取的导出数据
+
+    导出时才在后台线程中调用工厂函数逐条读取记录, 不在内存中保留全部数据.
+    记录数量由调用方预先统计, 用于显示和进度计算.
+    """
+
+    def __init__(self, factory: Callable[[], Iterable[Dict[str, Any]]], total: int):
+        """初始化流式导出数据
+
+        Args:
+            factory: 返回记录迭代器的工厂函数, 每次遍历调用一次
+            total: 记录数量
+        """
+        self._factory = factory
+        self.total = total
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._factory())
+
+
+# 导出数据: 内存中的记录列表或流式读取的记录
+ExportData = Union[List[Dict[str, Any]], StreamedExportData]
+
+
 class TableExportTTK(BaseWidget):
     """TTK表格导出组件
 
@@ -128,14 +158,14 @@ class TableExportTTK(BaseWidget):
 
     def show_export_dialog(
         self,
-        data: List[Dict[str, Any]],
+        data: ExportData,
         selected_data: Optional[List[Dict[str, Any]]] = None,
         current_page_data: Optional[List[Dict[str, Any]]] = None,
     ) -> None:
         """显示导出对话框
 
         Args:
-            data: 全部数据
+            data: 全部数据, 可以是StreamedExportData以便导出时分批读取
             selected_data: 选中的数据
             current_page_data: 当前页数据
         """
@@ -160,7 +190,7 @@ class TableExportTTK(BaseWidget):
     def _create_export_dialog_content(
         self,
         dialog: tk.Toplevel,
-        data: List[Dict[str, Any]],
+        data: ExportData,
         selected_data: Optional[List[Dict[str, Any]]],
         current_page_data: Optional[List[Dict[str, Any]]],
     ) -> None:
@@ -305,7 +335,7 @@ class TableExportTTK(BaseWidget):
         dialog: tk.Toplevel,
         export_format: str,
         export_scope: str,
-        data: List[Dict[str, Any]],
+        data: ExportData,
         selected_data: Optional[List[Dict[str, Any]]],
         current_page_data: Optional[List[Dict[str, Any]]],
         column_vars: Dict[str, tk.BooleanVar],
@@ -368,7 +398,7 @@ class TableExportTTK(BaseWidget):
         filename: str,
         export_format: ExportFormat,
         export_scope: ExportScope,
-        data: List[Dict[str, Any]],
+        data: ExportData,
         columns: List[Dict[str, Any]],
     ) -> None:
         """执行导出"""
@@ -395,7 +425,7 @@ class TableExportTTK(BaseWidget):
         self,
         filename: str,
         export_format: ExportFormat,
-        data: List[Dict[str, Any]],
+        data: ExportData,
         columns: List[Dict[str, Any]],
     ) -> None:
         """导出工作线程"""
@@ -420,79 +450,57 @@ class TableExportTTK(BaseWidget):
         )
 
     def _export_to_excel(
-        self, filename: str, data: List[Dict[str, Any]], columns: List[Dict[str, Any]]
+        self, filename: str, data: ExportData, columns: List[Dict[str, Any]]
     ) -> bool:
-        """导出到Excel文件"""
+        """导出到Excel文件
+
+        使用openpyxl只写模式逐行写入, 已写入的行不在内存中保留单元格.
+        """
         if not EXCEL_AVAILABLE:
             raise ImportError("openpyxl库未安装,无法导出Excel文件")
 
-        workbook = openpyxl.Workbook()
-        worksheet = workbook.active
-        worksheet.title = "数据导出"
-
-        # 设置标题样式
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(
-            start_color="366092", end_color="366092", fill_type="solid"
-        )
-        header_alignment = Alignment(horizontal="center", vertical="center")
-        border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
-
-        # 写入标题行
-        for col_idx, col in enumerate(columns, 1):
-            cell = worksheet.cell(
-                row=1, column=col_idx, value=col.get("text", col["id"])
+        workbook = openpyxl.Workbook(write_only=True)
+        try:
+            worksheet = workbook.create_sheet("数据导出")
+            rows = self._iter_export_rows(data, columns)
+            StreamingSheetWriter(ExcelFormatters()).write_openpyxl(
+                worksheet,
+                [col.get("text", col["id"]) for col in columns],
+                rows,
+                ["data"] * len(columns),
             )
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-            cell.border = border
 
-        # 写入数据行
-        for row_idx, row_data in enumerate(data, 2):
             if self.export_progress and self.export_progress.cancelled:
                 return False
 
-            for col_idx, col in enumerate(columns, 1):
-                value = row_data.get(col["id"], "")
-                cell = worksheet.cell(row=row_idx, column=col_idx, value=value)
-                cell.border = border
+            # 保存文件
+            workbook.save(filename)
+            return True
+        finally:
+            workbook.close()
+
+    def _iter_export_rows(
+        self, data: ExportData, columns: List[Dict[str, Any]]
+    ) -> Iterator[List[Any]]:
+        """逐行生成导出的单元格值并更新进度, 取消导出时停止"""
+        for row_idx, row_data in enumerate(data, 1):
+            if self.export_progress and self.export_progress.cancelled:
+                return
+
+            yield [row_data.get(col["id"], "") for col in columns]
 
             # 更新进度
             if self.export_progress:
                 self.export_progress.update(
-                    row_idx - 1, f"正在导出第 {row_idx - 1} / {len(data)} 行数据..."
+                    row_idx, f"正在导出第 {row_idx} / {len(data)} 行数据..."
                 )
 
                 # 触发进度更新事件
                 if self.on_export_progress:
                     self.after(0, lambda: self.on_export_progress(self.export_progress))
 
-        # 自动调整列宽
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-
-            for cell in column:
-                try:
-                    max_length = max(max_length, len(str(cell.value)))
-                except:
-                    pass
-
-            adjusted_width = min(max_length + 2, 50)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-
-        # 保存文件
-        workbook.save(filename)
-        return True
-
     def _export_to_csv(
-        self, filename: str, data: List[Dict[str, Any]], columns: List[Dict[str, Any]]
+        self, filename: str, data: ExportData, columns: List[Dict[str, Any]]
     ) -> bool:
         """导出到CSV文件"""
         with open(filename, "w", newline="", encoding="utf-8-sig") as csvfile:
@@ -503,26 +511,9 @@ class TableExportTTK(BaseWidget):
             writer.writerow(headers)
 
             # 写入数据行
-            for row_idx, row_data in enumerate(data):
-                if self.export_progress and self.export_progress.cancelled:
-                    return False
-
-                row = [row_data.get(col["id"], "") for col in columns]
-                writer.writerow(row)
-
-                # 更新进度
-                if self.export_progress:
-                    self.export_progress.update(
-                        row_idx + 1, f"正在导出第 {row_idx + 1} / {len(data)} 行数据..."
-                    )
-
-                    # 触发进度更新事件
-                    if self.on_export_progress:
-                        self.after(
-                            0, lambda: self.on_export_progress(self.export_progress)
-                        )
-
-        return True
+            writer.writerows(self._iter_export_rows(data, columns))
+
+        return not (self.export_progress and self.export_progress.cancelled)
 
     def _show_progress_dialog(self) -> None:
         """显示进度对话框"""
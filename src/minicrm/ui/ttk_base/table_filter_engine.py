@@ -0,0 +1,438 @@
+"""MiniCRM 表格筛选引擎
+
+为TableFilterTTK提供编译后的筛选执行, 使大数据量下的实时筛选保持流畅.
+
+设计特点:
+- 筛选条件只编译一次, 比较值的转换(大小写、数值、正则)在编译时完成
+- 按列缓存表格数据的快照(文本/数值), 多次筛选共用
+- 高级条件按选择性和代价排序, 逐步缩小候选行
+- 条件只是收窄(如继续输入搜索字符)时, 在上次结果上继续筛选
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+import logging
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class FilterOperator(Enum):
+    """筛选操作符枚举"""
+
+    EQUALS = "等于"
+    NOT_EQUALS = "不等于"
+    CONTAINS = "包含"
+    NOT_CONTAINS = "不包含"
+    STARTS_WITH = "开头是"
+    ENDS_WITH = "结尾是"
+    GREATER_THAN = "大于"
+    GREATER_EQUAL = "大于等于"
+    LESS_THAN = "小于"
+    LESS_EQUAL = "小于等于"
+    BETWEEN = "介于"
+    IN_LIST = "在列表中"
+    NOT_IN_LIST = "不在列表中"
+    IS_EMPTY = "为空"
+    IS_NOT_EMPTY = "不为空"
+    REGEX = "正则表达式"
+
+
+# 列值的预处理方式
+TEXT = "text"
+TEXT_CASE_SENSITIVE = "text_cs"
+NUMBER = "number"
+
+# 各操作符的默认通过率估计, 没有实际统计时用于排序
+_DEFAULT_PASS_RATES = {
+    FilterOperator.EQUALS: 0.1,
+    FilterOperator.IN_LIST: 0.2,
+    FilterOperator.STARTS_WITH: 0.3,
+    FilterOperator.ENDS_WITH: 0.3,
+    FilterOperator.IS_EMPTY: 0.3,
+    FilterOperator.CONTAINS: 0.5,
+    FilterOperator.REGEX: 0.5,
+    FilterOperator.GREATER_THAN: 0.5,
+    FilterOperator.GREATER_EQUAL: 0.5,
+    FilterOperator.LESS_THAN: 0.5,
+    FilterOperator.LESS_EQUAL: 0.5,
+    FilterOperator.BETWEEN: 0.5,
+    FilterOperator.NOT_IN_LIST: 0.8,
+    FilterOperator.IS_NOT_EMPTY: 0.7,
+    FilterOperator.NOT_EQUALS: 0.9,
+    FilterOperator.NOT_CONTAINS: 0.9,
+}
+
+# 各操作符每行的相对代价
+_COSTS = {FilterOperator.REGEX: 5.0}
+
+_NUMERIC_COMPARATORS: Dict[FilterOperator, Callable[[float, float], bool]] = {
+    FilterOperator.GREATER_THAN: lambda a, b: a > b,
+    FilterOperator.GREATER_EQUAL: lambda a, b: a >= b,
+    FilterOperator.LESS_THAN: lambda a, b: a < b,
+    FilterOperator.LESS_EQUAL: lambda a, b: a <= b,
+}
+
+# 通过率统计的最大条目数
+_MAX_STATS = 256
+
+
+def _to_text(value: Any, case_sensitive: bool) -> str:
+    """转换为比较用的文本"""
+    text = str(value) if value is not None else ""
+    return text if case_sensitive else text.lower()
+
+
+def _to_number(value: Any) -> Optional[float]:
+    """转换为比较用的数值, 空字符串视为0, 无法转换返回None"""
+    if value == "":
+        return 0.0
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return None
+
+
+class FilterCondition:
+    """筛选条件类"""
+
+    def __init__(
+        self,
+        column_id: str,
+        operator: FilterOperator,
+        value: Any = None,
+        value2: Any = None,
+        case_sensitive: bool = False,
+    ):
+        self.column_id = column_id
+        self.operator = operator
+        self.value = value
+        self.value2 = value2  # 用于BETWEEN操作
+        self.case_sensitive = case_sensitive
+        self._compiled: Optional[CompiledCondition] = None
+
+    @property
+    def signature(self) -> Tuple[Any, ...]:
+        """条件签名, 相同签名的条件筛选结果相同"""
+        return (
+            self.column_id,
+            self.operator,
+            self.value,
+            self.value2,
+            self.case_sensitive,
+        )
+
+    def compile(self) -> CompiledCondition:
+        """编译筛选条件, 条件内容未变化时复用上次的编译结果
+
+        Returns:
+            编译后的筛选条件
+        """
+        if self._compiled is None or self._compiled.signature != self.signature:
+            self._compiled = CompiledCondition(self)
+        return self._compiled
+
+    def apply(self, row_data: Dict[str, Any]) -> bool:
+        """应用筛选条件到行数据
+
+        Args:
+            row_data: 行数据字典
+
+        Returns:
+            是否满足筛选条件
+        """
+        return self.compile().matches(row_data.get(self.column_id, ""))
+
+
+class CompiledCondition:
+    """编译后的筛选条件
+
+    持有预处理后的比较值和针对单个列值的判定函数.
+    """
+
+    def __init__(self, condition: FilterCondition):
+        """编译筛选条件
+
+        Args:
+            condition: 筛选条件
+        """
+        self.signature = condition.signature
+        self.column_id = condition.column_id
+        self.operator = condition.operator
+        self.case_sensitive = condition.case_sensitive
+        self.source = TEXT_CASE_SENSITIVE if condition.case_sensitive else TEXT
+        self.needle = _to_text(condition.value, condition.case_sensitive)
+        self.cost = _COSTS.get(condition.operator, 1.0)
+        self.test = self._build_test(condition)
+
+    def _build_test(self, condition: FilterCondition) -> Callable[[Any], bool]:
+        """构造针对预处理后列值的判定函数"""
+        operator = condition.operator
+        needle = self.needle
+
+        if operator == FilterOperator.EQUALS:
+            return lambda text: text == needle
+        if operator == FilterOperator.NOT_EQUALS:
+            return lambda text: text != needle
+        if operator == FilterOperator.CONTAINS:
+            return lambda text: needle in text
+        if operator == FilterOperator.NOT_CONTAINS:
+            return lambda text: needle not in text
+        if operator == FilterOperator.STARTS_WITH:
+            return lambda text: text.startswith(needle)
+        if operator == FilterOperator.ENDS_WITH:
+            return lambda text: text.endswith(needle)
+        if operator in (FilterOperator.IN_LIST, FilterOperator.NOT_IN_LIST):
+            # 支持逗号分隔的列表
+            items = frozenset(item.strip() for item in needle.split(","))
+            if operator == FilterOperator.IN_LIST:
+                return lambda text: text in items
+            return lambda text: text not in items
+        if operator == FilterOperator.IS_EMPTY:
+            return lambda text: text == ""
+        if operator == FilterOperator.IS_NOT_EMPTY:
+            return lambda text: text != ""
+        if operator == FilterOperator.REGEX:
+            flags = 0 if condition.case_sensitive else re.IGNORECASE
+            try:
+                search = re.compile(str(condition.value or ""), flags).search
+            except re.error as e:
+                logging.getLogger(__name__).warning(f"筛选条件应用失败: {e}")
+                return lambda text: True
+            return lambda text: search(text) is not None
+
+        if operator in _NUMERIC_COMPARATORS:
+            self.source = NUMBER
+            compare = _NUMERIC_COMPARATORS[operator]
+            target = _to_number(condition.value)
+            if target is None:
+                return lambda number: False
+            return lambda number: number is not None and compare(number, target)
+        if operator == FilterOperator.BETWEEN:
+            self.source = NUMBER
+            # 未填写的边界不限制
+            low = (
+                float("-inf")
+                if condition.value in (None, "")
+                else _to_number(condition.value)
+            )
+            high = (
+                float("inf")
+                if condition.value2 in (None, "")
+                else _to_number(condition.value2)
+            )
+            if low is None or high is None:
+                return lambda number: False
+            return lambda number: number is not None and low <= number <= high
+
+        return lambda value: True
+
+    def prepare(self, value: Any) -> Any:
+        """按条件需要预处理单个列值"""
+        if self.source == NUMBER:
+            return _to_number(value)
+        return _to_text(value, self.source == TEXT_CASE_SENSITIVE)
+
+    def matches(self, value: Any) -> bool:
+        """判断单个列值是否满足条件"""
+        return self.test(self.prepare(value))
+
+    def select(self, values: Sequence[Any], indices: Sequence[int]) -> List[int]:
+        """从候选行中选出满足条件的行
+
+        Args:
+            values: 预处理后的整列数据
+            indices: 候选行下标(升序)
+
+        Returns:
+            满足条件的行下标
+        """
+        test = self.test
+        if self.operator == FilterOperator.CONTAINS:
+            # 快速搜索的热点路径, 避免逐行函数调用
+            needle = self.needle
+            return [i for i in indices if needle in values[i]]
+        return [i for i in indices if test(values[i])]
+
+    def narrows(self, other: CompiledCondition) -> bool:
+        """判断本条件的结果是否一定是other结果的子集"""
+        if self.signature == other.signature:
+            return True
+        if (
+            self.column_id != other.column_id
+            or self.operator != other.operator
+            or self.case_sensitive != other.case_sensitive
+        ):
+            return False
+        if self.operator == FilterOperator.CONTAINS:
+            return other.needle in self.needle
+        if self.operator == FilterOperator.NOT_CONTAINS:
+            return self.needle in other.needle
+        if self.operator == FilterOperator.STARTS_WITH:
+            return self.needle.startswith(other.needle)
+        if self.operator == FilterOperator.ENDS_WITH:
+            return self.needle.endswith(other.needle)
+        return False
+
+
+class ColumnarSnapshot:
+    """表格数据的列式快照
+
+    按需把某一列转换为比较用的文本或数值并缓存, 同一份数据的多次筛选共用.
+    """
+
+    def __init__(self, data: List[Dict[str, Any]]):
+        """创建快照
+
+        Args:
+            data: 行数据列表
+        """
+        self.data = data
+        self.size = len(data)
+        self._columns: Dict[Tuple[str, str], List[Any]] = {}
+
+    def is_current(self, data: List[Dict[str, Any]]) -> bool:
+        """判断快照是否对应给定数据"""
+        return self.data is data and self.size == len(data)
+
+    def column(self, compiled: CompiledCondition) -> List[Any]:
+        """获取条件所需的预处理列"""
+        key = (compiled.column_id, compiled.source)
+        values = self._columns.get(key)
+        if values is None:
+            column_id = compiled.column_id
+            if compiled.source == NUMBER:
+                values = [_to_number(row.get(column_id, "")) for row in self.data]
+            else:
+                case_sensitive = compiled.source == TEXT_CASE_SENSITIVE
+                values = [
+                    _to_text(row.get(column_id, ""), case_sensitive)
+                    for row in self.data
+                ]
+            self._columns[key] = values
+        return values
+
+
+class FilterEngine:
+    """表格筛选引擎
+
+    all组条件全部满足, any组条件满足其一(为空时不限制), 结果保持原有顺序.
+    """
+
+    def __init__(self) -> None:
+        self._snapshot: Optional[ColumnarSnapshot] = None
+        self._last_all: List[CompiledCondition] = []
+        self._last_any: List[CompiledCondition] = []
+        self._last_indices: Optional[List[int]] = None
+        self._pass_rates: Dict[Tuple[Any, ...], float] = {}
+
+    def invalidate(self) -> None:
+        """数据被原地修改后调用, 丢弃快照和上次结果"""
+        self._snapshot = None
+        self._last_indices = None
+
+    def filter(
+        self,
+        data: List[Dict[str, Any]],
+        all_conditions: Sequence[FilterCondition],
+        any_conditions: Sequence[FilterCondition] = (),
+    ) -> List[Dict[str, Any]]:
+        """筛选数据
+
+        Args:
+            data: 行数据列表
+            all_conditions: 需全部满足的条件
+            any_conditions: 满足其一即可的条件
+
+        Returns:
+            筛选后的行数据列表
+        """
+        indices = self.filter_indices(data, all_conditions, any_conditions)
+        return [data[i] for i in indices]
+
+    def filter_indices(
+        self,
+        data: List[Dict[str, Any]],
+        all_conditions: Sequence[FilterCondition],
+        any_conditions: Sequence[FilterCondition] = (),
+    ) -> List[int]:
+        """筛选数据并返回满足条件的行下标"""
+        if self._snapshot is None or not self._snapshot.is_current(data):
+            self._snapshot = ColumnarSnapshot(data)
+            self._last_indices = None
+
+        compiled_all = [cond.compile() for cond in all_conditions]
+        compiled_any = [cond.compile() for cond in any_conditions]
+
+        if self._last_indices is not None and self._narrows(compiled_all, compiled_any):
+            indices = self._last_indices
+        else:
+            indices = range(len(data))
+
+        for compiled in sorted(compiled_all, key=self._and_rank):
+            if not indices:
+                break
+            indices = self._select(compiled, indices)
+
+        if compiled_any and indices:
+            indices = self._select_any(compiled_any, indices)
+
+        indices = list(indices)
+        self._last_all = compiled_all
+        self._last_any = compiled_any
+        self._last_indices = indices
+        return indices
+
+    def _narrows(
+        self,
+        compiled_all: List[CompiledCondition],
+        compiled_any: List[CompiledCondition],
+    ) -> bool:
+        """判断新条件的结果是否一定是上次结果的子集"""
+        for old in self._last_all:
+            if not any(new.narrows(old) for new in compiled_all):
+                return False
+        if not self._last_any:
+            return True
+        if not compiled_any:
+            return False
+        return all(
+            any(new.narrows(old) for old in self._last_any) for new in compiled_any
+        )
+
+    def _select(self, compiled: CompiledCondition, indices: Sequence[int]) -> List[int]:
+        """执行单个条件并记录通过率"""
+        result = compiled.select(self._snapshot.column(compiled), indices)
+        if len(self._pass_rates) >= _MAX_STATS:
+            self._pass_rates.clear()
+        self._pass_rates[compiled.signature] = len(result) / len(indices)
+        return result
+
+    def _select_any(
+        self, compiled_any: List[CompiledCondition], indices: Sequence[int]
+    ) -> List[int]:
+        """执行any组条件, 已命中的行不再参与后续条件"""
+        matched: set = set()
+        remaining = indices
+        for compiled in sorted(compiled_any, key=self._or_rank):
+            hits = self._select(compiled, remaining)
+            if hits:
+                matched.update(hits)
+                remaining = [i for i in remaining if i not in matched]
+                if not remaining:
+                    break
+        return [i for i in indices if i in matched]
+
+    def _pass_rate(self, compiled: CompiledCondition) -> float:
+        rate = self._pass_rates.get(compiled.signature)
+        if rate is None:
+            rate = _DEFAULT_PASS_RATES.get(compiled.operator, 0.5)
+        return rate
+
+    def _and_rank(self, compiled: CompiledCondition) -> float:
+        """all组排序: 单位代价淘汰行数越多越靠前"""
+        return compiled.cost / max(1.0 - self._pass_rate(compiled), 1e-6)
+
+    def _or_rank(self, compiled: CompiledCondition) -> float:
+        """any组排序: 单位代价命中行数越多越靠前"""
+        return -self._pass_rate(compiled) / compiled.cost
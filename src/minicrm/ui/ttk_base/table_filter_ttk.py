@@ -11,152 +11,20 @@
 - 可扩展的筛选规则
 """
 
-from enum import Enum
 import logging
-import re
 import tkinter as tk
 from tkinter import ttk
 from typing import Any, Callable, Dict, List, Optional
 
 from minicrm.ui.ttk_base.base_widget import BaseWidget
+from minicrm.ui.ttk_base.table_filter_engine import (
+    FilterCondition,
+    FilterEngine,
+    FilterOperator,
+)
 
 
-class FilterOperator(Enum):
-    """筛选操作符枚举"""
-
-    EQUALS = "等于"
-    NOT_EQUALS = "不等于"
-    CONTAINS = "包含"
-    NOT_CONTAINS = "不包含"
-    STARTS_WITH = "开头是"
-    ENDS_WITH = "结尾是"
-    GREATER_THAN = "大于"
-    GREATER_EQUAL = "大于等于"
-    LESS_THAN = "小于"
-    LESS_EQUAL = "小于等于"
-    BETWEEN = "介于"
-    IN_LIST = "在列表中"
-    NOT_IN_LIST = "不在列表中"
-    IS_EMPTY = "为空"
-    IS_NOT_EMPTY = "不为空"
-    REGEX = "正则表达式"
-
-
-class FilterCondition:
-    """筛选条件类"""
-
-    def __init__(
-        self,
-        column_id: str,
-        operator: FilterOperator,
-        value: Any = None,
-        value2: Any = None,
-        case_sensitive: bool = False,
-    ):
-        self.column_id = column_id
-        self.operator = operator
-        self.value = value
-        self.value2 = value2  # 用于BETWEEN操作
-        self.case_sensitive = case_sensitive
-
-    def apply(self, row_data: Dict[str, Any]) -> bool:
-        """应用筛选条件到行数据
-
-        Args:
-            row_data: 行数据字典
-
-        Returns:
-            是否满足筛选条件
-        """
-        cell_value = row_data.get(self.column_id, "")
-
-        # 转换为字符串进行比较
-        cell_str = str(cell_value) if cell_value is not None else ""
-        filter_str = str(self.value) if self.value is not None else ""
-
-        # 大小写处理
-        if not self.case_sensitive:
-            cell_str = cell_str.lower()
-            filter_str = filter_str.lower()
-
-        try:
-            if self.operator == FilterOperator.EQUALS:
-                return cell_str == filter_str
-            if self.operator == FilterOperator.NOT_EQUALS:
-                return cell_str != filter_str
-            if self.operator == FilterOperator.CONTAINS:
-                return filter_str in cell_str
-            if self.operator == FilterOperator.NOT_CONTAINS:
-                return filter_str not in cell_str
-            if self.operator == FilterOperator.STARTS_WITH:
-                return cell_str.startswith(filter_str)
-            if self.operator == FilterOperator.ENDS_WITH:
-                return cell_str.endswith(filter_str)
-            if self.operator == FilterOperator.GREATER_THAN:
-                return self._numeric_compare(cell_value, self.value, ">")
-            if self.operator == FilterOperator.GREATER_EQUAL:
-                return self._numeric_compare(cell_value, self.value, ">=")
-            if self.operator == FilterOperator.LESS_THAN:
-                return self._numeric_compare(cell_value, self.value, "<")
-            if self.operator == FilterOperator.LESS_EQUAL:
-                return self._numeric_compare(cell_value, self.value, "<=")
-            if self.operator == FilterOperator.BETWEEN:
-                return self._between_compare(cell_value, self.value, self.value2)
-            if self.operator == FilterOperator.IN_LIST:
-                return self._in_list_compare(cell_str, filter_str)
-            if self.operator == FilterOperator.NOT_IN_LIST:
-                return not self._in_list_compare(cell_str, filter_str)
-            if self.operator == FilterOperator.IS_EMPTY:
-                return cell_str == "" or cell_value is None
-            if self.operator == FilterOperator.IS_NOT_EMPTY:
-                return cell_str != "" and cell_value is not None
-            if self.operator == FilterOperator.REGEX:
-                return bool(re.search(filter_str, cell_str))
-            return True
-
-        except Exception as e:
-            logging.getLogger(__name__).warning(f"筛选条件应用失败: {e}")
-            return True
-
-    def _numeric_compare(
-        self, cell_value: Any, filter_value: Any, operator: str
-    ) -> bool:
-        """数值比较"""
-        try:
-            cell_num = float(cell_value) if cell_value != "" else 0
-            filter_num = float(filter_value) if filter_value != "" else 0
-
-            if operator == ">":
-                return cell_num > filter_num
-            if operator == ">=":
-                return cell_num >= filter_num
-            if operator == "<":
-                return cell_num < filter_num
-            if operator == "<=":
-                return cell_num <= filter_num
-
-        except (ValueError, TypeError):
-            return False
-
-        return False
-
-    def _between_compare(self, cell_value: Any, min_value: Any, max_value: Any) -> bool:
-        """区间比较"""
-        try:
-            cell_num = float(cell_value) if cell_value != "" else 0
-            min_num = float(min_value) if min_value != "" else float("-inf")
-            max_num = float(max_value) if max_value != "" else float("inf")
-
-            return min_num <= cell_num <= max_num
-
-        except (ValueError, TypeError):
-            return False
-
-    def _in_list_compare(self, cell_str: str, filter_str: str) -> bool:
-        """列表包含比较"""
-        # 支持逗号分隔的列表
-        filter_list = [item.strip() for item in filter_str.split(",")]
-        return cell_str in filter_list
+__all__ = ["FilterCondition", "FilterOperator", "TableFilterTTK"]
 
 
 class TableFilterTTK(BaseWidget):
@@ -179,13 +47,16 @@ class TableFilterTTK(BaseWidget):
 
         Args:
             parent: 父组件
-            columns: 列定义列表
+            columns: 列定义列表, searchable为False的列不参与搜索和筛选
             show_quick_search: 是否显示快速搜索
             show_advanced_filter: 是否显示高级筛选
             enable_filter_history: 是否启用筛选历史
         """
         # 筛选配置
         self.columns = columns
+        self.searchable_columns = [
+            col for col in columns if col.get("searchable", True)
+        ]
         self.show_quick_search = show_quick_search
         self.show_advanced_filter = show_advanced_filter
         self.enable_filter_history = enable_filter_history
@@ -194,6 +65,7 @@ class TableFilterTTK(BaseWidget):
         self.filter_conditions: List[FilterCondition] = []
         self.quick_search_text = ""
         self.filter_history: List[Dict[str, Any]] = []
+        self.filter_engine = FilterEngine()
 
         # UI组件
         self.search_entry = None
@@ -244,7 +116,7 @@ class TableFilterTTK(BaseWidget):
         ttk.Label(search_input_frame, text="在列:").pack(side=tk.LEFT, padx=(10, 0))
 
         column_options = ["所有列"] + [
-            col.get("text", col["id"]) for col in self.columns
+            col.get("text", col["id"]) for col in self.searchable_columns
         ]
         self.search_column_combo = ttk.Combobox(
             search_input_frame, values=column_options, width=15, state="readonly"
@@ -350,8 +222,8 @@ class TableFilterTTK(BaseWidget):
         # 添加新的快速搜索条件
         if search_text:
             if search_column == "所有列":
-                # 在所有列中搜索
-                for col in self.columns:
+                # 在所有可搜索的列中搜索
+                for col in self.searchable_columns:
                     condition = FilterCondition(
                         col["id"],
                         FilterOperator.CONTAINS,
@@ -363,7 +235,7 @@ class TableFilterTTK(BaseWidget):
             else:
                 # 在指定列中搜索
                 column_id = None
-                for col in self.columns:
+                for col in self.searchable_columns:
                     if col.get("text", col["id"]) == search_column:
                         column_id = col["id"]
                         break
@@ -406,13 +278,14 @@ class TableFilterTTK(BaseWidget):
         # 列选择
         column_combo = ttk.Combobox(
             condition_frame,
-            values=[col.get("text", col["id"]) for col in self.columns],
+            values=[col.get("text", col["id"]) for col in self.searchable_columns],
             width=15,
             state="readonly",
         )
         column_combo.pack(side=tk.LEFT, padx=(0, 5))
-        if self.columns:
-            column_combo.set(self.columns[0].get("text", self.columns[0]["id"]))
+        if self.searchable_columns:
+            first_column = self.searchable_columns[0]
+            column_combo.set(first_column.get("text", first_column["id"]))
 
         # 操作符选择
         operator_combo = ttk.Combobox(
@@ -479,7 +352,7 @@ class TableFilterTTK(BaseWidget):
                 # 获取列ID
                 column_text = widgets["column"].get()
                 column_id = None
-                for col in self.columns:
+                for col in self.searchable_columns:
                     if col.get("text", col["id"]) == column_text:
                         column_id = col["id"]
                         break
@@ -537,6 +410,9 @@ class TableFilterTTK(BaseWidget):
     def apply_filters(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """应用筛选条件到数据
 
+        条件由筛选引擎编译执行; 原地修改了data中的行时需先调用
+        filter_engine.invalidate().
+
         Args:
             data: 原始数据列表
 
@@ -546,40 +422,44 @@ class TableFilterTTK(BaseWidget):
         if not self.filter_conditions:
             return data
 
-        filtered_data = []
-
-        for row_data in data:
-            # 快速搜索条件(OR逻辑)
-            quick_search_conditions = [
-                cond
-                for cond in self.filter_conditions
-                if hasattr(cond, "_is_quick_search")
-            ]
-
-            # 高级筛选条件(AND逻辑)
-            advanced_conditions = [
-                cond
-                for cond in self.filter_conditions
-                if not hasattr(cond, "_is_quick_search")
-            ]
-
-            # 检查快速搜索条件
-            quick_search_match = True
-            if quick_search_conditions:
-                quick_search_match = any(
-                    cond.apply(row_data) for cond in quick_search_conditions
-                )
-
-            # 检查高级筛选条件
-            advanced_match = all(cond.apply(row_data) for cond in advanced_conditions)
+        # 快速搜索条件(OR逻辑), 高级筛选条件(AND逻辑)
+        quick_search_conditions = []
+        advanced_conditions = []
+        for cond in self.filter_conditions:
+            if hasattr(cond, "_is_quick_search"):
+                quick_search_conditions.append(cond)
+            else:
+                advanced_conditions.append(cond)
 
-            # 同时满足快速搜索和高级筛选
-            if quick_search_match and advanced_match:
-                filtered_data.append(row_data)
+        filtered_data = self.filter_engine.filter(
+            data, advanced_conditions, quick_search_conditions
+        )
 
         self.logger.info(f"筛选结果: {len(filtered_data)}/{len(data)} 条记录")
         return filtered_data
 
+    def get_query_filters(self) -> Dict[str, List[Dict[str, Any]]]:
+        """获取可交给数据源执行的筛选条件
+
+        快速搜索条件放入any(满足其一即可), 高级筛选条件放入all(全部满足),
+        语义与apply_filters一致.
+
+        Returns:
+            {"all": [...], "any": [...]}格式的筛选条件
+        """
+        query_filters: Dict[str, List[Dict[str, Any]]] = {"all": [], "any": []}
+        for cond in self.filter_conditions:
+            group = "any" if hasattr(cond, "_is_quick_search") else "all"
+            query_filters[group].append(
+                {
+                    "column": cond.column_id,
+                    "operator": cond.operator.name.lower(),
+                    "value": cond.value,
+                    "value2": cond.value2,
+                }
+            )
+        return query_filters
+
     def get_current_filters(self) -> Dict[str, Any]:
         """获取当前筛选条件
 
@@ -601,5 +481,6 @@ class TableFilterTTK(BaseWidget):
         """清理资源"""
         self.filter_conditions.clear()
         self.filter_history.clear()
+        self.filter_engine.invalidate()
         self.on_filter_changed = None
         self.logger.info("筛选组件资源已清理")
@@ -17,6 +17,7 @@ from .statistics import (
     calculate_average,
     calculate_growth_rate,
     calculate_pagination,
+    calculate_period_buckets,
     calculate_weighted_average,
 )
 
@@ -36,6 +37,7 @@ __all__ = [
     # 统计计算
     "calculate_pagination",
     "calculate_growth_rate",
+    "calculate_period_buckets",
     "calculate_average",
     "calculate_weighted_average",
 ]
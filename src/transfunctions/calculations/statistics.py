@@ -7,6 +7,7 @@ Transfunctions - 统计计算
 import logging
 import math
 from dataclasses import dataclass
+from datetime import date, timedelta
 from typing import Any
 
 
@@ -179,6 +180,84 @@ def calculate_weighted_average(values: list[tuple[int | float, float]]) -> float
     return total_weighted_value / total_weight
 
 
+_QUARTER_LABELS = ("第一季度", "第二季度", "第三季度", "第四季度")
+
+
+def calculate_period_buckets(
+    granularity: str, count: int, end_date: date | None = None
+) -> list[dict[str, Any]]:
+    """计算截至指定日期的最近若干个时间段
+
+    时间段的key与SQLite中按同一粒度分组得到的值一致:
+    daily为YYYY-MM-DD, weekly为周一日期, monthly为YYYY-MM,
+    quarterly为YYYY-Qn, yearly为YYYY.
+
+    Args:
+        granularity: 时间粒度 ("daily", "weekly", "monthly", "quarterly", "yearly")
+        count: 时间段数量
+        end_date: 最后一个时间段包含的日期, 默认为今天
+
+    Returns:
+        List[Dict[str, Any]]: 按时间升序的时间段,
+            包含key、label、start(含)和end(不含)
+
+    Raises:
+        CalculationError: 当时间粒度不受支持时
+    """
+    end_date = end_date or date.today()
+    buckets: list[dict[str, Any]] = []
+
+    if granularity == "daily":
+        for offset in range(count - 1, -1, -1):
+            start = end_date - timedelta(days=offset)
+            buckets.append(
+                {
+                    "key": start.isoformat(),
+                    "label": start.strftime("%m-%d"),
+                    "start": start,
+                    "end": start + timedelta(days=1),
+                }
+            )
+    elif granularity == "weekly":
+        monday = end_date - timedelta(days=end_date.weekday())
+        for offset in range(count - 1, -1, -1):
+            start = monday - timedelta(weeks=offset)
+            buckets.append(
+                {
+                    "key": start.isoformat(),
+                    "label": f"{start.strftime('%m-%d')}周",
+                    "start": start,
+                    "end": start + timedelta(weeks=1),
+                }
+            )
+    elif granularity in ("monthly", "quarterly", "yearly"):
+        months = {"monthly": 1, "quarterly": 3, "yearly": 12}[granularity]
+        # 以月份序号计算, 避免逐月加减日期
+        current = end_date.year * 12 + (end_date.month - 1) // months * months
+        for offset in range(count - 1, -1, -1):
+            index = current - offset * months
+            start = date(index // 12, index % 12 + 1, 1)
+            next_index = index + months
+            end = date(next_index // 12, next_index % 12 + 1, 1)
+
+            if granularity == "monthly":
+                key, label = start.strftime("%Y-%m"), f"{start.month}月"
+            elif granularity == "quarterly":
+                quarter = (start.month - 1) // 3
+                key = f"{start.year}-Q{quarter + 1}"
+                label = _QUARTER_LABELS[quarter]
+            else:
+                key, label = str(start.year), f"{start.year}年"
+
+            buckets.append({"key": key, "label": label, "start": start, "end": end})
+    else:
+        raise CalculationError(
+            f"不支持的时间粒度: {granularity}", {"granularity": granularity}
+        )
+
+    return buckets
+
+
 def _get_empty_pagination(page_size: int) -> dict[str, int]:
     """获取空的分页信息"""
     return {
@@ -9,24 +9,33 @@ Transfunctions - 数据操作模块
 """
 
 from .crud_templates import (
+    DEFAULT_CHUNK_SIZE,
     CRUDTemplate,
     batch_operation_template,
     create_crud_template,
     paginated_search_template,
 )
 from .data_converter import convert_dict_to_model, convert_row_to_dict
-from .query_builder import QueryBuilder, build_search_query
+from .query_builder import (
+    QueryBuilder,
+    build_search_query,
+    decode_cursor,
+    encode_cursor,
+)
 
 
 __all__ = [
     # CRUD模板
     "CRUDTemplate",
+    "DEFAULT_CHUNK_SIZE",
     "create_crud_template",
     "paginated_search_template",
     "batch_operation_template",
     # 查询构建器
     "QueryBuilder",
     "build_search_query",
+    "encode_cursor",
+    "decode_cursor",
     # 数据转换
     "convert_row_to_dict",
     "convert_dict_to_model",
@@ -7,12 +7,16 @@ Transfunctions - CRUD操作模板
 
 import logging
 from abc import ABC, abstractmethod
-from collections.abc import Callable
+from collections.abc import Callable, Iterator
 from typing import Any
 
 from minicrm.core.exceptions import DatabaseError, ValidationError
 
 
+# 批量操作的默认每块记录数, IN列表的参数个数也受此限制
+DEFAULT_CHUNK_SIZE = 500
+
+
 class CRUDTemplate(ABC):
     """
     CRUD操作模板基类
@@ -179,6 +183,246 @@ class CRUDTemplate(ABC):
             self.logger.error(f"删除{self.table_name}记录失败: {e}")
             raise DatabaseError(f"删除{self.table_name}记录失败: {e}") from e
 
+    def create_many(
+        self, records: list[dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> list[int]:
+        """
+        批量创建记录模板
+
+        所有记录在一个事务中按块执行executemany, 任一块失败整批回滚.
+
+        Args:
+            records: 要创建的数据列表, 每条记录的字段必须相同
+            chunk_size: 每块记录数
+
+        Returns:
+            List[int]: 新创建记录的ID, 与records顺序一致
+
+        Raises:
+            ValidationError: 记录字段不一致
+            DatabaseError: 数据库操作失败
+        """
+        if not records:
+            return []
+        columns = _common_columns(records)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = (
+            f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+            f"VALUES ({placeholders})"
+        )
+        chunks = _chunks(records, chunk_size)
+
+        try:
+            record_ids: list[int] = []
+            with self.db_manager.transaction():
+                for chunk in chunks:
+                    self.db_manager.execute_many(
+                        sql, [tuple(data[c] for c in columns) for data in chunk]
+                    )
+                    if "id" in columns:
+                        record_ids.extend(data["id"] for data in chunk)
+                        continue
+                    # 同一事务内连续插入, 自增ID连续分配
+                    last_id = self.db_manager.execute_query(
+                        "SELECT last_insert_rowid()"
+                    )[0][0]
+                    record_ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+
+            self.logger.info(f"批量创建{self.table_name}记录{len(record_ids)}条")
+            return record_ids
+
+        except Exception as e:
+            self.logger.error(f"批量创建{self.table_name}记录失败: {e}")
+            raise DatabaseError(f"批量创建{self.table_name}记录失败: {e}") from e
+
+    def update_many(
+        self,
+        updates: list[tuple[int, dict[str, Any]]],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        批量更新记录模板
+
+        更新字段相同的记录共用一条UPDATE语句, 在一个事务中按块执行executemany.
+
+        Args:
+            updates: (记录ID, 更新数据)列表
+            chunk_size: 每块记录数
+
+        Returns:
+            int: 更新的记录数
+        """
+        groups: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+        for record_id, data in updates:
+            columns = tuple(key for key in data if key != "id")
+            if columns:
+                params = (*(data[c] for c in columns), record_id)
+                groups.setdefault(columns, []).append(params)
+        if not groups:
+            return 0
+        statements = []
+        for columns, params_list in groups.items():
+            set_clause = ", ".join(f"{c} = ?" for c in columns)
+            sql = f"UPDATE {self.table_name} SET {set_clause} WHERE id = ?"
+            statements.append((sql, _chunks(params_list, chunk_size)))
+
+        try:
+            updated_count = 0
+            with self.db_manager.transaction():
+                for sql, chunks in statements:
+                    for chunk in chunks:
+                        updated_count += self.db_manager.execute_many(sql, chunk)
+
+            self.logger.info(f"批量更新{self.table_name}记录{updated_count}条")
+            return updated_count
+
+        except Exception as e:
+            self.logger.error(f"批量更新{self.table_name}记录失败: {e}")
+            raise DatabaseError(f"批量更新{self.table_name}记录失败: {e}") from e
+
+    def update_by_ids(
+        self,
+        record_ids: list[int],
+        data: dict[str, Any],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        将多条记录更新为相同的值
+
+        每块记录执行一条UPDATE ... WHERE id IN (...)语句.
+
+        Args:
+            record_ids: 记录ID列表
+            data: 更新数据
+            chunk_size: 每块记录数, 不能超过SQLite的参数个数上限
+
+        Returns:
+            int: 更新的记录数
+        """
+        columns = [key for key in data if key != "id"]
+        if not record_ids or not columns:
+            return 0
+        set_clause = ", ".join(f"{c} = ?" for c in columns)
+        values = tuple(data[c] for c in columns)
+        chunks = _chunks(list(record_ids), chunk_size)
+
+        try:
+            updated_count = 0
+            with self.db_manager.transaction():
+                for chunk in chunks:
+                    placeholders = ", ".join("?" for _ in chunk)
+                    updated_count += self.db_manager.execute_update(
+                        f"UPDATE {self.table_name} SET {set_clause} "
+                        f"WHERE id IN ({placeholders})",
+                        (*values, *chunk),
+                    )
+
+            self.logger.info(f"批量更新{self.table_name}记录{updated_count}条")
+            return updated_count
+
+        except Exception as e:
+            self.logger.error(f"批量更新{self.table_name}记录失败: {e}")
+            raise DatabaseError(f"批量更新{self.table_name}记录失败: {e}") from e
+
+    def upsert_many(
+        self,
+        records: list[dict[str, Any]],
+        conflict_columns: tuple[str, ...] = ("id",),
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> int:
+        """
+        批量插入或更新记录模板
+
+        使用INSERT ... ON CONFLICT DO UPDATE, 冲突时更新除冲突列和created_at
+        以外的字段. conflict_columns必须对应主键或唯一索引.
+
+        Args:
+            records: 数据列表, 每条记录的字段必须相同且包含冲突列
+            conflict_columns: 判断记录是否已存在的列
+            chunk_size: 每块记录数
+
+        Returns:
+            int: 插入和更新的记录数
+
+        Raises:
+            ValidationError: 记录字段不一致或缺少冲突列
+            DatabaseError: 数据库操作失败
+        """
+        if not records:
+            return 0
+        columns = _common_columns(records)
+        missing = [c for c in conflict_columns if c not in columns]
+        if missing:
+            raise ValidationError(f"批量插入或更新缺少冲突列: {', '.join(missing)}")
+
+        update_columns = [
+            c for c in columns if c not in conflict_columns and c != "created_at"
+        ]
+        if update_columns:
+            action = "DO UPDATE SET " + ", ".join(
+                f"{c} = excluded.{c}" for c in update_columns
+            )
+        else:
+            action = "DO NOTHING"
+        placeholders = ", ".join("?" for _ in columns)
+        sql = (
+            f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+            f"VALUES ({placeholders}) "
+            f"ON CONFLICT ({', '.join(conflict_columns)}) {action}"
+        )
+        chunks = _chunks(records, chunk_size)
+
+        try:
+            affected_count = 0
+            with self.db_manager.transaction():
+                for chunk in chunks:
+                    affected_count += self.db_manager.execute_many(
+                        sql, [tuple(data[c] for c in columns) for data in chunk]
+                    )
+
+            self.logger.info(f"批量插入或更新{self.table_name}记录{affected_count}条")
+            return affected_count
+
+        except Exception as e:
+            self.logger.error(f"批量插入或更新{self.table_name}记录失败: {e}")
+            raise DatabaseError(f"批量插入或更新{self.table_name}记录失败: {e}") from e
+
+    def delete_many(
+        self, record_ids: list[int], chunk_size: int = DEFAULT_CHUNK_SIZE
+    ) -> int:
+        """
+        批量删除记录模板
+
+        每块记录执行一条DELETE ... WHERE id IN (...)语句, 在一个事务中完成.
+
+        Args:
+            record_ids: 记录ID列表
+            chunk_size: 每块记录数, 不能超过SQLite的参数个数上限
+
+        Returns:
+            int: 删除的记录数
+        """
+        if not record_ids:
+            return 0
+        chunks = _chunks(list(record_ids), chunk_size)
+
+        try:
+            deleted_count = 0
+            with self.db_manager.transaction():
+                for chunk in chunks:
+                    placeholders = ", ".join("?" for _ in chunk)
+                    deleted_count += self.db_manager.execute_delete(
+                        f"DELETE FROM {self.table_name} WHERE id IN ({placeholders})",
+                        tuple(chunk),
+                    )
+
+            self.logger.info(f"批量删除{self.table_name}记录{deleted_count}条")
+            return deleted_count
+
+        except Exception as e:
+            self.logger.error(f"批量删除{self.table_name}记录失败: {e}")
+            raise DatabaseError(f"批量删除{self.table_name}记录失败: {e}") from e
+
     def search(
         self,
         conditions: dict[str, Any] | None = None,
@@ -199,33 +443,7 @@ class CRUDTemplate(ABC):
             List[Dict[str, Any]]: 搜索结果列表
         """
         try:
-            sql = f"SELECT * FROM {self.table_name}"
-            params = []
-
-            # 构建WHERE子句
-            if conditions:
-                where_clauses = []
-                for key, value in conditions.items():
-                    if isinstance(value, (list, tuple)):
-                        # IN查询
-                        placeholders = ", ".join(["?" for _ in value])
-                        where_clauses.append(f"{key} IN ({placeholders})")
-                        params.extend(value)
-                    elif isinstance(value, str) and "%" in value:
-                        # LIKE查询
-                        where_clauses.append(f"{key} LIKE ?")
-                        params.append(value)
-                    else:
-                        # 等值查询
-                        where_clauses.append(f"{key} = ?")
-                        params.append(value)
-
-                if where_clauses:
-                    sql += " WHERE " + " AND ".join(where_clauses)
-
-            # 添加排序
-            if order_by:
-                sql += f" ORDER BY {order_by}"
+            sql, params = self._build_search_sql(conditions, order_by)
 
             # 添加分页
             if limit:
@@ -234,13 +452,85 @@ class CRUDTemplate(ABC):
                     sql += f" OFFSET {offset}"
 
             # 执行查询
-            results = self.db_manager.execute_query(sql, tuple(params))
+            results = self.db_manager.execute_query(sql, params)
             return [self._row_to_dict(row) for row in results]
 
         except Exception as e:
             self.logger.error(f"搜索{self.table_name}记录失败: {e}")
             raise DatabaseError(f"搜索{self.table_name}记录失败: {e}") from e
 
+    def stream_batches(
+        self,
+        conditions: dict[str, Any] | None = None,
+        order_by: str | None = None,
+        batch_size: int = 500,
+    ) -> Iterator[list[dict[str, Any]]]:
+        """
+        流式搜索记录模板
+
+        使用数据库管理器的游标批量读取接口, 避免一次性加载全部结果.
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+            batch_size: 每批记录数
+
+        Yields:
+            List[Dict[str, Any]]: 每批记录
+        """
+        sql, params = self._build_search_sql(conditions, order_by)
+        try:
+            for batch in self.db_manager.iter_query_batches(sql, params, batch_size):
+                yield [self._row_to_dict(row) for row in batch]
+        except DatabaseError:
+            raise
+        except Exception as e:
+            self.logger.error(f"流式读取{self.table_name}记录失败: {e}")
+            raise DatabaseError(f"流式读取{self.table_name}记录失败: {e}") from e
+
+    def _build_search_sql(
+        self, conditions: dict[str, Any] | None, order_by: str | None
+    ) -> tuple[str, tuple[Any, ...]]:
+        """
+        构建搜索SQL(不含分页)
+
+        Args:
+            conditions: 搜索条件
+            order_by: 排序字段
+
+        Returns:
+            Tuple[str, Tuple]: SQL语句和参数
+        """
+        sql = f"SELECT * FROM {self.table_name}"
+        params = []
+
+        # 构建WHERE子句
+        if conditions:
+            where_clauses = []
+            for key, value in conditions.items():
+                if isinstance(value, (list, tuple)):
+                    # IN查询
+                    placeholders = ", ".join(["?" for _ in value])
+                    where_clauses.append(f"{key} IN ({placeholders})")
+                    params.extend(value)
+                elif isinstance(value, str) and "%" in value:
+                    # LIKE查询
+                    where_clauses.append(f"{key} LIKE ?")
+                    params.append(value)
+                else:
+                    # 等值查询
+                    where_clauses.append(f"{key} = ?")
+                    params.append(value)
+
+            if where_clauses:
+                sql += " WHERE " + " AND ".join(where_clauses)
+
+        # 添加排序
+        if order_by:
+            sql += f" ORDER BY {order_by}"
+
+        return sql, tuple(params)
+
     def count(self, conditions: dict[str, Any] | None = None) -> int:
         """
         统计记录数量模板
@@ -437,3 +727,20 @@ def batch_operation_template(
     except Exception as e:
         crud_template.logger.error(f"批量{operation}操作失败: {e}")
         raise DatabaseError(f"批量{operation}操作失败: {e}") from e
+
+
+def _chunks(items: list[Any], chunk_size: int) -> list[list[Any]]:
+    """按块大小切分列表"""
+    if chunk_size < 1:
+        raise ValidationError(f"批量操作块大小必须大于0: {chunk_size}")
+    return [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+
+def _common_columns(records: list[dict[str, Any]]) -> list[str]:
+    """返回批量记录共同的字段, executemany要求每条记录字段相同"""
+    columns = list(records[0])
+    expected = set(columns)
+    for index, data in enumerate(records):
+        if set(data) != expected:
+            raise ValidationError(f"批量记录第{index + 1}条的字段与第1条不同")
+    return columns
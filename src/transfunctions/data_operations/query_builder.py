@@ -4,7 +4,9 @@ Transfunctions - 查询构建器
 提供动态SQL查询构建功能，支持复杂的搜索条件和查询优化。
 """
 
+import base64
 from enum import Enum
+import json
 from typing import Any
 
 
@@ -62,6 +64,8 @@ class QueryBuilder:
         self.order_by_fields: list[str] = []
         self.limit_value: int | None = None
         self.offset_value: int | None = None
+        self.seek_condition: str | None = None
+        self.seek_params: list[Any] = []
 
     def select(self, *fields: str) -> "QueryBuilder":
         """
@@ -179,6 +183,38 @@ class QueryBuilder:
         """
         return self.where(field, ComparisonOperator.IN, values, logical_op)
 
+    def where_any(
+        self,
+        fields: list[str],
+        operator: ComparisonOperator | str,
+        value: Any,
+        logical_op: LogicalOperator = LogicalOperator.AND,
+    ) -> "QueryBuilder":
+        """
+        添加"任一字段满足"条件, 各字段以OR连接并整体加括号
+
+        Args:
+            fields: 字段名列表
+            operator: 比较操作符, 只支持单值操作符
+            value: 比较值
+            logical_op: 逻辑操作符（与前一个条件的关系）
+
+        Returns:
+            QueryBuilder: 查询构建器实例
+        """
+        if isinstance(operator, str):
+            operator = ComparisonOperator(operator)
+        if not fields:
+            return self
+
+        condition = " OR ".join(f"{field} {operator.value} ?" for field in fields)
+        condition = f"({condition})"
+        self.where_params.extend([value] * len(fields))
+        if self.where_conditions:
+            condition = f"{logical_op.value} {condition}"
+        self.where_conditions.append(condition)
+        return self
+
     def group_by(self, *fields: str) -> "QueryBuilder":
         """
         设置GROUP BY字段
@@ -274,6 +310,77 @@ class QueryBuilder:
         offset = (page - 1) * page_size
         return self.limit(page_size).offset(offset)
 
+    def seek(
+        self,
+        field: str,
+        direction: str = "ASC",
+        after: tuple[Any, Any] | None = None,
+        id_field: str = "id",
+    ) -> "QueryBuilder":
+        """
+        设置键集(seek)分页
+
+        按(field, id_field)排序, 并只返回排在after之后的记录. 与OFFSET分页不同,
+        翻页代价与页码无关, 且翻页期间插入或删除记录不会导致重复或遗漏.
+        field为NULL的记录按SQLite的规则排在升序最前、降序最后.
+
+        Args:
+            field: 排序字段, 应有以它开头的索引
+            direction: 排序方向(ASC或DESC), id_field使用相同方向
+            after: 上一页最后一条记录的(排序值, ID), 为None时从第一条开始
+            id_field: 唯一ID字段, 用于排序值相同时确定顺序
+
+        Returns:
+            QueryBuilder: 查询构建器实例
+        """
+        direction = direction.upper()
+        if direction not in ["ASC", "DESC"]:
+            raise ValueError("排序方向必须是ASC或DESC")
+
+        if field == id_field:
+            self.order_by(id_field, direction)
+        else:
+            self.order_by(field, direction).order_by(id_field, direction)
+
+        if after is None:
+            self.seek_condition = None
+            self.seek_params = []
+            return self
+
+        value, last_id = after
+        op = ">" if direction == "ASC" else "<"
+        if field == id_field:
+            self.seek_condition = f"{id_field} {op} ?"
+            self.seek_params = [last_id]
+        elif value is None and direction == "ASC":
+            self.seek_condition = (
+                f"(({field} IS NULL AND {id_field} > ?) OR {field} IS NOT NULL)"
+            )
+            self.seek_params = [last_id]
+        elif value is None:
+            self.seek_condition = f"({field} IS NULL AND {id_field} < ?)"
+            self.seek_params = [last_id]
+        elif direction == "ASC":
+            self.seek_condition = f"({field}, {id_field}) > (?, ?)"
+            self.seek_params = [value, last_id]
+        else:
+            self.seek_condition = f"(({field}, {id_field}) < (?, ?) OR {field} IS NULL)"
+            self.seek_params = [value, last_id]
+        return self
+
+    def _build_where(self, include_seek: bool) -> tuple[str | None, list[Any]]:
+        """构建WHERE子句, 键集条件与已有条件整体以AND连接"""
+        params = list(self.where_params)
+        clause = " ".join(self.where_conditions) if self.where_conditions else None
+        if include_seek and self.seek_condition:
+            clause = (
+                f"({clause}) AND {self.seek_condition}"
+                if clause
+                else self.seek_condition
+            )
+            params.extend(self.seek_params)
+        return clause, params
+
     def build(self) -> tuple[str, list[Any]]:
         """
         构建SQL查询语句
@@ -290,10 +397,9 @@ class QueryBuilder:
             sql_parts.extend(self.joins)
 
         # 添加WHERE
-        params = []
-        if self.where_conditions:
-            sql_parts.append(f"WHERE {' '.join(self.where_conditions)}")
-            params.extend(self.where_params)
+        where_clause, params = self._build_where(include_seek=True)
+        if where_clause:
+            sql_parts.append(f"WHERE {where_clause}")
 
         # 添加GROUP BY
         if self.group_by_fields:
@@ -321,11 +427,13 @@ class QueryBuilder:
         """
         构建COUNT查询语句
 
+        统计的是整个结果集, 不受键集分页条件影响. 带GROUP BY的查询按分组数统计.
+
         Returns:
-            Tuple[str, List[Any]]: (COUNT SQL语句, 参数列表)
+            Tuple[str, List[Any]]: (COUNT SQL语句, 参数列表), 结果列名为count
         """
         # 构建COUNT查询（不包含ORDER BY, LIMIT, OFFSET）
-        sql_parts = ["SELECT COUNT(*)"]
+        sql_parts = ["SELECT 1" if self.group_by_fields else "SELECT COUNT(*) AS count"]
         sql_parts.append(f"FROM {self.table_name}")
 
         # 添加JOIN
@@ -333,10 +441,9 @@ class QueryBuilder:
             sql_parts.extend(self.joins)
 
         # 添加WHERE
-        params = []
-        if self.where_conditions:
-            sql_parts.append(f"WHERE {' '.join(self.where_conditions)}")
-            params.extend(self.where_params)
+        where_clause, params = self._build_where(include_seek=False)
+        if where_clause:
+            sql_parts.append(f"WHERE {where_clause}")
 
         # 添加GROUP BY
         if self.group_by_fields:
@@ -348,9 +455,51 @@ class QueryBuilder:
             params.extend(self.having_params)
 
         sql = " ".join(sql_parts)
+        if self.group_by_fields:
+            sql = f"SELECT COUNT(*) AS count FROM ({sql})"
         return sql, params
 
 
+def encode_cursor(signature: str, value: Any, last_id: Any) -> str:
+    """
+    生成键集分页的不透明游标
+
+    Args:
+        signature: 查询签名, 游标只能用于签名相同的查询
+        value: 当前页最后一条记录的排序值
+        last_id: 当前页最后一条记录的ID
+
+    Returns:
+        str: URL安全的游标字符串
+    """
+    payload = json.dumps([signature, value, last_id], ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str, signature: str) -> tuple[Any, Any]:
+    """
+    解析键集分页游标
+
+    Args:
+        cursor: encode_cursor生成的游标
+        signature: 当前查询的签名
+
+    Returns:
+        Tuple[Any, Any]: (排序值, ID), 可直接传给QueryBuilder.seek的after参数
+
+    Raises:
+        ValueError: 游标格式错误或不属于当前查询
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        cursor_signature, value, last_id = payload
+    except (ValueError, TypeError) as e:
+        raise ValueError("无效的分页游标") from e
+    if cursor_signature != signature:
+        raise ValueError("分页游标与当前查询不匹配")
+    return value, last_id
+
+
 def build_search_query(
     table_name: str,
     search_fields: list[str],
@@ -142,6 +142,33 @@ def sample_service_ticket_data() -> dict:
 
 
 # Pytest configuration
+def pytest_addoption(parser):
+    """Add options for the synthetic-data scale benchmarks."""
+    group = parser.getgroup("minicrm-scale", "MiniCRM scale benchmarks")
+    group.addoption(
+        "--scale",
+        default="10k",
+        help="synthetic data scale for benchmarks: 10k, 100k or 1m (default: 10k)",
+    )
+    group.addoption(
+        "--update-baselines",
+        action="store_true",
+        default=False,
+        help="record benchmark medians as the new baselines instead of comparing",
+    )
+    group.addoption(
+        "--regression-threshold",
+        type=float,
+        default=None,
+        help="allowed slowdown over baseline, e.g. 0.25 for 25%% (default: from file)",
+    )
+    group.addoption(
+        "--synthetic-cache-dir",
+        default=None,
+        help="directory for cached synthetic databases (default: system temp dir)",
+    )
+
+
 def pytest_configure(config):
     """Configure pytest with custom markers."""
     config.addinivalue_line(
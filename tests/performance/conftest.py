@@ -0,0 +1,146 @@
+"""规模基准测试的公共夹具
+
+- 按 --scale 生成(或复用缓存的)合成数据库
+- 将基准测试中位数与存储的基线比较, 超出阈值视为性能回退
+- 使用 --update-baselines 时改为记录新的基线
+"""
+
+import json
+from pathlib import Path
+import tempfile
+
+import pytest
+
+from minicrm.data.database import DatabaseManager
+from tests.performance.synthetic_data import (
+    SyntheticDataConfig,
+    build_cached_database,
+)
+
+
+BASELINES_PATH = Path(__file__).parent / "baselines" / "scale_benchmarks.json"
+
+# 基线文件未指定阈值时允许的变慢比例
+DEFAULT_REGRESSION_THRESHOLD = 0.25
+
+
+class BaselineStore:
+    """
+    基准测试基线
+
+    基线按数据规模保存各基准测试的耗时中位数(秒).
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        scale: str,
+        threshold: float | None = None,
+        update: bool = False,
+    ):
+        """
+        初始化基线
+
+        Args:
+            path: 基线文件路径
+            scale: 数据规模
+            threshold: 允许的变慢比例, 为None时使用基线文件中的值
+            update: 是否记录新的基线而不是比较
+        """
+        self._path = path
+        self._scale = scale
+        self._update = update
+        self._data = (
+            json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+        )
+        if threshold is None:
+            threshold = self._data.get("threshold", DEFAULT_REGRESSION_THRESHOLD)
+        self.threshold = threshold
+        self._recorded: dict[str, float] = {}
+
+    def get(self, name: str) -> float | None:
+        """获取基准测试在当前规模下的基线中位数"""
+        return self._data.get("scales", {}).get(self._scale, {}).get(name)
+
+    def check(self, name: str, benchmark) -> None:
+        """
+        检查基准测试结果是否超出基线阈值
+
+        Args:
+            name: 基准测试名称
+            benchmark: pytest-benchmark夹具, 需已完成测量
+        """
+        median = benchmark.stats.stats.median
+        if self._update:
+            self._recorded[name] = median
+            return
+
+        baseline = self.get(name)
+        if baseline is None:
+            return
+        limit = baseline * (1 + self.threshold)
+        if median > limit:
+            pytest.fail(
+                f"{name} 性能回退({self._scale}): 中位数 {median * 1000:.2f}ms, "
+                f"基线 {baseline * 1000:.2f}ms, 允许上限 {limit * 1000:.2f}ms"
+            )
+
+    def save(self) -> None:
+        """写入记录的新基线, 其他规模和基准测试的基线保持不变"""
+        if not self._recorded:
+            return
+        self._data.setdefault("threshold", self.threshold)
+        scales = self._data.setdefault("scales", {})
+        scales.setdefault(self._scale, {}).update(
+            {name: round(value, 6) for name, value in self._recorded.items()}
+        )
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._path.write_text(
+            json.dumps(self._data, ensure_ascii=False, indent=2, sort_keys=True) + "\n",
+            encoding="utf-8",
+        )
+
+
+@pytest.fixture(scope="session")
+def scale_name(pytestconfig) -> str:
+    """当前基准测试的数据规模"""
+    return pytestconfig.getoption("--scale").lower()
+
+
+@pytest.fixture(scope="session")
+def synthetic_config(scale_name) -> SyntheticDataConfig:
+    """当前规模的合成数据配置"""
+    try:
+        return SyntheticDataConfig.for_scale(scale_name)
+    except ValueError as e:
+        raise pytest.UsageError(str(e)) from e
+
+
+@pytest.fixture(scope="session")
+def synthetic_database(pytestconfig, synthetic_config) -> Path:
+    """已写入合成数据的数据库文件, 跨会话缓存, 测试不应修改"""
+    cache_dir = pytestconfig.getoption("--synthetic-cache-dir")
+    if cache_dir is None:
+        cache_dir = Path(tempfile.gettempdir()) / "minicrm-benchmarks"
+    return build_cached_database(synthetic_config, Path(cache_dir))
+
+
+@pytest.fixture(scope="session")
+def synthetic_db_manager(synthetic_database):
+    """连接合成数据库的数据库管理器"""
+    manager = DatabaseManager(synthetic_database)
+    yield manager
+    manager.close()
+
+
+@pytest.fixture(scope="session")
+def baselines(pytestconfig, scale_name):
+    """基准测试基线, 更新模式下在会话结束时写入"""
+    store = BaselineStore(
+        BASELINES_PATH,
+        scale_name,
+        threshold=pytestconfig.getoption("--regression-threshold"),
+        update=pytestconfig.getoption("--update-baselines"),
+    )
+    yield store
+    store.save()
@@ -0,0 +1,267 @@
+"""MiniCRM启动导入耗时分析器
+
+基于 ``python -X importtime`` 在全新解释器中测量冷启动导入耗时:
+- 按模块统计自身耗时和累计耗时
+- 按顶层包汇总耗时
+- 检查启动路径中不应出现的重量级库(pandas、reportlab等)
+- 冷启动导入耗时超过预算时返回非零退出码, 可作为基准测试门禁
+
+使用方法:
+    python tests/performance/import_time_profiler.py [--module MODULE]
+        [--budget-ms BUDGET] [--runs RUNS] [--top N] [--json PATH]
+
+作者: MiniCRM开发团队
+"""
+
+import argparse
+from dataclasses import asdict, dataclass, field
+import json
+import os
+from pathlib import Path
+import re
+import subprocess
+import sys
+import time
+
+
+project_root = Path(__file__).parent.parent.parent
+
+# 默认分析的启动入口模块
+DEFAULT_MODULE = "minicrm.application_ttk"
+
+# 默认冷启动导入预算(毫秒)
+DEFAULT_BUDGET_MS = 1500.0
+
+# 只在导入/导出、PDF、监控等功能首次使用时才应加载的库
+DEFAULT_FORBIDDEN = ("pandas", "reportlab", "psutil", "openpyxl", "docx", "numpy")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$")
+
+
+@dataclass
+class ImportRecord:
+    """单个模块的导入耗时"""
+
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+@dataclass
+class ImportProfile:
+    """一次冷启动的导入耗时分析结果"""
+
+    module: str
+    records: list[ImportRecord] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    @property
+    def total_ms(self) -> float:
+        """顶层导入累计耗时之和, 即冷启动导入总耗时"""
+        return sum(r.cumulative_ms for r in self.records if r.depth == 0)
+
+    def top_modules(self, limit: int = 20) -> list[ImportRecord]:
+        """自身耗时最高的模块"""
+        return sorted(self.records, key=lambda r: r.self_ms, reverse=True)[:limit]
+
+    def by_package(self) -> dict[str, float]:
+        """按顶层包汇总的自身耗时, 从高到低排列"""
+        totals: dict[str, float] = {}
+        for record in self.records:
+            package = record.module.split(".", 1)[0]
+            totals[package] = totals.get(package, 0.0) + record.self_ms
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+    def imported(self, package: str) -> bool:
+        """包或其子模块是否在启动时被导入"""
+        prefix = f"{package}."
+        return any(
+            r.module == package or r.module.startswith(prefix) for r in self.records
+        )
+
+    def to_dict(self, limit: int = 20) -> dict:
+        """转换为可序列化的字典"""
+        return {
+            "module": self.module,
+            "total_ms": round(self.total_ms, 3),
+            "wall_ms": round(self.wall_ms, 3),
+            "module_count": len(self.records),
+            "top_modules": [asdict(r) for r in self.top_modules(limit)],
+            "packages": {k: round(v, 3) for k, v in self.by_package().items()},
+        }
+
+
+def parse_importtime(output: str) -> list[ImportRecord]:
+    """
+    解析 ``-X importtime`` 输出
+
+    Args:
+        output: 解释器的标准错误输出
+
+    Returns:
+        List[ImportRecord]: 按导入完成顺序排列的模块耗时, 其他行被忽略
+    """
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match is None:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        records.append(
+            ImportRecord(
+                module=module,
+                self_ms=int(self_us) / 1000,
+                cumulative_ms=int(cumulative_us) / 1000,
+                depth=(len(indent) - 1) // 2,
+            )
+        )
+    return records
+
+
+def profile_imports(module: str = DEFAULT_MODULE) -> ImportProfile:
+    """
+    在全新解释器中导入模块并分析导入耗时
+
+    Args:
+        module: 要导入的模块
+
+    Returns:
+        ImportProfile: 导入耗时分析结果
+
+    Raises:
+        RuntimeError: 导入失败
+    """
+    env = dict(os.environ)
+    python_path = [str(project_root / "src"), env.get("PYTHONPATH", "")]
+    env["PYTHONPATH"] = os.pathsep.join(p for p in python_path if p)
+
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+
+    if result.returncode != 0:
+        raise RuntimeError(f"导入{module}失败:\n{result.stderr[-2000:]}")
+
+    return ImportProfile(module, parse_importtime(result.stderr), wall_ms)
+
+
+def best_of(module: str = DEFAULT_MODULE, runs: int = 3) -> ImportProfile:
+    """
+    多次测量取导入总耗时最低的一次, 降低磁盘缓存和系统负载的干扰
+
+    Args:
+        module: 要导入的模块
+        runs: 测量次数
+
+    Returns:
+        ImportProfile: 耗时最低的一次分析结果
+    """
+    profiles = [profile_imports(module) for _ in range(max(1, runs))]
+    return min(profiles, key=lambda p: p.total_ms)
+
+
+def check_budget(
+    profile: ImportProfile,
+    budget_ms: float,
+    forbidden: tuple[str, ...] = DEFAULT_FORBIDDEN,
+) -> list[str]:
+    """
+    检查冷启动导入是否超出预算
+
+    Args:
+        profile: 导入耗时分析结果
+        budget_ms: 导入总耗时预算(毫秒)
+        forbidden: 启动时不应导入的包
+
+    Returns:
+        List[str]: 违规说明, 为空表示通过
+    """
+    violations = []
+    if profile.total_ms > budget_ms:
+        violations.append(
+            f"冷启动导入耗时 {profile.total_ms:.1f}ms 超出预算 {budget_ms:.1f}ms"
+        )
+    for package in forbidden:
+        if profile.imported(package):
+            violations.append(f"启动时导入了应延迟加载的库: {package}")
+    return violations
+
+
+def print_report(profile: ImportProfile, limit: int = 20) -> None:
+    """打印导入耗时报告"""
+    print(f"模块: {profile.module}")
+    print(f"导入模块数: {len(profile.records)}")
+    print(f"导入总耗时: {profile.total_ms:.1f}ms (进程总耗时 {profile.wall_ms:.1f}ms)")
+
+    print(f"\n自身耗时最高的 {limit} 个模块:")
+    print(f"{'自身(ms)':>10} {'累计(ms)':>10}  模块")
+    for record in profile.top_modules(limit):
+        print(
+            f"{record.self_ms:>10.2f} {record.cumulative_ms:>10.2f}  "
+            f"{'  ' * record.depth}{record.module}"
+        )
+
+    print("\n按顶层包汇总:")
+    for package, total in list(profile.by_package().items())[:limit]:
+        print(f"{total:>10.2f}  {package}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MiniCRM启动导入耗时分析器")
+    parser.add_argument(
+        "--module",
+        default=DEFAULT_MODULE,
+        help=f"启动入口模块 (默认: {DEFAULT_MODULE})",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"冷启动导入预算, 毫秒 (默认: {DEFAULT_BUDGET_MS:g})",
+    )
+    parser.add_argument("--runs", type=int, default=3, help="测量次数, 取最快一次")
+    parser.add_argument("--top", type=int, default=20, help="报告中列出的模块数")
+    parser.add_argument(
+        "--allow",
+        action="append",
+        default=[],
+        help="允许在启动时导入的重量级库, 可重复指定",
+    )
+    parser.add_argument("--json", type=Path, help="将结果写入JSON文件")
+
+    args = parser.parse_args(argv)
+
+    profile = best_of(args.module, args.runs)
+    forbidden = tuple(p for p in DEFAULT_FORBIDDEN if p not in args.allow)
+    violations = check_budget(profile, args.budget_ms, forbidden)
+
+    print_report(profile, args.top)
+
+    if args.json:
+        report = profile.to_dict(args.top)
+        report.update(budget_ms=args.budget_ms, violations=violations)
+        args.json.parent.mkdir(parents=True, exist_ok=True)
+        args.json.write_text(
+            json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8"
+        )
+
+    if violations:
+        print("\n❌ 启动导入检查未通过:")
+        for violation in violations:
+            print(f"  - {violation}")
+        return 1
+
+    print(f"\n✅ 启动导入检查通过 (预算 {args.budget_ms:g}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
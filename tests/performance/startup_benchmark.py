@@ -0,0 +1,296 @@
+"""MiniCRM启动阶段基准测试
+
+在全新解释器中按真实入口(minicrm.main)的步骤启动应用程序, 记录各阶段耗时:
+- 配置加载、日志初始化
+- 应用程序模块导入
+- 依赖配置、数据库初始化、服务创建、服务集成
+- 主窗口构建和首帧渲染(有显示环境时)
+
+每次运行使用独立的用户目录和按指定规模生成的合成数据库, 结果写入:
+- startup_timeline.json: 每次运行的阶段时间线和按阶段汇总的统计
+- startup_trace.json: Chrome trace格式, 可在 chrome://tracing 或 Perfetto 中查看
+
+无显示环境(如CI)下自动以无界面模式运行, 跳过主窗口和首帧渲染阶段.
+
+使用方法:
+    python tests/performance/startup_benchmark.py [--records N] [--runs RUNS]
+        [--ui auto|on|off] [--budget-ms BUDGET] [--output-dir OUTPUT_DIR]
+
+作者: MiniCRM开发团队
+"""
+
+import argparse
+import json
+import os
+from pathlib import Path
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+project_root = Path(__file__).parent.parent.parent
+
+# 默认合成数据规模(客户数量)
+DEFAULT_RECORDS = 1000
+
+# 默认启动耗时预算(毫秒), 按各次运行的中位数检查
+DEFAULT_BUDGET_MS = 3000.0
+
+
+def app_database_path(home: Path) -> Path:
+    """应用程序在指定用户目录下使用的数据库路径"""
+    return home / "Library" / "Application Support" / "MiniCRM" / "minicrm.db"
+
+
+def has_display() -> bool:
+    """当前环境能否创建Tk窗口"""
+    if sys.platform.startswith(("win", "darwin")):
+        return True
+    return bool(os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY"))
+
+
+def seed_database(db_path: Path, records: int) -> None:
+    """
+    创建数据库并写入合成数据
+
+    Args:
+        db_path: 数据库文件路径
+        records: 客户数量, 其他表按合成数据的默认比例生成
+    """
+    from tests.performance.synthetic_data import (
+        SyntheticDataConfig,
+        generate_database,
+    )
+
+    generate_database(db_path, SyntheticDataConfig(customers=records))
+
+
+def run_startup(ui: bool) -> dict:
+    """
+    按minicrm.main的步骤启动应用程序并返回时间线
+
+    在子进程中调用, 不进入主事件循环.
+
+    Args:
+        ui: 是否创建主窗口并渲染首帧
+
+    Returns:
+        dict: 包含JSON时间线和Chrome trace的字典
+    """
+    from minicrm.core.startup_timeline import get_startup_timeline
+
+    timeline = get_startup_timeline()
+    with timeline.phase("entry_import"):
+        from minicrm import main
+
+    main.setup_application()
+    config = main.get_config()
+
+    with timeline.phase("application_import"):
+        from minicrm.application_ttk import MiniCRMApplicationTTK
+
+    app = None
+    try:
+        with timeline.phase("application_init"):
+            app = MiniCRMApplicationTTK(config, headless=not ui)
+        app.render_first_frame()
+        timeline.mark("ready")
+        timeline.finish()
+        return {"timeline": timeline.to_dict(), "trace": timeline.to_chrome_trace()}
+    finally:
+        if app is not None:
+            app.shutdown()
+        main.cleanup_application()
+
+
+def _run_child(home: Path, *args: str) -> str:
+    """在使用独立用户目录的子进程中执行本脚本"""
+    env = dict(os.environ)
+    env["HOME"] = str(home)
+    python_path = [str(project_root / "src"), str(project_root), env.get("PYTHONPATH")]
+    env["PYTHONPATH"] = os.pathsep.join(p for p in python_path if p)
+    result = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"子进程执行失败:\n{result.stderr[-4000:]}")
+    return result.stdout
+
+
+def summarize(runs: list[dict]) -> dict:
+    """
+    按阶段汇总多次运行的耗时
+
+    Args:
+        runs: 每次运行的结果, 包含timeline和process_ms
+
+    Returns:
+        dict: 总耗时和各阶段耗时的中位数、最小值和最大值(毫秒)
+    """
+
+    def stats(values: list[float]) -> dict:
+        return {
+            "median_ms": round(statistics.median(values), 3),
+            "min_ms": round(min(values), 3),
+            "max_ms": round(max(values), 3),
+        }
+
+    phases: dict[str, list[float]] = {}
+    for run in runs:
+        for phase in run["timeline"]["phases"]:
+            phases.setdefault(phase["name"], []).append(phase["duration_ms"])
+
+    return {
+        "total": stats([run["timeline"]["total_ms"] for run in runs]),
+        "process": stats([run["process_ms"] for run in runs]),
+        "phases": {name: stats(values) for name, values in phases.items()},
+    }
+
+
+def run_benchmark(records: int, runs: int, ui: bool) -> dict:
+    """
+    在合成数据库上多次冷启动应用程序
+
+    Args:
+        records: 合成数据规模
+        runs: 启动次数
+        ui: 是否创建主窗口并渲染首帧
+
+    Returns:
+        dict: 运行参数、每次运行的结果和汇总统计
+    """
+    with tempfile.TemporaryDirectory(prefix="minicrm-startup-") as temp_dir:
+        home = Path(temp_dir)
+        _run_child(home, "--seed", str(records))
+
+        results = []
+        for _ in range(max(1, runs)):
+            start = time.perf_counter()
+            output = _run_child(home, "--child", "--ui", "on" if ui else "off")
+            process_ms = (time.perf_counter() - start) * 1000
+            result = json.loads(output.strip().splitlines()[-1])
+            result["process_ms"] = round(process_ms, 3)
+            results.append(result)
+
+    return {
+        "records": records,
+        "runs": len(results),
+        "ui": ui,
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "summary": summarize(results),
+        "results": results,
+    }
+
+
+def write_reports(report: dict, output_dir: Path) -> tuple[Path, Path]:
+    """
+    写入JSON时间线和Chrome trace文件
+
+    Args:
+        report: run_benchmark的返回值
+        output_dir: 输出目录
+
+    Returns:
+        Tuple[Path, Path]: JSON时间线和Chrome trace文件路径
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timeline_path = output_dir / "startup_timeline.json"
+    trace_path = output_dir / "startup_trace.json"
+
+    timeline = {k: v for k, v in report.items() if k != "results"}
+    timeline["runs_detail"] = [
+        {"process_ms": r["process_ms"], **r["timeline"]} for r in report["results"]
+    ]
+    timeline_path.write_text(
+        json.dumps(timeline, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+
+    # 每次运行是独立进程, 在trace中按进程分行显示
+    events = [event for r in report["results"] for event in r["trace"]["traceEvents"]]
+    trace = {"traceEvents": events, "displayTimeUnit": "ms"}
+    trace_path.write_text(json.dumps(trace, ensure_ascii=False), encoding="utf-8")
+    return timeline_path, trace_path
+
+
+def print_summary(report: dict) -> None:
+    """打印汇总结果"""
+    summary = report["summary"]
+    mode = "界面" if report["ui"] else "无界面"
+    print(
+        f"合成数据: 客户 {report['records']} 条, {mode}模式, 运行 {report['runs']} 次"
+    )
+    print(f"启动总耗时中位数: {summary['total']['median_ms']:.1f}ms")
+    process_ms = summary["process"]["median_ms"]
+    print(f"进程总耗时中位数(含解释器启动和关闭): {process_ms:.1f}ms\n")
+    print(f"{'中位数(ms)':>12} {'最小(ms)':>10} {'最大(ms)':>10}  阶段")
+    for name, stats in summary["phases"].items():
+        print(
+            f"{stats['median_ms']:>12.2f} {stats['min_ms']:>10.2f} "
+            f"{stats['max_ms']:>10.2f}  {name}"
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MiniCRM启动阶段基准测试")
+    parser.add_argument(
+        "--records",
+        type=int,
+        default=DEFAULT_RECORDS,
+        help=f"合成数据规模, 客户数量 (默认: {DEFAULT_RECORDS})",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="启动次数 (默认: 5)")
+    parser.add_argument(
+        "--ui",
+        choices=["auto", "on", "off"],
+        default="auto",
+        help="是否创建主窗口, auto表示有显示环境时创建 (默认: auto)",
+    )
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"启动总耗时中位数预算, 毫秒 (默认: {DEFAULT_BUDGET_MS:g})",
+    )
+    parser.add_argument(
+        "--output-dir", default="reports", help="报告输出目录 (默认: reports)"
+    )
+    parser.add_argument("--seed", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+
+    args = parser.parse_args(argv)
+
+    if args.seed is not None:
+        seed_database(app_database_path(Path.home()), args.seed)
+        return 0
+    if args.child:
+        result = run_startup(ui=args.ui == "on")
+        print(json.dumps(result, ensure_ascii=False))
+        return 0
+
+    ui = has_display() if args.ui == "auto" else args.ui == "on"
+    report = run_benchmark(args.records, args.runs, ui)
+    timeline_path, trace_path = write_reports(report, Path(args.output_dir))
+
+    print_summary(report)
+    print(f"\n时间线: {timeline_path}")
+    print(f"Chrome trace: {trace_path}")
+
+    median_ms = report["summary"]["total"]["median_ms"]
+    if median_ms > args.budget_ms:
+        print(f"\n❌ 启动耗时 {median_ms:.1f}ms 超出预算 {args.budget_ms:g}ms")
+        return 1
+
+    print(f"\n✅ 启动耗时在预算内 (预算 {args.budget_ms:g}ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
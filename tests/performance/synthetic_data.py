@@ -0,0 +1,574 @@
+"""MiniCRM合成数据生成器
+
+按生产数据规模生成确定性的合成数据, 覆盖完整业务表结构:
+- 客户、供应商
+- 报价及报价明细
+- 合同
+- 客户互动、供应商互动
+- 财务记录
+- 任务
+
+相同的配置(规模、随机种子、参考日期)总是生成相同的数据, 日期以参考日期
+为基准而不是当前时间. 每张表以一条executemany流式写入, 内存占用与规模无关.
+生成的数据库可按配置缓存复用, 避免每次基准测试都重新生成百万级数据.
+
+使用方法:
+    python tests/performance/synthetic_data.py --scale 100k --output crm.db
+
+作者: MiniCRM开发团队
+"""
+
+import argparse
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+import hashlib
+import json
+from pathlib import Path
+import random
+import sys
+import time
+
+
+project_root = Path(__file__).parent.parent.parent
+if str(project_root / "src") not in sys.path:
+    sys.path.insert(0, str(project_root / "src"))
+
+from minicrm.data.database import DatabaseManager  # noqa: E402
+
+
+# 预设规模(客户数量), 其他表按比例生成
+SCALES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# 生成规则变化时递增, 使缓存的数据库失效
+GENERATOR_VERSION = 2
+
+_CITIES = (
+    "上海", "北京", "广州", "深圳", "杭州", "苏州", "南京", "成都", "武汉", "重庆",
+    "天津", "西安", "长沙", "郑州", "青岛", "宁波", "佛山", "东莞", "合肥", "厦门",
+)  # fmt: skip
+_BRANDS = (
+    "恒达", "华美", "金源", "鑫盛", "宏图", "远洋", "瑞丰", "嘉禾", "新材", "绿森",
+    "兴业", "永泰", "和信", "德润", "中联", "天成", "卓越", "安居", "林海", "名匠",
+)  # fmt: skip
+_INDUSTRIES = ("家具", "装饰", "建材", "木业", "板材", "家居", "门业", "橱柜")
+_COMPANY_SUFFIXES = ("有限公司", "贸易公司", "制造厂", "工程公司")
+_SURNAMES = "张王李赵刘陈杨黄周吴徐孙马朱胡郭何林罗高"
+_TITLES = ("经理", "总", "主任", "工", "先生", "女士")
+_PRODUCTS = (
+    ("生态板", "E0级"), ("生态板", "E1级"), ("家具板", "多层"), ("家具板", "颗粒"),
+    ("阻燃板", "B1级"), ("密度板", "中纤"), ("胶合板", "桉木"), ("饰面板", "三聚氰胺"),
+)  # fmt: skip
+_THICKNESS = ("9mm", "12mm", "15mm", "18mm")
+_CONTRACT_STATUSES = (
+    ("active", 40), ("completed", 25), ("signed", 10), ("draft", 8),
+    ("pending", 7), ("expired", 6), ("terminated", 4),
+)  # fmt: skip
+_TASK_PRIORITIES = (("low", 20), ("medium", 50), ("high", 25), ("urgent", 5))
+_TASK_STATUSES = (("pending", 35), ("in_progress", 20), ("completed", 40))
+_INTERACTION_SUBJECTS = ("电话回访", "上门拜访", "报价沟通", "样品确认", "售后跟进")
+
+
+@dataclass(frozen=True)
+class SyntheticDataConfig:
+    """合成数据配置, 各表数量由客户数量乘以比例得到"""
+
+    customers: int
+    seed: int = 20240101
+    reference_date: date = date(2025, 6, 30)
+    history_days: int = 3 * 365
+    suppliers_per_customer: float = 0.1
+    quotes_per_customer: float = 1.0
+    items_per_quote: int = 3
+    contracts_per_quote: float = 0.5
+    interactions_per_customer: float = 2.0
+    interactions_per_supplier: float = 1.0
+    financial_records_per_contract: float = 2.0
+    tasks_per_customer: float = 0.5
+
+    @classmethod
+    def for_scale(cls, scale: str, **overrides) -> "SyntheticDataConfig":
+        """
+        按预设规模创建配置
+
+        Args:
+            scale: 预设规模名称, 见SCALES
+            **overrides: 覆盖的配置项
+
+        Returns:
+            SyntheticDataConfig: 合成数据配置
+        """
+        try:
+            customers = SCALES[scale.lower()]
+        except KeyError:
+            raise ValueError(
+                f"未知的数据规模: {scale}, 可选: {', '.join(SCALES)}"
+            ) from None
+        return cls(customers=customers, **overrides)
+
+    def row_counts(self) -> dict[str, int]:
+        """各表生成的记录数"""
+        suppliers = max(1, int(self.customers * self.suppliers_per_customer))
+        quotes = int(self.customers * self.quotes_per_customer)
+        contracts = int(quotes * self.contracts_per_quote)
+        return {
+            "customers": self.customers,
+            "suppliers": suppliers,
+            "quotes": quotes,
+            "quote_items": quotes * self.items_per_quote,
+            "contracts": contracts,
+            "customer_interactions": int(
+                self.customers * self.interactions_per_customer
+            ),
+            "supplier_interactions": int(suppliers * self.interactions_per_supplier),
+            "financial_records": int(contracts * self.financial_records_per_contract),
+            "tasks": int(self.customers * self.tasks_per_customer),
+        }
+
+    def cache_name(self) -> str:
+        """按配置内容生成的缓存文件名"""
+        content = json.dumps(asdict(self), default=str, sort_keys=True)
+        digest = hashlib.sha1(content.encode("utf-8")).hexdigest()[:12]
+        return f"minicrm-{self.customers}-v{GENERATOR_VERSION}-{digest}.db"
+
+
+def _mix(index: int, salt: int) -> int:
+    """把序号映射为确定性的伪随机整数, 用于需要跨表一致的属性"""
+    value = (index * 0x9E3779B1 + salt * 0x85EBCA77) & 0xFFFFFFFF
+    value ^= value >> 15
+    value = (value * 0x2C1B3C6D) & 0xFFFFFFFF
+    return value ^ (value >> 12)
+
+
+def _weighted(rng: random.Random, choices: tuple) -> str:
+    """按权重随机选择"""
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+class SyntheticDataGenerator:
+    """
+    合成数据生成器
+
+    在已初始化的数据库中按配置追加合成数据. 记录ID从各表当前最大ID之后
+    连续分配, 外键按序号计算, 不需要回查数据库.
+    """
+
+    def __init__(self, config: SyntheticDataConfig):
+        """
+        初始化生成器
+
+        Args:
+            config: 合成数据配置
+        """
+        self._config = config
+        self._counts = config.row_counts()
+        reference = datetime.combine(config.reference_date, datetime.min.time())
+        self._reference = reference
+        self._start = reference - timedelta(days=config.history_days)
+        self._first_ids: dict[str, int] = {}
+        self._lookup_ids: dict[str, list[int]] = {}
+
+    def populate(self, db: DatabaseManager) -> dict[str, int]:
+        """
+        初始化数据库结构并写入合成数据
+
+        Args:
+            db: 数据库管理器
+
+        Returns:
+            Dict[str, int]: 各表写入的记录数
+        """
+        db.initialize_database()
+        # 示例数据带有当前时间戳, 删除后合成数据才能逐字节重现
+        with db.transaction() as connection:
+            for table in _SAMPLE_TABLES:
+                connection.execute(f"DELETE FROM {table}")
+            placeholders = ", ".join("?" for _ in _SAMPLE_TABLES)
+            connection.execute(
+                f"DELETE FROM sqlite_sequence WHERE name IN ({placeholders})",
+                _SAMPLE_TABLES,
+            )
+        for table in ("customer_types", "quote_statuses", "interaction_types"):
+            rows = db.execute_query(f"SELECT id FROM {table} ORDER BY id")
+            self._lookup_ids[table] = [row[0] for row in rows]
+
+        written = {}
+        for table, sql, rows in (
+            ("customers", _CUSTOMER_SQL, self._customers),
+            ("suppliers", _SUPPLIER_SQL, self._suppliers),
+            ("quotes", _QUOTE_SQL, self._quotes),
+            ("quote_items", _QUOTE_ITEM_SQL, self._quote_items),
+            ("contracts", _CONTRACT_SQL, self._contracts),
+            ("customer_interactions", _CUSTOMER_INTERACTION_SQL, self._interactions),
+            (
+                "supplier_interactions",
+                _SUPPLIER_INTERACTION_SQL,
+                self._supplier_interactions,
+            ),
+            ("financial_records", _FINANCIAL_SQL, self._financial_records),
+            ("tasks", _TASK_SQL, self._tasks),
+        ):
+            result = db.execute_query(f"SELECT COALESCE(MAX(id), 0) FROM {table}")
+            self._first_ids[table] = result[0][0] + 1
+            written[table] = db.execute_many(sql, rows())
+        return written
+
+    # ==================== 通用属性 ====================
+
+    def _timestamp(self, rng: random.Random) -> datetime:
+        """历史区间内的随机时间, 越接近参考日期越密集"""
+        offset = self._config.history_days * (rng.random() ** 0.7)
+        return self._reference - timedelta(days=offset, seconds=rng.randrange(86400))
+
+    def _rng(self, table: str) -> random.Random:
+        return random.Random(f"{self._config.seed}:{table}")
+
+    def _customer_name(self, index: int) -> str:
+        h = _mix(index, 1)
+        return (
+            f"{_CITIES[h % len(_CITIES)]}{_BRANDS[(h >> 5) % len(_BRANDS)]}"
+            f"{_INDUSTRIES[(h >> 10) % len(_INDUSTRIES)]}"
+            f"{_COMPANY_SUFFIXES[(h >> 14) % len(_COMPANY_SUFFIXES)]}"
+        )
+
+    def _person(self, rng: random.Random) -> str:
+        return f"{rng.choice(_SURNAMES)}{rng.choice(_TITLES)}"
+
+    def _customer_id(self, index: int) -> int:
+        return self._first_ids["customers"] + index % self._counts["customers"]
+
+    def _quote_item_prices(self, quote_index: int) -> list[tuple[float, float]]:
+        """报价明细的(数量, 单价), 报价总额与明细之和一致"""
+        prices = []
+        for item in range(self._config.items_per_quote):
+            h = _mix(quote_index * 8 + item, 2)
+            quantity = float(10 + h % 490)
+            unit_price = round(45 + (h >> 9) % 260 + ((h >> 17) % 100) / 100, 2)
+            prices.append((quantity, unit_price))
+        return prices
+
+    # ==================== 各表记录 ====================
+
+    def _customers(self) -> Iterator[tuple]:
+        rng = self._rng("customers")
+        type_ids = self._lookup_ids["customer_types"]
+        for i in range(self._counts["customers"]):
+            created = self._timestamp(rng)
+            city = _CITIES[_mix(i, 1) % len(_CITIES)]
+            yield (
+                self._customer_name(i),
+                f"1{rng.choice('3589')}{i:09d}",
+                f"customer{i}@example.com" if rng.random() < 0.7 else None,
+                f"{city}市{rng.choice(_BRANDS)}路{rng.randint(1, 999)}号",
+                type_ids[_mix(i, 3) % len(type_ids)] if type_ids else None,
+                self._person(rng),
+                None,
+                created.isoformat(sep=" ", timespec="seconds"),
+                created.isoformat(sep=" ", timespec="seconds"),
+            )
+
+    def _suppliers(self) -> Iterator[tuple]:
+        rng = self._rng("suppliers")
+        for i in range(self._counts["suppliers"]):
+            created = self._timestamp(rng)
+            yield (
+                f"{rng.choice(_CITIES)}{rng.choice(_BRANDS)}板材供应{i:06d}",
+                f"0{rng.randint(10, 999)}-{rng.randint(10000000, 99999999)}",
+                f"supplier{i}@example.com",
+                f"{rng.choice(_CITIES)}工业园区{rng.randint(1, 300)}号",
+                self._person(rng),
+                round(rng.uniform(2.5, 5.0), 1),
+                rng.randint(0, 15),
+                None,
+                created.isoformat(sep=" ", timespec="seconds"),
+                created.isoformat(sep=" ", timespec="seconds"),
+            )
+
+    def _quotes(self) -> Iterator[tuple]:
+        rng = self._rng("quotes")
+        status_ids = self._lookup_ids["quote_statuses"]
+        for i in range(self._counts["quotes"]):
+            customer_index = _mix(i, 4) % self._counts["customers"]
+            quoted = self._timestamp(rng)
+            total = sum(round(q * p, 2) for q, p in self._quote_item_prices(i))
+            yield (
+                f"SQ{self._config.seed % 10000:04d}{i:08d}",
+                self._customer_id(customer_index),
+                self._customer_name(customer_index),
+                round(total, 2),
+                quoted.date().isoformat(),
+                (quoted + timedelta(days=30)).date().isoformat(),
+                rng.choice(status_ids) if status_ids else None,
+                None,
+                quoted.isoformat(sep=" ", timespec="seconds"),
+                quoted.isoformat(sep=" ", timespec="seconds"),
+            )
+
+    def _quote_items(self) -> Iterator[tuple]:
+        first_quote = self._first_ids["quotes"]
+        created = self._reference.isoformat(sep=" ", timespec="seconds")
+        for i in range(self._counts["quotes"]):
+            for item, (quantity, unit_price) in enumerate(self._quote_item_prices(i)):
+                product, grade = _PRODUCTS[_mix(i * 8 + item, 5) % len(_PRODUCTS)]
+                thickness = _THICKNESS[_mix(i * 8 + item, 6) % len(_THICKNESS)]
+                yield (
+                    first_quote + i,
+                    product,
+                    f"1220x2440x{thickness} {grade}",
+                    "张",
+                    quantity,
+                    unit_price,
+                    round(quantity * unit_price, 2),
+                    None,
+                    created,
+                )
+
+    def _contracts(self) -> Iterator[tuple]:
+        rng = self._rng("contracts")
+        first_quote = self._first_ids["quotes"]
+        for i in range(self._counts["contracts"]):
+            # 第i份合同来自第i份报价, 客户和金额与报价一致
+            customer_index = _mix(i, 4) % self._counts["customers"]
+            amount = sum(round(q * p, 2) for q, p in self._quote_item_prices(i))
+            signed = self._timestamp(rng)
+            ends = signed + timedelta(days=rng.choice((90, 180, 365)))
+            yield (
+                f"SC{self._config.seed % 10000:04d}{i:08d}",
+                self._customer_id(customer_index),
+                first_quote + i,
+                round(amount, 2),
+                signed.date().isoformat(),
+                ends.date().isoformat(),
+                _weighted(rng, _CONTRACT_STATUSES),
+                None,
+                signed.isoformat(sep=" ", timespec="seconds"),
+                signed.isoformat(sep=" ", timespec="seconds"),
+            )
+
+    def _interactions(self) -> Iterator[tuple]:
+        yield from self._interaction_rows("customer_interactions", "customers")
+
+    def _supplier_interactions(self) -> Iterator[tuple]:
+        yield from self._interaction_rows("supplier_interactions", "suppliers")
+
+    def _interaction_rows(self, table: str, party: str) -> Iterator[tuple]:
+        rng = self._rng(table)
+        type_ids = self._lookup_ids["interaction_types"]
+        first_party = self._first_ids[party]
+        parties = self._counts[party]
+        for _ in range(self._counts[table]):
+            happened = self._timestamp(rng)
+            follow_up = rng.random() < 0.3
+            follow_up_date = happened + timedelta(days=7)
+            yield (
+                first_party + rng.randrange(parties),
+                rng.choice(type_ids) if type_ids else None,
+                happened.isoformat(sep=" ", timespec="seconds"),
+                rng.choice(_INTERACTION_SUBJECTS),
+                None,
+                follow_up,
+                follow_up_date.date().isoformat() if follow_up else None,
+                self._person(rng),
+                happened.isoformat(sep=" ", timespec="seconds"),
+            )
+
+    def _financial_records(self) -> Iterator[tuple]:
+        rng = self._rng("financial_records")
+        first_contract = self._first_ids["contracts"]
+        first_supplier = self._first_ids["suppliers"]
+        contracts = self._counts["contracts"]
+        for i in range(self._counts["financial_records"]):
+            contract_index = i % contracts
+            created = self._timestamp(rng)
+            due = created + timedelta(days=rng.choice((30, 60, 90)))
+            if rng.random() < 0.75:
+                # 应收款: 关联合同和客户
+                customer_id = self._customer_id(_mix(contract_index, 4))
+                supplier_id, record_type = None, "receivable"
+            else:
+                customer_id, record_type = None, "payable"
+                supplier_id = first_supplier + rng.randrange(self._counts["suppliers"])
+            if due < self._reference and rng.random() < 0.8:
+                status = "paid"
+                paid = (due - timedelta(days=rng.randint(0, 20))).date().isoformat()
+            else:
+                status = "overdue" if due < self._reference else "pending"
+                paid = None
+            yield (
+                customer_id,
+                supplier_id,
+                first_contract + contract_index,
+                record_type,
+                round(rng.uniform(1_000, 200_000), 2),
+                due.date().isoformat(),
+                paid,
+                status,
+                None,
+                created.isoformat(sep=" ", timespec="seconds"),
+                created.isoformat(sep=" ", timespec="seconds"),
+            )
+
+    def _tasks(self) -> Iterator[tuple]:
+        rng = self._rng("tasks")
+        for i in range(self._counts["tasks"]):
+            created = self._timestamp(rng)
+            status = _weighted(rng, _TASK_STATUSES)
+            completed = created + timedelta(days=rng.randint(1, 14))
+            yield (
+                f"{rng.choice(_INTERACTION_SUBJECTS)}任务{i:07d}",
+                None,
+                self._customer_id(rng.randrange(self._counts["customers"])),
+                None,
+                (created + timedelta(days=rng.randint(1, 30))).date().isoformat(),
+                _weighted(rng, _TASK_PRIORITIES),
+                status,
+                self._person(rng),
+                self._person(rng),
+                created.isoformat(sep=" ", timespec="seconds"),
+                created.isoformat(sep=" ", timespec="seconds"),
+                completed.isoformat(sep=" ", timespec="seconds")
+                if status == "completed"
+                else None,
+            )
+
+
+# initialize_database写入的示例业务数据, 按外键依赖顺序删除
+_SAMPLE_TABLES = ("quotes", "customers", "suppliers")
+
+_CUSTOMER_SQL = """
+    INSERT INTO customers (
+        name, phone, email, address, customer_type_id, contact_person, notes,
+        created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SUPPLIER_SQL = """
+    INSERT INTO suppliers (
+        name, phone, email, address, contact_person, quality_rating,
+        cooperation_years, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_QUOTE_SQL = """
+    INSERT INTO quotes (
+        quote_number, customer_id, customer_name, total_amount, quote_date,
+        valid_until, quote_status_id, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_QUOTE_ITEM_SQL = """
+    INSERT INTO quote_items (
+        quote_id, product_name, specification, unit, quantity, unit_price,
+        total_price, notes, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_CONTRACT_SQL = """
+    INSERT INTO contracts (
+        contract_number, customer_id, quote_id, contract_amount, start_date,
+        end_date, status, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_CUSTOMER_INTERACTION_SQL = """
+    INSERT INTO customer_interactions (
+        customer_id, interaction_type_id, interaction_date, subject, content,
+        follow_up_required, follow_up_date, created_by, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_SUPPLIER_INTERACTION_SQL = """
+    INSERT INTO supplier_interactions (
+        supplier_id, interaction_type_id, interaction_date, subject, content,
+        follow_up_required, follow_up_date, created_by, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_FINANCIAL_SQL = """
+    INSERT INTO financial_records (
+        customer_id, supplier_id, contract_id, record_type, amount, due_date,
+        paid_date, status, notes, created_at, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+_TASK_SQL = """
+    INSERT INTO tasks (
+        title, description, customer_id, supplier_id, due_date, priority, status,
+        assigned_to, created_by, created_at, updated_at, completed_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def generate_database(db_path: Path, config: SyntheticDataConfig) -> dict[str, int]:
+    """
+    在指定路径创建数据库并写入合成数据
+
+    Args:
+        db_path: 数据库文件路径
+        config: 合成数据配置
+
+    Returns:
+        Dict[str, int]: 各表写入的记录数
+    """
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    db = DatabaseManager(db_path)
+    try:
+        return SyntheticDataGenerator(config).populate(db)
+    finally:
+        db.close()
+
+
+def build_cached_database(config: SyntheticDataConfig, cache_dir: Path) -> Path:
+    """
+    获取按配置生成的数据库, 已生成过时直接复用
+
+    生成完成后才写入同名的.json清单, 中途失败的数据库不会被复用.
+    调用方不应修改返回的数据库.
+
+    Args:
+        config: 合成数据配置
+        cache_dir: 缓存目录
+
+    Returns:
+        Path: 数据库文件路径
+    """
+    db_path = cache_dir / config.cache_name()
+    manifest = db_path.with_suffix(".json")
+    if db_path.exists() and manifest.exists():
+        return db_path
+
+    for path in (db_path, manifest):
+        path.unlink(missing_ok=True)
+    counts = generate_database(db_path, config)
+    manifest.write_text(
+        json.dumps({"config": asdict(config), "rows": counts}, default=str, indent=2),
+        encoding="utf-8",
+    )
+    return db_path
+
+
+def main(argv: list[str] | None = None) -> int:
+    """主函数"""
+    parser = argparse.ArgumentParser(description="MiniCRM合成数据生成器")
+    parser.add_argument(
+        "--scale", default="10k", help=f"数据规模: {', '.join(SCALES)} (默认: 10k)"
+    )
+    parser.add_argument("--customers", type=int, help="客户数量, 覆盖--scale")
+    parser.add_argument("--seed", type=int, default=SyntheticDataConfig.seed)
+    parser.add_argument("--output", type=Path, required=True, help="数据库文件路径")
+
+    args = parser.parse_args(argv)
+
+    if args.customers:
+        config = SyntheticDataConfig(customers=args.customers, seed=args.seed)
+    else:
+        config = SyntheticDataConfig.for_scale(args.scale, seed=args.seed)
+    if args.output.exists():
+        print(f"❌ 文件已存在: {args.output}")
+        return 1
+
+    start = time.perf_counter()
+    counts = generate_database(args.output, config)
+    elapsed = time.perf_counter() - start
+
+    for table, count in counts.items():
+        print(f"{count:>10}  {table}")
+    print(f"\n✅ 合成数据生成完成: {args.output} ({elapsed:.1f}s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
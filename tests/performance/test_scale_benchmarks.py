@@ -0,0 +1,172 @@
+"""MiniCRM数据与服务层规模基准测试
+
+在按生产规模生成的合成数据库上测量:
+- CustomerDAO.search
+- AdvancedSearchService.search_customers
+- DashboardService.get_dashboard_data
+- FinancialRiskService.get_comprehensive_risk_analysis
+- 客户数据CSV导入和导出
+
+每个基准测试的中位数与 baselines/scale_benchmarks.json 中同一规模的基线
+比较, 超出阈值即失败.
+
+使用方法:
+    pytest tests/performance/test_scale_benchmarks.py --scale 100k
+    pytest tests/performance/test_scale_benchmarks.py --update-baselines
+
+作者: MiniCRM开发团队
+"""
+
+import csv
+from pathlib import Path
+
+import pytest
+
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.financial_risk_dao import FinancialRiskDAO
+from minicrm.data.dao.supplier_dao import SupplierDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.analytics.dashboard_service import DashboardService
+from minicrm.services.analytics.financial_risk_service import FinancialRiskService
+from minicrm.services.contract_service import ContractService
+from minicrm.services.customer import CustomerService
+from minicrm.services.import_export_service import ImportExportService
+from minicrm.services.supplier_service import SupplierService
+
+
+pytest.importorskip("pytest_benchmark")
+
+pytestmark = pytest.mark.slow
+
+IMPORT_FIELD_MAPPING = {"name": "name", "phone": "phone", "email": "email"}
+
+
+@pytest.fixture(scope="module")
+def customer_dao(synthetic_db_manager):
+    """客户DAO"""
+    return CustomerDAO(synthetic_db_manager)
+
+
+@pytest.fixture(scope="module")
+def supplier_dao(synthetic_db_manager):
+    """供应商DAO"""
+    return SupplierDAO(synthetic_db_manager)
+
+
+@pytest.fixture(scope="module")
+def import_export_service(customer_dao, supplier_dao):
+    """导入导出服务"""
+    return ImportExportService(
+        CustomerService(customer_dao), SupplierService(supplier_dao), ContractService()
+    )
+
+
+@pytest.fixture(scope="module")
+def export_file(import_export_service, tmp_path_factory) -> Path:
+    """从合成数据库导出的客户CSV, 作为导入基准测试的输入"""
+    path = tmp_path_factory.mktemp("export") / "customers.csv"
+    import_export_service.export_data("customers", ".csv", str(path))
+    return path
+
+
+class TestDAOBenchmarks:
+    """数据访问层基准测试"""
+
+    def test_customer_dao_search(self, benchmark, baselines, customer_dao):
+        """按客户类型筛选并分页"""
+        type_id = customer_dao.search(limit=1)[0]["customer_type_id"]
+
+        results = benchmark(
+            customer_dao.search, {"customer_type_id": type_id}, limit=50, offset=100
+        )
+
+        assert len(results) == 50
+        baselines.check("customer_dao_search", benchmark)
+
+
+class TestServiceBenchmarks:
+    """业务服务层基准测试"""
+
+    def test_advanced_search(self, benchmark, baselines, customer_dao, supplier_dao):
+        """多条件高级搜索, 不使用结果缓存"""
+        search_module = pytest.importorskip("minicrm.services.advanced_search_service")
+        QueryCondition = search_module.QueryCondition
+        service = search_module.AdvancedSearchService(customer_dao, supplier_dao)
+        conditions = [
+            QueryCondition("name", "LIKE", "上海", "AND"),
+            QueryCondition("address", "LIKE", "路", "AND"),
+        ]
+
+        result = benchmark(
+            service.search_customers, conditions, page_size=50, use_cache=False
+        )
+
+        assert result is not None
+        baselines.check("advanced_search_customers", benchmark)
+
+    def test_dashboard(self, benchmark, baselines, customer_dao, supplier_dao):
+        """仪表板数据"""
+        service = DashboardService(customer_dao, supplier_dao)
+
+        data = benchmark(service.get_dashboard_data)
+
+        assert data["metrics"]
+        baselines.check("dashboard_data", benchmark)
+
+    def test_financial_risk(
+        self, benchmark, baselines, synthetic_db_manager, customer_dao, supplier_dao
+    ):
+        """综合财务风险分析"""
+        service = FinancialRiskService(
+            customer_dao, supplier_dao, FinancialRiskDAO(synthetic_db_manager)
+        )
+
+        analysis = benchmark(service.get_comprehensive_risk_analysis)
+
+        assert "overall_risk_level" in analysis
+        baselines.check("financial_risk_analysis", benchmark)
+
+
+class TestImportExportBenchmarks:
+    """导入导出基准测试"""
+
+    def test_export_customers_csv(
+        self, benchmark, baselines, import_export_service, tmp_path
+    ):
+        """导出客户CSV"""
+        output = tmp_path / "customers.csv"
+
+        exported = benchmark(
+            import_export_service.export_data, "customers", ".csv", str(output)
+        )
+
+        assert exported
+        baselines.check("export_customers_csv", benchmark)
+
+    def test_import_customers_csv(self, benchmark, baselines, export_file, tmp_path):
+        """导入客户CSV到空数据库"""
+        with open(export_file, encoding="utf-8-sig", newline="") as file:
+            row_count = sum(1 for _ in csv.DictReader(file))
+        managers = []
+
+        def setup():
+            manager = DatabaseManager(tmp_path / f"import-{len(managers)}.db")
+            manager.initialize_database()
+            managers.append(manager)
+            dao = CustomerDAO(manager)
+            service = ImportExportService(CustomerService(dao), None, None)
+            args = (str(export_file), "customers", IMPORT_FIELD_MAPPING)
+            return (service.import_data, *args), {}
+
+        try:
+            success, failed, _ = benchmark.pedantic(
+                lambda import_data, *args: import_data(*args),
+                setup=setup,
+                rounds=3,
+            )
+        finally:
+            for manager in managers:
+                manager.close()
+
+        assert 0 < success <= row_count
+        baselines.check("import_customers_csv", benchmark)
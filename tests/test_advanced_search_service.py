@@ -15,17 +15,24 @@ MiniCRM 高级搜索服务测试
 - 性能基准测试
 """
 
-import unittest
 from datetime import datetime, timedelta
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
 from unittest.mock import Mock, patch
 
+from minicrm.core.cache_tier import get_cache_tier
 from minicrm.core.exceptions import BusinessLogicError, ValidationError
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.supplier_dao import SupplierDAO
+from minicrm.data.database import DatabaseManager
 from minicrm.services.advanced_search_service import (
     AdvancedSearchService,
+    QueryCondition,
     SearchField,
     SearchResult,
 )
-from minicrm.ui.components.advanced_search_dialog import QueryCondition
 
 
 class TestAdvancedSearchService(unittest.TestCase):
@@ -565,5 +572,112 @@ class TestSearchResult(unittest.TestCase):
         self.assertEqual(result3.total_pages, 0)
 
 
+class TestAdvancedSearchRefinement(unittest.TestCase):
+    """细化查询复用缓存结果集的测试(使用临时数据库)"""
+
+    CUSTOMERS = [
+        ("上海华东贸易", "13800000001", "上海市浦东新区", "张三"),
+        ("上海东方科技", "13800000002", "上海市徐汇区", "李四"),
+        ("上海明珠电子", "13900000003", "江苏省苏州市", "王五"),
+        ("北京华北贸易", "13800000004", "北京市朝阳区", "张三"),
+        ("上海远洋物流", None, "上海市浦东新区", "赵六"),
+    ]
+
+    def setUp(self):
+        """测试准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(self.temp_dir / "search_refinement.db")
+        self.db_manager.initialize_database()
+        for customer in self.CUSTOMERS:
+            self.db_manager.execute_insert(
+                "INSERT INTO customers (name, phone, address, contact_person) "
+                "VALUES (?, ?, ?, ?)",
+                customer,
+            )
+        # 数据库写入后按表失效缓存
+        get_cache_tier().attach_database(self.db_manager)
+        self.search_service = AdvancedSearchService(
+            CustomerDAO(self.db_manager), SupplierDAO(self.db_manager)
+        )
+
+    def tearDown(self):
+        """测试清理"""
+        get_cache_tier().detach_database(self.db_manager)
+        self.search_service.clear_cache()
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _assert_same_as_uncached(self, conditions, order_by=None):
+        """缓存回答的结果应与直接查询数据库的结果一致"""
+        cached = self.search_service.search_customers(
+            conditions, page_size=2, order_by=order_by, use_cache=True
+        )
+        uncached = self.search_service.search_customers(
+            conditions, page_size=2, order_by=order_by, use_cache=False
+        )
+        self.assertEqual(cached.data, uncached.data)
+        self.assertEqual(cached.total_count, uncached.total_count)
+        self.assertEqual(cached.next_cursor is None, uncached.next_cursor is None)
+        return cached
+
+    def test_refinements_match_uncached_results(self):
+        """在已缓存查询上追加AND条件时从缓存结果集中筛选"""
+        broad = [QueryCondition("name", "LIKE", "上海", "AND")]
+        self.search_service.search_customers(broad, use_cache=True)
+        self.assertEqual(self.search_service._superset_hits, 0)
+
+        refinements = [
+            broad + [QueryCondition("address", "LIKE", "浦东", "AND")],
+            broad + [QueryCondition("phone", "IS NOT NULL", None, "AND")],
+            broad + [QueryCondition("contact_person", "=", "张三", "AND")],
+            broad + [QueryCondition("address", "LIKE", "不存在", "AND")],
+            broad
+            + [
+                QueryCondition("address", "LIKE", "上海", "AND"),
+                QueryCondition("phone", "LIKE", "138%", "AND"),
+            ],
+        ]
+        for conditions in refinements:
+            hits = self.search_service._superset_hits
+            self._assert_same_as_uncached(conditions)
+            self.assertEqual(self.search_service._superset_hits, hits + 1)
+
+    def test_refinement_pages_match_uncached_results(self):
+        """缓存回答的分页和游标与数据库查询一致"""
+        broad = [QueryCondition("name", "LIKE", "上海", "AND")]
+        self.search_service.search_customers(broad, use_cache=True)
+        conditions = broad + [QueryCondition("address", "LIKE", "上海", "AND")]
+
+        first = self._assert_same_as_uncached(conditions, order_by="name DESC")
+        self.assertIsNotNone(first.next_cursor)
+        cached = self.search_service.search_customers(
+            conditions, page_size=2, order_by="name DESC", cursor=first.next_cursor
+        )
+        uncached = self.search_service.search_customers(
+            conditions,
+            page_size=2,
+            order_by="name DESC",
+            cursor=first.next_cursor,
+            use_cache=False,
+        )
+        self.assertEqual(cached.data, uncached.data)
+        self.assertGreater(self.search_service._superset_hits, 0)
+
+    def test_write_invalidates_cached_superset(self):
+        """写入客户表后不再使用旧的缓存结果集"""
+        broad = [QueryCondition("name", "LIKE", "上海", "AND")]
+        self.search_service.search_customers(broad, use_cache=True)
+        self.db_manager.execute_insert(
+            "INSERT INTO customers (name, phone, address, contact_person) "
+            "VALUES (?, ?, ?, ?)",
+            ("上海新开客户", "13800000009", "上海市浦东新区", "孙七"),
+        )
+
+        conditions = broad + [QueryCondition("address", "LIKE", "浦东", "AND")]
+        result = self._assert_same_as_uncached(conditions)
+        self.assertEqual(result.total_count, 3)
+        self.assertEqual(self.search_service._superset_hits, 0)
+
+
 if __name__ == "__main__":
     unittest.main()
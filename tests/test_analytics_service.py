@@ -142,7 +142,7 @@ class TestAnalyticsService(unittest.TestCase):
         """测试成功获取客户分析"""
         # 设置模拟返回值
         self.mock_customer_dao.get_statistics.return_value = self.sample_customer_stats
-        self.mock_customer_dao.search.return_value = self.sample_customers
+        self.mock_customer_dao.stream.return_value = iter(self.sample_customers)
 
         # 执行测试
         result = self.analytics_service.get_customer_analysis(12)
@@ -237,6 +237,7 @@ class TestAnalyticsService(unittest.TestCase):
         """测试成功生成客户报表"""
         # 设置模拟返回值
         self.mock_customer_dao.search.return_value = self.sample_customers
+        self.mock_customer_dao.stream.return_value = iter(self.sample_customers)
         self.mock_customer_dao.get_statistics.return_value = self.sample_customer_stats
 
         # 执行测试
@@ -326,7 +327,7 @@ class TestAnalyticsService(unittest.TestCase):
         """测试通过客户分析获取价值分布"""
         # 设置模拟返回值
         self.mock_customer_dao.get_statistics.return_value = self.sample_customer_stats
-        self.mock_customer_dao.search.return_value = self.sample_customers
+        self.mock_customer_dao.stream.return_value = iter(self.sample_customers)
 
         # 通过公共接口测试价值分布计算
         result = self.analytics_service.get_customer_analysis(12)
@@ -467,7 +468,7 @@ class TestAnalyticsService(unittest.TestCase):
             )
 
         # 设置模拟返回值
-        self.mock_customer_dao.search.return_value = large_customer_dataset
+        self.mock_customer_dao.stream.return_value = iter(large_customer_dataset)
         self.mock_customer_dao.get_statistics.return_value = self.sample_customer_stats
 
         # 测试性能（应该在合理时间内完成）
@@ -35,6 +35,9 @@ class TestAnalyticsServiceRefactored(unittest.TestCase):
             {"id": 1, "name": "客户A", "level": "VIP"},
             {"id": 2, "name": "客户B", "level": "普通"},
         ]
+        self.mock_customer_dao.stream.side_effect = lambda *args, **kwargs: iter(
+            self.mock_customer_dao.search.return_value
+        )
 
         self.mock_supplier_dao.search.return_value = [
             {"id": 1, "name": "供应商A", "quality_score": 90},
@@ -0,0 +1,168 @@
+"""
+分析结果快照测试
+
+测试按数据版本持久化的分析结果快照：
+- 表变更计数由触发器维护
+- 数据未变化时直接使用快照, 跨服务实例(重启)仍然有效
+- 数据变化后先返回旧快照, 后台刷新后返回新结果
+- 依赖日期的快照在日期变化后同样刷新
+"""
+
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.data.dao.analytics_snapshot_dao import AnalyticsSnapshotDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.analytics.snapshot_service import AnalyticsSnapshotService
+
+
+class TestAnalyticsSnapshots:
+    """分析结果快照测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建已初始化的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "snapshots.db")
+        manager.initialize_database()
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def snapshot_dao(self, db_manager):
+        """创建分析快照DAO"""
+        return AnalyticsSnapshotDAO(db_manager)
+
+    def _add_customer(self, db_manager) -> int:
+        return db_manager.execute_insert(
+            "INSERT INTO customers (name) VALUES (?)", ("客户",)
+        )
+
+    def _count_customers(self, db_manager, calls: list) -> dict:
+        calls.append(1)
+        return {"customers": self._customer_total(db_manager)}
+
+    def _customer_total(self, db_manager) -> int:
+        return db_manager.execute_query("SELECT COUNT(*) FROM customers")[0][0]
+
+    def test_change_counters_follow_writes(self, db_manager, snapshot_dao):
+        """测试增删改都会改变数据版本, 无关表的写入不影响"""
+        versions = [snapshot_dao.get_data_version(["customers"])]
+
+        customer_id = self._add_customer(db_manager)
+        versions.append(snapshot_dao.get_data_version(["customers"]))
+        db_manager.execute_update(
+            "UPDATE customers SET name = ? WHERE id = ?", ("新名称", customer_id)
+        )
+        versions.append(snapshot_dao.get_data_version(["customers"]))
+        db_manager.execute_delete("DELETE FROM customers WHERE id = ?", (customer_id,))
+        versions.append(snapshot_dao.get_data_version(["customers"]))
+
+        assert len(set(versions)) == 4
+
+        db_manager.execute_insert(
+            "INSERT INTO suppliers (name) VALUES (?)", ("供应商",)
+        )
+        assert snapshot_dao.get_data_version(["customers"]) == versions[-1]
+
+    def test_snapshot_survives_new_service(self, db_manager, snapshot_dao):
+        """测试数据未变化时新的服务实例直接使用已保存的快照"""
+        calls = []
+        total = self._customer_total(db_manager)
+
+        def compute():
+            return self._count_customers(db_manager, calls)
+
+        first = AnalyticsSnapshotService(snapshot_dao)
+        assert first.get("dashboard", ["customers"], compute) == (
+            {"customers": total},
+            True,
+        )
+
+        restarted = AnalyticsSnapshotService(AnalyticsSnapshotDAO(db_manager))
+        assert restarted.get("dashboard", ["customers"], compute) == (
+            {"customers": total},
+            True,
+        )
+        assert len(calls) == 1
+
+    def test_stale_snapshot_refreshes_in_background(self, db_manager, snapshot_dao):
+        """测试数据变化后先返回旧快照, 后台刷新完成后返回新结果"""
+        calls = []
+        refreshed = []
+        total = self._customer_total(db_manager)
+
+        def compute():
+            return self._count_customers(db_manager, calls)
+
+        service = AnalyticsSnapshotService(snapshot_dao)
+        service.add_refresh_listener(lambda name, payload: refreshed.append(payload))
+        service.get("dashboard", ["customers"], compute)
+        self._add_customer(db_manager)
+
+        assert service.get("dashboard", ["customers"], compute) == (
+            {"customers": total},
+            False,
+        )
+        service.wait_for_refreshes(timeout=5)
+
+        assert service.get("dashboard", ["customers"], compute) == (
+            {"customers": total + 1},
+            True,
+        )
+        assert refreshed == [{"customers": total + 1}]
+        assert len(calls) == 2
+        service.shutdown()
+
+    def test_date_change_refreshes_snapshot(self, db_manager, snapshot_dao):
+        """测试数据未变化但日期前进后快照过期, 按新日期重新计算"""
+        calls = []
+        service = AnalyticsSnapshotService(snapshot_dao)
+
+        def compute():
+            calls.append(1)
+            return {"as_of": current_date}
+
+        current_date = "2026-10-17"
+        assert service.get("risk", ["customers"], compute, current_date) == (
+            {"as_of": "2026-10-17"},
+            True,
+        )
+        assert service.get("risk", ["customers"], compute, current_date)[1]
+
+        current_date = "2026-10-18"
+        assert service.get("risk", ["customers"], compute, current_date) == (
+            {"as_of": "2026-10-17"},
+            False,
+        )
+        service.wait_for_refreshes(timeout=5)
+
+        assert service.get("risk", ["customers"], compute, current_date) == (
+            {"as_of": "2026-10-18"},
+            True,
+        )
+        assert len(calls) == 2
+        service.shutdown()
+
+    def test_unreadable_snapshot_is_recomputed(self, db_manager, snapshot_dao):
+        """测试无法还原的快照视为不存在"""
+        db_manager.execute_insert(
+            "INSERT INTO analytics_snapshots (name, data_version, payload) "
+            "VALUES (?, ?, ?)",
+            ("dashboard", "v", b"not a pickle"),
+        )
+        assert snapshot_dao.get_snapshot("dashboard") is None
+
+        calls = []
+        total = self._customer_total(db_manager)
+        service = AnalyticsSnapshotService(snapshot_dao)
+        payload, is_current = service.get(
+            "dashboard", ["customers"], lambda: self._count_customers(db_manager, calls)
+        )
+        assert payload == {"customers": total}
+        assert is_current
+        assert snapshot_dao.get_snapshot("dashboard").payload == {"customers": total}
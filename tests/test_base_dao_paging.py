@@ -0,0 +1,177 @@
+"""
+DAO分页查询测试
+
+测试DAO在SQL中完成筛选、排序和分页：
+- 表格筛选条件转换为WHERE子句
+- 排序稳定且列名经过校验
+- 统计数量与分页结果一致
+- 流式读取与分页使用相同的条件和顺序
+- 客户和供应商DAO支持带基础筛选条件的表格数据源
+"""
+
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.core.exceptions import DatabaseError
+from minicrm.data.dao.base_dao import BaseDAO
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.supplier_dao import SupplierDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.ui.ttk_base.table_data_source import (
+    DAOTableDataSource,
+    keyword_filters,
+)
+
+
+class TestBaseDAOPaging:
+    """DAO分页查询测试类"""
+
+    @pytest.fixture
+    def dao(self):
+        """创建带测试数据的DAO"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "paging.db")
+        manager.initialize_database()
+        manager.execute_update("DELETE FROM customer_value_scores")
+        manager.execute_update("DELETE FROM quotes")
+        manager.execute_update("DELETE FROM customers")
+        for index in range(30):
+            manager.execute_insert(
+                "INSERT INTO customers (name, phone, notes) VALUES (?, ?, ?)",
+                (f"Client{index:02d}", f"1380000{index:04d}", str(index * 100)),
+            )
+        yield BaseDAO(manager, "customers")
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_fetch_page_sorts_and_paginates(self, dao):
+        """测试排序和分页"""
+        page = dao.fetch_page(5, 5, ("phone", "desc"))
+
+        assert [row["name"] for row in page] == [
+            "Client24",
+            "Client23",
+            "Client22",
+            "Client21",
+            "Client20",
+        ]
+
+    def test_quick_search_and_advanced_filters(self, dao):
+        """测试快速搜索(any)与高级筛选(all)组合"""
+        filters = {
+            "any": [
+                {"column": "name", "operator": "contains", "value": "client1"},
+                {"column": "phone", "operator": "ends_with", "value": "0029"},
+            ],
+            "all": [
+                {
+                    "column": "notes",
+                    "operator": "between",
+                    "value": "1200",
+                    "value2": "",
+                },
+            ],
+        }
+
+        rows = dao.fetch_page(0, 100, ("name", "asc"), filters)
+
+        assert [row["name"] for row in rows] == [
+            "Client12",
+            "Client13",
+            "Client14",
+            "Client15",
+            "Client16",
+            "Client17",
+            "Client18",
+            "Client19",
+            "Client29",
+        ]
+        assert dao.count_filtered(filters) == len(rows)
+
+    @pytest.mark.parametrize(
+        ("condition", "expected"),
+        [
+            ({"operator": "equals", "value": "CLIENT03"}, 1),
+            ({"operator": "not_contains", "value": "client"}, 0),
+            ({"operator": "in_list", "value": "client01, client02"}, 2),
+            ({"operator": "regex", "value": r"client\d5"}, 3),
+            ({"operator": "is_empty"}, 0),
+        ],
+    )
+    def test_filter_operators(self, dao, condition, expected):
+        """测试各筛选操作符"""
+        filters = {"all": [{"column": "name", **condition}]}
+
+        assert dao.count_filtered(filters) == expected
+
+    def test_invalid_column_is_rejected(self, dao):
+        """测试非法列名被拒绝"""
+        with pytest.raises(DatabaseError):
+            dao.fetch_page(0, 10, ("name; DROP TABLE customers", "asc"))
+
+    def test_stream_filtered_matches_pages(self, dao):
+        """测试流式读取按批返回与分页相同的记录和顺序"""
+        filters = {"all": [{"column": "name", "operator": "contains", "value": "1"}]}
+
+        batches = list(dao.stream_filtered(("phone", "desc"), filters, batch_size=4))
+
+        assert [len(batch) for batch in batches] == [4, 4, 4]
+        assert [row["id"] for batch in batches for row in batch] == [
+            row["id"] for row in dao.fetch_page(0, 100, ("phone", "desc"), filters)
+        ]
+
+
+class TestEntityDAOPaging:
+    """客户和供应商DAO分页测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建已初始化的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "entity_paging.db")
+        manager.initialize_database()
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.mark.parametrize(
+        ("dao_class", "table"), [(CustomerDAO, "customers"), (SupplierDAO, "suppliers")]
+    )
+    def test_data_source_combines_base_filters(self, db_manager, dao_class, table):
+        """测试基础关键词筛选与表格快速搜索同时生效"""
+        for index in range(12):
+            db_manager.execute_insert(
+                f"INSERT INTO {table} (name, phone, contact_person) VALUES (?, ?, ?)",
+                (f"Paging{index:02d}", f"1390000{index:04d}", f"联系人{index % 3}"),
+            )
+        source = DAOTableDataSource(
+            dao_class(db_manager), keyword_filters("paging", ("name", "phone"))
+        )
+        table_filters = {
+            "all": [],
+            "any": [
+                {"column": "contact_person", "operator": "equals", "value": "联系人1"},
+                {"column": "name", "operator": "ends_with", "value": "00"},
+            ],
+        }
+
+        page = source.fetch_page(0, 3, ("name", "asc"), table_filters)
+        streamed = [
+            row["name"]
+            for batch in source.stream(("name", "asc"), table_filters, batch_size=2)
+            for row in batch
+        ]
+
+        assert source.count() == 12
+        assert source.count(table_filters) == 5
+        assert [row["name"] for row in page] == ["Paging00", "Paging01", "Paging04"]
+        assert streamed == [
+            "Paging00",
+            "Paging01",
+            "Paging04",
+            "Paging07",
+            "Paging10",
+        ]
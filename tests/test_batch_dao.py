@@ -0,0 +1,196 @@
+"""
+DAO批量写操作测试
+
+测试基于executemany的批量插入、更新、插入或更新和删除:
+- 按块执行且整批在一个事务中, 任一块失败全部回滚
+- 批量插入返回的ID与记录顺序一致
+- 相同值的批量更新和批量删除每块只执行一条语句
+"""
+
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.core.exceptions import DatabaseError, ValidationError
+from minicrm.data.dao.base_dao import BaseDAO
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.interaction_dao import InteractionDAO
+from minicrm.data.dao.supplier_dao import SupplierDAO
+from minicrm.data.database import DatabaseManager
+
+
+class TestBatchDAO:
+    """DAO批量写操作测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建带测试表的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "batch.db")
+        manager.initialize_database()
+        manager.execute_update(
+            "CREATE TABLE items (id INTEGER PRIMARY KEY, code TEXT NOT NULL UNIQUE, "
+            "qty INTEGER, created_at TEXT)"
+        )
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def dao(self, db_manager):
+        """创建测试表的基础DAO"""
+        return BaseDAO(db_manager, "items")
+
+    @pytest.fixture
+    def statements(self, db_manager):
+        """记录写连接上执行的UPDATE和DELETE语句"""
+        executed = []
+        db_manager.execute_query("SELECT 1")
+        db_manager._connection.set_trace_callback(
+            lambda sql: (
+                executed.append(sql)
+                if sql.lstrip().upper().startswith(("UPDATE", "DELETE"))
+                else None
+            )
+        )
+        return executed
+
+    def _items(self, db_manager):
+        rows = db_manager.execute_query("SELECT id, code, qty FROM items ORDER BY id")
+        return [tuple(row) for row in rows]
+
+    def test_insert_many_returns_ids_in_order(self, dao, db_manager):
+        """测试分块插入返回的ID与记录顺序一致"""
+        records = [{"code": f"A{i}", "qty": i} for i in range(10)]
+
+        record_ids = dao.insert_many(records, chunk_size=3)
+
+        assert [(i, r["code"], r["qty"]) for i, r in zip(record_ids, records)] == (
+            self._items(db_manager)
+        )
+
+    def test_failed_chunk_rolls_back_whole_batch(self, dao, db_manager):
+        """测试后面的块失败时前面的块也回滚"""
+        records = [{"code": f"B{i}", "qty": i} for i in range(5)]
+        records.append({"code": "B0", "qty": 99})
+
+        with pytest.raises(DatabaseError):
+            dao.insert_many(records, chunk_size=2)
+
+        assert self._items(db_manager) == []
+
+    def test_inconsistent_fields_rejected(self, dao):
+        """测试字段不一致或块大小非法的批量记录被拒绝"""
+        with pytest.raises(ValidationError):
+            dao.insert_many([{"code": "C1", "qty": 1}, {"code": "C2"}])
+        with pytest.raises(ValidationError):
+            dao.insert_many([{"code": "C1"}], chunk_size=0)
+
+    def test_update_many_groups_by_fields(self, dao, db_manager):
+        """测试不同更新字段的记录分别执行, 返回实际更新数"""
+        ids = dao.insert_many([{"code": f"D{i}", "qty": 0} for i in range(4)])
+
+        updated = dao.update_many(
+            [
+                (ids[0], {"qty": 5}),
+                (ids[1], {"qty": 6}),
+                (ids[2], {"code": "D2x", "qty": 7}),
+                (9999, {"qty": 8}),
+            ]
+        )
+
+        assert updated == 3
+        assert self._items(db_manager) == [
+            (ids[0], "D0", 5),
+            (ids[1], "D1", 6),
+            (ids[2], "D2x", 7),
+            (ids[3], "D3", 0),
+        ]
+
+    def test_update_by_ids_and_delete_one_statement_per_chunk(
+        self, dao, db_manager, statements
+    ):
+        """测试相同值的批量更新和批量删除每块只执行一条语句"""
+        ids = dao.insert_many([{"code": f"E{i}", "qty": 0} for i in range(7)])
+
+        assert dao.update_by_ids(ids, {"qty": 1}, chunk_size=3) == 7
+        assert len(statements) == 3
+        assert all(qty == 1 for _, _, qty in self._items(db_manager))
+
+        statements.clear()
+        assert dao.delete_many(ids[:5], chunk_size=4) == 5
+        assert len(statements) == 2
+        assert [row[0] for row in self._items(db_manager)] == ids[5:]
+
+    def test_upsert_many_keeps_created_at(self, dao, db_manager):
+        """测试冲突时更新已有记录, 不覆盖创建时间"""
+        (existing_id,) = dao.insert_many(
+            [{"code": "F1", "qty": 1, "created_at": "2024-01-01"}]
+        )
+
+        affected = dao.upsert_many(
+            [
+                {"code": "F1", "qty": 10, "created_at": "2025-01-01"},
+                {"code": "F2", "qty": 20, "created_at": "2025-01-01"},
+            ],
+            conflict_columns=("code",),
+        )
+
+        assert affected == 2
+        assert self._items(db_manager) == [
+            (existing_id, "F1", 10),
+            (existing_id + 1, "F2", 20),
+        ]
+        assert dao.get_by_id(existing_id)["created_at"] == "2024-01-01"
+        with pytest.raises(ValidationError):
+            dao.upsert_many([{"qty": 1}], conflict_columns=("code",))
+
+    def test_customer_and_supplier_insert_many(self, db_manager):
+        """测试客户和供应商批量插入使用与单条插入相同的字段和默认值"""
+        customer_dao = CustomerDAO(db_manager)
+        supplier_dao = SupplierDAO(db_manager)
+
+        customer_ids = customer_dao.insert_many(
+            [{"name": f"批量客户{i}", "phone": f"1390000{i:04d}"} for i in range(5)],
+            chunk_size=2,
+        )
+        supplier_ids = supplier_dao.insert_many(
+            [{"name": "批量供应商1"}, {"name": "批量供应商2", "quality_rating": 4.5}]
+        )
+
+        assert [customer_dao.get_by_id(i)["name"] for i in customer_ids] == [
+            f"批量客户{i}" for i in range(5)
+        ]
+        assert [supplier_dao.get_by_id(i)["quality_rating"] for i in supplier_ids] == [
+            0.0,
+            4.5,
+        ]
+        assert customer_dao.delete_many(customer_ids) == 5
+        assert supplier_dao.update_by_ids(supplier_ids, {"notes": "批量"}) == 2
+
+    def test_customer_batch_errors_wrapped(self, db_manager):
+        """测试客户批量写操作失败时包装为DatabaseError"""
+        customer_dao = CustomerDAO(db_manager)
+        customer_id = customer_dao.insert_many([{"name": "客户", "phone": "1"}])[0]
+
+        with pytest.raises(DatabaseError, match="批量更新客户数据失败"):
+            customer_dao.update_many([(customer_id, {"no_such_column": 1})])
+        with pytest.raises(DatabaseError, match="批量更新客户数据失败"):
+            customer_dao.update_by_ids([customer_id], {"no_such_column": 1})
+
+    def test_interaction_bulk_update_status(self, db_manager, statements):
+        """测试互动记录批量更新状态每块只执行一条语句"""
+        db_manager.execute_update(
+            "CREATE TABLE interactions (id INTEGER PRIMARY KEY, "
+            "interaction_status TEXT, updated_at TEXT)"
+        )
+        dao = InteractionDAO(db_manager)
+        ids = dao.insert_many([{"interaction_status": "planned"} for _ in range(5)])
+        statements.clear()
+
+        assert dao.bulk_update_status(ids, "completed", chunk_size=500) == 5
+        assert len(statements) == 1
+        rows = db_manager.execute_query("SELECT interaction_status FROM interactions")
+        assert {row[0] for row in rows} == {"completed"}
@@ -0,0 +1,162 @@
+"""
+批量导入管道测试
+
+测试流式分批导入：
+- 客户按批在事务中写入, 行号对应源文件
+- 名称+电话重复检测(文件内和数据库已有记录)
+- 整批失败时逐行重试定位错误行
+- 中断后根据检查点续传
+"""
+
+import csv
+from pathlib import Path
+import shutil
+import tempfile
+from unittest.mock import Mock
+
+import pytest
+
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.bulk_import import (
+    BulkImportPipeline,
+    ImportCheckpoint,
+    iter_csv_batches,
+)
+from minicrm.services.customer import CustomerService
+from minicrm.services.import_export_service import ImportExportService
+
+
+FIELD_MAPPING = {"name": "客户名称", "phone": "电话", "email": "邮箱"}
+
+
+class TestBulkImport:
+    """批量导入测试类"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """创建临时目录"""
+        path = Path(tempfile.mkdtemp())
+        yield path
+        shutil.rmtree(path, ignore_errors=True)
+
+    @pytest.fixture
+    def db_manager(self, temp_dir):
+        """创建已初始化的临时数据库"""
+        manager = DatabaseManager(temp_dir / "import.db")
+        manager.initialize_database()
+        manager.execute_update("DELETE FROM customer_value_scores")
+        manager.execute_update("DELETE FROM quotes")
+        manager.execute_update("DELETE FROM customers")
+        yield manager
+        manager.close()
+
+    @pytest.fixture
+    def customer_service(self, db_manager):
+        """创建客户服务"""
+        return CustomerService(CustomerDAO(db_manager))
+
+    @pytest.fixture
+    def service(self, customer_service):
+        """创建导入导出服务"""
+        return ImportExportService(customer_service, Mock(), Mock())
+
+    def _write_csv(self, path: Path, rows: list[tuple[str, str, str]]) -> str:
+        with open(path, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["客户名称", "电话", "邮箱"])
+            writer.writerows(rows)
+        return str(path)
+
+    def _customer_count(self, db_manager) -> int:
+        return db_manager.execute_query("SELECT COUNT(*) FROM customers")[0][0]
+
+    def test_import_customers_in_batches(self, service, db_manager, temp_dir):
+        """测试分批导入、校验失败和重复检测"""
+        db_manager.execute_insert(
+            "INSERT INTO customers (name, phone) VALUES (?, ?)",
+            ("已有客户", "13900000000"),
+        )
+        rows = [(f"客户{i:03d}", f"138{i:08d}", "") for i in range(25)]
+        rows[3] = ("客户003", "123", "")  # 电话格式错误
+        rows.append(("客户001", "138-0000-0001", ""))  # 与文件内第2行重复
+        rows.append(("已有客户", "13900000000", ""))  # 与数据库重复
+        rows.append(("", "", ""))  # 空行跳过
+        file_path = self._write_csv(temp_dir / "customers.csv", rows)
+        progress = []
+
+        success, errors, messages = service.import_data(
+            file_path,
+            "customers",
+            FIELD_MAPPING,
+            {"batch_size": 10, "progress_callback": progress.append},
+        )
+
+        assert (success, errors) == (24, 3)
+        assert messages[0].startswith("第4行数据验证失败")
+        assert messages[1:] == ["第26行数据重复, 已跳过", "第27行数据重复, 已跳过"]
+        assert self._customer_count(db_manager) == 25
+        assert [p.rows_processed for p in progress] == [10, 20, 28]
+        assert progress[-1].duplicate_count == 2
+
+    def test_failed_batch_is_retried_row_by_row(self, customer_service):
+        """测试整批写入失败时逐行定位错误"""
+
+        def write_batch(records):
+            if any(record["name"] == "坏数据" for record in records):
+                raise RuntimeError("写入失败")
+            return customer_service.bulk_create_customers(records)
+
+        pipeline = BulkImportPipeline(
+            prepare_row=customer_service.prepare_customer_record,
+            write_batch=write_batch,
+            key_func=customer_service.customer_key,
+        )
+        batch = [
+            {"name": "客户甲", "phone": "13800000001"},
+            {"name": "坏数据", "phone": "13800000002"},
+            {"name": "客户乙", "phone": "13800000003"},
+        ]
+
+        result = pipeline.run([batch])
+
+        assert result.success_count == 2
+        assert result.error_messages == ["第2行处理失败: 写入失败"]
+        assert len(result.record_ids) == 2
+
+    def test_resume_from_checkpoint(self, customer_service, db_manager, temp_dir):
+        """测试中断后从检查点继续导入"""
+        rows = [(f"客户{i:03d}", f"138{i:08d}", "") for i in range(30)]
+        file_path = self._write_csv(temp_dir / "customers.csv", rows)
+        checkpoint_path = temp_dir / "import.checkpoint"
+
+        def make_pipeline(progress_callback=None):
+            return BulkImportPipeline(
+                prepare_row=customer_service.prepare_customer_record,
+                write_batch=customer_service.bulk_create_customers,
+                key_func=customer_service.customer_key,
+                existing_keys=customer_service.get_existing_customer_keys(),
+                progress_callback=progress_callback,
+                checkpoint=ImportCheckpoint(checkpoint_path, file_path),
+            )
+
+        def interrupt(progress):
+            if progress.batch_index == 2:
+                raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            make_pipeline(interrupt).run(self._mapped_batches(file_path, batch_size=8))
+        assert self._customer_count(db_manager) == 16
+        assert checkpoint_path.exists()
+
+        result = make_pipeline().run(self._mapped_batches(file_path, batch_size=8))
+
+        assert result.success_count == 30
+        assert result.error_count == 0
+        assert len(result.record_ids) == 14
+        assert self._customer_count(db_manager) == 30
+        assert not checkpoint_path.exists()
+
+    def _mapped_batches(self, file_path: str, batch_size: int):
+        for batch in iter_csv_batches(file_path, batch_size):
+            yield [{"name": row["客户名称"], "phone": row["电话"]} for row in batch]
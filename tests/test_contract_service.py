@@ -21,8 +21,11 @@ from datetime import datetime, timedelta
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
+from transfunctions.data_operations import DEFAULT_CHUNK_SIZE
+
 from src.minicrm.core.exceptions import (
     BusinessLogicError,
+    DatabaseError,
     ServiceError,
     ValidationError,
 )
@@ -350,25 +353,47 @@ class TestContractService(unittest.TestCase):
         # 准备
         expired_contract = Contract.from_dict(self.sample_contract_data)
         expired_contract.id = 1
+        expired_contract.contract_status = ContractStatus.ACTIVE
         expired_contract.expiry_date = datetime.now() - timedelta(days=10)
+        completed_contract = Contract.from_dict(self.sample_contract_data)
+        completed_contract.id = 2
+        completed_contract.contract_status = ContractStatus.COMPLETED
+        self.mock_dao.update_many.return_value = 1
 
-        with (
-            patch.object(
-                self.contract_service,
-                "get_expired_contracts",
-                return_value=[expired_contract],
-            ),
-            patch.object(
-                self.contract_service, "update_contract_status"
-            ) as mock_update,
+        with patch.object(
+            self.contract_service,
+            "get_expired_contracts",
+            return_value=[expired_contract, completed_contract],
         ):
             # 执行
             result = self.contract_service.process_expired_contracts()
 
-            # 验证
+            # 验证: 合法的状态转换通过一次批量更新完成
             self.assertEqual(result["processed"], 1)
-            self.assertEqual(result["errors"], 0)
-            mock_update.assert_called_once_with(1, ContractStatus.EXPIRED, "合同已过期")
+            self.assertEqual(result["errors"], 1)
+            self.mock_dao.update_many.assert_called_once()
+            (updates,) = self.mock_dao.update_many.call_args.args
+            self.assertEqual([record_id for record_id, _ in updates], [1])
+            self.assertEqual(updates[0][1]["status"], "expired")
+            self.assertIn("原因: 合同已过期", updates[0][1]["notes"])
+
+    def test_process_expired_contracts_counts_failed_chunk(self):
+        """测试某块批量更新失败时计入错误并继续处理其余块"""
+        contracts = []
+        for contract_id in range(1, DEFAULT_CHUNK_SIZE + 3):
+            contract = Contract.from_dict(self.sample_contract_data)
+            contract.id = contract_id
+            contract.contract_status = ContractStatus.ACTIVE
+            contracts.append(contract)
+        self.mock_dao.update_many.side_effect = [DatabaseError("写入失败"), 2]
+
+        with patch.object(
+            self.contract_service, "get_expired_contracts", return_value=contracts
+        ):
+            result = self.contract_service.process_expired_contracts()
+
+        self.assertEqual(result, {"processed": 2, "errors": DEFAULT_CHUNK_SIZE})
+        self.assertEqual(self.mock_dao.update_many.call_count, 2)
 
     def test_create_renewal_contract_success(self):
         """测试创建续约合同成功"""
@@ -0,0 +1,188 @@
+"""
+统一缓存层测试模块
+
+测试区域字节预算、全局内存上限下的跨区域淘汰、按表失效、
+命名空间隔离以及SQLite二级缓存。
+"""
+
+from datetime import timedelta
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+from minicrm.core.cache_tier import CacheBackend, CacheTier, SQLiteCacheBackend
+from minicrm.core.sql_table_parser import ALL_TABLES
+from minicrm.data.database import DatabaseManager
+
+
+_MB = 1024 * 1024
+
+
+class TestCacheTier(unittest.TestCase):
+    """测试缓存层"""
+
+    def setUp(self):
+        """测试准备"""
+        self.tier = CacheTier(max_memory_mb=1000 / _MB)
+
+    def test_region_budget_and_statistics(self):
+        """测试区域预算内按LRU淘汰并记录统计"""
+        region = self.tier.create_region("query", max_size_mb=300 / _MB)
+        for key in ("a", "b", "c"):
+            region.put(key, key, size_bytes=100)
+        region.get("a")
+        region.put("d", "d", size_bytes=100)
+
+        self.assertIsNone(region.get("b"))
+        self.assertEqual(region.get("a"), "a")
+
+        stats = region.get_statistics()
+        self.assertEqual(stats.entries, 3)
+        self.assertEqual(stats.size_bytes, 300)
+        self.assertEqual(stats.hits, 2)
+        self.assertEqual(stats.misses, 1)
+        self.assertEqual(stats.evictions, 1)
+        self.assertIs(self.tier.create_region("query", max_size_mb=1), region)
+
+    def test_existing_region_keeps_first_config(self):
+        """测试同名区域以首次创建的配置为准, 配置不一致时记录警告"""
+        region = self.tier.create_region("search", 1, timedelta(minutes=5))
+
+        with self.assertNoLogs("minicrm.core.cache_tier", level="WARNING"):
+            same = self.tier.create_region("search", 1, timedelta(minutes=5))
+        with self.assertLogs("minicrm.core.cache_tier", level="WARNING") as logs:
+            other = self.tier.create_region(
+                "search", 2, timedelta(minutes=1), policy="lfu"
+            )
+
+        self.assertIs(same, region)
+        self.assertIs(other, region)
+        self.assertEqual(region.max_size_bytes, _MB)
+        self.assertEqual(region.ttl, timedelta(minutes=5))
+        self.assertEqual(region.policy, "lru")
+        self.assertIn("max_size_mb=2", logs.output[0])
+        self.assertIn("ttl=0:01:00", logs.output[0])
+        self.assertIn("policy=lfu", logs.output[0])
+
+    def test_global_limit_evicts_from_fullest_region(self):
+        """测试超出全局上限时从占用比例最高的区域淘汰"""
+        small = self.tier.create_region("small", max_size_mb=400 / _MB)
+        large = self.tier.create_region("large", max_size_mb=1000 / _MB)
+        for i in range(4):
+            small.put(f"s{i}", i, size_bytes=100)
+        for i in range(6):
+            large.put(f"l{i}", i, size_bytes=100)
+
+        large.put("l6", 6, size_bytes=100)
+
+        self.assertLessEqual(self.tier.size_bytes, self.tier.max_memory_bytes)
+        self.assertEqual(small.size_bytes, 300)
+        self.assertIsNone(small.get("s0"))
+        self.assertEqual(large.get("l6"), 6)
+
+    def test_table_invalidation_via_write_listener(self):
+        """测试数据库写通知按表失效缓存"""
+        temp_dir = Path(tempfile.mkdtemp())
+        db_manager = DatabaseManager(temp_dir / "tier.db")
+        try:
+            with db_manager.transaction() as connection:
+                connection.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY)")
+            self.tier.attach_database(db_manager)
+            region = self.tier.create_region("analytics", max_size_mb=1)
+            region.put("customers", 1, tables=("Customers",))
+            region.put("suppliers", 2, tables=("suppliers",))
+            region.put("static", 3)
+
+            db_manager.execute_insert("INSERT INTO customers DEFAULT VALUES")
+            self.assertIsNone(region.get("customers"))
+            self.assertEqual(region.get("suppliers"), 2)
+
+            self.tier.invalidate_tables({ALL_TABLES})
+            self.assertIsNone(region.get("suppliers"))
+            self.assertEqual(region.get("static"), 3)
+        finally:
+            self.tier.detach_database(db_manager)
+            db_manager.close()
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def test_namespaces_are_isolated(self):
+        """测试同一区域的命名空间互不影响"""
+        region = self.tier.create_region("search", max_size_mb=1)
+        first = region.namespace()
+        second = region.namespace()
+        first.put("key", "first")
+        second.put("key", "second")
+
+        first.clear()
+
+        self.assertIsNone(first.get("key"))
+        self.assertEqual(second.get("key"), "second")
+        self.assertEqual(second.keys(), ["key"])
+
+    def test_get_or_load_caches_none_results(self):
+        """测试get_or_load缓存None结果并记录加载耗时"""
+        region = self.tier.create_region("pages", max_size_mb=1)
+        calls = []
+
+        def loader():
+            calls.append(1)
+
+        self.assertIsNone(region.get_or_load("empty", loader))
+        self.assertIsNone(region.get_or_load("empty", loader))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(region.get_statistics().loads, 1)
+
+
+class TestSQLiteCacheBackend(unittest.TestCase):
+    """测试SQLite二级缓存"""
+
+    def setUp(self):
+        """测试准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.backend = SQLiteCacheBackend(self.temp_dir / "l2.db")
+        self.tier = CacheTier()
+        self.region = self.tier.create_region(
+            "analytics", max_size_mb=1, ttl=timedelta(minutes=5), backend=self.backend
+        )
+
+    def tearDown(self):
+        """测试清理"""
+        self.backend.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_backend_interface_is_abstract(self):
+        """测试后端接口不能直接实例化"""
+        with self.assertRaises(TypeError):
+            CacheBackend()
+
+    def test_l2_hit_after_memory_eviction(self):
+        """测试内存淘汰后从二级缓存读取并提升"""
+        self.region.put("report", {"total": 42}, tables=("customers",))
+        self.region.evict_one()
+
+        self.assertEqual(self.region.get("report"), {"total": 42})
+        self.assertEqual(self.region.get_statistics().l2_hits, 1)
+        self.assertIsNotNone(self.region.peek("report"))
+
+    def test_l2_table_invalidation(self):
+        """测试按表失效同时清除二级缓存"""
+        self.region.put("report", {"total": 42}, tables=("customers",))
+        self.region.invalidate_tables({"customers"})
+
+        self.assertIsNone(self.backend.get("report"))
+        self.assertIsNone(self.region.get("report"))
+
+    def test_l2_survives_new_region(self):
+        """测试二级缓存在新的缓存层中仍然可用"""
+        self.region.put("report", [1, 2, 3])
+
+        other = CacheTier().create_region(
+            "analytics", max_size_mb=1, backend=self.backend
+        )
+
+        self.assertEqual(other.get("report"), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+"""
+数据缓存管理器测试模块
+
+测试容量记账、LRU/LFU淘汰、大小估算以及大容量下的存取性能。
+"""
+
+import time
+import unittest
+
+from minicrm.core.data_cache_manager import (
+    CachePolicy,
+    DataCacheManager,
+    estimate_size,
+)
+
+
+class TestEstimateSize(unittest.TestCase):
+    """测试大小估算函数"""
+
+    def test_large_row_list_is_extrapolated(self):
+        """测试大列表按样本推算大小"""
+        rows = [{"id": i, "name": f"客户{i}"} for i in range(10000)]
+
+        small = estimate_size(rows[:100])
+        large = estimate_size(rows)
+
+        self.assertGreater(large, small * 50)
+
+    def test_empty_containers(self):
+        """测试空容器"""
+        self.assertGreater(estimate_size([]), 0)
+        self.assertGreater(estimate_size({}), 0)
+
+
+class TestDataCacheManager(unittest.TestCase):
+    """测试数据缓存管理器"""
+
+    def _make_cache(self, policy: str, entries: int) -> DataCacheManager:
+        """创建容量恰好能容纳指定条目数的缓存(每条100字节)"""
+        return DataCacheManager(
+            max_size_mb=entries * 100 / 1024 / 1024, cache_policy=policy
+        )
+
+    def test_size_accounting_on_replace_and_remove(self):
+        """测试覆盖和删除时字节计数同步更新"""
+        cache = DataCacheManager()
+        cache.put("a", "x", size_bytes=100)
+        cache.put("a", "y", size_bytes=40)
+        cache.put("b", "z", size_bytes=10)
+        self.assertEqual(cache.get_statistics().total_size_bytes, 50)
+
+        cache.remove("a")
+        stats = cache.get_statistics()
+        self.assertEqual(stats.total_size_bytes, 10)
+        self.assertEqual(stats.total_entries, 1)
+
+    def test_lru_evicts_least_recently_used(self):
+        """测试LRU淘汰最近最少使用的条目"""
+        cache = self._make_cache(CachePolicy.LRU, 3)
+        for key in ("a", "b", "c"):
+            cache.put(key, key, size_bytes=100)
+
+        cache.get("a")
+        cache.put("d", "d", size_bytes=100)
+
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), "a")
+        self.assertEqual(cache.get_statistics().eviction_count, 1)
+
+    def test_fifo_ignores_access(self):
+        """测试FIFO不因访问而调整顺序"""
+        cache = self._make_cache(CachePolicy.FIFO, 2)
+        cache.put("a", "a", size_bytes=100)
+        cache.put("b", "b", size_bytes=100)
+
+        cache.get("a")
+        cache.put("c", "c", size_bytes=100)
+
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "b")
+
+    def test_lfu_evicts_least_frequently_used(self):
+        """测试LFU淘汰访问频率最低的条目"""
+        cache = self._make_cache(CachePolicy.LFU, 3)
+        for key in ("a", "b", "c"):
+            cache.put(key, key, size_bytes=100)
+
+        for _ in range(3):
+            cache.get("a")
+        cache.get("b")
+        cache.get("c")
+        cache.get("c")
+
+        cache.put("d", "d", size_bytes=100)
+        self.assertIsNone(cache.get("b"))
+
+        # 新条目频率最低, 下一次淘汰它
+        cache.put("e", "e", size_bytes=100)
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(cache.get("a"), "a")
+        self.assertEqual(cache.get("c"), "c")
+
+    def test_oversized_value_rejected(self):
+        """测试超过总容量的值不会清空缓存"""
+        cache = self._make_cache(CachePolicy.LRU, 2)
+        cache.put("a", "a", size_bytes=100)
+
+        self.assertFalse(cache.put("big", "x", size_bytes=1000))
+        self.assertEqual(cache.get("a"), "a")
+
+    def test_registered_size_estimator(self):
+        """测试按类型注册的大小估算器"""
+        cache = DataCacheManager()
+        cache.register_size_estimator(list, len)
+
+        cache.put("rows", [1, 2, 3])
+
+        self.assertEqual(cache.get_statistics().total_size_bytes, 3)
+
+
+class TestDataCacheManagerScaling(unittest.TestCase):
+    """测试大容量下存取耗时保持平稳"""
+
+    ENTRIES = 100_000
+    WINDOW = 10_000
+
+    def _measure(self, policy: str) -> tuple[float, float]:
+        """返回首个窗口和最后窗口的单次put+get平均耗时"""
+        # 容量为条目数的一半, 后半程每次put都会触发淘汰
+        cache = DataCacheManager(
+            max_size_mb=self.ENTRIES // 2 * 100 / 1024 / 1024,
+            cache_policy=policy,
+        )
+        value = [{"id": 1, "name": "客户"}] * 50
+
+        timings = []
+        for start in range(0, self.ENTRIES, self.WINDOW):
+            began = time.perf_counter()
+            for i in range(start, start + self.WINDOW):
+                key = f"key_{i}"
+                cache.put(key, value, size_bytes=100)
+                cache.get(key)
+                cache.get(f"key_{i // 2}")
+            timings.append((time.perf_counter() - began) / self.WINDOW)
+
+        self.assertEqual(len(cache._cache), self.ENTRIES // 2)
+        return min(timings[:2]), timings[-1]
+
+    def test_put_get_flat_lru(self):
+        """测试LRU在10万条目下存取耗时平稳"""
+        first, last = self._measure(CachePolicy.LRU)
+        self.assertLess(last, first * 4)
+
+    def test_put_get_flat_lfu(self):
+        """测试LFU在10万条目下存取耗时平稳"""
+        first, last = self._measure(CachePolicy.LFU)
+        self.assertLess(last, first * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
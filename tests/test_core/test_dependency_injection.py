@@ -0,0 +1,84 @@
+"""
+依赖注入容器延迟加载测试
+
+测试register_lazy注册的实现:
+- 注册时不导入实现模块, 首次解析时才导入并缓存为单例
+- 按具体类路径注册的实现可通过类本身解析, 也可作为构造函数依赖注入
+- 无效路径在注册时即被拒绝
+"""
+
+import sys
+
+import pytest
+
+from minicrm.core.dependency_injection import DIContainer
+from minicrm.core.exceptions import DependencyError
+
+
+@pytest.fixture
+def lazy_module(tmp_path, monkeypatch):
+    """在临时目录中创建一个尚未导入的模块"""
+    (tmp_path / "lazy_di_sample.py").write_text(
+        "class Repository:\n"
+        "    pass\n"
+        "\n"
+        "\n"
+        "class Service:\n"
+        "    def __init__(self, repository: Repository):\n"
+        "        self.repository = repository\n",
+        encoding="utf-8",
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "lazy_di_sample"
+    sys.modules.pop("lazy_di_sample", None)
+
+
+class IService:
+    """测试用服务接口"""
+
+
+class TestLazyRegistration:
+    """延迟加载注册测试类"""
+
+    def test_module_imported_on_first_resolve(self, lazy_module):
+        """测试注册时不导入模块, 解析时导入并返回同一实例"""
+        container = DIContainer()
+        container.register_lazy(IService, f"{lazy_module}:Service")
+        container.register_lazy(f"{lazy_module}:Repository")
+
+        assert lazy_module not in sys.modules
+        assert container.is_registered(IService)
+
+        service = container.resolve(IService)
+
+        module = sys.modules[lazy_module]
+        assert isinstance(service, module.Service)
+        assert isinstance(service.repository, module.Repository)
+        assert container.resolve(IService) is service
+        assert container.resolve(module.Repository) is service.repository
+
+    def test_invalid_target_rejected(self):
+        """测试缺少类名的路径在注册时被拒绝"""
+        container = DIContainer()
+
+        with pytest.raises(DependencyError):
+            container.register_lazy(IService, "minicrm.services.customer_service")
+        with pytest.raises(DependencyError):
+            container.register_lazy("minicrm.services.customer_service")
+
+    def test_missing_module_fails_on_resolve(self):
+        """测试模块不存在时在解析时报错"""
+        container = DIContainer()
+        container.register_lazy(IService, "minicrm.no_such_module:Service")
+
+        with pytest.raises(DependencyError):
+            container.resolve(IService)
+
+    def test_clear_removes_lazy_registrations(self, lazy_module):
+        """测试清理容器后延迟注册失效"""
+        container = DIContainer()
+        container.register_lazy(IService, f"{lazy_module}:Service")
+
+        container.clear()
+
+        assert not container.is_registered(IService)
@@ -0,0 +1,162 @@
+"""
+查询缓存管理器测试模块
+
+测试SQL表名解析以及基于写通知的按表缓存失效。
+"""
+
+from pathlib import Path
+import shutil
+import tempfile
+import unittest
+
+from minicrm.core.query_cache_manager import QueryCacheManager
+from minicrm.core.sql_table_parser import (
+    ALL_TABLES,
+    extract_read_tables,
+    extract_write_tables,
+    is_read_query,
+)
+from minicrm.data.database import DatabaseManager
+from minicrm.data.database_manager_enhanced import EnhancedDatabaseManager
+
+
+class TestSQLTableParser(unittest.TestCase):
+    """测试SQL表名解析"""
+
+    def test_read_tables_with_joins_and_aliases(self):
+        """测试JOIN和别名"""
+        sql = (
+            "SELECT c.name FROM customers c "
+            "LEFT JOIN customer_types AS ct ON c.customer_type_id = ct.id "
+            "WHERE c.name LIKE 'from quotes%'"
+        )
+        self.assertEqual(
+            extract_read_tables(sql), frozenset({"customers", "customer_types"})
+        )
+
+    def test_read_tables_with_subquery_and_comma_list(self):
+        """测试子查询和逗号分隔的多表"""
+        sql = (
+            "SELECT * FROM quotes q, main.contracts "
+            'WHERE q.id IN (SELECT quote_id FROM "quote_items")'
+        )
+        self.assertEqual(
+            extract_read_tables(sql),
+            frozenset({"quotes", "contracts", "quote_items"}),
+        )
+
+    def test_write_tables(self):
+        """测试写语句的目标表"""
+        self.assertEqual(
+            extract_write_tables("INSERT OR REPLACE INTO customers (name) VALUES (?)"),
+            frozenset({"customers"}),
+        )
+        self.assertEqual(
+            extract_write_tables("UPDATE suppliers SET name = ? WHERE id = ?"),
+            frozenset({"suppliers"}),
+        )
+        self.assertEqual(
+            extract_write_tables("DELETE FROM tasks WHERE id = ?"),
+            frozenset({"tasks"}),
+        )
+        self.assertEqual(
+            extract_write_tables("CREATE INDEX idx ON customers(name)"),
+            frozenset({ALL_TABLES}),
+        )
+
+    def test_is_read_query(self):
+        """测试只读查询判断"""
+        self.assertTrue(is_read_query("  select 1"))
+        self.assertTrue(is_read_query("WITH t AS (SELECT 1) SELECT * FROM t"))
+        self.assertFalse(is_read_query("PRAGMA table_info(customers)"))
+        self.assertFalse(is_read_query("WITH t AS (SELECT 1) DELETE FROM customers"))
+
+
+class TestQueryCacheInvalidation(unittest.TestCase):
+    """测试DatabaseManager写通知驱动的缓存失效"""
+
+    def setUp(self):
+        """测试准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = DatabaseManager(self.temp_dir / "cache.db")
+        with self.db_manager.transaction() as connection:
+            connection.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY)")
+            connection.execute("CREATE TABLE suppliers (id INTEGER PRIMARY KEY)")
+        self.cache = QueryCacheManager(self.db_manager)
+
+    def tearDown(self):
+        """测试清理"""
+        self.cache.close()
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _count(self, table: str) -> int:
+        return self.cache.execute_cached_query(f"SELECT COUNT(*) FROM {table}")[0][0]
+
+    def test_write_invalidates_only_dependent_entries(self):
+        """测试写入只失效读取了该表的缓存"""
+        self.assertEqual(self._count("customers"), 0)
+        self.assertEqual(self._count("suppliers"), 0)
+
+        self.db_manager.execute_insert("INSERT INTO customers DEFAULT VALUES")
+
+        self.assertEqual(self._count("customers"), 1)
+        self.assertEqual(self._count("suppliers"), 0)
+
+        stats = self.cache.get_cache_statistics()
+        self.assertEqual(stats["cache_misses"], 3)
+        self.assertEqual(stats["cache_hits"], 1)
+
+    def test_transaction_writes_notify_on_exit(self):
+        """测试事务内的写入在事务结束后失效缓存"""
+        self.assertEqual(self._count("customers"), 0)
+
+        with self.db_manager.transaction():
+            self.db_manager.execute_insert("INSERT INTO customers DEFAULT VALUES")
+
+        self.assertEqual(self._count("customers"), 1)
+
+    def test_raw_transaction_writes_invalidate_everything(self):
+        """测试直接使用事务连接的写入失效全部缓存"""
+        self.assertEqual(self._count("suppliers"), 0)
+
+        with self.db_manager.transaction() as connection:
+            connection.execute("INSERT INTO suppliers DEFAULT VALUES")
+
+        self.assertEqual(self._count("suppliers"), 1)
+
+    def test_close_unsubscribes(self):
+        """测试关闭后不再接收写通知"""
+        self.cache.close()
+        self.db_manager.execute_insert("INSERT INTO customers DEFAULT VALUES")
+        self.assertEqual(self.cache.get_cache_statistics()["invalidations"], 0)
+
+
+class TestQueryCacheEnhancedHooks(unittest.TestCase):
+    """测试EnhancedDatabaseManager after hooks驱动的缓存失效"""
+
+    def setUp(self):
+        """测试准备"""
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db_manager = EnhancedDatabaseManager(self.temp_dir / "enhanced.db")
+        with self.db_manager.transaction() as connection:
+            connection.execute("CREATE TABLE notes (id INTEGER PRIMARY KEY)")
+        self.cache = QueryCacheManager(self.db_manager)
+
+    def tearDown(self):
+        """测试清理"""
+        self.db_manager.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_after_hook_invalidates(self):
+        """测试after hook按SQL解析的表失效缓存"""
+        sql = "SELECT COUNT(*) FROM notes"
+        self.assertEqual(self.cache.execute_cached_query(sql)[0][0], 0)
+
+        self.db_manager.execute_insert("INSERT INTO notes DEFAULT VALUES")
+
+        self.assertEqual(self.cache.execute_cached_query(sql)[0][0], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -328,6 +328,39 @@ class TestCustomerDAO:
 
         assert "搜索客户记录失败" in str(exc_info.value)
 
+    def test_stream_batches_uses_cursor_iteration(
+        self, customer_dao, mock_db_manager, sample_customer_row
+    ):
+        """测试流式读取使用游标批量接口而不是一次性查询"""
+        mock_db_manager.iter_query_batches.return_value = iter(
+            [[sample_customer_row, sample_customer_row], [sample_customer_row]]
+        )
+
+        batches = list(customer_dao.stream_batches({"customer_type_id": 1}, None, 2))
+
+        assert [len(batch) for batch in batches] == [2, 1]
+        assert batches[0][0]["name"] == "测试公司"
+        mock_db_manager.execute_query.assert_not_called()
+
+        sql, params, batch_size = mock_db_manager.iter_query_batches.call_args[0]
+        assert "WHERE customer_type_id = ?" in sql
+        assert "LIMIT" not in sql
+        assert params == (1,)
+        assert batch_size == 2
+
+    def test_stream_yields_rows(
+        self, customer_dao, mock_db_manager, sample_customer_row
+    ):
+        """测试逐条流式读取"""
+        mock_db_manager.iter_query_batches.return_value = iter(
+            [[sample_customer_row], [sample_customer_row]]
+        )
+
+        rows = list(customer_dao.stream())
+
+        assert len(rows) == 2
+        assert all(row["id"] == 1 for row in rows)
+
     def test_count_with_conditions(self, customer_dao, mock_db_manager):
         """测试带条件统计"""
         # 设置模拟返回值
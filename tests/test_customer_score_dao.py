@@ -0,0 +1,194 @@
+"""
+客户价值评分预计算测试
+
+测试客户价值评分的持久化、增量重算以及基于索引的分布和前N名查询：
+- 触发器在客户及其关联记录变化、删除或改挂到其他客户时标记重算
+- 计算时间过久的评分重新计算
+- 分析服务只重算有变化的客户
+- 预计算结果与实时遍历计算结果一致
+"""
+
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.customer_score_dao import CustomerScoreDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.analytics.customer_analytics_service import (
+    CustomerAnalyticsService,
+)
+
+
+class TestCustomerScorePipeline:
+    """客户价值评分预计算测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建已初始化的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "scores.db")
+        manager.initialize_database()
+        for index in range(20):
+            manager.execute_insert(
+                "INSERT INTO customers (name, phone) VALUES (?, ?)",
+                (f"客户{index}", f"1380000{index:04d}"),
+            )
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def score_dao(self, db_manager):
+        """创建客户价值评分DAO"""
+        return CustomerScoreDAO(db_manager)
+
+    @pytest.fixture
+    def service(self, db_manager, score_dao):
+        """创建使用预计算评分的客户分析服务"""
+        return CustomerAnalyticsService(CustomerDAO(db_manager), score_dao)
+
+    def test_refresh_only_recomputes_dirty_customers(
+        self, db_manager, score_dao, service
+    ):
+        """测试只重算被标记的客户"""
+        total = db_manager.execute_query("SELECT COUNT(*) FROM customers")[0][0]
+        assert service.refresh_customer_scores(batch_size=7) == total
+        assert score_dao.count_dirty() == 0
+        assert service.refresh_customer_scores() == 0
+
+        customer_id = db_manager.execute_query("SELECT MIN(id) FROM customers")[0][0]
+        db_manager.execute_insert(
+            "INSERT INTO customer_interactions (customer_id, subject) VALUES (?, ?)",
+            (customer_id, "回访"),
+        )
+        assert score_dao.count_dirty() == 1
+        assert service.refresh_customer_scores() == 1
+
+    def _dirty_ids(self, db_manager) -> set[int]:
+        rows = db_manager.execute_query(
+            "SELECT customer_id FROM customer_value_scores WHERE is_dirty = 1"
+        )
+        return {row[0] for row in rows}
+
+    def test_delete_marks_customer_dirty(self, db_manager, service):
+        """测试删除关联记录时标记原客户重算"""
+        customer_id = db_manager.execute_query("SELECT MIN(id) FROM customers")[0][0]
+        interaction_id = db_manager.execute_insert(
+            "INSERT INTO customer_interactions (customer_id, subject) VALUES (?, ?)",
+            (customer_id, "回访"),
+        )
+        service.refresh_customer_scores()
+
+        db_manager.execute_delete(
+            "DELETE FROM customer_interactions WHERE id = ?", (interaction_id,)
+        )
+
+        assert self._dirty_ids(db_manager) == {customer_id}
+
+    def test_reassignment_marks_both_customers_dirty(self, db_manager, service):
+        """测试关联记录改挂到其他客户时两个客户都标记重算"""
+        old_id, new_id = [
+            row[0]
+            for row in db_manager.execute_query(
+                "SELECT id FROM customers ORDER BY id LIMIT 2"
+            )
+        ]
+        interaction_id = db_manager.execute_insert(
+            "INSERT INTO customer_interactions (customer_id, subject) VALUES (?, ?)",
+            (old_id, "回访"),
+        )
+        service.refresh_customer_scores()
+
+        db_manager.execute_update(
+            "UPDATE customer_interactions SET subject = ? WHERE id = ?",
+            ("再次回访", interaction_id),
+        )
+        assert self._dirty_ids(db_manager) == {old_id}
+        service.refresh_customer_scores()
+
+        db_manager.execute_update(
+            "UPDATE customer_interactions SET customer_id = ? WHERE id = ?",
+            (new_id, interaction_id),
+        )
+        assert self._dirty_ids(db_manager) == {old_id, new_id}
+
+    def test_stale_scores_recomputed(self, db_manager, score_dao, service):
+        """测试计算时间超过有效天数的评分被重新计算"""
+        service.refresh_customer_scores()
+        customer_id = db_manager.execute_query("SELECT MIN(id) FROM customers")[0][0]
+        db_manager.execute_update(
+            "UPDATE customer_value_scores SET computed_at = datetime('now', '-8 days') "
+            "WHERE customer_id = ?",
+            (customer_id,),
+        )
+
+        assert service.refresh_customer_scores(max_age_days=30) == 0
+        assert service.refresh_customer_scores(max_age_days=7) == 1
+        assert score_dao.mark_stale(7) == 0
+
+    def test_modified_after_read_stays_dirty(self, db_manager, score_dao, service):
+        """测试读取后再次修改的客户不会被清除重算标记"""
+        service.refresh_customer_scores()
+        customer_id = db_manager.execute_query("SELECT MIN(id) FROM customers")[0][0]
+        db_manager.execute_update(
+            "UPDATE customers SET notes = ? WHERE id = ?", ("a", customer_id)
+        )
+
+        dirty = score_dao.get_dirty_customers()
+        db_manager.execute_update(
+            "UPDATE customers SET notes = ? WHERE id = ?", ("b", customer_id)
+        )
+        saved = score_dao.save_scores(
+            [(customer_id, dirty[0]["_score_dirty_version"], 90.0, 90.0, "高价值")]
+        )
+
+        assert saved == 0
+        assert score_dao.count_dirty() == 1
+
+    def test_analysis_matches_streaming_computation(self, db_manager, service):
+        """测试预计算结果与逐个客户实时计算一致"""
+        streaming = CustomerAnalyticsService(CustomerDAO(db_manager))
+
+        precomputed = service.get_customer_analysis()
+        expected = streaming.get_customer_analysis()
+
+        assert (
+            precomputed.customer_value_distribution
+            == expected.customer_value_distribution
+        )
+        assert [c["value_score"] for c in precomputed.top_customers] == [
+            c["value_score"] for c in expected.top_customers
+        ]
+
+    def test_deleted_customer_removes_score(self, db_manager, score_dao, service):
+        """测试删除客户时级联删除评分"""
+        service.refresh_customer_scores()
+        customer_id = db_manager.execute_query("SELECT MAX(id) FROM customers")[0][0]
+        before = sum(score_dao.get_value_level_counts().values())
+
+        db_manager.execute_delete("DELETE FROM customers WHERE id = ?", (customer_id,))
+
+        assert sum(score_dao.get_value_level_counts().values()) == before - 1
+
+    def test_trigger_writes_notify_dependent_tables(self, db_manager):
+        """测试触发器连带修改的表被精确通知, 而不是失效所有表"""
+        notified = []
+        db_manager.add_write_listener(notified.append)
+
+        db_manager.execute_insert("INSERT INTO customers (name) VALUES ('新客户')")
+
+        # 连带修改按表级触发器推导, 包含customers上所有触发器的目标表
+        assert notified == [
+            frozenset(
+                {
+                    "customers",
+                    "customer_value_scores",
+                    "metric_daily_rollups",
+                    "interaction_search",
+                    "table_change_counters",
+                }
+            )
+        ]
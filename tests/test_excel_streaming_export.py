@@ -0,0 +1,79 @@
+"""
+Excel流式导出测试
+
+测试供应商和客户明细的单遍导出：
+- 列宽根据样本行计算, 全角字符按双倍宽度
+- 数据只遍历一次, 可以直接传入迭代器
+- openpyxl只写模式下样式以命名样式注册
+"""
+
+import csv
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.services.excel_export import (
+    CustomerExcelExporter,
+    ExcelFormatters,
+    SupplierExcelExporter,
+)
+
+
+class TestExcelStreamingExport:
+    """Excel流式导出测试类"""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """创建临时目录"""
+        path = Path(tempfile.mkdtemp())
+        yield path
+        shutil.rmtree(path, ignore_errors=True)
+
+    def test_column_widths_from_sample(self):
+        """测试根据样本计算列宽"""
+        formatters = ExcelFormatters()
+
+        widths = formatters.calculate_column_widths(
+            ["客户名称", "id", "备注"],
+            [["上海贸易有限公司", 1, "x" * 200]],
+        )
+
+        # 8个全角字符 + 2个字符边距; 短列使用最小宽度; 超长列截断
+        assert widths == [18, 8, 50]
+
+    def test_csv_fallback_consumes_iterator_once(self, temp_dir):
+        """测试CSV备用方案单遍写入迭代器"""
+        exporter = SupplierExcelExporter()
+        output = temp_dir / "suppliers.csv"
+        suppliers = (
+            {"id": i, "name": f"供应商{i}", "quality_score": 9} for i in range(3)
+        )
+
+        assert exporter._export_as_csv(suppliers, str(output))
+
+        with open(output, encoding="utf-8-sig", newline="") as f:
+            rows = list(csv.reader(f))
+        assert rows[0][:2] == ["供应商ID", "供应商名称"]
+        assert rows[1][:2] == ["0", "供应商0"]
+        assert rows[1][7] == "9.0"
+        assert len(rows) == 4
+
+    def test_write_only_export_uses_named_styles(self, temp_dir):
+        """测试openpyxl只写模式导出"""
+        openpyxl = pytest.importorskip("openpyxl")
+        exporter = CustomerExcelExporter()
+        output = temp_dir / "customers.xlsx"
+        customers = ({"id": i, "name": f"客户{i}"} for i in range(500))
+
+        assert exporter.export_customer_rows(customers, str(output))
+
+        wb = openpyxl.load_workbook(output)
+        ws = wb["客户基本信息"]
+        assert ws.max_row == 501
+        assert ws.freeze_panes == "A2"
+        assert ws["A1"].style == "minicrm_header"
+        assert ws["B2"].value == "客户0"
+        assert ws["B2"].style == "minicrm_data"
+        assert ws.column_dimensions["B"].width == 10
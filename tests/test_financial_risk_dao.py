@@ -0,0 +1,143 @@
+"""
+财务风险聚合测试
+
+测试按财务记录在数据库中聚合的客户风险档案:
+- 账龄区间、逾期天数和按时付款率由SQL计算
+- 收入占比和排名由窗口函数计算
+- 综合风险分析只加载一次风险数据
+"""
+
+from datetime import date
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.financial_risk_dao import FinancialRiskDAO
+from minicrm.data.dao.supplier_dao import SupplierDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.analytics.financial_risk_service import FinancialRiskService
+
+
+AS_OF = date(2024, 6, 1)
+
+
+class CountingFinancialRiskDAO(FinancialRiskDAO):
+    """记录风险档案加载次数的财务风险DAO"""
+
+    def __init__(self, database_manager: DatabaseManager):
+        super().__init__(database_manager)
+        self.load_count = 0
+
+    def get_customer_risk_profiles(self, as_of: date):
+        self.load_count += 1
+        return super().get_customer_risk_profiles(as_of)
+
+
+class TestFinancialRiskDAO:
+    """财务风险聚合测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建已初始化的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "risk.db")
+        manager.initialize_database()
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def customers(self, db_manager):
+        """插入客户和财务记录, 返回(大客户ID, 小客户ID)"""
+        sql = "INSERT INTO customers (name, created_at) VALUES (?, ?)"
+        big = db_manager.execute_insert(sql, ("大客户", "2020-06-01"))
+        small = db_manager.execute_insert(sql, ("小客户", "2023-06-01"))
+
+        records = [
+            # 未结应收: 逾期152天、逾期12天、尚未到期
+            (big, "receivable", 1000, "2024-01-01", None, "pending"),
+            (big, "receivable", 500, "2024-05-20", None, "pending"),
+            (big, "receivable", 200, "2024-07-01", None, "pending"),
+            # 已结应收: 一笔按时、一笔逾期9天
+            (big, "receivable", 300, "2024-01-01", "2023-12-30", "paid"),
+            (small, "receivable", 100, "2024-02-01", "2024-02-10", "paid"),
+            # 回款
+            (big, "payment", 900, None, "2024-01-10", "paid"),
+            (small, "payment", 100, None, "2024-02-10", "paid"),
+        ]
+        for record in records:
+            db_manager.execute_insert(
+                "INSERT INTO financial_records "
+                "(customer_id, record_type, amount, due_date, paid_date, status) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                record,
+            )
+        return big, small
+
+    def test_profiles_aggregate_receivables(self, db_manager, customers):
+        """测试账龄、逾期和付款历史的聚合结果"""
+        big, small = customers
+        profiles = FinancialRiskDAO(db_manager).get_customer_risk_profiles(AS_OF)
+
+        # 按未结应收金额排序, 没有财务记录的初始客户也在结果中
+        assert profiles[0]["id"] == big
+        assert small in [p["id"] for p in profiles]
+        profile = profiles[0]
+        assert profile["outstanding_amount"] == 1700
+        assert profile["overdue_amount"] == 1500
+        assert profile["overdue_days"] == 152
+        assert profile["aging_0_30"] == 500
+        assert profile["aging_over_90"] == 1000
+        assert profile["overdue_count"] == 2
+        assert profile["on_time_payment_rate"] == 1.0
+        assert profile["transaction_count"] == 5
+        assert profile["cooperation_years"] == pytest.approx(4, abs=0.01)
+
+        profile = next(p for p in profiles if p["id"] == small)
+        assert profile["outstanding_amount"] == 0
+        assert profile["max_overdue_days"] == 9
+        assert profile["on_time_payment_rate"] == 0.0
+        assert "overdue_count" not in next(
+            p for p in profiles if p["id"] not in customers
+        )
+
+    def test_profiles_rank_revenue(self, db_manager, customers):
+        """测试收入占比和排名"""
+        big, small = customers
+        profiles = {
+            p["id"]: p
+            for p in FinancialRiskDAO(db_manager).get_customer_risk_profiles(AS_OF)
+        }
+
+        assert profiles[big]["revenue_rank"] == 1
+        assert profiles[big]["revenue_share"] == pytest.approx(0.9)
+        assert profiles[small]["revenue_rank"] == 2
+        assert profiles[small]["revenue_share"] == pytest.approx(0.1)
+
+    def test_comprehensive_analysis_loads_profiles_once(self, db_manager, customers):
+        """测试综合风险分析共享同一份风险数据"""
+        risk_dao = CountingFinancialRiskDAO(db_manager)
+        service = FinancialRiskService(
+            CustomerDAO(db_manager), SupplierDAO(db_manager), risk_dao
+        )
+
+        analysis = service.get_comprehensive_risk_analysis()
+
+        assert risk_dao.load_count == 1
+
+        # 按当天统计, 所有未结应收均已逾期90天以上
+        receivable_risk = analysis["receivable_risk"]
+        assert receivable_risk["total_receivables"] == 1700
+        assert receivable_risk["overdue_receivables"] == 1700
+        assert receivable_risk["aging_analysis"]["90天以上"] == 1700
+        assert receivable_risk["high_risk_receivables"][0]["customer_name"] == "大客户"
+
+        concentration_risk = analysis["concentration_risk"]
+        assert concentration_risk["top1_customer_ratio"] == 90.0
+        assert concentration_risk["risk_level"] == "高"
+        customer_count = db_manager.execute_query("SELECT COUNT(*) FROM customers")
+        distribution = analysis["credit_risk"]["risk_distribution"]
+        assert sum(distribution.values()) == customer_count[0][0]
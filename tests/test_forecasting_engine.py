@@ -0,0 +1,125 @@
+"""
+预测引擎测试
+
+测试基于NumPy的批量预测引擎:
+- 批量拟合与逐条拟合结果一致
+- 线性回归的异常值处理
+- Holt-Winters季节模型
+- 按最新数据点缓存拟合模型
+- 滚动起点回测
+"""
+
+import math
+from unittest.mock import Mock
+
+import pytest
+
+from minicrm.services.analytics.forecasting_engine import ForecastingEngine
+from minicrm.services.analytics.prediction_service import PredictionService
+
+
+# 预测引擎依赖analytics可选依赖中的NumPy
+np = pytest.importorskip("numpy")
+
+
+class TestForecastingEngine:
+    """预测引擎测试类"""
+
+    @pytest.fixture
+    def engine(self):
+        """创建预测引擎"""
+        return ForecastingEngine()
+
+    def test_linear_regression_extends_line(self, engine):
+        """测试线性序列按直线外推, 置信度随预测距离下降"""
+        forecast = engine.forecast([10, 12, 14, 16, 18, 20], 3)
+
+        assert forecast.values[0].tolist() == pytest.approx([22, 24, 26])
+        assert forecast.confidence[0, 0] > forecast.confidence[0, 2]
+
+    def test_linear_regression_replaces_outliers(self, engine):
+        """测试异常值用中位数替换后再拟合"""
+        model = engine.fit([10, 11, 12, 13, 500, 15, 16, 17], "linear_regression")
+
+        assert model.params["slope"][0] < 5
+
+    def test_batch_matches_single_series(self, engine):
+        """测试批量拟合与逐条拟合结果一致"""
+        rng = np.random.default_rng(1)
+        data = rng.random((20, 30)) * 100 + np.arange(30)
+
+        for method in ("linear_regression", "trend_analysis", "holt_winters"):
+            batch = engine.forecast(data, 4, method).values
+            single = np.vstack([engine.forecast(row, 4, method).values for row in data])
+            assert np.allclose(batch, single)
+
+    def test_holt_winters_follows_season(self, engine):
+        """测试Holt-Winters延续季节形态和趋势"""
+        months = np.arange(48)
+        seasonal = 100 + months * 2 + 20 * np.sin(2 * math.pi * months / 12)
+
+        forecast = engine.forecast(seasonal, 12, "holt_winters").values[0]
+        future = np.arange(48, 60)
+        expected = 100 + future * 2 + 20 * np.sin(2 * math.pi * future / 12)
+
+        assert np.abs(forecast - expected).max() < 10
+        assert forecast.argmax() == expected.argmax()
+
+    def test_model_cache_keyed_by_latest_point(self, engine):
+        """测试最新数据点不变时复用模型, 新增数据后重新拟合"""
+        first = engine.fit([1, 2, 3, 4], "linear_regression", cache_key="revenue")
+        again = engine.fit([1, 2, 3, 4], "linear_regression", cache_key="revenue")
+        extended = engine.fit([1, 2, 3, 4, 5], "linear_regression", cache_key="revenue")
+
+        assert again is first
+        assert extended is not first
+
+    def test_backtest_rolling_origin(self, engine):
+        """测试滚动起点回测的次数和误差"""
+        result = engine.backtest(np.arange(1, 11, dtype=float), "linear_regression")
+
+        assert result["folds"] == 5
+        assert result["mape"][0] == pytest.approx(0)
+        assert result["mae"][0] == pytest.approx(0)
+
+
+class TestPredictionServiceWithEngine:
+    """使用预测引擎的预测服务测试类"""
+
+    @pytest.fixture
+    def service(self):
+        """创建预测服务"""
+        return PredictionService(Mock(), Mock())
+
+    def test_predict_all_metrics(self, service):
+        """测试一次预测所有业务指标"""
+        results = service.predict_all_metrics(3, "holt_winters")
+
+        assert set(results) == {"customer_growth", "revenue", "supplier_performance"}
+        assert all(len(r.predicted_values) == 3 for r in results.values())
+
+    def test_forecast_series_batch(self, service):
+        """测试批量预测多条序列"""
+        series = {key: [key * month for month in range(1, 7)] for key in (1, 2)}
+
+        forecasts = service.forecast_series_batch(series, 2)
+
+        assert forecasts[1] == pytest.approx([7, 8])
+        assert forecasts[2] == pytest.approx([14, 16])
+
+    def test_accuracy_analysis_backtests_methods(self, service):
+        """测试准确性分析由回测得出最佳方法"""
+        analysis = service.get_prediction_accuracy_analysis(
+            "revenue", [{"date": "2025-01", "value": 1100000}]
+        )
+
+        assert set(analysis["method_errors"]) == {
+            "linear_regression",
+            "exponential_smoothing",
+            "trend_analysis",
+            "holt_winters",
+        }
+        assert analysis["best_prediction_method"] == min(
+            analysis["method_errors"], key=analysis["method_errors"].get
+        )
+        assert analysis["backtest_folds"] == 7
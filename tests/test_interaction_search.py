@@ -0,0 +1,130 @@
+"""
+互动记录全文搜索测试
+
+测试基于FTS5的互动记录全文索引：
+- 触发器在互动记录及关联方名称变化时同步索引
+- 中文子串、多关键词和短关键词检索
+- 相关度排序、摘要高亮和分页
+"""
+
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.data.dao.interaction_dao import InteractionDAO
+from minicrm.data.database import DatabaseManager
+
+
+class TestInteractionSearch:
+    """互动记录全文搜索测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建已初始化的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "search.db")
+        manager.initialize_database()
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def dao(self, db_manager):
+        """创建互动记录DAO"""
+        return InteractionDAO(db_manager)
+
+    def _add_customer_interaction(self, db_manager, subject, content, name="华东板材"):
+        customer_id = db_manager.execute_insert(
+            "INSERT INTO customers (name) VALUES (?)", (name,)
+        )
+        interaction_id = db_manager.execute_insert(
+            "INSERT INTO customer_interactions (customer_id, subject, content) "
+            "VALUES (?, ?, ?)",
+            (customer_id, subject, content),
+        )
+        return customer_id, interaction_id
+
+    def test_chinese_substring_search(self, db_manager, dao):
+        """测试中文子串检索和摘要高亮"""
+        customer_id, interaction_id = self._add_customer_interaction(
+            db_manager, "季度回访", "客户反馈生态板封边质量需要改进"
+        )
+
+        results = dao.search_by_content("封边质量", highlight=("[", "]"))
+
+        assert [r["id"] for r in results] == [interaction_id]
+        assert results[0]["party_type"] == "customer"
+        assert results[0]["party_id"] == customer_id
+        assert "[封边质量]" in results[0]["snippet"]
+
+    def test_short_terms_and_party_name(self, db_manager, dao):
+        """测试短关键词和关联方名称检索"""
+        _, interaction_id = self._add_customer_interaction(
+            db_manager, "报价", "确认板材价格", name="恒通家具"
+        )
+        self._add_customer_interaction(db_manager, "报价", "确认板材价格")
+
+        assert [r["id"] for r in dao.search_by_content("恒通 报价")] == [interaction_id]
+
+    def test_index_follows_updates_deletes_and_renames(self, db_manager, dao):
+        """测试互动记录修改、删除和关联方改名后索引同步"""
+        customer_id, interaction_id = self._add_customer_interaction(
+            db_manager, "拜访", "讨论年度框架协议"
+        )
+
+        db_manager.execute_update(
+            "UPDATE customer_interactions SET content = ? WHERE id = ?",
+            ("讨论样品交付周期", interaction_id),
+        )
+        assert dao.search_by_content("框架协议") == []
+        assert len(dao.search_by_content("交付周期")) == 1
+
+        db_manager.execute_update(
+            "UPDATE customers SET name = ? WHERE id = ?", ("新名称公司", customer_id)
+        )
+        assert dao.search_by_content("新名称公司")[0]["party_name"] == "新名称公司"
+
+        db_manager.execute_delete(
+            "DELETE FROM customer_interactions WHERE id = ?", (interaction_id,)
+        )
+        assert dao.search_by_content("交付周期") == []
+
+    def test_filters_ranking_and_pagination(self, db_manager, dao):
+        """测试关联方过滤、相关度排序和分页"""
+        supplier_id = db_manager.execute_insert(
+            "INSERT INTO suppliers (name) VALUES (?)", ("原料供应商",)
+        )
+        db_manager.execute_insert(
+            "INSERT INTO supplier_interactions (supplier_id, subject, content) "
+            "VALUES (?, ?, ?)",
+            (supplier_id, "交期", "交货延迟交货延迟交货延迟"),
+        )
+        for index in range(3):
+            self._add_customer_interaction(
+                db_manager, f"记录{index}", "本次沟通涉及交货延迟的问题以及其他很多事项"
+            )
+
+        results = dao.search_by_content("交货延迟")
+        assert len(results) == 4
+        assert results[0]["party_type"] == "supplier"
+
+        assert len(dao.search_by_content("交货延迟", party_type="customer")) == 3
+        assert (
+            dao.search_by_content(
+                "交货延迟", party_id=supplier_id, party_type="supplier"
+            )[0]["party_id"]
+            == supplier_id
+        )
+        page = dao.search_by_content("交货延迟", limit=2, offset=2)
+        assert [r["id"] for r in page] == [r["id"] for r in results[2:]]
+
+    def test_query_syntax_is_escaped(self, db_manager, dao):
+        """测试用户输入中的FTS5语法字符按普通文本处理"""
+        _, interaction_id = self._add_customer_interaction(
+            db_manager, "备注", 'size "100%" OR NOT'
+        )
+
+        assert [r["id"] for r in dao.search_by_content('"100%"')] == [interaction_id]
+        assert dao.search_by_content("   ") == []
@@ -0,0 +1,220 @@
+"""
+键集分页测试
+
+测试基于(排序字段, id)的键集分页:
+- QueryBuilder.seek逐页遍历与完整排序结果一致, 包括重复值和NULL
+- 游标只能用于生成它的查询
+- 排序字段必须有可用索引, 总数可以缓存或根据sqlite_stat1估算
+"""
+
+from pathlib import Path
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+
+from minicrm.core.cache_tier import get_cache_tier
+from minicrm.core.exceptions import ValidationError
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.table_stats_dao import TableStatsDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.customer.customer_search_service import CustomerSearchService
+from transfunctions.data_operations.query_builder import (
+    LogicalOperator,
+    QueryBuilder,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class CountingCustomerDAO(CustomerDAO):
+    """记录COUNT查询次数的客户DAO"""
+
+    def __init__(self, database_manager: DatabaseManager):
+        super().__init__(database_manager)
+        self.count_calls = 0
+
+    def count_keyword_matches(self, query="", search_fields=(), filters=None):
+        self.count_calls += 1
+        return super().count_keyword_matches(query, search_fields, filters)
+
+
+class TestQueryBuilderSeek:
+    """QueryBuilder键集分页测试类"""
+
+    @pytest.fixture
+    def connection(self):
+        """创建包含重复值和NULL的内存表"""
+        connection = sqlite3.connect(":memory:")
+        connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, score INT)")
+        scores = [3, None, 1, 3, 2, None, 1, 3, 2, 5, None, 4]
+        connection.executemany(
+            "INSERT INTO items (score) VALUES (?)", [(s,) for s in scores]
+        )
+        yield connection
+        connection.close()
+
+    def _walk(self, connection, direction, page_size=5):
+        rows, after = [], None
+        while True:
+            builder = QueryBuilder("items").select("id", "score")
+            builder.where("score", "!=", 4).seek("score", direction, after)
+            sql, params = builder.limit(page_size).build()
+            page = connection.execute(sql, params).fetchall()
+            rows.extend(page)
+            if len(page) < page_size:
+                return rows
+            after = (page[-1][1], page[-1][0])
+
+    @pytest.mark.parametrize("direction", ["ASC", "DESC"])
+    def test_seek_pages_match_full_order(self, connection, direction):
+        """测试逐页遍历的结果与一次性排序一致"""
+        expected = connection.execute(
+            "SELECT id, score FROM items WHERE score != 4 "
+            f"ORDER BY score {direction}, id {direction}"
+        ).fetchall()
+
+        assert self._walk(connection, direction) == expected
+
+    def test_seek_keeps_existing_conditions_grouped(self):
+        """测试键集条件与OR条件整体以AND连接"""
+        builder = QueryBuilder("items").where("a", "=", 1)
+        builder.where("b", "=", 2, LogicalOperator.OR)
+        sql, params = builder.seek("score", "ASC", (3, 7)).build()
+
+        assert "WHERE (a = ? OR b = ?) AND (score, id) > (?, ?)" in sql
+        assert params == [1, 2, 3, 7]
+
+    def test_count_ignores_seek_and_counts_groups(self, connection):
+        """测试COUNT不受键集条件影响, 分组查询按组数统计"""
+        builder = QueryBuilder("items").group_by("score")
+        builder.seek("score", "ASC", (2, 100))
+        sql, params = builder.build_count()
+
+        assert connection.execute(sql, params).fetchall() == [(6,)]
+
+    def test_cursor_bound_to_query(self):
+        """测试游标只能用于生成它的查询"""
+        cursor = encode_cursor("query-a", "张三", 42)
+
+        assert decode_cursor(cursor, "query-a") == ("张三", 42)
+        with pytest.raises(ValueError):
+            decode_cursor(cursor, "query-b")
+        with pytest.raises(ValueError):
+            decode_cursor("not a cursor", "query-a")
+
+
+class TestCustomerKeysetSearch:
+    """客户键集分页搜索测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建带测试客户的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "keyset.db")
+        manager.initialize_database()
+        for index in range(25):
+            manager.execute_insert(
+                "INSERT INTO customers (name, phone, customer_type_id) "
+                "VALUES (?, ?, ?)",
+                (f"Keyset{index % 10}", f"1390000{index:04d}", index % 2 + 1),
+            )
+        # 写入后按表失效缓存的结果总数
+        get_cache_tier().attach_database(manager)
+        yield manager
+        get_cache_tier().detach_database(manager)
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def customer_dao(self, db_manager):
+        """创建记录COUNT次数的客户DAO"""
+        return CountingCustomerDAO(db_manager)
+
+    @pytest.fixture
+    def service(self, customer_dao, db_manager):
+        """创建客户搜索服务"""
+        service = CustomerSearchService(customer_dao, TableStatsDAO(db_manager))
+        service._count_cache.clear()
+        return service
+
+    def test_cursor_walks_all_matches_once(self, service, customer_dao):
+        """测试按游标翻页不重复不遗漏, 总数只统计一次"""
+        seen, cursor = [], None
+        while True:
+            page = service.search_customers_page(
+                "Keyset", cursor=cursor, page_size=4, order_by="name"
+            )
+            seen.extend(item["id"] for item in page.items)
+            assert page.total == 25
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+
+        names = [service._customer_dao.get_by_id(i)["name"] for i in seen]
+        assert len(seen) == len(set(seen)) == 25
+        assert names == sorted(names)
+        assert customer_dao.count_calls == 1
+
+    def test_writes_invalidate_cached_total(self, service, db_manager):
+        """测试写入客户表后重新统计总数"""
+        service.search_customers_page("Keyset")
+        db_manager.execute_insert(
+            "INSERT INTO customers (name) VALUES (?)", ("Keyset-new",)
+        )
+
+        assert service.search_customers_page("Keyset").total == 26
+
+    def test_filters_and_tuple_api(self, service):
+        """测试筛选条件和兼容的(列表, 总数)接口"""
+        customers, total = service.search_customers(
+            "Keyset", {"customer_type_id": 1, "customer_level": "vip"}, 2, 5
+        )
+
+        assert total == 13
+        assert len(customers) == 5
+        assert all(c["customer_type_id"] == 1 for c in customers)
+        assert all("formatted_phone" in c for c in customers)
+
+    def test_order_by_requires_index(self, service, db_manager):
+        """测试没有索引的排序字段被拒绝, 索引变化后重新检查"""
+        with pytest.raises(ValidationError):
+            service.search_customers_page("Keyset", order_by="address")
+
+        assert service.search_customers_page("Keyset", order_by="phone DESC").items
+        db_manager.execute_update("DROP INDEX idx_customers_phone")
+        with pytest.raises(ValidationError):
+            service.search_customers_page("Keyset", order_by="phone DESC")
+
+    def test_cursor_from_other_query_rejected(self, service):
+        """测试游标不能用于条件不同的查询"""
+        page = service.search_customers_page("Keyset", page_size=3)
+
+        with pytest.raises(ValidationError):
+            service.search_customers_page("Other", cursor=page.next_cursor)
+
+    def test_estimated_count_from_sqlite_stat1(self, service, db_manager):
+        """测试估算模式使用ANALYZE统计的行数, 不执行COUNT"""
+        db_manager.execute_update("ANALYZE")
+        total = db_manager.execute_query("SELECT COUNT(*) FROM customers")[0][0]
+
+        page = service.search_customers_page(count_mode="estimated")
+
+        assert page.total_estimated
+        assert page.total == total
+        assert service._customer_dao.count_calls == 0
+        assert service.search_customers_page(count_mode="none").total is None
+
+    def test_estimated_count_requires_indexed_equality(self, service, db_manager):
+        """测试无法用索引统计缩小的条件执行精确COUNT"""
+        db_manager.execute_update("ANALYZE")
+        stats_dao = TableStatsDAO(db_manager)
+
+        page = service.search_customers_page("Keyset1", count_mode="estimated")
+
+        assert not page.total_estimated
+        assert page.total == 3
+        assert service._customer_dao.count_calls == 1
+        assert stats_dao.estimate_row_count("customers", ("address",)) is None
+        assert stats_dao.estimate_row_count("customers", ("phone",)) == 1
@@ -0,0 +1,155 @@
+"""
+业务指标日汇总测试
+
+测试由触发器增量维护的指标日汇总以及基于汇总的趋势查询：
+- 来源记录增删改时日汇总同步调整
+- 按月、季度等粒度分组的结果与来源表一致
+- 趋势分析服务使用真实历史数据
+"""
+
+from datetime import date
+from pathlib import Path
+import shutil
+import tempfile
+
+import pytest
+
+from minicrm.data.dao.customer_dao import CustomerDAO
+from minicrm.data.dao.metric_rollup_dao import MetricRollupDAO
+from minicrm.data.database import DatabaseManager
+from minicrm.services.analytics.customer_analytics_service import (
+    CustomerAnalyticsService,
+)
+from minicrm.services.analytics.trend_analysis_service import TrendAnalysisService
+from transfunctions.calculations import calculate_period_buckets
+
+
+class TestMetricRollupPipeline:
+    """业务指标日汇总测试类"""
+
+    @pytest.fixture
+    def db_manager(self):
+        """创建已初始化的临时数据库"""
+        temp_dir = Path(tempfile.mkdtemp())
+        manager = DatabaseManager(temp_dir / "rollups.db")
+        manager.initialize_database()
+        yield manager
+        manager.close()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    @pytest.fixture
+    def rollup_dao(self, db_manager):
+        """创建业务指标汇总DAO"""
+        return MetricRollupDAO(db_manager)
+
+    def _add_customer(self, db_manager, created_at: str) -> int:
+        return db_manager.execute_insert(
+            "INSERT INTO customers (name, created_at) VALUES (?, ?)",
+            ("客户", created_at),
+        )
+
+    def _add_payment(self, db_manager, customer_id: int, amount: float, paid: str):
+        return db_manager.execute_insert(
+            "INSERT INTO financial_records "
+            "(customer_id, record_type, amount, paid_date) VALUES (?, 'payment', ?, ?)",
+            (customer_id, amount, paid),
+        )
+
+    def test_rollup_follows_inserts_updates_and_deletes(self, db_manager, rollup_dao):
+        """测试来源记录变化时日汇总同步调整"""
+        customer_id = self._add_customer(db_manager, "2024-01-15 10:00:00")
+        record_id = self._add_payment(db_manager, customer_id, 100, "2024-01-20")
+        self._add_payment(db_manager, customer_id, 50, "2024-02-03")
+
+        series = rollup_dao.get_series(
+            "revenue", "monthly", date(2024, 1, 1), date(2024, 3, 1)
+        )
+        assert series["2024-01"]["amount"] == 100
+        assert series["2024-02"]["amount"] == 50
+
+        db_manager.execute_update(
+            "UPDATE financial_records SET paid_date = ? WHERE id = ?",
+            ("2024-02-10", record_id),
+        )
+        db_manager.execute_delete(
+            "DELETE FROM financial_records WHERE amount = ?", (50,)
+        )
+
+        series = rollup_dao.get_series(
+            "revenue", "monthly", date(2024, 1, 1), date(2024, 3, 1)
+        )
+        assert series["2024-01"]["amount"] == 0
+        assert series["2024-02"] == {"count": 1, "amount": 100}
+
+    def test_unrelated_records_are_not_counted(self, db_manager, rollup_dao):
+        """测试不满足计入条件的财务记录不计入收入"""
+        customer_id = self._add_customer(db_manager, "2024-01-15")
+        db_manager.execute_insert(
+            "INSERT INTO financial_records "
+            "(customer_id, record_type, amount, due_date) "
+            "VALUES (?, 'receivable', 80, '2024-01-20')",
+            (customer_id,),
+        )
+
+        assert (
+            rollup_dao.get_series(
+                "revenue", "yearly", date(2024, 1, 1), date(2025, 1, 1)
+            )
+            == {}
+        )
+
+    def test_grouping_matches_period_buckets(self, db_manager, rollup_dao):
+        """测试SQL分组的key与时间段划分一致"""
+        for created_at in ("2024-05-31", "2024-06-01", "2024-06-30", "2024-07-01"):
+            self._add_customer(db_manager, created_at)
+
+        for granularity in ("daily", "weekly", "monthly", "quarterly", "yearly"):
+            buckets = calculate_period_buckets(granularity, 400, date(2024, 7, 1))
+            series = rollup_dao.get_series(
+                "new_customers", granularity, buckets[0]["start"], buckets[-1]["end"]
+            )
+            keys = {bucket["key"] for bucket in buckets}
+            assert set(series) <= keys
+            assert sum(item["count"] for item in series.values()) == 4
+
+    def test_rebuild_matches_incremental_rollup(self, db_manager, rollup_dao):
+        """测试全量重建结果与增量维护一致"""
+        customer_id = self._add_customer(db_manager, "2023-12-31 23:00:00")
+        self._add_payment(db_manager, customer_id, 20.5, "2024-03-01")
+        db_manager.execute_insert(
+            "INSERT INTO quotes "
+            "(quote_number, customer_id, customer_name, total_amount, quote_date) "
+            "VALUES ('Q-1', ?, '客户', 300, '2024-03-02')",
+            (customer_id,),
+        )
+        sql = "SELECT * FROM metric_daily_rollups ORDER BY metric, bucket_date"
+        incremental = [tuple(row) for row in db_manager.execute_query(sql)]
+
+        rollup_dao.rebuild()
+
+        assert [tuple(row) for row in db_manager.execute_query(sql)] == incremental
+
+    def test_services_use_rollup(self, db_manager, rollup_dao):
+        """测试趋势服务基于真实数据计算"""
+        today = date.today()
+        # 初始数据中的客户创建于今天
+        existing = db_manager.execute_query("SELECT COUNT(*) FROM customers")[0][0]
+        self._add_customer(db_manager, "2000-01-01")
+        self._add_customer(db_manager, today.isoformat())
+
+        trend = CustomerAnalyticsService(
+            CustomerDAO(db_manager), rollup_dao=rollup_dao
+        ).calculate_customer_growth_trend(3)
+        assert [item["total_customers"] for item in trend] == [1, 1, existing + 2]
+        assert trend[-1]["new_customers"] == existing + 1
+        assert trend[-1]["growth_rate"] == (existing + 1) * 100
+
+        analysis = TrendAnalysisService(
+            CustomerDAO(db_manager), None, rollup_dao
+        ).get_business_trend_analysis("customer_growth", "yearly")
+        assert [point["value"] for point in analysis.data_points] == [
+            1,
+            1,
+            existing + 2,
+        ]
+        assert analysis.data_points[-1]["date"] == str(today.year)
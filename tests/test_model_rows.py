@@ -0,0 +1,169 @@
+"""
+数据模型批量加载测试
+
+测试从可信数据库行构建模型的快速路径:
+- 模型使用__slots__, 初始化时的清理和验证照常进行
+- from_rows按字段类型转换数据库值, 不验证
+- 验证推迟到模型写回数据库时进行
+"""
+
+from datetime import datetime
+from decimal import Decimal
+
+import pytest
+
+from minicrm.core import ValidationError
+from minicrm.data.dao.model_converter import ModelConverter
+from minicrm.models.base import ModelStatus, model_fields
+from minicrm.models.contract import Contract, ContractStatus
+from minicrm.models.customer import Customer, CustomerLevel
+from minicrm.models.quote import Quote, QuoteStatus
+from minicrm.models.supplier import Supplier
+
+
+CUSTOMER_ROW = {
+    "id": 7,
+    "name": "上海恒达家具有限公司",
+    "phone": "13812345678",
+    "email": None,
+    "address": "上海市恒达路1号",
+    "customer_type_id": 3,
+    "contact_person": "王经理",
+    "notes": None,
+    "created_at": "2024-01-02 03:04:05",
+    "updated_at": "2024-01-02 03:04:05",
+}
+
+
+class TestSlottedModels:
+    """使用__slots__的模型测试类"""
+
+    @pytest.mark.parametrize("model_class", [Customer, Supplier, Quote, Contract])
+    def test_no_instance_dict(self, model_class):
+        """测试实例没有__dict__"""
+        model = model_class.from_rows([{"name": "测试名称"}])[0]
+
+        assert not hasattr(model, "__dict__")
+        with pytest.raises(AttributeError):
+            model.undeclared_attribute = 1
+
+    def test_construction_still_validates(self):
+        """测试构造时仍清理和验证数据"""
+        customer = Customer(name="  测试公司  ", phone="13812345678")
+
+        assert customer.name == "测试公司"
+        with pytest.raises(ValidationError):
+            Customer(name="测试公司", phone="123")
+
+    def test_to_dict_and_from_dict_round_trip(self):
+        """测试序列化后可以还原"""
+        customer = Customer(
+            name="测试公司",
+            phone="13812345678",
+            customer_level=CustomerLevel.VIP,
+            created_at=datetime(2024, 5, 6, 7, 8, 9),
+        )
+
+        data = customer.to_dict()
+        restored = Customer.from_dict(data)
+
+        assert data["created_at"] == "2024-05-06 07:08:09"
+        assert data["customer_level"] == "vip"
+        assert restored.customer_level == CustomerLevel.VIP
+        assert restored.created_at == customer.created_at
+
+    def test_field_metadata_cached(self):
+        """测试字段元数据按类缓存"""
+        assert model_fields(Customer) is model_fields(Customer)
+        assert "customer_level" in model_fields(Customer).name_set
+        assert "customer_level" not in model_fields(Quote).name_set
+
+
+class TestFromRows:
+    """批量加载测试类"""
+
+    def test_converts_database_values(self):
+        """测试数据库值按字段类型转换"""
+        customer = Customer.from_rows([CUSTOMER_ROW])[0]
+
+        assert customer.id == 7
+        assert customer.created_at == datetime(2024, 1, 2, 3, 4, 5)
+        # 非Optional字段的NULL使用默认值, 不属于模型的列被忽略
+        assert customer.email == ""
+        assert customer.notes == ""
+        assert customer.tags == []
+        assert customer.company_name == customer.name
+        assert customer.credit_limit == Decimal("0.00")
+
+    def test_enums_and_decimals(self):
+        """测试枚举和Decimal字段, 无效枚举值使用默认值"""
+        contract = Contract.from_rows(
+            [
+                {
+                    "contract_number": "SC0001",
+                    "contract_status": "signed",
+                    "contract_amount": 1234.5,
+                    "status": "unknown",
+                    "sign_date": "2025-01-01",
+                }
+            ]
+        )[0]
+
+        assert contract.contract_status == ContractStatus.SIGNED
+        assert contract.contract_amount == Decimal("1234.5")
+        assert contract.status == ModelStatus.ACTIVE
+        assert contract.sign_date == datetime(2025, 1, 1)
+        assert contract.attachments == []
+
+    def test_skips_validation(self):
+        """测试加载不验证, 验证推迟到写入"""
+        quote = Quote.from_rows(
+            [
+                {
+                    "quote_number": "SQ0001",
+                    "customer_name": "客户",
+                    "quote_status": "sent",
+                }
+            ]
+        )[0]
+
+        assert quote.quote_status == QuoteStatus.SENT
+        assert quote.items == []
+        with pytest.raises(ValidationError):
+            quote.validate()
+
+    def test_instances_are_independent(self):
+        """测试每个实例有独立的列表字段"""
+        first, second = Customer.from_rows([CUSTOMER_ROW, CUSTOMER_ROW])
+
+        first.add_tag("重点")
+
+        assert second.tags == []
+
+
+class TestModelConverter:
+    """模型转换器测试类"""
+
+    def test_rows_to_models(self):
+        """测试批量转换跳过空行"""
+        converter = ModelConverter()
+
+        models = converter.rows_to_models([CUSTOMER_ROW, {}, CUSTOMER_ROW], Customer)
+
+        assert [model.id for model in models] == [7, 7]
+        assert converter.rows_to_models([], Customer) == []
+
+    def test_validates_before_write(self):
+        """测试写入前验证"""
+        converter = ModelConverter()
+        customer = Customer.from_rows([dict(CUSTOMER_ROW, phone="123")])[0]
+
+        with pytest.raises(ValidationError):
+            converter.prepare_model_for_insert(customer)
+        with pytest.raises(ValidationError):
+            converter.prepare_model_for_update(customer)
+
+        customer.phone = "13812345678"
+        data = converter.prepare_model_for_update(customer)
+        assert "id" not in data
+        assert data["phone"] == "13812345678"
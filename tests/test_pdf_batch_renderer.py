@@ -0,0 +1,102 @@
+"""
+PDF批量渲染测试
+
+测试批量生成报表的调度部分：
+- 结果按输入顺序返回, 每份报表单独计时并回调
+- 进程池和当前进程两种方式结果一致
+- 图表按数据内容缓存
+"""
+
+from unittest.mock import Mock
+
+from minicrm.services.pdf_batch_renderer import PdfBatchRenderer
+from minicrm.services.pdf_document_service import PdfDocumentService
+from minicrm.services.pdf_report_resources import ChartCache
+
+
+def _configs(tmp_path, count):
+    return [
+        {
+            "report_type": "analytics_report",
+            "data": {"analysis_content": f"内容{i}"},
+            "output_path": str(tmp_path / f"report_{i}.pdf"),
+        }
+        for i in range(count)
+    ]
+
+
+class TestPdfBatchRenderer:
+    """PDF批量渲染测试类"""
+
+    def test_results_keep_input_order(self, tmp_path):
+        """测试进程池生成结果按输入顺序返回"""
+        configs = _configs(tmp_path, 6)
+        callback = Mock()
+
+        results = PdfBatchRenderer(max_workers=2).render(configs, callback)
+
+        assert [r.output_path for r in results] == [c["output_path"] for c in configs]
+        assert [r.index for r in results] == list(range(6))
+        assert all(r.elapsed >= 0 for r in results)
+        assert callback.call_count == 6
+
+    def test_in_process_matches_pool(self, tmp_path):
+        """测试单进程和进程池结果一致"""
+        configs = _configs(tmp_path, 3)
+
+        sequential = PdfBatchRenderer(max_workers=1).render(configs)
+        parallel = PdfBatchRenderer(max_workers=3).render(configs)
+
+        assert [r.success for r in sequential] == [r.success for r in parallel]
+
+    def test_generate_batch_reports_in_process(self):
+        """测试单进程批量生成使用当前服务, 未指定输出路径时使用默认文件名"""
+        service = PdfDocumentService()
+        service.generate_enhanced_pdf_report = Mock(side_effect=[True, False])
+        callback = Mock()
+
+        results = service.generate_batch_reports(
+            [
+                {"report_type": "customer_report", "data": {"total_customers": 1}},
+                {"report_type": "generic", "output_path": "b.pdf"},
+            ],
+            max_workers=1,
+            progress_callback=callback,
+        )
+
+        assert results == {"report_0.pdf": True, "b.pdf": False}
+        service.generate_enhanced_pdf_report.assert_any_call(
+            "customer_report", {"total_customers": 1}, "report_0.pdf"
+        )
+        assert callback.call_args_list[0].args[0].elapsed >= 0
+
+
+class TestChartCache:
+    """图表缓存测试类"""
+
+    def test_same_data_creates_chart_once(self):
+        """测试相同数据只创建一次图表"""
+        cache = ChartCache()
+        factory = Mock(return_value=object())
+
+        first = cache.get_or_create("pie", "分布", {"高价值": 3, "低价值": 5}, factory)
+        second = cache.get_or_create("pie", "分布", {"低价值": 5, "高价值": 3}, factory)
+
+        assert first is second
+        assert factory.call_count == 1
+        assert cache.hits == 1
+
+    def test_failed_chart_not_cached_and_lru_eviction(self):
+        """测试创建失败不缓存, 超出容量淘汰最久未使用的图表"""
+        cache = ChartCache(max_size=2)
+
+        assert cache.get_or_create("pie", "t", {"a": 1}, lambda: None) is None
+        assert len(cache) == 0
+
+        for i in range(3):
+            cache.get_or_create("trend", "t", [i], object)
+        assert len(cache) == 2
+
+        factory = Mock(return_value=object())
+        cache.get_or_create("trend", "t", [0], factory)
+        assert factory.call_count == 1
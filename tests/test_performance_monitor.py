@@ -0,0 +1,130 @@
+"""
+性能监控器指标核心测试
+
+测试PerformanceMonitor的低开销指标记录:
+- 对数线性直方图的百分位误差在桶精度以内
+- 最近指标明细保存在定长环形缓冲区中, 累计统计不受影响
+- 进程内存按间隔抽样读取, 不在每次调用时读取
+"""
+
+import itertools
+import random
+
+import pytest
+
+from minicrm.core.performance_monitor import (
+    DEFAULT_MAX_METRICS,
+    DEFAULT_MEMORY_SAMPLE_INTERVAL,
+    LatencyHistogram,
+    PerformanceMonitor,
+)
+
+
+@pytest.fixture
+def monitor():
+    """提供已清空的性能监控器, 测试后恢复默认设置"""
+    monitor = PerformanceMonitor.get_instance()
+    monitor.clear_metrics()
+    monitor.enable()
+    yield monitor
+    monitor.enable()
+    monitor.set_max_metrics(DEFAULT_MAX_METRICS)
+    monitor.set_memory_sample_interval(DEFAULT_MEMORY_SAMPLE_INTERVAL)
+    monitor.clear_metrics()
+
+
+class TestLatencyHistogram:
+    """耗时直方图测试类"""
+
+    def test_percentiles_within_bucket_precision(self):
+        """测试百分位与精确排序结果的相对误差不超过1/64"""
+        rng = random.Random(7)
+        values = [rng.lognormvariate(-6, 1.5) for _ in range(20000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        values.sort()
+        for percent in (50, 95, 99):
+            exact = values[-(-len(values) * percent // 100) - 1]
+            assert histogram.percentile(percent) == pytest.approx(exact, rel=1 / 64)
+        assert histogram.count == len(values)
+        assert histogram.min == values[0]
+        assert histogram.max == values[-1]
+
+    def test_small_and_empty(self):
+        """测试空直方图和亚微秒耗时"""
+        histogram = LatencyHistogram()
+        assert histogram.percentile(99) == 0.0
+
+        histogram.record(0.0000002)
+        assert histogram.percentile(50) == 0.0000002
+
+
+class TestPerformanceMonitor:
+    """性能监控器测试类"""
+
+    def test_operation_stats_and_recent_metrics(self, monitor):
+        """测试累计统计和最近明细"""
+        for index in range(10):
+            monitor.record_metric("db.query", (index + 1) / 1000, table="customers")
+        with monitor.monitor_operation("db.insert", table="suppliers"):
+            pass
+
+        stats = monitor.get_operation_stats("db.query")
+        assert stats["count"] == 10
+        assert stats["total_duration_ms"] == pytest.approx(55.0)
+        assert stats["p50_duration_ms"] == pytest.approx(5.0, rel=1 / 64)
+        assert stats["p99_duration_ms"] == pytest.approx(10.0, rel=1 / 64)
+        assert monitor.get_all_operations() == ["db.insert", "db.query"]
+
+        latest = monitor.get_metrics(limit=2)
+        assert [m.operation for m in latest] == ["db.insert", "db.query"]
+        assert latest[0].metadata == {"table": "suppliers"}
+        assert latest[1].duration_ms == pytest.approx(10.0)
+
+    def test_ring_buffer_keeps_totals(self, monitor):
+        """测试明细超出上限时丢弃最旧的, 累计统计仍包含全部调用"""
+        monitor.set_max_metrics(5)
+        for index in range(12):
+            monitor.record_metric("service.call", 0.001, index=index)
+
+        metrics = monitor.get_metrics("service.call")
+        assert [m.metadata["index"] for m in metrics] == [11, 10, 9, 8, 7]
+        assert monitor.get_operation_stats("service.call")["count"] == 12
+        assert monitor.get_summary()["total_operations"] == 12
+
+    def test_memory_sampled_by_interval(self, monitor, monkeypatch):
+        """测试每隔固定次数才读取内存"""
+        readings = []
+
+        def fake_memory_usage():
+            readings.append(len(readings))
+            return 100.0 + len(readings)
+
+        monkeypatch.setattr(monitor, "_get_memory_usage", fake_memory_usage)
+        monitor.set_memory_sample_interval(4)
+        monitor._operation_counter = itertools.count()
+
+        for _ in range(8):
+            with monitor.monitor_operation("ui.render"):
+                pass
+
+        # 8次操作中抽样2次, 每次在开始和结束各读取一次
+        assert len(readings) == 4
+        assert monitor.get_operation_stats("ui.render")["avg_memory_delta_mb"] == 1.0
+
+        monitor.set_memory_sample_interval(0)
+        with monitor.monitor_operation("ui.render"):
+            pass
+        assert len(readings) == 4
+
+    def test_disabled_monitor_records_nothing(self, monitor):
+        """测试禁用时不记录"""
+        monitor.disable()
+
+        with monitor.monitor_operation("db.query"):
+            pass
+        monitor.monitor_function("db.func")(lambda: None)()
+
+        assert monitor.get_all_operations() == []
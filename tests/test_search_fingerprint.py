@@ -0,0 +1,180 @@
+"""
+搜索条件指纹测试
+
+测试高级搜索结果缓存使用的查询指纹和内存筛选:
+- AND条件与顺序无关, 含OR的条件与顺序有关
+- 增加AND条件的查询可以由已缓存的结果集回答
+- 内存筛选和排序与SQLite的结果一致
+"""
+
+from dataclasses import dataclass
+import sqlite3
+from typing import Any
+
+import pytest
+
+from minicrm.services.search_fingerprint import (
+    RowNotEvaluableError,
+    filter_rows,
+    fingerprint_conditions,
+    rows_after,
+    sort_rows,
+)
+
+
+FIELD_TYPES = {"name": "text", "phone": "text", "quality_rating": "number"}
+
+
+@dataclass
+class Condition:
+    """与高级搜索对话框的查询条件结构相同"""
+
+    field: str
+    operator: str
+    value: Any
+    logic: str = "AND"
+
+
+def _fingerprint(*conditions):
+    return fingerprint_conditions("supplier", conditions, FIELD_TYPES)
+
+
+class TestQueryFingerprint:
+    """查询指纹测试类"""
+
+    def test_and_conditions_ignore_order_and_spelling(self):
+        """测试AND条件的顺序、模糊匹配写法和IN列表顺序不影响指纹"""
+        first = _fingerprint(
+            Condition("name", "LIKE", "公司"),
+            Condition("quality_rating", "IN", [3, 5]),
+        )
+        second = _fingerprint(
+            Condition("quality_rating", "IN", [5, 3], "OR"),
+            Condition("name", "LIKE", "%公司%"),
+        )
+
+        assert first.conjunctive
+        assert first.key == second.key
+
+    def test_or_conditions_keep_order(self):
+        """测试含OR的条件按顺序比较"""
+        first = _fingerprint(
+            Condition("name", "=", "a"),
+            Condition("phone", "=", "1", "OR"),
+            Condition("quality_rating", "=", 5),
+        )
+        second = _fingerprint(
+            Condition("quality_rating", "=", 5),
+            Condition("phone", "=", "1", "OR"),
+            Condition("name", "=", "a"),
+        )
+
+        assert not first.conjunctive
+        assert first.key != second.key
+
+    def test_narrows(self):
+        """测试增加AND条件的查询被识别为细化查询"""
+        broad = _fingerprint(Condition("name", "LIKE", "公司"))
+        narrow = _fingerprint(
+            Condition("name", "LIKE", "公司"), Condition("quality_rating", ">=", 4)
+        )
+        with_or = _fingerprint(
+            Condition("name", "LIKE", "公司"),
+            Condition("quality_rating", ">=", 4, "OR"),
+        )
+
+        assert narrow.narrows(broad)
+        assert broad.narrows(broad)
+        assert not broad.narrows(narrow)
+        assert not with_or.narrows(broad)
+        assert not fingerprint_conditions(
+            "customer", [Condition("name", "LIKE", "公司")], FIELD_TYPES
+        ).narrows(broad)
+
+
+class TestInMemoryEvaluation:
+    """内存筛选和排序测试类"""
+
+    ROWS = [
+        {"id": 1, "name": "Alpha公司", "phone": None, "quality_rating": 4.5},
+        {"id": 2, "name": "beta公司", "phone": "139", "quality_rating": 3.0},
+        {"id": 3, "name": "GAMMA", "phone": "138", "quality_rating": None},
+        {"id": 4, "name": "alpha", "phone": "137", "quality_rating": 4.5},
+        {"id": 5, "name": None, "phone": "136", "quality_rating": 5.0},
+    ]
+
+    @pytest.fixture
+    def connection(self):
+        """创建与ROWS相同的SQLite表"""
+        connection = sqlite3.connect(":memory:")
+        connection.execute(
+            "CREATE TABLE suppliers "
+            "(id INTEGER PRIMARY KEY, name TEXT, phone TEXT, quality_rating REAL)"
+        )
+        connection.executemany(
+            "INSERT INTO suppliers VALUES (:id, :name, :phone, :quality_rating)",
+            self.ROWS,
+        )
+        yield connection
+        connection.close()
+
+    @pytest.mark.parametrize(
+        ("condition", "sql", "params"),
+        [
+            (Condition("name", "LIKE", "%ALPHA%"), "name LIKE ?", ["%ALPHA%"]),
+            (Condition("name", "NOT LIKE", "%公司"), "name NOT LIKE ?", ["%公司"]),
+            (Condition("name", "LIKE", "_eta%"), "name LIKE ?", ["_eta%"]),
+            (Condition("phone", "IS NULL", None), "phone IS NULL", []),
+            (Condition("phone", "!=", "139"), "phone != ?", ["139"]),
+            (
+                Condition("quality_rating", "BETWEEN", [3, 4.5]),
+                "quality_rating BETWEEN ? AND ?",
+                [3, 4.5],
+            ),
+            (
+                Condition("quality_rating", "NOT IN", [3.0, 5.0]),
+                "quality_rating NOT IN (?, ?)",
+                [3.0, 5.0],
+            ),
+        ],
+    )
+    def test_filter_matches_sqlite(self, connection, condition, sql, params):
+        """测试内存筛选结果与SQLite一致"""
+        fingerprint = _fingerprint(condition)
+        expected = [
+            row[0]
+            for row in connection.execute(
+                f"SELECT id FROM suppliers WHERE {sql} ORDER BY id", params
+            )
+        ]
+
+        matched = filter_rows(self.ROWS, fingerprint.conditions)
+
+        assert [row["id"] for row in matched] == expected
+
+    def test_mismatched_types_not_evaluable(self):
+        """测试值类型与列类型不同时交给数据库计算"""
+        fingerprint = _fingerprint(Condition("quality_rating", ">", "4"))
+
+        with pytest.raises(RowNotEvaluableError):
+            filter_rows(self.ROWS, fingerprint.conditions)
+
+    @pytest.mark.parametrize("direction", ["ASC", "DESC"])
+    def test_sort_and_seek_match_sqlite(self, connection, direction):
+        """测试排序和键集定位与SQLite一致, 包括NULL"""
+        expected = [
+            row[0]
+            for row in connection.execute(
+                "SELECT id FROM suppliers "
+                f"ORDER BY quality_rating {direction}, id {direction}"
+            )
+        ]
+
+        ordered = sort_rows(self.ROWS, "quality_rating", direction)
+        assert [row["id"] for row in ordered] == expected
+
+        # 排序值相同的记录按id区分先后
+        boundary = ordered[2]
+        after = (boundary["quality_rating"], boundary["id"])
+        remaining = rows_after(ordered, "quality_rating", direction, after)
+        assert [row["id"] for row in remaining] == expected[3:]
@@ -0,0 +1,94 @@
+"""
+启动导入耗时测试
+
+测试冷启动导入路径:
+- importtime输出解析和预算检查
+- 应用入口和依赖配置不导入pandas、reportlab、psutil等重量级库
+- 冷启动导入耗时不超过预算
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+from tests.performance.import_time_profiler import (
+    DEFAULT_BUDGET_MS,
+    DEFAULT_FORBIDDEN,
+    ImportProfile,
+    best_of,
+    check_budget,
+    parse_importtime,
+    project_root,
+)
+
+
+SAMPLE_OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:       300 |        420 | site
+import time:      2000 |       2000 |     pandas.core
+import time:      1500 |       3500 |   pandas
+import time:       500 |       4000 | minicrm.services.data_import_service
+"""
+
+
+class TestImportProfiler:
+    """导入耗时分析器测试类"""
+
+    def test_parse_importtime(self):
+        """测试解析模块名、耗时和嵌套深度"""
+        records = parse_importtime(SAMPLE_OUTPUT)
+
+        assert [(r.module, r.depth) for r in records] == [
+            ("_io", 1),
+            ("site", 0),
+            ("pandas.core", 2),
+            ("pandas", 1),
+            ("minicrm.services.data_import_service", 0),
+        ]
+        profile = ImportProfile("minicrm", records)
+        assert profile.total_ms == pytest.approx(4.42)
+        assert profile.top_modules(1)[0].module == "pandas.core"
+        assert profile.by_package()["pandas"] == pytest.approx(3.5)
+
+    def test_check_budget(self):
+        """测试超出预算和导入重量级库都会报告"""
+        profile = ImportProfile("minicrm", parse_importtime(SAMPLE_OUTPUT))
+
+        assert check_budget(profile, 10.0, ("reportlab",)) == []
+        violations = check_budget(profile, 1.0, ("pandas", "reportlab"))
+        assert len(violations) == 2
+        assert "pandas" in violations[1]
+
+
+@pytest.mark.slow
+class TestStartupImports:
+    """冷启动导入测试类"""
+
+    def test_entry_point_within_budget(self):
+        """测试应用入口冷启动导入耗时在预算内且不导入重量级库"""
+        profile = best_of("minicrm.application_ttk", runs=3)
+
+        assert check_budget(profile, DEFAULT_BUDGET_MS) == []
+
+    def test_dependency_wiring_stays_lazy(self, tmp_path):
+        """测试配置依赖不导入服务实现和重量级库"""
+        code = (
+            "import sys\n"
+            "from minicrm.application_config import "
+            "configure_application_dependencies\n"
+            "configure_application_dependencies()\n"
+            "print(sorted(m for m in sys.modules if m.startswith("
+            "('minicrm.services.', 'minicrm.data.dao.')) or m.split('.')[0] in "
+            f"{DEFAULT_FORBIDDEN!r}))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={"PYTHONPATH": str(project_root / "src"), "HOME": str(tmp_path)},
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
@@ -0,0 +1,110 @@
+"""
+启动阶段时间线测试
+
+测试StartupTimeline和启动基准测试:
+- 嵌套阶段、异常阶段和启动完成后的记录行为
+- JSON时间线和Chrome trace导出格式
+- 无界面模式下按真实入口启动并记录各阶段
+"""
+
+import json
+
+import pytest
+
+from minicrm.core.startup_timeline import StartupTimeline
+from tests.performance.startup_benchmark import run_benchmark, write_reports
+
+
+class TestStartupTimeline:
+    """启动阶段时间线测试类"""
+
+    def test_nested_phases(self):
+        """测试嵌套阶段的深度和先后顺序"""
+        timeline = StartupTimeline()
+
+        with timeline.phase("services"):
+            with timeline.phase("database_init", records=10):
+                pass
+            with timeline.phase("service_construction"):
+                pass
+
+        phases = timeline.phases
+        assert [(p.name, p.depth) for p in phases] == [
+            ("services", 0),
+            ("database_init", 1),
+            ("service_construction", 1),
+        ]
+        assert phases[0].duration_ms >= phases[1].duration_ms
+        assert phases[1].args == {"records": 10}
+        assert timeline.total_ms() >= phases[0].duration_ms
+
+    def test_failed_phase_recorded(self):
+        """测试阶段内异常照常抛出, 阶段仍被记录"""
+        timeline = StartupTimeline()
+
+        with pytest.raises(ValueError):
+            with timeline.phase("config_load"):
+                raise ValueError("bad config")
+
+        assert timeline.get_phase("config_load").args == {"error": "ValueError"}
+
+    def test_finish_and_limit(self):
+        """测试启动完成或达到上限后不再记录"""
+        timeline = StartupTimeline(max_phases=2)
+        for name in ("a", "b", "c"):
+            with timeline.phase(name):
+                pass
+        assert [p.name for p in timeline.phases] == ["a", "b"]
+
+        timeline.reset()
+        timeline.mark("ready")
+        timeline.finish()
+        with timeline.phase("late"):
+            pass
+        timeline.mark("late")
+
+        assert timeline.phases == []
+        assert [m["name"] for m in timeline.to_dict()["marks"]] == ["ready"]
+
+    def test_chrome_trace_format(self):
+        """测试Chrome trace包含完整事件和时间点事件, 时间单位为微秒"""
+        timeline = StartupTimeline()
+        with timeline.phase("main_window"):
+            pass
+        timeline.mark("interactive")
+
+        events = json.loads(json.dumps(timeline.to_chrome_trace()))["traceEvents"]
+
+        complete, instant = events
+        assert complete["ph"] == "X" and complete["name"] == "main_window"
+        assert complete["dur"] == pytest.approx(
+            timeline.phases[0].duration_ms * 1000, abs=0.1
+        )
+        assert instant["ph"] == "i" and instant["ts"] >= complete["ts"]
+
+
+@pytest.mark.slow
+class TestStartupBenchmark:
+    """启动基准测试类"""
+
+    def test_headless_startup_phases(self, tmp_path):
+        """测试无界面模式在合成数据库上启动并输出时间线和trace"""
+        report = run_benchmark(records=50, runs=1, ui=False)
+
+        phases = report["summary"]["phases"]
+        for name in (
+            "entry_import",
+            "config_load",
+            "logging_init",
+            "di_wiring",
+            "database_init",
+            "service_construction",
+        ):
+            assert name in phases
+        assert "main_window" not in phases
+
+        timeline_path, trace_path = write_reports(report, tmp_path)
+        timeline = json.loads(timeline_path.read_text(encoding="utf-8"))
+        trace = json.loads(trace_path.read_text(encoding="utf-8"))
+        assert timeline["runs_detail"][0]["marks"][0]["name"] == "ready"
+        assert {e["name"] for e in trace["traceEvents"]} >= set(phases)
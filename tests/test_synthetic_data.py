@@ -0,0 +1,124 @@
+"""
+合成数据生成器测试
+
+测试规模基准测试使用的合成数据:
+- 各表记录数与配置一致
+- 相同配置生成完全相同的数据
+- 跨表引用和金额保持一致
+- 缓存的数据库按配置复用
+"""
+
+from pathlib import Path
+import shutil
+import sqlite3
+import tempfile
+
+import pytest
+
+from tests.performance.synthetic_data import (
+    SyntheticDataConfig,
+    build_cached_database,
+    generate_database,
+)
+
+
+TABLES = (
+    "customers",
+    "suppliers",
+    "quotes",
+    "quote_items",
+    "contracts",
+    "customer_interactions",
+    "supplier_interactions",
+    "financial_records",
+    "tasks",
+)
+
+
+@pytest.fixture
+def temp_dir():
+    """创建临时目录"""
+    path = Path(tempfile.mkdtemp())
+    yield path
+    shutil.rmtree(path, ignore_errors=True)
+
+
+def _dump(db_path: Path) -> dict[str, list[tuple]]:
+    connection = sqlite3.connect(db_path)
+    try:
+        return {
+            table: connection.execute(f"SELECT * FROM {table} ORDER BY id").fetchall()
+            for table in TABLES
+        }
+    finally:
+        connection.close()
+
+
+class TestSyntheticData:
+    """合成数据生成器测试类"""
+
+    def test_row_counts_and_determinism(self, temp_dir):
+        """测试记录数和确定性"""
+        config = SyntheticDataConfig(customers=200)
+
+        counts = generate_database(temp_dir / "a.db", config)
+        generate_database(temp_dir / "b.db", config)
+
+        assert counts == config.row_counts()
+        assert counts["quote_items"] == 600
+        assert _dump(temp_dir / "a.db") == _dump(temp_dir / "b.db")
+
+        other = SyntheticDataConfig(customers=200, seed=1)
+        generate_database(temp_dir / "c.db", other)
+        other_customers = _dump(temp_dir / "c.db")["customers"]
+        assert other_customers != _dump(temp_dir / "a.db")["customers"]
+
+    def test_cross_table_consistency(self, temp_dir):
+        """测试报价金额、合同客户和外键一致"""
+        db_path = temp_dir / "crm.db"
+        generate_database(db_path, SyntheticDataConfig(customers=300))
+
+        connection = sqlite3.connect(db_path)
+        try:
+            mismatched_totals = connection.execute(
+                """
+                SELECT COUNT(*) FROM (
+                    SELECT q.id FROM quotes q JOIN quote_items i ON i.quote_id = q.id
+                    GROUP BY q.id
+                    HAVING ABS(q.total_amount - SUM(i.total_price)) > 0.005
+                )
+                """
+            ).fetchone()[0]
+            mismatched_contracts = connection.execute(
+                """
+                SELECT COUNT(*) FROM contracts c JOIN quotes q ON q.id = c.quote_id
+                WHERE c.customer_id != q.customer_id
+                """
+            ).fetchone()[0]
+            broken_keys = connection.execute("PRAGMA foreign_key_check").fetchall()
+        finally:
+            connection.close()
+
+        assert mismatched_totals == 0
+        assert mismatched_contracts == 0
+        assert broken_keys == []
+
+    def test_cached_database_reused(self, temp_dir):
+        """测试相同配置复用缓存的数据库"""
+        config = SyntheticDataConfig(customers=50)
+
+        first = build_cached_database(config, temp_dir)
+        modified = first.stat().st_mtime_ns
+        second = build_cached_database(config, temp_dir)
+
+        assert second == first
+        assert second.stat().st_mtime_ns == modified
+        assert first.with_suffix(".json").exists()
+        other = build_cached_database(SyntheticDataConfig(customers=60), temp_dir)
+        assert other != first
+
+    def test_unknown_scale(self):
+        """测试未知规模"""
+        assert SyntheticDataConfig.for_scale("100K").customers == 100_000
+        with pytest.raises(ValueError):
+            SyntheticDataConfig.for_scale("5m")
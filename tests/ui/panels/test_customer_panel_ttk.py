@@ -59,11 +59,10 @@ class TestCustomerPanelTTK(unittest.TestCase):
             },
         ]
 
-        # 配置模拟服务的返回值
-        self.mock_customer_service.search_customers.return_value = (
-            self.sample_customers,
-            len(self.sample_customers),
-        )
+        # 配置模拟DAO的分页返回值
+        customer_dao = self.mock_customer_service.customer_dao
+        customer_dao.count_filtered.return_value = len(self.sample_customers)
+        customer_dao.fetch_page.return_value = self.sample_customers
 
     def tearDown(self):
         """测试清理"""
@@ -87,7 +86,6 @@ class TestCustomerPanelTTK(unittest.TestCase):
 
         # 验证初始状态
         self.assertEqual(self.customer_panel._search_query, "")
-        self.assertEqual(self.customer_panel._current_filters, {})
         self.assertIsNone(self.customer_panel._selected_customer_id)
 
     def test_ui_components_creation(self):
@@ -99,7 +97,6 @@ class TestCustomerPanelTTK(unittest.TestCase):
 
         # 验证主要UI组件存在
         self.assertIsNotNone(self.customer_panel._search_entry)
-        self.assertIsNotNone(self.customer_panel._filter_frame)
         self.assertIsNotNone(self.customer_panel._customer_table)
         self.assertIsNotNone(self.customer_panel._detail_panel)
         self.assertIsNotNone(self.customer_panel._splitter)
@@ -112,11 +109,6 @@ class TestCustomerPanelTTK(unittest.TestCase):
         self.assertIsNotNone(self.customer_panel._export_button)
         self.assertIsNotNone(self.customer_panel._refresh_button)
 
-        # 验证筛选器存在
-        self.assertIsNotNone(self.customer_panel._level_filter)
-        self.assertIsNotNone(self.customer_panel._type_filter)
-        self.assertIsNotNone(self.customer_panel._industry_filter)
-
     def test_data_loading(self):
         """测试数据加载"""
         self.customer_panel = CustomerPanelTTK(
@@ -124,12 +116,13 @@ class TestCustomerPanelTTK(unittest.TestCase):
             customer_service=self.mock_customer_service,
         )
 
-        # 验证服务被调用
-        self.mock_customer_service.search_customers.assert_called()
+        # 验证表格按页从DAO加载
+        self.mock_customer_service.customer_dao.fetch_page.assert_called()
 
         # 验证数据被加载
-        self.assertEqual(len(self.customer_panel._current_customers), 2)
-        self.assertEqual(self.customer_panel._current_customers[0]["name"], "测试客户1")
+        table = self.customer_panel._customer_table
+        self.assertEqual(table.get_total_count(), 2)
+        self.assertEqual(table._get_current_page_data()[0]["name"], "测试客户1")
 
     def test_search_functionality(self):
         """测试搜索功能"""
@@ -148,25 +141,20 @@ class TestCustomerPanelTTK(unittest.TestCase):
         # 验证搜索查询被设置
         self.assertEqual(self.customer_panel._search_query, "测试客户1")
 
-    def test_filter_functionality(self):
-        """测试筛选功能"""
+    def test_unmapped_columns_not_searchable(self):
+        """测试没有对应数据库列的显示列不参与表格搜索"""
         self.customer_panel = CustomerPanelTTK(
             parent=self.root,
             customer_service=self.mock_customer_service,
         )
 
-        # 设置筛选器值
-        self.customer_panel._level_filter.set(CustomerLevel.VIP.value)
-        self.customer_panel._type_filter.set(CustomerType.ENTERPRISE.value)
-
-        # 触发筛选事件
-        event = Mock()
-        self.customer_panel._on_filter_changed(event)
+        filter_widget = self.customer_panel._customer_table.filter_widget
+        searchable = [col["id"] for col in filter_widget.searchable_columns]
 
-        # 验证筛选条件被构建
-        filters = self.customer_panel._build_filters()
-        self.assertEqual(filters["customer_level"], CustomerLevel.VIP.value)
-        self.assertEqual(filters["customer_type"], CustomerType.ENTERPRISE.value)
+        self.assertIn("company_name", searchable)
+        self.assertNotIn("customer_level", searchable)
+        self.assertNotIn("customer_type", searchable)
+        self.assertNotIn("industry_type", searchable)
 
     def test_customer_selection(self):
         """测试客户选择"""
@@ -287,13 +275,13 @@ class TestCustomerPanelTTK(unittest.TestCase):
         )
 
         # 重置模拟调用计数
-        self.mock_customer_service.search_customers.reset_mock()
+        self.mock_customer_service.customer_dao.count_filtered.reset_mock()
 
         # 触发刷新操作
         self.customer_panel._on_refresh()
 
         # 验证数据重新加载
-        self.mock_customer_service.search_customers.assert_called()
+        self.mock_customer_service.customer_dao.count_filtered.assert_called()
 
     def test_status_bar_update(self):
         """测试状态栏更新"""
@@ -340,9 +328,9 @@ class TestCustomerPanelTTK(unittest.TestCase):
         )
 
         # 测试刷新数据方法
-        self.mock_customer_service.search_customers.reset_mock()
+        self.mock_customer_service.customer_dao.count_filtered.reset_mock()
         self.customer_panel.refresh_data()
-        self.mock_customer_service.search_customers.assert_called()
+        self.mock_customer_service.customer_dao.count_filtered.assert_called()
 
         # 测试选中客户方法
         self.customer_panel.select_customer(1)
@@ -402,7 +390,8 @@ class TestCustomerPanelTTKIntegration(unittest.TestCase):
                 "created_at": "2024-01-01 10:00:00",
             }
         ]
-        self.mock_customer_service.search_customers.return_value = (customers, 1)
+        self.mock_customer_service.customer_dao.count_filtered.return_value = 1
+        self.mock_customer_service.customer_dao.fetch_page.return_value = customers
         self.mock_customer_service.get_customer_by_id.return_value = customers[0]
 
         # 创建面板
@@ -413,7 +402,7 @@ class TestCustomerPanelTTKIntegration(unittest.TestCase):
 
         # 验证初始化
         self.assertIsNotNone(self.customer_panel)
-        self.assertEqual(len(self.customer_panel._current_customers), 1)
+        self.assertEqual(self.customer_panel._customer_table.get_total_count(), 1)
 
         # 模拟选择客户
         self.customer_panel._on_customer_selected(customers)
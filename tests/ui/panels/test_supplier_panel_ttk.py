@@ -11,8 +11,9 @@
 
 import tkinter as tk
 import unittest
-from unittest.mock import Mock, patch
+from unittest.mock import Mock, PropertyMock, patch
 
+from minicrm.core.exceptions import ServiceError
 from minicrm.models.supplier import QualityRating, SupplierLevel, SupplierType
 from minicrm.ui.panels.supplier_panel_ttk import SupplierPanelTTK
 
@@ -89,11 +90,10 @@ class TestSupplierPanelTTK(unittest.TestCase):
             },
         ]
 
-        # 配置模拟服务的返回值
-        self.mock_supplier_service.search_suppliers.return_value = (
-            self.mock_suppliers,
-            len(self.mock_suppliers),
-        )
+        # 配置模拟DAO的分页返回值
+        supplier_dao = self.mock_supplier_service.supplier_dao
+        supplier_dao.count_filtered.return_value = len(self.mock_suppliers)
+        supplier_dao.fetch_page.return_value = self.mock_suppliers
 
         self.mock_supplier_service.delete_supplier.return_value = True
 
@@ -116,18 +116,16 @@ class TestSupplierPanelTTK(unittest.TestCase):
 
         # 验证UI组件存在
         self.assertIsNotNone(self.supplier_panel._search_entry)
-        self.assertIsNotNone(self.supplier_panel._level_filter)
-        self.assertIsNotNone(self.supplier_panel._type_filter)
-        self.assertIsNotNone(self.supplier_panel._quality_filter)
         self.assertIsNotNone(self.supplier_panel._supplier_table)
         self.assertIsNotNone(self.supplier_panel._detail_panel)
         self.assertIsNotNone(self.supplier_panel._comparison_panel)
         self.assertIsNotNone(self.supplier_panel._notebook)
 
         # 验证数据加载
-        self.mock_supplier_service.search_suppliers.assert_called_once()
+        self.mock_supplier_service.supplier_dao.count_filtered.assert_called_once()
         self.assertEqual(
-            len(self.supplier_panel._current_suppliers), len(self.mock_suppliers)
+            self.supplier_panel._supplier_table.get_total_count(),
+            len(self.mock_suppliers),
         )
 
     def test_supplier_filtering(self):
@@ -139,40 +137,15 @@ class TestSupplierPanelTTK(unittest.TestCase):
         # 验证搜索查询被设置
         self.assertEqual(self.supplier_panel._search_query, "供应商A")
 
-        # 测试等级筛选
-        self.supplier_panel._level_filter.set(SupplierLevel.STRATEGIC.value)
-        self.supplier_panel._on_filter_changed(None)
-
-        # 测试类型筛选
-        self.supplier_panel._type_filter.set(SupplierType.MANUFACTURER.value)
-        self.supplier_panel._on_filter_changed(None)
-
-        # 测试质量等级筛选
-        self.supplier_panel._quality_filter.set(QualityRating.EXCELLENT.value)
-        self.supplier_panel._on_filter_changed(None)
-
-    def test_filter_building(self):
-        """测试筛选条件构建."""
-        # 设置筛选条件
-        self.supplier_panel._level_filter.set(SupplierLevel.STRATEGIC.value)
-        self.supplier_panel._type_filter.set(SupplierType.MANUFACTURER.value)
-        self.supplier_panel._quality_filter.set(QualityRating.EXCELLENT.value)
-
-        # 构建筛选条件
-        filters = self.supplier_panel._build_filters()
-
-        # 验证筛选条件
-        expected_filters = {
-            "supplier_level": SupplierLevel.STRATEGIC.value,
-            "supplier_type": SupplierType.MANUFACTURER.value,
-            "quality_rating": QualityRating.EXCELLENT.value,
-        }
-        self.assertEqual(filters, expected_filters)
-
-        # 测试"全部"选项
-        self.supplier_panel._level_filter.set("全部")
-        filters = self.supplier_panel._build_filters()
-        self.assertNotIn("supplier_level", filters)
+    def test_unmapped_columns_not_searchable(self):
+        """测试没有对应数据库列的显示列不参与表格搜索."""
+        filter_widget = self.supplier_panel._supplier_table.filter_widget
+        searchable = [col["id"] for col in filter_widget.searchable_columns]
+
+        self.assertIn("company_name", searchable)
+        self.assertNotIn("supplier_level", searchable)
+        self.assertNotIn("supplier_type", searchable)
+        self.assertNotIn("quality_score", searchable)
 
     def test_supplier_selection(self):
         """测试供应商选择功能."""
@@ -481,7 +454,6 @@ class TestSupplierPanelTTK(unittest.TestCase):
         mock_showinfo.reset_mock()
 
         # 测试导出功能
-        self.supplier_panel._current_suppliers = self.mock_suppliers
         self.supplier_panel._on_export_suppliers()
         mock_showinfo.assert_called()
 
@@ -504,7 +476,8 @@ class TestSupplierPanelTTK(unittest.TestCase):
         # 测试刷新数据
         self.supplier_panel.refresh_data()
         # 验证服务方法被调用
-        self.assertGreater(self.mock_supplier_service.search_suppliers.call_count, 1)
+        supplier_dao = self.mock_supplier_service.supplier_dao
+        self.assertGreater(supplier_dao.count_filtered.call_count, 1)
 
         # 测试选中供应商
         self.supplier_panel.select_supplier(1)
@@ -517,7 +490,9 @@ class TestSupplierPanelTTK(unittest.TestCase):
     def test_error_handling(self):
         """测试错误处理."""
         # 测试服务异常处理
-        self.mock_supplier_service.search_suppliers.side_effect = Exception("服务异常")
+        type(self.mock_supplier_service).supplier_dao = PropertyMock(
+            side_effect=ServiceError("服务异常")
+        )
 
         with patch("tkinter.messagebox.showerror") as mock_error:
             # 重新创建面板以触发异常
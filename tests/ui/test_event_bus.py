@@ -0,0 +1,149 @@
+"""
+MiniCRM 事件总线测试
+
+测试EventBus的分发核心：
+- 按优先级出队, 同优先级先进先出
+- 尚未处理的重复刷新事件合并为最新的一个
+- 订阅变化后分发缓存失效
+- 后台线程分发和绑定Tk主循环后的分发
+"""
+
+import threading
+import unittest
+
+from minicrm.ui.event_bus import EventBus, EventPriority
+
+
+class _FakeTkRoot:
+    """记录after调度的Tk根窗口替身"""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+        return f"after#{len(self.scheduled)}"
+
+    def after_cancel(self, after_id):
+        pass
+
+
+class TestEventBus(unittest.TestCase):
+    """测试EventBus"""
+
+    def setUp(self):
+        self.bus = EventBus()
+        self.root = _FakeTkRoot()
+        # 绑定替身后事件只在手动调用分发回调时处理
+        self.bus.attach_to_tk(self.root)
+
+    def tearDown(self):
+        self.bus.cleanup()
+
+    def _tick(self):
+        self.bus._tk_dispatch()
+
+    def test_priority_order_and_fifo(self):
+        """测试高优先级先处理, 同优先级按发布顺序"""
+        received = []
+        self.bus.subscribe("x", lambda e: received.append(e.data))
+
+        self.bus.publish("x", "n1")
+        self.bus.publish("x", "low", priority=EventPriority.LOW)
+        self.bus.publish("x", "critical", priority=EventPriority.CRITICAL)
+        self.bus.publish("x", "n2")
+        self._tick()
+
+        self.assertEqual(received, ["critical", "n1", "n2", "low"])
+        self.assertEqual(self.bus.get_queue_size(), 0)
+
+    def test_refresh_events_coalesced(self):
+        """测试重复的刷新事件只处理最新一个"""
+        received = []
+        self.bus.subscribe("table.refresh", lambda e: received.append(e.data))
+
+        for i in range(100):
+            self.bus.publish("table.refresh", i)
+        self.bus.publish("table.refresh", "urgent", priority=EventPriority.HIGH)
+        self.assertEqual(self.bus.get_queue_size(), 1)
+        self._tick()
+
+        self.assertEqual(received, ["urgent"])
+        history = self.bus.get_event_history("table.refresh", limit=0)
+        self.assertEqual(len(history), 101)
+
+    def test_custom_coalesced_type_and_explicit_flag(self):
+        """测试自定义合并类型和逐次指定"""
+        received = []
+        self.bus.subscribe_global(lambda e: received.append((e.type, e.data)))
+        self.bus.add_coalesced_event_type("customer.changed")
+
+        for i in range(3):
+            self.bus.publish("customer.changed", i)
+            self.bus.publish("order.changed", i, coalesce=True)
+            self.bus.publish("grid.refresh", i, coalesce=False)
+        self._tick()
+
+        self.assertEqual(
+            received,
+            [
+                ("customer.changed", 2),
+                ("order.changed", 2),
+                ("grid.refresh", 0),
+                ("grid.refresh", 1),
+                ("grid.refresh", 2),
+            ],
+        )
+
+    def test_subscription_changes_invalidate_cache(self):
+        """测试订阅和取消订阅后立即生效"""
+        first, second = [], []
+        sub_id = self.bus.subscribe("x", lambda e: first.append(e.data))
+        self.bus.publish("x", 1)
+        self._tick()
+
+        self.bus.subscribe("x", lambda e: second.append(e.data))
+        self.bus.unsubscribe(sub_id)
+        self.bus.publish("x", 2)
+        self._tick()
+
+        self.assertEqual(first, [1])
+        self.assertEqual(second, [2])
+
+    def test_tk_dispatch_reschedules_by_backlog(self):
+        """测试Tk分发在有积压时立即继续, 空闲时按间隔轮询"""
+        self.bus.subscribe("x", lambda e: None)
+        self.bus._tk_time_budget = 0.0
+        for i in range(5000):
+            self.bus.publish("x", i)
+
+        self._tick()
+        self.assertEqual(self.root.scheduled[-1][0], 1)
+        self.assertGreater(self.bus.get_queue_size(), 0)
+
+        while self.bus.get_queue_size():
+            self._tick()
+        self._tick()
+        self.assertEqual(self.root.scheduled[-1][0], self.bus._tk_idle_interval)
+
+    def test_background_thread_dispatch(self):
+        """测试未绑定Tk时由后台线程分发"""
+        self.bus.detach_from_tk()
+        done = threading.Event()
+        received = []
+
+        def on_event(event):
+            received.append(event.data)
+            if len(received) == 1000:
+                done.set()
+
+        self.bus.subscribe("x", on_event)
+        for i in range(1000):
+            self.bus.publish("x", i)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(received, list(range(1000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
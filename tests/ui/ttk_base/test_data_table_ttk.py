@@ -8,7 +8,12 @@ import tkinter as tk
 import unittest
 from unittest.mock import Mock, patch
 
-from src.minicrm.ui.ttk_base.data_table_ttk import DataTableTTK, SortOrder
+from src.minicrm.ui.ttk_base.data_table_ttk import (
+    DataTableTTK,
+    SortOrder,
+    StreamedExportData,
+)
+from src.minicrm.ui.ttk_base.table_data_source import TableDataSource
 
 
 class TestDataTableTTK(unittest.TestCase):
@@ -287,5 +292,112 @@ class TestDataTableTTK(unittest.TestCase):
         single_select_table.destroy()
 
 
+class _ListDataSource(TableDataSource):
+    """记录请求的内存数据源"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.requests = []
+
+    def count(self, filters=None):
+        return len(self.rows)
+
+    def fetch_page(self, offset, limit, sort=None, filters=None):
+        self.requests.append((offset, limit, sort))
+        rows = self.rows
+        if sort:
+            rows = sorted(rows, key=lambda r: r[sort[0]], reverse=sort[1] == "desc")
+        return rows[offset : offset + limit]
+
+
+class TestDataTableTTKDataSource(unittest.TestCase):
+    """测试DataTableTTK的分页数据源模式"""
+
+    def setUp(self):
+        """测试准备"""
+        self.root = tk.Tk()
+        self.root.withdraw()
+
+        self.columns = [
+            {"id": "id", "text": "ID", "width": 60},
+            {"id": "name", "text": "名称", "width": 100},
+        ]
+        self.source = _ListDataSource(
+            [{"id": i, "name": f"客户{i:03d}"} for i in range(25)]
+        )
+        self.data_table = DataTableTTK(
+            self.root,
+            columns=self.columns,
+            page_size=10,
+            enable_virtual_scroll=False,
+            data_source=self.source,
+        )
+
+    def tearDown(self):
+        """测试清理"""
+        self.data_table.cleanup()
+        self.data_table.destroy()
+        self.root.destroy()
+
+    def test_only_current_page_is_loaded(self):
+        """测试只加载当前页并按总数分页"""
+        children = self.data_table.tree.get_children()
+        self.assertEqual(len(children), 10)
+        self.assertEqual(self.data_table.pagination_widget.total_pages, 3)
+        self.assertIn((0, 10, None), self.source.requests)
+
+    def test_sort_is_delegated_to_source(self):
+        """测试排序交给数据源执行"""
+        self.data_table._sort_by_column("id")
+        self.data_table._sort_by_column("id")
+
+        self.assertIn((0, 10, ("id", "desc")), self.source.requests)
+        first = self.data_table.tree.item(self.data_table.tree.get_children()[0])
+        self.assertEqual(str(first["values"][0]), "24")
+
+    def test_tree_items_are_reused(self):
+        """测试翻页时复用Treeview行"""
+        before = self.data_table.tree.get_children()
+
+        self.data_table.pagination_widget.current_page = 2
+        self.data_table._on_page_changed(2, 10)
+
+        self.assertEqual(self.data_table.tree.get_children(), before)
+
+    def test_adjacent_page_is_prefetched(self):
+        """测试后台预取下一页"""
+        self.data_table._prefetch_executor.shutdown(wait=True)
+
+        self.assertIn((10, 10, None), self.source.requests)
+
+    def test_export_data_is_streamed(self):
+        """测试导出数据按当前排序从数据源分批读取, 遍历时才读取"""
+        self.source.requests.clear()
+        data = StreamedExportData(
+            lambda: DataTableTTK._stream_export_rows(self.source, ("id", "desc"), None),
+            25,
+        )
+
+        self.assertEqual(len(data), 25)
+        self.assertEqual(self.source.requests, [])
+
+        rows = list(data)
+
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]["id"], 24)
+        self.assertIn((0, 500, ("id", "desc")), self.source.requests)
+
+    def test_export_dialog_receives_stream(self):
+        """测试数据源模式下导出对话框得到流式数据而不是全部记录"""
+        with patch.object(
+            self.data_table.export_widget, "show_export_dialog"
+        ) as mock_show:
+            self.data_table._export_all()
+
+        data = mock_show.call_args.kwargs["data"]
+        self.assertIsInstance(data, StreamedExportData)
+        self.assertEqual(len(data), 25)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -15,6 +15,7 @@ from src.minicrm.ui.ttk_base.table_export_ttk import (
     ExportFormat,
     ExportProgress,
     ExportScope,
+    StreamedExportData,
     TableExportTTK,
 )
 
@@ -150,6 +151,39 @@ class TestTableExportTTK(unittest.TestCase):
             if os.path.exists(temp_filename):
                 os.unlink(temp_filename)
 
+    def test_export_streamed_data_to_csv(self):
+        """测试流式数据在导出时才读取并逐行写入"""
+        reads = []
+
+        def read_rows():
+            reads.append(True)
+            yield from self.test_data
+
+        data = StreamedExportData(read_rows, len(self.test_data))
+        self.assertEqual(reads, [])
+
+        with tempfile.NamedTemporaryFile(suffix=".csv", delete=False) as temp_file:
+            temp_filename = temp_file.name
+
+        try:
+            self.export_widget.export_progress = ExportProgress(len(data))
+            success = self.export_widget._export_to_csv(
+                temp_filename, data, self.columns
+            )
+
+            self.assertTrue(success)
+            self.assertEqual(reads, [True])
+            self.assertEqual(
+                self.export_widget.export_progress.current, len(self.test_data)
+            )
+            with open(temp_filename, encoding="utf-8-sig") as csvfile:
+                rows = list(csv.reader(csvfile))
+            self.assertEqual(len(rows), len(self.test_data) + 1)
+
+        finally:
+            if os.path.exists(temp_filename):
+                os.unlink(temp_filename)
+
     @unittest.skipUnless(EXCEL_AVAILABLE, "openpyxl not available")
     def test_export_to_excel(self):
         """测试Excel导出功能"""
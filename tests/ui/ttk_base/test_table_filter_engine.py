@@ -0,0 +1,153 @@
+"""
+MiniCRM 表格筛选引擎测试
+
+测试FilterEngine的编译执行结果与逐行判定一致，
+以及收窄条件时复用上次结果、按选择性排序等行为。
+"""
+
+import random
+import unittest
+
+from src.minicrm.ui.ttk_base.table_filter_engine import (
+    FilterCondition,
+    FilterEngine,
+    FilterOperator,
+)
+
+
+def _reference_filter(data, all_conditions, any_conditions):
+    """逐行判定的参考实现"""
+    return [
+        row
+        for row in data
+        if all(cond.apply(row) for cond in all_conditions)
+        and (not any_conditions or any(cond.apply(row) for cond in any_conditions))
+    ]
+
+
+class TestFilterEngine(unittest.TestCase):
+    """测试FilterEngine"""
+
+    def setUp(self):
+        """测试准备"""
+        rng = random.Random(7)
+        cities = ["北京", "上海", "广州", "深圳", ""]
+        self.data = [
+            {
+                "name": f"Client{i:04d}",
+                "city": rng.choice(cities),
+                "amount": str(rng.randint(0, 1000)) if i % 11 else "n/a",
+                "note": None if i % 5 == 0 else f"note-{i % 17}",
+            }
+            for i in range(2000)
+        ]
+        self.engine = FilterEngine()
+
+    def test_matches_row_by_row_evaluation(self):
+        """测试各操作符结果与逐行判定一致"""
+        cases = [
+            ("city", FilterOperator.EQUALS, "上海", None),
+            ("city", FilterOperator.NOT_EQUALS, "上海", None),
+            ("name", FilterOperator.CONTAINS, "CLIENT01", None),
+            ("name", FilterOperator.NOT_CONTAINS, "9", None),
+            ("name", FilterOperator.STARTS_WITH, "client1", None),
+            ("name", FilterOperator.ENDS_WITH, "7", None),
+            ("amount", FilterOperator.GREATER_THAN, "500", None),
+            ("amount", FilterOperator.LESS_EQUAL, "10", None),
+            ("amount", FilterOperator.BETWEEN, "100", "200"),
+            ("amount", FilterOperator.BETWEEN, "900", None),
+            ("city", FilterOperator.IN_LIST, "北京, 广州", None),
+            ("city", FilterOperator.NOT_IN_LIST, "北京,广州", None),
+            ("note", FilterOperator.IS_EMPTY, None, None),
+            ("note", FilterOperator.IS_NOT_EMPTY, None, None),
+            ("note", FilterOperator.REGEX, r"NOTE-1\d", None),
+            ("note", FilterOperator.REGEX, "[", None),
+        ]
+        for column, operator, value, value2 in cases:
+            with self.subTest(operator=operator, value=value):
+                condition = FilterCondition(column, operator, value, value2)
+                self.assertEqual(
+                    self.engine.filter(self.data, [condition]),
+                    _reference_filter(self.data, [condition], []),
+                )
+
+    def test_any_and_all_groups(self):
+        """测试快速搜索(any)与高级筛选(all)组合且保持原有顺序"""
+        any_conditions = [
+            FilterCondition("name", FilterOperator.CONTAINS, "00"),
+            FilterCondition("note", FilterOperator.CONTAINS, "-3"),
+        ]
+        all_conditions = [
+            FilterCondition("amount", FilterOperator.GREATER_EQUAL, "300"),
+            FilterCondition("city", FilterOperator.NOT_EQUALS, ""),
+        ]
+
+        result = self.engine.filter(self.data, all_conditions, any_conditions)
+
+        self.assertTrue(result)
+        self.assertEqual(
+            result, _reference_filter(self.data, all_conditions, any_conditions)
+        )
+
+    def test_narrowed_search_reuses_previous_result(self):
+        """测试继续输入搜索字符时只在上次结果中筛选"""
+        first = FilterCondition("name", FilterOperator.CONTAINS, "client1")
+        previous = self.engine.filter_indices(self.data, [], [first])
+
+        narrowed = FilterCondition("name", FilterOperator.CONTAINS, "client12")
+        compiled = narrowed.compile()
+        seen = []
+        original_select = compiled.select
+
+        def recording_select(values, indices):
+            seen.append(list(indices))
+            return original_select(values, indices)
+
+        compiled.select = recording_select
+        result = self.engine.filter(self.data, [], [narrowed])
+
+        self.assertEqual(seen, [previous])
+        self.assertEqual(result, _reference_filter(self.data, [], [narrowed]))
+
+    def test_widened_search_scans_all_rows(self):
+        """测试放宽条件后重新扫描全部数据"""
+        narrow = FilterCondition("name", FilterOperator.CONTAINS, "client12")
+        self.engine.filter(self.data, [], [narrow])
+
+        wide = FilterCondition("name", FilterOperator.CONTAINS, "client1")
+
+        self.assertEqual(
+            self.engine.filter(self.data, [], [wide]),
+            _reference_filter(self.data, [], [wide]),
+        )
+
+    def test_new_data_is_not_served_from_stale_snapshot(self):
+        """测试更换数据后不使用旧快照"""
+        condition = FilterCondition("city", FilterOperator.EQUALS, "北京")
+        self.engine.filter(self.data, [condition])
+
+        new_data = [{"city": "北京"}, {"city": "上海"}]
+
+        self.assertEqual(self.engine.filter(new_data, [condition]), [new_data[0]])
+
+    def test_selective_condition_runs_first(self):
+        """测试高级条件按观测到的选择性排序"""
+        broad = FilterCondition("name", FilterOperator.CONTAINS, "client")
+        rare = FilterCondition("name", FilterOperator.CONTAINS, "client0001")
+        self.engine.filter(self.data, [broad, rare])
+
+        order = []
+        for condition in (broad, rare):
+            compiled = condition.compile()
+            original = compiled.select
+            compiled.select = lambda values, indices, c=condition, f=original: (
+                order.append(c) or f(values, indices)
+            )
+        self.engine.invalidate()
+        self.engine.filter(self.data, [broad, rare])
+
+        self.assertEqual(order, [rare, broad])
+
+
+if __name__ == "__main__":
+    unittest.main()